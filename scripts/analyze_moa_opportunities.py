@@ -1,6 +1,11 @@
 import json
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from catalyst_bot.partitioned_jsonl import iter_lines  # noqa: E402
+
 # Load outcomes data
 outcomes_path = Path('data/moa/outcomes.jsonl')
 outcomes = []
@@ -9,15 +14,15 @@ with open(outcomes_path, 'r', encoding='utf-8') as f:
         if line.strip():
             outcomes.append(json.loads(line))
 
-# Load rejected items to get titles and original prices
+# Load rejected items (legacy file plus day partitions) to get titles and
+# original prices
 rejected_items_path = Path('data/rejected_items.jsonl')
 rejected_items = {}
-with open(rejected_items_path, 'r', encoding='utf-8') as f:
-    for line in f:
-        if line.strip():
-            item = json.loads(line)
-            key = (item['ticker'], item['ts'])
-            rejected_items[key] = item
+for line in iter_lines(rejected_items_path):
+    if line.strip():
+        item = json.loads(line)
+        key = (item['ticker'], item['ts'])
+        rejected_items[key] = item
 
 # Get missed opportunities, keeping only the best per ticker
 ticker_best = {}
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Cycle Replay Benchmark
+======================
+
+Replay a recorded fixture bundle through the real runner cycle against
+local stand-ins (recorded quotes, a stub Ollama-compatible LLM server and a
+Discord webhook sink) and report cycle time, alerts/min, peak memory and
+per-stage timings. Record a bundle by running the bot with
+CYCLE_REPLAY_RECORD_DIR set.
+
+Usage:
+    python scripts/benchmark_cycle_replay.py replay data/replay/2025-12-09
+    python scripts/benchmark_cycle_replay.py replay data/replay/2025-12-09 \\
+        --llm-latency-ms 400 --llm-jitter-ms 200 --llm-429-rate 0.05
+    python scripts/benchmark_cycle_replay.py compare before.json after.json
+
+Reports are written to data/benchmarks/cycle_replay_<commit>_TIMESTAMP.json.
+``compare`` exits 1 when a stage regressed, so two checkouts can be compared
+from a shell loop without CI.
+"""
+
+import argparse
+import json
+import logging
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from catalyst_bot.simulation.cycle_replay import (  # noqa: E402
+    CycleReplayBench,
+    FixtureBundle,
+    compare_reports,
+)
+
+DEFAULT_OUT_DIR = Path("data/benchmarks")
+
+
+def _git_commit() -> str:
+    try:
+        return (
+            subprocess.check_output(
+                ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL
+            )
+            .decode()
+            .strip()
+        )
+    except Exception:
+        return "unknown"
+
+
+def _parse_env(pairs):
+    env = {}
+    for pair in pairs or []:
+        key, _, value = pair.partition("=")
+        env[key.strip()] = value
+    return env
+
+
+def cmd_replay(args) -> int:
+    bundle = FixtureBundle.load(args.bundle)
+    print(
+        f"Replaying {len(bundle.cycles)} cycles ({bundle.item_count} items, "
+        f"{len(bundle.quotes)} quotes, {len(bundle.llm)} LLM responses)"
+    )
+
+    bench = CycleReplayBench(
+        bundle,
+        llm_latency_ms=args.llm_latency_ms,
+        llm_jitter_ms=args.llm_jitter_ms,
+        llm_429_rate=args.llm_429_rate,
+        seed=args.seed,
+        trace_memory=args.tracemalloc,
+        env=_parse_env(args.env),
+    )
+    report = bench.run(cycles=args.cycles)
+    report["commit"] = _git_commit()
+
+    out = args.out
+    if out is None:
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        out = DEFAULT_OUT_DIR / f"cycle_replay_{report['commit']}_{stamp}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    cycle_ms = report["cycle_ms"]
+    print("=" * 78)
+    print(f"Commit:            {report['commit']}")
+    print(f"Cycles:            {report['cycles']} ({report['cycle_errors']} errors)")
+    print(
+        f"Cycle time:        p50 {cycle_ms['p50']:.1f} ms  p95 {cycle_ms['p95']:.1f} "
+        f"ms  max {cycle_ms['max']:.1f} ms"
+    )
+    print(f"Alerts:            {report['alerts']} ({report['alerts_per_min']}/min)")
+    memory = report["memory"]
+    print(f"Peak RSS:          {memory['peak_rss_mb']} MB")
+    if memory["tracemalloc_peak_mb"] is not None:
+        print(f"tracemalloc peak:  {memory['tracemalloc_peak_mb']} MB")
+    llm = report["llm"]
+    print(
+        f"Stub LLM:          {llm['requests']} requests, {llm['rate_limited']} "
+        f"429s, {llm['misses']} unrecorded prompts"
+    )
+    if report["blocked_network"]:
+        blocked = ", ".join(f"{h} x{n}" for h, n in report["blocked_network"].items())
+        print(f"Blocked network:   {blocked}")
+    print("-" * 78)
+    print(f"{'stage':<40} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9} {'spans':>8}")
+    for stage, row in sorted(report["stages"].items(), key=lambda kv: -kv[1]["p95_ms"]):
+        print(
+            f"{stage[:40]:<40} {row['p50_ms']:>9.1f} {row['p95_ms']:>9.1f} "
+            f"{row['max_ms']:>9.1f} {row['spans']:>8}"
+        )
+    print(f"\nReport written to {out}")
+    return 0
+
+
+def cmd_compare(args) -> int:
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.current, "r", encoding="utf-8") as f:
+        current = json.load(f)
+
+    result = compare_reports(baseline, current, args.tolerance, args.min_delta_ms)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return 1 if result["regressions"] else 0
+
+    print(
+        f"\n{baseline.get('commit', args.baseline)} -> "
+        f"{current.get('commit', args.current)}"
+    )
+    print("=" * 78)
+    for metric, row in result["headline"].items():
+        change = row["change_pct"]
+        change_s = f"{change:+.1f}%" if change is not None else "n/a"
+        print(
+            f"{metric:<20} {row['baseline']!s:>12} -> {row['current']!s:>12}  {change_s}"
+        )
+    if result["regressions"]:
+        print("\nREGRESSIONS:")
+        for r in result["regressions"]:
+            print(
+                f"  {r['stage']} {r['metric']}: {r['baseline_ms']:.1f} -> "
+                f"{r['current_ms']:.1f} ms (x{r['ratio']})"
+            )
+    else:
+        print("\nNo stage regressions")
+    return 1 if result["regressions"] else 0
+
+
+def main():
+    """Run the cycle replay benchmark."""
+    parser = argparse.ArgumentParser(
+        description="End-to-end cycle benchmark over a recorded fixture bundle",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    replay = sub.add_parser("replay", help="Replay a bundle and write a report")
+    replay.add_argument("bundle", type=Path, help="Fixture bundle directory")
+    replay.add_argument("--cycles", type=int, help="Replay only the first N cycles")
+    replay.add_argument(
+        "--llm-latency-ms", type=float, default=0.0, help="Stub LLM base latency"
+    )
+    replay.add_argument(
+        "--llm-jitter-ms", type=float, default=0.0, help="Extra random latency"
+    )
+    replay.add_argument(
+        "--llm-429-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of stub LLM requests answered with 429",
+    )
+    replay.add_argument("--seed", type=int, default=0, help="Stub RNG seed")
+    replay.add_argument(
+        "--tracemalloc",
+        action="store_true",
+        help="Also report the Python heap peak (slows the replay down)",
+    )
+    replay.add_argument(
+        "--env",
+        action="append",
+        metavar="KEY=VALUE",
+        help="Extra environment override for the replay (repeatable)",
+    )
+    replay.add_argument("--out", type=Path, help="Report path")
+    replay.add_argument("--json", action="store_true", help="Print JSON output")
+
+    compare = sub.add_parser("compare", help="Compare two replay reports")
+    compare.add_argument("baseline", type=Path)
+    compare.add_argument("current", type=Path)
+    compare.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.5,
+        help="Fractional growth over baseline that counts as a regression",
+    )
+    compare.add_argument(
+        "--min-delta-ms",
+        type=float,
+        default=250.0,
+        help="Ignore regressions smaller than this many milliseconds",
+    )
+    compare.add_argument("--json", action="store_true", help="Print JSON output")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    if args.command == "replay":
+        return cmd_replay(args)
+    return cmd_compare(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+"""Latency/token comparison of the fused and staged SEC LLM chain.
+
+Runs ``llm_chain.run_llm_chain`` in both modes against a local stub
+provider, so no API keys or network are needed. The stub sleeps for a
+simulated round trip (fixed overhead plus per-token prompt/output cost)
+and returns canned JSON for each prompt type.
+
+Usage:
+    python scripts/benchmark_llm_chain.py [--filings N] [--overhead-ms 400]
+        [--ms-per-1k-input 40] [--ms-per-1k-output 900] [--invalid-rate 0.1]
+
+``--invalid-rate`` makes that fraction of fused responses carry an invalid
+sentiment section, exercising the per-stage re-ask path.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Add parent directory to path to import catalyst_bot modules
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from catalyst_bot import llm_chain  # noqa: E402
+from catalyst_bot.llm_usage_monitor import estimate_tokens  # noqa: E402
+
+SAMPLE_FILING = (
+    "FORM 8-K CURRENT REPORT. Item 1.01 Entry into a Material Definitive "
+    "Agreement. On March 3, 2025, Acme Therapeutics, Inc. (NASDAQ: ACME) "
+    "entered into an asset purchase agreement with Beta Bio Holdings LLC to "
+    "acquire its late-stage oncology program for $150 million in cash and "
+    "2.5 million shares of common stock, subject to customary closing "
+    "conditions. Item 7.01 Regulation FD Disclosure. The company also "
+    "reaffirmed full-year revenue guidance of $210-$225 million. "
+) * 8
+
+EXTRACTION = {
+    "key_facts": [
+        "Acme agreed to acquire Beta Bio's oncology program",
+        "Consideration is $150M cash plus 2.5M shares",
+        "Full-year revenue guidance of $210-225M reaffirmed",
+    ],
+    "parties": ["Acme Therapeutics, Inc.", "Beta Bio Holdings LLC"],
+    "dates": ["March 3, 2025"],
+    "dollar_amounts": ["$150M", "$210-225M"],
+}
+SUMMARY = (
+    "Acme Therapeutics (8-K) agreed to buy Beta Bio's late-stage oncology "
+    "program for $150 million in cash plus 2.5 million shares, adding a "
+    "near-term pipeline asset while reaffirming revenue guidance of "
+    "$210-225 million. The deal expands Acme's oncology franchise; the share "
+    "component is modest dilution. Expect a positive reaction."
+)
+KEYWORDS = {"keywords": ["acquisition", "deal"]}
+SENTIMENT = {
+    "score": 0.6,
+    "justification": "Accretive pipeline acquisition with reaffirmed guidance.",
+    "confidence": 0.8,
+}
+
+
+class StubProvider:
+    """Async stand-in for ``query_hybrid_llm`` with simulated latency."""
+
+    def __init__(
+        self,
+        overhead_ms: float,
+        ms_per_1k_input: float,
+        ms_per_1k_output: float,
+        invalid_rate: float,
+        seed: int = 7,
+    ):
+        self.overhead_ms = overhead_ms
+        self.ms_per_1k_input = ms_per_1k_input
+        self.ms_per_1k_output = ms_per_1k_output
+        self.invalid_rate = invalid_rate
+        self.rng = random.Random(seed)
+        self.reset()
+
+    def reset(self) -> None:
+        self.calls = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+
+    def _respond(self, prompt: str) -> str:
+        if prompt.startswith("You are analyzing an SEC filing for traders."):
+            sentiment = dict(SENTIMENT)
+            if self.rng.random() < self.invalid_rate:
+                sentiment["score"] = "very bullish"  # fails FilingSentiment
+            return json.dumps(
+                {
+                    "extraction": EXTRACTION,
+                    "summary": SUMMARY,
+                    "keywords": KEYWORDS["keywords"],
+                    "sentiment": sentiment,
+                }
+            )
+        if prompt.startswith("You are analyzing an SEC filing."):
+            return json.dumps(EXTRACTION)
+        if prompt.startswith("You are creating a brief summary"):
+            return SUMMARY
+        if prompt.startswith("You are tagging"):
+            return json.dumps(KEYWORDS)
+        return json.dumps(SENTIMENT)
+
+    async def __call__(self, prompt: str, **kwargs: Any) -> str:
+        response = self._respond(prompt)
+        input_tokens = estimate_tokens(prompt)
+        output_tokens = estimate_tokens(response)
+        self.calls += 1
+        self.input_tokens += input_tokens
+        self.output_tokens += output_tokens
+        await asyncio.sleep(
+            (
+                self.overhead_ms
+                + input_tokens / 1000 * self.ms_per_1k_input
+                + output_tokens / 1000 * self.ms_per_1k_output
+            )
+            / 1000
+        )
+        return response
+
+
+async def run_mode(stub: StubProvider, mode: str, filings: int) -> Dict[str, Any]:
+    """Run ``filings`` analyses sequentially in one mode."""
+    stub.reset()
+    latencies: List[float] = []
+    for _ in range(filings):
+        start = time.perf_counter()
+        await llm_chain.run_llm_chain(SAMPLE_FILING, max_retries=2, mode=mode)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    return {
+        "mode": mode,
+        "filings": filings,
+        "mean_ms": statistics.mean(latencies),
+        "p95_ms": sorted(latencies)[int(len(latencies) * 0.95)],
+        "llm_calls_per_filing": stub.calls / filings,
+        "input_tokens_per_filing": stub.input_tokens / filings,
+        "output_tokens_per_filing": stub.output_tokens / filings,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark fused vs staged LLM chain")
+    parser.add_argument("--filings", type=int, default=20)
+    parser.add_argument("--overhead-ms", type=float, default=400.0)
+    parser.add_argument("--ms-per-1k-input", type=float, default=40.0)
+    parser.add_argument("--ms-per-1k-output", type=float, default=900.0)
+    parser.add_argument("--invalid-rate", type=float, default=0.1)
+    args = parser.parse_args()
+
+    if llm_chain.FilingExtraction is None:
+        print("Fused mode needs pydantic (llm_schemas); install it first.")
+        return 1
+
+    stub = StubProvider(
+        args.overhead_ms,
+        args.ms_per_1k_input,
+        args.ms_per_1k_output,
+        args.invalid_rate,
+    )
+    llm_chain.query_hybrid_llm = stub
+
+    results = [
+        asyncio.run(run_mode(stub, mode, args.filings)) for mode in ("chain", "fused")
+    ]
+
+    print(
+        f"{'mode':<8}{'mean_ms':>10}{'p95_ms':>10}{'calls':>8}"
+        f"{'in_tok':>10}{'out_tok':>10}"
+    )
+    for r in results:
+        print(
+            f"{r['mode']:<8}{r['mean_ms']:>10.0f}{r['p95_ms']:>10.0f}"
+            f"{r['llm_calls_per_filing']:>8.2f}"
+            f"{r['input_tokens_per_filing']:>10.0f}"
+            f"{r['output_tokens_per_filing']:>10.0f}"
+        )
+
+    chain, fused = results
+    print(
+        f"\nfused vs chain: latency x{chain['mean_ms'] / fused['mean_ms']:.2f} faster, "
+        f"input tokens {fused['input_tokens_per_filing'] / chain['input_tokens_per_filing']:.0%}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Cycle Profile Report
+====================
+
+Summarize a day of per-cycle trace records (written by the runner when
+FEATURE_CYCLE_PROFILER=1) into per-stage p50/p95 timings and flag stages
+that regressed against a stored baseline.
+
+Usage:
+    python scripts/cycle_profile_report.py                     # Today (UTC)
+    python scripts/cycle_profile_report.py --date 2025-12-09
+    python scripts/cycle_profile_report.py --save-baseline     # Store today as baseline
+    python scripts/cycle_profile_report.py --collapsed out.folded
+        # Span self-times in collapsed-stack format (flamegraph.pl / speedscope)
+
+Exit status is 1 when any stage regressed, so the report can run from cron
+or CI.
+"""
+
+import argparse
+import json
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from catalyst_bot.cycle_profiler import (  # noqa: E402
+    find_regressions,
+    load_traces,
+    summarize_traces,
+    trace_dir,
+    traces_to_collapsed,
+)
+
+DEFAULT_BASELINE = Path("data/cycle_profile_baseline.json")
+
+
+def main():
+    """Run the cycle profile report."""
+    parser = argparse.ArgumentParser(
+        description="Per-stage cycle timings and regression check",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "--date",
+        type=str,
+        default=datetime.now(timezone.utc).strftime("%Y-%m-%d"),
+        help="Trace day to summarize (YYYY-MM-DD, default: today UTC)",
+    )
+    parser.add_argument(
+        "--trace-dir",
+        type=Path,
+        default=None,
+        help="Directory holding YYYY-MM-DD.jsonl traces (default: CYCLE_TRACE_DIR)",
+    )
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=DEFAULT_BASELINE,
+        help=f"Baseline file (default: {DEFAULT_BASELINE})",
+    )
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Store this day's summary as the new baseline",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.5,
+        help="Fractional growth over baseline that counts as a regression",
+    )
+    parser.add_argument(
+        "--min-delta-ms",
+        type=float,
+        default=250.0,
+        help="Ignore regressions smaller than this many milliseconds",
+    )
+    parser.add_argument(
+        "--collapsed",
+        type=Path,
+        help="Write span self-times as collapsed stacks to this file",
+    )
+    parser.add_argument("--json", action="store_true", help="Print JSON output")
+
+    args = parser.parse_args()
+
+    directory = args.trace_dir or trace_dir()
+    records = load_traces(directory / f"{args.date}.jsonl")
+    if not records:
+        print(f"No cycle traces for {args.date} in {directory}")
+        return 0
+
+    summary = summarize_traces(records)
+
+    if args.collapsed:
+        collapsed = traces_to_collapsed(records)
+        with open(args.collapsed, "w", encoding="utf-8") as f:
+            for stack, weight in sorted(collapsed.items()):
+                f.write(f"{stack} {weight}\n")
+
+    baseline = {}
+    if args.baseline.exists():
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f).get("stages", {})
+    regressions = (
+        find_regressions(summary, baseline, args.tolerance, args.min_delta_ms)
+        if baseline
+        else []
+    )
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "created_at": datetime.now(timezone.utc).isoformat(),
+                    "source_date": args.date,
+                    "stages": summary,
+                },
+                f,
+                indent=2,
+            )
+
+    if args.json:
+        print(json.dumps({"stages": summary, "regressions": regressions}, indent=2))
+        return 1 if regressions else 0
+
+    print(f"\nCycle profile for {args.date} ({len(records)} cycles)")
+    print("=" * 78)
+    print(f"{'stage':<40} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9} {'spans':>8}")
+    print("-" * 78)
+    for stage, row in sorted(summary.items(), key=lambda kv: -kv[1]["p95_ms"]):
+        print(
+            f"{stage[:40]:<40} {row['p50_ms']:>9.1f} {row['p95_ms']:>9.1f} "
+            f"{row['max_ms']:>9.1f} {row['spans']:>8}"
+        )
+
+    if not baseline:
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline to create")
+    elif regressions:
+        print(f"\nREGRESSIONS vs baseline {args.baseline}:")
+        for r in regressions:
+            print(
+                f"  {r['stage']} {r['metric']}: {r['baseline_ms']:.1f} -> "
+                f"{r['current_ms']:.1f} ms (x{r['ratio']})"
+            )
+    else:
+        print("\nNo stage regressions against baseline")
+
+    if args.save_baseline:
+        print(f"Baseline saved to {args.baseline}")
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -28,12 +28,9 @@ load_dotenv(env_path)
 
 from flask import Flask, jsonify, request  # noqa: E402
 
-from catalyst_bot.discord_interactions import (  # noqa: E402
-    handle_interaction,
-    verify_discord_signature,
-)
+from catalyst_bot.discord_interactions import verify_discord_signature  # noqa: E402
+from catalyst_bot.interaction_service import get_interaction_service  # noqa: E402
 from catalyst_bot.logging_utils import get_logger  # noqa: E402
-from catalyst_bot.slash_commands import handle_slash_command  # noqa: E402
 
 app = Flask(__name__)
 log = get_logger("interaction_server")
@@ -85,21 +82,11 @@ def discord_interactions():
             print("[DEBUG] Responding to PING with type=1")
             return jsonify({"type": 1}), 200
 
-        # Handle APPLICATION_COMMAND (slash commands)
-        if interaction_type == 2:
-            log.info("handling_slash_command")
-            print("[DEBUG] Handling slash command")
-            response = handle_slash_command(interaction_data)
-            if response:
-                return jsonify(response), 200
-            else:
-                return "", 204
-
-        # Handle MESSAGE_COMPONENT (button clicks)
-        if interaction_type == 3:
-            log.info("handling_button_interaction")
-            print("[DEBUG] Handling button interaction")
-            response = handle_interaction(interaction_data)
+        # Slash commands and button clicks: ACK immediately (deferred when
+        # slow) and finish on the interaction service's worker pools
+        if interaction_type in (2, 3):
+            log.info("handling_interaction type=%s", interaction_type)
+            response = get_interaction_service().handle(interaction_data)
             if response:
                 return jsonify(response), 200
             else:
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Quote Replay Server
+===================
+
+Play recorded market-data ticks over a local websocket that speaks the
+Alpaca v2 stream protocol, so the streaming quote cache can run offline.
+
+Record ticks from a live session with QUOTE_STREAM_RECORD_PATH, then:
+
+Usage:
+    python scripts/quote_replay_server.py data/quote_ticks.jsonl
+    python scripts/quote_replay_server.py ticks.jsonl --port 8765 --speed 10 --loop
+
+and point the bot at it:
+
+    FEATURE_QUOTE_STREAM=1
+    QUOTE_STREAM_PROVIDER=alpaca
+    QUOTE_STREAM_URL=ws://127.0.0.1:8765
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from catalyst_bot.quote_stream import QuoteReplayServer  # noqa: E402
+
+
+def main():
+    """Run the replay server until interrupted."""
+    parser = argparse.ArgumentParser(
+        description="Replay recorded ticks over a local Alpaca-style websocket",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("ticks", type=Path, help="JSONL file of recorded ticks")
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address")
+    parser.add_argument("--port", type=int, default=8765, help="Bind port")
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="Playback speed vs recorded timestamps (0 = as fast as possible)",
+    )
+    parser.add_argument(
+        "--loop", action="store_true", help="Restart playback when the file ends"
+    )
+    args = parser.parse_args()
+
+    server = QuoteReplayServer(
+        str(args.ticks),
+        host=args.host,
+        port=args.port,
+        speed=args.speed,
+        loop_forever=args.loop,
+    )
+    print(f"Replaying {len(server.ticks)} ticks on ws://{args.host}:{args.port}")
+    try:
+        asyncio.run(server.serve())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -21,15 +21,23 @@ Updated: 2025-10-14 (Added price filtering and negative keyword tracking)
 """
 
 import json
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+from .ngram_store import CLASS_ACCEPTED, record_logged_title
+from .partitioned_jsonl import PartitionedJsonlLog, get_log, has_records
+
 # Price range filter: only log items within this range (matches rejected_items_logger)
 PRICE_FLOOR = 0.10
 PRICE_CEILING = 10.00
 
 
+def _item_log() -> PartitionedJsonlLog:
+    """Buffered, day-partitioned log under data/accepted_items/."""
+    return get_log(Path("data/accepted_items.jsonl"), ("source",))
+
+
 def should_log_accepted_item(price: Optional[float]) -> bool:
     """
     Determine if an accepted item should be logged based on price range.
@@ -58,7 +66,10 @@ def log_accepted_item(
     scored: Optional[Any] = None,
 ) -> None:
     """
-    Log an accepted item to data/accepted_items.jsonl.
+    Log an accepted item to data/accepted_items/<day>.jsonl.
+
+    Records are buffered and written once per cycle (or when the buffer
+    fills); see partitioned_jsonl.
 
     This allows MOA to track which keywords appear in GOOD alerts (true positives)
     vs BAD alerts (false positives), preventing false positive keywords from being added.
@@ -152,13 +163,11 @@ def log_accepted_item(
             # Silently ignore regime extraction errors
             pass
 
-    # Write to JSONL file
-    log_path = Path("data/accepted_items.jsonl")
-    log_path.parent.mkdir(parents=True, exist_ok=True)
-
+    # Buffer into the day-partitioned log (flushed once per cycle)
     try:
-        with open(log_path, "a", encoding="utf-8") as f:
-            f.write(json.dumps(accepted_item, ensure_ascii=False) + "\n")
+        _item_log().append(accepted_item)
+        # Keep the MOA keyword-mining n-gram tables current
+        record_logged_title(CLASS_ACCEPTED, accepted_item["title"], accepted_item["ts"])
     except Exception:
         # Silently fail - don't crash the bot if logging fails
         pass
@@ -168,35 +177,25 @@ def get_accepted_stats() -> Dict[str, int]:
     """
     Get statistics about accepted items logged today.
 
+    Reads the day's summary sidecar (plus unflushed records and any of today's
+    lines in the legacy flat file) instead of rescanning the log.
+
     Returns:
         Dict with counts by source and total count
     """
-    log_path = Path("data/accepted_items.jsonl")
-
-    if not log_path.exists():
+    item_log = _item_log()
+    if not has_records(item_log.legacy_path) and not item_log.pending():
         return {}
 
-    today = datetime.now(timezone.utc).date().isoformat()
-    stats: Dict[str, int] = {"total": 0}
-
     try:
-        with open(log_path, "r", encoding="utf-8") as f:
-            for line in f:
-                try:
-                    item = json.loads(line.strip())
-                    ts = item.get("ts", "")
-
-                    # Only count today's items
-                    if ts.startswith(today):
-                        stats["total"] += 1
-                        source = item.get("source", "unknown")
-                        source_key = f"source_{source}"
-                        stats[source_key] = stats.get(source_key, 0) + 1
-                except Exception:
-                    continue
+        summary = item_log.day_summary()
     except Exception:
         return {}
 
+    stats: Dict[str, int] = {"total": summary.get("count", 0)}
+    for source, count in summary.get("source", {}).items():
+        source_key = f"source_{source or 'unknown'}"
+        stats[source_key] = stats.get(source_key, 0) + count
     return stats
 
 
@@ -204,20 +203,29 @@ def clear_old_accepted_items(days_to_keep: int = 30) -> int:
     """
     Remove accepted items older than specified days.
 
+    Day partitions older than the cutoff are deleted whole; the legacy flat
+    file, if present, is filtered line by line.
+
     Args:
         days_to_keep: Number of days to retain (default 30)
 
     Returns:
         Number of items removed
     """
-    log_path = Path("data/accepted_items.jsonl")
+    cutoff_dt = datetime.now(timezone.utc) - timedelta(days=days_to_keep)
+    item_log = _item_log()
+    try:
+        removed_count = item_log.drop_days_before(cutoff_dt.date())
+    except Exception:
+        removed_count = 0
 
+    log_path = item_log.legacy_path
     if not log_path.exists():
-        return 0
+        return removed_count
 
-    cutoff = datetime.now(timezone.utc).timestamp() - (days_to_keep * 86400)
+    cutoff = cutoff_dt.timestamp()
     kept_items = []
-    removed_count = 0
+    legacy_removed = 0
 
     try:
         with open(log_path, "r", encoding="utf-8") as f:
@@ -232,19 +240,19 @@ def clear_old_accepted_items(days_to_keep: int = 30) -> int:
                     if ts.timestamp() >= cutoff:
                         kept_items.append(line)
                     else:
-                        removed_count += 1
+                        legacy_removed += 1
                 except Exception:
                     # Keep items we can't parse
                     kept_items.append(line)
 
         # Rewrite file with kept items
-        if removed_count > 0:
+        if legacy_removed > 0:
             with open(log_path, "w", encoding="utf-8") as f:
                 f.writelines(kept_items)
     except Exception:
-        return 0
+        return removed_count
 
-    return removed_count
+    return removed_count + legacy_removed
 
 
 # ============================================================================
@@ -305,7 +313,7 @@ DATAFLOW:
 1. Item passes all filters in classify.py (score > threshold, sentiment > threshold)
 2. runner.py sends alert to Discord via send_alert_safe()
 3. Alert succeeds (ok=True)
-4. log_accepted_item() writes to data/accepted_items.jsonl
+4. log_accepted_item() writes to data/accepted_items/<day>.jsonl
 5. MOA analyzer compares accepted_items vs rejected_items to find optimal keywords
 
 PRICE FILTERING:
@@ -16,6 +16,7 @@ from typing import Callable, Dict, List, Optional, Tuple
 
 import pandas as pd
 
+from ..bar_store import get_bar_store
 from ..logging_utils import get_logger
 from .analytics import (
     analyze_catalyst_performance,
@@ -184,6 +185,9 @@ class BacktestEngine:
         # LRU cache to reduce API calls and prevent OOM in long backtests
         self.price_cache = LRUCache(max_size=50)
 
+        # Shared on-disk bar store (persists across runs and consumers)
+        self.bar_store = get_bar_store()
+
         log.info(
             "backtest_engine_initialized start=%s end=%s capital=%.2f params=%s",
             start_date,
@@ -367,8 +371,8 @@ class BacktestEngine:
         """
         Load historical price data for ticker.
 
-        Uses yfinance for simplicity. In production, you might use Tiingo or
-        cached data.
+        Reads 15-minute bars from the shared bar store; only spans the store
+        has not seen yet are downloaded (via yfinance).
 
         Parameters
         ----------
@@ -395,18 +399,26 @@ class BacktestEngine:
         if cached_data is not None:
             return cached_data
 
-        try:
+        def _download(symbol: str, span_start: datetime, span_end: datetime):
             import yfinance as yf
 
-            # Download data
-            df = yf.download(
-                ticker,
-                start=start.strftime("%Y-%m-%d"),
-                end=end.strftime("%Y-%m-%d"),
+            return yf.download(
+                symbol,
+                start=span_start.strftime("%Y-%m-%d"),
+                end=(span_end + timedelta(days=1)).strftime("%Y-%m-%d"),
                 interval="15m",  # 15-minute data for more granular intraday tracking
                 progress=False,
             )
 
+        try:
+            range_start = datetime(
+                start.year, start.month, start.day, tzinfo=timezone.utc
+            )
+            range_end = datetime(end.year, end.month, end.day, tzinfo=timezone.utc)
+            df = self.bar_store.get_bars(
+                ticker, "15m", range_start, range_end, fetcher=_download
+            )
+
             if df.empty:
                 log.warning(
                     "no_price_data ticker=%s start=%s end=%s",
@@ -0,0 +1,648 @@
+"""
+Local Bar Store
+===============
+
+Shared on-disk store for historical OHLCV bars.
+
+Replaces the per-consumer price caches (bootstrapper pickles, RVOL per-day
+pickles, simulation ``prices_{date}_{ticker}.json`` files, backtest
+in-memory frames) with one columnar layout that every consumer reads from.
+
+Layout::
+
+    data/bars/
+        1d/
+            AAPL/
+                bars.bin        # append-only fixed-width records (BAR_DTYPE)
+                manifest.json   # covered [start, end) ranges + row count
+        15m/
+            AAPL/...
+
+Features:
+- One file per (ticker, interval), records sorted by timestamp
+- Range reads via ``np.memmap`` + binary search (no full-file loads)
+- Manifest of covered ranges, so empty spans (weekends, halts) are not
+  refetched
+- Gap detection: ``get_bars`` only calls the fetcher for missing spans
+- Bars that are still forming (today's daily bar, the current intraday
+  bar) are stored but never marked as covered, so they are refreshed
+
+Crash safety: bars are appended before the manifest is rewritten (atomic
+``os.replace``). A crash between the two leaves extra rows that are simply
+refetched and deduplicated; a torn trailing record is ignored on read.
+
+Several processes may share one store (the runner, the bootstrapper's
+shard workers, the sharded runner's workers). Writes to a series take an
+exclusive lock on its ``.lock`` file and re-read the manifest and bar file
+under it, rewrites go through a temp file unique to the writer, and cached
+manifests are reloaded whenever the file on disk has changed.
+
+Usage:
+    from catalyst_bot.bar_store import get_bar_store
+
+    store = get_bar_store()
+    df = store.get_bars("AAPL", "1d", start, end, fetcher=my_fetcher)
+
+Environment Variables:
+    BAR_STORE_DIR: Root directory for the store (default: data/bars)
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .logging_utils import get_logger
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+    import msvcrt
+
+log = get_logger("bar_store")
+
+# Fixed-width record layout for bars.bin (timestamps are UTC epoch seconds)
+BAR_DTYPE = np.dtype(
+    [
+        ("ts", "<i8"),
+        ("open", "<f8"),
+        ("high", "<f8"),
+        ("low", "<f8"),
+        ("close", "<f8"),
+        ("volume", "<f8"),
+    ]
+)
+
+# Supported intervals -> bar duration in seconds
+INTERVAL_SECONDS = {
+    "1m": 60,
+    "5m": 300,
+    "15m": 900,
+    "30m": 1800,
+    "1h": 3600,
+    "1d": 86400,
+}
+
+MANIFEST_VERSION = 1
+
+# Providers (notably yfinance) return empty frames on errors, so an empty
+# fetch only marks a span as covered when it is short enough to be a
+# weekend/holiday/overnight gap.
+EMPTY_SPAN_TRUST_SECONDS = 4 * 86400
+
+# Column name aliases accepted from providers (yfinance, Tiingo, Finnhub, JSON)
+_FIELD_ALIASES = {
+    "open": ("open", "o"),
+    "high": ("high", "h"),
+    "low": ("low", "l"),
+    "close": ("close", "c"),
+    "volume": ("volume", "v"),
+}
+_TS_KEYS = ("timestamp", "ts", "date", "datetime", "t", "time")
+
+_SAFE_TICKER_RE = re.compile(r"[^A-Z0-9.\-^=]")
+
+Fetcher = Callable[[str, datetime, datetime], Any]
+Range = Tuple[int, int]
+
+
+def _to_epoch(value: Any) -> int:
+    """Convert a datetime/Timestamp/ISO string/epoch number to epoch seconds."""
+    if isinstance(value, (int, np.integer)):
+        # Treat millisecond epochs (Polygon/Alpaca style) transparently
+        return int(value) // 1000 if value > 10**11 else int(value)
+    if isinstance(value, float):
+        return int(value) // 1000 if value > 10**11 else int(value)
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is None:
+        ts = ts.tz_localize("UTC")
+    return int(ts.timestamp())
+
+
+def _from_epoch(epoch: int) -> datetime:
+    return datetime.fromtimestamp(epoch, tz=timezone.utc)
+
+
+def _merge_ranges(ranges: Iterable[Range]) -> List[Range]:
+    """Union a collection of half-open [start, end) ranges."""
+    merged: List[List[int]] = []
+    for start, end in sorted(r for r in ranges if r[1] > r[0]):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [(s, e) for s, e in merged]
+
+
+def _subtract_ranges(start: int, end: int, covered: List[Range]) -> List[Range]:
+    """Return the parts of [start, end) not covered by ``covered`` (merged)."""
+    gaps: List[Range] = []
+    cursor = start
+    for c_start, c_end in covered:
+        if c_end <= cursor:
+            continue
+        if c_start >= end:
+            break
+        if c_start > cursor:
+            gaps.append((cursor, min(c_start, end)))
+        cursor = max(cursor, c_end)
+        if cursor >= end:
+            break
+    if cursor < end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+def completed_until(interval: str, now: Optional[datetime] = None) -> int:
+    """
+    Epoch second before which bars for ``interval`` are final.
+
+    Intraday bars are final once their period has elapsed. Daily bars are
+    treated as final only for previous UTC days, so today's partial bar is
+    always refetched.
+    """
+    now_ts = int((now or datetime.now(timezone.utc)).timestamp())
+    step = INTERVAL_SECONDS[interval]
+    return (now_ts // step) * step
+
+
+def bars_to_records(bars: Any) -> np.ndarray:
+    """
+    Normalize provider output into a sorted, de-duplicated BAR_DTYPE array.
+
+    Accepts a pandas DataFrame (yfinance/Tiingo style, DatetimeIndex or a
+    date/timestamp column, any column case, MultiIndex columns from
+    single-ticker ``yf.download``) or a list of bar dicts.
+    """
+    if bars is None:
+        return np.empty(0, dtype=BAR_DTYPE)
+    if isinstance(bars, np.ndarray) and bars.dtype == BAR_DTYPE:
+        return _sort_dedupe(bars)
+
+    if isinstance(bars, pd.DataFrame):
+        df = bars
+        if df.empty:
+            return np.empty(0, dtype=BAR_DTYPE)
+        if isinstance(df.columns, pd.MultiIndex):
+            df = df.copy()
+            df.columns = df.columns.get_level_values(0)
+        lower = {str(c).lower(): c for c in df.columns}
+
+        ts_col = next((lower[k] for k in _TS_KEYS if k in lower), None)
+        if ts_col is not None:
+            index = pd.to_datetime(df[ts_col], utc=True)
+        else:
+            index = pd.DatetimeIndex(df.index)
+            index = (
+                index.tz_localize("UTC")
+                if index.tz is None
+                else index.tz_convert("UTC")
+            )
+
+        out = np.empty(len(df), dtype=BAR_DTYPE)
+        out["ts"] = np.asarray(index.asi8, dtype=np.int64) // 10**9
+        for field, aliases in _FIELD_ALIASES.items():
+            col = next((lower[a] for a in aliases if a in lower), None)
+            if col is None:
+                out[field] = np.nan
+            else:
+                out[field] = pd.to_numeric(df[col], errors="coerce").to_numpy(
+                    dtype=np.float64, na_value=np.nan
+                )
+    else:
+        rows = list(bars)
+        out = np.empty(len(rows), dtype=BAR_DTYPE)
+        keep = np.ones(len(rows), dtype=bool)
+        for i, row in enumerate(rows):
+            ts_val = next((row[k] for k in _TS_KEYS if row.get(k) is not None), None)
+            if ts_val is None:
+                keep[i] = False
+                continue
+            out["ts"][i] = _to_epoch(ts_val)
+            for field, aliases in _FIELD_ALIASES.items():
+                val = next((row[a] for a in aliases if row.get(a) is not None), None)
+                try:
+                    out[field][i] = float(val) if val is not None else np.nan
+                except (TypeError, ValueError):
+                    out[field][i] = np.nan
+        out = out[keep]
+
+    return _sort_dedupe(out)
+
+
+def _sort_dedupe(records: np.ndarray) -> np.ndarray:
+    """Sort by timestamp, keeping the last record for duplicate timestamps."""
+    if len(records) < 2:
+        return records
+    order = np.argsort(records["ts"], kind="stable")
+    records = records[order]
+    # Keep last occurrence of each ts (later writes win)
+    last = np.ones(len(records), dtype=bool)
+    last[:-1] = records["ts"][1:] != records["ts"][:-1]
+    return records[last]
+
+
+def _floor_sessions(records: np.ndarray, interval: str) -> np.ndarray:
+    """
+    Stamp daily bars at 00:00 UTC of their session date.
+
+    Providers label the same session differently (Tiingo/Finnhub at 00:00Z,
+    yfinance at midnight New York time, i.e. 04:00/05:00Z), so without this
+    a fallback or mixed-source write would store two rows for one day.
+    """
+    if INTERVAL_SECONDS.get(interval, 0) < 86400 or not len(records):
+        return records
+    records = records.copy()
+    records["ts"] -= records["ts"] % 86400
+    return _sort_dedupe(records)
+
+
+@contextmanager
+def _file_lock(path: Path) -> Iterator[None]:
+    """Hold an exclusive inter-process lock on ``path`` (created if missing)."""
+    with open(path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:  # pragma: no cover - Windows
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:  # pragma: no cover - Windows
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _tmp_name(name: str) -> str:
+    """Temp file name unique to this writer (process and call)."""
+    return f"{name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp"
+
+
+def records_to_frame(records: np.ndarray) -> pd.DataFrame:
+    """Convert BAR_DTYPE records to a yfinance-style OHLCV DataFrame."""
+    index = pd.to_datetime(records["ts"], unit="s", utc=True)
+    return pd.DataFrame(
+        {
+            "Open": records["open"],
+            "High": records["high"],
+            "Low": records["low"],
+            "Close": records["close"],
+            "Volume": records["volume"],
+        },
+        index=index,
+    )
+
+
+class BarStore:
+    """Per-ticker, per-interval append-only bar files with a coverage manifest."""
+
+    def __init__(self, root: Optional[Path | str] = None):
+        """
+        Initialize the bar store.
+
+        Args:
+            root: Root directory (default: BAR_STORE_DIR env or data/bars)
+        """
+        self.root = Path(root or os.getenv("BAR_STORE_DIR", "data/bars"))
+        self._lock = threading.RLock()
+        # (ticker, interval) -> (manifest file signature, manifest)
+        self._manifests: Dict[Tuple[str, str], Tuple[Any, Dict[str, Any]]] = {}
+        self.stats = {
+            "reads": 0,
+            "rows_read": 0,
+            "rows_written": 0,
+            "appends": 0,
+            "rewrites": 0,
+            "fetches": 0,
+            "fetch_failures": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Paths and manifest
+    # ------------------------------------------------------------------
+
+    def _series_dir(self, ticker: str, interval: str) -> Path:
+        if interval not in INTERVAL_SECONDS:
+            raise ValueError(f"unsupported interval: {interval}")
+        safe = _SAFE_TICKER_RE.sub("_", ticker.strip().upper()) or "_"
+        path = self.root / interval / safe
+        # Path traversal protection (ticker comes from external feeds)
+        path.resolve().relative_to(self.root.resolve())
+        return path
+
+    @staticmethod
+    def _file_signature(path: Path) -> Optional[Tuple[int, int, int]]:
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def _load_manifest(self, ticker: str, interval: str) -> Dict[str, Any]:
+        key = (ticker.strip().upper(), interval)
+        path = self._series_dir(ticker, interval) / "manifest.json"
+        signature = self._file_signature(path)
+        cached = self._manifests.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        manifest = {"version": MANIFEST_VERSION, "ranges": [], "rows": 0}
+        if signature is not None:
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+                if isinstance(data, dict):
+                    manifest["ranges"] = _merge_ranges(
+                        (int(s), int(e)) for s, e in data.get("ranges", [])
+                    )
+                    manifest["rows"] = int(data.get("rows", 0))
+            except Exception as e:
+                log.warning(f"bar_manifest_corrupt path={path} err={e}")
+        self._manifests[key] = (signature, manifest)
+        return manifest
+
+    def _save_manifest(
+        self, ticker: str, interval: str, manifest: Dict[str, Any]
+    ) -> None:
+        series_dir = self._series_dir(ticker, interval)
+        series_dir.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "version": MANIFEST_VERSION,
+            "ticker": ticker.strip().upper(),
+            "interval": interval,
+            "rows": manifest["rows"],
+            "ranges": [list(r) for r in manifest["ranges"]],
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+        }
+        path = series_dir / "manifest.json"
+        tmp = series_dir / _tmp_name("manifest.json")
+        tmp.write_text(json.dumps(payload), encoding="utf-8")
+        os.replace(tmp, path)
+        self._manifests[(ticker.strip().upper(), interval)] = (
+            self._file_signature(path),
+            manifest,
+        )
+
+    @contextmanager
+    def _write_lock(self, ticker: str, interval: str) -> Iterator[Path]:
+        """Serialize writers to one series across threads and processes."""
+        series_dir = self._series_dir(ticker, interval)
+        with self._lock:
+            series_dir.mkdir(parents=True, exist_ok=True)
+            with _file_lock(series_dir / ".lock"):
+                yield series_dir
+
+    def _open_records(self, ticker: str, interval: str) -> np.ndarray:
+        """Memory-map the bar file (read-only); empty array if absent."""
+        path = self._series_dir(ticker, interval) / "bars.bin"
+        try:
+            rows = path.stat().st_size // BAR_DTYPE.itemsize
+        except FileNotFoundError:
+            return np.empty(0, dtype=BAR_DTYPE)
+        if rows == 0:
+            return np.empty(0, dtype=BAR_DTYPE)
+        return np.memmap(path, dtype=BAR_DTYPE, mode="r", shape=(rows,))
+
+    # ------------------------------------------------------------------
+    # Coverage
+    # ------------------------------------------------------------------
+
+    def covered_ranges(
+        self, ticker: str, interval: str
+    ) -> List[Tuple[datetime, datetime]]:
+        """Return the covered [start, end) ranges for a series."""
+        with self._lock:
+            manifest = self._load_manifest(ticker, interval)
+            return [(_from_epoch(s), _from_epoch(e)) for s, e in manifest["ranges"]]
+
+    def missing_ranges(
+        self, ticker: str, interval: str, start: datetime, end: datetime
+    ) -> List[Tuple[datetime, datetime]]:
+        """Return the sub-ranges of [start, end) that are not yet covered."""
+        s, e = _to_epoch(start), _to_epoch(end)
+        if e <= s:
+            return []
+        with self._lock:
+            manifest = self._load_manifest(ticker, interval)
+            gaps = _subtract_ranges(s, e, manifest["ranges"])
+        return [(_from_epoch(gs), _from_epoch(ge)) for gs, ge in gaps]
+
+    def mark_covered(
+        self, ticker: str, interval: str, start: datetime, end: datetime
+    ) -> None:
+        """Record [start, end) as covered (clipped to completed bars)."""
+        s = _to_epoch(start)
+        e = min(_to_epoch(end), completed_until(interval))
+        if e <= s:
+            return
+        with self._write_lock(ticker, interval):
+            manifest = self._load_manifest(ticker, interval)
+            manifest["ranges"] = _merge_ranges(manifest["ranges"] + [(s, e)])
+            self._save_manifest(ticker, interval, manifest)
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def write_bars(
+        self,
+        ticker: str,
+        interval: str,
+        bars: Any,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> int:
+        """
+        Store bars and optionally mark [start, end) as covered.
+
+        New bars strictly after the last stored timestamp are appended in
+        place; overlapping or earlier bars trigger a merge rewrite (later
+        values win for duplicate timestamps). Daily bars are keyed by
+        session date (00:00 UTC) whatever time the provider stamped.
+
+        Args:
+            ticker: Stock ticker
+            interval: Bar interval (see INTERVAL_SECONDS)
+            bars: DataFrame or list of bar dicts (see bars_to_records)
+            start: Start of the span the bars were fetched for
+            end: End of the span the bars were fetched for
+
+        Returns:
+            Number of records written
+        """
+        records = _floor_sessions(bars_to_records(bars), interval)
+
+        with self._write_lock(ticker, interval) as series_dir:
+            manifest = self._load_manifest(ticker, interval)
+
+            if len(records):
+                path = series_dir / "bars.bin"
+                existing = self._open_records(ticker, interval)
+
+                if not len(existing) or records["ts"][0] > existing["ts"][-1]:
+                    # Fast path: pure append (trim any torn trailing record)
+                    size = len(existing) * BAR_DTYPE.itemsize
+                    del existing
+                    with open(path, "ab") as f:
+                        f.truncate(size)
+                        f.write(records.tobytes())
+                    manifest["rows"] = size // BAR_DTYPE.itemsize + len(records)
+                    self.stats["appends"] += 1
+                else:
+                    # Also folds daily rows stored before timestamps were
+                    # floored; the new records still win
+                    stored = _floor_sessions(np.array(existing), interval)
+                    merged = _sort_dedupe(np.concatenate([stored, records]))
+                    del existing
+                    tmp = series_dir / _tmp_name("bars.bin")
+                    merged.tofile(tmp)
+                    os.replace(tmp, path)
+                    manifest["rows"] = len(merged)
+                    self.stats["rewrites"] += 1
+
+                self.stats["rows_written"] += len(records)
+
+            if start is not None and end is not None:
+                s = _to_epoch(start)
+                e = min(_to_epoch(end), completed_until(interval))
+                if e > s:
+                    manifest["ranges"] = _merge_ranges(manifest["ranges"] + [(s, e)])
+
+            if len(records) or (start is not None and end is not None):
+                self._save_manifest(ticker, interval, manifest)
+
+        return len(records)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def read_records(
+        self, ticker: str, interval: str, start: datetime, end: datetime
+    ) -> np.ndarray:
+        """Read raw BAR_DTYPE records in [start, end) without loading the file."""
+        s, e = _to_epoch(start), _to_epoch(end)
+        with self._lock:
+            mm = self._open_records(ticker, interval)
+            if not len(mm):
+                return np.empty(0, dtype=BAR_DTYPE)
+            ts = mm["ts"]
+            lo = int(np.searchsorted(ts, s, side="left"))
+            hi = int(np.searchsorted(ts, e, side="left"))
+            out = np.array(mm[lo:hi])
+            del mm
+        self.stats["reads"] += 1
+        self.stats["rows_read"] += len(out)
+        return out
+
+    def read_bars(
+        self, ticker: str, interval: str, start: datetime, end: datetime
+    ) -> pd.DataFrame:
+        """Read bars in [start, end) as an OHLCV DataFrame (UTC index)."""
+        return records_to_frame(self.read_records(ticker, interval, start, end))
+
+    def get_bars(
+        self,
+        ticker: str,
+        interval: str,
+        start: datetime,
+        end: datetime,
+        fetcher: Optional[Fetcher] = None,
+    ) -> pd.DataFrame:
+        """
+        Read bars in [start, end), fetching only the uncovered spans.
+
+        ``fetcher(ticker, span_start, span_end)`` must return a DataFrame or
+        list of bar dicts. Returning ``None`` or raising marks the fetch as
+        failed and the span stays uncovered so it is retried next time. An
+        empty result is recorded as covered only for short spans (see
+        EMPTY_SPAN_TRUST_SECONDS).
+        """
+        if fetcher is not None:
+            for gap_start, gap_end in self.missing_ranges(ticker, interval, start, end):
+                self.stats["fetches"] += 1
+                try:
+                    fetched = fetcher(ticker, gap_start, gap_end)
+                except Exception as e:
+                    log.debug(
+                        f"bar_fetch_failed ticker={ticker} interval={interval} "
+                        f"start={gap_start.isoformat()} err={e}"
+                    )
+                    fetched = None
+                if fetched is None:
+                    self.stats["fetch_failures"] += 1
+                    continue
+                records = bars_to_records(fetched)
+                span = (gap_end - gap_start).total_seconds()
+                if not len(records) and span > EMPTY_SPAN_TRUST_SECONDS:
+                    self.stats["fetch_failures"] += 1
+                    continue
+                self.write_bars(ticker, interval, records, gap_start, gap_end)
+
+        return self.read_bars(ticker, interval, start, end)
+
+    def get_close_at(
+        self,
+        ticker: str,
+        interval: str,
+        when: datetime,
+        lookback_bars: int = 5,
+    ) -> Optional[float]:
+        """
+        Close of the last stored bar at or before ``when``.
+
+        Only bars within ``lookback_bars`` intervals of ``when`` are
+        considered, so stale data is never returned for an uncached date.
+        """
+        step = INTERVAL_SECONDS[interval]
+        end_ts = _to_epoch(when) + 1
+        start_ts = end_ts - step * max(1, lookback_bars)
+        records = self.read_records(
+            ticker, interval, _from_epoch(start_ts), _from_epoch(end_ts)
+        )
+        closes = records["close"][~np.isnan(records["close"])]
+        if not len(closes):
+            return None
+        return float(closes[-1])
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return store I/O statistics."""
+        return dict(self.stats)
+
+
+# Global store instance (lazy)
+_store: Optional[BarStore] = None
+_store_lock = threading.Lock()
+
+
+def get_bar_store() -> BarStore:
+    """Return the process-wide BarStore (rooted at BAR_STORE_DIR)."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = BarStore()
+        return _store
+
+
+__all__ = [
+    "BAR_DTYPE",
+    "BarStore",
+    "INTERVAL_SECONDS",
+    "bars_to_records",
+    "completed_until",
+    "get_bar_store",
+    "records_to_frame",
+]
@@ -164,6 +164,38 @@ def register_alert_for_tracking(
         return alert_id
 
 
+def _build_outcome(
+    entry_price: float,
+    entry_volume: Optional[float],
+    price: float,
+    volume: Optional[float] = None,
+    observed_at: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Build the outcome JSON payload for one interval."""
+    price_change_pct = ((price - entry_price) / entry_price) * 100
+
+    volume_change_pct = None
+    if volume and entry_volume:
+        volume_change_pct = ((volume - entry_volume) / entry_volume) * 100
+
+    # Breakout confirmation: price up >3% with sustained/higher volume
+    breakout_confirmed = price_change_pct > 3.0
+    if volume_change_pct is not None:
+        breakout_confirmed = breakout_confirmed and volume_change_pct > -20
+
+    if observed_at is None:
+        observed_at = int(datetime.now(timezone.utc).timestamp())
+
+    return {
+        "price": price,
+        "price_change_pct": price_change_pct,
+        "volume": volume,
+        "volume_change_pct": volume_change_pct,
+        "timestamp": observed_at,
+        "breakout_confirmed": breakout_confirmed,
+    }
+
+
 def update_alert_outcome(
     alert_id: str,
     interval: str,
@@ -215,27 +247,11 @@ def update_alert_outcome(
 
         entry_price, entry_volume, entry_ts = row
 
-        # Calculate changes
-        price_change_pct = ((current_price - entry_price) / entry_price) * 100
-
-        volume_change_pct = None
-        if current_volume and entry_volume:
-            volume_change_pct = ((current_volume - entry_volume) / entry_volume) * 100
-
-        # Breakout confirmation: price up >3% with sustained/higher volume
-        breakout_confirmed = price_change_pct > 3.0
-        if volume_change_pct is not None:
-            breakout_confirmed = breakout_confirmed and volume_change_pct > -20
-
-        # Build outcome JSON
-        outcome = {
-            "price": current_price,
-            "price_change_pct": price_change_pct,
-            "volume": current_volume,
-            "volume_change_pct": volume_change_pct,
-            "timestamp": int(datetime.now(timezone.utc).timestamp()),
-            "breakout_confirmed": breakout_confirmed,
-        }
+        outcome = _build_outcome(
+            entry_price, entry_volume, current_price, current_volume
+        )
+        price_change_pct = outcome["price_change_pct"]
+        breakout_confirmed = outcome["breakout_confirmed"]
 
         outcome_json = json.dumps(outcome)
 
@@ -266,6 +282,89 @@ def update_alert_outcome(
         return False
 
 
+def update_alert_outcomes_batch(updates: List[Dict[str, Any]]) -> int:
+    """
+    Write many interval outcomes in a single transaction.
+
+    Parameters
+    ----------
+    updates : list of dict
+        Each with ``alert_id``, ``interval``, ``price`` and optionally
+        ``volume`` and ``observed_at`` (epoch seconds of the price)
+
+    Returns
+    -------
+    int
+        Number of outcomes written; 0 if the transaction was rolled back
+    """
+    if not updates:
+        return 0
+
+    try:
+        conn = connect(DB_PATH)
+        migrate_feedback_tables(conn)
+    except Exception as e:
+        log.error(f"outcome_batch_connect_failed err={e}")
+        return 0
+
+    try:
+        alert_ids = sorted({u["alert_id"] for u in updates})
+        placeholders = ",".join("?" for _ in alert_ids)
+        cursor = conn.execute(
+            f"""
+            SELECT alert_id, entry_price, entry_volume
+            FROM alert_outcomes
+            WHERE alert_id IN ({placeholders})
+            """,
+            alert_ids,
+        )
+        entries = {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
+
+        tracked_at = int(datetime.now(timezone.utc).timestamp())
+        written = 0
+
+        for update in updates:
+            alert_id = update["alert_id"]
+            interval = update["interval"]
+            if interval not in TRACKING_INTERVALS:
+                log.warning(f"invalid_interval interval={interval}")
+                continue
+            if alert_id not in entries:
+                log.warning(f"alert_not_found id={alert_id}")
+                continue
+
+            entry_price, entry_volume = entries[alert_id]
+            if not entry_price:
+                continue
+
+            outcome = _build_outcome(
+                entry_price,
+                entry_volume,
+                update["price"],
+                update.get("volume"),
+                update.get("observed_at"),
+            )
+            conn.execute(
+                f"""
+                UPDATE alert_outcomes
+                SET outcome_{interval} = ?, tracked_at = ?
+                WHERE alert_id = ?
+                """,
+                (json.dumps(outcome), tracked_at, alert_id),
+            )
+            written += 1
+
+        conn.commit()
+        return written
+
+    except Exception as e:
+        conn.rollback()
+        log.error(f"outcome_batch_update_failed count={len(updates)} err={e}")
+        return 0
+    finally:
+        conn.close()
+
+
 def get_pending_alerts(interval: str) -> List[Dict[str, Any]]:
     """
     Get alerts that need tracking for a specific interval.
@@ -352,41 +451,56 @@ def track_pending_outcomes() -> Dict[str, int]:
     Check and update outcomes for all pending alerts.
 
     This should be called periodically (e.g., every 5-10 minutes) to update
-    alert outcomes across all time intervals.
+    alert outcomes across all time intervals. Due (alert, interval) pairs
+    are resolved to the price at ``alert time + interval`` with one bar
+    fetch per unique ticker, and written in a single transaction.
 
     Returns
     -------
     dict
         Count of updates per interval
     """
-    from .market import get_last_price_change
+    from .feedback.outcome_scheduler import OutcomeScheduler, due_outcomes
 
     update_counts = {interval: 0 for interval in TRACKING_INTERVALS}
+    horizons = {k: minutes * 60 for k, minutes in TRACKING_INTERVALS.items()}
 
+    due = []
     for interval in TRACKING_INTERVALS.keys():
-        pending = get_pending_alerts(interval)
-
-        for alert in pending:
-            ticker = alert["ticker"]
-            alert_id = alert["alert_id"]
-
-            try:
-                # Get current price
-                price, _ = get_last_price_change(ticker)
+        for alert in get_pending_alerts(interval):
+            due.extend(
+                due_outcomes(
+                    alert["alert_id"],
+                    alert["ticker"],
+                    alert["timestamp"].timestamp(),
+                    horizons,
+                    [interval],
+                )
+            )
 
-                if price:
-                    # Volume tracking would require additional API call
-                    # Skip for now to reduce API usage
-                    success = update_alert_outcome(alert_id, interval, price)
+    if not due:
+        return update_counts
 
-                    if success:
-                        update_counts[interval] += 1
+    try:
+        resolved = OutcomeScheduler().resolve(due)
+    except Exception as e:
+        log.warning(f"outcome_tracking_failed due={len(due)} err={e}")
+        return update_counts
+
+    updates = [
+        {
+            "alert_id": r.due.key,
+            "interval": r.due.horizon,
+            "price": r.price,
+            "volume": r.volume,
+            "observed_at": int(r.price_ts),
+        }
+        for r in resolved
+    ]
 
-            except Exception as e:
-                log.warning(
-                    f"outcome_tracking_failed ticker={ticker} interval={interval} err={e}"
-                )
-                continue
+    if update_alert_outcomes_batch(updates):
+        for r in resolved:
+            update_counts[r.due.horizon] += 1
 
     total = sum(update_counts.values())
     if total > 0:
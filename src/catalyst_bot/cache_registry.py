@@ -0,0 +1,584 @@
+"""Central registry for module-level caches with budgets and leak diagnostics.
+
+Long-lived in-process caches (price snapshots, SEC filing history, insider
+sentiment, VWAP, chart paths, enrichment results) register here instead of
+being plain dicts that are cleared ad hoc.  Each cache carries an entry
+and/or byte budget and an eviction policy, so memory is bounded by
+configuration rather than by uptime.
+
+- ``BoundedCache``: a thread-safe ``MutableMapping`` with ``max_entries``,
+  optional ``max_bytes``, optional per-entry TTL and ``lru`` or ``fifo``
+  eviction.  It is a drop-in replacement for the dicts it replaces.
+- ``CacheRegistry``: holds every bounded cache plus size callbacks for
+  structures that are not mappings (e.g. the ML batch scorer queue), and
+  reports entries/bytes/evictions for the heartbeat and ``/metrics``.
+- ``maybe_snapshot_allocations()``: optional tracemalloc diagnostics that
+  record RSS and the top allocation-growth sites every N cycles.
+
+Byte sizes are estimates (``sys.getsizeof`` over a bounded object walk).
+Caches with a byte budget measure every entry on write; the others are
+sampled when a report is built.
+
+Environment
+-----------
+MEMORY_DIAGNOSTICS_EVERY_N_CYCLES : int
+    Take a tracemalloc snapshot every N cycles (default 0, disabled).
+    Tracing costs CPU and memory; enable it when chasing RSS growth.
+MEMORY_DIAGNOSTICS_TOP_N : int
+    Allocation sites recorded per snapshot (default 15).
+MEMORY_DIAGNOSTICS_FRAMES : int
+    Stack frames kept per allocation (default 1).
+MEMORY_DIAGNOSTICS_DIR : str
+    Directory for ``YYYY-MM-DD.jsonl`` snapshot records
+    (default ``data/logs/memory``).
+
+Usage
+-----
+    from catalyst_bot.cache_registry import bounded_cache
+
+    _VWAP_CACHE = bounded_cache("vwap", max_entries=500)
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from datetime import datetime, timezone
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+try:
+    from .logging_utils import get_logger
+except Exception:  # pragma: no cover - fallback for standalone use
+    import logging
+
+    def get_logger(_):
+        return logging.getLogger("cache_registry")
+
+
+log = get_logger("cache_registry")
+
+POLICIES = ("lru", "fifo")
+SIZE_SAMPLE = 32
+_MAX_WALK_DEPTH = 3
+_MAX_WALK_ITEMS = 64
+_ATOMIC = (str, bytes, bytearray, int, float, bool, type(None))
+
+
+def approx_size(obj: Any, _depth: int = 0) -> int:
+    """Estimate the memory held by ``obj`` in bytes.
+
+    Walks containers and instance ``__dict__`` up to a fixed depth and a
+    fixed number of children per container, so the cost is bounded even
+    for large values.  Shared references are counted once per path.
+    """
+    size = sys.getsizeof(obj, 64)
+    if _depth >= _MAX_WALK_DEPTH or isinstance(obj, _ATOMIC):
+        return size
+    if isinstance(obj, dict):
+        total = len(obj)
+        walked = list(islice(obj.items(), _MAX_WALK_ITEMS))
+        children = [part for pair in walked for part in pair]
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        total = len(obj)
+        walked = children = list(islice(obj, _MAX_WALK_ITEMS))
+    elif hasattr(obj, "__dict__"):
+        total = 1
+        walked = children = [vars(obj)]
+    else:
+        return size
+    child_bytes = sum(approx_size(c, _depth + 1) for c in children)
+    if walked and len(walked) < total:
+        # Extrapolate from the walked prefix
+        child_bytes = child_bytes * total / len(walked)
+    return size + int(child_bytes)
+
+
+class BoundedCache(MutableMapping):
+    """Thread-safe mapping with entry/byte budgets and LRU or FIFO eviction.
+
+    Parameters
+    ----------
+    name : str
+        Registry name, used in reports and log lines.
+    max_entries : int
+        Maximum number of keys (``0`` disables the entry budget).
+    max_bytes : int, optional
+        Maximum estimated bytes across all values.
+    policy : str
+        ``"lru"`` (reads refresh recency) or ``"fifo"`` (insertion order).
+    ttl_seconds : float, optional
+        Entries older than this read as missing and are dropped by
+        ``sweep()``.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int = 1000,
+        max_bytes: Optional[int] = None,
+        policy: str = "lru",
+        ttl_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if policy not in POLICIES:
+            raise ValueError(f"unknown eviction policy {policy!r}")
+        self.name = name
+        self.max_entries = int(max_entries)
+        self.max_bytes = int(max_bytes) if max_bytes else None
+        self.policy = policy
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.RLock()
+        # key -> (value, written_at, size_bytes)
+        self._data: "OrderedDict[Any, Tuple[Any, float, int]]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    # -- MutableMapping ----------------------------------------------------
+
+    def _expired(self, written_at: float) -> bool:
+        return (
+            self.ttl_seconds is not None
+            and self._clock() - written_at >= self.ttl_seconds
+        )
+
+    def _drop(self, key: Any) -> None:
+        _, _, size = self._data.pop(key)
+        self._bytes -= size
+
+    def __getitem__(self, key: Any) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                raise KeyError(key)
+            if self._expired(entry[1]):
+                self._drop(key)
+                self.expirations += 1
+                self.misses += 1
+                raise KeyError(key)
+            if self.policy == "lru":
+                self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        size = approx_size(value) if self.max_bytes else 0
+        with self._lock:
+            if key in self._data:
+                self._drop(key)
+            self._data[key] = (value, self._clock(), size)
+            self._bytes += size
+            self._enforce()
+
+    def __delitem__(self, key: Any) -> None:
+        with self._lock:
+            self._drop(key)
+
+    def __contains__(self, key: Any) -> bool:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return False
+            if self._expired(entry[1]):
+                self._drop(key)
+                self.expirations += 1
+                return False
+            return True
+
+    def __iter__(self) -> Iterator[Any]:
+        # Iterate over a snapshot so callers may mutate while looping
+        with self._lock:
+            return iter(list(self._data))
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    # Snapshot views: iterating must not refresh LRU order or count as hits
+    def items(self) -> List[Tuple[Any, Any]]:  # type: ignore[override]
+        with self._lock:
+            return [
+                (k, v) for k, (v, ts, _) in self._data.items() if not self._expired(ts)
+            ]
+
+    def values(self) -> List[Any]:  # type: ignore[override]
+        return [v for _, v in self.items()]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"BoundedCache({self.name!r}, entries={len(self._data)}, "
+            f"max_entries={self.max_entries}, policy={self.policy!r})"
+        )
+
+    # -- budgets -----------------------------------------------------------
+
+    def _enforce(self) -> None:
+        while self._data and (
+            (self.max_entries and len(self._data) > self.max_entries)
+            or (self.max_bytes and self._bytes > self.max_bytes)
+        ):
+            # Both policies evict from the front: LRU moves reads to the end
+            oldest = next(iter(self._data))
+            self._drop(oldest)
+            self.evictions += 1
+
+    def sweep(self) -> int:
+        """Drop expired entries; return how many were removed."""
+        if self.ttl_seconds is None:
+            return 0
+        with self._lock:
+            expired = [k for k, (_, ts, _) in self._data.items() if self._expired(ts)]
+            for key in expired:
+                self._drop(key)
+            self.expirations += len(expired)
+            return len(expired)
+
+    def estimated_bytes(self) -> int:
+        """Tracked bytes for byte-budgeted caches, otherwise a sampled estimate."""
+        with self._lock:
+            if self.max_bytes:
+                return self._bytes
+            count = len(self._data)
+            if not count:
+                return 0
+            step = max(1, count // SIZE_SAMPLE)
+            sample = [
+                entry[0] for i, entry in enumerate(self._data.values()) if i % step == 0
+            ][:SIZE_SAMPLE]
+        return int(sum(approx_size(v) for v in sample) / len(sample) * count)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._data),
+            "bytes": self.estimated_bytes(),
+            "max_entries": self.max_entries or None,
+            "max_bytes": self.max_bytes,
+            "policy": self.policy,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class CacheRegistry:
+    """Named caches plus size callbacks for structures that aren't mappings."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._caches: Dict[str, BoundedCache] = {}
+        self._external: Dict[str, Tuple[Callable[[], int], Optional[Callable]]] = {}
+
+    def register(self, cache: BoundedCache) -> BoundedCache:
+        """Track ``cache`` under its name (replacing an earlier instance)."""
+        with self._lock:
+            self._caches[cache.name] = cache
+        return cache
+
+    def register_external(
+        self,
+        name: str,
+        entries: Callable[[], int],
+        clear: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """Report an unmanaged structure's size; ``clear`` is used by ``clear_all``."""
+        with self._lock:
+            self._external[name] = (entries, clear)
+
+    def get(self, name: str) -> Optional[BoundedCache]:
+        return self._caches.get(name)
+
+    def sweep(self) -> int:
+        """Drop expired entries from every TTL cache."""
+        with self._lock:
+            caches = list(self._caches.values())
+        return sum(cache.sweep() for cache in caches)
+
+    def clear_all(self) -> None:
+        with self._lock:
+            caches = list(self._caches.values())
+            clears = [c for _, c in self._external.values() if c is not None]
+        for cache in caches:
+            cache.clear()
+        for clear in clears:
+            try:
+                clear()
+            except Exception:
+                pass
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        """Per-cache stats; external entries report ``entries`` only."""
+        with self._lock:
+            caches = dict(self._caches)
+            external = dict(self._external)
+        out = {name: cache.stats() for name, cache in caches.items()}
+        for name, (entries, _) in external.items():
+            try:
+                out[name] = {"entries": int(entries()), "bytes": None}
+            except Exception:
+                out[name] = {"entries": None, "bytes": None}
+        return out
+
+    def publish_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Copy sizes into ``cache_entries``/``cache_bytes`` gauges; return the report."""
+        report = self.report()
+        try:
+            from .metrics_registry import set_gauge
+
+            for name, row in report.items():
+                if row.get("entries") is not None:
+                    set_gauge("cache_entries", row["entries"], cache=name)
+                if row.get("bytes") is not None:
+                    set_gauge("cache_bytes", row["bytes"], cache=name)
+        except Exception:
+            pass
+        return report
+
+
+_registry: Optional[CacheRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_cache_registry() -> CacheRegistry:
+    """Process-wide cache registry."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = CacheRegistry()
+    return _registry
+
+
+def bounded_cache(
+    name: str,
+    max_entries: int = 1000,
+    max_bytes: Optional[int] = None,
+    policy: str = "lru",
+    ttl_seconds: Optional[float] = None,
+) -> BoundedCache:
+    """Create a ``BoundedCache`` and register it with the global registry."""
+    return get_cache_registry().register(
+        BoundedCache(
+            name,
+            max_entries=max_entries,
+            max_bytes=max_bytes,
+            policy=policy,
+            ttl_seconds=ttl_seconds,
+        )
+    )
+
+
+def format_cache_summary(report: Dict[str, Dict[str, Any]], top: int = 2) -> str:
+    """One heartbeat line: total entries, estimated MB and the largest caches."""
+    if not report:
+        return ""
+    entries = sum(row.get("entries") or 0 for row in report.values())
+    sized = sorted(
+        ((row.get("bytes") or 0, name) for name, row in report.items()),
+        reverse=True,
+    )
+    total_mb = sum(b for b, _ in sized) / (1024 * 1024)
+    largest = ", ".join(
+        f"{name} {b / (1024 * 1024):.1f} MB" for b, name in sized[:top] if b
+    )
+    line = f"Caches: {entries:,} entries, ~{total_mb:.1f} MB"
+    return f"{line} ({largest})" if largest else line
+
+
+# ---------------------------------------------------------------------------
+# tracemalloc diagnostics
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)) or default)
+    except ValueError:
+        return default
+
+
+class AllocationDiagnostics:
+    """Periodic tracemalloc snapshots diffed against the previous one.
+
+    Each record holds RSS, traced memory, growth since the first snapshot
+    and the top allocation sites by size growth, plus the cache report, so
+    a slow leak shows up as the same site climbing across records.
+    """
+
+    def __init__(
+        self,
+        every_n_cycles: int,
+        top_n: int = 15,
+        frames: int = 1,
+        out_dir: Optional[Path] = None,
+    ):
+        self.every_n_cycles = every_n_cycles
+        self.top_n = top_n
+        self.frames = frames
+        self.out_dir = Path(out_dir or "data/logs/memory")
+        self._previous: Optional[tracemalloc.Snapshot] = None
+        self._first_rss_mb: Optional[float] = None
+        self._started_tracing = False
+
+    def _ensure_tracing(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_tracing = True
+
+    def stop(self) -> None:
+        if self._started_tracing and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._started_tracing = False
+        self._previous = None
+
+    def maybe_snapshot(self, cycle: int) -> Optional[Dict[str, Any]]:
+        if self.every_n_cycles <= 0:
+            return None
+        self._ensure_tracing()
+        if cycle % self.every_n_cycles:
+            return None
+        return self.snapshot(cycle)
+
+    def snapshot(self, cycle: int) -> Dict[str, Any]:
+        self._ensure_tracing()
+        snap = tracemalloc.take_snapshot().filter_traces(
+            (
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            )
+        )
+        if self._previous is not None:
+            stats = snap.compare_to(self._previous, "lineno")
+            stats.sort(key=lambda s: s.size_diff, reverse=True)
+        else:
+            stats = snap.statistics("lineno")
+        self._previous = snap
+
+        top = []
+        for stat in stats[: self.top_n]:
+            frame = stat.traceback[0]
+            top.append(
+                {
+                    "site": f"{frame.filename}:{frame.lineno}",
+                    "size_kb": round(stat.size / 1024, 1),
+                    "size_diff_kb": round(getattr(stat, "size_diff", 0) / 1024, 1),
+                    "count": stat.count,
+                }
+            )
+
+        current, peak = tracemalloc.get_traced_memory()
+        rss_mb = _rss_mb()
+        if self._first_rss_mb is None:
+            self._first_rss_mb = rss_mb
+        record = {
+            "ts": datetime.now(timezone.utc).isoformat(),
+            "cycle": cycle,
+            "rss_mb": rss_mb,
+            "rss_growth_mb": (
+                round(rss_mb - self._first_rss_mb, 1)
+                if rss_mb is not None and self._first_rss_mb is not None
+                else None
+            ),
+            "traced_mb": round(current / (1024 * 1024), 1),
+            "traced_peak_mb": round(peak / (1024 * 1024), 1),
+            "top": top,
+            "caches": get_cache_registry().report(),
+        }
+        self._write(record)
+        if top:
+            log.info(
+                "memory_snapshot cycle=%d rss_mb=%s growth_mb=%s top_site=%s "
+                "top_diff_kb=%.1f",
+                cycle,
+                rss_mb,
+                record["rss_growth_mb"],
+                top[0]["site"],
+                top[0]["size_diff_kb"],
+            )
+        return record
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        try:
+            self.out_dir.mkdir(parents=True, exist_ok=True)
+            path = self.out_dir / f"{datetime.now(timezone.utc):%Y-%m-%d}.jsonl"
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, separators=(",", ":")) + "\n")
+        except Exception as e:
+            log.warning("memory_snapshot_write_failed err=%s", e)
+
+
+def _rss_mb() -> Optional[float]:
+    try:
+        from .metrics_registry import get_registry
+
+        value = get_registry().gauge("process_rss_mb").get()
+        if value is not None:
+            return round(float(value), 1)
+    except Exception:
+        pass
+    try:
+        import psutil
+
+        return round(psutil.Process().memory_info().rss / (1024 * 1024), 1)
+    except Exception:
+        return None
+
+
+_diagnostics: Optional[AllocationDiagnostics] = None
+
+
+def maybe_snapshot_allocations(cycle: int) -> Optional[Dict[str, Any]]:
+    """Take a tracemalloc snapshot when ``cycle`` hits the configured interval."""
+    global _diagnostics
+    every = _env_int("MEMORY_DIAGNOSTICS_EVERY_N_CYCLES", 0)
+    if every <= 0:
+        if _diagnostics is not None:
+            _diagnostics.stop()
+            _diagnostics = None
+        return None
+    if _diagnostics is None or _diagnostics.every_n_cycles != every:
+        _diagnostics = AllocationDiagnostics(
+            every,
+            top_n=_env_int("MEMORY_DIAGNOSTICS_TOP_N", 15),
+            frames=_env_int("MEMORY_DIAGNOSTICS_FRAMES", 1),
+            out_dir=Path(os.getenv("MEMORY_DIAGNOSTICS_DIR", "data/logs/memory")),
+        )
+    try:
+        return _diagnostics.maybe_snapshot(cycle)
+    except Exception as e:
+        log.warning("memory_snapshot_failed err=%s", e)
+        return None
+
+
+__all__ = [
+    "AllocationDiagnostics",
+    "BoundedCache",
+    "CacheRegistry",
+    "approx_size",
+    "bounded_cache",
+    "format_cache_summary",
+    "get_cache_registry",
+    "maybe_snapshot_allocations",
+]
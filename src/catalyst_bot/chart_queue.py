@@ -22,6 +22,7 @@ from pathlib import Path
 from queue import Empty, PriorityQueue
 from typing import Any, Callable, Dict, List, Optional
 
+from .cache_registry import bounded_cache
 from .logging_utils import get_logger
 
 log = get_logger("chart_queue")
@@ -64,8 +65,10 @@ class ChartGenerationQueue:
         self.workers: List[threading.Thread] = []
         self.running = False
 
-        # Chart cache: {cache_key: (chart_path, timestamp)}
-        self.cache: Dict[str, tuple] = {}
+        # Chart cache: {cache_key: (chart_path, timestamp)}, LRU-bounded
+        self.cache = bounded_cache(
+            "chart_queue", max_entries=500, ttl_seconds=cache_ttl
+        )
         self.cache_lock = threading.Lock()
 
         # Stats
@@ -333,23 +336,6 @@ class ChartGenerationQueue:
         with self.cache_lock:
             self.cache[key] = (chart_path, time.time())
 
-            # Prune if cache is large
-            if len(self.cache) > 500:
-                self._prune_cache()
-
-    def _prune_cache(self):
-        """Remove expired cache entries."""
-        now = time.time()
-        expired_keys = [
-            k for k, (_, ts) in self.cache.items() if now - ts > self.cache_ttl
-        ]
-
-        for key in expired_keys:
-            del self.cache[key]
-
-        if expired_keys:
-            log.debug(f"chart_cache_pruned count={len(expired_keys)}")
-
 
 # Global chart queue instance
 _chart_queue: Optional[ChartGenerationQueue] = None
@@ -3,9 +3,11 @@ from __future__ import annotations
 import importlib.util
 import json
 import os
+import threading
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from .logging_utils import get_logger
 
@@ -583,6 +585,7 @@ def add_triangle_patterns(ax, df, ticker):
     - Text annotation with pattern name and confidence
     """
     try:
+        from .indicators.pattern_scanner import reuse_patterns
         from .indicators.patterns import detect_triangles
 
         # Validate required columns
@@ -595,8 +598,10 @@ def add_triangle_patterns(ax, df, ticker):
         highs = df['High'].values.tolist()
         lows = df['Low'].values.tolist()
 
-        # Detect patterns
-        patterns = detect_triangles(prices, highs, lows, min_touches=3, lookback=20)
+        # Reuse a watchlist panel scan of these bars, else detect
+        patterns = reuse_patterns(ticker, prices, highs, lows, kinds=("triangles",))
+        if patterns is None:
+            patterns = detect_triangles(prices, highs, lows, min_touches=3, lookback=20)
 
         if not patterns:
             log.debug("triangle_patterns_none_detected ticker=%s", ticker)
@@ -794,6 +799,7 @@ def add_hs_patterns(ax, df, ticker):
     - Price target projection
     """
     try:
+        from .indicators.pattern_scanner import reuse_patterns
         from .indicators.patterns import detect_head_shoulders
 
         # Validate required columns
@@ -804,8 +810,10 @@ def add_hs_patterns(ax, df, ticker):
         # Extract price data as list
         prices = df['Close'].values.tolist()
 
-        # Detect patterns
-        patterns = detect_head_shoulders(prices, min_confidence=0.6, lookback=30)
+        # Reuse a watchlist panel scan of these bars, else detect
+        patterns = reuse_patterns(ticker, prices, kinds=("head_shoulders",))
+        if patterns is None:
+            patterns = detect_head_shoulders(prices, min_confidence=0.6, lookback=30)
 
         if not patterns:
             log.debug("hs_patterns_none_detected ticker=%s", ticker)
@@ -950,6 +958,7 @@ def add_double_patterns(ax, df, ticker):
     - Price target projection
     """
     try:
+        from .indicators.pattern_scanner import reuse_patterns
         from .indicators.patterns import detect_double_tops_bottoms
 
         # Validate required columns
@@ -960,13 +969,15 @@ def add_double_patterns(ax, df, ticker):
         # Extract price data as list
         prices = df['Close'].values.tolist()
 
-        # Detect patterns
-        all_patterns = detect_double_tops_bottoms(
-            prices,
-            tolerance=0.02,
-            min_spacing=5,
-            lookback=30
-        )
+        # Reuse a watchlist panel scan of these bars, else detect
+        all_patterns = reuse_patterns(ticker, prices, kinds=("double_tops",))
+        if all_patterns is None:
+            all_patterns = detect_double_tops_bottoms(
+                prices,
+                tolerance=0.02,
+                min_spacing=5,
+                lookback=30
+            )
 
         if not all_patterns:
             log.debug("double_patterns_none_detected ticker=%s", ticker)
@@ -1372,6 +1383,34 @@ def optimize_for_mobile(fig, axes):
         log.warning("mobile_optimize_failed err=%s", str(err))
 
 
+def _fill_chart_gaps(df, sym: str):
+    """Gap-fill ``df`` the way :func:`render_chart_with_panels` draws it.
+
+    Controlled by CHART_FILL_EXTENDED_HOURS / CHART_FILL_METHOD; returns the
+    original frame when filling is disabled or fails.
+    """
+    fill_enabled = os.getenv("CHART_FILL_EXTENDED_HOURS", "1") == "1"
+    if fill_enabled and len(df) > 1:
+        fill_method = os.getenv("CHART_FILL_METHOD", "forward_fill")
+        # Determine interval from index (5min, 15min, etc.)
+        try:
+            time_diff = (df.index[1] - df.index[0]).total_seconds() / 60
+            expected_interval = int(time_diff)
+            df = fill_gaps(
+                df, method=fill_method, expected_interval_minutes=expected_interval
+            )
+            log.debug(
+                "gap_filling_applied ticker=%s method=%s interval=%d",
+                sym,
+                fill_method,
+                expected_interval,
+            )
+        except Exception as err:
+            log.warning("gap_filling_failed ticker=%s err=%s", sym, str(err))
+            # Continue with original df
+    return df
+
+
 def render_chart_with_panels(
     ticker: str,
     df,
@@ -1446,21 +1485,7 @@ def render_chart_with_panels(
             raise ValueError("no_data")
 
         # Apply gap filling if enabled
-        fill_enabled = os.getenv("CHART_FILL_EXTENDED_HOURS", "1") == "1"
-        if fill_enabled and len(df) > 1:
-            fill_method = os.getenv("CHART_FILL_METHOD", "forward_fill")
-            # Determine interval from index (5min, 15min, etc.)
-            try:
-                import pandas as pd
-                if len(df) >= 2:
-                    time_diff = (df.index[1] - df.index[0]).total_seconds() / 60
-                    expected_interval = int(time_diff)
-                    df = fill_gaps(df, method=fill_method, expected_interval_minutes=expected_interval)
-                    log.debug("gap_filling_applied ticker=%s method=%s interval=%d", sym, fill_method, expected_interval)
-            except Exception as err:
-                log.warning("gap_filling_failed ticker=%s err=%s", sym, str(err))
-                # Continue with original df
-                pass
+        df = _fill_chart_gaps(df, sym)
 
         # Create WeBull style
         webull_style = create_webull_style()
@@ -2256,6 +2281,12 @@ def get_quickchart_url(ticker: str, *, bars: int = 50) -> Optional[str]:
 # Enhanced Multi-Panel Support with chart_panels Integration (Phase 3)
 
 
+def _default_chart_indicators() -> List[str]:
+    """Indicators from CHART_DEFAULT_INDICATORS (default: vwap, rsi, macd)."""
+    default_str = os.getenv("CHART_DEFAULT_INDICATORS", "vwap,rsi,macd")
+    return [ind.strip() for ind in default_str.split(",") if ind.strip()]
+
+
 def render_multipanel_chart(
     ticker: str,
     timeframe: str = "1D",
@@ -2325,8 +2356,7 @@ def render_multipanel_chart(
 
     # Default indicators from environment or fallback
     if indicators is None:
-        default_str = os.getenv("CHART_DEFAULT_INDICATORS", "vwap,rsi,macd")
-        indicators = [ind.strip() for ind in default_str.split(",") if ind.strip()]
+        indicators = _default_chart_indicators()
 
     # Use existing render_chart_with_panels which already has good implementation
     # Just need to fetch data and pass it through
@@ -2458,3 +2488,88 @@ def render_multipanel_chart(
     except Exception as err:
         log.error("multipanel_enhanced_failed ticker=%s err=%s", ticker, str(err))
         return None
+
+
+def pattern_overlay_kinds(indicators: Optional[List[str]] = None) -> Tuple[str, ...]:
+    """Pattern families the chart overlays draw for ``indicators``.
+
+    Mirrors the ``patterns``/``triangles``/``hs`` switches in
+    :func:`render_chart_with_panels`; defaults to CHART_DEFAULT_INDICATORS.
+    An empty tuple means no pattern overlays are drawn.
+    """
+    if indicators is None:
+        indicators = _default_chart_indicators()
+    wanted = {ind.lower() for ind in indicators}
+    kinds: List[str] = []
+    if "patterns" in wanted or "triangles" in wanted:
+        kinds.append("triangles")
+    if "patterns" in wanted or "hs" in wanted:
+        kinds += ["head_shoulders", "double_tops"]
+    return tuple(kinds)
+
+
+def prescan_chart_patterns(
+    tickers: Iterable[str],
+    indicators: Optional[List[str]] = None,
+    wait: bool = True,
+) -> int:
+    """Scan chart patterns for ``tickers`` in one panel pass.
+
+    Fetches the 5-minute bars :func:`render_multipanel_chart` draws, applies
+    the same gap filling and runs
+    :func:`~catalyst_bot.indicators.pattern_scanner.scan_panel` over all of
+    them, so the ``add_*_patterns`` overlays reuse the result instead of
+    detecting per chart. Does nothing when no pattern overlays are enabled.
+
+    With ``wait=False`` the scan runs on a background thread and 0 is
+    returned; otherwise returns the number of tickers scanned.
+    """
+    kinds = pattern_overlay_kinds(indicators)
+    wanted = sorted({t.strip().upper() for t in tickers if t and t.strip()})
+    if not kinds or not wanted:
+        return 0
+    if not wait:
+        threading.Thread(
+            target=prescan_chart_patterns,
+            args=(wanted, indicators),
+            name="ChartPatternPrescan",
+            daemon=True,
+        ).start()
+        return 0
+
+    try:
+        import pandas as pd
+
+        from . import market
+        from .indicators.pattern_scanner import build_panel, scan_panel
+
+        def one(sym: str):
+            try:
+                df = market.get_intraday(
+                    sym, interval="5min", output_size="compact", prepost=True
+                )
+                if df is None or getattr(df, "empty", False):
+                    return sym, None
+                if not isinstance(df.index, pd.DatetimeIndex):
+                    df.index = pd.to_datetime(df.index)
+                df = _fill_chart_gaps(df, sym)
+                # The same lists add_*_patterns hand to the detectors
+                return sym, {
+                    "close": df["Close"].values.tolist(),
+                    "high": df["High"].values.tolist(),
+                    "low": df["Low"].values.tolist(),
+                }
+            except Exception as err:
+                log.debug("chart_pattern_prescan_fetch_failed ticker=%s err=%s", sym, str(err))
+                return sym, None
+
+        with ThreadPoolExecutor(max_workers=min(8, len(wanted))) as pool:
+            frames = {sym: bars for sym, bars in pool.map(one, wanted) if bars}
+        if not frames:
+            return 0
+        scan_panel(build_panel(frames), kinds=kinds)
+        log.info("chart_pattern_prescan tickers=%d kinds=%s", len(frames), ",".join(kinds))
+        return len(frames)
+    except Exception as err:
+        log.warning("chart_pattern_prescan_failed err=%s", str(err))
+        return 0
@@ -27,6 +27,7 @@ try:
 except Exception:  # pragma: no cover
     SentimentIntensityAnalyzer = None  # type: ignore
 
+from .cache_registry import get_cache_registry
 from .config import get_settings
 from .logging_utils import get_logger
 from .models import NewsItem, ScoredItem
@@ -158,6 +159,13 @@ def _init_ml_model():
         return None
 
 
+def _ml_batch_queue_size() -> int:
+    return len(getattr(_ml_batch_scorer, "queue", None) or ())
+
+
+get_cache_registry().register_external("classify.ml_batch_queue", _ml_batch_queue_size)
+
+
 def clear_ml_batch_scorer() -> None:
     """Clear ML batch scorer to prevent memory leaks.
 
@@ -0,0 +1,411 @@
+"""Per-stage cycle profiler with compact trace records.
+
+The runner opens a trace around every ``_cycle`` call and marks its phases
+(fetch, dedupe, enrich_ticker, price_batch, sec_batch, items, ...).  Inside a
+phase, ``span()`` blocks and ``record_span()`` calls nest under the active
+path, so a provider call made while classifying an item is recorded as
+``items;classify;provider:tiingo``.  Spans opened on worker threads (price
+fallback pool, async LLM loop) nest under whatever the cycle thread is doing
+at that moment.
+
+Each cycle is written as one JSON line holding, per stage path, the number
+of spans, total milliseconds and the slowest span.  Paths use ``;`` as the
+separator so they convert directly to the collapsed-stack format consumed
+by flamegraph tools (see :func:`traces_to_collapsed`).
+
+``summarize_traces`` aggregates a day of records into per-stage p50/p95 and
+``find_regressions`` compares that against a stored baseline;
+``scripts/cycle_profile_report.py`` wraps both for the command line.
+
+An optional sampling profiler (``CYCLE_PROFILER_SAMPLE_HZ`` > 0) walks the
+cycle thread's stack at a fixed rate and appends collapsed stacks to a
+per-day ``.folded`` file next to the traces.
+
+Environment
+-----------
+FEATURE_CYCLE_PROFILER : bool
+    Record cycle traces (default 1).
+CYCLE_TRACE_DIR : str
+    Directory for ``YYYY-MM-DD.jsonl`` trace files
+    (default ``data/logs/cycle_traces``).
+CYCLE_PROFILER_SAMPLE_HZ : float
+    Stack sampling rate during cycles; 0 disables sampling (default 0).
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+try:
+    from .logging_utils import get_logger
+except Exception:  # pragma: no cover - fallback for standalone use
+    import logging
+
+    def get_logger(_):
+        return logging.getLogger("cycle_profiler")
+
+
+log = get_logger("cycle_profiler")
+
+DEFAULT_TRACE_DIR = "data/logs/cycle_traces"
+CYCLE_STAGE = "cycle"
+MAX_SAMPLE_DEPTH = 64
+
+_local = threading.local()
+_active: Optional["CycleTrace"] = None
+
+
+def profiler_enabled() -> bool:
+    return os.getenv("FEATURE_CYCLE_PROFILER", "1").strip().lower() in {
+        "1",
+        "true",
+        "yes",
+        "on",
+    }
+
+
+def trace_dir() -> Path:
+    return Path(os.getenv("CYCLE_TRACE_DIR", DEFAULT_TRACE_DIR))
+
+
+class CycleTrace:
+    """Aggregated span timings for one cycle."""
+
+    def __init__(self, cycle_id: int):
+        self.cycle_id = cycle_id
+        self.started_at = datetime.now(timezone.utc)
+        self._t0 = time.perf_counter()
+        self._owner = threading.get_ident()
+        self._lock = threading.Lock()
+        # path -> [count, total_ms, max_ms]
+        self.stages: Dict[str, List[float]] = {}
+        self._phase: Optional[str] = None
+        self._phase_t0 = 0.0
+        # Path of the innermost span open on the cycle thread; spans from
+        # other threads attach here.
+        self._owner_path = ""
+        self._sampler: Optional[_StackSampler] = None
+        self.total_ms: Optional[float] = None
+
+    def record(self, path: str, ms: float) -> None:
+        with self._lock:
+            entry = self.stages.get(path)
+            if entry is None:
+                self.stages[path] = [1, ms, ms]
+            else:
+                entry[0] += 1
+                entry[1] += ms
+                if ms > entry[2]:
+                    entry[2] = ms
+
+    def start_phase(self, name: Optional[str]) -> None:
+        now = time.perf_counter()
+        if self._phase is not None:
+            elapsed = (now - self._phase_t0) * 1000.0
+            self.record(self._phase, elapsed)
+            _observe_stage(self._phase, elapsed / 1000.0)
+        self._phase = name
+        self._phase_t0 = now
+        self._owner_path = name or ""
+
+    def base_path(self) -> str:
+        if threading.get_ident() == self._owner:
+            return self._phase or ""
+        return self._owner_path
+
+    def to_record(self) -> Dict[str, Any]:
+        return {
+            "ts": self.started_at.isoformat(),
+            "cycle_id": self.cycle_id,
+            "total_ms": round(self.total_ms or 0.0, 1),
+            "stages": {
+                path: [int(n), round(total, 1), round(peak, 1)]
+                for path, (n, total, peak) in sorted(self.stages.items())
+            },
+        }
+
+
+def _observe_stage(stage: str, seconds: float) -> None:
+    try:
+        from .metrics_registry import observe
+
+        observe("cycle_stage_seconds", seconds, stage=stage)
+    except Exception:
+        pass
+
+
+def _stack() -> List[str]:
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def _join(parent: str, name: str) -> str:
+    return f"{parent};{name}" if parent else name
+
+
+def current_trace() -> Optional[CycleTrace]:
+    return _active
+
+
+def start_cycle(cycle_id: int) -> Optional[CycleTrace]:
+    """Open the trace for a cycle; returns None when profiling is disabled."""
+    global _active
+    if not profiler_enabled():
+        _active = None
+        return None
+    trace = CycleTrace(cycle_id)
+    _stack().clear()
+    try:
+        hz = float(os.getenv("CYCLE_PROFILER_SAMPLE_HZ", "0") or 0)
+    except ValueError:
+        hz = 0.0
+    if hz > 0:
+        trace._sampler = _StackSampler(trace._owner, hz)
+        trace._sampler.start()
+    _active = trace
+    return trace
+
+
+def finish_cycle(trace: Optional[CycleTrace]) -> Optional[Dict[str, Any]]:
+    """Close the trace, append it to today's trace file and return the record."""
+    global _active
+    if trace is None:
+        return None
+    if _active is trace:
+        _active = None
+    trace.start_phase(None)
+    trace.total_ms = (time.perf_counter() - trace._t0) * 1000.0
+    _observe_stage(CYCLE_STAGE, trace.total_ms / 1000.0)
+    record = trace.to_record()
+    day = trace.started_at.strftime("%Y-%m-%d")
+    directory = trace_dir()
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        with open(directory / f"{day}.jsonl", "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, separators=(",", ":")) + "\n")
+    except Exception as e:
+        log.debug("cycle_trace_write_failed err=%s", e.__class__.__name__)
+    if trace._sampler is not None:
+        trace._sampler.stop()
+        trace._sampler.write(directory / f"{day}.folded")
+    return record
+
+
+def phase(name: str) -> None:
+    """End the current top-level phase of the active cycle and start ``name``."""
+    trace = _active
+    if trace is not None and threading.get_ident() == trace._owner:
+        _stack().clear()
+        trace.start_phase(name)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time the block as a child of the innermost open span or phase."""
+    trace = _active
+    if trace is None:
+        yield
+        return
+    stack = _stack()
+    path = _join(stack[-1] if stack else trace.base_path(), name)
+    is_owner = threading.get_ident() == trace._owner
+    stack.append(path)
+    if is_owner:
+        trace._owner_path = path
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.record(path, (time.perf_counter() - start) * 1000.0)
+        stack.pop()
+        if is_owner:
+            trace._owner_path = stack[-1] if stack else (trace._phase or "")
+
+
+def record_span(name: str, seconds: float) -> None:
+    """Record an already-measured span under the current path."""
+    trace = _active
+    if trace is None:
+        return
+    stack = _stack()
+    path = _join(stack[-1] if stack else trace.base_path(), name)
+    trace.record(path, seconds * 1000.0)
+
+
+class _StackSampler:
+    """Background sampler collecting collapsed stacks of one thread."""
+
+    def __init__(self, thread_id: int, hz: float):
+        self.thread_id = thread_id
+        self.interval = 1.0 / hz
+        self.counts: Dict[str, int] = defaultdict(int)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="cycle-stack-sampler", daemon=True
+        )
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join(timeout=1.0)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            frames = []
+            while frame is not None and len(frames) < MAX_SAMPLE_DEPTH:
+                code = frame.f_code
+                module = frame.f_globals.get("__name__", "?")
+                frames.append(f"{module}:{code.co_name}")
+                frame = frame.f_back
+            if frames:
+                self.counts[";".join(reversed(frames))] += 1
+
+    def write(self, path: Path) -> None:
+        if not self.counts:
+            return
+        try:
+            with open(path, "a", encoding="utf-8") as f:
+                for stack, n in self.counts.items():
+                    f.write(f"{stack} {n}\n")
+        except Exception as e:
+            log.debug("cycle_stack_write_failed err=%s", e.__class__.__name__)
+
+
+# ---------------------------------------------------------------------------
+# Offline analysis
+# ---------------------------------------------------------------------------
+
+
+def load_traces(path: Path) -> List[Dict[str, Any]]:
+    """Read trace records from a JSONL file, skipping malformed lines."""
+    records = []
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+    except FileNotFoundError:
+        pass
+    return records
+
+
+def _nearest_rank(values: List[float], q: float) -> float:
+    return values[max(0, math.ceil(q * len(values)) - 1)]
+
+
+def summarize_traces(records: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Per-stage distribution of per-cycle time (ms) across ``records``.
+
+    A stage's value for a cycle is the summed time of all its spans in that
+    cycle, so ``items;classify`` reflects classify cost per cycle rather than
+    per item.  The ``cycle`` stage holds end-to-end cycle time.
+    """
+    per_stage: Dict[str, List[float]] = defaultdict(list)
+    spans: Dict[str, int] = defaultdict(int)
+    for record in records:
+        per_stage[CYCLE_STAGE].append(float(record.get("total_ms", 0.0)))
+        for path, (n, total_ms, _peak) in record.get("stages", {}).items():
+            per_stage[path].append(float(total_ms))
+            spans[path] += int(n)
+    summary = {}
+    for stage, values in per_stage.items():
+        values.sort()
+        summary[stage] = {
+            "cycles": len(values),
+            "spans": spans.get(stage, len(values)),
+            "p50_ms": round(_nearest_rank(values, 0.50), 1),
+            "p95_ms": round(_nearest_rank(values, 0.95), 1),
+            "mean_ms": round(sum(values) / len(values), 1),
+            "max_ms": round(values[-1], 1),
+        }
+    return summary
+
+
+def find_regressions(
+    summary: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    tolerance: float = 0.5,
+    min_delta_ms: float = 250.0,
+) -> List[Dict[str, Any]]:
+    """Stages whose p50 or p95 grew past the baseline.
+
+    A stage regresses when the percentile exceeds the baseline by more than
+    ``tolerance`` (fractional) and by at least ``min_delta_ms``, which keeps
+    millisecond-scale stages from flapping.  Stages missing from the
+    baseline are ignored.
+    """
+    regressions = []
+    for stage, current in sorted(summary.items()):
+        base = baseline.get(stage)
+        if not base:
+            continue
+        for key in ("p50_ms", "p95_ms"):
+            before = float(base.get(key, 0.0))
+            after = float(current.get(key, 0.0))
+            if after - before >= min_delta_ms and after > before * (1 + tolerance):
+                regressions.append(
+                    {
+                        "stage": stage,
+                        "metric": key,
+                        "baseline_ms": before,
+                        "current_ms": after,
+                        "ratio": round(after / before, 2) if before else None,
+                    }
+                )
+    return regressions
+
+
+def traces_to_collapsed(records: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+    """Fold span records into collapsed stacks weighted by self time (ms)."""
+    totals: Dict[str, float] = defaultdict(float)
+    cycle_total = 0.0
+    for record in records:
+        cycle_total += float(record.get("total_ms", 0.0))
+        for path, (_n, total_ms, _peak) in record.get("stages", {}).items():
+            totals[path] += float(total_ms)
+    child_time: Dict[str, float] = defaultdict(float)
+    for path, total in totals.items():
+        parent = path.rpartition(";")[0]
+        child_time[parent] += total
+    collapsed = {}
+    for path, total in totals.items():
+        self_ms = int(round(total - child_time.get(path, 0.0)))
+        if self_ms > 0:
+            collapsed[f"{CYCLE_STAGE};{path}"] = self_ms
+    untracked = int(round(cycle_total - child_time.get("", 0.0)))
+    if untracked > 0:
+        collapsed[CYCLE_STAGE] = untracked
+    return collapsed
+
+
+__all__ = [
+    "CycleTrace",
+    "current_trace",
+    "find_regressions",
+    "finish_cycle",
+    "load_traces",
+    "phase",
+    "record_span",
+    "span",
+    "start_cycle",
+    "summarize_traces",
+    "trace_dir",
+    "traces_to_collapsed",
+]
@@ -139,7 +139,9 @@ def _components_enabled() -> bool:
     }
 
 
-def handle_interaction(interaction_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+def handle_interaction(
+    interaction_data: Dict[str, Any], service: Optional[Any] = None
+) -> Optional[Dict[str, Any]]:
     """Handle a Discord interaction (button click).
 
     This function processes the interaction and returns a response payload
@@ -149,6 +151,8 @@ def handle_interaction(interaction_data: Dict[str, Any]) -> Optional[Dict[str, A
     ----------
     interaction_data : Dict[str, Any]
         Interaction payload from Discord
+    service : InteractionService, optional
+        Service that renders chart clicks; defaults to the process-wide one
 
     Returns
     -------
@@ -201,191 +205,98 @@ def handle_interaction(interaction_data: Dict[str, Any]) -> Optional[Dict[str, A
 
         log.info("interaction_received ticker=%s tf=%s", ticker, timeframe)
 
-        # Generate new chart for the requested timeframe
-        from .chart_cache import get_cache
-        from .charts_advanced import generate_multi_panel_chart
+        # ACK with a deferred update; the render and message edit run on the
+        # interaction service's worker pools (duplicate clicks share a render)
+        if service is None:
+            from .interaction_service import get_interaction_service
 
-        cache = get_cache()
+            service = get_interaction_service()
+        return service.submit_chart(interaction_data, ticker, timeframe)
 
-        # Try cache first
-        chart_path = cache.get_cached_chart(ticker, timeframe)
-
-        if chart_path is None:
-            # Generate new chart
-            chart_path = generate_multi_panel_chart(
-                ticker, timeframe=timeframe, style="dark"
-            )
-
-            if chart_path:
-                cache.cache_chart(ticker, timeframe, chart_path)
-
-        if chart_path is None:
-            # Failed to generate chart
-            return {
-                "type": 4,  # CHANNEL_MESSAGE_WITH_SOURCE
-                "data": {
-                    "content": f"❌ Failed to generate {timeframe} chart for {ticker}",
-                    "flags": 64,  # Ephemeral (only visible to user who clicked)
-                },
-            }
+    except Exception as e:
+        log.warning("interaction_handle_failed err=%s", str(e))
+        return {
+            "type": 4,
+            "data": {
+                "content": "❌ An error occurred while processing your request",
+                "flags": 64,
+            },
+        }
 
-        # Build new embed with updated chart
-        # Note: Discord interaction responses with attachments are complex
-        # We'll upload via Bot API and return a deferred response
 
-        # Extract metadata from interaction for editing
-        message = interaction_data.get("message")
-        message_id = message.get("id") if isinstance(message, dict) else None
-        channel_id = interaction_data.get("channel_id")
+def render_chart(ticker: str, timeframe: str) -> Optional[Path]:
+    """Render the multi-panel chart used by timeframe buttons.
 
-        # Get bot token from environment
-        bot_token = os.getenv("DISCORD_BOT_TOKEN")
+    Module-level so the interaction service can run it in a worker process.
+    """
+    from .charts_advanced import generate_multi_panel_chart
 
-        if not (bot_token and message_id and channel_id):
-            log.warning(
-                "missing_bot_metadata bot_token=%s msg_id=%s ch_id=%s",
-                bool(bot_token),
-                bool(message_id),
-                bool(channel_id),
-            )
-            return {
-                "type": 4,
-                "data": {
-                    "content": "❌ Failed to update chart (missing configuration)",
-                    "flags": 64,
-                },
-            }
+    return generate_multi_panel_chart(ticker, timeframe=timeframe, style="dark")
 
-        # Get original message embeds to preserve alert metadata
-        original_embeds = message.get("embeds", [])
-        original_attachments = message.get("attachments", [])
-
-        # Find sentiment gauge attachment if it exists
-        gauge_attachment = None
-        gauge_filename = None
-        for att in original_attachments:
-            if att.get("filename", "").startswith("gauge_"):
-                gauge_attachment = att
-                gauge_filename = att.get("filename")
-                break
-
-        # Build updated embeds list
-        new_embeds = []
-
-        if original_embeds:
-            # Preserve the first embed (alert metadata) but update the chart image
-            first_embed = original_embeds[0].copy()
-            first_embed["image"] = {"url": f"attachment://{chart_path.name}"}
-
-            # Preserve sentiment gauge thumbnail if it exists
-            if gauge_filename:
-                first_embed["thumbnail"] = {"url": f"attachment://{gauge_filename}"}
-
-            # Update footer to show new timeframe
-            first_embed["footer"] = {
-                "text": f"Chart: {timeframe} | Click buttons to switch timeframes"
-            }
-            new_embeds.append(first_embed)
-        else:
-            # Fallback if no original embeds (shouldn't happen)
-            new_embeds.append(
-                {
-                    "color": 0x2ECC71,
-                    "image": {"url": f"attachment://{chart_path.name}"},
-                    "footer": {
-                        "text": f"Timeframe: {timeframe} | Click a button to switch"
-                    },
-                }
-            )
 
-        # Edit message with new chart via bot API
-        import json
+def edit_interaction_chart(
+    interaction_data: Dict[str, Any], ticker: str, timeframe: str, chart_path: Path
+) -> bool:
+    """Swap the chart on the message a timeframe button belongs to.
 
-        import requests
+    Keeps the alert embed (and its sentiment gauge thumbnail) and edits the
+    message through the interaction webhook, so no bot token is needed.
+    """
+    import requests
 
-        url = f"https://discord.com/api/v10/channels/{channel_id}/messages/{message_id}"
+    from .interaction_service import interaction_webhook_url
 
-        headers = {"Authorization": f"Bot {bot_token}"}
+    webhook_url = interaction_webhook_url(interaction_data)
+    if not webhook_url:
+        return False
 
-        payload = {
-            "embeds": new_embeds,
-            "components": create_timeframe_buttons(ticker, timeframe),
+    message = interaction_data.get("message") or {}
+    original_embeds = message.get("embeds", [])
+
+    # Find sentiment gauge attachment if it exists
+    gauge_attachment = None
+    for att in message.get("attachments", []):
+        if att.get("filename", "").startswith("gauge_"):
+            gauge_attachment = att
+            break
+
+    embeds = None
+    if original_embeds:
+        # Preserve the first embed (alert metadata) but update the chart image
+        first_embed = original_embeds[0].copy()
+        first_embed["image"] = {"url": f"attachment://{chart_path.name}"}
+        if gauge_attachment:
+            first_embed["thumbnail"] = {
+                "url": f"attachment://{gauge_attachment['filename']}"
+            }
+        first_embed["footer"] = {
+            "text": f"Chart: {timeframe} | Click buttons to switch timeframes"
         }
+        embeds = [first_embed]
 
-        data = {"payload_json": json.dumps(payload)}
-
+    extra_files = {}
+    if gauge_attachment and gauge_attachment.get("url"):
+        # Re-attach the gauge; edits drop attachments that are not re-sent
         try:
-            # First, acknowledge the interaction immediately (type 6 = deferred update)
-            # This tells Discord we received the button click
-            import threading
-
-            def update_message_async():
-                """Update the message in the background after acknowledging interaction"""
-                try:
-                    # Prepare files to upload
-                    files_dict = {}
-
-                    # Add chart file
-                    with open(chart_path, "rb") as f:
-                        chart_bytes = f.read()
-                    files_dict["files[0]"] = (chart_path.name, chart_bytes, "image/png")
-
-                    # Download and re-attach gauge if it exists
-                    if gauge_attachment and gauge_filename:
-                        try:
-                            gauge_url = gauge_attachment.get("url")
-                            if gauge_url:
-                                gauge_resp = requests.get(gauge_url, timeout=10)
-                                if gauge_resp.ok:
-                                    files_dict["files[1]"] = (
-                                        gauge_filename,
-                                        gauge_resp.content,
-                                        "image/png",
-                                    )
-                        except Exception as e:
-                            log.warning("gauge_download_failed err=%s", str(e))
-
-                    resp = requests.patch(
-                        url, headers=headers, data=data, files=files_dict, timeout=15
-                    )
-
-                    if resp.ok:
-                        log.info("chart_switched ticker=%s tf=%s", ticker, timeframe)
-                    else:
-                        log.warning(
-                            "chart_switch_failed status=%d body=%s",
-                            resp.status_code,
-                            resp.text[:200],
-                        )
-                except Exception as e:
-                    log.warning("chart_switch_exception err=%s", str(e))
-
-            # Start async update
-            threading.Thread(target=update_message_async, daemon=True).start()
-
-            # Return immediate acknowledgment (type 6 = deferred update, no loading state)
-            return {"type": 6}
+            gauge_resp = requests.get(gauge_attachment["url"], timeout=10)
+            if gauge_resp.ok:
+                extra_files["files[1]"] = (
+                    gauge_attachment["filename"],
+                    gauge_resp.content,
+                    "image/png",
+                )
         except Exception as e:
-            # Log full error internally (includes stack trace)
-            log.warning("chart_update_failed err=%s", str(e), exc_info=True)
-            # Security: Return generic error to user (don't expose internal details)
-            return {
-                "type": 4,
-                "data": {
-                    "content": "❌ Failed to update chart. Please try again later.",
-                    "flags": 64,
-                },
-            }
+            log.warning("gauge_download_failed err=%s", str(e))
 
-    except Exception as e:
-        log.warning("interaction_handle_failed err=%s", str(e))
-        return {
-            "type": 4,
-            "data": {
-                "content": "❌ An error occurred while processing your request",
-                "flags": 64,
-            },
-        }
+    return edit_message_with_chart(
+        webhook_url,
+        "@original",
+        ticker,
+        timeframe,
+        chart_path,
+        embeds=embeds,
+        extra_files=extra_files,
+    )
 
 
 def verify_discord_signature(
@@ -491,14 +402,21 @@ def create_interaction_endpoint_flask():
 
 
 def edit_message_with_chart(
-    webhook_url: str, message_id: str, ticker: str, timeframe: str, chart_path: Path
+    webhook_url: str,
+    message_id: str,
+    ticker: str,
+    timeframe: str,
+    chart_path: Path,
+    embeds: Optional[List[Dict[str, Any]]] = None,
+    extra_files: Optional[Dict[str, Any]] = None,
 ) -> bool:
     """Edit a Discord message to update its chart image.
 
     Parameters
     ----------
     webhook_url : str
-        Discord webhook URL
+        Discord webhook URL (a channel webhook, or an interaction webhook
+        with ``message_id="@original"``)
     message_id : str
         ID of the message to edit
     ticker : str
@@ -507,6 +425,10 @@ def edit_message_with_chart(
         New timeframe to display
     chart_path : Path
         Path to the chart image
+    embeds : list of dict, optional
+        Embeds to send instead of the default chart embed
+    extra_files : dict, optional
+        Additional multipart files to re-attach (e.g. the sentiment gauge)
 
     Returns
     -------
@@ -529,21 +451,25 @@ def edit_message_with_chart(
         )
 
         # Build new embed
-        embed = {
-            "title": f"{ticker} - {timeframe} Chart",
-            "color": 0x2ECC71,
-            "image": {"url": f"attachment://{chart_path.name}"},
-            "footer": {"text": f"Timeframe: {timeframe} | Generated charts"},
-        }
+        if embeds is None:
+            embeds = [
+                {
+                    "title": f"{ticker} - {timeframe} Chart",
+                    "color": 0x2ECC71,
+                    "image": {"url": f"attachment://{chart_path.name}"},
+                    "footer": {"text": f"Timeframe: {timeframe} | Generated charts"},
+                }
+            ]
 
         # Build components (buttons)
         components = create_timeframe_buttons(ticker, timeframe)
 
         # Prepare multipart upload
-        files = {"file": (chart_path.name, chart_path.open("rb"), "image/png")}
+        files = {"file": (chart_path.name, chart_path.read_bytes(), "image/png")}
+        files.update(extra_files or {})
 
         payload = {
-            "embeds": [embed],
+            "embeds": embeds,
             "components": components,
         }
 
@@ -7,6 +7,9 @@ from typing import Any, Dict, Tuple
 
 import requests  # runtime dep
 
+from .cycle_profiler import record_span
+from .metrics_registry import inc_counter, observe
+
 # --- Small per-webhook soft rate limiter (header-aware) ---
 _RL_LOCK = threading.Lock()
 _RL_STATE: Dict[str, Dict[str, float]] = {}
@@ -91,7 +94,12 @@ def post_discord_with_backoff(
     _rl_pre_wait(url)
 
     def _do_post():
+        start = time.perf_counter()
         resp = (session or requests).post(url, json=payload, timeout=10)
+        elapsed = time.perf_counter() - start
+        observe("discord_post_seconds", elapsed)
+        record_span("discord_post", elapsed)
+        inc_counter("discord_posts_total", status=resp.status_code)
         _rl_note_headers(url, resp.headers, is_429=(resp.status_code == 429))
         return resp
 
@@ -0,0 +1,432 @@
+"""
+Durable Local Work Queue
+========================
+
+Embedded, crash-safe work queue backed by one SQLite file in WAL mode, so
+background stages on a single box can buffer work without a Redis
+service. The SEC filing stream backlog and the sharded runner's process
+queues use it.
+
+Delivery is at-least-once with leases:
+
+- ``put`` appends a message to a topic. If a message with the same
+  ``key`` is still unacked on that topic, the new one is dropped.
+- ``get`` leases messages to one consumer. They stay invisible to every
+  other consumer, in this process or another, for the visibility timeout.
+- ``ack`` deletes a leased message. ``nack`` makes it visible again, with
+  an optional delay.
+- A message whose lease runs out without an ack is handed out again. This
+  covers a consumer that crashed, was killed or hung. After
+  ``max_attempts`` deliveries it moves to ``<topic>.dead`` for inspection
+  instead of being retried forever.
+
+A restart loses nothing: unacked messages are still in the file and come
+back once their lease expires. ``stats`` reports depth, in-flight count,
+lag (age of the oldest unacked message) and throughput (acks per second
+over the last minute), counted across every process using the file.
+``publish_metrics`` mirrors these into the metrics registry.
+"""
+
+from __future__ import annotations
+
+import pickle
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from .logging_utils import get_logger
+from .metrics_registry import inc_counter, set_gauge
+
+log = get_logger("durable_queue")
+
+DEAD_SUFFIX = ".dead"
+THROUGHPUT_WINDOW_SEC = 60.0
+
+
+@dataclass(frozen=True)
+class Job:
+    """A leased message; pass it back to ``ack``/``nack``."""
+
+    id: int
+    topic: str
+    key: Optional[str]
+    message: Any
+    attempts: int
+    enqueued_at: float
+    lease: str
+
+
+JobsArg = Union[Job, Iterable[Job]]
+
+
+def _jobs(jobs: JobsArg) -> List[Job]:
+    return [jobs] if isinstance(jobs, Job) else list(jobs)
+
+
+class DurableQueue:
+    """Topic work queue in a local SQLite (WAL) file with leases and acks.
+
+    Parameters
+    ----------
+    path : Path
+        SQLite file; created (with parent directories) when missing.
+    visibility_timeout : float
+        Default lease length in seconds for ``get``.
+    max_attempts : int
+        Deliveries before a message is moved to ``<topic>.dead``.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        visibility_timeout: float = 30.0,
+        max_attempts: int = 5,
+    ):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.visibility_timeout = float(visibility_timeout)
+        self.max_attempts = int(max_attempts)
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " topic TEXT NOT NULL,"
+            " key TEXT,"
+            " body BLOB NOT NULL,"
+            " enqueued_at REAL NOT NULL,"
+            " visible_at REAL NOT NULL,"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " lease TEXT,"
+            " UNIQUE(topic, key))"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_jobs_ready ON jobs(topic, visible_at, id)"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS acks ("
+            " topic TEXT NOT NULL, ts REAL NOT NULL, n INTEGER NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_acks ON acks(topic, ts)")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+            conn.execute("PRAGMA busy_timeout=30000")
+            conn.execute("PRAGMA synchronous=FULL")
+            self._local.conn = conn
+        return conn
+
+    def _write(self, fn):
+        """Run ``fn(conn)`` in one IMMEDIATE transaction."""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = fn(conn)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return result
+
+    # ------------------------------------------------------------------ produce
+
+    def put(
+        self,
+        topic: str,
+        message: Any,
+        key: Optional[str] = None,
+        delay: float = 0.0,
+    ) -> bool:
+        """Append one message; False when ``key`` is already unacked."""
+        return self.put_many(topic, [(key, message)], delay=delay) == 1
+
+    def put_many(
+        self,
+        topic: str,
+        messages: Iterable[Tuple[Optional[str], Any]],
+        delay: float = 0.0,
+    ) -> int:
+        """Append ``(key, message)`` pairs in one transaction; returns added."""
+        now = time.time()
+        rows = []
+        for key, message in messages:
+            try:
+                body = pickle.dumps(message, protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception as e:
+                log.warning(
+                    "durable_queue_encode_failed topic=%s key=%s err=%s",
+                    topic,
+                    key,
+                    e.__class__.__name__,
+                )
+                continue
+            rows.append((topic, key, sqlite3.Binary(body), now, now + delay))
+        if not rows:
+            return 0
+
+        def insert(conn):
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO jobs(topic, key, body, enqueued_at, visible_at)"
+                " VALUES(?, ?, ?, ?, ?)",
+                rows,
+            )
+            return conn.total_changes - before
+
+        added = self._write(insert)
+        if added:
+            inc_counter("durable_queue_enqueued_total", added, topic=topic)
+        return added
+
+    # ------------------------------------------------------------------ consume
+
+    def get(
+        self,
+        topic: str,
+        limit: int = 1,
+        visibility_timeout: Optional[float] = None,
+        timeout: float = 0.0,
+        stop: Optional[Any] = None,
+    ) -> List[Job]:
+        """Lease up to ``limit`` visible messages, oldest first.
+
+        Polls for up to ``timeout`` seconds while the topic is empty (or
+        until ``stop``, an Event, is set). Polls of an idle topic are
+        read-only; the write transaction is only opened once a message is
+        visible.
+        """
+        deadline = time.monotonic() + timeout
+        wait = 0.01
+        while True:
+            jobs = (
+                self._lease(topic, limit, visibility_timeout)
+                if self._has_visible(topic)
+                else []
+            )
+            if jobs or time.monotonic() >= deadline:
+                return jobs
+            if stop is not None and stop.is_set():
+                return jobs
+            time.sleep(wait)
+            wait = min(wait * 2, 0.2)
+
+    def _has_visible(self, topic: str) -> bool:
+        row = self._conn().execute(
+            "SELECT 1 FROM jobs WHERE topic = ? AND visible_at <= ? LIMIT 1",
+            (topic, time.time()),
+        ).fetchone()
+        return row is not None
+
+    def _lease(
+        self, topic: str, limit: int, visibility_timeout: Optional[float]
+    ) -> List[Job]:
+        now = time.time()
+        vt = (
+            self.visibility_timeout
+            if visibility_timeout is None
+            else visibility_timeout
+        )
+        lease = uuid.uuid4().hex
+
+        def claim(conn):
+            dead = 0
+            if not topic.endswith(DEAD_SUFFIX):
+                dead = conn.execute(
+                    "UPDATE jobs SET topic = ?, key = NULL, lease = NULL, attempts = 0"
+                    " WHERE topic = ? AND visible_at <= ? AND attempts >= ?",
+                    (topic + DEAD_SUFFIX, topic, now, self.max_attempts),
+                ).rowcount
+            rows = conn.execute(
+                "SELECT id, key, body, attempts, enqueued_at FROM jobs"
+                " WHERE topic = ? AND visible_at <= ? ORDER BY id LIMIT ?",
+                (topic, now, int(limit)),
+            ).fetchall()
+            if rows:
+                conn.executemany(
+                    "UPDATE jobs SET visible_at = ?, attempts = attempts + 1,"
+                    " lease = ? WHERE id = ?",
+                    [(now + vt, lease, row[0]) for row in rows],
+                )
+            return dead, rows
+
+        dead, rows = self._write(claim)
+        if dead:
+            log.warning("durable_queue_dead_lettered topic=%s count=%d", topic, dead)
+            inc_counter("durable_queue_dead_total", dead, topic=topic)
+        jobs = []
+        for job_id, key, body, attempts, enqueued_at in rows:
+            try:
+                message = pickle.loads(body)
+            except Exception as e:
+                log.warning(
+                    "durable_queue_decode_failed topic=%s id=%d err=%s",
+                    topic,
+                    job_id,
+                    e.__class__.__name__,
+                )
+                self._write(
+                    lambda conn, i=job_id: conn.execute(
+                        "UPDATE jobs SET topic = ?, key = NULL WHERE id = ?",
+                        (topic + DEAD_SUFFIX, i),
+                    )
+                )
+                continue
+            jobs.append(
+                Job(job_id, topic, key, message, attempts + 1, enqueued_at, lease)
+            )
+        return jobs
+
+    def ack(self, jobs: JobsArg) -> int:
+        """Delete finished messages; returns how many were still leased.
+
+        A message whose lease expired and was handed to another consumer
+        is left alone, so a slow consumer cannot ack someone else's work.
+        """
+        jobs = _jobs(jobs)
+        if not jobs:
+            return 0
+        now = time.time()
+
+        def delete(conn):
+            before = conn.total_changes
+            conn.executemany(
+                "DELETE FROM jobs WHERE id = ? AND lease = ?",
+                [(job.id, job.lease) for job in jobs],
+            )
+            done = conn.total_changes - before
+            by_topic: Dict[str, int] = {}
+            for job in jobs:
+                by_topic[job.topic] = by_topic.get(job.topic, 0) + 1
+            if done:
+                conn.executemany(
+                    "INSERT INTO acks(topic, ts, n) VALUES(?, ?, ?)",
+                    [(topic, now, n) for topic, n in by_topic.items()],
+                )
+            return done
+
+        done = self._write(delete)
+        if done:
+            inc_counter("durable_queue_acked_total", done, topic=jobs[0].topic)
+        return done
+
+    def nack(self, jobs: JobsArg, delay: float = 0.0) -> int:
+        """Release leased messages for redelivery after ``delay`` seconds."""
+        return self._relet(jobs, delay, release=True)
+
+    def touch(self, jobs: JobsArg, visibility_timeout: Optional[float] = None) -> int:
+        """Extend the lease of messages that are taking a while to process."""
+        vt = (
+            self.visibility_timeout
+            if visibility_timeout is None
+            else visibility_timeout
+        )
+        return self._relet(jobs, vt, release=False)
+
+    def _relet(self, jobs: JobsArg, seconds: float, release: bool) -> int:
+        jobs = _jobs(jobs)
+        if not jobs:
+            return 0
+        visible_at = time.time() + seconds
+
+        def update(conn):
+            before = conn.total_changes
+            conn.executemany(
+                "UPDATE jobs SET visible_at = ?, lease = ? WHERE id = ? AND lease = ?",
+                [
+                    (visible_at, None if release else job.lease, job.id, job.lease)
+                    for job in jobs
+                ],
+            )
+            return conn.total_changes - before
+
+        return self._write(update)
+
+    # ------------------------------------------------------------------ inspect
+
+    def depth(self, topic: Optional[str] = None) -> int:
+        """Unacked messages (ready or leased) on ``topic`` or on every topic."""
+        conn = self._conn()
+        if topic is None:
+            row = conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE topic NOT LIKE ?", ("%" + DEAD_SUFFIX,)
+            ).fetchone()
+        else:
+            row = conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE topic = ?", (topic,)
+            ).fetchone()
+        return int(row[0])
+
+    def topics(self) -> List[str]:
+        """Topics that currently hold messages (dead-letter topics included)."""
+        rows = self._conn().execute("SELECT DISTINCT topic FROM jobs").fetchall()
+        return sorted(row[0] for row in rows)
+
+    def stats(self, topic: str) -> Dict[str, Any]:
+        """Depth, in-flight, dead letters, lag and throughput for ``topic``."""
+        now = time.time()
+        conn = self._conn()
+        ready, in_flight, oldest = conn.execute(
+            "SELECT SUM(lease IS NULL OR visible_at <= ?),"
+            " SUM(lease IS NOT NULL AND visible_at > ?), MIN(enqueued_at)"
+            " FROM jobs WHERE topic = ?",
+            (now, now, topic),
+        ).fetchone()
+        dead = conn.execute(
+            "SELECT COUNT(*) FROM jobs WHERE topic = ?", (topic + DEAD_SUFFIX,)
+        ).fetchone()[0]
+        self._write(
+            lambda c: c.execute(
+                "DELETE FROM acks WHERE ts < ?", (now - THROUGHPUT_WINDOW_SEC,)
+            )
+        )
+        acked = conn.execute(
+            "SELECT COALESCE(SUM(n), 0) FROM acks WHERE topic = ? AND ts >= ?",
+            (topic, now - THROUGHPUT_WINDOW_SEC),
+        ).fetchone()[0]
+        return {
+            "topic": topic,
+            "ready": int(ready or 0),
+            "in_flight": int(in_flight or 0),
+            "dead": int(dead),
+            "lag_seconds": round(now - oldest, 3) if oldest is not None else 0.0,
+            "acked_last_minute": int(acked),
+            "throughput_per_sec": round(acked / THROUGHPUT_WINDOW_SEC, 3),
+        }
+
+    def publish_metrics(self, topic: str) -> Dict[str, Any]:
+        """Mirror ``stats(topic)`` into the metrics registry gauges."""
+        stats = self.stats(topic)
+        set_gauge("durable_queue_depth", stats["ready"], topic=topic)
+        set_gauge("durable_queue_in_flight", stats["in_flight"], topic=topic)
+        set_gauge("durable_queue_dead", stats["dead"], topic=topic)
+        set_gauge("durable_queue_lag_seconds", stats["lag_seconds"], topic=topic)
+        set_gauge(
+            "durable_queue_throughput_per_sec", stats["throughput_per_sec"], topic=topic
+        )
+        return stats
+
+    def clear(self, topic: Optional[str] = None) -> None:
+        """Drop every message on ``topic`` (or the whole queue)."""
+        if topic is None:
+            self._write(lambda c: c.execute("DELETE FROM jobs"))
+        else:
+            self._write(
+                lambda c: c.execute("DELETE FROM jobs WHERE topic = ?", (topic,))
+            )
+
+    def close(self) -> None:
+        """Close this thread's connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+__all__ = ["DEAD_SUFFIX", "DurableQueue", "Job"]
@@ -31,6 +31,7 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from typing import Dict, List, Optional, Tuple
 
+from .cache_registry import BoundedCache, get_cache_registry
 from .models import NewsItem, ScoredItem
 
 log = logging.getLogger(__name__)
@@ -55,7 +56,10 @@ class EnrichmentQueue:
 
     def __init__(self, maxsize: int = 1000):
         self._queue: queue.Queue[EnrichmentTask] = queue.Queue(maxsize=maxsize)
-        self._results: Dict[str, ScoredItem] = {}
+        # Unclaimed results are evicted oldest-first once maxsize is reached
+        self._results = get_cache_registry().register(
+            BoundedCache("enrichment_worker.results", max_entries=maxsize, policy="fifo")
+        )
         self._results_lock = threading.Lock()
 
     def put(self, task: EnrichmentTask, block: bool = True, timeout: Optional[float] = None) -> None:
@@ -279,6 +283,11 @@ class EnrichmentWorker:
                 ticker_tasks[ticker] = []
             ticker_tasks[ticker].append(task)
 
+        # One bulk intraday bar fetch covers RVOL/VWAP/divergence for the batch
+        from .intraday_features import prefetch_features
+
+        prefetch_features(t for t in ticker_tasks if t)
+
         # Submit enrichment jobs for each ticker
         futures = {}
         for ticker, tasks in ticker_tasks.items():
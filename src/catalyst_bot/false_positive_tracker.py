@@ -23,6 +23,7 @@ from typing import Any, Dict, List, Optional, Tuple
 import yfinance as yf
 
 from .logging_utils import get_logger
+from .partitioned_jsonl import has_records, iter_lines
 
 log = get_logger("false_positive_tracker")
 
@@ -64,24 +65,23 @@ def read_accepted_items() -> List[Dict[str, Any]]:
     root, _ = _ensure_fp_dirs()
     accepted_path = root / "data" / "accepted_items.jsonl"
 
-    if not accepted_path.exists():
+    if not has_records(accepted_path):
         log.warning(f"accepted_items_not_found path={accepted_path}")
         return []
 
     items = []
     try:
-        with open(accepted_path, "r", encoding="utf-8") as f:
-            for line_num, line in enumerate(f, 1):
-                line = line.strip()
-                if not line:
-                    continue
-
-                try:
-                    item = json.loads(line)
-                    items.append(item)
-                except json.JSONDecodeError as e:
-                    log.debug(f"invalid_json line={line_num} err={e}")
-                    continue
+        for line_num, line in enumerate(iter_lines(accepted_path), 1):
+            line = line.strip()
+            if not line:
+                continue
+
+            try:
+                item = json.loads(line)
+                items.append(item)
+            except json.JSONDecodeError as e:
+                log.debug(f"invalid_json line={line_num} err={e}")
+                continue
 
         log.info(f"loaded_accepted_items count={len(items)}")
         return items
@@ -0,0 +1,466 @@
+"""Per-source feed polling cadence.
+
+The runner used to sleep a fixed ``cycle_seconds`` between cycles and poll
+every source on every cycle, whether the source publishes every few seconds
+(wire services at the open) or a handful of times per day (SC 13G).  This
+module learns how often each source actually publishes and schedules each
+one on its own interval:
+
+- every poll reports the entry timestamps it saw; timestamps newer than the
+  newest one already seen are publishes, and the gaps between them feed an
+  exponentially weighted moving average (EWMA) of the publish interval
+- polls that produce nothing new (including 304 Not Modified answers from
+  :class:`~catalyst_bot.feed_state_manager.FeedStateManager`) count the
+  silence since the last publish as a lower bound on the current gap, so
+  sources that go quiet drift to slower polling
+- when a 200 response has no datable entries, the feed's ``Last-Modified``
+  header is used as the publish time instead
+- sources that never expose timestamps back off geometrically while quiet
+  and reset on the next poll with new items
+
+A source is polled about twice per expected publish gap (clamped to
+``FEED_SCHED_MIN_SEC`` .. ``FEED_SCHED_MAX_SEC``).  The interval is scaled by
+the market session using the existing ``*_CYCLE_SEC`` ratios from
+:func:`~catalyst_bot.market_hours.get_cycle_seconds`, and shortened further
+for the first ``FEED_SCHED_OPEN_WINDOW_MIN`` minutes after the regular open.
+
+``feeds.fetch_pr_feeds`` only polls sources that are due, and the runner
+sleeps until the next source is due (never longer than the market-hours
+cycle), so a hot source is fetched and processed as soon as it is due
+instead of on the next fixed tick.
+
+Environment
+-----------
+FEATURE_FEED_SCHEDULER : bool
+    Enable adaptive per-source polling (default 0).
+FEED_SCHED_MIN_SEC : float
+    Shortest poll interval for any source (default 15).
+FEED_SCHED_MAX_SEC : float
+    Longest poll interval for any source (default 600).
+FEED_SCHED_BASE_SEC : float
+    Interval for sources with no cadence history yet (default 60).
+FEED_SCHED_OPEN_WINDOW_MIN : float
+    Minutes after 9:30 ET treated as the open rush (default 30).
+FEED_SCHED_OPEN_FACTOR : float
+    Interval multiplier during the open rush (default 0.5).
+FEED_SCHED_STATE_PATH : str
+    Where learned cadences persist (default data/feed_schedule.json).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, fields
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+from .logging_utils import get_logger
+from .market_hours import ET, get_cycle_seconds, get_market_status
+from .metrics_registry import inc_counter, set_gauge
+
+log = get_logger("feed_scheduler")
+
+DEFAULT_STATE_PATH = "data/feed_schedule.json"
+
+# Poll about twice per expected publish gap
+POLL_FRACTION = 0.5
+# Weight of the newest gap in the EWMA
+EWMA_ALPHA = 0.3
+# Backoff per quiet poll for sources without usable timestamps
+QUIET_BACKOFF = 1.5
+# Shortest sleep the runner takes between cycles
+MIN_WAIT_SEC = 1.0
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, "") or default)
+    except ValueError:
+        return default
+
+
+def scheduler_enabled() -> bool:
+    """True when FEATURE_FEED_SCHEDULER is on."""
+    return os.getenv("FEATURE_FEED_SCHEDULER", "0").strip().lower() in (
+        "1",
+        "true",
+        "yes",
+        "on",
+    )
+
+
+def session_factor(now: float, open_window_min: float, open_factor: float) -> float:
+    """Interval multiplier for the market session at epoch ``now``.
+
+    Extended and closed sessions reuse the ratios between the configured
+    ``*_CYCLE_SEC`` values (60/90/180 by default gives 1, 1.5 and 3).  The
+    first ``open_window_min`` minutes of the regular session use
+    ``open_factor``.
+    """
+    dt = datetime.fromtimestamp(now, tz=timezone.utc)
+    status = get_market_status(dt)
+    if status == "regular":
+        et = dt.astimezone(ET)
+        since_open = (et.hour * 60 + et.minute) - (9 * 60 + 30)
+        if since_open < open_window_min:
+            return open_factor
+        return 1.0
+    regular = get_cycle_seconds("regular") or 1
+    return get_cycle_seconds(status) / regular
+
+
+@dataclass
+class SourceCadence:
+    """Learned polling state for one source."""
+
+    interval: float
+    next_due: float = 0.0
+    last_poll: float = 0.0
+    gap_ewma: Optional[float] = None  # seconds between publishes
+    last_publish: Optional[float] = None  # epoch of the newest entry seen
+    quiet_polls: int = 0
+    polls: int = 0
+    hits: int = 0
+    not_modified: int = 0
+    errors: int = 0
+
+
+class FeedScheduler:
+    """Decide which feed sources are due and learn their publish cadence.
+
+    Thread-safe; feeds may record polls from worker threads while the
+    runner asks for the next wake-up time.
+    """
+
+    def __init__(
+        self,
+        state_path: Optional[Path] = None,
+        min_interval: Optional[float] = None,
+        max_interval: Optional[float] = None,
+        base_interval: Optional[float] = None,
+        open_window_min: Optional[float] = None,
+        open_factor: Optional[float] = None,
+        clock: Callable[[], float] = time.time,
+        factor_fn: Optional[Callable[[float], float]] = None,
+    ):
+        self.state_path = Path(
+            state_path or os.getenv("FEED_SCHED_STATE_PATH") or DEFAULT_STATE_PATH
+        )
+        self.min_interval = (
+            min_interval
+            if min_interval is not None
+            else _env_float("FEED_SCHED_MIN_SEC", 15.0)
+        )
+        self.max_interval = max(
+            self.min_interval,
+            (
+                max_interval
+                if max_interval is not None
+                else _env_float("FEED_SCHED_MAX_SEC", 600.0)
+            ),
+        )
+        self.base_interval = (
+            base_interval
+            if base_interval is not None
+            else _env_float("FEED_SCHED_BASE_SEC", 60.0)
+        )
+        self.open_window_min = (
+            open_window_min
+            if open_window_min is not None
+            else _env_float("FEED_SCHED_OPEN_WINDOW_MIN", 30.0)
+        )
+        self.open_factor = (
+            open_factor
+            if open_factor is not None
+            else _env_float("FEED_SCHED_OPEN_FACTOR", 0.5)
+        )
+        self._clock = clock
+        self._factor_fn = factor_fn or (
+            lambda now: session_factor(now, self.open_window_min, self.open_factor)
+        )
+        self._lock = threading.Lock()
+        self.sources: Dict[str, SourceCadence] = {}
+        self._periodic: Dict[str, float] = {}
+        self._cycle_polls = 0
+        self._cycle_errors = 0
+        self._load()
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _load(self) -> None:
+        if not self.state_path.exists():
+            return
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+            known = {f.name for f in fields(SourceCadence)}
+            for src, state in (raw.get("sources") or {}).items():
+                state = {k: v for k, v in state.items() if k in known}
+                self.sources[src] = SourceCadence(**state)
+            log.debug("feed_schedule_loaded sources=%d", len(self.sources))
+        except Exception as e:
+            log.warning(
+                "feed_schedule_load_error file=%s err=%s",
+                self.state_path,
+                e.__class__.__name__,
+            )
+            self.sources = {}
+
+    def save(self) -> None:
+        """Persist learned cadences with an atomic write."""
+        with self._lock:
+            payload = {"sources": {src: asdict(st) for src, st in self.sources.items()}}
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_file = self.state_path.with_suffix(".json.tmp")
+            with open(temp_file, "w", encoding="utf-8") as f:
+                json.dump(payload, f, indent=2, sort_keys=True)
+            temp_file.replace(self.state_path)
+        except Exception as e:
+            log.warning(
+                "feed_schedule_save_error file=%s err=%s",
+                self.state_path,
+                e.__class__.__name__,
+            )
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+
+    def _state(self, source: str) -> SourceCadence:
+        st = self.sources.get(source)
+        if st is None:
+            st = SourceCadence(interval=self.base_interval)
+            self.sources[source] = st
+        return st
+
+    def due(self, sources: Iterable[str], now: Optional[float] = None) -> List[str]:
+        """Return the subset of ``sources`` whose next poll time has passed.
+
+        Sources seen for the first time are always due.
+        """
+        now = self._clock() if now is None else now
+        with self._lock:
+            return [src for src in sources if self._state(src).next_due <= now]
+
+    def is_due(self, source: str, now: Optional[float] = None) -> bool:
+        return bool(self.due([source], now))
+
+    def periodic_due(
+        self, name: str, every: Optional[float] = None, now: Optional[float] = None
+    ) -> bool:
+        """Fixed-interval gate for per-cycle work that has no cadence of its own.
+
+        Returns True (and starts a new period) at most once per ``every``
+        seconds, which defaults to the market-hours cycle length, so such
+        work keeps the pace it had under fixed-interval cycles.
+        """
+        now = self._clock() if now is None else now
+        if every is None:
+            every = float(
+                get_cycle_seconds(
+                    get_market_status(datetime.fromtimestamp(now, tz=timezone.utc))
+                )
+            )
+        with self._lock:
+            last = self._periodic.get(name)
+            if last is not None and now - last < every:
+                return False
+            self._periodic[name] = now
+            return True
+
+    def record_poll(
+        self,
+        source: str,
+        published: Iterable[float] = (),
+        not_modified: bool = False,
+        error: bool = False,
+        now: Optional[float] = None,
+    ) -> int:
+        """Record one poll of ``source`` and schedule its next one.
+
+        Parameters
+        ----------
+        published : iterable of float
+            Epoch timestamps of the entries the poll returned.
+        not_modified : bool
+            The server answered 304 Not Modified.
+        error : bool
+            The poll failed; the interval is kept as is.
+
+        Returns
+        -------
+        int
+            Number of entries newer than anything seen before.
+        """
+        now = self._clock() if now is None else now
+        with self._lock:
+            st = self._state(source)
+            st.polls += 1
+            st.last_poll = now
+            self._cycle_polls += 1
+
+            if error:
+                st.errors += 1
+                self._cycle_errors += 1
+                st.next_due = now + st.interval
+                return 0
+
+            if not_modified:
+                st.not_modified += 1
+
+            seeded = st.last_publish is not None
+            fresh = sorted(
+                t
+                for t in published
+                if t <= now + 60 and (not seeded or t > st.last_publish)
+            )
+            prev = st.last_publish
+            for t in fresh:
+                if prev is not None:
+                    self._observe_gap(st, max(t - prev, 1.0))
+                prev = t
+            if fresh:
+                st.last_publish = fresh[-1]
+
+            new_count = len(fresh) if seeded else 0
+            if new_count:
+                st.hits += 1
+                st.quiet_polls = 0
+            else:
+                st.quiet_polls += 1
+                # Censored observation: the current gap is at least this long
+                if st.gap_ewma is not None and st.last_publish is not None:
+                    silence = now - st.last_publish
+                    if silence > st.gap_ewma:
+                        self._observe_gap(st, silence)
+
+            st.interval = self._interval_for(st, now)
+            st.next_due = now + st.interval
+            return new_count
+
+    def _observe_gap(self, st: SourceCadence, gap: float) -> None:
+        if st.gap_ewma is None:
+            st.gap_ewma = gap
+        else:
+            st.gap_ewma = EWMA_ALPHA * gap + (1.0 - EWMA_ALPHA) * st.gap_ewma
+
+    def _interval_for(self, st: SourceCadence, now: float) -> float:
+        if st.gap_ewma is not None:
+            interval = st.gap_ewma * POLL_FRACTION
+        else:
+            interval = self.base_interval * QUIET_BACKOFF ** min(st.quiet_polls, 10)
+        try:
+            interval *= self._factor_fn(now)
+        except Exception:
+            pass
+        return min(max(interval, self.min_interval), self.max_interval)
+
+    def seconds_until_due(self, now: Optional[float] = None) -> Optional[float]:
+        """Seconds until the next tracked source is due (None if none tracked)."""
+        now = self._clock() if now is None else now
+        with self._lock:
+            if not self.sources:
+                return None
+            return max(0.0, min(st.next_due for st in self.sources.values()) - now)
+
+    def next_wait(self, ceiling: float, now: Optional[float] = None) -> float:
+        """How long the runner should sleep before the next cycle."""
+        wait = self.seconds_until_due(now)
+        if wait is None:
+            return ceiling
+        return min(max(wait, MIN_WAIT_SEC), ceiling)
+
+    # ------------------------------------------------------------------
+    # Cycle bookkeeping
+    # ------------------------------------------------------------------
+
+    def begin_cycle(self) -> None:
+        with self._lock:
+            self._cycle_polls = 0
+            self._cycle_errors = 0
+
+    def cycle_quiet(self) -> bool:
+        """True unless every poll in the current cycle failed.
+
+        An empty cycle is then expected (sources not due, 304s, nothing
+        new) rather than a sign of a feed outage.
+        """
+        with self._lock:
+            return self._cycle_errors == 0 or self._cycle_errors < self._cycle_polls
+
+    def end_cycle(self) -> None:
+        """Publish gauges and persist state after a fetch pass."""
+        with self._lock:
+            polls = self._cycle_polls
+            intervals = [st.interval for st in self.sources.values()]
+        inc_counter("feed_sched_polls_total", polls)
+        if intervals:
+            set_gauge("feed_sched_min_interval_seconds", min(intervals))
+            set_gauge("feed_sched_max_interval_seconds", max(intervals))
+        self.save()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-source interval, learned gap and poll counters."""
+        with self._lock:
+            return {
+                src: {
+                    "interval": round(st.interval, 1),
+                    "gap": round(st.gap_ewma, 1) if st.gap_ewma else 0.0,
+                    "polls": st.polls,
+                    "hits": st.hits,
+                    "not_modified": st.not_modified,
+                }
+                for src, st in self.sources.items()
+            }
+
+
+# ============================================================================
+# Module-level access
+# ============================================================================
+
+_scheduler: Optional[FeedScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_feed_scheduler() -> FeedScheduler:
+    """Return the process-wide scheduler, creating it on first use."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = FeedScheduler()
+        return _scheduler
+
+
+def active_scheduler() -> Optional[FeedScheduler]:
+    """The scheduler when FEATURE_FEED_SCHEDULER is on, else None."""
+    if not scheduler_enabled():
+        return None
+    return get_feed_scheduler()
+
+
+def entry_epochs(items: Iterable[dict]) -> List[float]:
+    """Parse the ISO ``ts`` of normalized feed items into epoch seconds.
+
+    Items flagged ``ts_estimated`` (no date in the feed, stamped with the
+    poll time) are skipped: they say when we polled, not when it published.
+    """
+    out: List[float] = []
+    for it in items:
+        ts = it.get("ts") if isinstance(it, dict) else None
+        if not ts or it.get("ts_estimated"):
+            continue
+        try:
+            dt = datetime.fromisoformat(str(ts).replace("Z", "+00:00"))
+        except ValueError:
+            continue
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        out.append(dt.timestamp())
+    return out
@@ -28,6 +28,7 @@ from __future__ import annotations
 import json
 import logging
 import threading
+from email.utils import parsedate_to_datetime
 from pathlib import Path
 from typing import Dict, Optional, Union
 
@@ -209,6 +210,27 @@ class FeedStateManager:
                     bool(last_modified),
                 )
 
+    def last_modified_at(self, feed_url: str) -> Optional[float]:
+        """Return the feed's cached Last-Modified header as epoch seconds.
+
+        Used by the feed scheduler as a publish time when a changed feed
+        has no datable entries.
+
+        Args:
+            feed_url: RSS feed URL
+
+        Returns:
+            Epoch seconds, or None if no parseable Last-Modified is cached
+        """
+        with self._lock:
+            value = self.state.get(feed_url, {}).get("last_modified")
+        if not value:
+            return None
+        try:
+            return parsedate_to_datetime(value).timestamp()
+        except (TypeError, ValueError):
+            return None
+
     def should_skip(self, status_code: int) -> bool:
         """Check if 304 Not Modified status indicates no new content.
 
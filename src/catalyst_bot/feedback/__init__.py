@@ -7,6 +7,7 @@ Real-time alert performance tracking and keyword weight auto-adjustment.
 This module provides:
 - Alert performance database tracking
 - Price/volume monitoring over multiple timeframes
+- Batched outcome scheduling (one bar fetch per ticker)
 - Outcome scoring (win/loss/neutral)
 - Keyword weight recommendations based on real outcomes
 - Weekly performance reports
@@ -21,7 +22,9 @@ from .database import (
     record_alert,
     update_outcome,
     update_performance,
+    update_performance_batch,
 )
+from .outcome_scheduler import DueOutcome, OutcomeScheduler, due_outcomes
 from .outcome_scorer import calculate_outcome, score_pending_alerts
 from .price_tracker import run_tracker_loop, track_alert_performance
 from .weekly_report import generate_weekly_report
@@ -31,6 +34,7 @@ __all__ = [
     "init_database",
     "record_alert",
     "update_performance",
+    "update_performance_batch",
     "update_outcome",
     "get_alert_performance",
     "get_alerts_by_keyword",
@@ -38,6 +42,9 @@ __all__ = [
     "get_performance_stats",
     "track_alert_performance",
     "run_tracker_loop",
+    "DueOutcome",
+    "OutcomeScheduler",
+    "due_outcomes",
     "calculate_outcome",
     "score_pending_alerts",
     "analyze_keyword_performance",
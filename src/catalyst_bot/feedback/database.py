@@ -302,6 +302,76 @@ def update_performance(
         conn.close()
 
 
+def update_performance_batch(updates: List[Dict[str, Any]]) -> int:
+    """
+    Apply many timeframe updates in a single transaction.
+
+    Each update is a dict with the keyword arguments of
+    :func:`update_performance` (``alert_id``, ``timeframe`` and any of
+    ``price``, ``volume``, ``price_change``, ``volume_change``).
+
+    Parameters
+    ----------
+    updates : list of dict
+        Updates to apply
+
+    Returns
+    -------
+    int
+        Number of (alert, timeframe) rows updated; 0 if the transaction
+        was rolled back
+    """
+    if not updates:
+        return 0
+
+    conn = _get_connection()
+    try:
+        now = int(time.time())
+        cursor = conn.cursor()
+        updated = 0
+
+        for update in updates:
+            timeframe = update.get("timeframe")
+            if timeframe not in ("15m", "1h", "4h", "1d"):
+                log.error(
+                    "invalid_timeframe alert_id=%s timeframe=%s",
+                    update.get("alert_id"),
+                    timeframe,
+                )
+                continue
+
+            assignments = []
+            params: List[Any] = []
+            for field in ("price", "volume", "price_change", "volume_change"):
+                value = update.get(field)
+                if value is not None:
+                    assignments.append(f"{field}_{timeframe} = ?")
+                    params.append(value)
+
+            assignments.append("updated_at = ?")
+            params.extend([now, update.get("alert_id")])
+
+            cursor.execute(
+                f"UPDATE alert_performance SET {', '.join(assignments)} "
+                "WHERE alert_id = ?",
+                params,
+            )
+            updated += cursor.rowcount
+
+        conn.commit()
+        log.debug("performance_batch_updated rows=%d", updated)
+        return updated
+
+    except Exception as e:
+        log.error(
+            "update_performance_batch_failed count=%d error=%s", len(updates), str(e)
+        )
+        conn.rollback()
+        return 0
+    finally:
+        conn.close()
+
+
 def update_outcome(alert_id: str, outcome: str, score: float) -> bool:
     """
     Update the outcome classification and score for an alert.
@@ -0,0 +1,374 @@
+"""
+Outcome Scheduler
+=================
+
+Shared scheduling and price resolution for alert outcome tracking.
+
+The three outcome trackers (feedback price tracker, breakout feedback and
+the MOA rejected-item tracker) all answer the same question: "what was the
+price of TICKER at ``anchor + horizon``?". They used to answer it with one
+live quote per (alert, horizon) pair, recorded at whatever time the tracker
+happened to run, followed by one write per pair.
+
+This module:
+1. Turns pending records into due (key, horizon) pairs
+2. Groups them by ticker and fetches ONE bar set per ticker through the
+   shared bar store (only uncovered spans hit the provider)
+3. Resolves each pair to the close of the last bar completed by its target
+   time, so a late run still records the price at the horizon
+4. Falls back to one bulk quote call for targets so recent that the bars
+   have not caught up yet
+
+Persistence stays with each tracker, which commits all resolved outcomes
+in a single transaction / file rewrite.
+
+Usage:
+    from catalyst_bot.feedback.outcome_scheduler import (
+        OutcomeScheduler,
+        due_outcomes,
+    )
+
+    due = due_outcomes(alert_id, ticker, posted_at, HORIZONS, missing, now)
+    resolved = OutcomeScheduler().resolve(due)
+"""
+
+from __future__ import annotations
+
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from ..bar_store import INTERVAL_SECONDS, BarStore, get_bar_store
+from ..logging_utils import get_logger
+
+log = get_logger("feedback.outcome_scheduler")
+
+try:
+    import yfinance as yf
+except Exception:
+    yf = None
+
+# Intraday bar interval used to resolve outcome prices
+OUTCOME_BAR_INTERVAL = "5m"
+
+# yfinance serves 5m bars for the last 60 days only; older targets are
+# resolved from daily bars
+INTRADAY_MAX_AGE_DAYS = 59
+
+# Targets newer than this may be priced from a live quote when the bars
+# have not caught up yet (provider delay)
+QUOTE_FALLBACK_SECONDS = 1800
+
+# Maximum distance between a target and the bar used to price it. Covers
+# overnight and weekend gaps for intraday bars and long weekends for daily
+MAX_BAR_STALENESS_SECONDS = 4 * 86400
+
+BarFetcher = Callable[[str, datetime, datetime], Any]
+QuoteFetcher = Callable[[List[str]], Dict[str, Tuple[Optional[float], Optional[float]]]]
+
+
+@dataclass(frozen=True)
+class DueOutcome:
+    """An (alert, horizon) pair whose target time has passed."""
+
+    key: Any
+    ticker: str
+    horizon: str
+    anchor_ts: float
+    target_ts: float
+
+
+@dataclass(frozen=True)
+class ResolvedOutcome:
+    """Price observed for a due outcome."""
+
+    due: DueOutcome
+    price: float
+    volume: Optional[float]
+    price_ts: float
+    source: str  # "bars" or "quote"
+
+
+def due_outcomes(
+    key: Any,
+    ticker: str,
+    anchor_ts: float,
+    horizons: Dict[str, float],
+    pending: Iterable[str],
+    now: Optional[float] = None,
+) -> List[DueOutcome]:
+    """
+    Return the pending horizons whose target time has passed.
+
+    Parameters
+    ----------
+    key : Any
+        Caller's identifier for the record (alert_id, composite key, ...)
+    ticker : str
+        Ticker symbol
+    anchor_ts : float
+        Epoch seconds the horizons are measured from (alert post time)
+    horizons : dict
+        Mapping of horizon label -> offset in seconds
+    pending : iterable of str
+        Horizon labels that still have no outcome
+    now : float, optional
+        Current epoch seconds (default: time.time())
+
+    Returns
+    -------
+    list of DueOutcome
+    """
+    now = time.time() if now is None else now
+    ticker = (ticker or "").strip().upper()
+    if not ticker:
+        return []
+
+    due = []
+    for horizon in pending:
+        offset = horizons.get(horizon)
+        if offset is None:
+            continue
+        target_ts = float(anchor_ts) + float(offset)
+        if target_ts <= now:
+            due.append(
+                DueOutcome(
+                    key=key,
+                    ticker=ticker,
+                    horizon=horizon,
+                    anchor_ts=float(anchor_ts),
+                    target_ts=target_ts,
+                )
+            )
+    return due
+
+
+def _fetch_outcome_bars(ticker: str, start: datetime, end: datetime) -> Any:
+    """
+    Fetch intraday bars (incl. extended hours) for ``[start, end)``.
+
+    Returns None on failure so the bar store retries the span next run.
+    """
+    if yf is None:
+        return None
+    try:
+        return yf.download(
+            ticker,
+            start=start,
+            end=end,
+            interval=OUTCOME_BAR_INTERVAL,
+            prepost=True,
+            auto_adjust=False,
+            progress=False,
+        )
+    except Exception as e:
+        log.debug("outcome_bars_fetch_failed ticker=%s error=%s", ticker, str(e))
+        return None
+
+
+def _fetch_daily_bars(ticker: str, start: datetime, end: datetime) -> Any:
+    """Fetch daily bars for ``[start, end)`` from yfinance."""
+    if yf is None:
+        return None
+    try:
+        return yf.download(
+            ticker,
+            start=start,
+            end=end,
+            interval="1d",
+            auto_adjust=False,
+            progress=False,
+        )
+    except Exception as e:
+        log.debug("outcome_daily_fetch_failed ticker=%s error=%s", ticker, str(e))
+        return None
+
+
+def _default_quotes(
+    tickers: List[str],
+) -> Dict[str, Tuple[Optional[float], Optional[float]]]:
+    from ..market import batch_get_prices
+
+    return batch_get_prices(tickers)
+
+
+class OutcomeScheduler:
+    """
+    Resolve due outcomes with one bar fetch per ticker.
+
+    Parameters
+    ----------
+    bar_store : BarStore, optional
+        Store used for bar reads/writes (default: shared store)
+    bar_fetcher : callable, optional
+        ``fetcher(ticker, start, end)`` for intraday bars
+    daily_fetcher : callable, optional
+        ``fetcher(ticker, start, end)`` for daily bars (old targets)
+    quote_fetcher : callable, optional
+        ``quotes(tickers) -> {ticker: (last_price, change_pct)}``
+    interval : str, optional
+        Intraday bar interval (default: OUTCOME_BAR_INTERVAL)
+    """
+
+    def __init__(
+        self,
+        bar_store: Optional[BarStore] = None,
+        bar_fetcher: Optional[BarFetcher] = None,
+        daily_fetcher: Optional[BarFetcher] = None,
+        quote_fetcher: Optional[QuoteFetcher] = None,
+        interval: str = OUTCOME_BAR_INTERVAL,
+    ):
+        self.bar_store = bar_store or get_bar_store()
+        self.bar_fetcher = bar_fetcher or _fetch_outcome_bars
+        self.daily_fetcher = daily_fetcher or _fetch_daily_bars
+        self.quote_fetcher = quote_fetcher or _default_quotes
+        self.interval = interval
+        self.stats = {"tickers": 0, "bars": 0, "quotes": 0, "unresolved": 0}
+
+    def _load_series(
+        self, ticker: str, interval: str, start_ts: float, end_ts: float
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return (bar_end_ts, close, volume) arrays for one ticker."""
+        step = INTERVAL_SECONDS[interval]
+        fetcher = self.bar_fetcher if interval == self.interval else self.daily_fetcher
+        start = datetime.fromtimestamp(start_ts - step, tz=timezone.utc)
+        end = datetime.fromtimestamp(end_ts + step, tz=timezone.utc)
+        try:
+            frame = self.bar_store.get_bars(ticker, interval, start, end, fetcher)
+        except Exception as e:
+            log.warning(
+                "outcome_bars_unavailable ticker=%s interval=%s error=%s",
+                ticker,
+                interval,
+                str(e),
+            )
+            empty = np.array([], dtype=float)
+            return empty, empty, empty
+
+        if frame.empty:
+            empty = np.array([], dtype=float)
+            return empty, empty, empty
+
+        closes = frame["Close"].to_numpy(dtype=float)
+        valid = ~np.isnan(closes)
+        starts = frame.index.asi8[valid] // 1_000_000_000
+        return (
+            starts.astype(float) + step,
+            closes[valid],
+            frame["Volume"].to_numpy(dtype=float)[valid],
+        )
+
+    @staticmethod
+    def _price_at(
+        series: Tuple[np.ndarray, np.ndarray, np.ndarray], target_ts: float
+    ) -> Optional[Tuple[float, Optional[float], float]]:
+        """Close of the last bar completed by ``target_ts``."""
+        ends, closes, volumes = series
+        idx = int(np.searchsorted(ends, target_ts, side="right")) - 1
+        if idx < 0:
+            return None
+        if target_ts - ends[idx] > MAX_BAR_STALENESS_SECONDS:
+            return None
+        volume = volumes[idx]
+        return (
+            float(closes[idx]),
+            None if np.isnan(volume) else float(volume),
+            float(ends[idx]),
+        )
+
+    def resolve(
+        self, due: Iterable[DueOutcome], now: Optional[float] = None
+    ) -> List[ResolvedOutcome]:
+        """
+        Resolve prices for all due outcomes.
+
+        Bars are fetched once per (ticker, interval) over the span covering
+        all of that ticker's targets. Targets the bars cannot price yet fall
+        back to a single bulk quote call when they are recent enough; the
+        rest stay unresolved and are retried on the next run.
+
+        Parameters
+        ----------
+        due : iterable of DueOutcome
+            Outcomes to resolve
+        now : float, optional
+            Current epoch seconds (default: time.time())
+
+        Returns
+        -------
+        list of ResolvedOutcome
+        """
+        now = time.time() if now is None else now
+        intraday_cutoff = now - INTRADAY_MAX_AGE_DAYS * 86400
+
+        groups: Dict[Tuple[str, str], List[DueOutcome]] = defaultdict(list)
+        for item in due:
+            interval = self.interval if item.anchor_ts >= intraday_cutoff else "1d"
+            groups[(item.ticker, interval)].append(item)
+
+        if not groups:
+            return []
+
+        resolved: List[ResolvedOutcome] = []
+        needs_quote: List[DueOutcome] = []
+
+        for (ticker, interval), items in groups.items():
+            self.stats["tickers"] += 1
+            start_ts = min(item.anchor_ts for item in items)
+            end_ts = min(max(item.target_ts for item in items), now)
+            series = self._load_series(ticker, interval, start_ts, end_ts)
+
+            for item in items:
+                hit = self._price_at(series, item.target_ts)
+                # Bars that end well before a recent target are just lagging
+                lagging = hit is not None and item.target_ts - hit[2] > (
+                    2 * INTERVAL_SECONDS[interval]
+                )
+                if hit is not None and not (
+                    lagging and now - item.target_ts <= QUOTE_FALLBACK_SECONDS
+                ):
+                    price, volume, price_ts = hit
+                    resolved.append(
+                        ResolvedOutcome(item, price, volume, price_ts, "bars")
+                    )
+                    self.stats["bars"] += 1
+                elif now - item.target_ts <= QUOTE_FALLBACK_SECONDS:
+                    needs_quote.append(item)
+                else:
+                    self.stats["unresolved"] += 1
+
+        if needs_quote:
+            tickers = sorted({item.ticker for item in needs_quote})
+            try:
+                quotes = self.quote_fetcher(tickers) or {}
+            except Exception as e:
+                log.warning("outcome_quotes_failed error=%s", str(e))
+                quotes = {}
+            for item in needs_quote:
+                price = (quotes.get(item.ticker) or (None, None))[0]
+                if price is None or price <= 0:
+                    self.stats["unresolved"] += 1
+                    continue
+                resolved.append(ResolvedOutcome(item, float(price), None, now, "quote"))
+                self.stats["quotes"] += 1
+
+        log.debug(
+            "outcomes_resolved due=%d resolved=%d tickers=%d quotes=%d",
+            sum(len(v) for v in groups.values()),
+            len(resolved),
+            len(groups),
+            len(needs_quote),
+        )
+        return resolved
+
+
+__all__ = [
+    "DueOutcome",
+    "OutcomeScheduler",
+    "ResolvedOutcome",
+    "due_outcomes",
+]
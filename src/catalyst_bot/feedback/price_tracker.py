@@ -13,10 +13,18 @@ from typing import Optional, Tuple
 
 from ..logging_utils import get_logger
 from ..market import get_last_price_snapshot
-from .database import get_pending_updates, update_performance
+from .database import get_pending_updates, update_performance_batch
+from .outcome_scheduler import OutcomeScheduler, due_outcomes
 
 log = get_logger("feedback.price_tracker")
 
+# Tracked timeframes (seconds after the alert was posted)
+TIMEFRAME_SECONDS = {"15m": 900, "1h": 3600, "4h": 14400, "1d": 86400}
+
+# Alerts stay pending long enough for the 1d outcome to be filled from
+# bars even when a run is late
+TRACKING_MAX_AGE_HOURS = 48
+
 try:
     import yfinance as yf
 except Exception:
@@ -72,102 +80,88 @@ def track_alert_performance() -> int:
     Track performance for all pending alerts.
 
     This function:
-    1. Queries pending alerts (posted within last 24 hours)
-    2. Determines which timeframes need updates based on time elapsed
-    3. Fetches current price and volume
+    1. Queries pending alerts (posted within TRACKING_MAX_AGE_HOURS)
+    2. Determines which (alert, timeframe) pairs are due
+    3. Resolves each pair to the price at ``posted_at + timeframe`` using
+       one bar fetch per unique ticker (see outcome_scheduler)
     4. Calculates percentage changes
-    5. Updates the database
+    5. Writes all updates in a single transaction
 
     Returns
     -------
     int
-        Number of alerts updated
+        Number of (alert, timeframe) pairs updated
     """
     log.debug("track_alert_performance_start")
 
-    pending = get_pending_updates(max_age_hours=24)
+    pending = get_pending_updates(max_age_hours=TRACKING_MAX_AGE_HOURS)
     if not pending:
         log.debug("no_pending_alerts_to_track")
         return 0
 
     now = time.time()
-    updated_count = 0
+    due = []
+    alerts = {}
 
     for alert in pending:
-        alert_id = alert["alert_id"]
-        ticker = alert["ticker"]
-        posted_at = alert["posted_at"]
-        posted_price = alert.get("posted_price")
-
-        time_elapsed = now - posted_at
-
-        # Determine which timeframes to update
-        timeframes_to_check = []
-
-        # 15 minutes (900 seconds)
-        if time_elapsed >= 900 and alert["price_15m"] is None:
-            timeframes_to_check.append("15m")
-
-        # 1 hour (3600 seconds)
-        if time_elapsed >= 3600 and alert["price_1h"] is None:
-            timeframes_to_check.append("1h")
-
-        # 4 hours (14400 seconds)
-        if time_elapsed >= 14400 and alert["price_4h"] is None:
-            timeframes_to_check.append("4h")
-
-        # 1 day (86400 seconds)
-        if time_elapsed >= 86400 and alert["price_1d"] is None:
-            timeframes_to_check.append("1d")
+        missing = [tf for tf in TIMEFRAME_SECONDS if alert.get(f"price_{tf}") is None]
+        alert_due = due_outcomes(
+            alert["alert_id"],
+            alert["ticker"],
+            alert["posted_at"],
+            TIMEFRAME_SECONDS,
+            missing,
+            now,
+        )
+        if alert_due:
+            alerts[alert["alert_id"]] = alert
+            due.extend(alert_due)
 
-        if not timeframes_to_check:
-            continue
+    if not due:
+        return 0
 
-        # Fetch current price and volume
-        current_price, current_volume = get_current_price_volume(ticker)
+    resolved = OutcomeScheduler().resolve(due, now=now)
 
-        if current_price is None:
-            log.debug(
-                "price_unavailable_skipping alert_id=%s ticker=%s",
-                alert_id,
-                ticker,
-            )
-            continue
+    updates = []
+    for outcome in resolved:
+        alert = alerts[outcome.due.key]
+        posted_price = alert.get("posted_price")
 
         # Calculate price change
         price_change = None
         if posted_price and posted_price > 0:
-            price_change = ((current_price - posted_price) / posted_price) * 100
-
-        # Calculate volume change (if we have reference volume)
-        # For now, we'll store absolute volume and calculate change later
-        # when we have baseline volume data
-        volume_change = None
-
-        # Update all applicable timeframes
-        for tf in timeframes_to_check:
-            success = update_performance(
-                alert_id=alert_id,
-                timeframe=tf,
-                price=current_price,
-                volume=current_volume,
-                price_change=price_change,
-                volume_change=volume_change,
-            )
-
-            if success:
-                updated_count += 1
-                log.info(
-                    "performance_tracked alert_id=%s ticker=%s timeframe=%s "
-                    "price=%.2f change=%.2f%%",
-                    alert_id,
-                    ticker,
-                    tf,
-                    current_price,
-                    price_change or 0.0,
-                )
-
-    log.info("track_alert_performance_complete updated=%d", updated_count)
+            price_change = ((outcome.price - posted_price) / posted_price) * 100
+
+        # Volume change needs a baseline volume, which alerts do not carry yet
+        updates.append(
+            {
+                "alert_id": outcome.due.key,
+                "timeframe": outcome.due.horizon,
+                "price": outcome.price,
+                "volume": outcome.volume,
+                "price_change": price_change,
+                "volume_change": None,
+            }
+        )
+        log.info(
+            "performance_tracked alert_id=%s ticker=%s timeframe=%s "
+            "price=%.2f change=%.2f%% source=%s",
+            outcome.due.key,
+            outcome.due.ticker,
+            outcome.due.horizon,
+            outcome.price,
+            price_change or 0.0,
+            outcome.source,
+        )
+
+    updated_count = update_performance_batch(updates)
+
+    log.info(
+        "track_alert_performance_complete updated=%d due=%d tickers=%d",
+        updated_count,
+        len(due),
+        len({d.ticker for d in due}),
+    )
     return updated_count
 
 
@@ -10,6 +10,7 @@ import os
 import random
 import re
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from io import StringIO
 from typing import Any, Dict, List, Optional, Tuple, Union
@@ -34,7 +35,7 @@ except ImportError:
     AIOHTTP_AVAILABLE = False
     aiohttp = None  # type: ignore
 
-from . import market
+from . import feed_scheduler, market
 
 # NOTE: Import the entire market module instead of directly importing
 # get_last_price_snapshot.  This allows tests to monkeypatch the
@@ -51,12 +52,15 @@ from .classify_bridge import classify_text
 # preferentially instantiate Settings() for watchlist and screener
 # configuration.
 from .config import Settings, get_settings
+from .cycle_profiler import record_span
 from .feed_state_manager import FeedStateManager
 from .logging_utils import get_logger
 from .market import get_volatility
+from .metrics_registry import inc_counter, observe
 from .ticker_validation import TickerValidator
 from .utils.event_loop_manager import run_async
 from .watchlist import load_watchlist_set
+from .wire_feed_parser import is_wire_source, parse_wire_feed
 
 # --- Simulation mode support -----------------------------------------------
 # When running in simulation mode, feeds can be injected from MockFeedProvider
@@ -513,6 +517,12 @@ _TICKER_VALIDATOR = TickerValidator()
 # Global feed state manager for conditional requests (ETags, Last-Modified)
 _feed_state_manager = FeedStateManager()
 
+# Worker pool for feed parsing/normalization (kept off the event loop)
+_parse_executor: Optional[ThreadPoolExecutor] = None
+
+# Last FMP sentiment map, reused between refreshes under the feed scheduler
+_fmp_sentiment_cache: Dict[str, float] = {}
+
 
 def _apply_refined_dedup(items: List[Dict]) -> List[Dict]:
     """Apply first-seen + source-weighted deduplication.
@@ -574,6 +584,31 @@ def _env_int(name: str, default: int) -> int:
         return default
 
 
+def _schedule_record(src: str, status: int, items: List[Dict], url: str = "") -> None:
+    """Report one source poll to the adaptive feed scheduler (if enabled).
+
+    Entry timestamps are the publish observations; a changed feed with no
+    datable entries falls back to its cached Last-Modified header.
+    """
+    sched = feed_scheduler.active_scheduler()
+    if sched is None:
+        return
+    try:
+        published = feed_scheduler.entry_epochs(items)
+        if status == 200 and not published and url:
+            last_modified = _feed_state_manager.last_modified_at(url)
+            if last_modified:
+                published = [last_modified]
+        sched.record_poll(
+            src,
+            published,
+            not_modified=status == 304,
+            error=status not in (200, 304),
+        )
+    except Exception as e:
+        log.debug("feed_schedule_record_failed source=%s err=%s", src, e)
+
+
 USER_AGENT = "CatalystBot/1.0 (+https://example.local)"
 
 # --- Reliable default feeds (no auth required) ---
@@ -1080,8 +1115,10 @@ def _normalize_entry(source: str, e) -> Optional[Dict]:
         or getattr(e, "pubDate", None)
     )
     ts_iso = _to_utc_iso(published)
-    # Fallback to current time for RSS feeds without valid timestamps
-    if not ts_iso:
+    # Fallback to current time for RSS feeds without valid timestamps; flagged
+    # so the feed scheduler does not read it as a publish
+    ts_estimated = not ts_iso
+    if ts_estimated:
         ts_iso = sim_now().isoformat()
     guid = getattr(e, "id", None) or getattr(e, "guid", None)
 
@@ -1127,7 +1164,7 @@ def _normalize_entry(source: str, e) -> Optional[Dict]:
         ticker = None
         ticker_source = None
 
-    return {
+    item = {
         "id": _stable_id(source, link, guid),
         "title": title,
         "link": link,
@@ -1137,6 +1174,9 @@ def _normalize_entry(source: str, e) -> Optional[Dict]:
         "summary": summary or None,
         "ticker_source": ticker_source,
     }
+    if ts_estimated:
+        item["ts_estimated"] = True
+    return item
 
 
 # --- helpers used by the Finviz block ---------------------------------------
@@ -1230,7 +1270,10 @@ async def _enrich_sec_filing_with_llm(
         if raw_summary:
             doc_hash = hashlib.md5(raw_summary[:1000].encode()).hexdigest()[:8]
 
-        cached_result = cache.get_cached_sec_analysis(
+        # Exact tier only: the Atom summary is EDGAR boilerplate that looks
+        # alike across filings, so it must not feed the semantic tier
+        cached_result = await asyncio.to_thread(
+            cache.get_cached_sec_analysis,
             filing_id=filing_id,
             ticker=ticker,
             filing_type=filing_type,
@@ -1272,7 +1315,8 @@ async def _enrich_sec_filing_with_llm(
             )
 
             # Cache the result
-            cache.cache_sec_analysis(
+            await asyncio.to_thread(
+                cache.cache_sec_analysis,
                 filing_id=filing_id,
                 ticker=ticker,
                 filing_type=filing_type,
@@ -1533,6 +1577,73 @@ async def _enrich_sec_items_batch(
 # -------------------------- Public API --------------------------------------
 
 
+def _max_age_minutes_for(source: str) -> int:
+    """Freshness window applied to ``source`` items by fetch_pr_feeds.
+
+    SEC filings use a separate, longer window since the SEC Atom feed has
+    inherent delays. 0 disables the freshness filter.
+    """
+    if (source or "").startswith("sec_"):
+        return _env_int("SEC_MAX_AGE_MINUTES", 480)
+    return _env_int("NEWS_MAX_AGE_MINUTES", 10)
+
+
+def _get_parse_executor() -> ThreadPoolExecutor:
+    """Lazily create the shared feed parsing pool (FEED_PARSE_WORKERS)."""
+    global _parse_executor
+    if _parse_executor is None:
+        _parse_executor = ThreadPoolExecutor(
+            max_workers=max(1, _env_int("FEED_PARSE_WORKERS", 4)),
+            thread_name_prefix="feed-parse",
+        )
+    return _parse_executor
+
+
+def _parse_feed_text(src: str, text: str) -> Tuple[List[Dict], Dict[str, Any]]:
+    """Parse and normalize one feed payload.
+
+    Wire feeds (GlobeNewswire, BusinessWire, PRNewswire, SEC Atom) go
+    through the streaming lxml parser, which stops once entries fall
+    outside the source's freshness window. Other sources, and wire payloads
+    that are not well-formed, use feedparser.
+
+    Returns
+    -------
+    Tuple[List[Dict], Dict[str, Any]]
+        (normalized_items, parse_metrics) where parse_metrics holds
+        ``entries``, ``parser``, ``parse_ms`` and ``stopped_early``.
+    """
+    st = time.perf_counter()
+    entries = None
+    parser = "feedparser"
+    stopped_early = False
+
+    if is_wire_source(src):
+        result = parse_wire_feed(
+            text, max_age_minutes=_max_age_minutes_for(src), now=sim_now()
+        )
+        if result is not None:
+            entries, stopped_early = result
+            parser = "wire"
+
+    if entries is None:
+        parsed = feedparser.parse(text)
+        entries = getattr(parsed, "entries", []) or []
+
+    items = []
+    for e in entries:
+        it = _normalize_entry(src, e)
+        if it:
+            items.append(it)
+
+    return items, {
+        "entries": len(entries),
+        "parser": parser,
+        "parse_ms": round((time.perf_counter() - st) * 1000.0, 1),
+        "stopped_early": int(stopped_early),
+    }
+
+
 async def _fetch_feeds_async_concurrent(
     feeds_dict: Dict[str, List[str]], env_overrides: Dict[str, str]
 ) -> Tuple[List[Dict], Dict[str, Any]]:
@@ -1589,6 +1700,7 @@ async def _fetch_feeds_async_concurrent(
                 s["entries"] = 0
                 s["t_ms"] = round((time.time() - st) * 1000.0, 1)
                 log.debug(f"feed_304_not_modified source={src} url={used_url[:60]}")
+                _schedule_record(src, 304, [], used_url)
                 return src, [], s
 
             if status != 200 or not text:
@@ -1605,21 +1717,20 @@ async def _fetch_feeds_async_concurrent(
                 else:
                     s["errors"] += 1
                 s["t_ms"] = round((time.time() - st) * 1000.0, 1)
+                _schedule_record(src, 599, [], used_url)
                 return src, [], s
 
-            # Parse feed (feedparser is synchronous but fast)
-            parsed = feedparser.parse(text)
-            entries = getattr(parsed, "entries", []) or []
-            s["entries"] = len(entries)
-
-            items = []
-            for e in entries:
-                it = _normalize_entry(src, e)
-                if it:
-                    items.append(it)
+            # Parse + normalize in the worker pool so large payloads do not
+            # stall the other in-flight fetches on the event loop
+            loop = asyncio.get_running_loop()
+            items, parse_stats = await loop.run_in_executor(
+                _get_parse_executor(), _parse_feed_text, src, text
+            )
+            s.update(parse_stats)
 
             s["ok"] += 1
             s["t_ms"] = round((time.time() - st) * 1000.0, 1)
+            _schedule_record(src, 200, items, used_url)
             return src, items, s
 
         except Exception as e:
@@ -1630,6 +1741,7 @@ async def _fetch_feeds_async_concurrent(
             )
             s["errors"] += 1
             s["t_ms"] = round((time.time() - st) * 1000.0, 1)
+            _schedule_record(src, 599, [])
             return src, [], s
 
     # Create aiohttp session with connection pooling
@@ -1674,8 +1786,16 @@ def fetch_pr_feeds(seen_store=None) -> List[Dict]:
         )
         return sim_items
 
+    # Adaptive scheduling: only poll the sources whose cadence says they
+    # are due (all of them when FEATURE_FEED_SCHEDULER is off)
+    sched = feed_scheduler.active_scheduler()
+    due_feeds = FEEDS
+    if sched is not None:
+        sched.begin_cycle()
+        due_feeds = {src: FEEDS[src] for src in sched.due(FEEDS)}
+
     all_items: List[Dict] = []
-    summary = {"sources": len(FEEDS), "items": 0, "t_ms": 0.0, "by_source": {}}
+    summary = {"sources": len(due_feeds), "items": 0, "t_ms": 0.0, "by_source": {}}
     t0 = time.time()
 
     # ---------------- Finnhub: Real-time news & catalysts (opt-in) ----------------
@@ -1688,10 +1808,11 @@ def fetch_pr_feeds(seen_store=None) -> List[Dict]:
                 is_finnhub_enabled,
             )
 
-            if is_finnhub_enabled():
+            if is_finnhub_enabled() and (sched is None or sched.is_due("finnhub")):
                 st = time.time()
                 finnhub_news = fetch_finnhub_news(max_items=30)
                 finnhub_earnings = fetch_finnhub_earnings_calendar(days_ahead=1)
+                _schedule_record("finnhub", 200, finnhub_news)
 
                 _seen_ids = {i.get("id") for i in all_items if i.get("id")}
                 _seen_links = {i.get("link") for i in all_items if i.get("link")}
@@ -1721,6 +1842,7 @@ def fetch_pr_feeds(seen_store=None) -> List[Dict]:
                 )
         except Exception as e:
             log.warning("finnhub_feeds_error err=%s", str(e.__class__.__name__))
+            _schedule_record("finnhub", 599, [])
             summary["by_source"]["finnhub"] = {
                 "ok": 0,
                 "http4": 0,
@@ -1739,12 +1861,13 @@ def fetch_pr_feeds(seen_store=None) -> List[Dict]:
             "true",
             "yes",
             "on",
-        }:
+        } and (sched is None or sched.is_due("finviz_news")):
             st = time.time()
             try:
                 _seen_ids = {i.get("id") for i in all_items if i.get("id")}
                 _seen_links = {i.get("link") for i in all_items if i.get("link")}
                 finviz_items = _fetch_finviz_news_from_env()
+                _schedule_record("finviz_news", 200, finviz_items)
                 finviz_unique = [
                     it
                     for it in finviz_items
@@ -1800,6 +1923,7 @@ def fetch_pr_feeds(seen_store=None) -> List[Dict]:
                     )
                 summary.setdefault("by_source", {})
                 summary["by_source"]["finviz_news"] = err_metrics
+                _schedule_record("finviz_news", 599, [])
 
         # ---------------- Optional Finviz news export CSV feed (opt-in) ----------------
         # When FEATURE_FINVIZ_NEWS_EXPORT=1 and a FINVIZ_NEWS_EXPORT_URL is set in the
@@ -1812,6 +1936,7 @@ def fetch_pr_feeds(seen_store=None) -> List[Dict]:
             settings.feature_finviz_news_export
             and settings.finviz_news_export_url
             and os.environ.get("PYTEST_CURRENT_TEST") is None
+            and (sched is None or sched.is_due("finviz_export"))
         ):
             st = time.time()
             try:
@@ -1820,6 +1945,7 @@ def fetch_pr_feeds(seen_store=None) -> List[Dict]:
                 export_items = _fetch_finviz_news_export(
                     settings.finviz_news_export_url
                 )
+                _schedule_record("finviz_export", 200, export_items)
                 export_unique = [
                     it
                     for it in export_items
@@ -1852,6 +1978,7 @@ def fetch_pr_feeds(seen_store=None) -> List[Dict]:
                 log.warning(
                     "finviz_export_error err=%s", e.__class__.__name__, exc_info=True
                 )
+                _schedule_record("finviz_export", 599, [])
 
     # -----------------------------------------------------------------------------
     # Patch‑2: proactive breakout scanner
@@ -1865,7 +1992,11 @@ def fetch_pr_feeds(seen_store=None) -> List[Dict]:
     except Exception:
         settings = None
     try:
-        if settings and getattr(settings, "feature_breakout_scanner", False):
+        if (
+            settings
+            and getattr(settings, "feature_breakout_scanner", False)
+            and (sched is None or sched.periodic_due("breakout_scanner"))
+        ):
             # Use thresholds from settings; defaults applied in config
             bv = getattr(settings, "breakout_min_avg_vol", 300000.0)
             rv = getattr(settings, "breakout_min_relvol", 1.5)
@@ -1890,11 +2021,12 @@ def fetch_pr_feeds(seen_store=None) -> List[Dict]:
     if AIOHTTP_AVAILABLE:
         try:
             feed_items, feed_summary = run_async(
-                _fetch_feeds_async_concurrent(FEEDS, ENV_URL_OVERRIDES), timeout=30.0
+                _fetch_feeds_async_concurrent(due_feeds, ENV_URL_OVERRIDES),
+                timeout=30.0,
             )
             all_items.extend(feed_items)
             summary["by_source"].update(feed_summary)
-            log.info("async_feeds_complete sources=%d mode=concurrent", len(FEEDS))
+            log.info("async_feeds_complete sources=%d mode=concurrent", len(due_feeds))
         except Exception as e:
             log.warning(
                 "async_feeds_failed err=%s falling_back_to_sync",
@@ -1909,7 +2041,7 @@ def fetch_pr_feeds(seen_store=None) -> List[Dict]:
 
     # Fallback: sequential sync fetching (original code path)
     if not AIOHTTP_AVAILABLE or not locals().get("AIOHTTP_AVAILABLE_FALLBACK", False):
-        for src, url_list in FEEDS.items():
+        for src, url_list in due_feeds.items():
             # Optional single-URL override via env
             if ENV_URL_OVERRIDES.get(src):
                 url_list = [ENV_URL_OVERRIDES[src]]  # type: ignore[index]
@@ -1935,6 +2067,7 @@ def fetch_pr_feeds(seen_store=None) -> List[Dict]:
                 s["t_ms"] = round((time.time() - st) * 1000.0, 1)
                 summary["by_source"][src] = s
                 log.debug(f"feed_304_not_modified source={src} url={used_url[:60]}")
+                _schedule_record(src, 304, [], used_url)
                 continue
 
             if status != 200 or not text:
@@ -1952,21 +2085,18 @@ def fetch_pr_feeds(seen_store=None) -> List[Dict]:
                     s["errors"] += 1
                 s["t_ms"] = round((time.time() - st) * 1000.0, 1)
                 summary["by_source"][src] = s
+                _schedule_record(src, 599, [], used_url)
                 continue
 
             try:
-                parsed = feedparser.parse(text)
-                entries = getattr(parsed, "entries", []) or []
-                s["entries"] = len(entries)
-                items = []
-                for e in entries:
-                    it = _normalize_entry(src, e)
-                    if it:
-                        items.append(it)
+                items, parse_stats = _parse_feed_text(src, text)
+                s.update(parse_stats)
                 all_items.extend(items)
                 s["ok"] += 1
+                _schedule_record(src, 200, items, used_url)
             except Exception:
                 s["errors"] += 1
+                _schedule_record(src, 599, [], used_url)
 
             s["t_ms"] = round((time.time() - st) * 1000.0, 1)
             summary["by_source"][src] = s
@@ -1984,10 +2114,8 @@ def fetch_pr_feeds(seen_store=None) -> List[Dict]:
     # SEC filings use a separate, longer freshness window since the SEC RSS feed
     # has inherent delays (filings can take hours to appear in the Atom feed).
     # SEC filings are official documents and remain actionable longer than news.
-    max_age_min = int(os.getenv("NEWS_MAX_AGE_MINUTES", "10"))
-    sec_max_age_min = int(
-        os.getenv("SEC_MAX_AGE_MINUTES", "480")
-    )  # 8 hours default for SEC
+    max_age_min = _max_age_minutes_for("news")
+    sec_max_age_min = _max_age_minutes_for("sec_")  # 8 hours default for SEC
 
     # Separate SEC items from news items for different freshness windows
     sec_items = [it for it in all_items if it.get("source", "").startswith("sec_")]
@@ -2040,10 +2168,15 @@ def fetch_pr_feeds(seen_store=None) -> List[Dict]:
     # When the feature flag is enabled, fetch the sentiment RSS feed once
     # per cycle and merge the resulting scores into each item.  We perform
     # this step after deduplication so that identical links map correctly.
-    try:
-        fmp_sents = fetch_fmp_sentiment()
-    except Exception:
-        fmp_sents = {}
+    # Under the adaptive scheduler cycles are shorter, so the feed is
+    # refreshed once per market-hours cycle and reused in between.
+    global _fmp_sentiment_cache
+    if sched is None or sched.periodic_due("fmp_sentiment"):
+        try:
+            _fmp_sentiment_cache = fetch_fmp_sentiment()
+        except Exception:
+            _fmp_sentiment_cache = {}
+    fmp_sents = _fmp_sentiment_cache
     try:
         attach_fmp_sentiment(all_items, fmp_sents)
     except Exception:
@@ -2903,6 +3036,21 @@ def fetch_pr_feeds(seen_store=None) -> List[Dict]:
     summary["bandwidth_savings_pct"] = bandwidth_savings_pct
     summary["feeds_skipped_304"] = not_modified_count
 
+    if sched is not None:
+        summary["sources_not_due"] = len(FEEDS) - len(due_feeds)
+        sched.end_cycle()
+
+    observe("feeds_fetch_seconds", summary["t_ms"] / 1000.0)
+    for src_name, stats in by_source.items():
+        try:
+            src_seconds = stats.get("t_ms", 0) / 1000.0
+            observe("feed_source_seconds", src_seconds, source=src_name)
+            record_span(f"feed:{src_name}", src_seconds)
+            if stats.get("errors", 0):
+                inc_counter("feed_errors_total", stats["errors"], source=src_name)
+        except Exception:
+            pass
+
     # Emit a concise summary line instead of dumping the entire dictionary.
     try:
         parts: list[str] = []
@@ -4,6 +4,9 @@ This module provides a lightweight HTTP server that exposes multiple health endp
 - /health/ping - Simple "ok" response for uptime monitoring
 - /health - Basic health status
 - /health/detailed - Comprehensive health metrics with GPU, disk, services
+- /metrics - Prometheus text exposition (when FEATURE_METRICS_ENDPOINT=1)
+- POST /interactions - Discord interactions, ACKed immediately and finished
+  on the interaction_service worker pools
 
 WAVE 2.3: 24/7 Deployment Infrastructure
 
@@ -21,12 +24,13 @@ import os
 import threading
 import time
 from datetime import datetime, timezone
-from http.server import BaseHTTPRequestHandler, HTTPServer
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from typing import Any, Dict
 
 try:
     from .health_monitor import get_health_status, is_healthy
     from .logging_utils import get_logger
+    from .metrics_registry import get_registry, metrics_endpoint_enabled
 except Exception:
     import logging
 
@@ -41,6 +45,11 @@ except Exception:
     def is_healthy():
         return True
 
+    get_registry = None
+
+    def metrics_endpoint_enabled():
+        return False
+
 
 log = get_logger("health_endpoint")
 
@@ -122,6 +131,8 @@ class HealthCheckHandler(BaseHTTPRequestHandler):
             self._handle_detailed()
         elif self.path == "/health":
             self._handle_health()
+        elif self.path == "/metrics" and metrics_endpoint_enabled():
+            self._handle_metrics()
         elif self.path == "/":
             self._handle_root()
         else:
@@ -150,6 +161,8 @@ class HealthCheckHandler(BaseHTTPRequestHandler):
             b"  GET /health          - Basic health status\n"
             b"  GET /health/detailed - Comprehensive metrics\n"
         )
+        if metrics_endpoint_enabled():
+            msg += b"  GET /metrics          - Prometheus metrics\n"
         self.wfile.write(msg)
 
     def _handle_ping(self):
@@ -168,6 +181,10 @@ class HealthCheckHandler(BaseHTTPRequestHandler):
             # Merge with existing _HEALTH_STATUS for backward compatibility
             health["start_time"] = _HEALTH_STATUS.get("start_time")
 
+            # Last snapshot published by the cycle loop (no recomputation)
+            if get_registry is not None:
+                health["metrics"] = get_registry().snapshot()
+
             status_code = 200 if health.get("status") == "healthy" else 503
 
             self.send_response(status_code)
@@ -189,6 +206,20 @@ class HealthCheckHandler(BaseHTTPRequestHandler):
             }
             self.wfile.write(json.dumps(error_response).encode())
 
+    def _handle_metrics(self):
+        """Prometheus text exposition of the in-process metrics registry."""
+        try:
+            body = get_registry().render_prometheus().encode()
+        except Exception as e:
+            log.error(f"metrics_endpoint_error err={e.__class__.__name__}")
+            self.send_response(500)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.end_headers()
+        self.wfile.write(body)
+
     def _handle_health(self):
         """Health endpoint returns JSON status."""
         # Calculate staleness - if last cycle was > 5 minutes ago, mark degraded
@@ -219,104 +250,76 @@ class HealthCheckHandler(BaseHTTPRequestHandler):
         self.end_headers()
         self.wfile.write(json.dumps(response, indent=2).encode())
 
-    def _handle_discord_interaction(self):
-        """Handle Discord interaction (component interactions, slash commands).
+    def _send_json(self, code: int, payload: Any) -> None:
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(json.dumps(payload).encode())
 
-        WARNING: This endpoint is missing Discord signature verification.
-        If exposed publicly, it MUST implement signature verification using
-        X-Signature-Ed25519 and X-Signature-Timestamp headers.
+    def _handle_discord_interaction(self):
+        """Handle Discord interactions (PING, slash commands, components).
 
-        See interaction_server.py for reference implementation with
-        verify_discord_signature() from discord_interactions module.
+        Work is handed to ``interaction_service``: chart buttons and slow
+        slash commands are ACKed with a deferred response and finished on
+        worker pools, so a slow render never blocks health probes or other
+        clicks.
 
-        For production use, either:
-        1. Add signature verification (requires DISCORD_PUBLIC_KEY)
-        2. Only expose via authenticated proxy/tunnel
-        3. Use interaction_server.py instead
+        Requests are verified with X-Signature-Ed25519 when
+        DISCORD_PUBLIC_KEY is set.  Without a key only PINGs are answered;
+        commands and components (chart renders included) are refused, since
+        they start work and follow-up webhooks built from caller data.
         """
         try:
-            # TODO: Add Discord signature verification before production deployment
-            # signature = self.headers.get("X-Signature-Ed25519", "")
-            # timestamp = self.headers.get("X-Signature-Timestamp", "")
-            # if PUBLIC_KEY and not verify_discord_signature(
-            #     signature, timestamp, body, PUBLIC_KEY
-            # ):
-            #     return 401 Unauthorized
-
             # Read request body
             content_length = int(self.headers.get("Content-Length", 0))
             body = self.rfile.read(content_length)
 
+            public_key = os.getenv("DISCORD_PUBLIC_KEY", "")
+            if public_key:
+                from .discord_interactions import verify_discord_signature
+
+                signature = self.headers.get("X-Signature-Ed25519", "")
+                timestamp = self.headers.get("X-Signature-Timestamp", "")
+                if not verify_discord_signature(signature, timestamp, body, public_key):
+                    self._send_json(401, {"error": "Invalid signature"})
+                    return
+
             # Parse interaction payload
             interaction = json.loads(body.decode())
-
-            # Route based on interaction type
             interaction_type = interaction.get("type")
 
-            # Type 1: PING (Discord verification)
-            if interaction_type == 1:
-                self.send_response(200)
-                self.send_header("Content-Type", "application/json")
-                self.end_headers()
-                self.wfile.write(json.dumps({"type": 1}).encode())
+            # Anything beyond a PING needs a verified request
+            if not public_key and interaction_type != 1:
+                log.warning(
+                    "interaction_refused reason=no_public_key type=%s",
+                    interaction_type,
+                )
+                self._send_json(401, {"error": "Signature verification required"})
                 return
 
-            # Type 3: MESSAGE_COMPONENT (button/select menu interactions)
-            elif interaction_type == 3:
-                custom_id = interaction.get("data", {}).get("custom_id", "")
-
-                # Route chart indicator toggle interactions
-                if custom_id.startswith("chart_toggle_"):
-                    try:
-                        from .commands.chart_interactions import (
-                            handle_chart_indicator_toggle,
-                        )
-
-                        response = handle_chart_indicator_toggle(interaction)
-
-                        self.send_response(200)
-                        self.send_header("Content-Type", "application/json")
-                        self.end_headers()
-                        self.wfile.write(json.dumps(response).encode())
-                        return
-
-                    except Exception as e:
-                        log.error(f"chart_interaction_error err={e}", exc_info=True)
-                        # Return generic error to user, log full details server-side
-                        error_response = {
-                            "type": 4,
-                            "data": {
-                                "content": "❌ Error processing chart interaction",
-                                "flags": 64,
-                            },
-                        }
-                        self.send_response(200)
-                        self.send_header("Content-Type", "application/json")
-                        self.end_headers()
-                        self.wfile.write(json.dumps(error_response).encode())
-                        return
-
-            # Unknown interaction type
-            log.warning(f"unknown_interaction_type type={interaction_type}")
-            self.send_response(400)
-            self.send_header("Content-Type", "application/json")
-            self.end_headers()
-            error = {"error": "Unknown interaction type"}
-            self.wfile.write(json.dumps(error).encode())
+            from .interaction_service import get_interaction_service
+
+            response = get_interaction_service().handle(interaction)
+            if response is None:
+                log.warning(f"unknown_interaction_type type={interaction_type}")
+                self._send_json(400, {"error": "Unknown interaction type"})
+                return
+            self._send_json(200, response)
 
         except Exception as e:
             log.error(f"interaction_handler_error err={e}", exc_info=True)
-            self.send_response(500)
-            self.send_header("Content-Type", "application/json")
-            self.end_headers()
             # Return generic error to client, log full details server-side
-            error = {"error": "Internal server error"}
-            self.wfile.write(json.dumps(error).encode())
+            self._send_json(500, {"error": "Internal server error"})
 
 
 def _run_server(port: int):
-    """Run the health check HTTP server (blocking)."""
-    server = HTTPServer(("0.0.0.0", port), HealthCheckHandler)
+    """Run the health check HTTP server (blocking).
+
+    Each request gets its own thread so a slow request (e.g. a detailed
+    health probe or an interaction) never blocks the others.
+    """
+    server = ThreadingHTTPServer(("0.0.0.0", port), HealthCheckHandler)
+    server.daemon_threads = True
     log.info("health_server_started port=%d", port)
 
     try:
@@ -11,6 +11,11 @@ Process:
 4. Write to rejected_items.jsonl and outcomes.jsonl
 5. Support checkpoint/resume for long-running scrapes
 
+Sharded mode (--workers N) splits the range into month shards: feeds are
+fetched in one rate-limited stage, shards are classified and priced in a
+process pool with a checkpoint each, and shard output is merged into the
+JSONL files in chronological order.
+
 Author: Claude Code (MOA Phase 2.5B)
 Date: 2025-10-11
 """
@@ -18,13 +23,14 @@ Date: 2025-10-11
 from __future__ import annotations
 
 import argparse
-import hashlib
 import json
+import multiprocessing
 import os
-import pickle
 import random
+import shutil
 import threading
 import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta, timezone
 from functools import wraps
 from pathlib import Path
@@ -43,6 +49,7 @@ _env_path = Path(".") / ".env"
 if _env_path.exists():
     load_dotenv(_env_path)
 
+from .bar_store import BarStore  # noqa: E402
 from .classify import classify  # noqa: E402
 from .config import get_settings  # noqa: E402
 from .discord_transport import post_discord_with_backoff  # noqa: E402
@@ -89,6 +96,12 @@ ALL_TIMEFRAMES = {
 RATE_LIMIT_SECONDS = 0.5  # Legacy yfinance rate limit (kept for compatibility)
 FINNHUB_RATE_LIMIT = 1.2  # Finnhub: 50 calls/min = 1 call per 1.2 seconds (with buffer)
 
+# Sharded execution: feed fetches share one token bucket (SEC asks for at
+# most 10 requests/second), shards span SHARD_DAYS like the monthly loop
+SEC_REQUESTS_PER_SECOND = 5.0
+FEED_FETCH_THREADS = 4
+SHARD_DAYS = 30
+
 # Phase 2: Bulk fetching configuration
 BULK_FETCH_BATCH_SIZE = 10  # Number of tickers to fetch per batch
 CACHE_TTL_DAYS = 30  # Cache validity in days
@@ -298,97 +311,94 @@ def _extract_sec_ticker(title: str) -> Optional[str]:
         return None
 
 
-def _fetch_finnhub_price(
-    ticker: str, date: datetime, resolution: str = "D"
-) -> Optional[float]:
+def _fetch_finnhub_bars(
+    ticker: str, start: datetime, end: datetime, resolution: str = "D"
+) -> Optional[List[Dict[str, Any]]]:
     """
-    Fetch historical price from Finnhub API.
+    Fetch historical candles from Finnhub API.
 
     Args:
         ticker: Stock ticker symbol
-        date: Date to fetch price for
+        start: Range start
+        end: Range end
         resolution: Resolution (D=daily, 60=hourly, 15=15min, etc.)
 
     Returns:
-        Close price at that date, or None if unavailable
+        List of bar dicts (t/o/h/l/c/v), empty if Finnhub has no data for the
+        range, or None if the request failed
     """
     if not _finnhub_client:
         log.warning("finnhub_client_not_initialized")
         return None
 
     try:
-        # Convert date to UNIX timestamp
         # Finnhub expects timestamps in seconds (not milliseconds)
-        start_ts = int(date.timestamp())
-        # Add 1 day buffer to ensure we get the data
-        end_ts = int((date + timedelta(days=2)).timestamp())
-
-        # Fetch candles from Finnhub
-        # Resolution: D (daily), 60 (hourly), 15 (15-min), etc.
-        response = _finnhub_client.stock_candles(ticker, resolution, start_ts, end_ts)
+        response = _finnhub_client.stock_candles(
+            ticker, resolution, int(start.timestamp()), int(end.timestamp())
+        )
 
-        # Check response status
-        if not response or response.get("s") != "ok":
+        if not response:
+            return None
+        if response.get("s") == "no_data":
+            return []
+        if response.get("s") != "ok":
             log.debug(
-                f"finnhub_no_data ticker={ticker} date={date.date()} "
-                f"status={response.get('s') if response else 'none'}"
+                f"finnhub_no_data ticker={ticker} start={start.date()} "
+                f"status={response.get('s')}"
             )
             return None
 
-        # Extract close prices
-        closes = response.get("c", [])
-        if not closes:
-            return None
-
-        # Return the last close price (closest to our target date)
-        return float(closes[-1])
+        keys = ("t", "o", "h", "l", "c", "v")
+        columns = [response.get(k) or [] for k in keys]
+        return [dict(zip(keys, row)) for row in zip(*columns)]
 
     except Exception as e:
-        log.debug(f"finnhub_fetch_failed ticker={ticker} date={date.date()} err={e}")
+        log.debug(f"finnhub_fetch_failed ticker={ticker} start={start.date()} err={e}")
         return None
 
 
-# ============================================================================
-# Phase 2 Optimizations: Bulk Fetching and Multi-Level Caching
-# ============================================================================
-
-
-def _get_cache_key(ticker: str, date: datetime) -> str:
+def _fetch_finnhub_price(
+    ticker: str, date: datetime, resolution: str = "D"
+) -> Optional[float]:
     """
-    Generate cache key for price data.
+    Fetch historical price from Finnhub API.
 
     Args:
-        ticker: Stock ticker
-        date: Date for price lookup
+        ticker: Stock ticker symbol
+        date: Date to fetch price for
+        resolution: Resolution (D=daily, 60=hourly, 15=15min, etc.)
 
     Returns:
-        Cache key string
+        Close price at that date, or None if unavailable
     """
-    date_str = date.strftime("%Y-%m-%d")
-    return f"{ticker}_{date_str}"
+    # Add 1 day buffer to ensure we get the data
+    bars = _fetch_finnhub_bars(ticker, date, date + timedelta(days=2), resolution)
+    if not bars:
+        return None
+
+    # Return the last close price (closest to our target date)
+    return float(bars[-1]["c"])
+
+
+# ============================================================================
+# Phase 2 Optimizations: Bulk Fetching and Shared Bar Store
+# ============================================================================
 
 
-def _get_disk_cache_path(cache_dir: Path, ticker: str, date: datetime) -> Path:
+def _daily_price_window(date: datetime) -> Tuple[datetime, datetime]:
     """
-    Get disk cache file path for a ticker/date combination.
+    Daily bar window used to resolve the price for a date.
 
     Args:
-        cache_dir: Cache directory path
-        ticker: Stock ticker
         date: Date for price lookup
 
     Returns:
-        Path to cache file
+        (start, end) covering the prior day through the target day
     """
-    # Use hash to create subdirectories and avoid too many files in one dir
-    cache_key = _get_cache_key(ticker, date)
-    key_hash = hashlib.md5(cache_key.encode()).hexdigest()
-
-    # Create 2-level directory structure: first 2 chars / next 2 chars
-    subdir = cache_dir / key_hash[:2] / key_hash[2:4]
-    subdir.mkdir(parents=True, exist_ok=True)
-
-    return subdir / f"{cache_key}.pkl"
+    day = date.astimezone(timezone.utc).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+    return day - timedelta(days=1), day + timedelta(days=1)
 
 
 class HistoricalBootstrapper:
@@ -445,13 +455,13 @@ class HistoricalBootstrapper:
         self.rejected_path = Path("data/rejected_items.jsonl")
         self.outcomes_path = Path("data/moa/outcomes.jsonl")
         self.checkpoint_path = Path("data/moa/bootstrap_checkpoint.json")
-        self.cache_dir = Path("data/cache/bootstrapper")
+        self.shard_root = Path("data/moa/bootstrap_shards")
+        self.bar_store = BarStore(Path(os.getenv("BAR_STORE_DIR", "data/bars")))
 
         # Create directories
         self.rejected_path.parent.mkdir(parents=True, exist_ok=True)
         self.outcomes_path.parent.mkdir(parents=True, exist_ok=True)
         self.checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
 
         # Statistics
         self.stats = {
@@ -475,6 +485,13 @@ class HistoricalBootstrapper:
         self._price_cache: Dict[Tuple[str, str], float] = {}
         self._cache_lock = threading.Lock()
 
+        # Shared by every feed fetch (sequential loop and sharded fetch stage)
+        self.sec_limiter = SECRateLimiter(SEC_REQUESTS_PER_SECOND)
+
+        # Seconds between Finnhub calls; shard workers stretch it so the
+        # pool as a whole stays within the per-key limit
+        self.finnhub_rate_limit = FINNHUB_RATE_LIMIT
+
         # Discord notifications
         self._last_progress_time = time.time()
         self._progress_interval = 900  # 15 minutes between progress updates
@@ -578,26 +595,307 @@ class HistoricalBootstrapper:
                 log.error(f"bootstrap_feed_failed source={source} err={e}")
                 self.stats["errors"] += 1
 
-        # Deduplicate by ID
+        unique_items = self._dedupe_items(all_items)
+
+        # Process in batches
+        for i in range(0, len(unique_items), self.batch_size):
+            batch = unique_items[i : i + self.batch_size]
+            self._process_batch(batch)
+
+    def _dedupe_items(self, all_items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Drop items without an ID or already seen in this run (keeps order)."""
         unique_items = []
-        seen_ids = set()
         for item in all_items:
             item_id = item.get("id", "")
-            if (
-                item_id
-                and item_id not in seen_ids
-                and item_id not in self._processed_ids
-            ):
+            if item_id and item_id not in self._processed_ids:
                 unique_items.append(item)
-                seen_ids.add(item_id)
                 self._processed_ids.add(item_id)
 
         log.info(f"bootstrap_dedup total={len(all_items)} unique={len(unique_items)}")
+        return unique_items
 
-        # Process in batches
-        for i in range(0, len(unique_items), self.batch_size):
-            batch = unique_items[i : i + self.batch_size]
-            self._process_batch(batch)
+    # ========================================================================
+    # Sharded Execution
+    # ========================================================================
+
+    def _shard_windows(self) -> List[Tuple[datetime, datetime]]:
+        """Split [start_date, end_date) into SHARD_DAYS windows (oldest first)."""
+        windows = []
+        current = self.start_date
+        while current < self.end_date:
+            window_end = min(current + timedelta(days=SHARD_DAYS), self.end_date)
+            windows.append((current, window_end))
+            current = window_end
+        return windows
+
+    def _shard_dir(self, window: Tuple[datetime, datetime]) -> Path:
+        return self.shard_root / (
+            f"{window[0].strftime('%Y%m%d')}_{window[1].strftime('%Y%m%d')}"
+        )
+
+    def _load_shard_state(self, shard_dir: Path) -> Optional[Dict[str, Any]]:
+        """Return the shard checkpoint if it belongs to this run's sources."""
+        try:
+            with open(shard_dir / "state.json", "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if state.get("sources") != self.sources:
+            return None
+        return state
+
+    def _fetch_shard_items(
+        self, windows: List[Tuple[datetime, datetime]]
+    ) -> Dict[Tuple[datetime, datetime], List[Dict[str, Any]]]:
+        """
+        Fetch stage: fetch every (shard, source) feed under the shared limiter.
+
+        Fetched items are saved per shard (items.json) so a resumed run does
+        not hit the feeds again for shards that were fetched but not finished.
+        Deduplication runs oldest shard first, so results do not depend on
+        request completion order.
+        """
+        cached: Dict[Tuple[datetime, datetime], List[Dict[str, Any]]] = {}
+        to_fetch = []
+        for window in windows:
+            shard_dir = self._shard_dir(window)
+            if self.resume and (shard_dir / "items.json").exists():
+                items = self._read_shard_items(shard_dir)
+                if items is not None:
+                    cached[window] = items
+                    continue
+            to_fetch.extend((window, source) for source in self.sources)
+
+        fetched: Dict[Tuple[Tuple[datetime, datetime], str], List[Dict[str, Any]]] = {}
+        if to_fetch:
+            with ThreadPoolExecutor(max_workers=FEED_FETCH_THREADS) as pool:
+                futures = {
+                    pool.submit(self._fetch_sec_historical, source, *window): (
+                        window,
+                        source,
+                    )
+                    for window, source in to_fetch
+                }
+                for future in as_completed(futures):
+                    window, source = futures[future]
+                    try:
+                        fetched[(window, source)] = future.result()
+                        self.stats["feeds_fetched"] += 1
+                    except Exception as e:
+                        log.error(f"bootstrap_feed_failed source={source} err={e}")
+                        fetched[(window, source)] = []
+                        self.stats["errors"] += 1
+
+        shard_items = {}
+        for window in windows:
+            if window in cached:
+                shard_items[window] = self._dedupe_items(cached[window])
+                continue
+            all_items = []
+            for source in self.sources:
+                all_items.extend(fetched.get((window, source), []))
+            shard_items[window] = self._dedupe_items(all_items)
+            _write_json_atomic(
+                self._shard_dir(window) / "items.json",
+                {"sources": self.sources, "items": shard_items[window]},
+            )
+        return shard_items
+
+    def _shard_config(self) -> Dict[str, Any]:
+        """Constructor arguments for the per-shard bootstrapper in a worker."""
+        return {
+            "start_date": self.start_date.strftime("%Y-%m-%d"),
+            "end_date": self.end_date.strftime("%Y-%m-%d"),
+            "sources": list(self.sources),
+            "batch_size": self.batch_size,
+        }
+
+    def _merge_shards(self, windows: List[Tuple[datetime, datetime]]) -> int:
+        """
+        Append finished shard output to rejected_items.jsonl / outcomes.jsonl.
+
+        Shards merge oldest first and merging stops at the first unfinished
+        shard, so the files always grow in chronological order no matter
+        which worker finished first. Returns the number of shards merged.
+
+        Before appending, the target file sizes are journaled in the shard's
+        state.json. A merge interrupted between the append and ``merged=True``
+        is rolled back to those sizes on the next run, so no rows are
+        duplicated.
+        """
+        targets = (
+            ("rejected_items.jsonl", self.rejected_path),
+            ("outcomes.jsonl", self.outcomes_path),
+        )
+        merged = 0
+        for window in windows:
+            shard_dir = self._shard_dir(window)
+            state = self._load_shard_state(shard_dir)
+            if not state or state.get("status") != "complete":
+                break
+            if state.get("merged"):
+                continue
+
+            offsets = state.get("merge_offsets")
+            if offsets is None:
+                offsets = {
+                    name: target.stat().st_size if target.exists() else 0
+                    for name, target in targets
+                }
+                state["merge_offsets"] = offsets
+                _write_json_atomic(shard_dir / "state.json", state)
+            else:
+                # An earlier merge of this shard was interrupted
+                for name, target in targets:
+                    size = int(offsets.get(name, 0))
+                    if target.exists() and target.stat().st_size > size:
+                        with open(target, "r+b") as f:
+                            f.truncate(size)
+                        log.info(
+                            f"bootstrap_merge_rollback shard={shard_dir.name} "
+                            f"file={name} size={size}"
+                        )
+
+            for name, target in targets:
+                source_path = shard_dir / name
+                if not source_path.exists():
+                    continue
+                with open(source_path, "rb") as src, open(target, "ab") as dst:
+                    shutil.copyfileobj(src, dst)
+                    dst.flush()
+                    os.fsync(dst.fileno())
+
+            state["merged"] = True
+            _write_json_atomic(shard_dir / "state.json", state)
+            merged += 1
+        return merged
+
+    def _add_shard_stats(self, shard_stats: Dict[str, Any]) -> None:
+        for key, value in shard_stats.items():
+            if key == "feeds_fetched" or not isinstance(value, int):
+                continue
+            self.stats[key] = self.stats.get(key, 0) + value
+
+    def run_sharded(self, workers: int = 4) -> Dict[str, Any]:
+        """
+        Process the date range as month shards in parallel.
+
+        1. Fetch stage: all feeds are fetched in this process through one
+           shared rate limiter
+        2. Compute stage: each unfinished shard is classified and priced in
+           a process pool, writing its own output files and checkpoint.
+           Workers share the bar store, which locks each series across
+           processes, so a ticker priced by two shards keeps every row
+        3. Merge stage: finished shards are appended to the JSONL outputs
+           in chronological order
+
+        With ``resume=True`` finished shards are skipped, so a crash only
+        redoes the shards that had not completed. ``workers <= 1`` runs the
+        shards in this process.
+
+        Args:
+            workers: Number of worker processes
+
+        Returns:
+            Statistics dictionary with processing counts
+        """
+        start_time = time.time()
+        self.stats["start_time"] = start_time
+        self._send_discord_notification(self._build_start_embed())
+
+        windows = self._shard_windows()
+        pending = []
+        for window in windows:
+            shard_dir = self._shard_dir(window)
+            if not self.resume and shard_dir.exists():
+                shutil.rmtree(shard_dir)
+            state = self._load_shard_state(shard_dir)
+            if state and state.get("status") == "complete":
+                # Keep already-processed IDs out of later shards
+                self._dedupe_items(self._read_shard_items(shard_dir) or [])
+            else:
+                pending.append(window)
+
+        log.info(
+            f"bootstrap_sharded shards={len(windows)} pending={len(pending)} "
+            f"workers={workers}"
+        )
+
+        shard_items = self._fetch_shard_items(pending)
+        config = self._shard_config()
+
+        def _finished(window, shard_stats):
+            self._add_shard_stats(shard_stats)
+            log.info(
+                f"bootstrap_shard_complete shard={self._shard_dir(window).name} "
+                f"rejections={shard_stats.get('rejections_found', 0)}"
+            )
+            self._maybe_send_progress_update()
+
+        def _failed(window, e):
+            log.error(
+                f"bootstrap_shard_failed shard={self._shard_dir(window).name} err={e}"
+            )
+            self.stats["errors"] += 1
+            self._send_discord_notification(self._build_error_embed(str(e)))
+
+        if workers <= 1:
+            for window in pending:
+                try:
+                    shard_dir = str(self._shard_dir(window))
+                    _finished(
+                        window, _run_shard(config, shard_dir, shard_items[window])
+                    )
+                except Exception as e:
+                    _failed(window, e)
+        elif pending:
+            # spawn: workers must not inherit the fetch stage's threads/locks
+            ctx = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+                futures = {
+                    pool.submit(
+                        _run_shard,
+                        config,
+                        str(self._shard_dir(window)),
+                        shard_items[window],
+                        workers,
+                    ): window
+                    for window in pending
+                }
+                for future in as_completed(futures):
+                    window = futures[future]
+                    try:
+                        _finished(window, future.result())
+                    except Exception as e:
+                        _failed(window, e)
+
+        merged = self._merge_shards(windows)
+
+        elapsed = time.time() - start_time
+        self.stats["elapsed_seconds"] = round(elapsed, 2)
+        log.info(
+            f"bootstrap_complete sharded=1 "
+            f"shards={len(windows)} merged={merged} "
+            f"feeds={self.stats['feeds_fetched']} "
+            f"items={self.stats['items_processed']} "
+            f"rejections={self.stats['rejections_found']} "
+            f"outcomes={self.stats['outcomes_recorded']} "
+            f"errors={self.stats['errors']} "
+            f"elapsed={elapsed:.1f}s"
+        )
+        self._send_discord_notification(self._build_completion_embed(elapsed))
+        return self.stats
+
+    def _read_shard_items(self, shard_dir: Path) -> Optional[List[Dict[str, Any]]]:
+        """Return the shard's fetched items, or None if missing or stale."""
+        try:
+            with open(shard_dir / "items.json", "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("sources") != self.sources:
+            return None
+        return data.get("items", [])
 
     def _process_batch(self, items: List[Dict[str, Any]]) -> None:
         """
@@ -729,6 +1027,7 @@ class HistoricalBootstrapper:
                 "Accept": "application/atom+xml, application/xml",
             }
 
+            self.sec_limiter.acquire()
             response = requests.get(url, headers=headers, timeout=30)
             response.raise_for_status()
 
@@ -902,7 +1201,7 @@ class HistoricalBootstrapper:
 
     def _get_from_cache(self, ticker: str, date: datetime) -> Optional[float]:
         """
-        Get price from multi-level cache (memory → disk → None).
+        Get price from multi-level cache (memory → bar store → None).
 
         Args:
             ticker: Stock ticker
@@ -920,43 +1219,20 @@ class HistoricalBootstrapper:
                 self.stats["cache_hits"] += 1
                 return self._price_cache[cache_key]
 
-        # Level 2: Disk cache
-        cache_path = _get_disk_cache_path(self.cache_dir, ticker, date)
-
-        if cache_path.exists():
-            # Validate cache file is within expected directory (path traversal protection)
-            try:
-                cache_path.resolve().relative_to(self.cache_dir.resolve())
-            except ValueError:
-                log.warning(
-                    f"cache_path_traversal_attempt ticker={ticker} path={cache_path}"
-                )
-                return None
-
-            try:
-                # Security Note: Loading pickle from application-controlled cache directory
-                # Files are created by this application only. Do not load from untrusted sources.
-                with open(cache_path, "rb") as f:
-                    cache_data = pickle.load(f)
-
-                # Check TTL
-                cached_date = cache_data.get("cached_at")
-                price = cache_data.get("price")
-
-                if cached_date and price is not None:
-                    # Check if cache is still valid (within TTL)
-                    cache_age_days = (datetime.now(timezone.utc) - cached_date).days
-
-                    if cache_age_days <= CACHE_TTL_DAYS:
-                        # Valid cache - load into memory and return
-                        with self._cache_lock:
-                            self._price_cache[cache_key] = price
-
-                        self.stats["disk_cache_hits"] += 1
-                        return price
-
-            except Exception as e:
-                log.debug(f"disk_cache_load_failed ticker={ticker} err={e}")
+        # Level 2: Shared bar store (only trusted when the window is covered)
+        start, end = _daily_price_window(date)
+        try:
+            if not self.bar_store.missing_ranges(ticker, "1d", start, end):
+                bars = self.bar_store.read_bars(ticker, "1d", start, end)
+                closes = bars["Close"].dropna()
+                if not closes.empty:
+                    price = float(closes.iloc[-1])
+                    with self._cache_lock:
+                        self._price_cache[cache_key] = price
+                    self.stats["disk_cache_hits"] += 1
+                    return price
+        except Exception as e:
+            log.debug(f"bar_store_read_failed ticker={ticker} err={e}")
 
         # Cache miss
         self.stats["cache_misses"] += 1
@@ -964,35 +1240,47 @@ class HistoricalBootstrapper:
 
     def _put_in_cache(self, ticker: str, date: datetime, price: float) -> None:
         """
-        Put price in multi-level cache (memory + disk).
+        Put price in the memory cache.
+
+        The underlying bars are persisted by the bar store when fetched.
 
         Args:
             ticker: Stock ticker
             date: Date of price
             price: Price value
         """
-        date_str = date.strftime("%Y-%m-%d")
-        cache_key = (ticker, date_str)
-
-        # Store in memory cache
         with self._cache_lock:
-            self._price_cache[cache_key] = price
-
-        # Store in disk cache
-        try:
-            cache_path = _get_disk_cache_path(self.cache_dir, ticker, date)
-            cache_data = {
-                "ticker": ticker,
-                "date": date_str,
-                "price": price,
-                "cached_at": datetime.now(timezone.utc),
-            }
+            self._price_cache[(ticker, date.strftime("%Y-%m-%d"))] = price
 
-            with open(cache_path, "wb") as f:
-                pickle.dump(cache_data, f)
+    def _fetch_finnhub_daily_bars(
+        self, ticker: str, start: datetime, end: datetime
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Bar store fetcher: Finnhub daily candles (rate limited)."""
+        # Apply Finnhub rate limiting
+        time.sleep(self.finnhub_rate_limit)
+        return _fetch_finnhub_bars(ticker, start, end, resolution="D")
 
+    def _store_daily_bars(
+        self, ticker: str, bars: Any, start: datetime, end: datetime
+    ) -> None:
+        """Persist fetched daily bars for [start, end) in the bar store."""
+        if not isinstance(bars, (list, pd.DataFrame)):
+            return
+        try:
+            self.bar_store.write_bars(ticker, "1d", bars, start, end)
         except Exception as e:
-            log.debug(f"disk_cache_write_failed ticker={ticker} err={e}")
+            log.debug(f"bar_store_write_failed ticker={ticker} err={e}")
+
+    def _store_close(
+        self, ticker: str, date: datetime, fetcher: Callable
+    ) -> Optional[float]:
+        """Read the daily close for ``date`` from the bar store, filling gaps."""
+        start, end = _daily_price_window(date)
+        bars = self.bar_store.get_bars(ticker, "1d", start, end, fetcher=fetcher)
+        closes = bars["Close"].dropna()
+        if closes.empty:
+            return None
+        return float(closes.iloc[-1])
 
     def _prefetch_prices_bulk(
         self, ticker_dates: List[Tuple[str, datetime]]
@@ -1031,10 +1319,7 @@ class HistoricalBootstrapper:
         finnhub_failed = []
 
         for ticker, date in to_fetch:
-            # Apply Finnhub rate limiting
-            time.sleep(FINNHUB_RATE_LIMIT)
-
-            price = _fetch_finnhub_price(ticker, date, resolution="D")
+            price = self._store_close(ticker, date, self._fetch_finnhub_daily_bars)
 
             if price is not None:
                 date_str = date.strftime("%Y-%m-%d")
@@ -1088,6 +1373,26 @@ class HistoricalBootstrapper:
                     if data is None or data.empty:
                         continue
 
+                    # Persist the downloaded bars for every bar store consumer
+                    range_start = datetime.strptime(start_date, "%Y-%m-%d").replace(
+                        tzinfo=timezone.utc
+                    )
+                    range_end = datetime.strptime(end_date, "%Y-%m-%d").replace(
+                        tzinfo=timezone.utc
+                    )
+                    for ticker in tickers:
+                        try:
+                            frame = (
+                                data
+                                if len(tickers) == 1
+                                else data.xs(ticker, level=1, axis=1)
+                            )
+                            self.bar_store.write_bars(
+                                ticker, "1d", frame, range_start, range_end
+                            )
+                        except Exception as e:
+                            log.debug(f"bar_store_write_failed ticker={ticker} err={e}")
+
                     # Extract prices for each ticker/date
                     for ticker, date in batch:
                         date_str = date.strftime("%Y-%m-%d")
@@ -1144,7 +1449,10 @@ class HistoricalBootstrapper:
         self, ticker: str, date: datetime
     ) -> Optional[float]:
         """
-        Direct Finnhub fetch without caching (fallback method).
+        Direct Finnhub fetch with yfinance fallback (fallback method).
+
+        Fetched daily bars are written to the bar store so later lookups for
+        nearby dates (and other consumers) are served locally.
 
         Args:
             ticker: Stock ticker
@@ -1153,26 +1461,30 @@ class HistoricalBootstrapper:
         Returns:
             Price at that date, or None if unavailable
         """
-        # Apply Finnhub rate limiting
-        time.sleep(FINNHUB_RATE_LIMIT)
+        start, end = _daily_price_window(date)
 
-        # Try Finnhub first (daily resolution)
-        price = _fetch_finnhub_price(ticker, date, resolution="D")
+        # Try Finnhub first (daily resolution, rate limited)
+        bars = self._fetch_finnhub_daily_bars(ticker, start, end)
 
-        if price is not None:
-            return price
+        if bars:
+            self._store_daily_bars(ticker, bars, start, end)
+            return float(bars[-1]["c"])
 
         # Fallback to yfinance if Finnhub fails
         try:
             ticker_obj = yf.Ticker(ticker)
-            start = (date - timedelta(days=1)).strftime("%Y-%m-%d")
-            end = (date + timedelta(days=1)).strftime("%Y-%m-%d")
 
-            hist = ticker_obj.history(start=start, end=end, interval="1d")
+            hist = ticker_obj.history(
+                start=start.strftime("%Y-%m-%d"),
+                end=end.strftime("%Y-%m-%d"),
+                interval="1d",
+            )
 
             if hist is None or hist.empty:
                 return None
 
+            self._store_daily_bars(ticker, hist, start, end)
+
             close_price = hist["Close"].iloc[-1]
             return float(close_price)
 
@@ -2329,6 +2641,66 @@ class HistoricalBootstrapper:
             self._last_progress_time = now
 
 
+def _write_json_atomic(path: Path, data: Any) -> None:
+    """Write JSON via a temp file + os.replace so readers never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _run_shard(
+    config: Dict[str, Any],
+    shard_dir: str,
+    items: List[Dict[str, Any]],
+    workers: int = 1,
+) -> Dict[str, Any]:
+    """
+    Worker entry point: classify and price one shard's items.
+
+    Output goes to the shard directory; the checkpoint (state.json) is
+    written last, so a shard that crashed part way is redone from scratch.
+
+    Args:
+        config: HistoricalBootstrapper constructor arguments
+        shard_dir: Directory for the shard's output files and checkpoint
+        items: Deduplicated feed items for the shard
+        workers: Size of the pool sharing the Finnhub rate limit
+
+    Returns:
+        The shard's statistics dictionary
+    """
+    shard_path = Path(shard_dir)
+    shard_path.mkdir(parents=True, exist_ok=True)
+
+    bootstrapper = HistoricalBootstrapper(**config)
+    bootstrapper.rejected_path = shard_path / "rejected_items.jsonl"
+    bootstrapper.outcomes_path = shard_path / "outcomes.jsonl"
+    bootstrapper.finnhub_rate_limit = FINNHUB_RATE_LIMIT * max(1, workers)
+    for partial in (bootstrapper.rejected_path, bootstrapper.outcomes_path):
+        if partial.exists():
+            partial.unlink()
+
+    for i in range(0, len(items), bootstrapper.batch_size):
+        bootstrapper._process_batch(items[i : i + bootstrapper.batch_size])
+
+    stats = {k: v for k, v in bootstrapper.stats.items() if isinstance(v, int)}
+    _write_json_atomic(
+        shard_path / "state.json",
+        {
+            "status": "complete",
+            "sources": config["sources"],
+            "items": len(items),
+            "stats": stats,
+            "merged": False,
+        },
+    )
+    return stats
+
+
 def main():
     """CLI entry point."""
     parser = argparse.ArgumentParser(
@@ -2354,6 +2726,13 @@ Examples:
       --end-date 2025-01-01 \\
       --sources sec_8k \\
       --resume
+
+  # Multi-year backfill: month shards across 6 worker processes
+  python -m catalyst_bot.historical_bootstrapper \\
+      --start-date 2023-01-01 \\
+      --end-date 2025-01-01 \\
+      --sources sec_8k,sec_424b5 \\
+      --workers 6 --resume
         """,
     )
 
@@ -2378,6 +2757,14 @@ Examples:
         "--resume", action="store_true", help="Resume from last checkpoint"
     )
 
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes for sharded month processing (default: 1, "
+        "sequential)",
+    )
+
     args = parser.parse_args()
 
     # Parse sources
@@ -2406,10 +2793,14 @@ Examples:
     print(f"  Sources: {', '.join(sources)}")
     print(f"  Batch size: {args.batch_size}")
     print(f"  Resume: {args.resume}")
+    print(f"  Workers: {args.workers}")
     print()
 
     try:
-        stats = bootstrapper.run()
+        if args.workers > 1:
+            stats = bootstrapper.run_sharded(workers=args.workers)
+        else:
+            stats = bootstrapper.run()
 
         print("\nBootstrap Complete!")
         print(f"  Feeds fetched: {stats['feeds_fetched']}")
@@ -0,0 +1,1008 @@
+"""
+pattern_scanner.py
+==================
+
+Batch chart-pattern scanning over a whole ticker panel.
+
+The detectors in :mod:`patterns` work on one ticker's price lists at a time,
+calling ``find_peaks`` and ``np.polyfit`` once per window. This module runs
+the same detectors over a 2-D panel (tickers x bars) of aligned OHLC arrays
+in one pass:
+
+- swing highs/lows come from sliding-window maxima plus a vectorized
+  prominence test,
+- trendlines are closed-form least-squares fits over the swing masks,
+- every pattern family is classified with array masks,
+
+so a single call returns the patterns for the whole universe (e.g. a
+pre-market watchlist scan). Pattern dicts have the same structure, and the
+same indices into each ticker's own series, as
+``patterns.detect_all_patterns``.
+
+Scan results are remembered in the indicator cache so chart rendering can
+reuse them instead of re-detecting; see :func:`reuse_patterns`.
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .cache import cache_indicator, get_cached_indicator
+
+# Pattern families (scan ``kinds``) and the pattern types each one emits
+PATTERN_FAMILIES: Dict[str, Tuple[str, ...]] = {
+    "triangles": ("ascending_triangle", "descending_triangle", "symmetrical_triangle"),
+    "head_shoulders": ("head_shoulders", "inverse_head_shoulders"),
+    "double_tops": ("double_top", "double_bottom"),
+    "channels": ("ascending_channel", "descending_channel", "horizontal_channel"),
+    "flags": ("bull_flag", "bear_flag", "bull_pennant", "bear_pennant"),
+}
+
+# Default lookbacks of the per-ticker detectors in patterns.py
+_TRIANGLE_LOOKBACK = 20
+_REVERSAL_LOOKBACK = 30  # head & shoulders, double tops/bottoms, channels
+_FLAG_LOOKBACK = 20
+
+# Families whose detectors read highs/lows rather than closes only
+_HIGH_LOW_KINDS = ("triangles", "channels")
+
+# Rows per vectorized block; bounds the (rows x bars x bars) prominence arrays
+_CHUNK_ROWS = 256
+
+_SCAN_CACHE_NAME = "pattern_scan"
+
+
+@dataclass(frozen=True)
+class PatternPanel:
+    """Aligned OHLCV panel: one row per ticker, most recent bar last.
+
+    Rows with shorter histories are left-padded with NaN.
+
+    Attributes
+    ----------
+    tickers : Tuple[str, ...]
+        Row labels
+    close, high, low : np.ndarray
+        ``(tickers, bars)`` float arrays
+    volume : Optional[np.ndarray]
+        ``(tickers, bars)`` volumes, or None when no row has volume
+    """
+
+    tickers: Tuple[str, ...]
+    close: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    volume: Optional[np.ndarray] = None
+
+    @property
+    def lengths(self) -> np.ndarray:
+        """Number of valid trailing bars in each row."""
+        finite = np.isfinite(self.close)
+        first = np.argmax(finite, axis=1)
+        return np.where(finite.any(axis=1), self.close.shape[1] - first, 0)
+
+
+def _ohlcv(obj: Any) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Optional[np.ndarray]]:
+    """Pull close/high/low/volume arrays out of one ticker's bars."""
+    names = getattr(getattr(obj, "dtype", None), "names", None)
+    if names:
+        # bar_store structured array
+        cols = {name.lower(): obj[name] for name in names}
+    elif hasattr(obj, "columns"):
+        # pandas DataFrame (yfinance-style Close/High/Low/Volume columns)
+        cols = {str(col).lower(): obj[col].to_numpy() for col in obj.columns}
+    else:
+        cols = {str(key).lower(): value for key, value in dict(obj).items()}
+
+    close = np.asarray(cols["close"], dtype=float)
+    high = np.asarray(cols.get("high", close), dtype=float)
+    low = np.asarray(cols.get("low", close), dtype=float)
+    volume = cols.get("volume")
+    if volume is not None:
+        volume = np.asarray(volume, dtype=float)
+    return close, high, low, volume
+
+
+def build_panel(frames: Mapping[str, Any], bars: Optional[int] = None) -> PatternPanel:
+    """Stack per-ticker bars into a right-aligned :class:`PatternPanel`.
+
+    Parameters
+    ----------
+    frames : Mapping[str, Any]
+        Ticker -> OHLCV bars, oldest first. Values may be pandas DataFrames
+        (``Close``/``High``/``Low``/``Volume`` columns), ``bar_store``
+        structured arrays or plain mappings of column name -> sequence.
+    bars : Optional[int], optional
+        Keep only the most recent ``bars`` bars per ticker, by default the
+        longest history in ``frames``
+
+    Returns
+    -------
+    PatternPanel
+        Panel with one row per ticker in ``frames`` order
+    """
+    tickers = tuple(frames)
+    columns = [_ohlcv(frames[ticker]) for ticker in tickers]
+    width = bars if bars is not None else max((len(c[0]) for c in columns), default=0)
+
+    shape = (len(tickers), width)
+    close = np.full(shape, np.nan)
+    high = np.full(shape, np.nan)
+    low = np.full(shape, np.nan)
+    volume = np.full(shape, np.nan)
+    has_volume = False
+
+    for row, (c, h, lo, v) in enumerate(columns):
+        n = min(len(c), width)
+        if n == 0:
+            continue
+        close[row, width - n :] = c[-n:]
+        high[row, width - n :] = h[-n:]
+        low[row, width - n :] = lo[-n:]
+        if v is not None and len(v) >= n:
+            volume[row, width - n :] = v[-n:]
+            has_volume = True
+
+    return PatternPanel(tickers, close, high, low, volume if has_volume else None)
+
+
+def _prominences(values: np.ndarray) -> np.ndarray:
+    """Topographic prominence of every bar along the last axis.
+
+    Same definition as ``scipy.signal.peak_prominences`` (no window limit),
+    evaluated for all bars at once via ``(..., bars, bars)`` comparisons.
+    """
+    n = values.shape[-1]
+    idx = np.arange(n)
+    peak = values[..., :, None]
+    other = values[..., None, :]
+    before = idx[None, :] < idx[:, None]
+    after = idx[None, :] > idx[:, None]
+
+    with np.errstate(invalid="ignore"):
+        higher = other > peak
+    # Nearest strictly higher bar on each side bounds the search for the base
+    left_stop = np.where(higher & before, idx, -1).max(axis=-1)
+    right_stop = np.where(higher & after, idx, n).min(axis=-1)
+
+    left_range = (idx > left_stop[..., None]) & (idx <= idx[:, None])
+    right_range = (idx >= idx[:, None]) & (idx < right_stop[..., None])
+    left_base = np.where(left_range, other, np.inf).min(axis=-1)
+    right_base = np.where(right_range, other, np.inf).min(axis=-1)
+    return values - np.maximum(left_base, right_base)
+
+
+def _shifted(values: np.ndarray, offset: int, fill: Any) -> np.ndarray:
+    """``values[..., i + offset]`` along the last axis, ``fill`` off the ends."""
+    out = np.full_like(values, fill)
+    if offset > 0:
+        out[..., :-offset] = values[..., offset:]
+    else:
+        out[..., -offset:] = values[..., :offset]
+    return out
+
+
+def _distance_filter(values: np.ndarray, mask: np.ndarray, span: int) -> np.ndarray:
+    """Drop swings within ``span`` bars of a taller surviving swing.
+
+    Resolved as a fixed point over the whole panel: a swing is kept once no
+    taller neighbour is still undecided and none was kept, and removed as soon
+    as a taller neighbour is kept. Each pass settles at least the tallest
+    undecided swing of every cluster, so the loop runs once per link of the
+    longest chain of nearby swings. Equal heights favour the later bar.
+    """
+    candidate = np.where(mask, values, -np.inf)
+    kept = np.zeros_like(mask)
+    pending = mask.copy()
+    while pending.any():
+        blocked = np.zeros_like(mask)
+        waiting = np.zeros_like(mask)
+        for offset in [d for k in range(1, span + 1) for d in (-k, k)]:
+            other = _shifted(candidate, offset, -np.inf)
+            taller = (other > values) | ((other == values) & (offset > 0))
+            taller &= np.isfinite(other)
+            blocked |= taller & _shifted(kept, offset, False)
+            waiting |= taller & _shifted(pending, offset, False)
+        settled_kept = pending & ~blocked & ~waiting
+        settled = settled_kept | (pending & blocked)
+        if not settled.any():
+            break
+        kept |= settled_kept
+        pending &= ~settled
+    return kept
+
+
+def swing_points(
+    values: np.ndarray, distance: int = 3, prominence: Optional[float] = None
+) -> np.ndarray:
+    """Find swing highs along the last axis of a price array.
+
+    Mirrors ``scipy.signal.find_peaks(x, distance=..., prominence=...)`` for
+    every row of a panel at once. Pass ``-lows`` to find swing lows.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        Prices, any leading shape (e.g. ``(tickers, bars)`` or sliding
+        windows ``(tickers, windows, bars)``)
+    distance : int, optional
+        Minimum bars between kept swings, by default 3
+    prominence : Optional[float], optional
+        Minimum prominence, by default None (no prominence filter)
+
+    Returns
+    -------
+    np.ndarray
+        Boolean mask, same shape as ``values``
+
+    Notes
+    -----
+    Swings are strict local maxima (flat tops are not reported). The
+    distance filter reproduces scipy's tallest-first rule: a swing survives
+    unless a taller *surviving* swing lies within ``distance - 1`` bars.
+    """
+    v = np.asarray(values, dtype=float)
+    mask = np.zeros(v.shape, dtype=bool)
+    n = v.shape[-1]
+    if n < 3:
+        return mask
+
+    mid = v[..., 1:-1]
+    with np.errstate(invalid="ignore"):
+        mask[..., 1:-1] = (mid > v[..., :-2]) & (mid > v[..., 2:])
+
+    if distance > 1:
+        mask = _distance_filter(v, mask, distance - 1)
+
+    if prominence is not None:
+        with np.errstate(invalid="ignore"):
+            mask &= _prominences(v) >= prominence
+    return mask
+
+
+def fit_trendlines(
+    values: np.ndarray, mask: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Least-squares trendline through the masked swing points of each row.
+
+    Like ``np.polyfit(np.arange(k), values[swings], 1)`` in patterns.py, x is
+    the swing's ordinal (0, 1, 2, ...) rather than its bar index. Solved in
+    closed form from masked sums along the last axis.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        Prices, any leading shape
+    mask : np.ndarray
+        Swing mask from :func:`swing_points`
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray, np.ndarray]
+        ``(slope, intercept, count)``; slope/intercept are NaN for rows with
+        fewer than two swings
+    """
+    m = np.asarray(mask, dtype=bool)
+    y = np.where(m, values, 0.0)
+    count = m.sum(axis=-1)
+    ordinal = np.where(m, np.cumsum(m, axis=-1) - 1, 0)
+
+    n = count.astype(float)
+    sx = n * (n - 1) / 2
+    sxx = (n - 1) * n * (2 * n - 1) / 6
+    sy = y.sum(axis=-1)
+    sxy = (ordinal * y).sum(axis=-1)
+    denom = n * sxx - sx * sx
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        slope = np.where(denom > 0, (n * sxy - sx * sy) / denom, np.nan)
+        intercept = np.where(n > 1, (sy - slope * sx) / n, np.nan)
+    return slope, intercept, count
+
+
+def rolling_trendlines(
+    values: np.ndarray,
+    window: int,
+    distance: int = 3,
+    prominence: Optional[float] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Swing trendline fits over every trailing window of each row.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        ``(tickers, bars)`` prices (pass ``-lows`` for support lines)
+    window : int
+        Window length in bars
+    distance : int, optional
+        Minimum bars between swings, by default 3
+    prominence : Optional[float], optional
+        Minimum swing prominence, by default None. Costs
+        ``O(windows * window**2)`` memory per row.
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray, np.ndarray]
+        ``(slope, intercept, count)``, each ``(tickers, bars - window + 1)``;
+        column ``j`` is the fit over bars ``j .. j + window - 1``
+    """
+    windows = sliding_window_view(np.asarray(values, dtype=float), window, axis=-1)
+    return fit_trendlines(windows, swing_points(windows, distance, prominence))
+
+
+# ============================================================================
+# Array helpers
+# ============================================================================
+
+
+def _positions(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Swing bar indices packed to the left of each row (-1 padded)."""
+    counts = mask.sum(axis=-1)
+    width = max(int(counts.max(initial=0)), 1)
+    order = np.argsort(~mask, axis=-1, kind="stable")[..., :width]
+    return np.where(np.arange(width) < counts[..., None], order, -1), counts
+
+
+def _next_index(mask: np.ndarray) -> np.ndarray:
+    """First masked index >= i for i in 0..bars (``bars`` when none)."""
+    n = mask.shape[-1]
+    idx = np.where(mask, np.arange(n), n)
+    nxt = np.minimum.accumulate(idx[..., ::-1], axis=-1)[..., ::-1]
+    tail = np.full(mask.shape[:-1] + (1,), n)
+    return np.concatenate([nxt, tail], axis=-1)
+
+
+def _take(values: np.ndarray, idx: np.ndarray) -> np.ndarray:
+    """Row-wise gather that tolerates -1/out-of-range padding indices."""
+    safe = np.clip(idx, 0, values.shape[-1] - 1)
+    return np.take_along_axis(values, safe, axis=-1)
+
+
+def _masked_mean(values: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(mask, values, 0.0).sum(axis=-1) / mask.sum(axis=-1)
+
+
+def _eligible(
+    lengths: np.ndarray, lookback: int, *arrays: Optional[np.ndarray]
+) -> Tuple[np.ndarray, List[np.ndarray]]:
+    """Rows with a full, finite trailing window and those windows."""
+    ok = lengths >= lookback
+    windows = []
+    for arr in arrays:
+        win = arr[:, -lookback:]
+        ok &= np.isfinite(win).all(axis=1)
+        windows.append(win)
+    rows = np.flatnonzero(ok)
+    return rows, [win[rows] for win in windows]
+
+
+# ============================================================================
+# Detectors (same rules and pattern dicts as patterns.py)
+# ============================================================================
+
+
+def _scan_triangles(close, high, low, lengths, out, lookback, min_touches=3) -> None:
+    rows, (c, h, lo) = _eligible(lengths, lookback, close, high, low)
+    if not len(rows):
+        return
+    starts = lengths[rows] - lookback
+    high_swings = swing_points(h, 3)
+    low_swings = swing_points(-lo, 3)
+    high_slope, high_icpt, n_high = fit_trendlines(h, high_swings)
+    low_slope, low_icpt, n_low = fit_trendlines(lo, low_swings)
+
+    touches = max(min_touches, 2)
+    ok = (n_high >= touches) & (n_low >= touches)
+    threshold = 0.1  # Tolerance for horizontal lines
+    asc = ok & (np.abs(high_slope) < threshold) & (low_slope > threshold)
+    desc = ok & (high_slope < -threshold) & (np.abs(low_slope) < threshold)
+    sym = (
+        ok
+        & ~asc
+        & ~desc
+        & (high_slope < -threshold)
+        & (low_slope > threshold)
+        & (np.abs(high_slope - low_slope) > 0.01)
+    )
+    resistance = _masked_mean(h, high_swings)
+    support = _masked_mean(lo, low_swings)
+
+    for r in np.flatnonzero(asc | desc | sym):
+        start = int(starts[r])
+        current = float(c[r, -1])
+        if asc[r]:
+            level = float(resistance[r])
+            target = level + (level - lo[r, 0])
+            out[rows[r]].append(
+                {
+                    "type": "ascending_triangle",
+                    "confidence": min(0.95, 0.6 + int(n_high[r]) * 0.1),
+                    "start_idx": start,
+                    "end_idx": start + lookback - 1,
+                    "key_levels": {
+                        "resistance": level,
+                        "support_slope": float(low_slope[r]),
+                        "current_price": current,
+                    },
+                    "target": float(target),
+                    "description": f"Ascending triangle with resistance at ${level:.2f}, target ${target:.2f}",  # noqa: E501
+                }
+            )
+        elif desc[r]:
+            level = float(support[r])
+            target = level - (h[r, 0] - level)
+            out[rows[r]].append(
+                {
+                    "type": "descending_triangle",
+                    "confidence": min(0.95, 0.6 + int(n_low[r]) * 0.1),
+                    "start_idx": start,
+                    "end_idx": start + lookback - 1,
+                    "key_levels": {
+                        "support": level,
+                        "resistance_slope": float(high_slope[r]),
+                        "current_price": current,
+                    },
+                    "target": float(target),
+                    "description": f"Descending triangle with support at ${level:.2f}, target ${target:.2f}",  # noqa: E501
+                }
+            )
+        else:
+            apex_x = (low_icpt[r] - high_icpt[r]) / (high_slope[r] - low_slope[r])
+            apex_price = float(high_slope[r] * apex_x + high_icpt[r])
+            out[rows[r]].append(
+                {
+                    "type": "symmetrical_triangle",
+                    "confidence": min(0.95, 0.5 + int(n_high[r] + n_low[r]) * 0.05),
+                    "start_idx": start,
+                    "end_idx": start + lookback - 1,
+                    "key_levels": {
+                        "apex_price": apex_price,
+                        "high_slope": float(high_slope[r]),
+                        "low_slope": float(low_slope[r]),
+                        "current_price": current,
+                    },
+                    "target": current + float(h[r, 0] - lo[r, 0]),
+                    "description": f"Symmetrical triangle converging toward ${apex_price:.2f}",
+                }
+            )
+
+
+def _hs_triples(seg, pivots, necks, rows, starts, out, min_confidence, inverse) -> None:
+    """Consecutive pivot triples forming a (inverse) head & shoulders."""
+    pos, _ = _positions(pivots)
+    if pos.shape[1] < 3:
+        return
+    ls, head, rs = pos[:, :-2], pos[:, 1:-1], pos[:, 2:]
+    ls_px, head_px, rs_px = _take(seg, ls), _take(seg, head), _take(seg, rs)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        if inverse:
+            shape_ok = (head_px < ls_px) & (head_px < rs_px)
+        else:
+            shape_ok = (head_px > ls_px) & (head_px > rs_px)
+        shoulder_diff = np.abs(ls_px - rs_px) / ls_px
+    # Neckline: first opposite pivot between the shoulders
+    neck = np.take_along_axis(_next_index(necks), np.clip(ls + 1, 0, None), axis=-1)
+    confidence = np.minimum(0.95, (1.0 - shoulder_diff) * 0.7 + 0.25)
+    hits = (
+        (rs >= 0)
+        & shape_ok
+        & (shoulder_diff < 0.05)
+        & (neck < rs)
+        & (confidence >= min_confidence)
+    )
+    neck_px = _take(seg, neck)
+
+    for r, k in zip(*np.nonzero(hits)):
+        start = int(starts[r])
+        neckline = float(neck_px[r, k])
+        height = abs(float(head_px[r, k]) - neckline)
+        target = neckline + height if inverse else neckline - height
+        key_levels = {
+            "left_shoulder": (start + int(ls[r, k]), float(ls_px[r, k])),
+            "head": (start + int(head[r, k]), float(head_px[r, k])),
+            "right_shoulder": (start + int(rs[r, k]), float(rs_px[r, k])),
+            "neckline": neckline,
+        }
+        if inverse:
+            description = f"Inverse H&S pattern with neckline at ${neckline:.2f}, target ${target:.2f}"  # noqa: E501
+        else:
+            description = f"Head & Shoulders pattern with neckline at ${neckline:.2f}, target ${target:.2f}"  # noqa: E501
+        out[rows[r]].append(
+            {
+                "type": "inverse_head_shoulders" if inverse else "head_shoulders",
+                "confidence": float(confidence[r, k]),
+                "start_idx": start + int(ls[r, k]),
+                "end_idx": start + int(rs[r, k]),
+                "key_levels": key_levels,
+                "target": float(target),
+                "description": description,
+            }
+        )
+
+
+def _scan_head_shoulders(close, lengths, out, lookback, min_confidence) -> None:
+    rows, (seg,) = _eligible(lengths, lookback, close)
+    if not len(rows):
+        return
+    starts = lengths[rows] - lookback
+    peaks = swing_points(seg, 3, 0.5)
+    troughs = swing_points(-seg, 3, 0.5)
+    # Like detect_head_shoulders, rows with fewer than three peaks are
+    # skipped for both variants
+    three = peaks.sum(axis=1) >= 3
+    rows, seg, starts = rows[three], seg[three], starts[three]
+    peaks, troughs = peaks[three], troughs[three]
+    _hs_triples(seg, peaks, troughs, rows, starts, out, min_confidence, inverse=False)
+    _hs_triples(seg, troughs, peaks, rows, starts, out, min_confidence, inverse=True)
+
+
+def _double_pairs(seg, pivots, rows, starts, out, tolerance, bottoms) -> None:
+    """First later pivot within ``tolerance`` of each pivot."""
+    pos, _ = _positions(pivots)
+    k = pos.shape[1]
+    if k < 2:
+        return
+    price = _take(seg, pos)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        diff = np.abs(price[:, :, None] - price[:, None, :]) / price[:, :, None]
+    later = np.arange(k)[None, :] > np.arange(k)[:, None]
+    match = (
+        later & (pos[:, :, None] >= 0) & (pos[:, None, :] >= 0) & (diff <= tolerance)
+    )
+    found = match.any(axis=-1)
+    second = np.argmax(match, axis=-1)
+
+    first_idx = pos
+    second_idx = np.take_along_axis(pos, second, axis=-1)
+    # Extreme between the two pivots: seg[first:second]
+    bars = np.arange(seg.shape[1])
+    between = (bars >= first_idx[..., None]) & (bars < second_idx[..., None])
+    if bottoms:
+        vals = np.where(between, seg[:, None, :], -np.inf)
+        mid_idx = vals.argmax(axis=-1)
+    else:
+        vals = np.where(between, seg[:, None, :], np.inf)
+        mid_idx = vals.argmin(axis=-1)
+    pair_diff = np.take_along_axis(diff, second[..., None], axis=-1)[..., 0]
+
+    for r, i in zip(*np.nonzero(found)):
+        start = int(starts[r])
+        p1, p2, mid = int(first_idx[r, i]), int(second_idx[r, i]), int(mid_idx[r, i])
+        px1, px2, mid_px = float(seg[r, p1]), float(seg[r, p2]), float(seg[r, mid])
+        confidence = min(0.95, 0.8 - float(pair_diff[r, i]) * 10)
+        if bottoms:
+            target = mid_px + (mid_px - px1)
+            pattern = {
+                "type": "double_bottom",
+                "confidence": confidence,
+                "start_idx": start + p1,
+                "end_idx": start + p2,
+                "key_levels": {
+                    "trough1": (start + p1, px1),
+                    "trough2": (start + p2, px2),
+                    "peak": (start + mid, mid_px),
+                },
+                "target": float(target),
+                "description": f"Double bottom at ${px1:.2f}, target ${target:.2f}",
+            }
+        else:
+            target = mid_px - (px1 - mid_px)
+            pattern = {
+                "type": "double_top",
+                "confidence": confidence,
+                "start_idx": start + p1,
+                "end_idx": start + p2,
+                "key_levels": {
+                    "peak1": (start + p1, px1),
+                    "peak2": (start + p2, px2),
+                    "trough": (start + mid, mid_px),
+                },
+                "target": float(target),
+                "description": f"Double top at ${px1:.2f}, target ${target:.2f}",
+            }
+        out[rows[r]].append(pattern)
+
+
+def _scan_double_tops(
+    close, lengths, out, lookback, tolerance=0.02, min_spacing=5
+) -> None:
+    rows, (seg,) = _eligible(lengths, lookback, close)
+    if not len(rows):
+        return
+    starts = lengths[rows] - lookback
+    peaks = swing_points(seg, min_spacing, 0.5)
+    troughs = swing_points(-seg, min_spacing, 0.5)
+    _double_pairs(seg, peaks, rows, starts, out, tolerance, bottoms=False)
+    _double_pairs(seg, troughs, rows, starts, out, tolerance, bottoms=True)
+
+
+def _scan_channels(close, high, low, lengths, out, lookback, min_touches=3) -> None:
+    rows, (c, h, lo) = _eligible(lengths, lookback, close, high, low)
+    if not len(rows):
+        return
+    starts = lengths[rows] - lookback
+    peaks = swing_points(h, 3)
+    troughs = swing_points(-lo, 3)
+    upper, _, n_peaks = fit_trendlines(h, peaks)
+    lower, _, n_troughs = fit_trendlines(lo, troughs)
+
+    touches = max(min_touches, 2)
+    ok = (n_peaks >= touches) & (n_troughs >= touches) & (np.abs(upper - lower) < 0.5)
+
+    # np.interp(peaks, troughs, lows[troughs]) for every bar of every row
+    bars = np.arange(lookback)
+    prev_t = np.maximum.accumulate(np.where(troughs, bars, -1), axis=-1)
+    next_t = _next_index(troughs)[:, :lookback]
+    left = np.where(prev_t >= 0, prev_t, next_t[:, :1])
+    right = np.where(next_t < lookback, next_t, prev_t[:, -1:])
+    y0, y1 = _take(lo, left), _take(lo, right)
+    span = right - left
+    with np.errstate(invalid="ignore", divide="ignore"):
+        frac = np.where(span > 0, (bars - left) / np.where(span > 0, span, 1), 0.0)
+    support_line = y0 + (y1 - y0) * frac
+    width = _masked_mean(h - support_line, peaks)
+
+    for r in np.flatnonzero(ok):
+        start = int(starts[r])
+        if upper[r] > 0.1 and lower[r] > 0.1:
+            channel_type = "ascending_channel"
+        elif upper[r] < -0.1 and lower[r] < -0.1:
+            channel_type = "descending_channel"
+        else:
+            channel_type = "horizontal_channel"
+        channel_width = float(width[r])
+        out[rows[r]].append(
+            {
+                "type": channel_type,
+                "confidence": min(0.95, 0.6 + int(n_peaks[r] + n_troughs[r]) * 0.05),
+                "start_idx": start,
+                "end_idx": start + lookback - 1,
+                "key_levels": {
+                    "upper_slope": float(upper[r]),
+                    "lower_slope": float(lower[r]),
+                    "channel_width": channel_width,
+                    "current_price": float(c[r, -1]),
+                },
+                "target": None,  # Channels don't have specific targets
+                "description": f"{channel_type.replace('_', ' ').title()} with width ${channel_width:.2f}",  # noqa: E501
+            }
+        )
+
+
+def _scan_flags(close, volume, lengths, out, lookback) -> None:
+    pole = lookback // 3
+    if volume is None or pole < 3 or lookback - pole < 5:
+        return
+    rows, (seg, vol) = _eligible(lengths, lookback, close, volume)
+    if not len(rows):
+        return
+    starts = lengths[rows] - lookback
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        pole_change = (seg[:, pole - 1] - seg[:, 0]) / seg[:, 0]
+        consolidation = seg[:, pole:]
+        consol_pct = (consolidation.max(axis=1) - consolidation.min(axis=1)) / (
+            consolidation.mean(axis=1)
+        )
+
+    # Single-bar swings inside the consolidation
+    highs = swing_points(consolidation, distance=1)
+    lows = swing_points(-consolidation, distance=1)
+    high_pos, n_highs = _positions(highs)
+    low_pos, n_lows = _positions(lows)
+    ok = (
+        (np.abs(pole_change) >= 0.05)
+        & (consol_pct < 0.05)
+        & (n_highs >= 2)
+        & (n_lows >= 2)
+    )
+    rows_ok = np.flatnonzero(ok)
+    if not len(rows_ok):
+        return
+
+    def _edge_slope(pos, counts):
+        first = _take(consolidation, pos[:, :1])[:, 0]
+        last_pos = np.take_along_axis(
+            pos, np.clip(counts - 1, 0, None)[:, None], axis=1
+        )
+        last = _take(consolidation, last_pos)[:, 0]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return (last - first) / counts
+
+    high_slope = _edge_slope(high_pos, n_highs)
+    low_slope = _edge_slope(low_pos, n_lows)
+    # Volume should dry up during the consolidation
+    volume_confirmed = vol[:, pole:].mean(axis=1) < vol[:, :pole].mean(axis=1) * 0.8
+    pole_mean = seg[:, :pole].mean(axis=1)
+
+    for r in rows_ok:
+        start = int(starts[r])
+        bullish = pole_change[r] > 0
+        if abs(high_slope[r] - low_slope[r]) < 0.1:
+            pattern_type = "bull_flag" if bullish else "bear_flag"
+        else:
+            pattern_type = "bull_pennant" if bullish else "bear_pennant"
+        target = float(seg[r, -1] + pole_change[r] * pole_mean[r])
+        out[rows[r]].append(
+            {
+                "type": pattern_type,
+                "confidence": 0.7 if volume_confirmed[r] else 0.6,
+                "start_idx": start,
+                "end_idx": start + lookback - 1,
+                "key_levels": {
+                    "pole_start": float(seg[r, 0]),
+                    "pole_end": float(seg[r, pole]),
+                    "current_price": float(seg[r, -1]),
+                },
+                "target": target,
+                "description": f"{pattern_type.replace('_', ' ').title()} with target ${target:.2f}",  # noqa: E501
+            }
+        )
+
+
+# ============================================================================
+# Public scanning API
+# ============================================================================
+
+
+def _span(lookback: Optional[int]) -> int:
+    """Trailing bars that can influence any detector's result."""
+    return lookback or max(_TRIANGLE_LOOKBACK, _REVERSAL_LOOKBACK, _FLAG_LOOKBACK)
+
+
+def _normalize_kinds(kinds: Optional[Iterable[str]]) -> Tuple[str, ...]:
+    selected = tuple(kinds) if kinds is not None else tuple(PATTERN_FAMILIES)
+    unknown = [kind for kind in selected if kind not in PATTERN_FAMILIES]
+    if unknown:
+        raise ValueError(f"unknown pattern kinds: {unknown}")
+    return selected
+
+
+def scan_panel(
+    panel: PatternPanel,
+    min_confidence: float = 0.6,
+    lookback: Optional[int] = None,
+    kinds: Optional[Iterable[str]] = None,
+    remember: bool = True,
+) -> Dict[str, List[Dict]]:
+    """Detect chart patterns for every ticker in a panel at once.
+
+    Runs the ``detect_all_patterns`` detector set (triangles, head and
+    shoulders, double tops/bottoms, channels and, when the panel has volume,
+    flags/pennants) across all rows with vectorized array operations.
+
+    Parameters
+    ----------
+    panel : PatternPanel
+        Aligned OHLCV panel (see :func:`build_panel`)
+    min_confidence : float, optional
+        Minimum confidence threshold (0.0 to 1.0), by default 0.6
+    lookback : Optional[int], optional
+        Bars analyzed by every detector, by default each detector's own
+        default (20 for triangles/flags, 30 for the rest)
+    kinds : Optional[Iterable[str]], optional
+        Subset of :data:`PATTERN_FAMILIES` to scan, by default all
+    remember : bool, optional
+        Store results for :func:`reuse_patterns`, by default True
+
+    Returns
+    -------
+    Dict[str, List[Dict]]
+        Ticker -> patterns sorted by confidence (highest first), with indices
+        into that ticker's own (unpadded) series
+
+    Examples
+    --------
+    >>> panel = build_panel({"AAPL": {"close": [100, 105, 102, 110, 105]}})
+    >>> scan_panel(panel, remember=False)
+    {'AAPL': []}
+    """
+    selected = _normalize_kinds(kinds)
+    lengths = panel.lengths
+    found: List[List[Dict]] = [[] for _ in panel.tickers]
+
+    for lo in range(0, len(panel.tickers), _CHUNK_ROWS):
+        block = slice(lo, lo + _CHUNK_ROWS)
+        close, high, low = panel.close[block], panel.high[block], panel.low[block]
+        volume = panel.volume[block] if panel.volume is not None else None
+        n, out = lengths[block], found[block]
+
+        if "triangles" in selected:
+            _scan_triangles(close, high, low, n, out, lookback or _TRIANGLE_LOOKBACK)
+        if "head_shoulders" in selected:
+            _scan_head_shoulders(
+                close, n, out, lookback or _REVERSAL_LOOKBACK, min_confidence
+            )
+        if "double_tops" in selected:
+            _scan_double_tops(close, n, out, lookback or _REVERSAL_LOOKBACK)
+        if "channels" in selected:
+            _scan_channels(close, high, low, n, out, lookback or _REVERSAL_LOOKBACK)
+        if "flags" in selected:
+            _scan_flags(close, volume, n, out, lookback or _FLAG_LOOKBACK)
+
+    results: Dict[str, List[Dict]] = {}
+    for ticker, patterns in zip(panel.tickers, found):
+        patterns = [p for p in patterns if p.get("confidence", 0) >= min_confidence]
+        patterns.sort(key=lambda x: x.get("confidence", 0), reverse=True)
+        results[ticker] = patterns
+
+    if remember:
+        _remember(panel, results, lengths, min_confidence, lookback, selected)
+    return results
+
+
+def scan_patterns(
+    frames: Mapping[str, Any],
+    min_confidence: float = 0.6,
+    lookback: Optional[int] = None,
+    kinds: Optional[Iterable[str]] = None,
+    bars: Optional[int] = None,
+) -> Dict[str, List[Dict]]:
+    """Build a panel from per-ticker bars and scan it in one pass.
+
+    Parameters
+    ----------
+    frames : Mapping[str, Any]
+        Ticker -> OHLCV bars (see :func:`build_panel`)
+    min_confidence : float, optional
+        Minimum confidence threshold, by default 0.6
+    lookback : Optional[int], optional
+        Bars analyzed by every detector, by default per-detector defaults
+    kinds : Optional[Iterable[str]], optional
+        Subset of :data:`PATTERN_FAMILIES`, by default all
+    bars : Optional[int], optional
+        Panel width, by default the longest history
+
+    Returns
+    -------
+    Dict[str, List[Dict]]
+        Ticker -> patterns sorted by confidence (highest first)
+    """
+    panel = build_panel(frames, bars=bars)
+    return scan_panel(
+        panel, min_confidence=min_confidence, lookback=lookback, kinds=kinds
+    )
+
+
+def _remember(
+    panel: PatternPanel,
+    results: Dict[str, List[Dict]],
+    lengths: np.ndarray,
+    min_confidence: float,
+    lookback: Optional[int],
+    kinds: Tuple[str, ...],
+) -> None:
+    """Cache each ticker's scan with the bars it was computed from."""
+    span = _span(lookback)
+    ttl = int(os.getenv("CHART_PATTERN_CACHE_TTL", "3600"))
+    for row, ticker in enumerate(panel.tickers):
+        patterns = results[ticker]
+        if not patterns:
+            continue
+        n = int(lengths[row])
+        tail = min(n, span)
+        entry = {
+            "bars": n,
+            "min_confidence": min_confidence,
+            "kinds": kinds,
+            "close": panel.close[row, panel.close.shape[1] - tail :].copy(),
+            "high": panel.high[row, panel.high.shape[1] - tail :].copy(),
+            "low": panel.low[row, panel.low.shape[1] - tail :].copy(),
+            "patterns": patterns,
+        }
+        cache_indicator(
+            ticker.upper(), _SCAN_CACHE_NAME, {"lookback": lookback}, entry, ttl
+        )
+
+
+def _shift(pattern: Dict, offset: int) -> Dict:
+    """Copy of ``pattern`` with its bar indices moved by ``offset``."""
+    if not offset:
+        return dict(pattern)
+    key_levels = {
+        name: (value[0] + offset, value[1]) if isinstance(value, tuple) else value
+        for name, value in pattern.get("key_levels", {}).items()
+    }
+    return {
+        **pattern,
+        "start_idx": pattern["start_idx"] + offset,
+        "end_idx": pattern["end_idx"] + offset,
+        "key_levels": key_levels,
+    }
+
+
+def reuse_patterns(
+    ticker: str,
+    closes: Sequence[float],
+    highs: Optional[Sequence[float]] = None,
+    lows: Optional[Sequence[float]] = None,
+    kinds: Optional[Iterable[str]] = None,
+    min_confidence: float = 0.6,
+    lookback: Optional[int] = None,
+) -> Optional[List[Dict]]:
+    """Patterns from a recent panel scan that covers these exact bars.
+
+    Chart renderers call this before running a per-ticker detector. The
+    scan is reused only when it ran with the same ``lookback``, a
+    confidence floor no higher than ``min_confidence``, included every
+    requested family, and its trailing bars match ``closes`` (and
+    ``highs``/``lows`` for triangles/channels). Indices are shifted onto
+    ``closes``.
+
+    Parameters
+    ----------
+    ticker : str
+        Stock ticker symbol
+    closes : Sequence[float]
+        Closing prices the caller would pass to the detector
+    highs, lows : Optional[Sequence[float]], optional
+        High/low prices, by default ``closes``
+    kinds : Optional[Iterable[str]], optional
+        Families wanted, by default all
+    min_confidence : float, optional
+        Minimum confidence threshold, by default 0.6
+    lookback : Optional[int], optional
+        Detector lookback, by default per-detector defaults
+
+    Returns
+    -------
+    Optional[List[Dict]]
+        Matching patterns (possibly empty), or None when no usable scan is
+        cached and the caller should detect itself
+    """
+    entry = get_cached_indicator(
+        ticker.upper(), _SCAN_CACHE_NAME, {"lookback": lookback}
+    )
+    wanted = _normalize_kinds(kinds)
+    if not entry or entry["min_confidence"] > min_confidence:
+        return None
+    if any(kind not in entry["kinds"] for kind in wanted):
+        return None
+
+    closes_arr = np.asarray(closes, dtype=float)
+    n, scanned = len(closes_arr), entry["bars"]
+    span = _span(lookback)
+    # Detectors only look at the trailing window; a shorter scan only
+    # matches the identical series length
+    if n != scanned and (scanned < span or n < span):
+        return None
+
+    tail = len(entry["close"])
+    to_check = [(closes_arr, entry["close"])]
+    if any(kind in _HIGH_LOW_KINDS for kind in wanted):
+        highs_arr = closes_arr if highs is None else np.asarray(highs, dtype=float)
+        lows_arr = closes_arr if lows is None else np.asarray(lows, dtype=float)
+        to_check += [(highs_arr, entry["high"]), (lows_arr, entry["low"])]
+    for values, expected in to_check:
+        if len(values) < tail or not np.array_equal(
+            values[len(values) - tail :], expected
+        ):
+            return None
+
+    types = {t for kind in wanted for t in PATTERN_FAMILIES[kind]}
+    offset = n - scanned
+    return [
+        _shift(p, offset)
+        for p in entry["patterns"]
+        if p["type"] in types and p.get("confidence", 0) >= min_confidence
+    ]
+
+
+__all__ = [
+    "PATTERN_FAMILIES",
+    "PatternPanel",
+    "build_panel",
+    "swing_points",
+    "fit_trendlines",
+    "rolling_trendlines",
+    "scan_panel",
+    "scan_patterns",
+    "reuse_patterns",
+]
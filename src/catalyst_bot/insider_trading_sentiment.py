@@ -52,6 +52,7 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 from urllib.request import Request, urlopen
 
+from .cache_registry import bounded_cache
 from .logging_utils import get_logger
 
 log = get_logger("insider_sentiment")
@@ -59,7 +60,8 @@ log = get_logger("insider_sentiment")
 # Cache settings
 CACHE_DIR = Path("data/cache/insider_sentiment")
 CACHE_TTL_HOURS = 24  # Form 4s don't change, cache for 24 hours
-_memory_cache: Dict[str, Tuple[datetime, Tuple[float, Dict[str, Any]]]] = {}
+# cache_key -> (cached_at, result); LRU-bounded across tickers
+_memory_cache = bounded_cache("insider_sentiment", max_entries=1000)
 
 # SEC rate limiting: 10 requests/second max
 SEC_RATE_LIMIT = 0.1  # seconds between requests
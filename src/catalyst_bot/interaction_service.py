@@ -0,0 +1,471 @@
+"""Deferred-response service for Discord interactions.
+
+Discord expects an interaction to be acknowledged within three seconds.
+Chart timeframe buttons (``chart_{ticker}_{tf}``) and slash commands can
+take much longer than that (chart renders, JSONL scans, backtests), so this
+service acknowledges immediately and does the work on bounded pools:
+
+- Chart buttons are ACKed with a deferred update (type 6).  The render runs
+  in a small process pool (matplotlib is CPU-bound and not thread-safe),
+  then the original message is edited through
+  ``discord_interactions.edit_message_with_chart`` using the interaction
+  webhook.  Clicks on the same ticker/timeframe while a render is in
+  flight share that render, and repeat clicks on the same message collapse
+  into a single edit.
+- Slash commands run on a thread pool.  Commands that finish within a short
+  inline budget are answered directly (so fast, ephemeral replies keep
+  their flags); slower ones are ACKed with a deferred channel message
+  (type 5) and the result replaces the "thinking" message when ready.
+- PINGs, admin buttons (which may open modals) and indicator toggles are
+  answered inline as before.
+
+When more than ``INTERACTION_MAX_PENDING`` jobs are queued, new work is
+rejected with an ephemeral "busy" reply instead of piling up.
+
+Environment
+-----------
+INTERACTION_WORKERS : int
+    Threads for slash commands and message edits (default 4).
+INTERACTION_RENDER_PROCESSES : int
+    Processes for chart renders; 0 renders on the thread pool (default 2).
+INTERACTION_MAX_PENDING : int
+    Queued jobs before new interactions are turned away (default 32).
+INTERACTION_INLINE_BUDGET_MS : int
+    How long a slash command may run before it is deferred (default 150).
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .logging_utils import get_logger
+from .metrics_registry import inc_counter, observe, set_gauge
+
+log = get_logger("interaction_service")
+
+DISCORD_API = "https://discord.com/api/v10"
+
+INTERACTION_TYPE_PING = 1
+INTERACTION_TYPE_COMMAND = 2
+INTERACTION_TYPE_COMPONENT = 3
+
+RESPONSE_TYPE_PONG = 1
+RESPONSE_TYPE_CHANNEL_MESSAGE = 4
+RESPONSE_TYPE_DEFERRED_CHANNEL_MESSAGE = 5
+RESPONSE_TYPE_DEFERRED_UPDATE = 6
+
+EPHEMERAL = 64
+
+
+def _ephemeral(content: str) -> Dict[str, Any]:
+    return {
+        "type": RESPONSE_TYPE_CHANNEL_MESSAGE,
+        "data": {"content": content, "flags": EPHEMERAL},
+    }
+
+
+def interaction_webhook_url(interaction: Dict[str, Any]) -> Optional[str]:
+    """Webhook URL that edits/follows up on an interaction (valid 15 min)."""
+    app_id = interaction.get("application_id")
+    token = interaction.get("token")
+    if not (app_id and token):
+        return None
+    return f"{DISCORD_API}/webhooks/{app_id}/{token}"
+
+
+def _default_followup(webhook_url: str, data: Dict[str, Any]) -> bool:
+    """Replace the deferred "thinking" message with the command result."""
+    import requests
+
+    resp = requests.patch(f"{webhook_url}/messages/@original", json=data, timeout=15)
+    if not resp.ok:
+        log.warning(
+            "interaction_followup_failed status=%d body=%s",
+            resp.status_code,
+            resp.text[:200],
+        )
+    return resp.ok
+
+
+def _default_notice(webhook_url: str, content: str) -> bool:
+    """Post an ephemeral follow-up message (used when a deferred edit fails)."""
+    import requests
+
+    resp = requests.post(
+        webhook_url, json={"content": content, "flags": EPHEMERAL}, timeout=15
+    )
+    return resp.ok
+
+
+@dataclass
+class _CommandJob:
+    interaction: Dict[str, Any]
+    started: float
+    done: threading.Event = field(default_factory=threading.Event)
+    result: Optional[Dict[str, Any]] = None
+    acked: bool = False
+
+
+@dataclass
+class _RenderJob:
+    ticker: str
+    timeframe: str
+    started: float
+    # message id -> newest interaction for that message
+    waiters: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+
+class InteractionService:
+    """Acknowledge interactions immediately and do the work on worker pools."""
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        render_processes: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        inline_budget_ms: Optional[float] = None,
+        render_fn: Optional[Callable[[str, str], Any]] = None,
+        edit_fn: Optional[Callable[..., bool]] = None,
+        followup_fn: Optional[Callable[[str, Dict[str, Any]], bool]] = None,
+        notice_fn: Optional[Callable[[str, str], bool]] = None,
+        command_handler: Optional[Callable[[Dict[str, Any]], Any]] = None,
+    ):
+        def env_int(name, default):
+            try:
+                return int(os.getenv(name, str(default)))
+            except ValueError:
+                return default
+
+        if workers is None:
+            workers = env_int("INTERACTION_WORKERS", 4)
+        if render_processes is None:
+            render_processes = env_int("INTERACTION_RENDER_PROCESSES", 2)
+        if max_pending is None:
+            max_pending = env_int("INTERACTION_MAX_PENDING", 32)
+        if inline_budget_ms is None:
+            inline_budget_ms = env_int("INTERACTION_INLINE_BUDGET_MS", 150)
+
+        self.render_processes = max(0, render_processes)
+        self.max_pending = max(1, max_pending)
+        self.inline_budget = max(0.0, inline_budget_ms) / 1000.0
+        self._render_fn = render_fn
+        self._edit_fn = edit_fn
+        self._followup_fn = followup_fn or _default_followup
+        self._notice_fn = notice_fn or _default_notice
+        self._command_handler = command_handler
+
+        self._pool = ThreadPoolExecutor(
+            max_workers=max(1, workers), thread_name_prefix="interaction"
+        )
+        self._render_pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._renders: Dict[Tuple[str, str], _RenderJob] = {}
+        self._pending = 0
+        self.stats = {
+            "commands_inline": 0,
+            "commands_deferred": 0,
+            "renders": 0,
+            "render_cache_hits": 0,
+            "coalesced": 0,
+            "edits": 0,
+            "rejected_busy": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Routing
+    # ------------------------------------------------------------------
+
+    def handle(self, interaction: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Return the immediate response for an interaction payload."""
+        started = time.perf_counter()
+        interaction_type = interaction.get("type")
+        kind = "unknown"
+        try:
+            if interaction_type == INTERACTION_TYPE_PING:
+                kind = "ping"
+                return {"type": RESPONSE_TYPE_PONG}
+            if interaction_type == INTERACTION_TYPE_COMMAND:
+                kind = "command"
+                return self.submit_command(interaction)
+            if interaction_type == INTERACTION_TYPE_COMPONENT:
+                custom_id = interaction.get("data", {}).get("custom_id", "")
+                if custom_id.startswith("chart_toggle_"):
+                    kind = "indicator_toggle"
+                    from .commands.chart_interactions import (
+                        handle_chart_indicator_toggle,
+                    )
+
+                    return handle_chart_indicator_toggle(interaction)
+                kind = "component"
+                # Chart buttons come back through submit_chart()
+                from .discord_interactions import handle_interaction
+
+                return handle_interaction(interaction, service=self)
+            log.warning("unknown_interaction_type type=%s", interaction_type)
+            return None
+        finally:
+            observe("interaction_ack_seconds", time.perf_counter() - started, kind=kind)
+            inc_counter("interactions_total", kind=kind)
+
+    def _reserve_locked(self) -> bool:
+        if self._pending >= self.max_pending:
+            self.stats["rejected_busy"] += 1
+            inc_counter("interactions_rejected_total", reason="busy")
+            return False
+        self._pending += 1
+        set_gauge("interaction_pending", self._pending)
+        return True
+
+    def _release(self) -> None:
+        with self._lock:
+            self._pending -= 1
+            set_gauge("interaction_pending", self._pending)
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    # ------------------------------------------------------------------
+    # Slash commands
+    # ------------------------------------------------------------------
+
+    def submit_command(self, interaction: Dict[str, Any]) -> Dict[str, Any]:
+        """Run a slash command, answering inline if it finishes in budget."""
+        with self._lock:
+            if not self._reserve_locked():
+                return _ephemeral("⏳ The bot is busy right now, please try again.")
+
+        job = _CommandJob(interaction=interaction, started=time.perf_counter())
+        self._pool.submit(self._run_command, job)
+        job.done.wait(self.inline_budget)
+        with self._lock:
+            if job.result is not None:
+                self.stats["commands_inline"] += 1
+                return job.result
+            job.acked = True
+            self.stats["commands_deferred"] += 1
+
+        command = interaction.get("data", {}).get("name", "")
+        log.info("interaction_deferred command=%s", command)
+        response: Dict[str, Any] = {"type": RESPONSE_TYPE_DEFERRED_CHANNEL_MESSAGE}
+        if command == "admin":
+            response["data"] = {"flags": EPHEMERAL}
+        return response
+
+    def _run_command(self, job: _CommandJob) -> None:
+        try:
+            handler = self._command_handler
+            if handler is None:
+                from .slash_commands import handle_slash_command as handler
+            try:
+                result = handler(job.interaction)
+            except Exception as e:
+                log.error("interaction_command_failed err=%s", e, exc_info=True)
+                result = _ephemeral("❌ Command failed. Please try again later.")
+            if not isinstance(result, dict):
+                result = _ephemeral("✅ Done.")
+
+            with self._lock:
+                deferred = job.acked
+                if not deferred:
+                    job.result = result
+            job.done.set()
+            if deferred:
+                self._send_followup(job.interaction, result)
+            observe(
+                "interaction_job_seconds",
+                time.perf_counter() - job.started,
+                kind="command",
+            )
+        finally:
+            self._release()
+
+    def _send_followup(
+        self, interaction: Dict[str, Any], result: Dict[str, Any]
+    ) -> None:
+        if result.get("type") == RESPONSE_TYPE_DEFERRED_CHANNEL_MESSAGE:
+            return  # the handler defers on its own and follows up itself
+        webhook_url = interaction_webhook_url(interaction)
+        if not webhook_url:
+            log.warning("interaction_followup_skipped reason=no_token")
+            return
+        data = dict(result.get("data") or {})
+        data.pop("flags", None)  # visibility is fixed by the deferred ACK
+        try:
+            self._followup_fn(webhook_url, data)
+        except Exception as e:
+            log.warning("interaction_followup_exception err=%s", e)
+
+    # ------------------------------------------------------------------
+    # Chart buttons
+    # ------------------------------------------------------------------
+
+    def submit_chart(
+        self, interaction: Dict[str, Any], ticker: str, timeframe: str
+    ) -> Dict[str, Any]:
+        """Defer a chart button click and edit the message once rendered."""
+        if not interaction_webhook_url(interaction):
+            log.warning("chart_interaction_missing_token ticker=%s", ticker)
+            return _ephemeral("❌ Failed to update chart (missing configuration)")
+
+        message = interaction.get("message")
+        message_id = str(message.get("id", "")) if isinstance(message, dict) else ""
+        key = (ticker, timeframe)
+
+        with self._lock:
+            job = self._renders.get(key)
+            if job is not None:
+                self.stats["coalesced"] += 1
+                inc_counter("interactions_coalesced_total")
+                job.waiters[message_id] = interaction
+                return {"type": RESPONSE_TYPE_DEFERRED_UPDATE}
+            if not self._reserve_locked():
+                return _ephemeral("⏳ Charts are busy right now, please try again.")
+            job = _RenderJob(ticker, timeframe, time.perf_counter())
+            job.waiters[message_id] = interaction
+            self._renders[key] = job
+
+        self._pool.submit(self._start_render, job)
+        return {"type": RESPONSE_TYPE_DEFERRED_UPDATE}
+
+    def _render_executor(self):
+        if self.render_processes <= 0:
+            return self._pool
+        if self._render_pool is None:
+            # spawn: forking a threaded process can deadlock in the child
+            self._render_pool = ProcessPoolExecutor(
+                max_workers=self.render_processes,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._render_pool
+
+    def _start_render(self, job: _RenderJob) -> None:
+        from .chart_cache import get_cache
+
+        try:
+            cached = get_cache().get_cached_chart(job.ticker, job.timeframe)
+        except Exception as e:
+            log.debug("chart_cache_lookup_failed err=%s", e)
+            cached = None
+        if cached is not None:
+            self.stats["render_cache_hits"] += 1
+            self._finish_render(job, cached, cached=True)
+            return
+
+        render_fn = self._render_fn
+        if render_fn is None:
+            from .discord_interactions import render_chart as render_fn
+
+        self.stats["renders"] += 1
+        try:
+            future = self._render_executor().submit(
+                render_fn, job.ticker, job.timeframe
+            )
+        except Exception as e:
+            # Broken or unavailable process pool: render on this thread
+            log.warning("chart_render_pool_unavailable err=%s", e)
+            self._render_pool = None
+            future = Future()
+            try:
+                future.set_result(render_fn(job.ticker, job.timeframe))
+            except Exception as exc:
+                future.set_exception(exc)
+
+        def _on_done(f: Future) -> None:
+            try:
+                chart_path = f.result()
+            except Exception as e:
+                log.warning(
+                    "chart_render_failed ticker=%s tf=%s err=%s",
+                    job.ticker,
+                    job.timeframe,
+                    e,
+                )
+                chart_path = None
+            try:
+                self._pool.submit(self._finish_render, job, chart_path)
+            except RuntimeError:
+                self._release()  # service shut down while rendering
+
+        future.add_done_callback(_on_done)
+
+    def _finish_render(self, job: _RenderJob, chart_path, cached: bool = False):
+        from pathlib import Path
+
+        try:
+            with self._lock:
+                self._renders.pop((job.ticker, job.timeframe), None)
+                waiters: List[Dict[str, Any]] = list(job.waiters.values())
+
+            if chart_path is not None and not cached:
+                chart_path = Path(chart_path)
+                try:
+                    from .chart_cache import get_cache
+
+                    get_cache().cache_chart(job.ticker, job.timeframe, chart_path)
+                except Exception as e:
+                    log.debug("chart_cache_store_failed err=%s", e)
+
+            for interaction in waiters:
+                self._edit_chart_message(interaction, job, chart_path)
+            observe(
+                "interaction_job_seconds",
+                time.perf_counter() - job.started,
+                kind="chart",
+            )
+        finally:
+            self._release()
+
+    def _edit_chart_message(self, interaction, job: _RenderJob, chart_path) -> None:
+        webhook_url = interaction_webhook_url(interaction)
+        if chart_path is None:
+            try:
+                self._notice_fn(
+                    webhook_url,
+                    f"❌ Failed to generate {job.timeframe} chart for {job.ticker}",
+                )
+            except Exception as e:
+                log.warning("chart_failure_notice_failed err=%s", e)
+            return
+
+        edit_fn = self._edit_fn
+        if edit_fn is None:
+            from .discord_interactions import edit_interaction_chart as edit_fn
+        try:
+            if edit_fn(interaction, job.ticker, job.timeframe, chart_path):
+                self.stats["edits"] += 1
+        except Exception as e:
+            log.warning("chart_switch_exception err=%s", e)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait)
+        if self._render_pool is not None:
+            self._render_pool.shutdown(wait=wait)
+            self._render_pool = None
+
+
+_service: Optional[InteractionService] = None
+_service_lock = threading.Lock()
+
+
+def get_interaction_service() -> InteractionService:
+    """Return the process-wide interaction service."""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = InteractionService()
+    return _service
+
+
+__all__ = [
+    "InteractionService",
+    "get_interaction_service",
+    "interaction_webhook_url",
+]
@@ -0,0 +1,596 @@
+"""
+Intraday Feature Engine
+=======================
+
+One intraday bar fetch per ticker per cycle, shared by every enrichment
+signal.
+
+RVOL (``rvol.calculate_rvol_intraday``), VWAP (``vwap_calculator``), the
+volume/price divergence price change (``volume_price_divergence``) and the
+alert indicators (``market.get_intraday_indicators``) used to fetch their
+own bars (``fast_info``, 1-day and 2-day 1-minute histories) and keep their
+own caches.  With the engine on, they all read one :class:`FeatureSnapshot`
+per ticker, computed in a single pass over the NumPy columns of one
+1-minute bar set:
+
+- last price, previous regular-session close and price change
+- session volume, RVOL inputs (hours open, 20-day average volume)
+- session VWAP and the latest typical price
+- ATR(14) and RSI(14) (Wilder smoothing)
+- 5- and 15-minute momentum
+
+Bars are fetched in bulk: one ``yf.download`` call per batch of tickers,
+or a thread pool of per-ticker Tiingo IEX requests when Tiingo is
+configured (Tiingo has no multi-ticker intraday endpoint).  The 20-day
+volume baseline comes from the shared daily bar store, so it is fetched
+once per ticker per day.
+
+Concurrent requests for the same ticker wait on the in-flight fetch rather
+than starting another one.  The runner warms snapshots for a cycle's
+candidate tickers in the background and the enrichment worker prefetches
+each batch, so per-item lookups are usually dictionary hits.
+
+Usage:
+    from catalyst_bot.intraday_features import get_intraday_engine
+
+    engine = get_intraday_engine()
+    engine.prefetch(["AAPL", "TSLA"])
+    snap = engine.get("AAPL")
+    rvol_data = snap.rvol_data() if snap else None
+
+Environment Variables:
+    FEATURE_INTRADAY_FEATURES: Serve RVOL/VWAP/divergence from shared
+        snapshots (default: 1)
+    INTRADAY_FEATURES_TTL_SEC: Snapshot lifetime, about one cycle
+        (default: 60)
+    INTRADAY_FEATURES_BATCH_SIZE: Tickers per bulk bar request (default: 50)
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .bar_store import BAR_DTYPE, bars_to_records, get_bar_store
+from .cache_registry import bounded_cache
+from .config import get_settings
+from .logging_utils import get_logger
+from .market_hours import ET
+from .metrics_registry import inc_counter, observe
+from .time_utils import is_simulation
+
+log = get_logger("intraday_features")
+
+# Regular session in minutes after midnight ET
+REGULAR_OPEN_MIN = 9 * 60 + 30
+REGULAR_CLOSE_MIN = 16 * 60
+TRADING_HOURS = 6.5
+
+RSI_PERIOD = 14
+ATR_PERIOD = 14
+# Wilder smoothing only needs the recent tail: (13/14)**300 < 1e-9
+WILDER_TAIL = 300
+
+BASELINE_DAYS = 20
+# Seconds a caller waits on another thread's in-flight fetch
+INFLIGHT_WAIT_SEC = 15.0
+
+BarFetcher = Callable[[List[str]], Dict[str, np.ndarray]]
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, "") or default)
+    except ValueError:
+        return default
+
+
+def engine_enabled() -> bool:
+    """True when FEATURE_INTRADAY_FEATURES is on (default) outside simulation.
+
+    Snapshots are built from live bars, so simulated runs keep the
+    per-function lookups that honour the simulation clock.
+    """
+    if os.getenv("FEATURE_INTRADAY_FEATURES", "1").strip().lower() not in (
+        "1",
+        "true",
+        "yes",
+        "on",
+    ):
+        return False
+    return not is_simulation()
+
+
+def _et_offset(epoch: int) -> int:
+    """UTC offset of US/Eastern at ``epoch`` in seconds."""
+    dt = datetime.fromtimestamp(int(epoch), tz=timezone.utc).astimezone(ET)
+    return int(dt.utcoffset().total_seconds())
+
+
+def _et_local(ts: np.ndarray) -> np.ndarray:
+    """Shift UTC epochs to ET wall-clock epochs (DST-aware per UTC day)."""
+    days, inverse = np.unique(ts // 86400, return_inverse=True)
+    offsets = np.array([_et_offset(d * 86400 + 43200) for d in days], dtype=np.int64)
+    return ts + offsets[inverse]
+
+
+def _wilder_last(values: np.ndarray, period: int) -> Optional[float]:
+    """Last value of Wilder's smoothing (``ewm(alpha=1/period, adjust=False)``)."""
+    if not len(values):
+        return None
+    alpha = 1.0 / period
+    tail = values[-WILDER_TAIL:]
+    acc = float(tail[0])
+    for x in tail[1:]:
+        acc += alpha * (float(x) - acc)
+    return acc
+
+
+@dataclass(frozen=True)
+class FeatureSnapshot:
+    """Intraday features for one ticker, computed from one bar set."""
+
+    ticker: str
+    computed_at: float
+    num_bars: int
+    last_price: float
+    prev_close: Optional[float] = None
+    price_change: Optional[float] = None  # fraction, 0.05 = +5%
+    session_volume: int = 0  # regular-session volume today
+    session_bars: int = 0
+    hours_open: float = 0.0
+    avg_volume_20d: Optional[float] = None
+    vwap: Optional[float] = None
+    vwap_volume: float = 0.0
+    typical_price: Optional[float] = None
+    atr14: Optional[float] = None
+    rsi14: Optional[float] = None
+    momentum_5m: Optional[float] = None
+    momentum_15m: Optional[float] = None
+
+    def rvol_data(self) -> Optional[Dict[str, Any]]:
+        """RVOL result in the ``calculate_rvol_intraday`` shape, or None."""
+        if not self.session_volume or not self.avg_volume_20d:
+            return None
+        settings = get_settings()
+        if not getattr(settings, "feature_rvol", True):
+            return None
+        if self.avg_volume_20d < getattr(settings, "rvol_min_avg_volume", 100000):
+            return None
+        from .rvol import build_rvol_result
+
+        return build_rvol_result(
+            self.ticker, self.session_volume, self.avg_volume_20d, self.hours_open
+        )
+
+    def vwap_data(self) -> Optional[Dict[str, Any]]:
+        """VWAP result in the ``calculate_vwap`` shape, or None."""
+        if not self.vwap or self.typical_price is None:
+            return None
+        from .vwap_calculator import build_vwap_result
+
+        return build_vwap_result(
+            vwap=self.vwap,
+            current_price=self.last_price,
+            cumulative_volume=self.vwap_volume,
+            typical_price=self.typical_price,
+            num_bars=self.session_bars or self.num_bars,
+        )
+
+    def divergence_data(self) -> Optional[Dict[str, Any]]:
+        """Volume/price divergence from this snapshot's RVOL and price change."""
+        rvol = self.rvol_data()
+        if rvol is None or self.price_change is None:
+            return None
+        from .volume_price_divergence import detect_divergence
+
+        return detect_divergence(self.ticker, self.price_change, rvol["rvol"] - 1.0)
+
+    def indicators(self) -> Dict[str, float]:
+        """``market.get_intraday_indicators`` shape: ``vwap`` and ``rsi14``."""
+        out: Dict[str, float] = {}
+        if self.vwap is not None:
+            out["vwap"] = self.vwap
+        if self.rsi14 is not None:
+            out["rsi14"] = self.rsi14
+        return out
+
+
+def session_day(records: np.ndarray) -> Optional[int]:
+    """ET calendar day number (days since epoch) of the latest bar."""
+    if not len(records):
+        return None
+    return int(_et_local(records["ts"][-1:])[0] // 86400)
+
+
+def compute_snapshot(
+    ticker: str,
+    records: np.ndarray,
+    avg_volume_20d: Optional[float] = None,
+    now: Optional[float] = None,
+) -> Optional[FeatureSnapshot]:
+    """Compute every intraday feature from one BAR_DTYPE array in one pass.
+
+    ``records`` are 1-minute bars sorted by time, normally the last two
+    sessions including extended hours.  The session is the ET date of the
+    latest bar; VWAP and volume use its regular-hours bars (falling back to
+    all of its bars before the open).
+    """
+    now = time.time() if now is None else now
+    rec = records[np.isfinite(records["close"])]
+    if not len(rec):
+        return None
+
+    ts = rec["ts"]
+    high, low, close = rec["high"], rec["low"], rec["close"]
+    high = np.where(np.isfinite(high), high, close)
+    low = np.where(np.isfinite(low), low, close)
+    volume = np.nan_to_num(rec["volume"], nan=0.0)
+
+    local = _et_local(ts)
+    day = local // 86400
+    minute = (local % 86400) // 60
+    regular = (minute >= REGULAR_OPEN_MIN) & (minute < REGULAR_CLOSE_MIN)
+    today = day == day[-1]
+    session = today & regular
+
+    prior = regular & (day < day[-1])
+    prev_close = float(close[prior][-1]) if prior.any() else None
+    last_price = float(close[-1])
+    price_change = (
+        last_price / prev_close - 1.0 if prev_close and prev_close > 0 else None
+    )
+
+    # Session VWAP on typical price
+    window = session if session.any() else today
+    typical = (high + low + close) / 3.0
+    vol_w = volume[window]
+    vwap_volume = float(vol_w.sum())
+    vwap = float((typical[window] * vol_w).sum() / vwap_volume) if vwap_volume else None
+
+    # ATR / RSI over the whole series so the first session bars have history
+    prev = close[:-1]
+    true_range = np.maximum(
+        high[1:] - low[1:],
+        np.maximum(np.abs(high[1:] - prev), np.abs(low[1:] - prev)),
+    )
+    atr14 = _wilder_last(true_range, ATR_PERIOD)
+    delta = np.diff(close)
+    avg_up = _wilder_last(np.clip(delta, 0.0, None), RSI_PERIOD)
+    avg_down = _wilder_last(np.clip(-delta, 0.0, None), RSI_PERIOD)
+    rsi14 = None
+    if avg_up is not None and avg_down:
+        rsi14 = 100.0 - 100.0 / (1.0 + avg_up / avg_down)
+    elif avg_up:
+        rsi14 = 100.0
+
+    def _momentum(bars: int) -> Optional[float]:
+        if len(close) <= bars or not close[-1 - bars]:
+            return None
+        return float(close[-1] / close[-1 - bars] - 1.0)
+
+    # Hours since the regular open, for RVOL extrapolation
+    now_local = int(_et_local(np.array([int(now)], dtype=np.int64))[0])
+    if now_local // 86400 != day[-1]:
+        hours_open = TRADING_HOURS
+    else:
+        since_open = (now_local % 86400) / 60.0 - REGULAR_OPEN_MIN
+        hours_open = min(max(since_open / 60.0, 0.0), TRADING_HOURS)
+
+    return FeatureSnapshot(
+        ticker=ticker,
+        computed_at=now,
+        num_bars=len(rec),
+        last_price=last_price,
+        prev_close=prev_close,
+        price_change=price_change,
+        session_volume=int(volume[session].sum()),
+        session_bars=int(session.sum()),
+        hours_open=round(hours_open, 4),
+        avg_volume_20d=avg_volume_20d,
+        vwap=vwap,
+        vwap_volume=vwap_volume,
+        typical_price=float(typical[window][-1]) if window.any() else None,
+        atr14=atr14,
+        rsi14=rsi14,
+        momentum_5m=_momentum(5),
+        momentum_15m=_momentum(15),
+    )
+
+
+# ============================================================================
+# Data sources
+# ============================================================================
+
+
+def _finite(records: np.ndarray) -> np.ndarray:
+    return records[np.isfinite(records["close"])]
+
+
+def fetch_intraday_bars(tickers: List[str]) -> Dict[str, np.ndarray]:
+    """Fetch the last two sessions of 1-minute bars for ``tickers`` in bulk."""
+    settings = get_settings()
+    tiingo_key = getattr(settings, "tiingo_api_key", "") or ""
+    if getattr(settings, "feature_tiingo", False) and tiingo_key:
+        return _fetch_tiingo(tickers, tiingo_key)
+    return _fetch_yfinance(tickers)
+
+
+def _fetch_tiingo(tickers: List[str], api_key: str) -> Dict[str, np.ndarray]:
+    from .market import _tiingo_intraday_series
+
+    end = datetime.now(timezone.utc).date() + timedelta(days=1)
+    start = end - timedelta(days=5)
+
+    def one(ticker: str) -> Tuple[str, np.ndarray]:
+        df = _tiingo_intraday_series(
+            ticker,
+            api_key,
+            start_date=start.strftime("%Y-%m-%d"),
+            end_date=end.strftime("%Y-%m-%d"),
+            resample_freq="1min",
+            after_hours=True,
+        )
+        return ticker, _finite(bars_to_records(df))
+
+    out: Dict[str, np.ndarray] = {}
+    with ThreadPoolExecutor(max_workers=min(8, max(1, len(tickers)))) as pool:
+        for ticker, records in pool.map(one, tickers):
+            out[ticker] = records
+    return out
+
+
+def _fetch_yfinance(tickers: List[str]) -> Dict[str, np.ndarray]:
+    import pandas as pd
+    import yfinance as yf
+
+    df = yf.download(
+        tickers,
+        period="2d",
+        interval="1m",
+        prepost=True,
+        group_by="ticker",
+        auto_adjust=False,
+        progress=False,
+        threads=True,
+    )
+    out: Dict[str, np.ndarray] = {}
+    if df is None or df.empty:
+        return out
+    grouped = isinstance(df.columns, pd.MultiIndex)
+    level0 = set(df.columns.get_level_values(0)) if grouped else set()
+    for ticker in tickers:
+        if grouped and ticker in level0:
+            frame = df[ticker]
+        elif not grouped and len(tickers) == 1:
+            frame = df
+        else:
+            continue
+        out[ticker] = _finite(bars_to_records(frame))
+    return out
+
+
+def daily_volume_baseline(ticker: str, day: int) -> Optional[float]:
+    """20-day average daily volume before ET day number ``day``.
+
+    Reads the shared daily bar store (fetching only uncovered days), with
+    the same validity rules as ``rvol.get_volume_baseline``.
+    """
+    from .rvol import MIN_VOLUME_THRESHOLD, _fetch_daily_history
+
+    end = datetime.fromtimestamp(day * 86400, tz=timezone.utc)
+    start = end - timedelta(days=BASELINE_DAYS + 15)
+    df = get_bar_store().get_bars(
+        ticker, "1d", start, end, fetcher=_fetch_daily_history
+    )
+    volumes = df["Volume"].to_numpy(dtype=np.float64)[-BASELINE_DAYS:]
+    valid = volumes[volumes > MIN_VOLUME_THRESHOLD]
+    if len(valid) < BASELINE_DAYS * 0.5:
+        return None
+    return float(valid.mean())
+
+
+# ============================================================================
+# Engine
+# ============================================================================
+
+
+class IntradayFeatureEngine:
+    """Per-ticker feature snapshots backed by bulk intraday bar fetches."""
+
+    def __init__(
+        self,
+        ttl: Optional[float] = None,
+        batch_size: Optional[int] = None,
+        fetch_bars: Optional[BarFetcher] = None,
+        baseline_fn: Optional[Callable[[str, int], Optional[float]]] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.ttl = (
+            ttl if ttl is not None else _env_float("INTRADAY_FEATURES_TTL_SEC", 60.0)
+        )
+        self.batch_size = int(
+            batch_size
+            if batch_size is not None
+            else _env_float("INTRADAY_FEATURES_BATCH_SIZE", 50)
+        )
+        self._fetch_bars = fetch_bars or fetch_intraday_bars
+        self._baseline_fn = baseline_fn or daily_volume_baseline
+        self._clock = clock
+        self._lock = threading.Lock()
+        # ticker -> (computed_at, snapshot or None when the fetch came back empty)
+        self._snapshots = bounded_cache("intraday_features", max_entries=2000)
+        self._baselines = bounded_cache("intraday_baselines", max_entries=2000)
+        self._inflight: Dict[str, threading.Event] = {}
+        self.stats = {"hits": 0, "fetches": 0, "tickers_fetched": 0, "empty": 0}
+
+    def _fresh(self, ticker: str, now: float) -> Tuple[bool, Optional[FeatureSnapshot]]:
+        entry = self._snapshots.get(ticker)
+        if entry is not None and now - entry[0] < self.ttl:
+            return True, entry[1]
+        return False, None
+
+    def peek(self, ticker: str) -> Optional[FeatureSnapshot]:
+        """Fresh cached snapshot for ``ticker`` without fetching."""
+        with self._lock:
+            return self._fresh(ticker.strip().upper(), self._clock())[1]
+
+    def get(self, ticker: str) -> Optional[FeatureSnapshot]:
+        """Snapshot for ``ticker``, fetching its bars if not fresh."""
+        ticker = ticker.strip().upper()
+        return self.prefetch([ticker]).get(ticker)
+
+    def prefetch(
+        self, tickers: Iterable[str], wait: bool = True
+    ) -> Dict[str, Optional[FeatureSnapshot]]:
+        """Make sure every ticker has a fresh snapshot, fetching in bulk.
+
+        With ``wait=False`` the fetch runs on a background thread and only
+        already-fresh snapshots are returned.
+        """
+        wanted = sorted({t.strip().upper() for t in tickers if t and t.strip()})
+        now = self._clock()
+        out: Dict[str, Optional[FeatureSnapshot]] = {}
+        claimed: List[str] = []
+        waiting: List[Tuple[str, threading.Event]] = []
+        with self._lock:
+            for ticker in wanted:
+                fresh, snap = self._fresh(ticker, now)
+                if fresh:
+                    self.stats["hits"] += 1
+                    out[ticker] = snap
+                elif ticker in self._inflight:
+                    waiting.append((ticker, self._inflight[ticker]))
+                else:
+                    self._inflight[ticker] = threading.Event()
+                    claimed.append(ticker)
+
+        if claimed:
+            if not wait:
+                threading.Thread(
+                    target=self._load,
+                    args=(claimed,),
+                    name="IntradayFeaturePrefetch",
+                    daemon=True,
+                ).start()
+            else:
+                self._load(claimed)
+        if not wait:
+            return out
+
+        for ticker, event in waiting:
+            event.wait(INFLIGHT_WAIT_SEC)
+        with self._lock:
+            for ticker in claimed + [t for t, _ in waiting]:
+                out[ticker] = self._fresh(ticker, self._clock())[1]
+        return out
+
+    def _baseline(self, ticker: str, day: int) -> Optional[float]:
+        key = (ticker, day)
+        if key in self._baselines:
+            return self._baselines[key]
+        try:
+            value = self._baseline_fn(ticker, day)
+        except Exception as e:
+            log.debug("intraday_baseline_failed ticker=%s err=%s", ticker, e)
+            value = None
+        self._baselines[key] = value
+        return value
+
+    def _load(self, tickers: List[str]) -> None:
+        try:
+            for i in range(0, len(tickers), max(1, self.batch_size)):
+                chunk = tickers[i : i + self.batch_size]
+                st = time.perf_counter()
+                try:
+                    bars = self._fetch_bars(chunk)
+                except Exception as e:
+                    log.warning(
+                        "intraday_bar_fetch_failed tickers=%d err=%s",
+                        len(chunk),
+                        e.__class__.__name__,
+                    )
+                    bars = {}
+                observe("intraday_bar_fetch_seconds", time.perf_counter() - st)
+                inc_counter("intraday_bar_fetches_total")
+                self.stats["fetches"] += 1
+                self.stats["tickers_fetched"] += len(chunk)
+
+                now = self._clock()
+                for ticker in chunk:
+                    snap = None
+                    records = bars.get(ticker)
+                    try:
+                        if records is not None and len(records):
+                            day = session_day(records)
+                            snap = compute_snapshot(
+                                ticker, records, self._baseline(ticker, day), now
+                            )
+                    except Exception as e:
+                        log.debug(
+                            "intraday_features_failed ticker=%s err=%s", ticker, e
+                        )
+                    if snap is None:
+                        self.stats["empty"] += 1
+                    with self._lock:
+                        self._snapshots[ticker] = (now, snap)
+                log.debug(
+                    "intraday_features_loaded tickers=%d with_bars=%d t_ms=%.1f",
+                    len(chunk),
+                    sum(1 for t in chunk if bars.get(t) is not None),
+                    (time.perf_counter() - st) * 1000.0,
+                )
+        finally:
+            with self._lock:
+                for ticker in tickers:
+                    event = self._inflight.pop(ticker, None)
+                    if event is not None:
+                        event.set()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._snapshots.clear()
+            self._baselines.clear()
+
+
+_engine: Optional[IntradayFeatureEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_intraday_engine() -> IntradayFeatureEngine:
+    """Return the process-wide feature engine."""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = IntradayFeatureEngine()
+        return _engine
+
+
+def prefetch_features(tickers: Iterable[str], wait: bool = True) -> None:
+    """Warm snapshots for ``tickers`` when the engine is enabled."""
+    if not engine_enabled():
+        return
+    try:
+        get_intraday_engine().prefetch(tickers, wait=wait)
+    except Exception as e:
+        log.debug("intraday_prefetch_failed err=%s", e.__class__.__name__)
+
+
+__all__ = [
+    "BAR_DTYPE",
+    "FeatureSnapshot",
+    "IntradayFeatureEngine",
+    "compute_snapshot",
+    "daily_volume_baseline",
+    "engine_enabled",
+    "fetch_intraday_bars",
+    "get_intraday_engine",
+    "prefetch_features",
+]
@@ -6,10 +6,15 @@ This module provides functionality to:
 - Filter out stop words and common non-catalyst phrases
 - Count and rank keyword candidates by frequency
 - Calculate statistical scores for phrase relevance
+
+Counting is split from scoring (``count_ngrams`` /
+``score_discriminative_counts``) so pre-aggregated counts, e.g. window sums
+from :mod:`catalyst_bot.ngram_store`, can be scored without re-tokenizing
+titles.
 """
 
 import re
-from typing import List, Dict, Tuple, Set
+from typing import Dict, Iterable, List, Optional, Tuple
 from collections import Counter
 import logging
 
@@ -40,6 +45,7 @@ PRESERVE_TERMS = {
     'EPS', 'P/E', 'ROI', 'EBITDA', 'YoY', 'QoQ', 'AI', 'ML', 'API', 'SaaS',
     'EV', 'AV', 'R&D', 'IP', 'NDA', 'BLA', 'IND'
 }
+_PRESERVE_LOWER = {t.lower() for t in PRESERVE_TERMS}
 
 # Non-catalyst phrases to filter out
 NON_CATALYST_PHRASES = {
@@ -129,9 +135,9 @@ def is_valid_ngram(ngram: str, tokens: List[str]) -> bool:
         return False
 
     # Should not start or end with a stop word (unless it's a preserved term)
-    if tokens[0] in STOP_WORDS and tokens[0] not in [t.lower() for t in PRESERVE_TERMS]:
+    if tokens[0] in STOP_WORDS and tokens[0] not in _PRESERVE_LOWER:
         return False
-    if tokens[-1] in STOP_WORDS and tokens[-1] not in [t.lower() for t in PRESERVE_TERMS]:
+    if tokens[-1] in STOP_WORDS and tokens[-1] not in _PRESERVE_LOWER:
         return False
 
     return True
@@ -152,9 +158,11 @@ def extract_ngrams(text: str, n: int) -> List[str]:
         return []
 
     # Normalize and tokenize
-    normalized = normalize_text(text)
-    tokens = normalized.split()
+    return _token_ngrams(normalize_text(text).split(), n)
+
 
+def _token_ngrams(tokens: List[str], n: int) -> List[str]:
+    """Valid n-grams of size n from already-normalized tokens."""
     if len(tokens) < n:
         return []
 
@@ -181,12 +189,37 @@ def extract_all_ngrams(text: str, max_n: int = 4) -> List[str]:
     Returns:
         List of all n-grams
     """
+    if not text:
+        return []
+
+    # Normalize once and slice every n-gram size from the same tokens
+    tokens = normalize_text(text).split()
     all_ngrams = []
     for n in range(1, max_n + 1):
-        all_ngrams.extend(extract_ngrams(text, n))
+        all_ngrams.extend(_token_ngrams(tokens, n))
     return all_ngrams
 
 
+def count_ngrams(titles: Iterable[str], max_n: int = 4) -> Tuple[Counter, int]:
+    """
+    Count n-gram occurrences across titles.
+
+    Args:
+        titles: Title strings (empty titles are skipped)
+        max_n: Maximum n-gram size
+
+    Returns:
+        Tuple of (Counter of phrase -> occurrences, number of non-empty titles)
+    """
+    counts = Counter()
+    total = 0
+    for title in titles:
+        if title:
+            counts.update(extract_all_ngrams(title, max_n=max_n))
+            total += 1
+    return counts, total
+
+
 def mine_keyword_candidates(
     titles: List[str],
     min_occurrences: int = 5,
@@ -206,14 +239,8 @@ def mine_keyword_candidates(
     if not titles:
         return {}
 
-    # Extract all n-grams from all titles
-    all_ngrams = []
-    for title in titles:
-        if title:
-            all_ngrams.extend(extract_all_ngrams(title, max_n=max_ngram_size))
-
-    # Count occurrences
-    ngram_counts = Counter(all_ngrams)
+    # Count n-gram occurrences across all titles
+    ngram_counts, _ = count_ngrams(titles, max_n=max_ngram_size)
 
     # Filter by minimum occurrences
     candidates = {
@@ -305,34 +332,55 @@ def mine_discriminative_keywords(
         logger.warning("Need both positive and negative titles for discriminative mining")
         return []
 
-    # Extract n-grams from both sets
-    positive_ngrams = []
-    for title in positive_titles:
-        if title:
-            positive_ngrams.extend(extract_all_ngrams(title, max_n=max_ngram_size))
+    # Count n-gram occurrences in each set
+    positive_counts, _ = count_ngrams(positive_titles, max_n=max_ngram_size)
+    negative_counts, _ = count_ngrams(negative_titles, max_n=max_ngram_size)
+
+    scored_phrases = score_discriminative_counts(
+        positive_counts,
+        negative_counts,
+        total_positive=len(positive_titles),
+        total_negative=len(negative_titles),
+        min_occurrences=min_occurrences,
+        min_lift=min_lift,
+    )
 
-    negative_ngrams = []
-    for title in negative_titles:
-        if title:
-            negative_ngrams.extend(extract_all_ngrams(title, max_n=max_ngram_size))
+    logger.info(
+        f"Found {len(scored_phrases)} discriminative keywords "
+        f"from {len(positive_titles)} positive and {len(negative_titles)} negative titles"
+    )
+
+    return scored_phrases
 
-    # Count occurrences in each set
-    positive_counts = Counter(positive_ngrams)
-    negative_counts = Counter(negative_ngrams)
 
-    # Get all unique phrases that meet minimum occurrence threshold in positive set
-    candidates = {
-        phrase for phrase, count in positive_counts.items()
-        if count >= min_occurrences
-    }
+def score_discriminative_counts(
+    positive_counts: Dict[str, int],
+    negative_counts: Dict[str, int],
+    total_positive: int,
+    total_negative: int,
+    min_occurrences: int = 3,
+    min_lift: float = 2.0
+) -> List[Tuple[str, float, int, int]]:
+    """
+    Score pre-counted n-grams by lift.
 
-    # Calculate lift scores
-    total_positive = len(positive_titles)
-    total_negative = len(negative_titles)
+    Args:
+        positive_counts: Phrase -> occurrences in the positive set
+        negative_counts: Phrase -> occurrences in the negative set (only
+                         phrases that are positive candidates are looked up)
+        total_positive: Number of positive titles
+        total_negative: Number of negative titles
+        min_occurrences: Minimum occurrences in positive set
+        min_lift: Minimum lift ratio to consider
 
+    Returns:
+        List of tuples (phrase, lift_score, positive_count, negative_count),
+        sorted by lift score descending
+    """
     scored_phrases = []
-    for phrase in candidates:
-        pos_count = positive_counts.get(phrase, 0)
+    for phrase, pos_count in positive_counts.items():
+        if pos_count < min_occurrences:
+            continue
         neg_count = negative_counts.get(phrase, 0)
 
         lift = calculate_phrase_score(
@@ -345,11 +393,6 @@ def mine_discriminative_keywords(
     # Sort by lift score descending
     scored_phrases.sort(key=lambda x: x[1], reverse=True)
 
-    logger.info(
-        f"Found {len(scored_phrases)} discriminative keywords "
-        f"from {len(positive_titles)} positive and {len(negative_titles)} negative titles"
-    )
-
     return scored_phrases
 
 
@@ -387,6 +430,45 @@ def get_phrase_contexts(
     return contexts
 
 
+class PhraseTrie:
+    """
+    Token trie over every contiguous sub-phrase of the phrases added to it.
+
+    Each node records the smallest count of any added phrase passing through
+    it, so "is this phrase inside a kept phrase, and how rare is the rarest
+    such phrase" is a single walk of the phrase's tokens instead of a scan
+    over every kept phrase.
+    """
+
+    __slots__ = ('_root',)
+
+    def __init__(self) -> None:
+        self._root: Dict[str, list] = {}
+
+    def add(self, tokens: List[str], count: int) -> None:
+        """Index all contiguous sub-phrases of ``tokens`` with ``count``."""
+        for start in range(len(tokens)):
+            children = self._root
+            for token in tokens[start:]:
+                node = children.get(token)
+                if node is None:
+                    node = children[token] = [count, {}]
+                elif count < node[0]:
+                    node[0] = count
+                children = node[1]
+
+    def min_containing_count(self, tokens: List[str]) -> Optional[int]:
+        """Smallest count of an added phrase containing ``tokens``, if any."""
+        children = self._root
+        node = None
+        for token in tokens:
+            node = children.get(token)
+            if node is None:
+                return None
+            children = node[1]
+        return node[0] if node is not None else None
+
+
 def filter_subsumed_phrases(
     keyword_counts: Dict[str, int],
     subsume_threshold: float = 0.9
@@ -395,7 +477,8 @@ def filter_subsumed_phrases(
     Filter out n-grams that are subsumed by longer n-grams.
 
     For example, if "fda approval" appears 100 times and "fda" appears 105 times,
-    "fda" is mostly subsumed by "fda approval" and can be filtered.
+    "fda" is mostly subsumed by "fda approval" and can be filtered. Containment
+    is on whole tokens ("app" is not inside "fda approval").
 
     Args:
         keyword_counts: Dict of phrase -> count
@@ -413,23 +496,18 @@ def filter_subsumed_phrases(
     )
 
     filtered = {}
+    kept = PhraseTrie()
 
     for phrase, count in sorted_phrases:
-        is_subsumed = False
-
-        # Check if this phrase is contained in any longer phrase we've kept
-        for kept_phrase in filtered:
-            if phrase in kept_phrase:
-                # Calculate subsume ratio
-                ratio = count / filtered[kept_phrase]
+        tokens = phrase.split()
 
-                # If most occurrences are within the longer phrase, skip it
-                if ratio >= subsume_threshold:
-                    is_subsumed = True
-                    break
+        # Most occurrences are within a longer phrase we've kept: skip it
+        min_count = kept.min_containing_count(tokens)
+        if min_count is not None and count >= subsume_threshold * min_count:
+            continue
 
-        if not is_subsumed:
-            filtered[phrase] = count
+        filtered[phrase] = count
+        kept.add(tokens, count)
 
     logger.info(
         f"Filtered {len(keyword_counts) - len(filtered)} subsumed phrases "
@@ -54,6 +54,8 @@ except ImportError:
     BREAKER_AVAILABLE = False
     pybreaker = None  # type: ignore
 
+from .llm_scheduler import scheduled
+
 _logger = logging.getLogger(__name__)
 
 
@@ -152,6 +154,7 @@ class AsyncLLMClient:
             await self.session.close()
         await asyncio.sleep(0.25)  # Allow cleanup
 
+    @scheduled
     async def query(
         self, prompt: str, *, system: Optional[str] = None, priority: str = "normal"
     ) -> Optional[str]:
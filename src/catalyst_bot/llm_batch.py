@@ -9,6 +9,8 @@ Features:
 - Automatic batching of similar requests
 - Concurrent processing with thread pool
 - Response caching to avoid duplicate queries
+- Scheduled in the ``batch`` LLM scheduler class by default, so queued work
+  yields provider slots to alert-path calls
 """
 
 from __future__ import annotations
@@ -22,6 +24,7 @@ from queue import Empty, PriorityQueue
 from typing import Any, Callable, Dict, List, Optional
 
 from .llm_client import query_llm
+from .llm_scheduler import BATCH, llm_priority
 from .logging_utils import get_logger
 
 log = get_logger("llm_batch")
@@ -37,6 +40,7 @@ class LLMRequest:
     timeout: float = 20.0
     callback: Optional[Callable[[Optional[str]], None]] = None
     request_id: Optional[str] = None
+    priority_class: str = BATCH  # llm_scheduler class
 
     def __lt__(self, other):
         """Priority queue comparison (lower priority number = higher priority)."""
@@ -113,6 +117,7 @@ class LLMBatchProcessor:
         priority: int = 5,
         timeout: float = 20.0,
         callback: Optional[Callable[[Optional[str]], None]] = None,
+        priority_class: str = BATCH,
     ) -> str:
         """
         Submit LLM request to queue.
@@ -129,6 +134,8 @@ class LLMBatchProcessor:
             Request timeout in seconds
         callback : callable, optional
             Callback function to receive response
+        priority_class : str
+            LLM scheduler class the request runs in (default: batch)
 
         Returns
         -------
@@ -168,6 +175,7 @@ class LLMBatchProcessor:
             timeout=timeout,
             callback=callback,
             request_id=request_id,
+            priority_class=priority_class,
         )
 
         self.request_queue.put(request)
@@ -240,11 +248,12 @@ class LLMBatchProcessor:
         """Process a single LLM request."""
         try:
             # Query LLM
-            response = query_llm(
-                prompt=request.prompt,
-                system=request.system,
-                timeout=request.timeout,
-            )
+            with llm_priority(request.priority_class):
+                response = query_llm(
+                    prompt=request.prompt,
+                    system=request.system,
+                    timeout=request.timeout,
+                )
 
             # Cache response
             cache_key = self._cache_key(request.prompt, request.system)
@@ -495,6 +504,63 @@ def group_items_for_batch(items: List[Dict[str, Any]], batch_size: int = 5) -> L
     return batches
 
 
+def group_items_by_token_budget(
+    items: List[Any],
+    token_budget: int,
+    max_items: int = 10,
+    tokens_of: Optional[Callable[[Any], int]] = None,
+) -> List[List[Any]]:
+    """
+    Pack items into batches that each fit a prompt token budget.
+
+    Unlike ``group_items_for_batch``, which splits by count, this fills
+    each batch by size (first-fit decreasing), so many short items share a
+    call and long items do not push a batch past the model's context.
+
+    Parameters
+    ----------
+    items : list
+        Items to pack
+    token_budget : int
+        Maximum summed tokens per batch. An item larger than the budget
+        gets a batch of its own.
+    max_items : int
+        Maximum items per batch (default: 10)
+    tokens_of : callable, optional
+        Returns an item's token count (default: ``item["tokens"]``)
+
+    Returns
+    -------
+    list of list
+        Batches, largest items first
+
+    Example
+    -------
+    >>> items = [{'tokens': t} for t in (700, 300, 600, 200, 900)]
+    >>> batches = group_items_by_token_budget(items, token_budget=1000)
+    >>> [[i['tokens'] for i in b] for b in batches]
+    [[900], [700, 300], [600, 200]]
+    """
+    if tokens_of is None:
+
+        def tokens_of(item: Any) -> int:
+            return item.get("tokens", 0)
+
+    batches: List[List[Any]] = []
+    totals: List[int] = []
+    for item in sorted(items, key=tokens_of, reverse=True):
+        tokens = tokens_of(item)
+        for i, batch in enumerate(batches):
+            if len(batch) < max_items and totals[i] + tokens <= token_budget:
+                batch.append(item)
+                totals[i] += tokens
+                break
+        else:
+            batches.append([item])
+            totals.append(tokens)
+    return batches
+
+
 # Batch classification prompt templates
 BATCH_CLASSIFICATION_PROMPT_TEMPLATE = """You are a financial news classifier. Classify the following {count} news items.
 
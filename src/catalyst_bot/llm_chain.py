@@ -12,6 +12,16 @@ Each stage builds on the previous, creating a progressive refinement of
 understanding. The pipeline uses the existing llm_hybrid router for
 Gemini→Claude fallback and includes exponential backoff retry logic.
 
+Modes (LLM_CHAIN_MODE):
+- fused (default): one request asks for all four stages as a single JSON
+  object. Each stage is validated against its llm_schemas model and only
+  the stages that fail validation are re-asked with the stage prompts.
+- chain: the staged pipeline. Stages 3 and 4 only need the extraction and
+  summary, so they run concurrently.
+
+The fused mode needs pydantic (llm_schemas); without it the chain mode is
+used.
+
 References:
 - Multi-pass prompting: https://arxiv.org/abs/2203.11171
 - Chain-of-thought: https://arxiv.org/abs/2201.11903
@@ -21,13 +31,17 @@ from __future__ import annotations
 
 import asyncio
 import json
+import os
+import re
 import time
+from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 
 try:
     from .llm_hybrid import query_hybrid_llm
+    from .llm_scheduler import SEC, llm_priority
     from .logging_utils import get_logger
     from .numeric_extractor import NumericMetrics
     from .xbrl_parser import XBRLFinancials
@@ -42,6 +56,23 @@ except Exception:
     async def query_hybrid_llm(*args, **kwargs):
         raise NotImplementedError("llm_hybrid not available")
 
+    SEC = "sec"
+
+    @contextmanager
+    def llm_priority(priority_class):
+        yield
+
+
+try:
+    from .llm_schemas import (
+        FilingExtraction,
+        FilingKeywords,
+        FilingSentiment,
+        FilingSummary,
+    )
+except Exception:  # pydantic not installed
+    FilingExtraction = FilingKeywords = FilingSentiment = FilingSummary = None
+
 
 log = get_logger("llm_chain")
 
@@ -98,6 +129,8 @@ class LLMChainOutput:
     sentiment: SentimentOutput
     total_time_sec: float
     stages_completed: int
+    mode: str = "chain"  # "fused" or "chain"
+    llm_calls: int = 0  # LLM requests made (excluding retries)
 
 
 # ============================================================================
@@ -144,16 +177,7 @@ TASK: Write a 100-150 word summary that:
 
 Write in active voice. Be direct and factual. This will be shown to traders."""
 
-PROMPT_STAGE3_KEYWORDS = """You are tagging an SEC filing with catalyst keywords.
-
-SUMMARY:
-{summary}
-
-KEY FACTS:
-{key_facts}
-
-AVAILABLE KEYWORDS (choose 1-5 that apply):
-- merger, acquisition, takeover
+CATALYST_KEYWORD_CHOICES = """- merger, acquisition, takeover
 - earnings, revenue_beat, revenue_miss, eps_beat, eps_miss
 - offering, dilution, warrant_exercise, shelf_registration
 - fda_approval, clinical_trial, drug_approval
@@ -165,12 +189,27 @@ AVAILABLE KEYWORDS (choose 1-5 that apply):
 - restructuring, layoffs, cost_cutting
 - expansion, new_market, international
 - product_launch, new_product
-- lawsuit, settlement, regulatory_action
+- lawsuit, settlement, regulatory_action"""
+
+PROMPT_STAGE3_KEYWORDS = (
+    """You are tagging an SEC filing with catalyst keywords.
+
+SUMMARY:
+{summary}
+
+KEY FACTS:
+{key_facts}
+
+AVAILABLE KEYWORDS (choose 1-5 that apply):
+"""
+    + CATALYST_KEYWORD_CHOICES
+    + """
 
 TASK: Return ONLY a JSON list of keywords that apply:
 {{"keywords": ["keyword1", "keyword2", ...]}}
 
 Be selective - only tag clear, relevant catalysts. Maximum 5 keywords."""
+)
 
 PROMPT_STAGE4_SENTIMENT = """You are scoring the market impact of an SEC filing.
 
@@ -203,6 +242,51 @@ Format as JSON:
   "confidence": 0.8
 }}"""
 
+PROMPT_FUSED_ANALYSIS = (
+    """You are analyzing an SEC filing for traders.
+
+FILING TEXT:
+{filing_text}
+
+NUMERIC METRICS (already extracted):
+{numeric_metrics}
+
+XBRL FINANCIALS (if available):
+{xbrl_financials}
+
+TASK: Return ONE JSON object with exactly these fields:
+{{
+  "extraction": {{
+    "key_facts": ["3-7 most important, market-moving facts"],
+    "parties": ["companies, executives, entities involved"],
+    "dates": ["important dates"],
+    "dollar_amounts": ["$150M", "$2.50/share"]
+  }},
+  "summary": "100-150 word digest for traders (see SUMMARY RULES)",
+  "keywords": ["1-5 keywords from the list below"],
+  "sentiment": {{
+    "score": -1.0 to 1.0,
+    "justification": "one sentence",
+    "confidence": 0.0 to 1.0
+  }}
+}}
+
+SUMMARY RULES: start with the company name and filing type, explain what
+happened and why it matters, include key numbers, end with the potential
+market impact. Active voice, direct and factual.
+
+KEYWORDS (choose 1-5 that clearly apply):
+"""
+    + CATALYST_KEYWORD_CHOICES
+    + """
+
+SENTIMENT GUIDE: revenue growth, FDA approval and positive guidance are bullish;
+dilution/offerings and management departures are bearish; going concern
+warnings are very bearish.
+
+Return ONLY the JSON object. Be concise and factual."""
+)
+
 
 # ============================================================================
 # LLM Chain Execution
@@ -214,6 +298,7 @@ async def run_llm_chain(
     numeric_metrics: Optional[NumericMetrics] = None,
     xbrl_financials: Optional[XBRLFinancials] = None,
     max_retries: int = 3,
+    mode: Optional[str] = None,
 ) -> LLMChainOutput:
     """Execute the full 4-stage LLM chain.
 
@@ -227,6 +312,8 @@ async def run_llm_chain(
         Pre-extracted XBRL data from Wave 1C
     max_retries : int
         Maximum retry attempts per stage
+    mode : str, optional
+        "fused" or "chain" (default: LLM_CHAIN_MODE env, else "fused")
 
     Returns
     -------
@@ -242,10 +329,48 @@ async def run_llm_chain(
     >>> print(output.sentiment.score)
     """
     start_time = time.time()
-    stages_completed = 0
 
-    log.info("Starting 4-stage LLM chain")
+    mode = (mode or os.getenv("LLM_CHAIN_MODE", "fused")).strip().lower()
+    if mode == "fused" and FilingExtraction is None:
+        log.warning("Fused LLM chain needs llm_schemas (pydantic), using staged chain")
+        mode = "chain"
+
+    log.info(f"Starting 4-stage LLM chain (mode={mode})")
+
+    if mode == "fused":
+        extraction, summary, keywords, sentiment, llm_calls = await _run_fused(
+            filing_text, numeric_metrics, xbrl_financials, max_retries
+        )
+    else:
+        extraction, summary, keywords, sentiment, llm_calls = await _run_staged(
+            filing_text, numeric_metrics, xbrl_financials, max_retries
+        )
+
+    total_time = time.time() - start_time
+    log.info(
+        f"LLM chain completed in {total_time:.1f}s "
+        f"(4/4 stages, mode={mode}, llm_calls={llm_calls})"
+    )
+
+    return LLMChainOutput(
+        extraction=extraction,
+        summary=summary,
+        keywords=keywords,
+        sentiment=sentiment,
+        total_time_sec=total_time,
+        stages_completed=4,
+        mode=mode,
+        llm_calls=llm_calls,
+    )
 
+
+async def _run_staged(
+    filing_text: str,
+    numeric_metrics: Optional[NumericMetrics],
+    xbrl_financials: Optional[XBRLFinancials],
+    max_retries: int,
+) -> tuple[ExtractionOutput, SummaryOutput, KeywordOutput, SentimentOutput, int]:
+    """Staged chain: extraction → summary → (keywords ∥ sentiment)."""
     # Stage 1: Extraction
     try:
         extraction = await _stage1_extraction(
@@ -254,7 +379,6 @@ async def run_llm_chain(
             xbrl_financials,
             max_retries,
         )
-        stages_completed += 1
     except Exception as e:
         log.error(f"Stage 1 (extraction) failed: {e}")
         raise
@@ -262,38 +386,147 @@ async def run_llm_chain(
     # Stage 2: Summary
     try:
         summary = await _stage2_summary(extraction, max_retries)
-        stages_completed += 1
     except Exception as e:
         log.error(f"Stage 2 (summary) failed: {e}")
         raise
 
-    # Stage 3: Keywords
-    try:
-        keywords = await _stage3_keywords(extraction, summary, max_retries)
-        stages_completed += 1
-    except Exception as e:
-        log.error(f"Stage 3 (keywords) failed: {e}")
-        raise
+    # Stages 3 + 4: both only need extraction and summary
+    keywords, sentiment = await _run_tail_stages(extraction, summary, None, None, max_retries)
+    return extraction, summary, keywords, sentiment, 4
 
-    # Stage 4: Sentiment
+
+async def _run_tail_stages(
+    extraction: ExtractionOutput,
+    summary: SummaryOutput,
+    keywords: Optional[KeywordOutput],
+    sentiment: Optional[SentimentOutput],
+    max_retries: int,
+) -> tuple[KeywordOutput, SentimentOutput]:
+    """Run the missing keyword/sentiment stages concurrently."""
+    pending = {}
+    if keywords is None:
+        pending[(3, "keywords")] = _stage3_keywords(extraction, summary, max_retries)
+    if sentiment is None:
+        pending[(4, "sentiment")] = _stage4_sentiment(extraction, summary, keywords, max_retries)
+
+    results = await asyncio.gather(*pending.values(), return_exceptions=True)
+    for (number, stage), result in zip(pending, results):
+        if isinstance(result, BaseException):
+            log.error(f"Stage {number} ({stage}) failed: {result}")
+            raise result
+        if stage == "keywords":
+            keywords = result
+        else:
+            sentiment = result
+    return keywords, sentiment
+
+
+def _parse_json_object(response: str) -> Optional[dict]:
+    """Parse a JSON object from an LLM response (tolerates code fences/prose)."""
+    text = response.strip()
+    fenced = re.search(r"```(?:json)?\s*(.*?)```", text, re.DOTALL)
+    if fenced:
+        text = fenced.group(1).strip()
+    if not text.startswith("{"):
+        start, end = text.find("{"), text.rfind("}")
+        if start == -1 or end <= start:
+            return None
+        text = text[start : end + 1]
     try:
-        sentiment = await _stage4_sentiment(extraction, summary, keywords, max_retries)
-        stages_completed += 1
-    except Exception as e:
-        log.error(f"Stage 4 (sentiment) failed: {e}")
-        raise
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        return None
+    return data if isinstance(data, dict) else None
 
-    total_time = time.time() - start_time
-    log.info(f"LLM chain completed in {total_time:.1f}s ({stages_completed}/4 stages)")
 
-    return LLMChainOutput(
-        extraction=extraction,
-        summary=summary,
-        keywords=keywords,
-        sentiment=sentiment,
-        total_time_sec=total_time,
-        stages_completed=stages_completed,
+def _validate_fused(data: Optional[dict]) -> dict[str, Any]:
+    """Validate each stage section of a fused response on its own.
+
+    Returns
+    -------
+    dict[str, Any]
+        Validated llm_schemas model per stage ("extraction", "summary",
+        "keywords", "sentiment"); invalid or missing stages are omitted
+    """
+    if not data:
+        return {}
+
+    sections = {
+        "extraction": (FilingExtraction, data.get("extraction")),
+        "summary": (FilingSummary, {"summary": data.get("summary")}),
+        "keywords": (FilingKeywords, {"keywords": data.get("keywords")}),
+        "sentiment": (FilingSentiment, data.get("sentiment")),
+    }
+    validated = {}
+    for stage, (schema, section) in sections.items():
+        try:
+            model = schema.model_validate(section)
+        except Exception as e:
+            log.info(f"Fused response stage {stage} failed validation: {str(e)[:200]}")
+            continue
+        if stage == "keywords" and not model.keywords:
+            continue
+        validated[stage] = model
+    return validated
+
+
+async def _run_fused(
+    filing_text: str,
+    numeric_metrics: Optional[NumericMetrics],
+    xbrl_financials: Optional[XBRLFinancials],
+    max_retries: int,
+) -> tuple[ExtractionOutput, SummaryOutput, KeywordOutput, SentimentOutput, int]:
+    """Fused mode: one structured request, re-asking only invalid stages."""
+    prompt = PROMPT_FUSED_ANALYSIS.format(
+        filing_text=filing_text[:5000],
+        numeric_metrics=numeric_metrics.summary() if numeric_metrics else "None extracted",
+        xbrl_financials=xbrl_financials.summary() if xbrl_financials else "None available",
     )
+    response = await _call_llm_with_retry(prompt, max_retries, stage="fused")
+    validated = _validate_fused(_parse_json_object(response))
+    llm_calls = 1
+
+    reasked = [
+        stage
+        for stage in ("extraction", "summary", "keywords", "sentiment")
+        if stage not in validated
+    ]
+    if reasked:
+        log.info(f"Fused LLM chain re-asking stages: {', '.join(reasked)}")
+
+    if "extraction" in validated:
+        extraction = ExtractionOutput(
+            **validated["extraction"].model_dump(), raw_response=response
+        )
+    else:
+        extraction = await _stage1_extraction(
+            filing_text, numeric_metrics, xbrl_financials, max_retries
+        )
+        llm_calls += 1
+
+    if "summary" in validated:
+        summary = SummaryOutput(summary=validated["summary"].summary.strip(), raw_response=response)
+    else:
+        summary = await _stage2_summary(extraction, max_retries)
+        llm_calls += 1
+
+    keywords = sentiment = None
+    if "keywords" in validated:
+        keywords = KeywordOutput(keywords=validated["keywords"].keywords, raw_response=response)
+    if "sentiment" in validated:
+        s = validated["sentiment"]
+        sentiment = SentimentOutput(
+            score=s.score,
+            justification=s.justification,
+            confidence=s.confidence,
+            raw_response=response,
+        )
+    llm_calls += (keywords is None) + (sentiment is None)
+    keywords, sentiment = await _run_tail_stages(
+        extraction, summary, keywords, sentiment, max_retries
+    )
+
+    return extraction, summary, keywords, sentiment, llm_calls
 
 
 async def _stage1_extraction(
@@ -388,14 +621,17 @@ async def _stage3_keywords(
 async def _stage4_sentiment(
     extraction: ExtractionOutput,
     summary: SummaryOutput,
-    keywords: KeywordOutput,
+    keywords: Optional[KeywordOutput],
     max_retries: int,
 ) -> SentimentOutput:
-    """Stage 4: Sentiment analysis with justification."""
+    """Stage 4: Sentiment analysis with justification.
+
+    ``keywords`` is None when this stage runs concurrently with Stage 3.
+    """
     log.debug("Running Stage 4: Sentiment")
 
     key_facts_str = "\n".join(f"- {fact}" for fact in extraction.key_facts)
-    keywords_str = ", ".join(keywords.keywords)
+    keywords_str = ", ".join(keywords.keywords) if keywords else "(not tagged)"
 
     prompt = PROMPT_STAGE4_SENTIMENT.format(
         summary=summary.summary,
@@ -450,7 +686,10 @@ async def _call_llm_with_retry(prompt: str, max_retries: int, stage: str) -> str
     for attempt in range(max_retries):
         try:
             # Call existing LLM router (async)
-            response = await query_hybrid_llm(prompt, article_length=len(prompt), priority="normal")
+            with llm_priority(SEC):
+                response = await query_hybrid_llm(
+                    prompt, article_length=len(prompt), priority="normal"
+                )
 
             if response and len(response.strip()) > 10:
                 log.debug(f"Stage {stage} completed on attempt {attempt + 1}")
@@ -477,7 +716,9 @@ async def _call_llm_with_retry(prompt: str, max_retries: int, stage: str) -> str
 # ============================================================================
 
 
-async def get_filing_summary(filing_text: str, numeric_metrics: Optional[NumericMetrics] = None) -> str:
+async def get_filing_summary(
+    filing_text: str, numeric_metrics: Optional[NumericMetrics] = None
+) -> str:
     """Quick function to get just the summary (Stages 1+2 only).
 
     Parameters
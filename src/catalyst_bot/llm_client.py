@@ -58,6 +58,8 @@ except ImportError:
     TORCH_AVAILABLE = False
     torch = None
 
+from .llm_scheduler import scheduled
+
 _logger = logging.getLogger(__name__)
 
 # Track last cleanup time to avoid over-cleaning
@@ -140,6 +142,7 @@ def cleanup_gpu_memory(force: bool = False) -> None:
         _logger.warning("gpu_cleanup_failed err=%s", str(e))
 
 
+@scheduled
 def query_llm(
     prompt: str,
     *,
@@ -175,7 +178,8 @@ def query_llm(
     Returns
     -------
     Optional[str]
-        The response text or ``None`` on failure.
+        The response text or ``None`` on failure, including when the LLM
+        scheduler drops the request (see ``llm_scheduler``).
     """
     endpoint = _get_env_str("LLM_ENDPOINT_URL", "http://localhost:11434/api/generate")
     model_name = model or _get_env_str("LLM_MODEL_NAME", "mistral")
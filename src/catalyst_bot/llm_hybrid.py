@@ -52,6 +52,8 @@ except ImportError:
     GEMINI_AVAILABLE = False
     genai = None
 
+from .llm_scheduler import scheduled
+
 _logger = logging.getLogger(__name__)
 
 
@@ -597,6 +599,7 @@ class HybridLLMRouter:
                 _logger.warning("anthropic_init_failed err=%s", str(e))
                 self.config.anthropic_enabled = False
 
+    @scheduled
     async def route_request(
         self,
         prompt: str,
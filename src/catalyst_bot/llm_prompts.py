@@ -64,6 +64,54 @@ Return JSON matching this schema:
 
 If no material events found, return: {{"keywords": [], "material": false, "sentiment": 0.0, "confidence": 0.5, "summary": "Routine filing with no material catalysts", "sentiment_analysis": {{"market_sentiment": "neutral", "confidence": 0.5, "urgency": "low", "risk_level": "low", "institutional_interest": false, "retail_hype_score": 0.0, "reasoning": "No significant catalysts identified"}}}}"""  # noqa: E501
 
+# Packed Keyword Extraction Prompt (several short filings per call)
+# Used by sec_llm_packing; each filing is echoed back by doc_id so results
+# can be matched even if the model reorders or drops one.
+PACKED_KEYWORD_EXTRACTION_PROMPT = """\
+Analyze each of the following {count} SEC filings independently.
+Extract trading keywords that indicate material events for each one.
+
+Use only these keywords:
+- FDA/clinical: fda, clinical, phase_1, phase_2, phase_3, approval, pivotal, trial_results
+- Partnerships: partnership, collaboration, agreement, joint_venture, strategic_alliance
+- Listing: uplisting, nasdaq, nyse, exchange, listing
+- Dilution: dilution, offering, warrant, conversion, public_offering, registered_direct, atm
+- Delisting relief: compliance_extension, delisting_relief, compliance_restored,
+  extension_granted
+- Delisting warning: delisting_notice, listing_rule_violation, going_concern
+- Distress: going_concern, bankruptcy, liquidation, wind_down
+- Earnings: earnings, revenue, eps, guidance, beat, miss
+- Institutional: institutional, insider_buying, 13d, 13g
+
+Filings:
+{documents}
+
+Return one JSON object with exactly one result per filing, copying its doc_id:
+{{
+  "results": [
+    {{
+      "doc_id": "<doc_id from the filing header>",
+      "keywords": [<applicable keywords>],
+      "sentiment": <float from -1 (bearish) to +1 (bullish)>,
+      "confidence": <float from 0 to 1>,
+      "summary": "<one sentence summary of the material event>",
+      "material": <true if material event, false if routine filing>,
+      "risk_level": <"low"|"medium"|"high">,
+      "reasoning": "<one sentence explanation>"
+    }}
+  ]
+}}
+
+Do not let one filing's content influence another's result.
+Respond ONLY with valid JSON."""
+
+# Header placed before each filing in PACKED_KEYWORD_EXTRACTION_PROMPT
+PACKED_DOCUMENT_TEMPLATE = """=== doc_id: {doc_id} ===
+Filing Type: {filing_type}
+Title: {title}
+{document_text}
+"""
+
 # Earnings Report Prompt (Item 2.02)
 EARNINGS_PROMPT = """You are analyzing an SEC 8-K Item 2.02 earnings report for a penny stock.
 
@@ -351,9 +399,11 @@ Return JSON matching this schema:
   "summary": "<1 sentence max, focus on event type and dollar amounts>",
   "risk_level": <"low"|"medium"|"high">,
   "reasoning": "<2-3 sentence explanation of why you classified this way>",
-  "event_context": "<For delisting: 'extension_granted' | 'notice_received' | 'compliance_achieved' | 'warning_issued', otherwise null>",
+  "event_context": "<For delisting: 'extension_granted' | 'notice_received' |
+    'compliance_achieved' | 'warning_issued', otherwise null>",
   "trading_thesis": "<1 sentence: why traders would buy/sell on this news>",
-  "expected_price_action": "<'relief_rally' | 'momentum_breakout' | 'selloff' | 'volatility_spike' | 'neutral'>"
+  "expected_price_action": "<'relief_rally' | 'momentum_breakout' | 'selloff' |
+    'volatility_spike' | 'neutral'>"
 }}"""
 
 
@@ -0,0 +1,652 @@
+"""Priority-aware scheduler in front of every LLM provider call.
+
+All LLM entry points (``llm_client.query_llm``, ``AsyncLLMClient.query``,
+``HybridLLMRouter.route_request``, ``LLMService.query`` and the
+``LLMBatchProcessor`` workers) acquire a slot here before talking to a
+provider, so breaking-news classification no longer competes with SEC
+enrichment or batch analytics for the same provider quota on equal terms.
+
+Requests belong to one of four priority classes:
+
+- ``realtime``: alert-path classification and sentiment (default class)
+- ``interactive``: slash commands and on-demand questions
+- ``sec``: SEC filing enrichment and keyword extraction
+- ``batch``: MOA, keyword review and other background analytics
+
+Each class has a concurrency cap, an optional tokens-per-minute budget and
+a queueing deadline.  A global cap bounds the total number of in-flight
+provider calls.  Free slots are shared with start-time fair queueing
+weighted per class, so a busy ``batch`` class still makes progress but
+``realtime`` work is served first in proportion to its weight.  Requests
+that cannot start before their deadline are dropped rather than served
+late, and callers degrade the same way they do for a provider failure.
+
+The class is ambient: wrap a call site in ``llm_priority("sec")`` and every
+LLM call made underneath it (including ones in ``asyncio.to_thread``
+workers) is scheduled in that class.  Slots are re-entrant within a
+context, so a router holding a slot can call ``query_llm`` without taking a
+second one.
+
+Queue depth, in-flight counts, wait time and drops are published to the
+metrics registry as ``llm_sched_*`` series labelled by class.
+
+Environment
+-----------
+FEATURE_LLM_SCHEDULER : bool
+    Route LLM calls through the scheduler (default 1).
+LLM_SCHEDULER_MAX_CONCURRENT : int
+    Global cap on in-flight provider calls (default 8).
+LLM_SCHEDULER_DEFAULT_CLASS : str
+    Class used when no ``llm_priority`` is active (default ``realtime``).
+LLM_SCHEDULER_<CLASS>_CONCURRENCY : int
+    Per-class in-flight cap.
+LLM_SCHEDULER_<CLASS>_WEIGHT : float
+    Fair-share weight.
+LLM_SCHEDULER_<CLASS>_TOKENS_PER_MIN : int
+    Token budget per minute, 0 for unlimited.
+LLM_SCHEDULER_<CLASS>_DEADLINE_SEC : float
+    Longest a request may wait for a slot, 0 for no deadline.
+LLM_SCHEDULER_<CLASS>_MAX_QUEUE : int
+    Requests queued beyond this are rejected immediately.
+
+Usage
+-----
+    from catalyst_bot.llm_scheduler import SEC, llm_priority
+
+    with llm_priority(SEC):
+        response = query_llm(prompt)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import inspect
+import os
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Iterator, Optional
+
+from .logging_utils import get_logger
+from .metrics_registry import inc_counter, observe, set_gauge
+
+log = get_logger("llm_scheduler")
+
+REALTIME = "realtime"
+INTERACTIVE = "interactive"
+SEC = "sec"
+BATCH = "batch"
+
+# Rank order breaks fair-share ties (lower rank wins)
+PRIORITY_CLASSES = (REALTIME, INTERACTIVE, SEC, BATCH)
+
+_DEFAULTS: Dict[str, Dict[str, float]] = {
+    REALTIME: {
+        "weight": 8.0,
+        "concurrency": 4,
+        "tokens_per_min": 0,
+        "deadline_sec": 30.0,
+        "max_queue": 200,
+    },
+    INTERACTIVE: {
+        "weight": 4.0,
+        "concurrency": 2,
+        "tokens_per_min": 0,
+        "deadline_sec": 60.0,
+        "max_queue": 50,
+    },
+    SEC: {
+        "weight": 4.0,
+        "concurrency": 3,
+        "tokens_per_min": 0,
+        "deadline_sec": 300.0,
+        "max_queue": 500,
+    },
+    BATCH: {
+        "weight": 1.0,
+        "concurrency": 2,
+        "tokens_per_min": 60000,
+        "deadline_sec": 0.0,
+        "max_queue": 1000,
+    },
+}
+
+# How often idle waiters re-run dispatch (token refill, deadline purge)
+_POLL_SECONDS = 0.1
+# Smoothing for the per-class service time estimate
+_EWMA_ALPHA = 0.2
+
+_current_class: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "llm_priority_class", default=None
+)
+_slot_held: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "llm_slot_held", default=False
+)
+
+
+class LLMRequestDropped(Exception):
+    """Raised when a request is shed instead of being given a slot."""
+
+    def __init__(self, priority_class: str, reason: str):
+        super().__init__(f"llm request dropped class={priority_class} reason={reason}")
+        self.priority_class = priority_class
+        self.reason = reason
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, "") or default)
+    except ValueError:
+        return default
+
+
+@dataclass
+class ClassPolicy:
+    """Limits applied to one priority class."""
+
+    name: str
+    rank: int
+    weight: float = 1.0
+    concurrency: int = 2
+    tokens_per_min: int = 0
+    deadline_sec: float = 0.0
+    max_queue: int = 1000
+
+    @classmethod
+    def from_env(cls, name: str) -> "ClassPolicy":
+        defaults = _DEFAULTS[name]
+        prefix = f"LLM_SCHEDULER_{name.upper()}_"
+        return cls(
+            name=name,
+            rank=PRIORITY_CLASSES.index(name),
+            weight=max(0.01, _env_float(prefix + "WEIGHT", defaults["weight"])),
+            concurrency=max(
+                1, int(_env_float(prefix + "CONCURRENCY", defaults["concurrency"]))
+            ),
+            tokens_per_min=max(
+                0,
+                int(_env_float(prefix + "TOKENS_PER_MIN", defaults["tokens_per_min"])),
+            ),
+            deadline_sec=max(
+                0.0, _env_float(prefix + "DEADLINE_SEC", defaults["deadline_sec"])
+            ),
+            max_queue=max(
+                1, int(_env_float(prefix + "MAX_QUEUE", defaults["max_queue"]))
+            ),
+        )
+
+
+class _Ticket:
+    """One queued request.  State changes happen under the scheduler lock."""
+
+    __slots__ = (
+        "priority_class",
+        "tokens",
+        "deadline",
+        "enqueued_at",
+        "granted_at",
+        "state",
+        "reason",
+        "event",
+        "future",
+        "loop",
+    )
+
+    def __init__(self, priority_class: str, tokens: int, deadline: Optional[float]):
+        self.priority_class = priority_class
+        self.tokens = tokens
+        self.deadline = deadline
+        self.enqueued_at = 0.0
+        self.granted_at = 0.0
+        self.state = "queued"  # queued | granted | dropped | released
+        self.reason = ""
+        self.event: Optional[threading.Event] = None
+        self.future: Optional[asyncio.Future] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _notify(self) -> None:
+        if self.event is not None:
+            self.event.set()
+        if self.future is not None and self.loop is not None:
+            future = self.future
+
+            def _wake():
+                if not future.done():
+                    future.set_result(None)
+
+            try:
+                self.loop.call_soon_threadsafe(_wake)
+            except RuntimeError:
+                pass  # loop already closed; the waiter is gone
+
+
+class _ClassState:
+    def __init__(self, policy: ClassPolicy, now: float):
+        self.policy = policy
+        self.queue: Deque[_Ticket] = deque()
+        self.active = 0
+        self.vtime = 0.0
+        self.tokens = float(policy.tokens_per_min)
+        self.refilled_at = now
+        self.granted = 0
+        self.dropped: Dict[str, int] = {}
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.service_ewma = 0.0
+
+    def refill(self, now: float) -> None:
+        rate = self.policy.tokens_per_min
+        if rate <= 0:
+            return
+        elapsed = max(0.0, now - self.refilled_at)
+        self.tokens = min(float(rate), self.tokens + elapsed * rate / 60.0)
+        self.refilled_at = now
+
+    def affordable(self, ticket: _Ticket) -> bool:
+        rate = self.policy.tokens_per_min
+        if rate <= 0:
+            return True
+        # Requests larger than the whole budget run once the bucket is full
+        return self.tokens >= min(ticket.tokens, rate)
+
+
+class LLMScheduler:
+    """Shared admission control for LLM provider calls."""
+
+    def __init__(
+        self,
+        max_concurrent: Optional[int] = None,
+        policies: Optional[Dict[str, ClassPolicy]] = None,
+        default_class: Optional[str] = None,
+        enabled: Optional[bool] = None,
+        clock: Callable[[], float] = time.monotonic,
+        poll_seconds: float = _POLL_SECONDS,
+    ):
+        if max_concurrent is None:
+            max_concurrent = int(_env_float("LLM_SCHEDULER_MAX_CONCURRENT", 8))
+        if enabled is None:
+            enabled = os.getenv("FEATURE_LLM_SCHEDULER", "1").strip().lower() in (
+                "1",
+                "true",
+                "yes",
+                "on",
+            )
+        default_class = default_class or os.getenv(
+            "LLM_SCHEDULER_DEFAULT_CLASS", REALTIME
+        )
+        if default_class not in PRIORITY_CLASSES:
+            default_class = REALTIME
+
+        self.max_concurrent = max(1, max_concurrent)
+        self.default_class = default_class
+        self.enabled = enabled
+        self._clock = clock
+        self._poll = poll_seconds
+        self._lock = threading.Lock()
+        self._active = 0
+        self._vclock = 0.0
+        now = clock()
+        policies = policies or {}
+        self._classes: Dict[str, _ClassState] = {
+            name: _ClassState(policies.get(name) or ClassPolicy.from_env(name), now)
+            for name in PRIORITY_CLASSES
+        }
+
+    # ------------------------------------------------------------------
+    # Admission
+    # ------------------------------------------------------------------
+
+    def _resolve_class(self, priority_class: Optional[str]) -> str:
+        name = priority_class or _current_class.get() or self.default_class
+        return name if name in self._classes else self.default_class
+
+    def _submit(
+        self,
+        priority_class: Optional[str],
+        tokens: int,
+        deadline_sec: Optional[float],
+        event: Optional[threading.Event] = None,
+        future: Optional[asyncio.Future] = None,
+    ) -> _Ticket:
+        name = self._resolve_class(priority_class)
+        with self._lock:
+            now = self._clock()
+            state = self._classes[name]
+            if deadline_sec is None:
+                deadline_sec = state.policy.deadline_sec
+            ticket = _Ticket(
+                name, max(0, int(tokens)), now + deadline_sec if deadline_sec else None
+            )
+            ticket.enqueued_at = now
+            ticket.event = event
+            if future is not None:
+                ticket.future = future
+                ticket.loop = future.get_loop()
+
+            reason = None
+            if len(state.queue) >= state.policy.max_queue:
+                reason = "queue_full"
+            elif ticket.deadline is not None and state.queue:
+                # Rounds of service ahead of us at the current class concurrency
+                rounds = len(state.queue) // state.policy.concurrency
+                if rounds * state.service_ewma > ticket.deadline - now:
+                    reason = "deadline_unreachable"
+            if reason:
+                self._drop_locked(ticket, reason)
+                self._publish_locked(name)
+                return ticket
+
+            if not state.queue and state.active == 0:
+                # Returning from idle: don't bank credit from the quiet period
+                state.vtime = max(state.vtime, self._vclock)
+            state.queue.append(ticket)
+            self._dispatch_locked(now)
+            self._publish_locked(name)
+        return ticket
+
+    def _drop_locked(self, ticket: _Ticket, reason: str) -> None:
+        state = self._classes[ticket.priority_class]
+        ticket.state = "dropped"
+        ticket.reason = reason
+        state.dropped[reason] = state.dropped.get(reason, 0) + 1
+        inc_counter("llm_sched_dropped_total", cls=ticket.priority_class, reason=reason)
+        log.warning(
+            "llm_request_dropped class=%s reason=%s queued=%d",
+            ticket.priority_class,
+            reason,
+            len(state.queue),
+        )
+        ticket._notify()
+
+    def _pick_locked(self) -> Optional[_ClassState]:
+        best = None
+        for state in self._classes.values():
+            if not state.queue or state.active >= state.policy.concurrency:
+                continue
+            if not state.affordable(state.queue[0]):
+                continue
+            if best is None or (state.vtime, state.policy.rank) < (
+                best.vtime,
+                best.policy.rank,
+            ):
+                best = state
+        return best
+
+    def _dispatch_locked(self, now: float) -> None:
+        for state in self._classes.values():
+            state.refill(now)
+            if state.queue:
+                live = deque()
+                for ticket in state.queue:
+                    if ticket.deadline is not None and now > ticket.deadline:
+                        self._drop_locked(ticket, "deadline")
+                    else:
+                        live.append(ticket)
+                state.queue = live
+
+        while self._active < self.max_concurrent:
+            state = self._pick_locked()
+            if state is None:
+                break
+            ticket = state.queue.popleft()
+            if state.policy.tokens_per_min > 0:
+                state.tokens -= ticket.tokens
+            # Start-time fair queueing: virtual clock follows the served tag
+            self._vclock = state.vtime
+            state.vtime += max(1, ticket.tokens) / state.policy.weight
+            state.active += 1
+            self._active += 1
+
+            waited = now - ticket.enqueued_at
+            state.granted += 1
+            state.wait_total += waited
+            state.wait_max = max(state.wait_max, waited)
+            ticket.state = "granted"
+            ticket.granted_at = now
+            observe("llm_sched_wait_seconds", waited, cls=state.policy.name)
+            inc_counter("llm_sched_granted_total", cls=state.policy.name)
+            ticket._notify()
+
+    def _publish_locked(self, *names: str) -> None:
+        for name in names or tuple(self._classes):
+            state = self._classes[name]
+            set_gauge("llm_sched_queue_depth", len(state.queue), cls=name)
+            set_gauge("llm_sched_in_flight", state.active, cls=name)
+
+    def _finish(self, ticket: _Ticket) -> None:
+        """Release a granted slot, or withdraw a ticket that is still queued."""
+        with self._lock:
+            state = self._classes[ticket.priority_class]
+            now = self._clock()
+            if ticket.state == "granted":
+                state.active -= 1
+                self._active -= 1
+                served = max(0.0, now - ticket.granted_at)
+                state.service_ewma = (
+                    served
+                    if state.service_ewma == 0.0
+                    else (1 - _EWMA_ALPHA) * state.service_ewma + _EWMA_ALPHA * served
+                )
+            elif ticket.state == "queued":
+                try:
+                    state.queue.remove(ticket)
+                except ValueError:
+                    pass
+            ticket.state = "released"
+            self._dispatch_locked(now)
+            self._publish_locked()
+
+    def _poke(self) -> None:
+        with self._lock:
+            self._dispatch_locked(self._clock())
+            self._publish_locked()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def slot(
+        self,
+        priority_class: Optional[str] = None,
+        tokens: int = 0,
+        deadline_sec: Optional[float] = None,
+    ) -> Iterator[None]:
+        """Hold a provider slot for the duration of the block.
+
+        Raises ``LLMRequestDropped`` when the request is shed.  Re-entrant
+        within a context, and a no-op when the scheduler is disabled.
+        """
+        if not self.enabled or _slot_held.get():
+            yield
+            return
+
+        event = threading.Event()
+        ticket = self._submit(priority_class, tokens, deadline_sec, event=event)
+        try:
+            while not event.wait(self._poll):
+                self._poke()
+        except BaseException:
+            self._finish(ticket)
+            raise
+        if ticket.state == "dropped":
+            raise LLMRequestDropped(ticket.priority_class, ticket.reason)
+
+        held = _slot_held.set(True)
+        try:
+            yield
+        finally:
+            _slot_held.reset(held)
+            self._finish(ticket)
+
+    @asynccontextmanager
+    async def aslot(
+        self,
+        priority_class: Optional[str] = None,
+        tokens: int = 0,
+        deadline_sec: Optional[float] = None,
+    ):
+        """Async counterpart of :meth:`slot`; waits without blocking the loop."""
+        if not self.enabled or _slot_held.get():
+            yield
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        ticket = self._submit(priority_class, tokens, deadline_sec, future=future)
+        try:
+            while not future.done():
+                try:
+                    await asyncio.wait_for(asyncio.shield(future), self._poll)
+                except asyncio.TimeoutError:
+                    self._poke()
+        except BaseException:
+            self._finish(ticket)
+            raise
+        if ticket.state == "dropped":
+            raise LLMRequestDropped(ticket.priority_class, ticket.reason)
+
+        held = _slot_held.set(True)
+        try:
+            yield
+        finally:
+            _slot_held.reset(held)
+            self._finish(ticket)
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-class queue depth, in-flight count, wait times and drops."""
+        with self._lock:
+            now = self._clock()
+            classes = {}
+            for name, state in self._classes.items():
+                state.refill(now)
+                oldest = state.queue[0].enqueued_at if state.queue else None
+                classes[name] = {
+                    "queued": len(state.queue),
+                    "in_flight": state.active,
+                    "granted": state.granted,
+                    "dropped": dict(state.dropped),
+                    "avg_wait_ms": (
+                        round(state.wait_total / state.granted * 1000.0, 1)
+                        if state.granted
+                        else 0.0
+                    ),
+                    "max_wait_ms": round(state.wait_max * 1000.0, 1),
+                    "oldest_wait_ms": (
+                        round((now - oldest) * 1000.0, 1) if oldest is not None else 0.0
+                    ),
+                    "tokens_available": (
+                        int(state.tokens) if state.policy.tokens_per_min else None
+                    ),
+                    "concurrency": state.policy.concurrency,
+                    "weight": state.policy.weight,
+                }
+            return {
+                "enabled": self.enabled,
+                "in_flight": self._active,
+                "max_concurrent": self.max_concurrent,
+                "classes": classes,
+            }
+
+
+_scheduler: Optional[LLMScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_llm_scheduler() -> LLMScheduler:
+    """Return the process-wide scheduler, creating it from the environment."""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = LLMScheduler()
+    return _scheduler
+
+
+def reset_llm_scheduler(scheduler: Optional[LLMScheduler] = None) -> None:
+    """Replace the process-wide scheduler (tests, config reloads)."""
+    global _scheduler
+    with _scheduler_lock:
+        _scheduler = scheduler
+
+
+@contextmanager
+def llm_priority(priority_class: str) -> Iterator[None]:
+    """Schedule every LLM call made inside the block in ``priority_class``."""
+    if priority_class not in PRIORITY_CLASSES:
+        raise ValueError(f"unknown LLM priority class: {priority_class!r}")
+    token = _current_class.set(priority_class)
+    try:
+        yield
+    finally:
+        _current_class.reset(token)
+
+
+def current_priority_class() -> str:
+    """Class the next LLM call from this context would be scheduled in."""
+    return get_llm_scheduler()._resolve_class(None)
+
+
+def estimate_tokens(*texts: Optional[str]) -> int:
+    """Rough prompt token count (~4 characters per token)."""
+    return sum(len(t) for t in texts if t) // 4 + 1
+
+
+def scheduled(fn: Callable) -> Callable:
+    """Decorate an LLM entry point so each call holds a scheduler slot.
+
+    The wrapped function must take ``prompt`` (and optionally ``system``);
+    the estimate from those is charged against the class token budget.
+    Dropped requests return ``None``, the same as a provider failure.
+    """
+    signature = inspect.signature(fn)
+
+    def _tokens(args, kwargs) -> int:
+        try:
+            bound = signature.bind_partial(*args, **kwargs).arguments
+        except TypeError:
+            return 0
+        return estimate_tokens(bound.get("prompt"), bound.get("system"))
+
+    if inspect.iscoroutinefunction(fn):
+
+        @functools.wraps(fn)
+        async def async_wrapper(*args, **kwargs):
+            try:
+                async with get_llm_scheduler().aslot(tokens=_tokens(args, kwargs)):
+                    return await fn(*args, **kwargs)
+            except LLMRequestDropped:
+                return None
+
+        return async_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        try:
+            with get_llm_scheduler().slot(tokens=_tokens(args, kwargs)):
+                return fn(*args, **kwargs)
+        except LLMRequestDropped:
+            return None
+
+    return wrapper
+
+
+__all__ = [
+    "BATCH",
+    "INTERACTIVE",
+    "PRIORITY_CLASSES",
+    "REALTIME",
+    "SEC",
+    "ClassPolicy",
+    "LLMRequestDropped",
+    "LLMScheduler",
+    "current_priority_class",
+    "estimate_tokens",
+    "get_llm_scheduler",
+    "llm_priority",
+    "reset_llm_scheduler",
+    "scheduled",
+]
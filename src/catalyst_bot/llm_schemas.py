@@ -350,6 +350,80 @@ class DilutionAnalysis(BaseModel):
     )
 
 
+class FilingExtraction(BaseModel):
+    """Key facts extracted from an SEC filing (llm_chain extraction stage)."""
+
+    key_facts: List[str] = Field(
+        min_length=1,
+        description="3-7 bullet points of the most important information",
+    )
+    parties: List[str] = Field(
+        default_factory=list,
+        description="Companies, executives and entities involved",
+    )
+    dates: List[str] = Field(
+        default_factory=list,
+        description="Important dates mentioned",
+    )
+    dollar_amounts: List[str] = Field(
+        default_factory=list,
+        description="Financial figures (e.g., '$150M acquisition')",
+    )
+
+
+class FilingSummary(BaseModel):
+    """Trader-facing filing digest (llm_chain summary stage)."""
+
+    summary: str = Field(
+        min_length=20,
+        description="100-150 word summary starting with company and filing type",
+    )
+
+
+class FilingKeywords(BaseModel):
+    """Catalyst tags for a filing (llm_chain keyword stage)."""
+
+    keywords: List[str] = Field(
+        default_factory=list,
+        description="1-5 catalyst keywords (e.g., ['merger', 'offering'])",
+    )
+
+    @field_validator("keywords")
+    @classmethod
+    def validate_keywords(cls, v: List[str]) -> List[str]:
+        """Normalize to lowercase, drop duplicates (keeping order), max 5."""
+        normalized = [kw.lower().strip() for kw in v if kw.strip()]
+        return list(dict.fromkeys(normalized))[:5]
+
+
+class FilingSentiment(BaseModel):
+    """Market impact score for a filing (llm_chain sentiment stage)."""
+
+    score: float = Field(
+        ge=-1.0,
+        le=1.0,
+        description="Sentiment score from -1 (very bearish) to +1 (very bullish)",
+    )
+    justification: str = Field(
+        min_length=1,
+        description="One sentence explaining the score",
+    )
+    confidence: float = Field(
+        ge=0.0,
+        le=1.0,
+        description="Confidence level in the analysis (0=low, 1=high)",
+    )
+
+
+class SECFilingChainAnalysis(BaseModel):
+    """Single-response SEC filing analysis covering all four llm_chain stages."""
+
+    extraction: FilingExtraction
+    summary: str = Field(min_length=20)
+    keywords: List[str] = Field(default_factory=list)
+    sentiment: FilingSentiment
+
+
 # Type aliases for convenience
 AnyAnalysis = (
     SEC8KAnalysis
@@ -11,6 +11,13 @@ Features:
 - Rate limit monitoring
 - Cost alerts and warnings
 - Persistent logging to JSON
+- Per-minute rollups so stats queries never rescan the log
+
+Stats are answered from in-memory rollups bucketed by minute and keyed by
+(provider, model, operation). The rollups are snapshotted next to the log
+(``llm_usage.rollup.json``) together with the log offset they cover; on
+startup only the log tail past that offset is replayed, and a full replay
+happens only when the snapshot is missing or does not match the log.
 
 Environment Variables:
 * ``LLM_COST_ALERT_DAILY`` – Daily cost alert threshold (default: $5.00)
@@ -20,12 +27,20 @@ Environment Variables:
 
 from __future__ import annotations
 
+import bisect
+import hashlib
 import json
 import logging
+import os
+import threading
+import time
 from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .cycle_profiler import record_span
+from .metrics_registry import get_registry
 
 _logger = logging.getLogger(__name__)
 
@@ -138,6 +153,187 @@ PRICING = {
 }
 
 
+# Rollup bucket widths (seconds). Minute buckets older than
+# ROLLUP_MINUTE_RETENTION_S are folded into hour buckets.
+ROLLUP_MINUTE_S = 60
+ROLLUP_HOUR_S = 3600
+ROLLUP_MINUTE_RETENTION_S = 48 * 3600
+
+# Minimum seconds between rollup snapshots
+ROLLUP_SNAPSHOT_INTERVAL_S = 60.0
+
+ROLLUP_SNAPSHOT_VERSION = 1
+
+# Counter slots of a rollup bucket entry
+(
+    _REQUESTS,
+    _SUCCESSES,
+    _FAILURES,
+    _INPUT_TOKENS,
+    _OUTPUT_TOKENS,
+    _TOTAL_TOKENS,
+    _INPUT_COST,
+    _OUTPUT_COST,
+    _TOTAL_COST,
+) = range(9)
+
+RollupKey = Tuple[str, str, str]  # (provider, model, operation)
+
+
+class UsageRollups:
+    """
+    Time-bucketed usage counters keyed by (provider, model, operation).
+
+    Buckets are one minute wide. Minute buckets older than
+    ROLLUP_MINUTE_RETENTION_S are folded into hour buckets by ``compact``,
+    so memory grows with active hours rather than with logged calls.
+    """
+
+    def __init__(self) -> None:
+        self.buckets: Dict[int, Dict[RollupKey, List[float]]] = {}
+        self._starts: List[int] = []  # sorted bucket start times
+        self.compacted_before = 0  # buckets before this are hour buckets
+
+    def __len__(self) -> int:
+        return len(self.buckets)
+
+    def add(
+        self,
+        ts: float,
+        provider: str,
+        model: str,
+        operation: str,
+        success: bool,
+        input_tokens: int,
+        output_tokens: int,
+        total_tokens: int,
+        input_cost: float,
+        output_cost: float,
+        total_cost: float,
+    ) -> None:
+        """Fold one call into the bucket covering ``ts`` (epoch seconds)."""
+        width = ROLLUP_HOUR_S if ts < self.compacted_before else ROLLUP_MINUTE_S
+        start = int(ts) // width * width
+        self._merge(
+            start,
+            (provider, model, operation),
+            [
+                1,
+                1 if success else 0,
+                0 if success else 1,
+                input_tokens,
+                output_tokens,
+                total_tokens,
+                input_cost,
+                output_cost,
+                total_cost,
+            ],
+        )
+
+    def add_record(self, data: Dict[str, Any]) -> None:
+        """Fold a usage log record (LLMUsageEvent as dict) into the rollups."""
+        self.add(
+            datetime.fromisoformat(data["timestamp"]).timestamp(),
+            data["provider"],
+            data["model"],
+            data["operation"],
+            bool(data["success"]),
+            data["input_tokens"],
+            data["output_tokens"],
+            data["total_tokens"],
+            data["input_cost"],
+            data["output_cost"],
+            data["total_cost"],
+        )
+
+    def _merge(self, start: int, key: RollupKey, values: List[float]) -> None:
+        bucket = self.buckets.get(start)
+        if bucket is None:
+            bucket = self.buckets[start] = {}
+            if not self._starts or start > self._starts[-1]:
+                self._starts.append(start)
+            else:
+                bisect.insort(self._starts, start)
+        counters = bucket.get(key)
+        if counters is None:
+            bucket[key] = list(values)
+        else:
+            for i, value in enumerate(values):
+                counters[i] += value
+
+    def compact(self, now: float) -> None:
+        """Fold minute buckets older than the retention window into hours."""
+        cutoff = int(now - ROLLUP_MINUTE_RETENTION_S) // ROLLUP_HOUR_S * ROLLUP_HOUR_S
+        if cutoff <= self.compacted_before:
+            return
+        old = self._starts[: bisect.bisect_left(self._starts, cutoff)]
+        for start in old:
+            hour = start // ROLLUP_HOUR_S * ROLLUP_HOUR_S
+            if hour == start:
+                continue
+            for key, values in self.buckets.pop(start).items():
+                self._merge(hour, key, values)
+        self._starts = sorted(self.buckets)
+        self.compacted_before = cutoff
+
+    def query(
+        self, since_ts: float, until_ts: float
+    ) -> Iterator[Tuple[RollupKey, List[float]]]:
+        """
+        Yield (key, counters) for every bucket overlapping [since, until].
+
+        Resolution is one minute (one hour before ``compacted_before``), so
+        a bound falling inside a bucket includes the whole bucket.
+        """
+        lo = bisect.bisect_left(self._starts, since_ts - ROLLUP_HOUR_S + 1)
+        hi = bisect.bisect_right(self._starts, until_ts)
+        for start in self._starts[lo:hi]:
+            width = ROLLUP_HOUR_S if start < self.compacted_before else ROLLUP_MINUTE_S
+            if start + width <= since_ts:
+                continue
+            yield from self.buckets[start].items()
+
+    def to_rows(self) -> List[List[Any]]:
+        """Compact row form for snapshots: [start, provider, model, op, *counters]."""
+        return [
+            [start, *key, *counters]
+            for start in self._starts
+            for key, counters in self.buckets[start].items()
+        ]
+
+    @classmethod
+    def from_rows(cls, rows: List[List[Any]], compacted_before: int) -> UsageRollups:
+        rollups = cls()
+        rollups.compacted_before = int(compacted_before)
+        for row in rows:
+            rollups._merge(int(row[0]), (row[1], row[2], row[3]), list(row[4:]))
+        return rollups
+
+
+def _record_usage_metrics(event: LLMUsageEvent, latency_ms: Optional[float]) -> None:
+    """Feed one usage event into the in-process metrics registry."""
+    try:
+        registry = get_registry()
+        provider = event.provider
+        registry.counter("llm_requests_total").inc(provider=provider)
+        registry.counter("llm_input_tokens_total").inc(
+            event.input_tokens, provider=provider
+        )
+        registry.counter("llm_output_tokens_total").inc(
+            event.output_tokens, provider=provider
+        )
+        registry.counter("llm_cost_usd_total").inc(event.total_cost, provider=provider)
+        if not event.success:
+            registry.counter("llm_errors_total").inc(provider=provider)
+        if latency_ms is not None:
+            registry.histogram("llm_latency_seconds").observe(
+                latency_ms / 1000.0, provider=provider
+            )
+            record_span(f"llm:{provider}", latency_ms / 1000.0)
+    except Exception as e:
+        _logger.debug("llm_usage_metrics_failed err=%s", e.__class__.__name__)
+
+
 class LLMUsageMonitor:
     """
     Centralized LLM usage tracker.
@@ -174,6 +370,15 @@ class LLMUsageMonitor:
         # Ensure directory exists
         self.log_path.parent.mkdir(parents=True, exist_ok=True)
 
+        # Rollups (see module docstring). _log_offset is the byte offset of
+        # the usage log covered by the rollups.
+        self.rollup_path = self.log_path.with_name(self.log_path.stem + ".rollup.json")
+        self._lock = threading.RLock()
+        self._rollups = UsageRollups()
+        self._log_offset = 0
+        self._last_snapshot = time.time()
+        self._load_rollups()
+
         # Alert thresholds (USD)
         self.daily_alert_threshold = float(os.getenv("LLM_COST_ALERT_DAILY", "5.00"))
         self.monthly_alert_threshold = float(
@@ -265,12 +470,23 @@ class LLMUsageMonitor:
             ticker=ticker,
         )
 
-        # Write to log file
-        try:
-            with open(self.log_path, "a", encoding="utf-8") as f:
-                f.write(json.dumps(asdict(event)) + "\n")
-        except Exception as e:
-            _logger.warning("llm_usage_log_write_failed err=%s", str(e))
+        # Write to log file and fold the event into the rollups
+        line = (json.dumps(asdict(event)) + "\n").encode("utf-8")
+        with self._lock:
+            try:
+                with open(self.log_path, "ab") as f:
+                    start = f.tell()
+                    f.write(line)
+                    end = f.tell()
+                if start == self._log_offset:
+                    self._rollups.add_record(asdict(event))
+                    self._log_offset = end
+                else:
+                    # Another process appended since our last read
+                    self._replay_log()
+            except Exception as e:
+                _logger.warning("llm_usage_log_write_failed err=%s", str(e))
+            self._maybe_save_rollups()
 
         # Log to console
         _logger.info(
@@ -287,12 +503,127 @@ class LLMUsageMonitor:
 
         # Agent 4: Update real-time cost accumulator
         self._update_realtime_cost(total_cost)
+        _record_usage_metrics(event, latency_ms)
 
         # Check for cost alerts
         self._check_alerts()
 
         return event
 
+    # ------------------------------------------------------------------
+    # Rollup persistence
+    # ------------------------------------------------------------------
+
+    def _log_fingerprint(self) -> str:
+        """Hash of the log's first line, to detect a rotated/replaced log."""
+        try:
+            with open(self.log_path, "rb") as f:
+                first = f.readline(4096)
+        except OSError:
+            return ""
+        if not first.endswith(b"\n"):
+            return ""
+        return hashlib.sha1(first).hexdigest()
+
+    def _load_rollups(self) -> None:
+        """Restore rollups from the snapshot, then replay the log tail."""
+        try:
+            with open(self.rollup_path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+            offset = int(snapshot["log_offset"])
+            if (
+                snapshot.get("version") == ROLLUP_SNAPSHOT_VERSION
+                and offset <= self._log_size()
+                and snapshot.get("log_fingerprint") == self._log_fingerprint()
+            ):
+                self._rollups = UsageRollups.from_rows(
+                    snapshot["rows"], snapshot.get("compacted_before", 0)
+                )
+                self._log_offset = offset
+            else:
+                _logger.info("llm_usage_rollup_snapshot_stale rebuilding=1")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            _logger.warning("llm_usage_rollup_load_failed err=%s", str(e))
+            self._rollups = UsageRollups()
+            self._log_offset = 0
+
+        replayed = self._replay_log()
+        if replayed:
+            _logger.info(
+                "llm_usage_rollups_replayed events=%d buckets=%d",
+                replayed,
+                len(self._rollups),
+            )
+
+    def _log_size(self) -> int:
+        try:
+            return os.path.getsize(self.log_path)
+        except OSError:
+            return 0
+
+    def _replay_log(self) -> int:
+        """
+        Fold log lines past ``_log_offset`` into the rollups.
+
+        Only complete lines are consumed. A log shorter than the offset was
+        truncated or rotated, so the rollups are rebuilt from the start.
+        """
+        size = self._log_size()
+        if size == self._log_offset:
+            return 0
+        if size < self._log_offset:
+            _logger.info("llm_usage_log_truncated rebuilding=1")
+            self._rollups = UsageRollups()
+            self._log_offset = 0
+
+        try:
+            with open(self.log_path, "rb") as f:
+                f.seek(self._log_offset)
+                data = f.read()
+        except OSError as e:
+            _logger.warning("llm_usage_log_read_failed err=%s", str(e))
+            return 0
+
+        end = data.rfind(b"\n") + 1
+        count = 0
+        for raw in data[:end].splitlines():
+            if not raw.strip():
+                continue
+            try:
+                self._rollups.add_record(json.loads(raw))
+                count += 1
+            except (json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+                _logger.debug("llm_usage_parse_error line=%s err=%s", raw[:50], str(e))
+        self._log_offset += end
+        return count
+
+    def _maybe_save_rollups(self) -> None:
+        if time.time() - self._last_snapshot >= ROLLUP_SNAPSHOT_INTERVAL_S:
+            self.save_rollups()
+
+    def save_rollups(self) -> None:
+        """Write a rollup snapshot (atomic replace)."""
+        with self._lock:
+            now = time.time()
+            self._rollups.compact(now)
+            snapshot = {
+                "version": ROLLUP_SNAPSHOT_VERSION,
+                "log_offset": self._log_offset,
+                "log_fingerprint": self._log_fingerprint(),
+                "compacted_before": self._rollups.compacted_before,
+                "rows": self._rollups.to_rows(),
+            }
+            tmp_path = self.rollup_path.with_suffix(".tmp")
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(snapshot, f, separators=(",", ":"))
+                os.replace(tmp_path, self.rollup_path)
+            except Exception as e:
+                _logger.warning("llm_usage_rollup_save_failed err=%s", str(e))
+            self._last_snapshot = now
+
     def _update_realtime_cost(self, cost: float) -> None:
         """
         Update real-time cost accumulator.
@@ -407,9 +738,22 @@ class LLMUsageMonitor:
         """
         Get usage statistics for a time period.
 
+        Answered from the rollups in O(buckets), not by rescanning the log.
+
+        Granularity: bounds are rounded outward to the bucket containing
+        them. Buckets are one minute wide, or one hour wide for data older
+        than ROLLUP_MINUTE_RETENTION_S. A ``since`` of 10:30:45 therefore
+        counts every call from 10:30:00, or from 10:00:00 once that hour
+        has been compacted, and the same applies to ``until``. Callers that
+        need exact bounds must align them to bucket starts. The default
+        ranges used by ``get_daily_stats`` and ``get_monthly_stats`` start
+        at midnight and end at the present, so they are exact.
+
         Args:
             since: Start time (UTC). If None, uses beginning of today.
-            until: End time (UTC). If None, uses current time.
+                Rounded down to its bucket start.
+            until: End time (UTC). If None, uses current time. Rounded up
+                to its bucket end.
 
         Returns:
             UsageSummary with aggregated statistics
@@ -433,62 +777,36 @@ class LLMUsageMonitor:
         total_tokens = 0
         total_cost = 0.0
 
-        # Read and process log file
-        if not self.log_path.exists():
-            _logger.debug("llm_usage_log_not_found path=%s", self.log_path)
-        else:
-            try:
-                with open(self.log_path, "r", encoding="utf-8") as f:
-                    for line in f:
-                        try:
-                            event_data = json.loads(line.strip())
-                            event_time = datetime.fromisoformat(event_data["timestamp"])
-
-                            # Filter by time range
-                            if event_time < since or event_time > until:
-                                continue
-
-                            provider = event_data["provider"]
-                            operation = event_data["operation"]
-
-                            # Update provider stats
-                            if provider in stats_by_provider:
-                                pstats = stats_by_provider[provider]
-                                pstats.total_requests += 1
-                                if event_data["success"]:
-                                    pstats.successful_requests += 1
-                                else:
-                                    pstats.failed_requests += 1
-
-                                pstats.total_input_tokens += event_data["input_tokens"]
-                                pstats.total_output_tokens += event_data[
-                                    "output_tokens"
-                                ]
-                                pstats.total_tokens += event_data["total_tokens"]
-
-                                pstats.total_input_cost += event_data["input_cost"]
-                                pstats.total_output_cost += event_data["output_cost"]
-                                pstats.total_cost += event_data["total_cost"]
-
-                            # Update operation costs
-                            cost_by_operation[operation] = (
-                                cost_by_operation.get(operation, 0.0)
-                                + event_data["total_cost"]
-                            )
-
-                            # Update totals
-                            total_requests += 1
-                            total_tokens += event_data["total_tokens"]
-                            total_cost += event_data["total_cost"]
-
-                        except (json.JSONDecodeError, KeyError, ValueError) as e:
-                            _logger.debug(
-                                "llm_usage_parse_error line=%s err=%s",
-                                line[:50],
-                                str(e),
-                            )
-            except Exception as e:
-                _logger.warning("llm_usage_log_read_failed err=%s", str(e))
+        with self._lock:
+            # Pick up events appended by other processes
+            self._replay_log()
+            rows = list(self._rollups.query(since.timestamp(), until.timestamp()))
+
+        for (provider, _model, operation), c in rows:
+            # Update provider stats
+            if provider in stats_by_provider:
+                pstats = stats_by_provider[provider]
+                pstats.total_requests += int(c[_REQUESTS])
+                pstats.successful_requests += int(c[_SUCCESSES])
+                pstats.failed_requests += int(c[_FAILURES])
+
+                pstats.total_input_tokens += int(c[_INPUT_TOKENS])
+                pstats.total_output_tokens += int(c[_OUTPUT_TOKENS])
+                pstats.total_tokens += int(c[_TOTAL_TOKENS])
+
+                pstats.total_input_cost += c[_INPUT_COST]
+                pstats.total_output_cost += c[_OUTPUT_COST]
+                pstats.total_cost += c[_TOTAL_COST]
+
+            # Update operation costs
+            cost_by_operation[operation] = (
+                cost_by_operation.get(operation, 0.0) + c[_TOTAL_COST]
+            )
+
+            # Update totals
+            total_requests += int(c[_REQUESTS])
+            total_tokens += int(c[_TOTAL_TOKENS])
+            total_cost += c[_TOTAL_COST]
 
         # Build cost_by_provider
         cost_by_provider = {
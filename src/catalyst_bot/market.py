@@ -15,8 +15,11 @@ import pandas as pd
 import requests
 
 from .config import get_settings
+from .cycle_profiler import record_span
 from .logging_utils import get_logger
+from .metrics_registry import inc_counter, observe
 from .models import NewsItem, ScoredItem  # re-export for market.NewsItem
+from .quote_stream import remember_prev_close, stream_snapshot
 
 # Simulation-aware time utilities
 from .time_utils import is_simulation as is_sim_mode
@@ -590,6 +593,11 @@ def get_last_price_snapshot(
     filled by later ones. Telemetry is logged for each provider attempt, including
     the provider role (PRIMARY/BACKUP).
 
+    When the streaming quote cache (``quote_stream``) holds a fresh trade for
+    the ticker and today's previous close, it is returned without any REST
+    call.  A fresh streamed trade without a previous close still runs the
+    chain, but the streamed last price wins.
+
     This function never raises; it returns (last, prev) where either component
     may be None.
 
@@ -614,6 +622,25 @@ def get_last_price_snapshot(
             log.debug("mock_market_data_error ticker=%s error=%s", nt, e)
             # Fall through to real providers if mock fails
 
+    # --- Streaming quote cache: serve fresh streamed trades without REST ---
+    streamed = stream_snapshot(nt)
+    if streamed is not None and streamed[1] is not None:
+        inc_counter("quote_stream_lookups_total", result="hit")
+        return streamed
+
+    last, prev = _provider_last_prev(nt, retries)
+    remember_prev_close(nt, prev)
+    if streamed is not None:
+        # Streamed last is fresher; the chain only supplied the previous close
+        inc_counter("quote_stream_lookups_total", result="no_prev")
+        last = streamed[0]
+    return last, prev
+
+
+def _provider_last_prev(
+    nt: str, retries: int
+) -> Tuple[Optional[float], Optional[float]]:
+    """Run the REST provider chain described in ``get_last_price_snapshot``."""
     last: Optional[float] = None
     prev: Optional[float] = None
 
@@ -672,6 +699,10 @@ def get_last_price_snapshot(
         try:
             elapsed = (time.perf_counter() - t0) * 1000.0
             status = "ok" if (l is not None or p is not None) else (error or "no_data")
+            observe("market_provider_seconds", elapsed / 1000.0, provider=provider)
+            record_span(f"provider:{provider}", elapsed / 1000.0)
+            if status != "ok":
+                inc_counter("market_provider_misses_total", provider=provider)
             log.info(
                 "provider_usage provider=%s t_ms=%.1f status=%s",
                 provider,
@@ -912,6 +943,21 @@ def batch_get_prices(
         )
         return results
 
+    # Serve tickers with fresh streamed prices from the quote table and
+    # only send the rest down the REST batch path below
+    streamed: Dict[str, Tuple[Optional[float], Optional[float]]] = {}
+    for ticker in tickers:
+        norm_t = _norm_ticker(ticker)
+        snap = stream_snapshot(norm_t) if norm_t else None
+        if snap is not None and snap[1] is not None and abs(snap[1]) > 1e-9:
+            streamed[norm_t] = (snap[0], ((snap[0] - snap[1]) / snap[1]) * 100.0)
+    if streamed:
+        inc_counter("quote_stream_lookups_total", len(streamed), result="batch_hit")
+        remaining = [t for t in tickers if _norm_ticker(t) not in streamed]
+        results = batch_get_prices(remaining) if remaining else {}
+        results.update(streamed)
+        return results
+
     # OPTIMIZATION: Try Tiingo batch API first if enabled
     try:
         settings = get_settings()
@@ -926,6 +972,12 @@ def batch_get_prices(
 
                     if success_rate >= 0.8:
                         elapsed_ms = (time.perf_counter() - t0) * 1000.0
+                        observe(
+                            "market_batch_seconds",
+                            elapsed_ms / 1000.0,
+                            provider="tiingo",
+                        )
+                        record_span("provider:tiingo_batch", elapsed_ms / 1000.0)
                         log.info(
                             "batch_fetch_tiingo_primary tickers=%d success_rate=%.1f%% t_ms=%.1f",
                             len(tickers),
@@ -1048,6 +1100,8 @@ def batch_get_prices(
                 results[ticker] = (None, None)
 
         elapsed_ms = (time.perf_counter() - t0) * 1000.0
+        observe("market_batch_seconds", elapsed_ms / 1000.0, provider="yf")
+        record_span("provider:yf_batch", elapsed_ms / 1000.0)
         log.info(
             "batch_fetch_complete tickers=%d t_ms=%.1f speedup=~%.0fx",
             len(valid_tickers),
@@ -1507,6 +1561,12 @@ def get_intraday_indicators(
     nt = _norm_ticker(ticker)
     if not nt:
         return {}
+    if target_date is None:
+        from . import intraday_features
+
+        if intraday_features.engine_enabled():
+            snap = intraday_features.get_intraday_engine().get(nt)
+            return snap.indicators() if snap is not None else {}
     try:
         if target_date is None:
             target_date = sim_now().date()
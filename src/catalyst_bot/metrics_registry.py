@@ -0,0 +1,604 @@
+"""In-process metrics registry for heartbeat, health and slash-command stats.
+
+The cycle, feeds, LLM layer, market providers and Discord transport update
+counters, gauges and latency histograms here as work happens.  Readers
+(heartbeat embed, ``/health/detailed``, ``/admin stats``) take a published
+snapshot instead of re-deriving state from files, psutil or the trading
+engine on demand.
+
+- ``Counter``: monotonically increasing totals plus a sliding-window total
+  (e.g. "requests in the last hour").
+- ``Gauge``: last written value with the time it was written, so readers can
+  tell fresh values from stale ones.
+- ``Histogram``: HDR-style log-linear buckets (16 sub-buckets per power of
+  two, ~3% relative error) with cumulative and sliding-window percentiles.
+  Recording is O(1) and memory is bounded by the value range, not by the
+  number of observations.
+
+``MetricsRegistry.publish()`` is called once per cycle and builds an
+immutable snapshot; ``snapshot()`` returns that dict without touching the
+metrics, so readers are O(1) regardless of traffic.
+
+Environment
+-----------
+METRICS_WINDOW_SECONDS : int
+    Length of the sliding window used for "last hour" totals and
+    percentiles (default 3600).
+FEATURE_METRICS_ENDPOINT : bool
+    Expose ``GET /metrics`` in Prometheus text format on the health server
+    (default 0).
+
+Usage
+-----
+    from catalyst_bot.metrics_registry import inc_counter, observe, timed
+
+    inc_counter("feed_items_total", 12, source_type="rss")
+    with timed("market_batch_seconds"):
+        prices = batch_get_prices(tickers)
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+try:
+    from .logging_utils import get_logger
+except Exception:  # pragma: no cover - fallback for standalone use
+    import logging
+
+    def get_logger(_):
+        return logging.getLogger("metrics_registry")
+
+
+log = get_logger("metrics_registry")
+
+# Log-linear bucket resolution: sub-buckets per power of two
+SUB_BUCKETS = 16
+_ZERO_BUCKET = -(10**6)
+
+DEFAULT_WINDOW_SECONDS = 3600
+DEFAULT_WINDOW_SLOTS = 12
+
+# Upper bounds (seconds) for the Prometheus ``le`` series.  HDR buckets are
+# folded into these at scrape time so the exposition stays small.
+EXPORT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    120.0,
+    300.0,
+    600.0,
+)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    if not labels:
+        return ()
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _label_str(key: LabelKey) -> str:
+    return ",".join(f"{k}={v}" for k, v in key)
+
+
+def _bucket_index(value: float) -> int:
+    if value <= 0:
+        return _ZERO_BUCKET
+    mantissa, exponent = math.frexp(value)
+    sub = int((mantissa - 0.5) * 2 * SUB_BUCKETS)
+    return exponent * SUB_BUCKETS + min(sub, SUB_BUCKETS - 1)
+
+
+def _bucket_upper(index: int) -> float:
+    if index == _ZERO_BUCKET:
+        return 0.0
+    exponent, sub = divmod(index, SUB_BUCKETS)
+    return math.ldexp(0.5 + (sub + 1) / (2 * SUB_BUCKETS), exponent)
+
+
+def _percentile(buckets: Dict[int, int], count: int, q: float) -> Optional[float]:
+    if count <= 0:
+        return None
+    rank = max(1, math.ceil(q * count))
+    seen = 0
+    for index in sorted(buckets):
+        seen += buckets[index]
+        if seen >= rank:
+            return _bucket_upper(index)
+    return None
+
+
+class _Window:
+    """Ring of time slots backing sliding-window totals."""
+
+    def __init__(self, window_seconds: float, slots: int, clock: Callable[[], float]):
+        self.slot_seconds = max(window_seconds / slots, 1e-3)
+        self.slots = slots
+        self.clock = clock
+        self._epochs = [-1] * slots
+        self._values: List[Any] = [None] * slots
+
+    def current(self, factory: Callable[[], Any]) -> Any:
+        epoch = int(self.clock() // self.slot_seconds)
+        pos = epoch % self.slots
+        if self._epochs[pos] != epoch:
+            self._epochs[pos] = epoch
+            self._values[pos] = factory()
+        return self._values[pos]
+
+    def live(self) -> Iterator[Any]:
+        epoch = int(self.clock() // self.slot_seconds)
+        for slot_epoch, value in zip(self._epochs, self._values):
+            if value is not None and epoch - self.slots < slot_epoch <= epoch:
+                yield value
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, registry: "MetricsRegistry"):
+        self.name = name
+        self.help = help_text
+        self._registry = registry
+        self._lock = registry._lock
+
+    def _new_window(self) -> _Window:
+        return _Window(
+            self._registry.window_seconds,
+            self._registry.window_slots,
+            self._registry.clock,
+        )
+
+
+class Counter(_Metric):
+    """Monotonic counter with an optional label set per increment."""
+
+    kind = "counter"
+
+    def __init__(self, name, help_text, registry):
+        super().__init__(name, help_text, registry)
+        self._totals: Dict[LabelKey, float] = {}
+        self._windows: Dict[LabelKey, _Window] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        if amount < 0:
+            raise ValueError("counter increments must be non-negative")
+        key = _label_key(labels)
+        with self._lock:
+            self._totals[key] = self._totals.get(key, 0.0) + amount
+            window = self._windows.get(key)
+            if window is None:
+                window = self._windows[key] = self._new_window()
+            slot = window.current(lambda: [0.0])
+            slot[0] += amount
+
+    def total(self, **labels: Any) -> float:
+        with self._lock:
+            if labels:
+                return self._totals.get(_label_key(labels), 0.0)
+            return sum(self._totals.values())
+
+    def window_total(self, **labels: Any) -> float:
+        with self._lock:
+            if labels:
+                window = self._windows.get(_label_key(labels))
+                windows = [window] if window is not None else []
+            else:
+                windows = list(self._windows.values())
+            return sum(slot[0] for w in windows for slot in w.live())
+
+    def _snapshot(self) -> Dict[str, Any]:
+        by_label = {}
+        for key, total in self._totals.items():
+            window = sum(slot[0] for slot in self._windows[key].live())
+            by_label[_label_str(key)] = {"total": total, "window": window}
+        return {
+            "total": sum(v["total"] for v in by_label.values()),
+            "window": sum(v["window"] for v in by_label.values()),
+            "labels": by_label,
+        }
+
+    def _exposition(self) -> List[str]:
+        return [
+            f"{self.name}{_prom_labels(key)} {_prom_value(total)}"
+            for key, total in sorted(self._totals.items())
+        ]
+
+
+class Gauge(_Metric):
+    """Last-written value per label set, stamped with its update time."""
+
+    kind = "gauge"
+
+    def __init__(self, name, help_text, registry):
+        super().__init__(name, help_text, registry)
+        self._values: Dict[LabelKey, Tuple[float, float]] = {}
+
+    def set(self, value: float, **labels: Any) -> None:
+        with self._lock:
+            self._values[_label_key(labels)] = (float(value), time.time())
+
+    def get(
+        self, default: Optional[float] = None, max_age: Optional[float] = None, **labels
+    ) -> Optional[float]:
+        """Return the gauge value, or ``default`` if unset or older than ``max_age``."""
+        with self._lock:
+            entry = self._values.get(_label_key(labels))
+        if entry is None:
+            return default
+        value, updated = entry
+        if max_age is not None and time.time() - updated > max_age:
+            return default
+        return value
+
+    def _snapshot(self) -> Dict[str, Any]:
+        plain = self._values.get(())
+        return {
+            "value": plain[0] if plain else None,
+            "updated_at": plain[1] if plain else None,
+            "labels": {
+                _label_str(key): value
+                for key, (value, _) in self._values.items()
+                if key
+            },
+        }
+
+    def _exposition(self) -> List[str]:
+        return [
+            f"{self.name}{_prom_labels(key)} {_prom_value(value)}"
+            for key, (value, _) in sorted(self._values.items())
+        ]
+
+
+class _HistogramData:
+    __slots__ = ("buckets", "count", "sum", "min", "max")
+
+    def __init__(self):
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, index: int, value: float) -> None:
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other: "_HistogramData") -> None:
+        for index, n in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + n
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def summary(self) -> Dict[str, Any]:
+        if not self.count:
+            return {"count": 0}
+
+        def pct(q):
+            # Bucket upper bounds can overshoot the largest value seen
+            return min(_percentile(self.buckets, self.count, q), self.max)
+
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "min": self.min,
+            "max": self.max,
+            "mean": self.sum / self.count,
+            "p50": pct(0.50),
+            "p95": pct(0.95),
+            "p99": pct(0.99),
+        }
+
+
+class Histogram(_Metric):
+    """HDR-style latency histogram with cumulative and windowed percentiles."""
+
+    kind = "histogram"
+
+    def __init__(self, name, help_text, registry):
+        super().__init__(name, help_text, registry)
+        self._data: Dict[LabelKey, _HistogramData] = {}
+        self._windows: Dict[LabelKey, _Window] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        value = float(value)
+        index = _bucket_index(value)
+        key = _label_key(labels)
+        with self._lock:
+            data = self._data.get(key)
+            if data is None:
+                data = self._data[key] = _HistogramData()
+                self._windows[key] = self._new_window()
+            data.add(index, value)
+            self._windows[key].current(_HistogramData).add(index, value)
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def summary(self, window: bool = False, **labels: Any) -> Dict[str, Any]:
+        with self._lock:
+            return self._merged(window, [_label_key(labels)] if labels else None)
+
+    def _merged(
+        self, window: bool, keys: Optional[List[LabelKey]] = None
+    ) -> Dict[str, Any]:
+        merged = _HistogramData()
+        for key in self._data if keys is None else keys:
+            if key not in self._data:
+                continue
+            if window:
+                for slot in self._windows[key].live():
+                    merged.merge(slot)
+            else:
+                merged.merge(self._data[key])
+        return merged.summary()
+
+    def _snapshot(self) -> Dict[str, Any]:
+        snap = self._merged(False)
+        snap["window"] = self._merged(True)
+        if len(self._data) > 1 or () not in self._data:
+            snap["labels"] = {
+                _label_str(key): self._merged(True, [key]) for key in self._data
+            }
+        return snap
+
+    def _exposition(self) -> List[str]:
+        lines = []
+        for key, data in sorted(self._data.items()):
+            counts = [0] * (len(EXPORT_BUCKETS) + 1)
+            for index, n in data.buckets.items():
+                upper = _bucket_upper(index)
+                pos = next(
+                    (i for i, le in enumerate(EXPORT_BUCKETS) if upper <= le),
+                    len(EXPORT_BUCKETS),
+                )
+                counts[pos] += n
+            running = 0
+            for le, n in zip(EXPORT_BUCKETS + (math.inf,), counts):
+                running += n
+                le_str = "+Inf" if le == math.inf else repr(le)
+                labels = _prom_labels(key, ("le", le_str))
+                lines.append(f"{self.name}_bucket{labels} {running}")
+            lines.append(f"{self.name}_sum{_prom_labels(key)} {_prom_value(data.sum)}")
+            lines.append(f"{self.name}_count{_prom_labels(key)} {data.count}")
+        return lines
+
+
+def _prom_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    body = ",".join(
+        '{}="{}"'.format(k, v.replace("\\", "\\\\").replace('"', '\\"'))
+        for k, v in pairs
+    )
+    return "{" + body + "}"
+
+
+def _prom_value(value: float) -> str:
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+class MetricsRegistry:
+    """Named counters, gauges and histograms with a published snapshot."""
+
+    def __init__(
+        self,
+        window_seconds: Optional[float] = None,
+        window_slots: int = DEFAULT_WINDOW_SLOTS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if window_seconds is None:
+            try:
+                window_seconds = float(
+                    os.getenv("METRICS_WINDOW_SECONDS", DEFAULT_WINDOW_SECONDS)
+                )
+            except ValueError:
+                window_seconds = DEFAULT_WINDOW_SECONDS
+        self.window_seconds = window_seconds
+        self.window_slots = window_slots
+        self.clock = clock
+        self._lock = threading.RLock()
+        self._metrics: Dict[str, _Metric] = {}
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._started = time.time()
+
+    def _get_or_create(self, cls, name: str, help_text: str):
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(name)
+                if metric is None:
+                    metric = self._metrics[name] = cls(name, help_text, self)
+        if not isinstance(metric, cls):
+            raise TypeError(f"metric {name} is a {metric.kind}, not a {cls.kind}")
+        return metric
+
+    def counter(self, name: str, help_text: str = "") -> Counter:
+        return self._get_or_create(Counter, name, help_text)
+
+    def gauge(self, name: str, help_text: str = "") -> Gauge:
+        return self._get_or_create(Gauge, name, help_text)
+
+    def histogram(self, name: str, help_text: str = "") -> Histogram:
+        return self._get_or_create(Histogram, name, help_text)
+
+    def publish(self) -> Dict[str, Any]:
+        """Build and store a snapshot of every metric; return it."""
+        with self._lock:
+            snap: Dict[str, Any] = {
+                "generated_at": datetime.now(timezone.utc).isoformat(),
+                "uptime_seconds": round(time.time() - self._started, 1),
+                "window_seconds": self.window_seconds,
+                "counters": {},
+                "gauges": {},
+                "histograms": {},
+            }
+            for name, metric in self._metrics.items():
+                snap[metric.kind + "s"][name] = metric._snapshot()
+            self._snapshot = snap
+        return snap
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the last published snapshot (publishing once if none exists)."""
+        snap = self._snapshot
+        if snap is None:
+            snap = self.publish()
+        return snap
+
+    def render_prometheus(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        lines: List[str] = []
+        with self._lock:
+            for name in sorted(self._metrics):
+                metric = self._metrics[name]
+                if metric.help:
+                    lines.append(f"# HELP {name} {metric.help}")
+                lines.append(f"# TYPE {name} {metric.kind}")
+                lines.extend(metric._exposition())
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._metrics.clear()
+            self._snapshot = None
+
+
+_registry: Optional[MetricsRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> MetricsRegistry:
+    """Return the process-wide metrics registry."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = MetricsRegistry()
+    return _registry
+
+
+# ---------------------------------------------------------------------------
+# Fire-and-forget helpers for hot paths.  Instrumentation must never break
+# the caller, so failures are logged at debug level and swallowed.
+# ---------------------------------------------------------------------------
+
+
+def inc_counter(name: str, amount: float = 1.0, **labels: Any) -> None:
+    try:
+        get_registry().counter(name).inc(amount, **labels)
+    except Exception as e:
+        log.debug("metrics_inc_failed name=%s err=%s", name, e.__class__.__name__)
+
+
+def set_gauge(name: str, value: float, **labels: Any) -> None:
+    try:
+        get_registry().gauge(name).set(value, **labels)
+    except Exception as e:
+        log.debug("metrics_set_failed name=%s err=%s", name, e.__class__.__name__)
+
+
+def observe(name: str, value: float, **labels: Any) -> None:
+    try:
+        get_registry().histogram(name).observe(value, **labels)
+    except Exception as e:
+        log.debug("metrics_observe_failed name=%s err=%s", name, e.__class__.__name__)
+
+
+@contextmanager
+def timed(name: str, **labels: Any) -> Iterator[None]:
+    """Observe the wall time of the ``with`` block into histogram ``name``."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - start, **labels)
+
+
+_process = None
+
+
+def sample_process_metrics() -> None:
+    """Record process RSS and CPU gauges without blocking.
+
+    ``cpu_percent(interval=None)`` on a reused ``psutil.Process`` reports
+    usage since the previous call, so sampling once per cycle yields a
+    per-cycle CPU figure.
+    """
+    rss_mb = None
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    rss_mb = int(line.split()[1]) / 1024
+                    break
+    except Exception:
+        pass
+    try:
+        global _process
+        if _process is None:
+            import psutil
+
+            _process = psutil.Process(os.getpid())
+        process = _process
+        if rss_mb is None:
+            rss_mb = process.memory_info().rss / (1024 * 1024)
+        set_gauge("process_cpu_percent", process.cpu_percent(interval=None))
+    except Exception:
+        pass
+    if rss_mb is not None:
+        set_gauge("process_rss_mb", rss_mb)
+
+
+def metrics_endpoint_enabled() -> bool:
+    return os.getenv("FEATURE_METRICS_ENDPOINT", "0").strip().lower() in {
+        "1",
+        "true",
+        "yes",
+        "on",
+    }
+
+
+__all__ = [
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "MetricsRegistry",
+    "get_registry",
+    "inc_counter",
+    "set_gauge",
+    "observe",
+    "timed",
+    "sample_process_metrics",
+    "metrics_endpoint_enabled",
+]
@@ -18,6 +18,7 @@ Date: 2025-10-11
 from __future__ import annotations
 
 import json
+import os
 import time
 from collections import defaultdict
 from datetime import datetime, timedelta, timezone
@@ -29,6 +30,7 @@ import requests
 from .config import get_settings
 from .logging_utils import get_logger
 from .market_hours import is_market_holiday, is_weekend
+from .partitioned_jsonl import has_records, iter_lines
 
 log = get_logger("moa")
 
@@ -121,7 +123,7 @@ def load_rejected_items(
     root, _ = _ensure_moa_dirs()
     rejected_path = root / "data" / "rejected_items.jsonl"
 
-    if not rejected_path.exists():
+    if not has_records(rejected_path):
         log.warning(f"rejected_items_not_found path={rejected_path}")
         return []
 
@@ -129,32 +131,33 @@ def load_rejected_items(
     items = []
 
     try:
-        with open(rejected_path, "r", encoding="utf-8") as f:
-            for line_num, line in enumerate(f, 1):
-                line = line.strip()
-                if not line:
-                    continue
+        # Day partitions before the cutoff are skipped without being opened
+        lines = iter_lines(rejected_path, since=cutoff)
+        for line_num, line in enumerate(lines, 1):
+            line = line.strip()
+            if not line:
+                continue
+
+            try:
+                item = json.loads(line)
 
+                # Parse timestamp
+                ts_str = item.get("ts", "")
                 try:
-                    item = json.loads(line)
-
-                    # Parse timestamp
-                    ts_str = item.get("ts", "")
-                    try:
-                        ts = datetime.fromisoformat(ts_str.replace("Z", "+00:00"))
-                    except Exception:
-                        log.debug(f"invalid_timestamp line={line_num} ts={ts_str}")
-                        continue
+                    ts = datetime.fromisoformat(ts_str.replace("Z", "+00:00"))
+                except Exception:
+                    log.debug(f"invalid_timestamp line={line_num} ts={ts_str}")
+                    continue
 
-                    # Skip old items
-                    if ts < cutoff:
-                        continue
+                # Skip old items
+                if ts < cutoff:
+                    continue
 
-                    items.append(item)
+                items.append(item)
 
-                except json.JSONDecodeError as e:
-                    log.debug(f"invalid_json line={line_num} err={e}")
-                    continue
+            except json.JSONDecodeError as e:
+                log.debug(f"invalid_json line={line_num} err={e}")
+                continue
 
         log.info(f"loaded_rejected_items count={len(items)} since_days={since_days}")
         return items
@@ -177,7 +180,7 @@ def load_accepted_items(since_days: int = ANALYSIS_WINDOW_DAYS) -> List[Dict[str
     root, _ = _ensure_moa_dirs()
     accepted_path = root / "data" / "accepted_items.jsonl"
 
-    if not accepted_path.exists():
+    if not has_records(accepted_path):
         log.warning(f"accepted_items_not_found path={accepted_path}")
         return []
 
@@ -185,32 +188,33 @@ def load_accepted_items(since_days: int = ANALYSIS_WINDOW_DAYS) -> List[Dict[str
     items = []
 
     try:
-        with open(accepted_path, "r", encoding="utf-8") as f:
-            for line_num, line in enumerate(f, 1):
-                line = line.strip()
-                if not line:
-                    continue
+        # Day partitions before the cutoff are skipped without being opened
+        lines = iter_lines(accepted_path, since=cutoff)
+        for line_num, line in enumerate(lines, 1):
+            line = line.strip()
+            if not line:
+                continue
+
+            try:
+                item = json.loads(line)
 
+                # Parse timestamp
+                ts_str = item.get("ts", "")
                 try:
-                    item = json.loads(line)
-
-                    # Parse timestamp
-                    ts_str = item.get("ts", "")
-                    try:
-                        ts = datetime.fromisoformat(ts_str.replace("Z", "+00:00"))
-                    except Exception:
-                        log.debug(f"invalid_timestamp line={line_num} ts={ts_str}")
-                        continue
+                    ts = datetime.fromisoformat(ts_str.replace("Z", "+00:00"))
+                except Exception:
+                    log.debug(f"invalid_timestamp line={line_num} ts={ts_str}")
+                    continue
 
-                    # Skip old items
-                    if ts < cutoff:
-                        continue
+                # Skip old items
+                if ts < cutoff:
+                    continue
 
-                    items.append(item)
+                items.append(item)
 
-                except json.JSONDecodeError as e:
-                    log.debug(f"invalid_json line={line_num} err={e}")
-                    continue
+            except json.JSONDecodeError as e:
+                log.debug(f"invalid_json line={line_num} err={e}")
+                continue
 
         log.info(f"loaded_accepted_items count={len(items)} since_days={since_days}")
         return items
@@ -621,6 +625,40 @@ def extract_keywords_from_missed_opps(
     return results
 
 
+def _accepted_window_counts(
+    phrases: Dict[str, int],
+) -> Optional[Tuple[Dict[str, int], int]]:
+    """
+    Accepted-item n-gram counts over the analysis window, from the n-gram store.
+
+    Only ``phrases`` (the positive n-grams) are looked up. The window is whole UTC
+    days, so it can include a few hours more than ``load_accepted_items``'s
+    exact cutoff.
+
+    Returns:
+        (phrase -> count, number of accepted titles), or None when the store
+        is disabled or unavailable
+    """
+    try:
+        from .ngram_store import CLASS_ACCEPTED, get_ngram_store, ngram_store_enabled
+    except ImportError:
+        return None
+    if not ngram_store_enabled():
+        return None
+
+    try:
+        root, _ = _ensure_moa_dirs()
+        store = get_ngram_store(
+            os.getenv("NGRAM_STORE_PATH") or root / "data" / "ngram_stats.db"
+        )
+        store.ensure_backfilled(CLASS_ACCEPTED, root / "data" / "accepted_items.jsonl")
+        since = datetime.now(timezone.utc) - timedelta(days=ANALYSIS_WINDOW_DAYS)
+        return store.window_counts(CLASS_ACCEPTED, since, phrases=phrases)
+    except Exception as e:
+        log.warning(f"ngram_store_unavailable err={e}")
+        return None
+
+
 def discover_keywords_from_missed_opportunities(
     missed_opps: List[Dict[str, Any]],
     min_occurrences: int = 5,
@@ -652,7 +690,7 @@ def discover_keywords_from_missed_opportunities(
         ]
     """
     try:
-        from .keyword_miner import mine_discriminative_keywords
+        from .keyword_miner import count_ngrams, score_discriminative_counts
     except ImportError:
         log.warning("keyword_miner module not available, skipping keyword discovery")
         return []
@@ -662,31 +700,36 @@ def discover_keywords_from_missed_opportunities(
         item.get("title", "") for item in missed_opps if item.get("title")
     ]
 
-    # Load accepted items (items we alerted on)
+    # Negatives are accepted items (items we alerted on)
     # Filter for false positives (items that went down or stayed flat)
     # For now, use ALL accepted items as negatives (conservative approach)
     # TODO: Once outcome tracking is available, filter for actual false positives
-    accepted_items = load_accepted_items(since_days=ANALYSIS_WINDOW_DAYS)
-
-    negative_titles = [
-        item.get("title", "") for item in accepted_items if item.get("title")
-    ]
+    positive_counts, total_positive = count_ngrams(positive_titles, max_n=4)
+    negative = _accepted_window_counts(positive_counts)
+    if negative is None:
+        # Store unavailable: re-tokenize the accepted items log
+        accepted_items = load_accepted_items(since_days=ANALYSIS_WINDOW_DAYS)
+        negative = count_ngrams(
+            (item.get("title", "") for item in accepted_items), max_n=4
+        )
+    negative_counts, total_negative = negative
 
-    if not positive_titles or not negative_titles:
+    if not positive_titles or not total_negative:
         log.info(
             "insufficient_data_for_keyword_discovery "
-            f"positive={len(positive_titles)} negative={len(negative_titles)}"
+            f"positive={len(positive_titles)} negative={total_negative}"
         )
         return []
 
     # Mine discriminative keywords
     try:
-        scored_phrases = mine_discriminative_keywords(
-            positive_titles=positive_titles,
-            negative_titles=negative_titles,
+        scored_phrases = score_discriminative_counts(
+            positive_counts,
+            negative_counts,
+            total_positive=total_positive,
+            total_negative=total_negative,
             min_occurrences=min_occurrences,
             min_lift=min_lift,
-            max_ngram_size=4,
         )
 
         # Convert to recommendation format
@@ -715,7 +758,7 @@ def discover_keywords_from_missed_opportunities(
 
         log.info(
             f"discovered_keywords count={len(discovered)} "
-            f"from_positive={len(positive_titles)} from_negative={len(negative_titles)}"
+            f"from_positive={len(positive_titles)} from_negative={total_negative}"
         )
 
         return discovered
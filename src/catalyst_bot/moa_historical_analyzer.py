@@ -22,10 +22,15 @@ import time
 from collections import defaultdict
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
 
 from .llm_usage_monitor import get_monitor
 from .logging_utils import get_logger
+from .moa_outcome_frame import SENTIMENT_SOURCES, OutcomeFrame, as_frame, upper_median
+from .partitioned_jsonl import has_records, iter_lines
 
 log = get_logger("moa_historical")
 
@@ -164,28 +169,27 @@ def load_rejected_items() -> Dict[str, Dict[str, Any]]:
     root, _ = _ensure_moa_dirs()
     rejected_path = root / "data" / "rejected_items.jsonl"
 
-    if not rejected_path.exists():
+    if not has_records(rejected_path):
         log.warning(f"rejected_items_not_found path={rejected_path}")
         return {}
 
     items = {}
     try:
-        with open(rejected_path, "r", encoding="utf-8") as f:
-            for line_num, line in enumerate(f, 1):
-                line = line.strip()
-                if not line:
-                    continue
+        for line_num, line in enumerate(iter_lines(rejected_path), 1):
+            line = line.strip()
+            if not line:
+                continue
 
-                try:
-                    item = json.loads(line)
-                    ticker = item.get("ticker", "")
-                    ts = item.get("ts", "")
-                    if ticker and ts:
-                        key = (ticker, ts)
-                        items[key] = item
-                except json.JSONDecodeError as e:
-                    log.debug(f"invalid_json line={line_num} err={e}")
-                    continue
+            try:
+                item = json.loads(line)
+                ticker = item.get("ticker", "")
+                ts = item.get("ts", "")
+                if ticker and ts:
+                    key = (ticker, ts)
+                    items[key] = item
+            except json.JSONDecodeError as e:
+                log.debug(f"invalid_json line={line_num} err={e}")
+                continue
 
         log.info(f"loaded_rejected_items count={len(items)}")
         return items
@@ -195,6 +199,23 @@ def load_rejected_items() -> Dict[str, Dict[str, Any]]:
         return {}
 
 
+def load_outcome_frame(
+    rejected_items: Optional[Dict[Tuple[str, str], Dict[str, Any]]] = None,
+) -> OutcomeFrame:
+    """
+    Load all outcomes into a columnar frame in a single pass.
+
+    Parameters:
+        rejected_items: Optional output of load_rejected_items(); matched
+                        outcomes take keywords/title/source from it
+
+    Returns:
+        OutcomeFrame (deduplicated like load_outcomes); use
+        ``frame.select(frame.since(date))`` for incremental windows
+    """
+    return OutcomeFrame.from_records(load_outcomes(), rejected_items)
+
+
 def identify_missed_opportunities(
     outcomes: List[Dict[str, Any]],
     threshold_pct: float = SUCCESS_THRESHOLD_PCT,
@@ -202,6 +223,9 @@ def identify_missed_opportunities(
     """
     Identify outcomes that represent missed opportunities.
 
+    An outcome counts when it is flagged ``is_missed_opportunity`` or its
+    max return reaches ``threshold_pct``.
+
     Args:
         outcomes: List of outcome dictionaries
         threshold_pct: Success threshold percentage
@@ -209,24 +233,13 @@ def identify_missed_opportunities(
     Returns:
         List of missed opportunity dictionaries
     """
-    missed_opps = []
-
-    for outcome in outcomes:
-        # Check if this is a missed opportunity
-        is_missed = outcome.get("is_missed_opportunity", False)
-        max_return = outcome.get("max_return_pct", 0.0)
-
-        # Also manually check in case is_missed_opportunity wasn't set
-        if not is_missed and max_return >= threshold_pct:
-            is_missed = True
-
-        if is_missed:
-            missed_opps.append(outcome)
+    mask = as_frame(outcomes).missed_mask(threshold_pct).to_numpy()
+    missed_opps = [o for o, hit in zip(outcomes, mask) if hit]
 
     log.info(
         f"identified_missed_opportunities "
         f"total={len(outcomes)} missed={len(missed_opps)} "
-        f"rate={len(missed_opps)/len(outcomes)*100:.1f}%"
+        f"rate={len(missed_opps) / max(len(outcomes), 1) * 100:.1f}%"
     )
 
     return missed_opps
@@ -274,6 +287,48 @@ def merge_rejection_data(
     return merged
 
 
+def _category_stats(
+    df: pd.DataFrame, key: pd.Series, **extra: pd.Series
+) -> pd.DataFrame:
+    """Per-category counts and return sums; rows with a null key are dropped."""
+    columns = {
+        "total": pd.Series(1, index=df.index),
+        "missed": df["is_missed"].astype(int),
+        "total_return": df["max_return"],
+        "missed_return": df["max_return"].where(df["is_missed"], 0.0),
+    }
+    columns.update(extra)
+    return pd.DataFrame(columns).groupby(key, sort=False).sum()
+
+
+def _category_summary(stats: Any) -> Dict[str, Any]:
+    """Format one row of :func:`_category_stats` the way reports expect."""
+    total = int(stats.total)
+    missed = int(stats.missed)
+    return {
+        "total": total,
+        "missed_opportunities": missed,
+        "miss_rate": round(missed / total, 3) if total > 0 else 0.0,
+        "avg_return_all": (
+            round(float(stats.total_return) / total, 2) if total > 0 else 0.0
+        ),
+        "avg_return_missed": (
+            round(float(stats.missed_return) / missed, 2) if missed > 0 else 0.0
+        ),
+    }
+
+
+def _first_examples(
+    rows: pd.DataFrame, key: str, build: Callable[[Any], Dict[str, Any]]
+) -> Dict[Any, List[Dict[str, Any]]]:
+    """Collect up to three examples per ``key`` in original row order."""
+    examples: Dict[Any, List[Dict[str, Any]]] = defaultdict(list)
+    head = rows.groupby(key, sort=False, observed=True).head(3)
+    for rec in head.itertuples(index=False):
+        examples[getattr(rec, key)].append(build(rec))
+    return examples
+
+
 def extract_keywords_from_missed_opps(
     missed_opps: List[Dict[str, Any]]
 ) -> Dict[str, Dict[str, Any]]:
@@ -281,59 +336,48 @@ def extract_keywords_from_missed_opps(
     Extract and analyze keywords from missed opportunities.
 
     Args:
-        missed_opps: List of missed opportunity items
+        missed_opps: Missed opportunity items (list or OutcomeFrame)
 
     Returns:
         Dict mapping keyword -> stats (occurrences, success_rate, avg_return)
     """
-    keyword_stats = defaultdict(
-        lambda: {"occurrences": 0, "successes": 0, "total_return": 0.0, "examples": []}
+    rows = as_frame(missed_opps).keyword_rows(
+        "max_return", "ticker", "rejection_reason"
+    )
+    grouped = pd.DataFrame(
+        {
+            "occurrences": 1,
+            "successes": (rows["max_return"] >= SUCCESS_THRESHOLD_PCT).astype(int),
+            "total_return": rows["max_return"],
+        }
+    ).groupby(rows["keyword"], sort=False, observed=True).sum()
+    significant = grouped[grouped["occurrences"] >= MIN_OCCURRENCES]
+
+    examples = _first_examples(
+        rows[rows["keyword"].isin(significant.index)],
+        "keyword",
+        lambda r: {
+            "ticker": r.ticker,
+            "return_pct": round(r.max_return, 2),
+            "rejection_reason": r.rejection_reason or "",
+        },
     )
 
-    for item in missed_opps:
-        keywords = item.get("cls", {}).get("keywords", [])
-        max_return = item.get("max_return_pct", 0.0)
-        ticker = item.get("ticker", "")
-        rejection_reason = item.get("rejection_reason", "")
-
-        # Track stats for each keyword
-        for kw in keywords:
-            kw_lower = str(kw).lower()
-            keyword_stats[kw_lower]["occurrences"] += 1
-
-            if max_return >= SUCCESS_THRESHOLD_PCT:
-                keyword_stats[kw_lower]["successes"] += 1
-
-            keyword_stats[kw_lower]["total_return"] += max_return
-
-            # Store example (limit to 3 per keyword)
-            examples = keyword_stats[kw_lower]["examples"]
-            if len(examples) < 3:
-                examples.append(
-                    {
-                        "ticker": ticker,
-                        "return_pct": round(max_return, 2),
-                        "rejection_reason": rejection_reason,
-                    }
-                )
-
-    # Calculate success rates and average returns
     results = {}
-    for kw, stats in keyword_stats.items():
-        occurrences = stats["occurrences"]
-
-        if occurrences >= MIN_OCCURRENCES:
-            results[kw] = {
-                "occurrences": occurrences,
-                "successes": stats["successes"],
-                "success_rate": round(stats["successes"] / occurrences, 3),
-                "avg_return": round(stats["total_return"] / occurrences, 2),
-                "examples": stats["examples"],
-            }
+    for kw, stats in significant.iterrows():
+        occurrences = int(stats["occurrences"])
+        successes = int(stats["successes"])
+        results[kw] = {
+            "occurrences": occurrences,
+            "successes": successes,
+            "success_rate": round(successes / occurrences, 3),
+            "avg_return": round(float(stats["total_return"]) / occurrences, 2),
+            "examples": examples[kw],
+        }
 
     log.info(
         f"extracted_keywords "
-        f"total_unique={len(keyword_stats)} "
+        f"total_unique={len(grouped)} "
         f"significant={len(results)} "
         f"min_occurrences={MIN_OCCURRENCES}"
     )
@@ -348,51 +392,18 @@ def analyze_rejection_reasons(
     Analyze which rejection reasons led to missed opportunities.
 
     Args:
-        outcomes: List of all outcomes
+        outcomes: All outcomes (list or OutcomeFrame)
 
     Returns:
         Dict mapping rejection_reason -> stats
     """
-    reason_stats = defaultdict(
-        lambda: {
-            "total": 0,
-            "missed_opportunities": 0,
-            "avg_return_all": 0.0,
-            "avg_return_missed": 0.0,
-            "total_return": 0.0,
-            "missed_return": 0.0,
-        }
-    )
-
-    for outcome in outcomes:
-        reason = outcome.get("rejection_reason", "UNKNOWN")
-        max_return = outcome.get("max_return_pct", 0.0)
-        is_missed = outcome.get("is_missed_opportunity", False)
-
-        reason_stats[reason]["total"] += 1
-        reason_stats[reason]["total_return"] += max_return
-
-        if is_missed:
-            reason_stats[reason]["missed_opportunities"] += 1
-            reason_stats[reason]["missed_return"] += max_return
-
-    # Calculate averages
-    results = {}
-    for reason, stats in reason_stats.items():
-        total = stats["total"]
-        missed = stats["missed_opportunities"]
-
-        results[reason] = {
-            "total": total,
-            "missed_opportunities": missed,
-            "miss_rate": round(missed / total, 3) if total > 0 else 0.0,
-            "avg_return_all": (
-                round(stats["total_return"] / total, 2) if total > 0 else 0.0
-            ),
-            "avg_return_missed": (
-                round(stats["missed_return"] / missed, 2) if missed > 0 else 0.0
-            ),
-        }
+    df = as_frame(outcomes).df
+    reasons = df["rejection_reason"].fillna("UNKNOWN")
+    # Only the is_missed_opportunity flag counts here, not the return threshold
+    results = {
+        reason: _category_summary(stats)
+        for reason, stats in _category_stats(df, reasons).iterrows()
+    }
 
     log.info(f"analyzed_rejection_reasons count={len(results)}")
     return results
@@ -403,92 +414,49 @@ def analyze_intraday_timing(outcomes: List[Dict[str, Any]]) -> Dict[str, Any]:
     Analyze intraday timing patterns (15m, 30m, 1h) to identify optimal entry/exit windows.
 
     Args:
-        outcomes: List of all outcomes with intraday data
+        outcomes: All outcomes with intraday data (list or OutcomeFrame)
 
     Returns:
         Dict with timing analysis including when catalysts typically peak
     """
-    timing_stats = {
-        "15m": {"count": 0, "total_return": 0.0, "positive_count": 0, "returns": []},
-        "30m": {"count": 0, "total_return": 0.0, "positive_count": 0, "returns": []},
-        "1h": {"count": 0, "total_return": 0.0, "positive_count": 0, "returns": []},
-    }
-
-    peak_timing_analysis = []  # Which timeframe had the best return for each outcome
+    frame = as_frame(outcomes)
+    returns = frame.intraday()
 
-    for outcome in outcomes:
-        outcomes_data = outcome.get("outcomes", {})
-        ticker = outcome.get("ticker", "")
-
-        # Collect intraday returns
-        timeframe_returns = {}
-        for tf in ["15m", "30m", "1h"]:
-            if tf in outcomes_data and outcomes_data[tf] is not None:
-                return_pct = outcomes_data[tf].get("return_pct", 0.0)
-                timing_stats[tf]["count"] += 1
-                timing_stats[tf]["total_return"] += return_pct
-                timing_stats[tf]["returns"].append(return_pct)
-
-                if return_pct > 0:
-                    timing_stats[tf]["positive_count"] += 1
-
-                timeframe_returns[tf] = return_pct
-
-        # Determine which timeframe peaked for this catalyst
-        if timeframe_returns:
-            peak_tf = max(timeframe_returns.items(), key=lambda x: x[1])
-            peak_timing_analysis.append(
-                {
-                    "ticker": ticker,
-                    "peak_timeframe": peak_tf[0],
-                    "peak_return": peak_tf[1],
-                    "all_returns": timeframe_returns,
-                }
-            )
-
-    # Calculate statistics
     results = {
         "timeframe_stats": {},
-        "peak_timing_distribution": defaultdict(int),
+        "peak_timing_distribution": {},
         "optimal_window_recommendation": "",
     }
 
-    for tf, stats in timing_stats.items():
-        if stats["count"] > 0:
-            avg_return = stats["total_return"] / stats["count"]
-            positive_rate = stats["positive_count"] / stats["count"]
-
-            results["timeframe_stats"][tf] = {
-                "count": stats["count"],
-                "avg_return_pct": round(avg_return, 2),
-                "positive_rate": round(positive_rate, 3),
-                "median_return_pct": (
-                    round(sorted(stats["returns"])[len(stats["returns"]) // 2], 2)
-                    if stats["returns"]
-                    else 0.0
-                ),
-            }
-
-    # Analyze when catalysts typically peak
-    for item in peak_timing_analysis:
-        peak_tf = item["peak_timeframe"]
-        results["peak_timing_distribution"][peak_tf] += 1
+    counts = returns.count()
+    for tf in INTRADAY_TIMEFRAMES:
+        values = returns[tf].dropna()
+        if values.empty:
+            continue
+        results["timeframe_stats"][tf] = {
+            "count": int(counts[tf]),
+            "avg_return_pct": round(float(values.sum()) / len(values), 2),
+            "positive_rate": round(int((values > 0).sum()) / len(values), 3),
+            "median_return_pct": round(upper_median(values), 2),
+        }
 
-    # Determine optimal window
-    if results["peak_timing_distribution"]:
-        most_common_peak = max(
+    # Which timeframe peaked for each catalyst (ties go to the shorter one)
+    has_data = returns.notna().any(axis=1)
+    if has_data.any():
+        peaks = returns[has_data].idxmax(axis=1)
+        distribution = peaks.groupby(peaks, sort=False).size()
+        results["peak_timing_distribution"] = {
+            tf: int(n) for tf, n in distribution.items()
+        }
+        results["optimal_window_recommendation"] = max(
             results["peak_timing_distribution"].items(), key=lambda x: x[1]
         )[0]
-        results["optimal_window_recommendation"] = most_common_peak
-
-    # Convert defaultdict to regular dict for JSON serialization
-    results["peak_timing_distribution"] = dict(results["peak_timing_distribution"])
 
     log.info(
         f"analyzed_intraday_timing "
-        f"15m_count={timing_stats['15m']['count']} "
-        f"30m_count={timing_stats['30m']['count']} "
-        f"1h_count={timing_stats['1h']['count']}"
+        f"15m_count={counts['15m']} "
+        f"30m_count={counts['30m']} "
+        f"1h_count={counts['1h']}"
     )
 
     return results
@@ -502,36 +470,42 @@ def identify_flash_catalysts(
     Identify 'flash catalysts' - stocks that move >5% in first 15-30 minutes.
 
     Args:
-        outcomes: List of outcome dictionaries
+        outcomes: Outcome dictionaries (list or OutcomeFrame)
         threshold_pct: Threshold for flash catalyst classification
 
     Returns:
         List of flash catalyst dictionaries with metadata
     """
-    flash_catalysts = []
-
-    for outcome in outcomes:
-        outcomes_data = outcome.get("outcomes", {})
-
-        # Check 15m and 30m timeframes
-        for tf in ["15m", "30m"]:
-            if tf in outcomes_data and outcomes_data[tf] is not None:
-                return_pct = outcomes_data[tf].get("return_pct", 0.0)
-
-                if abs(return_pct) >= threshold_pct:
-                    flash_catalysts.append(
-                        {
-                            "ticker": outcome.get("ticker", ""),
-                            "rejection_ts": outcome.get("rejection_ts", ""),
-                            "rejection_reason": outcome.get("rejection_reason", ""),
-                            "timeframe": tf,
-                            "return_pct": return_pct,
-                            "direction": "UP" if return_pct > 0 else "DOWN",
-                            "keywords": outcome.get("cls", {}).get("keywords", []),
-                            "title": outcome.get("title", ""),
-                        }
-                    )
-                    break  # Only count once per outcome (prefer shorter timeframe)
+    df = as_frame(outcomes).df
+    # Only count once per outcome, preferring the shorter timeframe
+    hit_15m = df["ret_15m"].abs() >= threshold_pct
+    hit_30m = ~hit_15m & (df["ret_30m"].abs() >= threshold_pct)
+    hits = df[hit_15m | hit_30m]
+    first = hit_15m[hits.index].to_numpy()
+    timeframes = np.where(first, "15m", "30m")
+    returns = np.where(first, hits["ret_15m"], hits["ret_30m"])
+
+    flash_catalysts = [
+        {
+            "ticker": ticker,
+            "rejection_ts": rejection_ts,
+            "rejection_reason": reason or "",
+            "timeframe": tf,
+            "return_pct": return_pct,
+            "direction": "UP" if return_pct > 0 else "DOWN",
+            "keywords": keywords,
+            "title": title,
+        }
+        for ticker, rejection_ts, reason, keywords, title, tf, return_pct in zip(
+            hits["ticker"].tolist(),
+            hits["rejection_ts"].tolist(),
+            hits["rejection_reason"].tolist(),
+            hits["keywords"].tolist(),
+            hits["title"].tolist(),
+            timeframes.tolist(),
+            returns.tolist(),
+        )
+    ]
 
     log.info(
         f"identified_flash_catalysts "
@@ -549,55 +523,31 @@ def analyze_intraday_keyword_correlation(
     Analyze which keywords correlate with fast 15m/30m moves.
 
     Args:
-        outcomes: List of outcomes with keyword and intraday data
+        outcomes: Outcomes with keyword and intraday data (list or OutcomeFrame)
 
     Returns:
         Dict mapping keyword -> intraday performance stats
     """
-    keyword_intraday_stats = defaultdict(
-        lambda: {
-            "15m": {"count": 0, "total_return": 0.0, "max_return": 0.0},
-            "30m": {"count": 0, "total_return": 0.0, "max_return": 0.0},
-        }
-    )
-
-    for outcome in outcomes:
-        keywords = outcome.get("cls", {}).get("keywords", [])
-        outcomes_data = outcome.get("outcomes", {})
-
-        if not keywords:
-            continue
-
-        for tf in ["15m", "30m"]:
-            if tf in outcomes_data and outcomes_data[tf] is not None:
-                return_pct = outcomes_data[tf].get("return_pct", 0.0)
+    rows = as_frame(outcomes).keyword_rows("ret_15m", "ret_30m")
 
-                for kw in keywords:
-                    kw_lower = str(kw).lower()
-                    keyword_intraday_stats[kw_lower][tf]["count"] += 1
-                    keyword_intraday_stats[kw_lower][tf]["total_return"] += return_pct
-                    keyword_intraday_stats[kw_lower][tf]["max_return"] = max(
-                        keyword_intraday_stats[kw_lower][tf]["max_return"], return_pct
-                    )
-
-    # Calculate averages and filter significant keywords
-    results = {}
-    for kw, stats in keyword_intraday_stats.items():
-        kw_results = {}
-        has_data = False
-
-        for tf in ["15m", "30m"]:
-            if stats[tf]["count"] >= MIN_OCCURRENCES:
-                has_data = True
-                avg_return = stats[tf]["total_return"] / stats[tf]["count"]
-                kw_results[tf] = {
-                    "count": stats[tf]["count"],
-                    "avg_return_pct": round(avg_return, 2),
-                    "max_return_pct": round(stats[tf]["max_return"], 2),
-                }
-
-        if has_data:
-            results[kw] = kw_results
+    per_timeframe = {}
+    for tf, col in (("15m", "ret_15m"), ("30m", "ret_30m")):
+        present = rows[rows[col].notna()]
+        grouped = present.groupby("keyword", sort=False, observed=True)[col].agg(
+            ["count", "sum", "max"]
+        )
+        per_timeframe[tf] = grouped[grouped["count"] >= MIN_OCCURRENCES]
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for tf, grouped in per_timeframe.items():
+        for kw, stats in grouped.iterrows():
+            count = int(stats["count"])
+            results.setdefault(kw, {})[tf] = {
+                "count": count,
+                "avg_return_pct": round(float(stats["sum"]) / count, 2),
+                # Max is floored at zero, as the running max always started there
+                "max_return_pct": round(max(float(stats["max"]), 0.0), 2),
+            }
 
     log.info(f"analyzed_intraday_keyword_correlation keywords={len(results)}")
     return results
@@ -610,70 +560,23 @@ def analyze_sector_performance(
     Analyze which sectors have best catalyst response rates.
 
     Args:
-        outcomes: List of all outcomes with sector context
+        outcomes: All outcomes with sector context (list or OutcomeFrame)
 
     Returns:
         Dict mapping sector -> performance stats
     """
-    sector_stats = defaultdict(
-        lambda: {
-            "total": 0,
-            "missed_opportunities": 0,
-            "total_return": 0.0,
-            "missed_return": 0.0,
-            "hot_sector_count": 0,  # Count when sector was outperforming SPY
-            "cold_sector_count": 0,  # Count when sector was underperforming SPY
-        }
+    df = as_frame(outcomes).df
+    # Hot = sector outperforming SPY at rejection time
+    grouped = _category_stats(
+        df, df["sector"], hot=(df["sector_vs_spy"] > 0).astype(int)
     )
 
-    for outcome in outcomes:
-        sector_context = outcome.get("sector_context", {})
-        sector = sector_context.get("sector")
-
-        if not sector:
-            continue
-
-        max_return = outcome.get("max_return_pct", 0.0)
-        is_missed = outcome.get("is_missed_opportunity", False)
-        sector_vs_spy = sector_context.get("sector_vs_spy")
-
-        sector_stats[sector]["total"] += 1
-        sector_stats[sector]["total_return"] += max_return
-
-        if is_missed:
-            sector_stats[sector]["missed_opportunities"] += 1
-            sector_stats[sector]["missed_return"] += max_return
-
-        # Track hot vs cold sector performance
-        if sector_vs_spy is not None:
-            if sector_vs_spy > 0:
-                sector_stats[sector]["hot_sector_count"] += 1
-            else:
-                sector_stats[sector]["cold_sector_count"] += 1
-
-    # Calculate statistics
     results = {}
-    for sector, stats in sector_stats.items():
-        total = stats["total"]
-        missed = stats["missed_opportunities"]
-
-        if total < MIN_OCCURRENCES:
-            continue
-
-        results[sector] = {
-            "total": total,
-            "missed_opportunities": missed,
-            "miss_rate": round(missed / total, 3) if total > 0 else 0.0,
-            "avg_return_all": (
-                round(stats["total_return"] / total, 2) if total > 0 else 0.0
-            ),
-            "avg_return_missed": (
-                round(stats["missed_return"] / missed, 2) if missed > 0 else 0.0
-            ),
-            "hot_sector_rate": (
-                round(stats["hot_sector_count"] / total, 3) if total > 0 else 0.0
-            ),
-        }
+    for sector, stats in grouped[grouped["total"] >= MIN_OCCURRENCES].iterrows():
+        results[sector] = _category_summary(stats)
+        results[sector]["hot_sector_rate"] = round(
+            int(stats["hot"]) / int(stats["total"]), 3
+        )
 
     log.info(f"analyzed_sector_performance sectors={len(results)}")
     return results
@@ -686,56 +589,19 @@ def analyze_rvol_correlation(outcomes: List[Dict[str, Any]]) -> Dict[str, Any]:
     Determines if high relative volume leads to better catalyst outcomes.
 
     Args:
-        outcomes: List of outcomes with RVOL data
+        outcomes: Outcomes with RVOL data (list or OutcomeFrame)
 
     Returns:
         Dict with RVOL category performance stats
     """
-    rvol_stats = defaultdict(
-        lambda: {
-            "total": 0,
-            "missed_opportunities": 0,
-            "total_return": 0.0,
-            "missed_return": 0.0,
-        }
-    )
-
-    for outcome in outcomes:
-        rvol_category = outcome.get("rvol_category")
-
-        if not rvol_category:
-            continue
-
-        max_return = outcome.get("max_return_pct", 0.0)
-        is_missed = outcome.get("is_missed_opportunity", False)
-
-        rvol_stats[rvol_category]["total"] += 1
-        rvol_stats[rvol_category]["total_return"] += max_return
-
-        if is_missed:
-            rvol_stats[rvol_category]["missed_opportunities"] += 1
-            rvol_stats[rvol_category]["missed_return"] += max_return
-
-    # Calculate statistics
-    results = {}
-    for category, stats in rvol_stats.items():
-        total = stats["total"]
-        missed = stats["missed_opportunities"]
-
-        if total < MIN_OCCURRENCES:
-            continue
-
-        results[category] = {
-            "total": total,
-            "missed_opportunities": missed,
-            "miss_rate": round(missed / total, 3) if total > 0 else 0.0,
-            "avg_return_all": (
-                round(stats["total_return"] / total, 2) if total > 0 else 0.0
-            ),
-            "avg_return_missed": (
-                round(stats["missed_return"] / missed, 2) if missed > 0 else 0.0
-            ),
-        }
+    df = as_frame(outcomes).df
+    grouped = _category_stats(df, df["rvol_category"])
+    results = {
+        category: _category_summary(stats)
+        for category, stats in grouped[
+            grouped["total"] >= MIN_OCCURRENCES
+        ].iterrows()
+    }
 
     # Generate recommendation
     recommendation = ""
@@ -774,69 +640,23 @@ def analyze_regime_performance(outcomes: List[Dict[str, Any]]) -> Dict[str, Any]
     Identifies which market regimes have highest success rates for catalysts.
 
     Args:
-        outcomes: List of outcomes with market regime data
+        outcomes: Outcomes with market regime data (list or OutcomeFrame)
 
     Returns:
         Dict mapping regime -> performance stats
     """
-    regime_stats = defaultdict(
-        lambda: {
-            "total": 0,
-            "missed_opportunities": 0,
-            "total_return": 0.0,
-            "missed_return": 0.0,
-            "avg_vix": [],
-        }
-    )
-
-    for outcome in outcomes:
-        regime = outcome.get("market_regime")
-
-        if not regime:
-            continue
-
-        max_return = outcome.get("max_return_pct", 0.0)
-        is_missed = outcome.get("is_missed_opportunity", False)
-        vix = outcome.get("market_vix")
-
-        regime_stats[regime]["total"] += 1
-        regime_stats[regime]["total_return"] += max_return
-
-        if is_missed:
-            regime_stats[regime]["missed_opportunities"] += 1
-            regime_stats[regime]["missed_return"] += max_return
+    df = as_frame(outcomes).df
+    grouped = _category_stats(df, df["market_regime"])
+    avg_vix = df["market_vix"].groupby(df["market_regime"], sort=False).mean()
 
-        # Track VIX levels for this regime
-        if vix is not None:
-            regime_stats[regime]["avg_vix"].append(vix)
-
-    # Calculate statistics
     results = {}
-    for regime, stats in regime_stats.items():
-        total = stats["total"]
-        missed = stats["missed_opportunities"]
-
-        if total < MIN_OCCURRENCES:
-            continue
-
-        # Calculate average VIX for this regime
-        avg_vix = (
-            sum(stats["avg_vix"]) / len(stats["avg_vix"]) if stats["avg_vix"] else None
+    for regime, stats in grouped[grouped["total"] >= MIN_OCCURRENCES].iterrows():
+        vix = avg_vix.get(regime)
+        results[regime] = _category_summary(stats)
+        results[regime]["avg_vix"] = (
+            round(float(vix), 2) if vix is not None and not pd.isna(vix) else None
         )
 
-        results[regime] = {
-            "total": total,
-            "missed_opportunities": missed,
-            "miss_rate": round(missed / total, 3) if total > 0 else 0.0,
-            "avg_return_all": (
-                round(stats["total_return"] / total, 2) if total > 0 else 0.0
-            ),
-            "avg_return_missed": (
-                round(stats["missed_return"] / missed, 2) if missed > 0 else 0.0
-            ),
-            "avg_vix": round(avg_vix, 2) if avg_vix is not None else None,
-        }
-
     # Generate recommendation based on regime performance
     recommendation = ""
     if results:
@@ -871,39 +691,17 @@ def analyze_sector_timing_correlation(outcomes: List[Dict[str, Any]]) -> Dict[st
     Determines if hot sectors (outperforming SPY) lead to better catalyst outcomes.
 
     Args:
-        outcomes: List of outcomes with sector context
+        outcomes: Outcomes with sector context (list or OutcomeFrame)
 
     Returns:
         Dict with hot vs cold sector comparison
     """
-    hot_sector_outcomes = []
-    cold_sector_outcomes = []
-
-    for outcome in outcomes:
-        sector_context = outcome.get("sector_context", {})
-        sector_vs_spy = sector_context.get("sector_vs_spy")
-
-        if sector_vs_spy is None:
-            continue
+    df = as_frame(outcomes).df
+    vs_spy = df["sector_vs_spy"]
 
-        max_return = outcome.get("max_return_pct", 0.0)
-        is_missed = outcome.get("is_missed_opportunity", False)
-
-        outcome_data = {
-            "max_return": max_return,
-            "is_missed": is_missed,
-            "sector": sector_context.get("sector"),
-            "sector_vs_spy": sector_vs_spy,
-        }
-
-        if sector_vs_spy > 0:
-            hot_sector_outcomes.append(outcome_data)
-        else:
-            cold_sector_outcomes.append(outcome_data)
-
-    # Calculate statistics
-    def calc_stats(outcomes_list):
-        if not outcomes_list:
+    def calc_stats(mask: pd.Series) -> Dict[str, Any]:
+        count = int(mask.sum())
+        if not count:
             return {
                 "count": 0,
                 "missed_count": 0,
@@ -911,19 +709,19 @@ def analyze_sector_timing_correlation(outcomes: List[Dict[str, Any]]) -> Dict[st
                 "avg_return": 0.0,
             }
 
-        missed_count = sum(1 for o in outcomes_list if o["is_missed"])
-        total_return = sum(o["max_return"] for o in outcomes_list)
+        missed_count = int(df["is_missed"][mask].sum())
+        total_return = float(df["max_return"][mask].sum())
 
         return {
-            "count": len(outcomes_list),
+            "count": count,
             "missed_count": missed_count,
-            "miss_rate": round(missed_count / len(outcomes_list), 3),
-            "avg_return": round(total_return / len(outcomes_list), 2),
+            "miss_rate": round(missed_count / count, 3),
+            "avg_return": round(total_return / count, 2),
         }
 
     results = {
-        "hot_sectors": calc_stats(hot_sector_outcomes),
-        "cold_sectors": calc_stats(cold_sector_outcomes),
+        "hot_sectors": calc_stats(vs_spy > 0),
+        "cold_sectors": calc_stats(vs_spy <= 0),
         "recommendation": "",
     }
 
@@ -963,64 +761,51 @@ def analyze_sentiment_sources(outcomes: List[Dict[str, Any]]) -> Dict[str, Any]:
     sentiment predictions to actual price outcomes. Helps calibrate sentiment weights.
 
     Args:
-        outcomes: List of outcomes with sentiment breakdown data
+        outcomes: Outcomes with sentiment breakdown data (list or OutcomeFrame)
 
     Returns:
         Dictionary with source performance metrics and calibration recommendations
     """
-    from collections import defaultdict
-
-    source_stats = defaultdict(lambda: {
-        "total": 0,
-        "positive_signals": 0,
-        "successful_outcomes": 0,
-        "accuracy": 0.0,
-        "avg_return_when_positive": 0.0,
-        "correlation": 0.0,
-        "examples": []
-    })
-
-    # Analyze each outcome
-    for outcome in outcomes:
-        sentiment_breakdown = outcome.get("sentiment_breakdown", {})
-        max_return = outcome.get("max_return_pct", 0.0)
-        is_success = max_return >= SUCCESS_THRESHOLD_PCT
-        ticker = outcome.get("ticker", "")
-
-        # Check each source
-        for source in ["vader", "ml", "llm", "earnings"]:
-            if source not in sentiment_breakdown:
-                continue
-
-            sentiment_value = sentiment_breakdown[source]
-            if sentiment_value is None:
-                continue
-
-            source_stats[source]["total"] += 1
+    df = as_frame(outcomes).df
+    is_success = df["max_return"] >= SUCCESS_THRESHOLD_PCT
 
-            # Consider sentiment > 0.5 as positive signal
-            if sentiment_value > 0.5:
-                source_stats[source]["positive_signals"] += 1
-
-                if is_success:
-                    source_stats[source]["successful_outcomes"] += 1
-                    source_stats[source]["avg_return_when_positive"] += max_return
+    source_stats = {}
+    recommendations = []
 
-                    # Store example
-                    if len(source_stats[source]["examples"]) < 3:
-                        source_stats[source]["examples"].append({
-                            "ticker": ticker,
-                            "sentiment": sentiment_value,
-                            "return_pct": max_return
-                        })
+    for source in SENTIMENT_SOURCES:
+        sentiment = df[f"sent_{source}"]
+        total = int(sentiment.notna().sum())
+        if not total:
+            continue
 
-    # Calculate accuracy and recommendations
-    recommendations = []
+        # Consider sentiment > 0.5 as positive signal
+        positive = sentiment > 0.5
+        hits = positive & is_success
+        positive_signals = int(positive.sum())
+        successful_outcomes = int(hits.sum())
 
-    for source, stats in source_stats.items():
-        if stats["positive_signals"] > 0:
-            stats["accuracy"] = stats["successful_outcomes"] / stats["positive_signals"]
-            stats["avg_return_when_positive"] /= stats["positive_signals"]
+        stats = {
+            "total": total,
+            "positive_signals": positive_signals,
+            "successful_outcomes": successful_outcomes,
+            "accuracy": 0.0,
+            "avg_return_when_positive": 0.0,
+            "correlation": 0.0,
+            "examples": [
+                {"ticker": ticker, "sentiment": value, "return_pct": ret}
+                for ticker, value, ret in zip(
+                    df["ticker"][hits][:3],
+                    sentiment[hits][:3],
+                    df["max_return"][hits][:3],
+                )
+            ],
+        }
+        if positive_signals > 0:
+            stats["accuracy"] = successful_outcomes / positive_signals
+            stats["avg_return_when_positive"] = (
+                float(df["max_return"][hits].sum()) / positive_signals
+            )
+        source_stats[source] = stats
 
         # Generate calibration recommendations
         if stats["total"] >= MIN_OCCURRENCES:
@@ -1053,13 +838,12 @@ def analyze_sentiment_sources(outcomes: List[Dict[str, Any]]) -> Dict[str, Any]:
             })
 
     log.info(
-        "analyzed_sentiment_sources",
-        sources_analyzed=len(source_stats),
-        recommendations_generated=len(recommendations)
+        f"analyzed_sentiment_sources sources_analyzed={len(source_stats)} "
+        f"recommendations_generated={len(recommendations)}"
     )
 
     return {
-        "source_statistics": dict(source_stats),
+        "source_statistics": source_stats,
         "recommendations": recommendations,
         "summary": {
             "best_source": max(recommendations, key=lambda x: x["accuracy"])["source"] if recommendations else None,
@@ -1076,49 +860,33 @@ def analyze_source_effectiveness(outcomes: List[Dict[str, Any]]) -> Dict[str, An
     Helps calibrate source credibility tiers.
 
     Args:
-        outcomes: List of outcomes with source information
+        outcomes: Outcomes with source information (list or OutcomeFrame)
 
     Returns:
         Dictionary with source performance metrics and recommendations
     """
-    from collections import defaultdict
-
-    source_stats = defaultdict(lambda: {
-        "total": 0,
-        "missed_opportunities": 0,
-        "miss_rate": 0.0,
-        "avg_return": 0.0,
-        "total_return": 0.0,
-        "examples": []
-    })
-
-    # Analyze each outcome
-    for outcome in outcomes:
-        source = outcome.get("source", "unknown")
-        max_return = outcome.get("max_return_pct", 0.0)
-        is_missed_opp = outcome.get("is_missed_opportunity", False)
-        ticker = outcome.get("ticker", "")
-
-        source_stats[source]["total"] += 1
-        source_stats[source]["total_return"] += max_return
-
-        if is_missed_opp:
-            source_stats[source]["missed_opportunities"] += 1
-
-            # Store example
-            if len(source_stats[source]["examples"]) < 3:
-                source_stats[source]["examples"].append({
-                    "ticker": ticker,
-                    "return_pct": max_return
-                })
+    df = as_frame(outcomes).df
+    grouped = _category_stats(df, df["source"])
+    examples = _first_examples(
+        df.loc[df["is_missed"], ["source", "ticker", "max_return"]],
+        "source",
+        lambda r: {"ticker": r.ticker, "return_pct": r.max_return},
+    )
 
-    # Calculate metrics and generate recommendations
+    source_stats = {}
     recommendations = []
 
-    for source, stats in source_stats.items():
-        if stats["total"] > 0:
-            stats["miss_rate"] = stats["missed_opportunities"] / stats["total"]
-            stats["avg_return"] = stats["total_return"] / stats["total"]
+    for source, row in grouped.iterrows():
+        total = int(row["total"])
+        stats = {
+            "total": total,
+            "missed_opportunities": int(row["missed"]),
+            "miss_rate": int(row["missed"]) / total,
+            "avg_return": float(row["total_return"]) / total,
+            "total_return": float(row["total_return"]),
+            "examples": examples.get(source, []),
+        }
+        source_stats[source] = stats
 
         # Generate credibility recommendations
         if stats["total"] >= MIN_OCCURRENCES:
@@ -1150,13 +918,12 @@ def analyze_source_effectiveness(outcomes: List[Dict[str, Any]]) -> Dict[str, An
     recommendations.sort(key=lambda x: x["miss_rate"], reverse=True)
 
     log.info(
-        "analyzed_source_effectiveness",
-        sources_analyzed=len(source_stats),
-        recommendations_generated=len(recommendations)
+        f"analyzed_source_effectiveness sources_analyzed={len(source_stats)} "
+        f"recommendations_generated={len(recommendations)}"
     )
 
     return {
-        "source_statistics": dict(source_stats),
+        "source_statistics": source_stats,
         "recommendations": recommendations[:10],  # Top 10 sources
         "summary": {
             "best_source": recommendations[0]["source"] if recommendations else None,
@@ -1480,7 +1247,7 @@ def analyze_multi_window_keywords(
     - Long-term stability (90-day: 20% weight)
 
     Parameters:
-        outcomes_by_window: Dict of window_name -> list of outcomes
+        outcomes_by_window: Dict of window_name -> outcomes (list or OutcomeFrame)
 
     Returns:
         Multi-window analysis results with weighted recommendations
@@ -1491,7 +1258,8 @@ def analyze_multi_window_keywords(
     window_results = {}
 
     for window_name, outcomes in outcomes_by_window.items():
-        if not outcomes:
+        frame = as_frame(outcomes)
+        if not len(frame):
             window_results[window_name] = {
                 "total_outcomes": 0,
                 "keywords_analyzed": 0,
@@ -1499,61 +1267,44 @@ def analyze_multi_window_keywords(
             }
             continue
 
-        # Identify missed opportunities in this window
-        missed_opps = [o for o in outcomes if o.get("is_missed_opportunity", False)]
-
-        # Extract keyword statistics
-        keyword_stats = defaultdict(lambda: {
-            "occurrences": 0,
-            "successes": 0,
-            "failures": 0,
-            "total_return": 0.0
-        })
-
-        for outcome in missed_opps:
-            cls_data = outcome.get("cls", {})
-            keywords = cls_data.get("keywords", [])
-            max_return = outcome.get("max_return_pct", 0.0)
-            is_success = max_return >= SUCCESS_THRESHOLD_PCT
-
-            for keyword in keywords:
-                kw_lower = keyword.lower()
-                keyword_stats[kw_lower]["occurrences"] += 1
-                keyword_stats[kw_lower]["total_return"] += max_return
-
-                if is_success:
-                    keyword_stats[kw_lower]["successes"] += 1
-                else:
-                    keyword_stats[kw_lower]["failures"] += 1
+        # Missed opportunities in this window (flagged outcomes only)
+        missed = frame.select(frame.df["is_missed"])
+        rows = missed.keyword_rows("max_return")
+        success = (rows["max_return"] >= SUCCESS_THRESHOLD_PCT).astype(int)
+        keyword_stats = pd.DataFrame(
+            {
+                "occurrences": 1,
+                "successes": success,
+                "total_return": rows["max_return"],
+            }
+        ).groupby(rows["keyword"], sort=False, observed=True).sum()
+        keyword_stats = keyword_stats[keyword_stats["occurrences"] >= MIN_OCCURRENCES]
 
         # Calculate metrics for each keyword
         keyword_analysis = {}
 
-        for keyword, stats in keyword_stats.items():
-            if stats["occurrences"] < MIN_OCCURRENCES:
-                continue
-
-            success_rate = stats["successes"] / stats["occurrences"]
-            avg_return = stats["total_return"] / stats["occurrences"]
+        for keyword, stats in keyword_stats.iterrows():
+            occurrences = int(stats["occurrences"])
+            successes = int(stats["successes"])
 
             keyword_analysis[keyword] = {
-                "occurrences": stats["occurrences"],
-                "success_rate": round(success_rate, 3),
-                "avg_return_pct": round(avg_return, 2),
-                "successes": stats["successes"],
-                "failures": stats["failures"]
+                "occurrences": occurrences,
+                "success_rate": round(successes / occurrences, 3),
+                "avg_return_pct": round(float(stats["total_return"]) / occurrences, 2),
+                "successes": successes,
+                "failures": occurrences - successes
             }
 
         window_results[window_name] = {
-            "total_outcomes": len(outcomes),
-            "missed_opportunities": len(missed_opps),
+            "total_outcomes": len(frame),
+            "missed_opportunities": len(missed),
             "keywords_analyzed": len(keyword_analysis),
             "keyword_stats": keyword_analysis
         }
 
         log.info(
             f"multi_window_analysis_complete window={window_name} "
-            f"outcomes={len(outcomes)} missed={len(missed_opps)} "
+            f"outcomes={len(frame)} missed={len(missed)} "
             f"keywords={len(keyword_analysis)}"
         )
 
@@ -1642,6 +1393,28 @@ def analyze_multi_window_keywords(
     }
 
 
+def _top_missed(missed: OutcomeFrame, limit: int) -> List[Dict[str, Any]]:
+    """Largest missed opportunities by max return."""
+    top = missed.df.loc[missed.df["max_return"].nlargest(limit, keep="first").index]
+    top = top.sort_values("max_return", ascending=False, kind="stable")
+    return [
+        {
+            "ticker": ticker,
+            "rejection_ts": rejection_ts,
+            "rejection_reason": reason,
+            "max_return_pct": max_return,
+            "keywords": keywords,
+        }
+        for ticker, rejection_ts, reason, max_return, keywords in zip(
+            top["ticker"][:limit],
+            top["rejection_ts"][:limit],
+            top["rejection_reason"][:limit],
+            top["max_return"][:limit],
+            top["keywords"][:limit],
+        )
+    ]
+
+
 def run_historical_moa_analysis(lookback_days: int = 14) -> Dict[str, Any]:
     """
     Run MOA analysis on recent outcomes.
@@ -1666,46 +1439,51 @@ def run_historical_moa_analysis(lookback_days: int = 14) -> Dict[str, Any]:
     log.info(f"moa_historical_analysis_start mode=rolling_window days={lookback_days} since={since_date.isoformat()}")
 
     try:
-        # 1. Load outcomes from last 14 days
-        # This balances statistical significance with current market relevance
-        outcomes = load_outcomes(since_date=since_date)
-        if not outcomes:
+        # 1. Load every outcome once, merged with rejection metadata; the
+        # lookback and multi-window views below are masks over this frame
+        rejected_items = load_rejected_items()
+        all_outcomes = load_outcome_frame(rejected_items)
+
+        # Analyze the last 14 days: balances statistical significance with
+        # current market relevance
+        outcomes = all_outcomes.select(all_outcomes.since(since_date))
+        if not len(outcomes):
             log.warning("moa_no_outcomes_found")
             return {
                 "status": "no_data",
                 "message": "No outcomes found in data/moa/outcomes.jsonl",
             }
 
-        rejected_items = load_rejected_items()
-
-        # 1.5. Multi-Window Analysis (Ticket #6): Load outcomes for 7d, 30d, 90d windows
-        log.info("multi_window_loading_outcomes")
+        # 1.5. Multi-Window Analysis (Ticket #6): 7d, 30d, 90d windows
         outcomes_by_window = {}
 
         for window_name, window_config in ANALYSIS_WINDOWS.items():
             window_since = analysis_timestamp - timedelta(days=window_config["days"])
-            window_outcomes = load_outcomes(since_date=window_since)
-
-            # Merge with rejection metadata and identify missed opportunities
-            window_merged = merge_rejection_data(window_outcomes, rejected_items)
-            outcomes_by_window[window_name] = window_merged
+            outcomes_by_window[window_name] = all_outcomes.select(
+                all_outcomes.since(window_since)
+            )
 
             log.info(
                 f"multi_window_loaded window={window_name} "
                 f"days={window_config['days']} "
-                f"outcomes={len(window_outcomes)}"
+                f"outcomes={len(outcomes_by_window[window_name])}"
             )
 
         # Run multi-window analysis
         multi_window_analysis = analyze_multi_window_keywords(outcomes_by_window)
 
-        # 2. Merge outcomes with rejection metadata
-        merged_data = merge_rejection_data(outcomes, rejected_items)
+        # 2. Outcomes in the lookback window (already merged)
+        merged_data = outcomes
 
         # 3. Identify missed opportunities
-        missed_opps = identify_missed_opportunities(merged_data)
+        missed_opps = outcomes.select(outcomes.missed_mask(SUCCESS_THRESHOLD_PCT))
+        log.info(
+            f"identified_missed_opportunities "
+            f"total={len(outcomes)} missed={len(missed_opps)} "
+            f"rate={len(missed_opps) / len(outcomes) * 100:.1f}%"
+        )
 
-        if not missed_opps:
+        if not len(missed_opps):
             log.warning("no_missed_opportunities")
             return {
                 "status": "no_opportunities",
@@ -1758,14 +1536,8 @@ def run_historical_moa_analysis(lookback_days: int = 14) -> Dict[str, Any]:
                 "total_outcomes": len(outcomes),
                 "missed_opportunities": len(missed_opps),
                 "miss_rate_pct": round(len(missed_opps) / len(outcomes) * 100, 2),
-                "avg_missed_return_pct": (
-                    round(
-                        sum(o.get("max_return_pct", 0.0) for o in missed_opps)
-                        / len(missed_opps),
-                        2,
-                    )
-                    if missed_opps
-                    else 0.0
+                "avg_missed_return_pct": round(
+                    float(missed_opps.df["max_return"].mean()), 2
                 ),
             },
             "rejection_analysis": rejection_analysis,
@@ -1792,22 +1564,7 @@ def run_historical_moa_analysis(lookback_days: int = 14) -> Dict[str, Any]:
                 },
                 "keyword_correlations": intraday_keyword_stats,
             },
-            "top_missed_opportunities": sorted(
-                [
-                    {
-                        "ticker": o.get("ticker"),
-                        "rejection_ts": o.get("rejection_ts"),
-                        "rejection_reason": o.get("rejection_reason"),
-                        "max_return_pct": o.get("max_return_pct"),
-                        "keywords": o.get("cls", {}).get("keywords", []),
-                    }
-                    for o in missed_opps
-                ],
-                key=lambda x: x["max_return_pct"],
-                reverse=True,
-            )[
-                :20
-            ],  # Top 20 missed opportunities
+            "top_missed_opportunities": _top_missed(missed_opps, 20),
             "sentiment_source_analysis": sentiment_source_analysis,
             "source_effectiveness": source_effectiveness,
             "multi_window_analysis": multi_window_analysis,
@@ -0,0 +1,212 @@
+"""
+Columnar view over MOA outcomes.
+
+The historical analyzer used to re-read outcomes.jsonl once per analysis
+window and then walk the resulting list of dicts in Python for every
+analysis.  :class:`OutcomeFrame` flattens the fields those analyses read
+into typed pandas columns in a single pass, merges rejection metadata
+(keywords, title, source) at the same time and explodes keyword lists into
+a ``(row, keyword)`` index.  Analyses become group-bys over the frame and
+time windows are boolean masks, so the 7d/30d/90d views share one parse.
+
+Column layout (one row per outcome):
+
+    ticker, rejection_ts (raw string), ts (UTC datetime, NaT if unparsable),
+    rejection_reason, max_return, is_missed, title, source, keywords (list),
+    sector, sector_vs_spy, rvol_category, market_regime, market_vix,
+    ret_15m / ret_30m / ret_1h (NaN when the timeframe is missing),
+    sent_vader / sent_ml / sent_llm / sent_earnings (NaN when missing)
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+INTRADAY_COLUMNS = {"15m": "ret_15m", "30m": "ret_30m", "1h": "ret_1h"}
+SENTIMENT_SOURCES = ["vader", "ml", "llm", "earnings"]
+
+_NUMERIC_COLUMNS = (
+    "max_return",
+    "sector_vs_spy",
+    "market_vix",
+    *INTRADAY_COLUMNS.values(),
+    *(f"sent_{s}" for s in SENTIMENT_SOURCES),
+)
+_COLUMNS = (
+    "ticker",
+    "rejection_ts",
+    "rejection_reason",
+    "max_return",
+    "is_missed",
+    "title",
+    "source",
+    "keywords",
+    "sector",
+    "sector_vs_spy",
+    "rvol_category",
+    "market_regime",
+    "market_vix",
+    *INTRADAY_COLUMNS.values(),
+    *(f"sent_{s}" for s in SENTIMENT_SOURCES),
+)
+_NAN = float("nan")
+
+
+class OutcomeFrame:
+    """Typed, columnar outcomes with an exploded keyword index."""
+
+    def __init__(self, df: pd.DataFrame, keywords: Optional[pd.DataFrame] = None):
+        self.df = df
+        self._keywords = keywords
+
+    @classmethod
+    def from_records(
+        cls,
+        records: Iterable[Dict[str, Any]],
+        rejected_items: Optional[Dict[Tuple[str, str], Dict[str, Any]]] = None,
+    ) -> "OutcomeFrame":
+        """Build a frame from outcome dicts, merging rejection metadata.
+
+        ``rejected_items`` is the mapping returned by ``load_rejected_items``;
+        matched outcomes take their keywords, title and source from it, the
+        same way ``merge_rejection_data`` does.
+        """
+        rejected_items = rejected_items or {}
+        rows = []
+        append = rows.append
+        for o in records:
+            ticker = o.get("ticker", "")
+            rejection_ts = o.get("rejection_ts", "")
+            item = (
+                rejected_items.get((ticker, rejection_ts)) if rejected_items else None
+            )
+            if item:
+                cls_data = item.get("cls") or {}
+                title = item.get("title", "")
+                source = item.get("source", "")
+            else:
+                cls_data = o.get("cls") or {}
+                title = o.get("title", "")
+                source = o.get("source", "unknown")
+            keywords = cls_data.get("keywords") if isinstance(cls_data, dict) else None
+            sector_context = o.get("sector_context") or {}
+            intraday = o.get("outcomes") or {}
+            r15, r30, r1h = intraday.get("15m"), intraday.get("30m"), intraday.get("1h")
+            sentiment = o.get("sentiment_breakdown") or {}
+            append(
+                (
+                    ticker,
+                    rejection_ts,
+                    o.get("rejection_reason"),
+                    o.get("max_return_pct"),
+                    bool(o.get("is_missed_opportunity", False)),
+                    title,
+                    "unknown" if source is None else source,
+                    list(keywords) if isinstance(keywords, (list, tuple)) else [],
+                    sector_context.get("sector") or None,
+                    sector_context.get("sector_vs_spy"),
+                    o.get("rvol_category") or None,
+                    o.get("market_regime") or None,
+                    o.get("market_vix"),
+                    _NAN if r15 is None else r15.get("return_pct", 0.0),
+                    _NAN if r30 is None else r30.get("return_pct", 0.0),
+                    _NAN if r1h is None else r1h.get("return_pct", 0.0),
+                    sentiment.get("vader"),
+                    sentiment.get("ml"),
+                    sentiment.get("llm"),
+                    sentiment.get("earnings"),
+                )
+            )
+
+        df = pd.DataFrame(rows, columns=_COLUMNS)
+        for col in _NUMERIC_COLUMNS:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("float64")
+        df["max_return"] = df["max_return"].fillna(0.0)
+        df["is_missed"] = df["is_missed"].astype(bool)
+        df["ts"] = pd.to_datetime(
+            df["rejection_ts"], utc=True, errors="coerce", format="ISO8601"
+        )
+        return cls(df)
+
+    def __len__(self) -> int:
+        return len(self.df)
+
+    @property
+    def keywords(self) -> pd.DataFrame:
+        """Exploded keyword index: one ``(row, keyword)`` pair per mention.
+
+        ``row`` is the outcome's index label in :attr:`df`; keywords are
+        lower-cased categoricals (group with ``observed=True``), and repeated
+        mentions within an outcome are kept.
+        """
+        if self._keywords is None:
+            exploded = self.df["keywords"].explode().dropna()
+            self._keywords = pd.DataFrame(
+                {
+                    "row": exploded.index.to_numpy(),
+                    "keyword": pd.Categorical(exploded.astype(str).str.lower()),
+                }
+            )
+        return self._keywords
+
+    def _label_lookup(self, fill: Any) -> np.ndarray:
+        """Array indexed by row label; row labels are the root frame's positions."""
+        size = int(self.df.index.max()) + 1 if len(self.df) else 0
+        return np.full(size, fill, dtype=type(fill))
+
+    def keyword_rows(self, *columns: str) -> pd.DataFrame:
+        """Keyword index joined with the requested outcome columns."""
+        kw = self.keywords
+        positions = self._label_lookup(-1)
+        positions[self.df.index.to_numpy()] = np.arange(len(self.df))
+        take = positions[kw["row"].to_numpy()]
+        joined = {"keyword": kw["keyword"].array}
+        for col in columns:
+            joined[col] = self.df[col].to_numpy()[take]
+        return pd.DataFrame(joined)
+
+    def since(self, since_date: datetime) -> pd.Series:
+        """Mask of outcomes rejected after ``since_date``.
+
+        Outcomes whose timestamp cannot be parsed are kept, matching
+        ``load_outcomes(since_date=...)``.
+        """
+        ts = self.df["ts"]
+        return ts.isna() | (ts > pd.Timestamp(since_date))
+
+    def select(self, mask: pd.Series) -> "OutcomeFrame":
+        """Return the sub-frame of rows where ``mask`` is true."""
+        mask = mask.reindex(self.df.index, fill_value=False).to_numpy(dtype=bool)
+        # Filter the parent's keyword index instead of re-exploding per window
+        kw = self.keywords
+        selected = self._label_lookup(False)
+        selected[self.df.index.to_numpy()[mask]] = True
+        keep = selected[kw["row"].to_numpy()]
+        return OutcomeFrame(self.df[mask], kw[keep].reset_index(drop=True))
+
+    def missed_mask(self, threshold_pct: float) -> pd.Series:
+        """Flagged missed opportunities plus any move above ``threshold_pct``."""
+        return self.df["is_missed"] | (self.df["max_return"] >= threshold_pct)
+
+    def intraday(self) -> pd.DataFrame:
+        """Intraday returns with timeframe labels (15m/30m/1h) as columns."""
+        return self.df[list(INTRADAY_COLUMNS.values())].set_axis(
+            list(INTRADAY_COLUMNS), axis=1
+        )
+
+
+def as_frame(outcomes: Any) -> OutcomeFrame:
+    """Accept either an :class:`OutcomeFrame` or a list of outcome dicts."""
+    if isinstance(outcomes, OutcomeFrame):
+        return outcomes
+    return OutcomeFrame.from_records(outcomes or [])
+
+
+def upper_median(values: pd.Series) -> float:
+    """Upper median (``sorted(v)[n // 2]``), as the analyzer has always used."""
+    arr = np.sort(values.to_numpy())
+    return float(arr[len(arr) // 2])
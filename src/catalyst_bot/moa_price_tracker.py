@@ -20,14 +20,16 @@ Date: 2025-10-11
 from __future__ import annotations
 
 import json
+import os
 import time
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
 from .logging_utils import get_logger
 from .market import get_last_price_change
 from .market_hours import get_market_status
+from .partitioned_jsonl import has_records, iter_lines
 
 log = get_logger("moa_price_tracker")
 
@@ -50,9 +52,6 @@ TRACKING_TIMEFRAMES = {
 # Threshold for "missed opportunity" detection
 MISSED_OPPORTUNITY_THRESHOLD = 10.0  # % return
 
-# Rate limiting: minimum seconds between price checks per ticker
-RATE_LIMIT_SECONDS = 60
-
 
 def _parse_timestamp(ts_str: str) -> Optional[datetime]:
     """Parse ISO timestamp string to datetime object."""
@@ -166,25 +165,24 @@ def fetch_intraday_price(ticker: str, target_time: datetime) -> Optional[float]:
 
 
 def _read_rejected_items() -> List[Dict[str, Any]]:
-    """Read all rejected items from data/rejected_items.jsonl."""
+    """Read all rejected items (legacy file plus day partitions)."""
     rejected_path = Path("data/rejected_items.jsonl")
 
-    if not rejected_path.exists():
+    if not has_records(rejected_path):
         return []
 
     items = []
     try:
-        with open(rejected_path, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    item = json.loads(line)
-                    items.append(item)
-                except Exception as e:
-                    log.warning(f"parse_rejected_item_failed err={e}")
-                    continue
+        for line in iter_lines(rejected_path):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                item = json.loads(line)
+                items.append(item)
+            except Exception as e:
+                log.warning(f"parse_rejected_item_failed err={e}")
+                continue
     except Exception as e:
         log.error(f"read_rejected_items_failed err={e}")
         return []
@@ -327,6 +325,56 @@ def get_max_return(outcomes: Dict[str, Optional[Dict[str, Any]]]) -> float:
     return max_ret
 
 
+def _apply_timeframe_outcome(
+    existing_outcomes: Dict[str, Dict[str, Any]],
+    ticker: str,
+    rejection_ts: str,
+    rejection_price: float,
+    rejection_reason: str,
+    timeframe: str,
+    outcome_data: Dict[str, Any],
+) -> Dict[str, Any]:
+    """
+    Set one timeframe on the (possibly new) outcome record for an item.
+
+    The record is updated in ``existing_outcomes`` in place and returned,
+    with missed-opportunity and max-return fields recalculated.
+    """
+    key = f"{ticker}:{rejection_ts}"
+    outcome_record = existing_outcomes.get(key)
+
+    if outcome_record is None:
+        outcome_record = {
+            "ticker": ticker,
+            "rejection_ts": rejection_ts,
+            "rejection_price": rejection_price,
+            "rejection_reason": rejection_reason,
+            "outcomes": {tf: None for tf in TRACKING_TIMEFRAMES},
+            "is_missed_opportunity": False,
+            "max_return_pct": 0.0,
+        }
+        existing_outcomes[key] = outcome_record
+
+    outcome_record.setdefault("outcomes", {})[timeframe] = outcome_data
+    outcome_record["is_missed_opportunity"] = is_missed_opportunity(
+        outcome_record["outcomes"]
+    )
+    outcome_record["max_return_pct"] = get_max_return(outcome_record["outcomes"])
+    return outcome_record
+
+
+def _rewrite_outcomes(records: Iterable[Dict[str, Any]]) -> None:
+    """Atomically rewrite data/moa/outcomes.jsonl with ``records``."""
+    outcomes_path = Path("data/moa/outcomes.jsonl")
+    outcomes_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = outcomes_path.with_suffix(".jsonl.tmp")
+
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    os.replace(tmp_path, outcomes_path)
+
+
 def get_pending_items(timeframe: str) -> List[Dict[str, Any]]:
     """
     Get rejected items that need outcome check at this timeframe.
@@ -341,14 +389,24 @@ def get_pending_items(timeframe: str) -> List[Dict[str, Any]]:
         log.warning(f"invalid_timeframe timeframe={timeframe}")
         return []
 
+    return _pending_for_timeframe(
+        timeframe,
+        _read_rejected_items(),
+        _read_outcomes(),
+        datetime.now(timezone.utc),
+    )
+
+
+def _pending_for_timeframe(
+    timeframe: str,
+    rejected_items: List[Dict[str, Any]],
+    existing_outcomes: Dict[str, Dict[str, Any]],
+    now: datetime,
+) -> List[Dict[str, Any]]:
+    """Filter already-loaded rejected items down to those due at ``timeframe``."""
     hours_elapsed = TRACKING_TIMEFRAMES[timeframe]
-    now = datetime.now(timezone.utc)
     cutoff = now - timedelta(hours=hours_elapsed)
 
-    # Read rejected items and existing outcomes
-    rejected_items = _read_rejected_items()
-    existing_outcomes = _read_outcomes()
-
     pending = []
 
     for item in rejected_items:
@@ -464,48 +522,22 @@ def record_outcome(
         # Read or create outcome record
         existing_outcomes = _read_outcomes()
         key = f"{ticker}:{rejection_ts}"
+        is_new = key not in existing_outcomes
 
-        if key in existing_outcomes:
-            # Update existing record
-            outcome_record = existing_outcomes[key]
-            outcome_record["outcomes"][timeframe] = outcome_data
-
-            # Recalculate missed opportunity and max return
-            outcome_record["is_missed_opportunity"] = is_missed_opportunity(
-                outcome_record["outcomes"]
-            )
-            outcome_record["max_return_pct"] = get_max_return(
-                outcome_record["outcomes"]
-            )
-
-            _update_outcome(outcome_record)
-        else:
-            # Create new outcome record
-            outcome_record = {
-                "ticker": ticker,
-                "rejection_ts": rejection_ts,
-                "rejection_price": rejection_price,
-                "rejection_reason": rejection_reason,
-                "outcomes": {
-                    "15m": None,
-                    "30m": None,
-                    "1h": None,
-                    "4h": None,
-                    "1d": None,
-                    "7d": None,
-                },
-                "is_missed_opportunity": False,
-                "max_return_pct": 0.0,
-            }
-            outcome_record["outcomes"][timeframe] = outcome_data
-            outcome_record["is_missed_opportunity"] = is_missed_opportunity(
-                outcome_record["outcomes"]
-            )
-            outcome_record["max_return_pct"] = get_max_return(
-                outcome_record["outcomes"]
-            )
+        outcome_record = _apply_timeframe_outcome(
+            existing_outcomes,
+            ticker,
+            rejection_ts,
+            rejection_price,
+            rejection_reason,
+            timeframe,
+            outcome_data,
+        )
 
+        if is_new:
             _write_outcome(outcome_record)
+        else:
+            _update_outcome(outcome_record)
 
         log.info(
             f"outcome_recorded ticker={ticker} timeframe={timeframe} "
@@ -526,55 +558,88 @@ def track_pending_outcomes() -> Dict[str, int]:
     Check and update outcomes for all pending items across all timeframes.
 
     This should be called periodically (e.g., every cycle) to update outcomes.
-    Handles rate limiting and market hours detection.
+    Rejected items and existing outcomes are read once; due (item, timeframe)
+    pairs are resolved to the price at ``rejection time + timeframe`` with
+    one bar fetch per unique ticker, and the outcomes file is rewritten once.
 
     Returns:
         Dict mapping timeframe -> count of outcomes recorded
     """
     # NOTE: Market hours check removed to ensure 24/7 tracking
     # This allows MOA to analyze fresh outcomes daily instead of stale October data
-    # Rate limiting per ticker (60s) already prevents excessive API calls
+    from .feedback.outcome_scheduler import OutcomeScheduler, due_outcomes
 
-    update_counts = {}
-
-    for timeframe in TRACKING_TIMEFRAMES.keys():
-        pending = get_pending_items(timeframe)
-
-        if not pending:
-            update_counts[timeframe] = 0
-            continue
-
-        recorded = 0
-
-        # Rate limit: track last check time per ticker
-        last_check_times: Dict[str, float] = {}
-
-        for item in pending:
-            ticker = item["ticker"]
+    update_counts = {timeframe: 0 for timeframe in TRACKING_TIMEFRAMES}
+    now = datetime.now(timezone.utc)
 
-            # Rate limiting: don't check same ticker too frequently
-            last_check = last_check_times.get(ticker, 0)
-            now = time.time()
-            if now - last_check < RATE_LIMIT_SECONDS:
+    rejected_items = _read_rejected_items()
+    existing_outcomes = _read_outcomes()
+    horizons = {tf: hours * 3600 for tf, hours in TRACKING_TIMEFRAMES.items()}
+
+    items: Dict[str, Dict[str, Any]] = {}
+    scheduled = set()
+    due = []
+    for timeframe in TRACKING_TIMEFRAMES:
+        for item in _pending_for_timeframe(
+            timeframe, rejected_items, existing_outcomes, now
+        ):
+            rejection_price = item.get("rejection_price")
+            if not rejection_price or rejection_price <= 0:
                 continue
-
-            # Record outcome
-            success = record_outcome(
-                ticker=ticker,
-                timeframe=timeframe,
-                rejection_ts=item["rejection_ts"],
-                rejection_price=item["rejection_price"],
-                rejection_reason=item["rejection_reason"],
+            key = f"{item['ticker']}:{item['rejection_ts']}"
+            if (key, timeframe) in scheduled:
+                continue  # Duplicate rejection line
+            scheduled.add((key, timeframe))
+            items[key] = item
+            due.extend(
+                due_outcomes(
+                    key,
+                    item["ticker"],
+                    item["rejection_ts_dt"].timestamp(),
+                    horizons,
+                    [timeframe],
+                    now.timestamp(),
+                )
             )
 
-            if success:
-                recorded += 1
-                last_check_times[ticker] = now
-
-            # Small delay between API calls to respect rate limits
-            time.sleep(0.1)
+    if not due:
+        return update_counts
 
-        update_counts[timeframe] = recorded
+    try:
+        resolved = OutcomeScheduler().resolve(due, now=now.timestamp())
+    except Exception as e:
+        log.error(f"moa_outcome_resolution_failed due={len(due)} err={e}")
+        return update_counts
+
+    checked_at = now.isoformat()
+    for r in resolved:
+        item = items[r.due.key]
+        rejection_price = float(item["rejection_price"])
+        return_pct = ((r.price - rejection_price) / rejection_price) * 100.0
+        _apply_timeframe_outcome(
+            existing_outcomes,
+            item["ticker"],
+            item["rejection_ts"],
+            rejection_price,
+            item["rejection_reason"],
+            r.due.horizon,
+            {
+                "price": r.price,
+                "return_pct": round(return_pct, 2),
+                "checked_at": checked_at,
+                "price_at": datetime.fromtimestamp(
+                    r.price_ts, tz=timezone.utc
+                ).isoformat(),
+            },
+        )
+        update_counts[r.due.horizon] += 1
+
+    if resolved:
+        try:
+            _rewrite_outcomes(existing_outcomes.values())
+        except Exception as e:
+            log.error(f"moa_outcomes_write_failed count={len(resolved)} err={e}")
+            return {timeframe: 0 for timeframe in TRACKING_TIMEFRAMES}
 
     total = sum(update_counts.values())
     if total > 0:
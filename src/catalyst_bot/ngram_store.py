@@ -0,0 +1,430 @@
+"""
+N-gram Statistics Store
+=======================
+
+Persistent per-day n-gram counts for keyword mining.
+
+MOA keyword discovery used to re-read ``accepted_items.jsonl`` and
+re-tokenize every title into 1-4-grams on each run. This store keeps sparse
+per-day count tables per class instead. The rejected and accepted items
+loggers buffer the titles they log, and the buffer is written in one
+transaction when the item logs flush (``partitioned_jsonl.flush_all``, once
+per runner cycle). A date window is a ``SUM`` over its day tables.
+
+Schema (SQLite)::
+
+    ngram_counts(day, cls, ngram, n, count)   # one row per n-gram seen that day
+    title_totals(day, cls, titles)            # non-empty titles counted that day
+    meta(key, value)                          # backfill markers
+
+``day`` is the UTC date (``YYYY-MM-DD``) of the item's ``ts``. Counts are
+occurrences, matching ``keyword_miner.count_ngrams``, and all n-gram sizes up
+to ``MAX_NGRAM_SIZE`` are stored so callers can narrow with ``max_n``.
+
+Existing JSONL history is loaded once per class by ``ensure_backfilled``.
+After that the loggers keep the tables current.
+
+Usage:
+    from catalyst_bot.ngram_store import get_ngram_store
+
+    store = get_ngram_store()
+    counts, titles = store.window_counts("accepted", since_day)
+
+Environment Variables:
+    NGRAM_STORE_ENABLED: Record/read n-gram counts (default: 1)
+    NGRAM_STORE_PATH: SQLite database path (default: data/ngram_stats.db
+        under the repository root, whatever the working directory)
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .keyword_miner import count_ngrams
+from .logging_utils import get_logger
+from .partitioned_jsonl import add_flush_hook, iter_lines
+
+log = get_logger("ngram_store")
+
+MAX_NGRAM_SIZE = 4
+
+# Class labels written by the item loggers
+CLASS_REJECTED = "rejected"
+CLASS_ACCEPTED = "accepted"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ngram_counts (
+    day TEXT NOT NULL,
+    cls TEXT NOT NULL,
+    ngram TEXT NOT NULL,
+    n INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (cls, ngram, day)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS title_totals (
+    day TEXT NOT NULL,
+    cls TEXT NOT NULL,
+    titles INTEGER NOT NULL,
+    PRIMARY KEY (cls, day)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+_UPSERT_COUNT = (
+    "INSERT INTO ngram_counts (day, cls, ngram, n, count) VALUES (?, ?, ?, ?, ?) "
+    "ON CONFLICT (cls, ngram, day) DO UPDATE SET count = count + excluded.count"
+)
+_UPSERT_TOTAL = (
+    "INSERT INTO title_totals (day, cls, titles) VALUES (?, ?, ?) "
+    "ON CONFLICT (cls, day) DO UPDATE SET titles = titles + excluded.titles"
+)
+
+# Buffered logger titles are written early once this many are pending
+PENDING_TITLES_MAX = 1000
+
+# SQLite's default host-parameter limit is 999; leave room for the window args
+_LOOKUP_CHUNK = 900
+
+DayLike = Union[str, date, datetime]
+
+
+def _repo_root() -> Path:
+    """Get repository root directory."""
+    return Path(__file__).resolve().parents[2]
+
+
+def default_store_path() -> Path:
+    """
+    NGRAM_STORE_PATH, else data/ngram_stats.db under the repo root.
+
+    Resolved like ``moa_analyzer``'s data paths, so the logger hook and
+    keyword discovery share one file whatever the working directory.
+    """
+    return Path(
+        os.getenv("NGRAM_STORE_PATH") or _repo_root() / "data" / "ngram_stats.db"
+    )
+
+
+def ngram_store_enabled() -> bool:
+    """Return True unless NGRAM_STORE_ENABLED is set to a false value."""
+    return os.getenv("NGRAM_STORE_ENABLED", "1").strip().lower() not in (
+        "0",
+        "false",
+        "no",
+        "off",
+    )
+
+
+def _day_key(value: Optional[DayLike]) -> str:
+    """Normalize a datetime/date/ISO string (or None for today) to a UTC day."""
+    if value is None:
+        return datetime.now(timezone.utc).date().isoformat()
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc)
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    text = str(value)
+    if len(text) == 10:
+        return date.fromisoformat(text).isoformat()
+    return _day_key(datetime.fromisoformat(text.replace("Z", "+00:00")))
+
+
+class NgramStore:
+    """SQLite-backed per-day n-gram count tables."""
+
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+        """
+        Args:
+            path: Database file (default: ``default_store_path()``)
+        """
+        self.path = Path(path or default_store_path())
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path), timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            if not self._initialized:
+                conn.executescript(_SCHEMA)
+                self._initialized = True
+            yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _write_day(
+        conn: sqlite3.Connection, cls: str, day: str, counts: Counter, titles: int
+    ) -> None:
+        conn.executemany(
+            _UPSERT_COUNT,
+            (
+                (day, cls, ngram, ngram.count(" ") + 1, count)
+                for ngram, count in counts.items()
+            ),
+        )
+        conn.execute(_UPSERT_TOTAL, (day, cls, titles))
+
+    def record_titles(
+        self, cls: str, titles: Iterable[str], day: Optional[DayLike] = None
+    ) -> int:
+        """
+        Add the n-grams of ``titles`` to ``cls``'s table for ``day``.
+
+        Args:
+            cls: Class label (e.g. CLASS_REJECTED, CLASS_ACCEPTED)
+            titles: Titles to tokenize (empty titles are skipped)
+            day: Day to record under (default: today, UTC)
+
+        Returns:
+            Number of titles recorded
+        """
+        counts, total = count_ngrams(titles, max_n=MAX_NGRAM_SIZE)
+        if not total:
+            return 0
+        with self._lock, self._connect() as conn:
+            with conn:
+                self._write_day(conn, cls, _day_key(day), counts, total)
+        return total
+
+    def record_title(self, cls: str, title: str, day: Optional[DayLike] = None) -> bool:
+        """Record a single title. Returns False if the title was empty."""
+        return self.record_titles(cls, [title], day) > 0
+
+    def record_batch(self, titles_by_day: Dict[Tuple[str, str], List[str]]) -> int:
+        """
+        Record titles for several (cls, day) keys in one transaction.
+
+        Args:
+            titles_by_day: ``(cls, day) -> titles``
+
+        Returns:
+            Number of titles recorded
+        """
+        tables = []
+        for (cls, day), titles in titles_by_day.items():
+            counts, total = count_ngrams(titles, max_n=MAX_NGRAM_SIZE)
+            if total:
+                tables.append((cls, _day_key(day), counts, total))
+        if not tables:
+            return 0
+        with self._lock, self._connect() as conn:
+            with conn:
+                for cls, day, counts, total in tables:
+                    self._write_day(conn, cls, day, counts, total)
+        return sum(total for _, _, _, total in tables)
+
+    def window_counts(
+        self,
+        cls: str,
+        since: DayLike,
+        until: Optional[DayLike] = None,
+        max_n: int = MAX_NGRAM_SIZE,
+        phrases: Optional[Iterable[str]] = None,
+    ) -> Tuple[Dict[str, int], int]:
+        """
+        Sum day tables over ``[since, until]`` (inclusive UTC days).
+
+        Args:
+            cls: Class label
+            since: First day of the window
+            until: Last day of the window (default: no upper bound)
+            max_n: Only return n-grams with at most this many tokens
+            phrases: If given, only look up these phrases (e.g. the positive
+                candidates when scoring lift)
+
+        Returns:
+            Tuple of (phrase -> summed count, summed number of titles)
+        """
+        lo = _day_key(since)
+        hi = _day_key(until) if until is not None else "9999-12-31"
+        with self._lock, self._connect() as conn:
+            (titles,) = conn.execute(
+                "SELECT COALESCE(SUM(titles), 0) FROM title_totals "
+                "WHERE cls = ? AND day BETWEEN ? AND ?",
+                (cls, lo, hi),
+            ).fetchone()
+
+            base = (
+                "SELECT ngram, SUM(count) FROM ngram_counts "
+                "WHERE cls = ? AND day BETWEEN ? AND ? AND n <= ?"
+            )
+            args = (cls, lo, hi, max_n)
+            counts: Dict[str, int] = {}
+            if phrases is None:
+                counts.update(conn.execute(base + " GROUP BY ngram", args))
+            else:
+                wanted = list(dict.fromkeys(phrases))
+                for i in range(0, len(wanted), _LOOKUP_CHUNK):
+                    chunk = wanted[i : i + _LOOKUP_CHUNK]
+                    marks = ",".join("?" * len(chunk))
+                    counts.update(
+                        conn.execute(
+                            f"{base} AND ngram IN ({marks}) GROUP BY ngram",
+                            args + tuple(chunk),
+                        )
+                    )
+        return counts, int(titles)
+
+    def is_backfilled(self, cls: str) -> bool:
+        """True once ``ensure_backfilled`` has loaded history for ``cls``."""
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT 1 FROM meta WHERE key = ?", (f"backfill:{cls}",)
+            ).fetchone()
+        return row is not None
+
+    def ensure_backfilled(self, cls: str, jsonl_path: Union[str, Path]) -> bool:
+        """
+        Load ``cls``'s history from an items JSONL file, once.
+
+        The class's tables are rebuilt from the file (anything recorded
+        before the backfill is also in the file), and a marker is written so
+        later calls are no-ops. Lines with bad JSON or timestamps are skipped,
+        like ``moa_analyzer.load_accepted_items`` does.
+
+        Returns:
+            True if a backfill ran, False if the class was already backfilled
+        """
+        key = f"backfill:{cls}"
+        with self._lock, self._connect() as conn:
+            if conn.execute("SELECT 1 FROM meta WHERE key = ?", (key,)).fetchone():
+                return False
+
+            by_day: Dict[str, List[str]] = {}
+            # Legacy flat file plus its day partitions
+            for line in iter_lines(jsonl_path):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    item = json.loads(line)
+                    day = _day_key(item.get("ts") or "")
+                except Exception:
+                    continue
+                by_day.setdefault(day, []).append(item.get("title") or "")
+
+            recorded = 0
+            with conn:
+                conn.execute("DELETE FROM ngram_counts WHERE cls = ?", (cls,))
+                conn.execute("DELETE FROM title_totals WHERE cls = ?", (cls,))
+                for day, titles in by_day.items():
+                    counts, total = count_ngrams(titles, max_n=MAX_NGRAM_SIZE)
+                    if total:
+                        self._write_day(conn, cls, day, counts, total)
+                        recorded += total
+                conn.execute(
+                    "INSERT INTO meta (key, value) VALUES (?, ?)",
+                    (key, datetime.now(timezone.utc).isoformat()),
+                )
+
+        log.info(
+            f"ngram_store_backfilled cls={cls} days={len(by_day)} "
+            f"titles={recorded} path={jsonl_path}"
+        )
+        return True
+
+    def prune(self, before: DayLike) -> int:
+        """Delete day tables older than ``before``. Returns rows removed."""
+        cutoff = _day_key(before)
+        with self._lock, self._connect() as conn:
+            with conn:
+                removed = conn.execute(
+                    "DELETE FROM ngram_counts WHERE day < ?", (cutoff,)
+                ).rowcount
+                conn.execute("DELETE FROM title_totals WHERE day < ?", (cutoff,))
+        return removed
+
+
+_stores: Dict[str, NgramStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_ngram_store(path: Optional[Union[str, Path]] = None) -> NgramStore:
+    """Return the shared NgramStore for ``path`` (default: default_store_path())."""
+    key = str(path or default_store_path())
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = NgramStore(key)
+        return store
+
+
+# Store path -> (class, day) -> titles; the path is fixed when a title is
+# logged so a later NGRAM_STORE_PATH change cannot redirect it
+_pending_titles: Dict[str, Dict[Tuple[str, str], List[str]]] = {}
+_pending_count = 0
+_pending_lock = threading.Lock()
+
+
+def record_logged_title(cls: str, title: str, ts: Optional[DayLike] = None) -> None:
+    """
+    Best-effort hook for the item loggers; never raises.
+
+    Titles are buffered and written by ``flush_logged_titles`` when the item
+    logs flush, or early once PENDING_TITLES_MAX are pending.
+    """
+    global _pending_count
+    if not title or not ngram_store_enabled():
+        return
+    try:
+        day = _day_key(ts)
+        path = str(default_store_path())
+    except Exception as e:
+        log.debug(f"ngram_store_record_failed cls={cls} err={e}")
+        return
+    with _pending_lock:
+        by_day = _pending_titles.setdefault(path, {})
+        by_day.setdefault((cls, day), []).append(title)
+        _pending_count += 1
+        due = _pending_count >= PENDING_TITLES_MAX
+    if due:
+        flush_logged_titles()
+
+
+def flush_logged_titles() -> int:
+    """Write the buffered logger titles in one transaction; never raises."""
+    global _pending_count
+    with _pending_lock:
+        batches = dict(_pending_titles)
+        _pending_titles.clear()
+        _pending_count = 0
+    written = 0
+    for path, batch in batches.items():
+        try:
+            written += get_ngram_store(path).record_batch(batch)
+        except Exception as e:
+            log.debug(f"ngram_store_record_failed path={path} err={e}")
+    return written
+
+
+add_flush_hook(flush_logged_titles)
+
+
+__all__ = [
+    "CLASS_ACCEPTED",
+    "CLASS_REJECTED",
+    "MAX_NGRAM_SIZE",
+    "NgramStore",
+    "default_store_path",
+    "flush_logged_titles",
+    "get_ngram_store",
+    "ngram_store_enabled",
+    "record_logged_title",
+]
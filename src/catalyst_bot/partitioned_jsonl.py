@@ -0,0 +1,452 @@
+"""
+Partitioned JSONL Logs
+======================
+
+Write-batched, day-partitioned JSONL logs with per-day summary sidecars.
+
+The rejected and accepted items loggers used to open, append to and close
+``data/<name>.jsonl`` for every item, and their stats/retention helpers
+rescanned (and rewrote) the whole file. A :class:`PartitionedJsonlLog`
+buffers records in memory and writes them once per flush. It flushes at
+the end of each runner cycle, when the buffer reaches a record count, or
+when the oldest buffered record reaches an age limit. Records land in
+one file per UTC day::
+
+    data/rejected_items/2026-01-06.jsonl           # records
+    data/rejected_items/2026-01-06.1.jsonl         # rotated part (size cap)
+    data/rejected_items/2026-01-06.summary.json    # {"count": n, "<field>": {...}}
+
+Retention deletes whole day files. Stats read the sidecar counters.
+
+The legacy flat file (``data/<name>.jsonl``) is still read, so history
+written before partitioning, and output appended by the historical
+bootstrapper, stay visible. Readers go through :func:`iter_lines` with the
+legacy path, which yields the legacy file followed by the day partitions.
+
+Environment Variables:
+    ITEM_LOG_FLUSH_RECORDS: Flush when this many records are buffered
+        (default: 500)
+    ITEM_LOG_FLUSH_SEC: Flush when the oldest buffered record is this old
+        (default: 30)
+    ITEM_LOG_PART_MAX_MB: Start a new part file for the day past this size
+        (default: 64)
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import re
+import threading
+import time
+import weakref
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .logging_utils import get_logger
+
+log = get_logger("partitioned_jsonl")
+
+SUMMARY_SUFFIX = ".summary.json"
+_PART_RE = re.compile(r"^(\d{4}-\d{2}-\d{2})(?:\.(\d+))?\.jsonl$")
+
+PathLike = Union[str, Path]
+
+
+def _env_num(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, "") or default)
+    except ValueError:
+        return default
+
+
+def partition_dir(legacy_path: PathLike) -> Path:
+    """Day-partition directory for a legacy log path (``x.jsonl`` -> ``x/``)."""
+    return Path(legacy_path).with_suffix("")
+
+
+def record_day(record: Dict[str, Any]) -> str:
+    """UTC day (``YYYY-MM-DD``) of a record's ``ts``, or today."""
+    ts = str(record.get("ts") or "")
+    try:
+        dt = datetime.fromisoformat(ts.replace("Z", "+00:00"))
+        if dt.tzinfo is not None:
+            dt = dt.astimezone(timezone.utc)
+        return dt.date().isoformat()
+    except ValueError:
+        return datetime.now(timezone.utc).date().isoformat()
+
+
+def day_files(directory: PathLike, since_day: Optional[str] = None) -> List[Path]:
+    """Record files in ``directory`` ordered by (day, part), from ``since_day``."""
+    parts: List[Tuple[str, int, Path]] = []
+    directory = Path(directory)
+    if not directory.is_dir():
+        return []
+    for path in directory.iterdir():
+        m = _PART_RE.match(path.name)
+        if not m:
+            continue
+        day = m.group(1)
+        if since_day is not None and day < since_day:
+            continue
+        parts.append((day, int(m.group(2) or 0), path))
+    parts.sort(key=lambda p: (p[0], p[1]))
+    return [p[2] for p in parts]
+
+
+def _empty_summary(fields: Sequence[str]) -> Dict[str, Any]:
+    summary: Dict[str, Any] = {"count": 0}
+    for field in fields:
+        summary[field] = {}
+    return summary
+
+
+def _add_to_summary(
+    summary: Dict[str, Any], record: Dict[str, Any], fields: Sequence[str]
+) -> None:
+    summary["count"] = summary.get("count", 0) + 1
+    for field in fields:
+        value = str(record.get(field) or "")
+        counts = summary.setdefault(field, {})
+        counts[value] = counts.get(value, 0) + 1
+
+
+def merge_summaries(*summaries: Dict[str, Any]) -> Dict[str, Any]:
+    """Sum ``count`` and per-field counters across summaries."""
+    out: Dict[str, Any] = {"count": 0}
+    for summary in summaries:
+        for key, value in summary.items():
+            if key == "count":
+                out["count"] += int(value)
+            elif isinstance(value, dict):
+                counts = out.setdefault(key, {})
+                for k, n in value.items():
+                    counts[k] = counts.get(k, 0) + int(n)
+    return out
+
+
+# Legacy flat-file summaries, keyed by path and invalidated on (mtime, size)
+_legacy_cache: Dict[Tuple[str, Tuple[str, ...]], Tuple[Tuple[int, int], Dict]] = {}
+_legacy_lock = threading.Lock()
+
+
+def legacy_day_summaries(
+    legacy_path: PathLike, fields: Sequence[str]
+) -> Dict[str, Dict[str, Any]]:
+    """Per-day summaries of a legacy flat log, rescanned only when it changes."""
+    path = Path(legacy_path)
+    try:
+        st = path.stat()
+    except OSError:
+        return {}
+    key = (str(path), tuple(fields))
+    sig = (st.st_mtime_ns, st.st_size)
+    with _legacy_lock:
+        cached = _legacy_cache.get(key)
+        if cached is not None and cached[0] == sig:
+            return cached[1]
+
+    by_day: Dict[str, Dict[str, Any]] = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line.strip())
+                day = str(record.get("ts", ""))[:10]
+            except Exception:
+                continue
+            if not day:
+                continue
+            _add_to_summary(
+                by_day.setdefault(day, _empty_summary(fields)), record, fields
+            )
+    with _legacy_lock:
+        _legacy_cache[key] = (sig, by_day)
+    return by_day
+
+
+class PartitionedJsonlLog:
+    """Buffered JSONL writer partitioned by UTC day with summary sidecars."""
+
+    def __init__(
+        self,
+        legacy_path: PathLike,
+        summary_fields: Sequence[str] = (),
+        flush_records: Optional[int] = None,
+        flush_seconds: Optional[float] = None,
+        part_max_bytes: Optional[int] = None,
+        clock=time.monotonic,
+    ):
+        self.legacy_path = Path(legacy_path)
+        self.directory = partition_dir(self.legacy_path)
+        self.summary_fields = tuple(summary_fields)
+        self.flush_records = int(
+            flush_records
+            if flush_records is not None
+            else _env_num("ITEM_LOG_FLUSH_RECORDS", 500)
+        )
+        self.flush_seconds = (
+            flush_seconds
+            if flush_seconds is not None
+            else _env_num("ITEM_LOG_FLUSH_SEC", 30.0)
+        )
+        self.part_max_bytes = int(
+            part_max_bytes
+            if part_max_bytes is not None
+            else _env_num("ITEM_LOG_PART_MAX_MB", 64) * 1024 * 1024
+        )
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._pending: List[Tuple[str, str, Dict[str, Any]]] = []
+        self._oldest: Optional[float] = None
+        self._parts: Dict[str, int] = {}
+        _register(self)
+
+    # ------------------------------------------------------------------ write
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """Buffer one record; flushes when the size or age limit is reached."""
+        sink = _append_sink
+        if sink is not None:
+            sink(self.legacy_path, self.summary_fields, record)
+            return
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._pending.append((record_day(record), line, record))
+            if self._oldest is None:
+                self._oldest = self._clock()
+            due = len(self._pending) >= self.flush_records or (
+                self._clock() - self._oldest >= self.flush_seconds
+            )
+        if due:
+            self.flush()
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self) -> int:
+        """Write buffered records (one open per day file) and update sidecars."""
+        with self._lock:
+            batch, self._pending, self._oldest = self._pending, [], None
+            if not batch:
+                return 0
+            by_day: Dict[str, List[Tuple[str, Dict[str, Any]]]] = {}
+            for day, line, record in batch:
+                by_day.setdefault(day, []).append((line, record))
+            try:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                for day, rows in by_day.items():
+                    with open(self._part_path(day), "a", encoding="utf-8") as f:
+                        f.write("".join(line for line, _ in rows))
+                    summary = self.read_summary(day)
+                    for _, record in rows:
+                        _add_to_summary(summary, record, self.summary_fields)
+                    self._write_summary(day, summary)
+            except Exception as e:
+                log.warning(
+                    "item_log_flush_failed path=%s records=%d err=%s",
+                    self.directory,
+                    len(batch),
+                    e.__class__.__name__,
+                )
+                return 0
+        return len(batch)
+
+    def _part_path(self, day: str) -> Path:
+        part = self._parts.get(day)
+        if part is None:
+            existing = [
+                p
+                for p in day_files(self.directory, since_day=day)
+                if p.name[:10] == day
+            ]
+            part = len(existing) - 1 if existing else 0
+        path = self._name(day, part)
+        if path.exists() and path.stat().st_size >= self.part_max_bytes:
+            part += 1
+            path = self._name(day, part)
+        self._parts[day] = part
+        return path
+
+    def _name(self, day: str, part: int) -> Path:
+        suffix = f".{part}.jsonl" if part else ".jsonl"
+        return self.directory / f"{day}{suffix}"
+
+    def _summary_path(self, day: str) -> Path:
+        return self.directory / f"{day}{SUMMARY_SUFFIX}"
+
+    def _write_summary(self, day: str, summary: Dict[str, Any]) -> None:
+        path = self._summary_path(day)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(summary, f, sort_keys=True)
+        tmp.replace(path)
+
+    # ------------------------------------------------------------------- read
+
+    def read_summary(self, day: str) -> Dict[str, Any]:
+        """Flushed summary for ``day`` (zeros when the day has no file)."""
+        try:
+            with open(self._summary_path(day), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return _empty_summary(self.summary_fields)
+
+    def day_summary(self, day: Optional[str] = None) -> Dict[str, Any]:
+        """Counters for ``day`` (default today) across legacy, flushed and pending."""
+        day = day or datetime.now(timezone.utc).date().isoformat()
+        pending = _empty_summary(self.summary_fields)
+        with self._lock:
+            for rec_day, _, record in self._pending:
+                if rec_day == day:
+                    _add_to_summary(pending, record, self.summary_fields)
+        legacy = legacy_day_summaries(self.legacy_path, self.summary_fields)
+        return merge_summaries(legacy.get(day, {}), self.read_summary(day), pending)
+
+    # -------------------------------------------------------------- retention
+
+    def drop_days_before(self, cutoff: date) -> int:
+        """Delete day partitions older than ``cutoff``; returns records removed."""
+        self.flush()
+        cutoff_day = cutoff.isoformat()
+        removed = 0
+        with self._lock:
+            days = {p.name[:10] for p in day_files(self.directory)}
+            days |= {
+                p.name[: -len(SUMMARY_SUFFIX)]
+                for p in self.directory.glob(f"*{SUMMARY_SUFFIX}")
+            }
+            for day in sorted(d for d in days if d < cutoff_day):
+                removed += int(self.read_summary(day).get("count", 0))
+                for path in day_files(self.directory, since_day=day):
+                    if path.name[:10] == day:
+                        path.unlink(missing_ok=True)
+                self._summary_path(day).unlink(missing_ok=True)
+                self._parts.pop(day, None)
+        return removed
+
+
+def iter_lines(
+    legacy_path: PathLike, since: Optional[datetime] = None
+) -> Iterator[str]:
+    """Yield raw lines from a legacy log file and then its day partitions.
+
+    Buffered records for the same log in this process are flushed first.
+    ``since`` skips whole partition days before its UTC date; the legacy
+    file is always read in full, so callers still filter by ``ts``.
+    """
+    legacy_path = Path(legacy_path)
+    flush_for(legacy_path)
+    paths: List[Path] = [legacy_path] if legacy_path.exists() else []
+    since_day = None
+    if since is not None:
+        since_day = since.astimezone(timezone.utc).date().isoformat()
+    paths.extend(day_files(partition_dir(legacy_path), since_day=since_day))
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            yield from f
+
+
+def has_records(legacy_path: PathLike) -> bool:
+    """True if the legacy file or any day partition exists."""
+    legacy_path = Path(legacy_path)
+    return legacy_path.exists() or bool(day_files(partition_dir(legacy_path)))
+
+
+# Process-wide registry so the runner (and atexit) can flush every log
+_logs: "weakref.WeakSet[PartitionedJsonlLog]" = weakref.WeakSet()
+_logs_lock = threading.Lock()
+
+
+def _register(item_log: PartitionedJsonlLog) -> None:
+    with _logs_lock:
+        _logs.add(item_log)
+
+
+_by_path: Dict[str, PartitionedJsonlLog] = {}
+
+# When set, appends are handed to the sink instead of buffered locally
+# (sharded runner workers forward them to the single writing process)
+_append_sink: Optional[Callable[[Path, Tuple[str, ...], Dict[str, Any]], None]] = None
+
+
+def set_append_sink(
+    sink: Optional[Callable[[Path, Tuple[str, ...], Dict[str, Any]], None]]
+) -> None:
+    """Route every log's ``append`` to ``sink(legacy_path, fields, record)``."""
+    global _append_sink
+    _append_sink = sink
+
+
+def get_log(
+    legacy_path: PathLike, summary_fields: Sequence[str] = ()
+) -> PartitionedJsonlLog:
+    """Process-wide log for ``legacy_path`` (one buffer per path)."""
+    key = str(Path(legacy_path))
+    with _logs_lock:
+        item_log = _by_path.get(key)
+    if item_log is None:
+        item_log = PartitionedJsonlLog(legacy_path, summary_fields=summary_fields)
+        with _logs_lock:
+            item_log = _by_path.setdefault(key, item_log)
+    return item_log
+
+
+# Callables run after every ``flush_all`` (e.g. the n-gram store writing
+# the titles it buffered for the same records)
+_flush_hooks: List[Callable[[], Any]] = []
+
+
+def add_flush_hook(hook: Callable[[], Any]) -> None:
+    """Run ``hook()`` after each ``flush_all`` (once per runner cycle)."""
+    with _logs_lock:
+        if hook not in _flush_hooks:
+            _flush_hooks.append(hook)
+
+
+def flush_all() -> int:
+    """Flush every partitioned log in the process; returns records written."""
+    with _logs_lock:
+        logs = list(_logs)
+        hooks = list(_flush_hooks)
+    written = sum(item_log.flush() for item_log in logs)
+    for hook in hooks:
+        try:
+            hook()
+        except Exception as e:
+            log.warning(
+                "item_log_flush_hook_failed hook=%s err=%s",
+                getattr(hook, "__name__", hook),
+                e.__class__.__name__,
+            )
+    return written
+
+
+def flush_for(legacy_path: PathLike) -> None:
+    """Flush logs writing under ``legacy_path`` (before reading it back)."""
+    target = Path(legacy_path).resolve()
+    with _logs_lock:
+        logs = [lg for lg in _logs if lg.legacy_path.resolve() == target]
+    for item_log in logs:
+        item_log.flush()
+
+
+atexit.register(flush_all)
+
+
+__all__ = [
+    "PartitionedJsonlLog",
+    "add_flush_hook",
+    "day_files",
+    "flush_all",
+    "get_log",
+    "has_records",
+    "iter_lines",
+    "legacy_day_summaries",
+    "merge_summaries",
+    "partition_dir",
+    "set_append_sink",
+]
@@ -5,6 +5,8 @@ This package provides position tracking and portfolio management.
 
 Components:
 - position_manager: Manages open positions and tracks P&L
+- portfolio_state: Ticker-indexed position store with bulk P&L and
+  write-behind dirty tracking
 
 Usage:
     from catalyst_bot.portfolio import PositionManager
@@ -27,6 +29,7 @@ Usage:
     metrics = manager.calculate_portfolio_metrics()
 """
 
+from .portfolio_state import PortfolioState
 from .position_manager import (
     ClosedPosition,
     ManagedPosition,
@@ -39,4 +42,5 @@ __all__ = [
     "ManagedPosition",
     "ClosedPosition",
     "PortfolioMetrics",
+    "PortfolioState",
 ]
@@ -0,0 +1,213 @@
+"""
+Portfolio State Module
+
+In-memory store of open positions shared by the position managers.
+
+Key responsibilities:
+- Index positions by ID and by ticker (no linear scans)
+- Apply a tick of price updates to all affected positions in bulk
+- Evaluate stop-loss / take-profit triggers for all positions at once
+- Track dirty positions for write-behind persistence
+
+P&L is computed on Decimal object vectors so stored values stay exact.
+Trigger checks run on float64 vectors; rounding Decimal -> float is
+monotonic, so a level that is hit is never reported as missed.
+
+Usage:
+    state = PortfolioState()
+    state.add(position)
+
+    updated = state.apply_prices({"AAPL": Decimal("155.00")})
+    stops, targets = state.triggered()
+
+    for position in state.take_dirty():
+        ...  # persist once per tick
+"""
+
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+from ..time_utils import now as sim_now
+
+_ZERO = Decimal("0")
+
+
+def _is_short(position: Any) -> bool:
+    """True for short positions (sync positions have no side and are long)."""
+    side = getattr(position, "side", None)
+    return getattr(side, "value", side) == "short"
+
+
+def _level(value: Optional[Decimal]) -> float:
+    """Float trigger level, NaN when unset (matches ``if not price`` checks)."""
+    return float(value) if value else np.nan
+
+
+class PortfolioState:
+    """
+    Ticker-indexed collection of open positions.
+
+    Positions are any objects with ``position_id``, ``ticker``, ``quantity``,
+    ``entry_price``, ``current_price``, ``cost_basis`` and the P&L fields of
+    ``ManagedPosition``; ``side`` is optional.
+    """
+
+    def __init__(self):
+        self.positions: Dict[str, Any] = {}
+        self._by_ticker: Dict[str, List[str]] = {}
+        self._dirty: Set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(list(self.positions.values()))
+
+    def __contains__(self, position_id: str) -> bool:
+        return position_id in self.positions
+
+    # ========================================================================
+    # Index Maintenance
+    # ========================================================================
+
+    def add(self, position: Any, dirty: bool = False) -> None:
+        """Add (or replace) a position and index it by ticker."""
+        if position.position_id in self.positions:
+            self.remove(position.position_id)
+        self.positions[position.position_id] = position
+        self._by_ticker.setdefault(position.ticker, []).append(position.position_id)
+        if dirty:
+            self._dirty.add(position.position_id)
+
+    def remove(self, position_id: str) -> Optional[Any]:
+        """Remove a position; pending writes for it are dropped."""
+        position = self.positions.pop(position_id, None)
+        self._dirty.discard(position_id)
+        if position is None:
+            return None
+        ids = self._by_ticker.get(position.ticker, [])
+        if position_id in ids:
+            ids.remove(position_id)
+        if not ids:
+            self._by_ticker.pop(position.ticker, None)
+        return position
+
+    def get(self, position_id: str) -> Optional[Any]:
+        """Get position by ID."""
+        return self.positions.get(position_id)
+
+    def get_by_ticker(self, ticker: str) -> Optional[Any]:
+        """Get the oldest open position for a ticker."""
+        ids = self._by_ticker.get(ticker)
+        return self.positions[ids[0]] if ids else None
+
+    def positions_for_ticker(self, ticker: str) -> List[Any]:
+        """Get all open positions for a ticker."""
+        return [self.positions[pid] for pid in self._by_ticker.get(ticker, [])]
+
+    def tickers(self) -> List[str]:
+        """Unique tickers with open positions."""
+        return list(self._by_ticker)
+
+    # ========================================================================
+    # Write-Behind Tracking
+    # ========================================================================
+
+    def mark_dirty(self, position_id: str) -> None:
+        """Flag a position for the next flush."""
+        if position_id in self.positions:
+            self._dirty.add(position_id)
+
+    def take_dirty(self) -> List[Any]:
+        """Return and clear the positions waiting to be persisted."""
+        dirty = [self.positions[pid] for pid in self._dirty if pid in self.positions]
+        self._dirty.clear()
+        return dirty
+
+    @property
+    def dirty_count(self) -> int:
+        return len(self._dirty)
+
+    # ========================================================================
+    # Bulk Operations
+    # ========================================================================
+
+    def apply_prices(
+        self,
+        price_updates: Dict[str, Decimal],
+        updated_at: Optional[datetime] = None,
+    ) -> List[Any]:
+        """
+        Mark all positions in ``price_updates`` to market in one pass.
+
+        Args:
+            price_updates: Dict of ticker -> current price
+            updated_at: Timestamp to stamp on updated positions
+
+        Returns:
+            List of updated positions (also flagged dirty)
+        """
+        positions = []
+        prices = []
+        for ticker, price in price_updates.items():
+            if price is None:
+                continue
+            for pid in self._by_ticker.get(ticker, ()):
+                positions.append(self.positions[pid])
+                prices.append(price)
+
+        if not positions:
+            return []
+
+        price_vec = np.array(prices, dtype=object)
+        qty = np.array([p.quantity for p in positions], dtype=object)
+        entry = np.array([p.entry_price for p in positions], dtype=object)
+        cost = np.array([p.cost_basis for p in positions], dtype=object)
+        short = np.array([_is_short(p) for p in positions], dtype=bool)
+
+        market_value = price_vec * qty
+        pnl = np.where(short, (entry - price_vec) * qty, (price_vec - entry) * qty)
+        pnl_pct = [pnl[i] / cost[i] if cost[i] else _ZERO for i in range(len(pnl))]
+
+        stamp = updated_at or sim_now()
+        for i, position in enumerate(positions):
+            position.current_price = prices[i]
+            position.market_value = market_value[i]
+            position.unrealized_pnl = pnl[i]
+            position.unrealized_pnl_pct = pnl_pct[i]
+            position.updated_at = stamp
+            self._dirty.add(position.position_id)
+
+        return positions
+
+    def triggered(self) -> Tuple[List[Any], List[Any]]:
+        """
+        Evaluate stop-loss and take-profit levels for all positions.
+
+        Returns:
+            (positions at stop loss, positions at take profit)
+        """
+        positions = list(self.positions.values())
+        if not positions:
+            return [], []
+
+        current = np.array([float(p.current_price) for p in positions])
+        stop = np.array([_level(p.stop_loss_price) for p in positions])
+        target = np.array([_level(p.take_profit_price) for p in positions])
+        short = np.array([_is_short(p) for p in positions], dtype=bool)
+
+        # NaN levels compare False in both directions
+        with np.errstate(invalid="ignore"):
+            stop_hit = np.where(short, current >= stop, current <= stop)
+            target_hit = np.where(short, current <= target, current >= target)
+
+        return (
+            [positions[i] for i in np.flatnonzero(stop_hit)],
+            [positions[i] for i in np.flatnonzero(target_hit)],
+        )
+
+
+__all__ = ["PortfolioState"]
@@ -69,12 +69,14 @@ from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from decimal import Decimal
 from pathlib import Path
-from typing import Dict, List, Optional
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional
 
 from ..broker.broker_interface import BrokerInterface, Order, PositionSide
 from ..config import get_settings
 from ..logging_utils import get_logger
 from ..time_utils import now as sim_now
+from .portfolio_state import PortfolioState
 
 logger = get_logger(__name__)
 
@@ -261,6 +263,10 @@ class PositionManager:
     5. Closing positions
     6. Maintaining position history
     7. Computing portfolio metrics
+
+    Opens and closes are written through immediately. Price updates are
+    write-behind: they mark positions dirty and ``flush_positions`` writes
+    them once per tick in a single transaction.
     """
 
     def __init__(
@@ -283,18 +289,35 @@ class PositionManager:
         self.db_path = db_path or settings.data_dir / "trading.db"
         self._init_database()
 
-        # In-memory position cache
-        self._positions: Dict[str, ManagedPosition] = {}
+        # In-memory position state (ticker index + write-behind dirty set)
+        self._state = PortfolioState()
 
         # Price update tracking
         self._last_price_update: Dict[str, datetime] = {}
 
         self.logger.info(f"Initialized PositionManager (db={self.db_path})")
 
+    @property
+    def _positions(self) -> Mapping[str, ManagedPosition]:
+        """Open positions keyed by position ID (read-only view of the state)."""
+        return MappingProxyType(self._state.positions)
+
     # ========================================================================
     # Database Management
     # ========================================================================
 
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Open a connection in WAL mode.
+
+        WAL keeps each flush transaction crash-safe (a torn write is rolled
+        back from the journal on the next open) without blocking readers.
+        """
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
     def _init_database(self) -> None:
         """
         Initialize database schema for position tracking.
@@ -303,7 +326,7 @@ class PositionManager:
             # Ensure directory exists
             self.db_path.parent.mkdir(parents=True, exist_ok=True)
 
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 # Create positions table
                 conn.execute(
                     """
@@ -395,16 +418,46 @@ class PositionManager:
             self.logger.error(f"Failed to initialize database: {e}")
             raise
 
-    def _save_position_to_db(self, position: ManagedPosition) -> None:
+    @staticmethod
+    def _position_row(position: ManagedPosition) -> tuple:
+        """Database row for an open position."""
+        return (
+            position.position_id,
+            position.ticker,
+            position.side.value,
+            position.quantity,
+            float(position.entry_price),
+            float(position.current_price),
+            float(position.cost_basis),
+            float(position.market_value),
+            float(position.unrealized_pnl),
+            float(position.unrealized_pnl_pct),
+            (float(position.stop_loss_price) if position.stop_loss_price else None),
+            (float(position.take_profit_price) if position.take_profit_price else None),
+            position.opened_at.isoformat(),
+            position.updated_at.isoformat(),
+            position.entry_order_id,
+            position.signal_id,
+            position.strategy,
+            json.dumps(position.metadata),
+        )
+
+    def _save_positions_to_db(self, positions: List[ManagedPosition]) -> bool:
         """
-        Save position to database.
+        Save positions to database in a single transaction.
 
         Args:
-            position: Position to save
+            positions: Positions to save
+
+        Returns:
+            True if the transaction committed
         """
+        if not positions:
+            return True
+
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute(
+            with self._connect() as conn:
+                conn.executemany(
                     """
                     INSERT OR REPLACE INTO positions (
                         position_id, ticker, side, quantity,
@@ -416,40 +469,44 @@ class PositionManager:
                         entry_order_id, signal_id, strategy, metadata
                     ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                     """,
-                    (
-                        position.position_id,
-                        position.ticker,
-                        position.side.value,
-                        position.quantity,
-                        float(position.entry_price),
-                        float(position.current_price),
-                        float(position.cost_basis),
-                        float(position.market_value),
-                        float(position.unrealized_pnl),
-                        float(position.unrealized_pnl_pct),
-                        (
-                            float(position.stop_loss_price)
-                            if position.stop_loss_price
-                            else None
-                        ),
-                        (
-                            float(position.take_profit_price)
-                            if position.take_profit_price
-                            else None
-                        ),
-                        position.opened_at.isoformat(),
-                        position.updated_at.isoformat(),
-                        position.entry_order_id,
-                        position.signal_id,
-                        position.strategy,
-                        json.dumps(position.metadata),
-                    ),
+                    [self._position_row(p) for p in positions],
                 )
                 conn.commit()
-                self.logger.debug(f"Saved position {position.position_id} to database")
+                self.logger.debug(f"Saved {len(positions)} positions to database")
+                return True
 
         except Exception as e:
-            self.logger.error(f"Failed to save position to database: {e}")
+            self.logger.error(f"Failed to save positions to database: {e}")
+            return False
+
+    def _save_position_to_db(self, position: ManagedPosition) -> None:
+        """
+        Save position to database.
+
+        Args:
+            position: Position to save
+        """
+        self._save_positions_to_db([position])
+
+    def flush_positions(self) -> int:
+        """
+        Persist all positions changed since the last flush.
+
+        Price updates only mark positions dirty; this writes them in one
+        transaction. On failure the positions stay dirty and are retried on
+        the next flush.
+
+        Returns:
+            Number of positions written
+        """
+        dirty = self._state.take_dirty()
+        if not dirty:
+            return 0
+        if not self._save_positions_to_db(dirty):
+            for position in dirty:
+                self._state.mark_dirty(position.position_id)
+            return 0
+        return len(dirty)
 
     def _save_closed_position_to_db(self, closed: ClosedPosition) -> None:
         """
@@ -459,7 +516,7 @@ class PositionManager:
             closed: Closed position to save
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 conn.execute(
                     """
                     INSERT OR REPLACE INTO closed_positions (
@@ -516,7 +573,7 @@ class PositionManager:
             position_id: Position ID to delete
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 conn.execute(
                     "DELETE FROM positions WHERE position_id = ?", (position_id,)
                 )
@@ -587,7 +644,7 @@ class PositionManager:
         self._save_position_to_db(position)
 
         # Cache in memory
-        self._positions[position.position_id] = position
+        self._state.add(position)
 
         self.logger.info(
             f"Opened position: {position.ticker} {position.side.value} "
@@ -673,7 +730,7 @@ class PositionManager:
         self._save_closed_position_to_db(closed)
 
         # Remove from memory cache
-        del self._positions[position_id]
+        self._state.remove(position_id)
 
         self.logger.info(
             f"Closed position {position_id}: {closed.ticker} "
@@ -709,43 +766,14 @@ class PositionManager:
             # 3. WebSocket feed
             price_updates = await self._fetch_current_prices()
 
-        # Update each position
-        updated_count = 0
-        for position_id, position in self._positions.items():
-            ticker = position.ticker
-            if ticker not in price_updates:
-                continue
-
-            current_price = price_updates[ticker]
-
-            # Update price and recalculate P&L
-            position.current_price = current_price
-            position.market_value = current_price * position.quantity
-
-            if position.side == PositionSide.LONG:
-                position.unrealized_pnl = (
-                    current_price - position.entry_price
-                ) * position.quantity
-            else:  # SHORT
-                position.unrealized_pnl = (
-                    position.entry_price - current_price
-                ) * position.quantity
-
-            position.unrealized_pnl_pct = (
-                position.unrealized_pnl / position.cost_basis
-                if position.cost_basis
-                else Decimal("0")
-            )
-
-            position.updated_at = sim_now()
-
-            # Save to database
-            self._save_position_to_db(position)
+        # Mark all affected positions to market in one pass
+        updated = self._state.apply_prices(price_updates, updated_at=sim_now())
 
-            updated_count += 1
+        # Write-behind: one transaction per tick
+        self.flush_positions()
 
-        self.logger.debug(f"Updated {updated_count} positions with current prices")
-        return updated_count
+        self.logger.debug(f"Updated {len(updated)} positions with current prices")
+        return len(updated)
 
     async def _fetch_current_prices(self) -> Dict[str, Decimal]:
         """
@@ -762,14 +790,14 @@ class PositionManager:
 
         prices = {}
 
-        for position in self._positions.values():
+        for ticker in self._state.tickers():
             try:
                 # Placeholder - implement actual price fetching
-                price = await self.broker.get_current_price(position.ticker)
+                price = await self.broker.get_current_price(ticker)
                 if price:
-                    prices[position.ticker] = price
+                    prices[ticker] = price
             except Exception as e:
-                self.logger.warning(f"Failed to fetch price for {position.ticker}: {e}")
+                self.logger.warning(f"Failed to fetch price for {ticker}: {e}")
 
         return prices
 
@@ -780,15 +808,13 @@ class PositionManager:
         Returns:
             List of positions that hit stop loss
         """
-        triggered_positions = []
+        triggered_positions, _ = self._state.triggered()
 
-        for position in self._positions.values():
-            if position.should_stop_loss():
-                self.logger.warning(
-                    f"Stop loss triggered for {position.ticker}: "
-                    f"current=${position.current_price}, stop=${position.stop_loss_price}"
-                )
-                triggered_positions.append(position)
+        for position in triggered_positions:
+            self.logger.warning(
+                f"Stop loss triggered for {position.ticker}: "
+                f"current=${position.current_price}, stop=${position.stop_loss_price}"
+            )
 
         return triggered_positions
 
@@ -799,15 +825,13 @@ class PositionManager:
         Returns:
             List of positions that hit take profit
         """
-        triggered_positions = []
+        _, triggered_positions = self._state.triggered()
 
-        for position in self._positions.values():
-            if position.should_take_profit():
-                self.logger.info(
-                    f"Take profit triggered for {position.ticker}: "
-                    f"current=${position.current_price}, target=${position.take_profit_price}"
-                )
-                triggered_positions.append(position)
+        for position in triggered_positions:
+            self.logger.info(
+                f"Take profit triggered for {position.ticker}: "
+                f"current=${position.current_price}, target=${position.take_profit_price}"
+            )
 
         return triggered_positions
 
@@ -852,10 +876,7 @@ class PositionManager:
 
     def get_position_by_ticker(self, ticker: str) -> Optional[ManagedPosition]:
         """Get position by ticker"""
-        for position in self._positions.values():
-            if position.ticker == ticker:
-                return position
-        return None
+        return self._state.get_by_ticker(ticker)
 
     def get_all_positions(self) -> List[ManagedPosition]:
         """Get all open positions"""
@@ -919,8 +940,9 @@ class PositionManager:
             else Decimal("0")
         )
 
-        positions_at_stop_loss = sum(1 for p in positions if p.should_stop_loss())
-        positions_at_take_profit = sum(1 for p in positions if p.should_take_profit())
+        at_stop_loss, at_take_profit = self._state.triggered()
+        positions_at_stop_loss = len(at_stop_loss)
+        positions_at_take_profit = len(at_take_profit)
 
         # Average position size
         avg_position_size = (
@@ -973,7 +995,7 @@ class PositionManager:
             List of ClosedPosition objects
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 query = "SELECT * FROM closed_positions WHERE 1=1"
                 params = []
 
@@ -1011,7 +1033,7 @@ class PositionManager:
             Dictionary with performance statistics
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.execute(
                     """
                     SELECT
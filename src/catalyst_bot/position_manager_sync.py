@@ -21,10 +21,12 @@ from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from decimal import Decimal
 from pathlib import Path
-from typing import Dict, List, Optional
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional
 
 from .broker.alpaca_wrapper import AlpacaBrokerWrapper
 from .logging_utils import get_logger
+from .portfolio.portfolio_state import PortfolioState
 
 log = get_logger("position_manager")
 
@@ -126,19 +128,31 @@ class PositionManagerSync:
         self.db_path = Path(db_path)
         self._init_database()
 
-        # In-memory position cache
-        self._positions: Dict[str, ManagedPosition] = {}
+        # In-memory position state (ticker index + write-behind dirty set)
+        self._state = PortfolioState()
         self._load_positions_from_db()
 
         log.info("position_manager_initialized db=%s positions=%d",
                  self.db_path, len(self._positions))
 
+    @property
+    def _positions(self) -> Mapping[str, ManagedPosition]:
+        """Open positions keyed by position ID (read-only view of the state)."""
+        return MappingProxyType(self._state.positions)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection in WAL mode (crash-safe flush transactions)."""
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
     def _init_database(self) -> None:
         """Initialize database schema for position tracking."""
         try:
             self.db_path.parent.mkdir(parents=True, exist_ok=True)
 
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 # Create positions table
                 conn.execute("""
                     CREATE TABLE IF NOT EXISTS positions (
@@ -199,7 +213,7 @@ class PositionManagerSync:
     def _load_positions_from_db(self) -> None:
         """Load open positions from database into memory cache."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.execute("SELECT * FROM positions")
                 rows = cursor.fetchall()
 
@@ -222,18 +236,21 @@ class PositionManagerSync:
                         signal_id=row[14],
                         strategy=row[15] or "catalyst_alert",
                     )
-                    self._positions[position.position_id] = position
+                    self._state.add(position)
 
                 log.info("positions_loaded_from_db count=%d", len(rows))
 
         except Exception as e:
             log.error("load_positions_failed error=%s", str(e))
 
-    def _save_position_to_db(self, position: ManagedPosition) -> None:
-        """Save position to database."""
+    def _save_positions_to_db(self, positions: List[ManagedPosition]) -> bool:
+        """Save positions to database in a single transaction."""
+        if not positions:
+            return True
+
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute(
+            with self._connect() as conn:
+                conn.executemany(
                     """
                     INSERT OR REPLACE INTO positions (
                         position_id, ticker, quantity,
@@ -245,35 +262,69 @@ class PositionManagerSync:
                         entry_order_id, signal_id, strategy
                     ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                     """,
-                    (
-                        position.position_id,
-                        position.ticker,
-                        position.quantity,
-                        float(position.entry_price),
-                        float(position.current_price),
-                        float(position.cost_basis),
-                        float(position.market_value),
-                        float(position.unrealized_pnl),
-                        float(position.unrealized_pnl_pct),
-                        float(position.stop_loss_price) if position.stop_loss_price else None,
-                        float(position.take_profit_price) if position.take_profit_price else None,
-                        position.opened_at.isoformat(),
-                        position.updated_at.isoformat(),
-                        position.entry_order_id,
-                        position.signal_id,
-                        position.strategy,
-                    ),
+                    [
+                        (
+                            position.position_id,
+                            position.ticker,
+                            position.quantity,
+                            float(position.entry_price),
+                            float(position.current_price),
+                            float(position.cost_basis),
+                            float(position.market_value),
+                            float(position.unrealized_pnl),
+                            float(position.unrealized_pnl_pct),
+                            (
+                                float(position.stop_loss_price)
+                                if position.stop_loss_price
+                                else None
+                            ),
+                            (
+                                float(position.take_profit_price)
+                                if position.take_profit_price
+                                else None
+                            ),
+                            position.opened_at.isoformat(),
+                            position.updated_at.isoformat(),
+                            position.entry_order_id,
+                            position.signal_id,
+                            position.strategy,
+                        )
+                        for position in positions
+                    ],
                 )
                 conn.commit()
+                return True
 
         except Exception as e:
-            log.error("save_position_failed position_id=%s error=%s",
-                     position.position_id, str(e))
+            log.error(
+                "save_positions_failed count=%d error=%s", len(positions), str(e)
+            )
+            return False
+
+    def _save_position_to_db(self, position: ManagedPosition) -> None:
+        """Save position to database."""
+        self._save_positions_to_db([position])
+
+    def flush_positions(self) -> int:
+        """
+        Persist all positions changed since the last flush in one transaction.
+
+        Returns:
+            Number of positions written (failed writes stay dirty for retry)
+        """
+        dirty = self._state.take_dirty()
+        if not dirty:
+            return 0
+        if not self._save_positions_to_db(dirty):
+            for position in dirty:
+                self._state.mark_dirty(position.position_id)
+            return 0
+        return len(dirty)
 
     def _save_closed_position_to_db(self, closed: ClosedPosition) -> None:
         """Save closed position to database and remove from open positions."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 conn.execute(
                     """
                     INSERT OR REPLACE INTO closed_positions (
@@ -370,7 +421,7 @@ class PositionManagerSync:
         self._save_position_to_db(position)
 
         # Cache in memory
-        self._positions[position.position_id] = position
+        self._state.add(position)
 
         log.info(
             "position_opened ticker=%s qty=%d entry=$%.2f stop=$%.2f target=$%.2f",
@@ -441,7 +492,7 @@ class PositionManagerSync:
         self._save_closed_position_to_db(closed)
 
         # Remove from memory cache
-        del self._positions[position_id]
+        self._state.remove(position_id)
 
         return closed
 
@@ -455,39 +506,25 @@ class PositionManagerSync:
         if not self._positions:
             return 0
 
-        updated_count = 0
-
-        for position_id, position in list(self._positions.items()):
+        # One quote per ticker, however many positions share it
+        price_updates: Dict[str, Decimal] = {}
+        for ticker in self._state.tickers():
             try:
-                current_price = self.broker.get_current_price(position.ticker)
-
-                if current_price is None:
-                    continue
-
-                # Update price and recalculate P&L
-                position.current_price = current_price
-                position.market_value = current_price * position.quantity
-                position.unrealized_pnl = (current_price - position.entry_price) * position.quantity
-                position.unrealized_pnl_pct = (
-                    position.unrealized_pnl / position.cost_basis
-                    if position.cost_basis
-                    else Decimal("0")
-                )
-                position.updated_at = datetime.now()
-
-                # Save to database
-                self._save_position_to_db(position)
+                current_price = self.broker.get_current_price(ticker)
+                if current_price is not None:
+                    price_updates[ticker] = current_price
+            except Exception as e:
+                log.error("update_price_failed ticker=%s error=%s", ticker, str(e))
 
-                updated_count += 1
+        updated = self._state.apply_prices(price_updates, updated_at=datetime.now())
 
-            except Exception as e:
-                log.error("update_price_failed ticker=%s error=%s",
-                         position.ticker, str(e))
+        # Write-behind: one transaction per tick
+        self.flush_positions()
 
-        if updated_count > 0:
-            log.debug("prices_updated count=%d", updated_count)
+        if updated:
+            log.debug("prices_updated count=%d", len(updated))
 
-        return updated_count
+        return len(updated)
 
     def check_and_execute_exits(self, max_hold_hours: int = 24) -> List[ClosedPosition]:
         """
@@ -500,10 +537,13 @@ class PositionManagerSync:
             List of closed positions
         """
         closed_positions = []
+        at_stop_loss, at_take_profit = self._state.triggered()
+        stop_ids = {p.position_id for p in at_stop_loss}
+        target_ids = {p.position_id for p in at_take_profit}
 
         for position in list(self._positions.values()):
             # Check stop-loss
-            if position.should_stop_loss():
+            if position.position_id in stop_ids:
                 log.warning(
                     "stop_loss_triggered ticker=%s current=$%.2f stop=$%.2f",
                     position.ticker, position.current_price, position.stop_loss_price
@@ -514,7 +554,7 @@ class PositionManagerSync:
                 continue
 
             # Check take-profit
-            if position.should_take_profit():
+            if position.position_id in target_ids:
                 log.info(
                     "take_profit_triggered ticker=%s current=$%.2f target=$%.2f",
                     position.ticker, position.current_price, position.take_profit_price
@@ -544,7 +584,4 @@ class PositionManagerSync:
 
     def get_position_by_ticker(self, ticker: str) -> Optional[ManagedPosition]:
         """Get position by ticker symbol."""
-        for position in self._positions.values():
-            if position.ticker == ticker:
-                return position
-        return None
+        return self._state.get_by_ticker(ticker)
@@ -169,6 +169,7 @@ class SECProcessor(BaseProcessor):
             temperature=0.1,
             enable_cache=True,
             compress_prompt=True,
+            metadata={"ticker": ticker, "filing_type": "8-K"},
         )
 
         # Query LLM service
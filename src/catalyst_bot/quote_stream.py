@@ -0,0 +1,789 @@
+"""Streaming last-trade/last-quote cache.
+
+Price lookups used to go through ``market.get_last_price_snapshot``'s REST
+chain (Tiingo -> Alpha Vantage -> yfinance) on every call.  This module keeps
+a long-lived market-data websocket open instead and maintains an in-memory
+table of the latest trade and quote per ticker, so ``market`` can answer
+from a dict lookup and only fall back to REST when the streamed value is
+missing or stale.
+
+The subscribed ticker set is dynamic and capped (Alpaca's free IEX feed
+allows 30 symbols).  When over the cap, priority runs:
+
+1. tickers in open positions
+2. watchlist tickers
+3. tickers mentioned in recent news (most recent first, expiring after
+   ``QUOTE_STREAM_NEWS_TTL_MIN``)
+
+The runner refreshes these sources once per cycle through
+:func:`update_stream_tickers`.
+
+Two wire formats are supported:
+
+- ``alpaca``: Market Data v2 stream (``auth`` / ``subscribe`` actions,
+  ``T=t`` trades and ``T=q`` quotes)
+- ``finnhub``: ``{"type": "subscribe", "symbol": ...}`` with ``type=trade``
+  batches (trades only)
+
+Previous closes are not on either stream.  They are seeded through REST when
+a ticker is first subscribed, on a background thread, and kept for the
+current US/Eastern session date.
+
+Offline testing
+---------------
+With ``QUOTE_STREAM_RECORD_PATH`` set, received ticks are appended to a
+JSONL file in Alpaca message shape.  :class:`QuoteReplayServer` plays such a
+file back over a local websocket speaking the Alpaca protocol.  Point
+``QUOTE_STREAM_URL`` at it (see ``scripts/quote_replay_server.py``).
+
+Environment
+-----------
+FEATURE_QUOTE_STREAM : bool
+    Start the stream with the runner (default 0).
+QUOTE_STREAM_PROVIDER : str
+    ``alpaca`` (default) or ``finnhub``.
+QUOTE_STREAM_URL : str
+    Override the websocket URL (e.g. ``ws://127.0.0.1:8765`` for replay).
+QUOTE_STREAM_FEED : str
+    Alpaca data feed, ``iex`` (default) or ``sip``.
+QUOTE_STREAM_MAX_AGE_SEC : float
+    How long a streamed price is served before REST is used (default 30).
+QUOTE_STREAM_MAX_SYMBOLS : int
+    Subscription cap (default 30).
+QUOTE_STREAM_NEWS_TTL_MIN : float
+    Minutes a news-mentioned ticker stays subscribed (default 30).
+QUOTE_STREAM_RECORD_PATH : str
+    Append received ticks to this JSONL file (default: off).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from .logging_utils import get_logger
+from .metrics_registry import inc_counter, set_gauge
+
+log = get_logger("quote_stream")
+
+ALPACA_STREAM_URL = "wss://stream.data.alpaca.markets/v2/{feed}"
+FINNHUB_STREAM_URL = "wss://ws.finnhub.io?token={token}"
+
+DEFAULT_RECONNECT_DELAY = 1.0
+MAX_RECONNECT_DELAY = 60.0
+
+# Subscription source priorities (lower is kept first when over the cap)
+SOURCE_POSITIONS = "positions"
+SOURCE_WATCHLIST = "watchlist"
+SOURCE_NEWS = "news"
+_SOURCE_ORDER = (SOURCE_POSITIONS, SOURCE_WATCHLIST)
+
+_EASTERN = ZoneInfo("America/New_York")
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, "") or default)
+    except ValueError:
+        return default
+
+
+def stream_enabled() -> bool:
+    """True when FEATURE_QUOTE_STREAM is on."""
+    return os.getenv("FEATURE_QUOTE_STREAM", "0").strip().lower() in (
+        "1",
+        "true",
+        "yes",
+        "on",
+    )
+
+
+def _session_date() -> str:
+    return datetime.now(_EASTERN).date().isoformat()
+
+
+# ============================================================================
+# Quote table
+# ============================================================================
+
+
+@dataclass(frozen=True)
+class Quote:
+    """Latest streamed trade/quote for a ticker."""
+
+    ticker: str
+    last: Optional[float] = None
+    size: Optional[float] = None
+    bid: Optional[float] = None
+    ask: Optional[float] = None
+    trade_ts: Optional[str] = None  # provider timestamp of the last trade
+    received: float = 0.0  # time.time() when the last update arrived
+
+
+class QuoteTable:
+    """Ticker -> :class:`Quote` map, written by the stream thread.
+
+    Entries are immutable and replaced whole, so readers on other threads
+    never see a half-updated quote and need no lock.
+    """
+
+    def __init__(self, max_age: Optional[float] = None):
+        self.max_age = (
+            max_age
+            if max_age is not None
+            else _env_float("QUOTE_STREAM_MAX_AGE_SEC", 30.0)
+        )
+        self._quotes: Dict[str, Quote] = {}
+        # ticker -> (session date, previous close)
+        self._prev: Dict[str, Tuple[str, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._quotes)
+
+    def update_trade(
+        self,
+        ticker: str,
+        price: float,
+        size: Optional[float] = None,
+        ts: Optional[str] = None,
+    ) -> None:
+        old = self._quotes.get(ticker) or Quote(ticker)
+        self._quotes[ticker] = replace(
+            old, last=price, size=size, trade_ts=ts, received=time.time()
+        )
+
+    def update_quote(
+        self, ticker: str, bid: Optional[float], ask: Optional[float]
+    ) -> None:
+        old = self._quotes.get(ticker) or Quote(ticker)
+        self._quotes[ticker] = replace(old, bid=bid, ask=ask, received=time.time())
+
+    def set_prev_close(self, ticker: str, prev: Optional[float]) -> None:
+        if prev is not None:
+            self._prev[ticker] = (_session_date(), float(prev))
+
+    def prev_close(self, ticker: str) -> Optional[float]:
+        entry = self._prev.get(ticker)
+        if entry is None or entry[0] != _session_date():
+            return None
+        return entry[1]
+
+    def get(self, ticker: str) -> Optional[Quote]:
+        """The quote for ``ticker`` if one arrived within ``max_age`` seconds."""
+        quote = self._quotes.get(ticker)
+        if quote is None or time.time() - quote.received > self.max_age:
+            return None
+        return quote
+
+    def snapshot(self, ticker: str) -> Optional[Tuple[float, Optional[float]]]:
+        """``(last, prev_close)`` from fresh stream data, or None.
+
+        ``prev_close`` is None until it has been seeded for today's session.
+        """
+        quote = self.get(ticker)
+        if quote is None or quote.last is None:
+            return None
+        return quote.last, self.prev_close(ticker)
+
+    def discard(self, tickers: Iterable[str]) -> None:
+        for ticker in tickers:
+            self._quotes.pop(ticker, None)
+
+
+# ============================================================================
+# Subscription set
+# ============================================================================
+
+
+class TickerSet:
+    """Desired subscriptions from positions, watchlist and recent news."""
+
+    def __init__(self, news_ttl: Optional[float] = None):
+        self.news_ttl = (
+            news_ttl
+            if news_ttl is not None
+            else _env_float("QUOTE_STREAM_NEWS_TTL_MIN", 30.0) * 60.0
+        )
+        self._lock = threading.Lock()
+        self._sources: Dict[str, frozenset] = {}
+        self._news: Dict[str, float] = {}  # ticker -> last mention (time.time())
+        self.version = 0
+
+    def set_source(self, name: str, tickers: Iterable[str]) -> None:
+        """Replace the tickers contributed by ``name`` (positions/watchlist)."""
+        normalized = frozenset(_normalize(tickers))
+        with self._lock:
+            if self._sources.get(name) != normalized:
+                self._sources[name] = normalized
+                self.version += 1
+
+    def touch_news(self, tickers: Iterable[str]) -> None:
+        """Mark tickers as mentioned in news now."""
+        now = time.time()
+        with self._lock:
+            for ticker in _normalize(tickers):
+                if ticker not in self._news:
+                    self.version += 1
+                self._news[ticker] = now
+
+    def desired(self, limit: int) -> List[str]:
+        """Up to ``limit`` tickers in priority order."""
+        cutoff = time.time() - self.news_ttl
+        with self._lock:
+            expired = [t for t, seen in self._news.items() if seen < cutoff]
+            for ticker in expired:
+                del self._news[ticker]
+            if expired:
+                self.version += 1
+            ordered: Dict[str, None] = {}
+            for name in _SOURCE_ORDER:
+                ordered.update(dict.fromkeys(sorted(self._sources.get(name, ()))))
+            for name, tickers in sorted(self._sources.items()):
+                if name not in _SOURCE_ORDER:
+                    ordered.update(dict.fromkeys(sorted(tickers)))
+            recent = sorted(self._news.items(), key=lambda kv: kv[1], reverse=True)
+            ordered.update(dict.fromkeys(t for t, _ in recent))
+        return list(ordered)[: max(limit, 0)]
+
+
+def _normalize(tickers: Iterable[str]) -> List[str]:
+    out = []
+    for ticker in tickers or ():
+        t = str(ticker or "").strip().upper()
+        if t:
+            out.append(t)
+    return out
+
+
+# ============================================================================
+# Wire protocols
+# ============================================================================
+
+
+class AlpacaProtocol:
+    """Alpaca Market Data v2 stream (also spoken by QuoteReplayServer)."""
+
+    name = "alpaca"
+
+    def __init__(self, key: str = "", secret: str = "", url: Optional[str] = None):
+        feed = os.getenv("QUOTE_STREAM_FEED", "iex").strip() or "iex"
+        self.url = url or ALPACA_STREAM_URL.format(feed=feed)
+        self.key = key
+        self.secret = secret
+
+    async def handshake(self, ws: Any) -> None:
+        """Consume the welcome message and authenticate."""
+        await asyncio.wait_for(ws.recv(), timeout=10.0)
+        await ws.send(
+            json.dumps({"action": "auth", "key": self.key, "secret": self.secret})
+        )
+        reply = json.loads(await asyncio.wait_for(ws.recv(), timeout=10.0))
+        if not any(m.get("msg") == "authenticated" for m in reply):
+            raise ConnectionError(f"alpaca_auth_failed reply={reply}")
+
+    def subscribe(self, tickers: List[str]) -> List[str]:
+        return [
+            json.dumps({"action": "subscribe", "trades": tickers, "quotes": tickers})
+        ]
+
+    def unsubscribe(self, tickers: List[str]) -> List[str]:
+        return [
+            json.dumps({"action": "unsubscribe", "trades": tickers, "quotes": tickers})
+        ]
+
+    def parse(self, raw: str) -> List[Dict[str, Any]]:
+        """Return the trade/quote messages in ``raw`` (Alpaca shape)."""
+        messages = json.loads(raw)
+        if isinstance(messages, dict):
+            messages = [messages]
+        ticks = []
+        for m in messages:
+            kind = m.get("T")
+            if kind in ("t", "q"):
+                ticks.append(m)
+            elif kind == "error":
+                log.warning(
+                    "quote_stream_provider_error code=%s msg=%s",
+                    m.get("code"),
+                    m.get("msg"),
+                )
+        return ticks
+
+
+class FinnhubProtocol:
+    """Finnhub trade stream; ticks are converted to Alpaca trade shape."""
+
+    name = "finnhub"
+
+    def __init__(self, token: str = "", url: Optional[str] = None):
+        self.url = url or FINNHUB_STREAM_URL.format(token=token)
+
+    async def handshake(self, ws: Any) -> None:
+        return None  # token is in the URL
+
+    def subscribe(self, tickers: List[str]) -> List[str]:
+        return [json.dumps({"type": "subscribe", "symbol": t}) for t in tickers]
+
+    def unsubscribe(self, tickers: List[str]) -> List[str]:
+        return [json.dumps({"type": "unsubscribe", "symbol": t}) for t in tickers]
+
+    def parse(self, raw: str) -> List[Dict[str, Any]]:
+        message = json.loads(raw)
+        if message.get("type") != "trade":
+            return []
+        ticks = []
+        for trade in message.get("data") or ():
+            ts = trade.get("t")
+            if isinstance(ts, (int, float)):
+                ts = datetime.fromtimestamp(ts / 1000.0, tz=timezone.utc).isoformat()
+            ticks.append(
+                {
+                    "T": "t",
+                    "S": trade.get("s"),
+                    "p": trade.get("p"),
+                    "s": trade.get("v"),
+                    "t": ts,
+                }
+            )
+        return ticks
+
+
+def apply_tick(table: QuoteTable, tick: Dict[str, Any]) -> bool:
+    """Write one Alpaca-shaped tick into ``table``. Returns False if ignored."""
+    ticker = tick.get("S")
+    if not ticker:
+        return False
+    if tick.get("T") == "t":
+        price = tick.get("p")
+        if price is None:
+            return False
+        table.update_trade(ticker, float(price), tick.get("s"), tick.get("t"))
+        return True
+    if tick.get("T") == "q":
+        table.update_quote(ticker, tick.get("bp"), tick.get("ap"))
+        return True
+    return False
+
+
+# ============================================================================
+# Stream client
+# ============================================================================
+
+
+def _default_prev_close(ticker: str) -> Optional[float]:
+    from .market import get_last_price_snapshot
+
+    return get_last_price_snapshot(ticker)[1]
+
+
+class QuoteStream:
+    """Websocket subscriber that keeps a :class:`QuoteTable` current.
+
+    Runs its own asyncio loop on a daemon thread; reconnects with
+    exponential backoff and re-subscribes the current ticker set.
+    """
+
+    def __init__(
+        self,
+        protocol: Any,
+        table: Optional[QuoteTable] = None,
+        tickers: Optional[TickerSet] = None,
+        max_symbols: Optional[int] = None,
+        prev_close_fn: Optional[Callable[[str], Optional[float]]] = None,
+        record_path: Optional[str] = None,
+    ):
+        self.protocol = protocol
+        self.table = table or QuoteTable()
+        self.tickers = tickers or TickerSet()
+        self.max_symbols = (
+            max_symbols
+            if max_symbols is not None
+            else int(_env_float("QUOTE_STREAM_MAX_SYMBOLS", 30))
+        )
+        self.prev_close_fn = (
+            _default_prev_close if prev_close_fn is None else prev_close_fn
+        )
+        self.record_path = (
+            record_path
+            if record_path is not None
+            else os.getenv("QUOTE_STREAM_RECORD_PATH", "")
+        )
+        self.subscribed: List[str] = []
+        self.connected = False
+        self.stats = {"connects": 0, "ticks": 0, "subscribes": 0, "errors": 0}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._seeder = ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="quote-prev-close"
+        )
+        self._synced_version = -1
+        self._last_sync = 0.0
+
+    # -- lifecycle ---------------------------------------------------------
+
+    def start(self) -> "QuoteStream":
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=lambda: asyncio.run(self._run()),
+                name="quote-stream",
+                daemon=True,
+            )
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._seeder.shutdown(wait=False, cancel_futures=True)
+        self.connected = False
+
+    # -- lookups -----------------------------------------------------------
+
+    def snapshot(self, ticker: str) -> Optional[Tuple[float, Optional[float]]]:
+        """Fresh ``(last, prev_close)`` for ``ticker``, or None."""
+        if not self.connected:
+            return None
+        return self.table.snapshot(ticker)
+
+    # -- internals ---------------------------------------------------------
+
+    async def _run(self) -> None:
+        try:
+            import websockets
+        except ImportError:
+            log.warning("quote_stream_disabled reason=websockets_not_installed")
+            return
+
+        delay = DEFAULT_RECONNECT_DELAY
+        while not self._stop.is_set():
+            try:
+                async with websockets.connect(
+                    self.protocol.url, ping_interval=20, ping_timeout=20
+                ) as ws:
+                    await self.protocol.handshake(ws)
+                    self.connected = True
+                    self.stats["connects"] += 1
+                    inc_counter(
+                        "quote_stream_connects_total", provider=self.protocol.name
+                    )
+                    self.subscribed = []
+                    self._synced_version = -1
+                    delay = DEFAULT_RECONNECT_DELAY
+                    log.info(
+                        "quote_stream_connected provider=%s url=%s",
+                        self.protocol.name,
+                        self.protocol.url.split("?")[0],
+                    )
+                    await self._pump(ws)
+            except Exception as e:
+                self.stats["errors"] += 1
+                log.warning(
+                    "quote_stream_disconnected err=%s retry_in=%.0fs",
+                    e.__class__.__name__,
+                    delay,
+                )
+            finally:
+                self.connected = False
+                set_gauge("quote_stream_connected", 0)
+            if self._stop.wait(delay):
+                break
+            delay = min(delay * 2, MAX_RECONNECT_DELAY)
+
+    async def _pump(self, ws: Any) -> None:
+        set_gauge("quote_stream_connected", 1)
+        record = (
+            open(self.record_path, "a", encoding="utf-8") if self.record_path else None
+        )
+        try:
+            while not self._stop.is_set():
+                await self._sync_subscriptions(ws)
+                try:
+                    raw = await asyncio.wait_for(ws.recv(), timeout=0.5)
+                except asyncio.TimeoutError:
+                    continue
+                for tick in self.protocol.parse(raw):
+                    if apply_tick(self.table, tick):
+                        self.stats["ticks"] += 1
+                        if record is not None:
+                            record.write(json.dumps(tick) + "\n")
+        finally:
+            if record is not None:
+                record.close()
+
+    async def _sync_subscriptions(self, ws: Any) -> None:
+        # desired() also expires news tickers, so besides reacting to changes
+        # it runs about once a second
+        now = time.monotonic()
+        if self.tickers.version == self._synced_version and now - self._last_sync < 1.0:
+            return
+        self._last_sync = now
+        desired = self.tickers.desired(self.max_symbols)
+        self._synced_version = self.tickers.version
+        current = set(self.subscribed)
+        add = [t for t in desired if t not in current]
+        remove = [t for t in self.subscribed if t not in set(desired)]
+        if remove:
+            for message in self.protocol.unsubscribe(remove):
+                await ws.send(message)
+            self.table.discard(remove)
+        if add:
+            for message in self.protocol.subscribe(add):
+                await ws.send(message)
+            self.stats["subscribes"] += 1
+            for ticker in add:
+                if self.table.prev_close(ticker) is None:
+                    self._seeder.submit(self._seed_prev_close, ticker)
+        self.subscribed = desired
+        set_gauge("quote_stream_symbols", len(desired))
+
+    def _seed_prev_close(self, ticker: str) -> None:
+        try:
+            self.table.set_prev_close(ticker, self.prev_close_fn(ticker))
+        except Exception as e:
+            log.debug("quote_stream_prev_close_failed ticker=%s err=%s", ticker, e)
+
+
+# ============================================================================
+# Local replay server
+# ============================================================================
+
+
+class QuoteReplayServer:
+    """Local websocket server that replays recorded ticks (Alpaca protocol).
+
+    ``ticks`` is a JSONL path or a list of Alpaca-shaped tick dicts (as
+    written by ``QUOTE_STREAM_RECORD_PATH``).  After a client subscribes,
+    ticks for its symbols are sent in order, spaced by their recorded
+    timestamps divided by ``speed`` (``speed=0`` sends them back to back).
+    """
+
+    def __init__(
+        self,
+        ticks: Any,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        speed: float = 0.0,
+        loop_forever: bool = False,
+    ):
+        if isinstance(ticks, (str, os.PathLike)):
+            with open(ticks, "r", encoding="utf-8") as f:
+                ticks = [json.loads(line) for line in f if line.strip()]
+        self.ticks: List[Dict[str, Any]] = list(ticks)
+        self.host = host
+        self.port = port
+        self.speed = speed
+        self.loop_forever = loop_forever
+        self._ready = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stopped: Optional[asyncio.Future] = None
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}"
+
+    def start(self) -> "QuoteReplayServer":
+        """Serve on a background thread; returns once the port is bound."""
+        self._thread = threading.Thread(
+            target=lambda: asyncio.run(self.serve()),
+            name="quote-replay",
+            daemon=True,
+        )
+        self._thread.start()
+        if not self._ready.wait(10):
+            raise RuntimeError("quote replay server did not start")
+        return self
+
+    def stop(self) -> None:
+        if self._loop is not None and self._stopped is not None:
+            self._loop.call_soon_threadsafe(
+                lambda: self._stopped.done() or self._stopped.set_result(None)
+            )
+        if self._thread is not None:
+            self._thread.join(5)
+
+    async def serve(self) -> None:
+        import websockets
+
+        self._loop = asyncio.get_running_loop()
+        self._stopped = self._loop.create_future()
+        async with websockets.serve(self._handle, self.host, self.port) as server:
+            self.port = server.sockets[0].getsockname()[1]
+            self._ready.set()
+            log.info("quote_replay_serving url=%s ticks=%d", self.url, len(self.ticks))
+            await self._stopped
+
+    async def _handle(self, ws: Any) -> None:
+        symbols: set = set()
+        player: Optional[asyncio.Task] = None
+        await ws.send(json.dumps([{"T": "success", "msg": "connected"}]))
+        try:
+            async for raw in ws:
+                request = json.loads(raw)
+                action = request.get("action")
+                if action == "auth":
+                    await ws.send(
+                        json.dumps([{"T": "success", "msg": "authenticated"}])
+                    )
+                elif action in ("subscribe", "unsubscribe"):
+                    changed = set(request.get("trades") or ()) | set(
+                        request.get("quotes") or ()
+                    )
+                    if action == "subscribe":
+                        symbols |= changed
+                    else:
+                        symbols -= changed
+                    await ws.send(
+                        json.dumps(
+                            [
+                                {
+                                    "T": "subscription",
+                                    "trades": sorted(symbols),
+                                    "quotes": sorted(symbols),
+                                }
+                            ]
+                        )
+                    )
+                    if player is None:
+                        player = asyncio.create_task(self._play(ws, symbols))
+        finally:
+            if player is not None:
+                player.cancel()
+
+    async def _play(self, ws: Any, symbols: set) -> None:
+        while True:
+            previous: Optional[float] = None
+            for tick in self.ticks:
+                if self.speed > 0:
+                    ts = _tick_epoch(tick)
+                    if previous is not None and ts is not None:
+                        await asyncio.sleep(max(ts - previous, 0) / self.speed)
+                    previous = ts if ts is not None else previous
+                if tick.get("S") in symbols:
+                    await ws.send(json.dumps([tick]))
+                else:
+                    await asyncio.sleep(0)
+            if not self.loop_forever:
+                return
+
+
+def _tick_epoch(tick: Dict[str, Any]) -> Optional[float]:
+    ts = tick.get("t")
+    if not ts:
+        return None
+    try:
+        # Alpaca timestamps carry nanoseconds; fromisoformat takes up to micro
+        text = str(ts).replace("Z", "+00:00")
+        if "." in text:
+            head, _, rest = text.partition(".")
+            digits = "".join(c for c in rest if c.isdigit())
+            text = f"{head}.{digits[:6]}{rest[len(digits):]}"
+        return datetime.fromisoformat(text).timestamp()
+    except ValueError:
+        return None
+
+
+# ============================================================================
+# Process-wide stream
+# ============================================================================
+
+_stream: Optional[QuoteStream] = None
+_stream_lock = threading.Lock()
+
+
+def _protocol_from_env(settings: Any = None) -> Any:
+    provider = os.getenv("QUOTE_STREAM_PROVIDER", "alpaca").strip().lower()
+    url = os.getenv("QUOTE_STREAM_URL", "").strip() or None
+    if provider == "finnhub":
+        token = getattr(settings, "finnhub_api_key", "") or os.getenv(
+            "FINNHUB_API_KEY", ""
+        )
+        return FinnhubProtocol(token, url=url)
+    key = getattr(settings, "alpaca_api_key", "") or os.getenv("ALPACA_API_KEY", "")
+    secret = getattr(settings, "alpaca_api_secret", "") or os.getenv(
+        "ALPACA_API_SECRET", ""
+    )
+    return AlpacaProtocol(key, secret, url=url)
+
+
+def start_quote_stream(settings: Any = None, **kwargs: Any) -> QuoteStream:
+    """Start (once) and return the process-wide quote stream."""
+    global _stream
+    with _stream_lock:
+        if _stream is None:
+            _stream = QuoteStream(_protocol_from_env(settings), **kwargs).start()
+        return _stream
+
+
+def stop_quote_stream() -> None:
+    global _stream
+    with _stream_lock:
+        if _stream is not None:
+            _stream.stop()
+            _stream = None
+
+
+def get_quote_stream() -> Optional[QuoteStream]:
+    """The running stream, or None when streaming is off."""
+    return _stream
+
+
+def update_stream_tickers(
+    watchlist: Optional[Iterable[str]] = None,
+    positions: Optional[Iterable[str]] = None,
+    news: Optional[Iterable[str]] = None,
+) -> None:
+    """Refresh the subscription sources; a no-op when no stream is running."""
+    stream = _stream
+    if stream is None:
+        return
+    if watchlist is not None:
+        stream.tickers.set_source(SOURCE_WATCHLIST, watchlist)
+    if positions is not None:
+        stream.tickers.set_source(SOURCE_POSITIONS, positions)
+    if news is not None:
+        stream.tickers.touch_news(news)
+
+
+def stream_snapshot(ticker: str) -> Optional[Tuple[float, Optional[float]]]:
+    """Fresh streamed ``(last, prev_close)`` for ``ticker``, or None."""
+    stream = _stream
+    if stream is None:
+        return None
+    return stream.snapshot(ticker)
+
+
+def remember_prev_close(ticker: str, prev: Optional[float]) -> None:
+    """Cache a REST-derived previous close for streamed lookups."""
+    stream = _stream
+    if stream is not None:
+        stream.table.set_prev_close(ticker, prev)
+
+
+__all__ = [
+    "AlpacaProtocol",
+    "FinnhubProtocol",
+    "Quote",
+    "QuoteReplayServer",
+    "QuoteStream",
+    "QuoteTable",
+    "TickerSet",
+    "apply_tick",
+    "get_quote_stream",
+    "remember_prev_close",
+    "start_quote_stream",
+    "stop_quote_stream",
+    "stream_enabled",
+    "stream_snapshot",
+    "update_stream_tickers",
+]
@@ -9,7 +9,8 @@ Key Features:
 - Filing text chunking (512 tokens per chunk)
 - Embedding generation using sentence-transformers
 - LLM-powered Q&A with retrieved context
-- Per-ticker indexing with metadata filtering
+- Per-ticker partitions searched exactly; optional HNSW/IVF global index
+- Append-only chunk metadata and vector storage
 
 Environment Variables:
 - RAG_ENABLED: Enable RAG system (default: true)
@@ -17,6 +18,9 @@ Environment Variables:
 - RAG_INDEX_PATH: Path to index storage (default: data/rag_index/)
 - RAG_MAX_CONTEXT_CHUNKS: Max chunks to retrieve (default: 3)
 - RAG_ANSWER_MAX_TOKENS: Max LLM response length (default: 150)
+- RAG_INDEX_TYPE: Global index type: flat, hnsw or ivf (default: flat)
+- RAG_ANN_MIN_VECTORS: Vectors before hnsw/ivf replaces flat (default: 20000)
+- RAG_ENCODE_BATCH_SIZE: Encoder batch size when indexing (default: 64)
 
 Example:
     >>> rag = SECFilingRAG()
@@ -34,6 +38,7 @@ References:
 from __future__ import annotations
 
 import hashlib
+import json
 import os
 import pickle
 from dataclasses import dataclass, field
@@ -44,13 +49,16 @@ from typing import Optional
 try:
     import faiss
     import numpy as np
-    from sentence_transformers import SentenceTransformer
 
     FAISS_AVAILABLE = True
 except ImportError:
     FAISS_AVAILABLE = False
     faiss = None
     np = None
+
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:
     SentenceTransformer = None
 
 try:
@@ -77,6 +85,8 @@ DEFAULT_CHUNK_OVERLAP = 50  # tokens
 DEFAULT_MAX_CONTEXT_CHUNKS = 3
 DEFAULT_ANSWER_MAX_TOKENS = 150
 EMBEDDING_MODEL = "all-MiniLM-L6-v2"  # 384-dimensional embeddings
+DEFAULT_ENCODE_BATCH_SIZE = 64
+DEFAULT_ANN_MIN_VECTORS = 20000  # below this a flat scan is fast enough
 
 
 # ============================================================================
@@ -187,12 +197,26 @@ def chunk_text(
 
 
 class SECFilingRAG:
-    """RAG system for SEC filing question answering."""
+    """
+    RAG system for SEC filing question answering.
+
+    Storage is append-only: ``chunks.jsonl`` holds chunk metadata and
+    ``vectors.f32`` the matching float32 embeddings, one row per chunk. Row
+    numbers double as FAISS ids, so a hit resolves to its chunk through an
+    array lookup. Indexes are rebuilt from these files on startup.
+
+    Searches with a ticker scan only that ticker's rows (exact, so rare
+    tickers always return their chunks). Searches without a ticker use the
+    global index, which switches to HNSW or IVF once it holds
+    RAG_ANN_MIN_VECTORS vectors if RAG_INDEX_TYPE asks for it.
+    """
 
     def __init__(
         self,
         index_path: Optional[str] = None,
         embedding_model: str = EMBEDDING_MODEL,
+        encoder=None,
+        index_type: Optional[str] = None,
     ):
         """
         Initialize RAG system.
@@ -203,13 +227,19 @@ class SECFilingRAG:
             Path to store index (default: data/rag_index/)
         embedding_model : str
             Sentence-transformers model name
+        encoder : object, optional
+            Pre-built encoder exposing ``encode`` and
+            ``get_sentence_embedding_dimension`` (default: load
+            ``embedding_model``)
+        index_type : str, optional
+            Global index type: flat, hnsw or ivf (default: RAG_INDEX_TYPE)
 
         Raises
         ------
         ImportError
             If FAISS or sentence-transformers not available
         """
-        if not FAISS_AVAILABLE:
+        if not FAISS_AVAILABLE or (encoder is None and SentenceTransformer is None):
             raise ImportError(
                 "FAISS and sentence-transformers required for RAG system. "
                 "Install with: pip install faiss-cpu sentence-transformers"
@@ -219,43 +249,87 @@ class SECFilingRAG:
             index_path or os.getenv("RAG_INDEX_PATH", DEFAULT_INDEX_PATH)
         )
         self.index_path.mkdir(parents=True, exist_ok=True)
+        self.index_type = (index_type or os.getenv("RAG_INDEX_TYPE", "flat")).lower()
+        self.ann_min_vectors = int(
+            os.getenv("RAG_ANN_MIN_VECTORS", DEFAULT_ANN_MIN_VECTORS)
+        )
 
         # Initialize sentence transformer for embeddings
-        log.info(f"Loading embedding model: {embedding_model}")
-        self.encoder = SentenceTransformer(embedding_model)
+        if encoder is None:
+            log.info(f"Loading embedding model: {embedding_model}")
+            encoder = SentenceTransformer(embedding_model)
+        self.encoder = encoder
         self.embedding_dim = self.encoder.get_sentence_embedding_dimension()
 
-        # Initialize FAISS index
-        self.index = self._load_or_create_index()
+        # Array-backed id -> chunk table; row i holds FAISS id i
+        self._chunk_table: list[FilingChunk] = []
+        self._vector_buffer = np.zeros((0, self.embedding_dim), dtype="float32")
+        self._ticker_rows: dict[str, list[int]] = {}
+
+        # Metadata lookup (chunk_id -> FilingChunk)
+        self.chunks: dict[str, FilingChunk] = {}
 
-        # Metadata storage (chunk_id -> FilingChunk)
-        self.chunks: dict[str, FilingChunk] = self._load_chunks()
+        self._load_store()
+        self.index = self._build_global_index()
 
         log.info(
             f"RAG system initialized: {len(self.chunks)} chunks indexed, "
-            f"embedding_dim={self.embedding_dim}"
+            f"embedding_dim={self.embedding_dim} index_type={self._global_kind}"
         )
 
-    def _load_or_create_index(self) -> faiss.Index:
-        """Load existing FAISS index or create new one."""
-        index_file = self.index_path / "faiss.index"
-
-        if index_file.exists():
-            try:
-                index = faiss.read_index(str(index_file))
-                log.info(f"Loaded existing FAISS index: {index.ntotal} vectors")
-                return index
-            except Exception as e:
-                log.warning(f"Failed to load index: {e}, creating new one")
-
-        # Create new index (Inner Product for cosine similarity with normalized vectors)
-        index = faiss.IndexFlatIP(self.embedding_dim)
-        log.info(f"Created new FAISS index (dim={self.embedding_dim})")
-        return index
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    @property
+    def _chunks_file(self) -> Path:
+        return self.index_path / "chunks.jsonl"
+
+    @property
+    def _vectors_file(self) -> Path:
+        return self.index_path / "vectors.f32"
+
+    def _load_store(self) -> None:
+        """Load chunk metadata and vectors, migrating the pickle layout."""
+        if not self._chunks_file.exists() and (self.index_path / "chunks.pkl").exists():
+            self._migrate_legacy_store()
+            return
+
+        chunks: list[FilingChunk] = []
+        if self._chunks_file.exists():
+            with open(self._chunks_file, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        chunks.append(FilingChunk.from_dict(json.loads(line)))
+                    except Exception as e:
+                        # Torn final line from an interrupted append
+                        log.warning(f"Skipping unreadable chunk record: {e}")
+                        break
+
+        vectors = np.zeros((0, self.embedding_dim), dtype="float32")
+        if self._vectors_file.exists():
+            raw = np.fromfile(self._vectors_file, dtype="float32")
+            rows = raw.size // self.embedding_dim
+            vectors = raw[: rows * self.embedding_dim].reshape(rows, self.embedding_dim)
+
+        # Vectors are appended before metadata; keep only complete pairs
+        count = min(len(chunks), len(vectors))
+        if count != len(chunks) or count != len(vectors):
+            log.warning(
+                f"RAG store mismatch chunks={len(chunks)} vectors={len(vectors)}, "
+                f"truncating to {count}"
+            )
+            self._rewrite_store(chunks[:count], vectors[:count])
+        self._register(chunks[:count], vectors[:count])
+        if count:
+            log.info(f"Loaded {count} chunks from {self.index_path}")
 
-    def _load_chunks(self) -> dict[str, FilingChunk]:
+    def _migrate_legacy_store(self) -> None:
         """
-        Load chunk metadata from disk.
+        Convert faiss.index + chunks.pkl to the append-only layout.
 
         Security Note:
             This loads pickle files from application-controlled index directory.
@@ -264,37 +338,168 @@ class SECFilingRAG:
         """
         chunks_file = self.index_path / "chunks.pkl"
 
-        if chunks_file.exists():
-            # Validate chunks file is within expected directory (path traversal protection)
-            try:
-                chunks_file.resolve().relative_to(self.index_path.resolve())
-            except ValueError:
-                log.warning(f"chunks_path_traversal_attempt path={chunks_file}")
-                return {}
+        # Validate chunks file is within expected directory (path traversal protection)
+        try:
+            chunks_file.resolve().relative_to(self.index_path.resolve())
+        except ValueError:
+            log.warning(f"chunks_path_traversal_attempt path={chunks_file}")
+            return
 
+        try:
+            with open(chunks_file, "rb") as f:
+                legacy: dict[str, FilingChunk] = pickle.load(f)
+        except Exception as e:
+            log.warning(f"Failed to load chunks: {e}, starting fresh")
+            return
+
+        legacy_index = None
+        index_file = self.index_path / "faiss.index"
+        if index_file.exists():
             try:
-                with open(chunks_file, "rb") as f:
-                    chunks = pickle.load(f)
-                log.info(f"Loaded {len(chunks)} chunk metadata")
-                return chunks
+                legacy_index = faiss.read_index(str(index_file))
             except Exception as e:
-                log.warning(f"Failed to load chunks: {e}, starting fresh")
+                log.warning(f"Failed to load legacy index: {e}")
+
+        chunks, vectors = [], []
+        for position, chunk in enumerate(legacy.values()):
+            embedding = chunk.embedding
+            if embedding is None and legacy_index is not None:
+                if position < legacy_index.ntotal:
+                    embedding = legacy_index.reconstruct(position)
+            if embedding is None:
+                continue
+            chunk.embedding = None
+            chunks.append(chunk)
+            vectors.append(np.asarray(embedding, dtype="float32"))
+
+        matrix = (
+            np.vstack(vectors)
+            if vectors
+            else np.zeros((0, self.embedding_dim), dtype="float32")
+        )
+        self._rewrite_store(chunks, matrix)
+        self._register(chunks, matrix)
+        log.info(f"Migrated {len(chunks)} legacy chunks to append-only store")
+
+    def _rewrite_store(self, chunks: list[FilingChunk], vectors) -> None:
+        """Replace both store files (migration and repair only)."""
+        tmp_vectors = self._vectors_file.with_suffix(".f32.tmp")
+        tmp_chunks = self._chunks_file.with_suffix(".jsonl.tmp")
+        np.ascontiguousarray(vectors, dtype="float32").tofile(tmp_vectors)
+        with open(tmp_chunks, "w", encoding="utf-8") as f:
+            for chunk in chunks:
+                f.write(json.dumps(chunk.to_dict()) + "\n")
+        os.replace(tmp_vectors, self._vectors_file)
+        os.replace(tmp_chunks, self._chunks_file)
+
+    def _append_to_store(self, chunks: list[FilingChunk], vectors) -> None:
+        """Append new chunks; cost is proportional to the new rows only."""
+        try:
+            with open(self._vectors_file, "ab") as f:
+                f.write(np.ascontiguousarray(vectors, dtype="float32").tobytes())
+            with open(self._chunks_file, "a", encoding="utf-8") as f:
+                f.write("".join(json.dumps(c.to_dict()) + "\n" for c in chunks))
+        except Exception as e:
+            log.error(f"Failed to persist chunks: {e}")
+
+    # ------------------------------------------------------------------
+    # In-memory tables and indexes
+    # ------------------------------------------------------------------
+
+    @property
+    def _vectors(self):
+        """Stored embeddings; row i belongs to ``_chunk_table[i]``."""
+        return self._vector_buffer[: len(self._chunk_table)]
+
+    def _register(self, chunks: list[FilingChunk], vectors) -> None:
+        """Add chunks to the id table, ticker partitions and vector matrix."""
+        start = len(self._chunk_table)
+        end = start + len(chunks)
+        if end > len(self._vector_buffer):
+            # Grow geometrically so appends are amortized O(new rows)
+            grown = np.zeros(
+                (max(end, 2 * len(self._vector_buffer), 1024), self.embedding_dim),
+                dtype="float32",
+            )
+            grown[:start] = self._vector_buffer[:start]
+            self._vector_buffer = grown
+        self._vector_buffer[start:end] = vectors
 
-        return {}
+        for offset, chunk in enumerate(chunks):
+            self._chunk_table.append(chunk)
+            self.chunks[chunk.chunk_id] = chunk
+            self._ticker_rows.setdefault(chunk.ticker, []).append(start + offset)
+
+    def _build_global_index(self):
+        """Build the global id-mapped index over every stored vector."""
+        count = len(self._vectors)
+        kind = self.index_type if count >= self.ann_min_vectors else "flat"
+
+        if kind == "hnsw":
+            base = faiss.IndexHNSWFlat(
+                self.embedding_dim,
+                int(os.getenv("RAG_HNSW_M", "32")),
+                faiss.METRIC_INNER_PRODUCT,
+            )
+            base.hnsw.efSearch = int(os.getenv("RAG_HNSW_EF_SEARCH", "64"))
+        elif kind == "ivf":
+            nlist = int(os.getenv("RAG_IVF_NLIST", "0")) or int(4 * count**0.5)
+            nlist = max(1, min(nlist, count))
+            quantizer = faiss.IndexFlatIP(self.embedding_dim)
+            base = faiss.IndexIVFFlat(
+                quantizer, self.embedding_dim, nlist, faiss.METRIC_INNER_PRODUCT
+            )
+            base.train(self._vectors)
+            base.nprobe = int(os.getenv("RAG_IVF_NPROBE", "8"))
+            self._ivf_quantizer = quantizer  # keep alive alongside the index
+        else:
+            kind = "flat"
+            base = faiss.IndexFlatIP(self.embedding_dim)
+
+        index = faiss.IndexIDMap2(base)
+        if count:
+            index.add_with_ids(self._vectors, np.arange(count, dtype="int64"))
+        self._global_base = base
+        self._global_kind = kind
+        return index
 
-    def _save_index(self):
-        """Save FAISS index and metadata to disk."""
-        try:
-            faiss.write_index(self.index, str(self.index_path / "faiss.index"))
+    # ------------------------------------------------------------------
+    # Indexing
+    # ------------------------------------------------------------------
+
+    def _make_chunks(self, filing_section, summary: str, keywords) -> list[FilingChunk]:
+        """Chunk one filing into FilingChunk objects (embeddings not set)."""
+        chunks_text = chunk_text(filing_section.text)
 
-            with open(self.index_path / "chunks.pkl", "wb") as f:
-                pickle.dump(self.chunks, f)
+        if not chunks_text:
+            log.warning(f"No chunks generated for {filing_section.ticker}")
+            return []
 
-            log.info(
-                f"Saved index: {self.index.ntotal} vectors, {len(self.chunks)} chunks"
+        filing_chunks = []
+        for i, text_chunk in enumerate(chunks_text):
+            chunk_id = hashlib.md5(
+                f"{filing_section.ticker}{filing_section.filing_url}{i}".encode()
+            ).hexdigest()
+
+            filing_chunks.append(
+                FilingChunk(
+                    chunk_id=chunk_id,
+                    ticker=filing_section.ticker,
+                    filing_type=filing_section.filing_type,
+                    filing_url=filing_section.filing_url,
+                    filed_at=datetime.now(
+                        timezone.utc
+                    ),  # Would use actual filing date if available
+                    chunk_index=i,
+                    text=text_chunk,
+                    metadata={
+                        "summary": summary,
+                        "keywords": keywords or [],
+                        "catalyst_type": filing_section.catalyst_type,
+                    },
+                )
             )
-        except Exception as e:
-            log.error(f"Failed to save index: {e}")
+        return filing_chunks
 
     def index_filing(
         self,
@@ -326,60 +531,68 @@ class SECFilingRAG:
         >>> rag.index_filing(filings[0], summary="...", keywords=["earnings"])
         5  # 5 chunks indexed
         """
-        # Chunk the filing text
-        chunks_text = chunk_text(filing_section.text)
-
-        if not chunks_text:
-            log.warning(f"No chunks generated for {filing_section.ticker}")
-            return 0
+        return self.index_filings([(filing_section, summary, keywords)])
 
-        log.info(
-            f"Indexing {filing_section.ticker} {filing_section.filing_type}: "
-            f"{len(chunks_text)} chunks"
-        )
-
-        # Create FilingChunk objects
-        filing_chunks = []
-        for i, text_chunk in enumerate(chunks_text):
-            chunk_id = hashlib.md5(
-                f"{filing_section.ticker}{filing_section.filing_url}{i}".encode()
-            ).hexdigest()
-
-            chunk = FilingChunk(
-                chunk_id=chunk_id,
-                ticker=filing_section.ticker,
-                filing_type=filing_section.filing_type,
-                filing_url=filing_section.filing_url,
-                filed_at=datetime.now(
-                    timezone.utc
-                ),  # Would use actual filing date if available
-                chunk_index=i,
-                text=text_chunk,
-                metadata={
-                    "summary": summary,
-                    "keywords": keywords or [],
-                    "catalyst_type": filing_section.catalyst_type,
-                },
-            )
+    def index_filings(self, filings: list[tuple]) -> int:
+        """
+        Index several filings with one batched encoder call.
 
-            filing_chunks.append(chunk)
+        Parameters
+        ----------
+        filings : list of tuple
+            ``(filing_section, summary, keywords)`` per filing
 
-        # Generate embeddings
-        chunk_texts = [c.text for c in filing_chunks]
-        embeddings = self.encoder.encode(chunk_texts, normalize_embeddings=True)
+        Returns
+        -------
+        int
+            Number of new chunks indexed. Chunks already in the index
+            (same ticker, URL and position) are skipped.
+        """
+        new_chunks: list[FilingChunk] = []
+        seen = set(self.chunks)
+        for filing_section, summary, keywords in filings:
+            filing_chunks = self._make_chunks(filing_section, summary, keywords)
+            fresh = [c for c in filing_chunks if c.chunk_id not in seen]
+            seen.update(c.chunk_id for c in fresh)
+            if filing_chunks:
+                log.info(
+                    f"Indexing {filing_section.ticker} {filing_section.filing_type}: "
+                    f"{len(fresh)}/{len(filing_chunks)} new chunks"
+                )
+            new_chunks.extend(fresh)
 
-        # Add to FAISS index
-        self.index.add(embeddings.astype("float32"))
+        if not new_chunks:
+            return 0
 
-        # Store chunk metadata
-        for chunk, embedding in zip(filing_chunks, embeddings):
-            chunk.embedding = embedding
-            self.chunks[chunk.chunk_id] = chunk
+        # Generate embeddings (one batched call for all filings)
+        embeddings = np.asarray(
+            self.encoder.encode(
+                [c.text for c in new_chunks],
+                batch_size=int(
+                    os.getenv("RAG_ENCODE_BATCH_SIZE", DEFAULT_ENCODE_BATCH_SIZE)
+                ),
+                normalize_embeddings=True,
+            ),
+            dtype="float32",
+        )
 
-        # Save to disk
-        self._save_index()
+        self._append_to_store(new_chunks, embeddings)
+        start = len(self._chunk_table)
+        self._register(new_chunks, embeddings)
+
+        # Switch to the configured ANN index once the corpus is large enough
+        if self._global_kind == "flat" and self.index_type != "flat":
+            if len(self._vectors) >= self.ann_min_vectors:
+                self.index = self._build_global_index()
+                return len(new_chunks)
+        self.index.add_with_ids(
+            embeddings, np.arange(start, start + len(new_chunks), dtype="int64")
+        )
+        return len(new_chunks)
 
-        return len(filing_chunks)
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
 
     def search(
         self,
@@ -415,39 +628,33 @@ class SECFilingRAG:
             top_k = int(os.getenv("RAG_MAX_CONTEXT_CHUNKS", DEFAULT_MAX_CONTEXT_CHUNKS))
 
         # Generate query embedding
-        query_embedding = self.encoder.encode([query], normalize_embeddings=True)
-
-        # Search FAISS index
-        similarities, indices = self.index.search(
-            query_embedding.astype("float32"), top_k * 2
-        )  # Get extra for filtering
-
-        # Convert to SearchResults
-        results = []
-        for rank, (similarity, idx) in enumerate(
-            zip(similarities[0], indices[0]), start=1
-        ):
-            if idx == -1:  # FAISS returns -1 for empty slots
-                continue
-
-            # Get chunk by index
-            chunk_id = list(self.chunks.keys())[idx]
-            chunk = self.chunks[chunk_id]
-
-            # Filter by ticker if specified
-            if ticker and chunk.ticker != ticker:
-                continue
-
-            results.append(
-                SearchResult(
-                    chunk=chunk,
-                    similarity=float(similarity),
-                    rank=rank,
-                )
-            )
+        query_embedding = np.asarray(
+            self.encoder.encode([query], normalize_embeddings=True), dtype="float32"
+        )
 
-            if len(results) >= top_k:
-                break
+        if ticker:
+            # Exact scan of the ticker's own partition
+            rows = np.asarray(self._ticker_rows.get(ticker, []), dtype="int64")
+            if rows.size == 0:
+                log.info(f"Search query='{query[:50]}...' no chunks for {ticker}")
+                return []
+            scores = self._vectors[rows] @ query_embedding[0]
+            k = min(top_k, rows.size)
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            hits = [(float(scores[i]), int(rows[i])) for i in top]
+        else:
+            similarities, ids = self.index.search(query_embedding, top_k)
+            hits = [
+                (float(s), int(i))
+                for s, i in zip(similarities[0], ids[0])
+                if i != -1  # FAISS returns -1 for empty slots
+            ]
+
+        results = [
+            SearchResult(chunk=self._chunk_table[row], similarity=score, rank=rank)
+            for rank, (score, row) in enumerate(hits, start=1)
+        ]
 
         log.info(f"Search query='{query[:50]}...' returned {len(results)} results")
         return results
@@ -520,8 +727,10 @@ class SECFilingRAG:
         # Call LLM (using hybrid router)
         try:
             from .llm_hybrid import query_hybrid_llm
+            from .llm_scheduler import INTERACTIVE, llm_priority
 
-            answer = await query_hybrid_llm(prompt, priority="high")
+            with llm_priority(INTERACTIVE):
+                answer = await query_hybrid_llm(prompt, priority="high")
 
             if answer:
                 log.info(f"RAG answered query for {ticker}: {query[:50]}...")
@@ -535,13 +744,12 @@ class SECFilingRAG:
 
     def get_stats(self) -> dict:
         """Get RAG system statistics."""
-        ticker_counts = {}
-        for chunk in self.chunks.values():
-            ticker_counts[chunk.ticker] = ticker_counts.get(chunk.ticker, 0) + 1
+        ticker_counts = {t: len(rows) for t, rows in self._ticker_rows.items()}
 
         return {
             "total_chunks": len(self.chunks),
             "total_vectors": self.index.ntotal,
+            "index_type": self._global_kind,
             "unique_tickers": len(ticker_counts),
             "top_tickers": sorted(
                 ticker_counts.items(), key=lambda x: x[1], reverse=True
@@ -591,7 +799,7 @@ def get_rag() -> Optional[SECFilingRAG]:
         log.debug("RAG system disabled via configuration")
         return None
 
-    if not FAISS_AVAILABLE:
+    if not FAISS_AVAILABLE or SentenceTransformer is None:
         log.warning("RAG system unavailable: FAISS not installed")
         return None
 
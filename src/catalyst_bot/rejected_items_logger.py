@@ -20,10 +20,13 @@ Updated: 2026-01-06 (Added MOA outcome tracking integration)
 
 import json
 from collections import OrderedDict
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+from .ngram_store import CLASS_REJECTED, record_logged_title
+from .partitioned_jsonl import PartitionedJsonlLog, get_log, has_records
+
 # Price range filter: only log items within this range
 PRICE_FLOOR = 0.10
 PRICE_CEILING = 10.00
@@ -34,6 +37,11 @@ _DEDUPE_CACHE: OrderedDict[tuple, bool] = OrderedDict()
 _DEDUPE_CACHE_MAX_SIZE = 10_000  # Keep last 10k rejections (~ 1-2 days at high volume)
 
 
+def _item_log() -> PartitionedJsonlLog:
+    """Buffered, day-partitioned log under data/rejected_items/."""
+    return get_log(Path("data/rejected_items.jsonl"), ("rejection_reason",))
+
+
 def should_log_rejected_item(price: Optional[float]) -> bool:
     """
     Determine if a rejected item should be logged based on price range.
@@ -103,7 +111,10 @@ def log_rejected_item(
     scored: Optional[Any] = None,
 ) -> None:
     """
-    Log a rejected item to data/rejected_items.jsonl with deduplication.
+    Log a rejected item to data/rejected_items/<day>.jsonl with deduplication.
+
+    Records are buffered and written once per cycle (or when the buffer
+    fills); see partitioned_jsonl.
 
     Uses a bounded LRU cache to prevent duplicate logging of the same rejection
     event within 1-minute windows. This prevents log file bloat when the same
@@ -203,13 +214,11 @@ def log_rejected_item(
             # Silently ignore regime extraction errors
             pass
 
-    # Write to JSONL file
-    log_path = Path("data/rejected_items.jsonl")
-    log_path.parent.mkdir(parents=True, exist_ok=True)
-
+    # Buffer into the day-partitioned log (flushed once per cycle)
     try:
-        with open(log_path, "a", encoding="utf-8") as f:
-            f.write(json.dumps(rejected_item, ensure_ascii=False) + "\n")
+        _item_log().append(rejected_item)
+        # Keep the MOA keyword-mining n-gram tables current
+        record_logged_title(CLASS_REJECTED, rejected_item["title"], rejected_item["ts"])
     except Exception:
         # Silently fail - don't crash the bot if logging fails
         pass
@@ -243,33 +252,25 @@ def get_rejection_stats() -> Dict[str, int]:
     """
     Get statistics about rejected items logged today.
 
+    Reads the day's summary sidecar (plus unflushed records and any of today's
+    lines in the legacy flat file) instead of rescanning the log.
+
     Returns:
         Dict with counts by rejection reason
     """
-    log_path = Path("data/rejected_items.jsonl")
-
-    if not log_path.exists():
+    item_log = _item_log()
+    if not has_records(item_log.legacy_path) and not item_log.pending():
         return {}
 
-    today = datetime.now(timezone.utc).date().isoformat()
-    stats: Dict[str, int] = {}
-
     try:
-        with open(log_path, "r", encoding="utf-8") as f:
-            for line in f:
-                try:
-                    item = json.loads(line.strip())
-                    ts = item.get("ts", "")
-
-                    # Only count today's items
-                    if ts.startswith(today):
-                        reason = item.get("rejection_reason", "UNKNOWN")
-                        stats[reason] = stats.get(reason, 0) + 1
-                except Exception:
-                    continue
+        summary = item_log.day_summary()
     except Exception:
         return {}
 
+    stats: Dict[str, int] = {}
+    for reason, count in summary.get("rejection_reason", {}).items():
+        key = reason or "UNKNOWN"
+        stats[key] = stats.get(key, 0) + count
     return stats
 
 
@@ -277,20 +278,29 @@ def clear_old_rejected_items(days_to_keep: int = 30) -> int:
     """
     Remove rejected items older than specified days.
 
+    Day partitions older than the cutoff are deleted whole; the legacy flat
+    file, if present, is filtered line by line.
+
     Args:
         days_to_keep: Number of days to retain (default 30)
 
     Returns:
         Number of items removed
     """
-    log_path = Path("data/rejected_items.jsonl")
+    cutoff_dt = datetime.now(timezone.utc) - timedelta(days=days_to_keep)
+    item_log = _item_log()
+    try:
+        removed_count = item_log.drop_days_before(cutoff_dt.date())
+    except Exception:
+        removed_count = 0
 
+    log_path = item_log.legacy_path
     if not log_path.exists():
-        return 0
+        return removed_count
 
-    cutoff = datetime.now(timezone.utc).timestamp() - (days_to_keep * 86400)
+    cutoff = cutoff_dt.timestamp()
     kept_items = []
-    removed_count = 0
+    legacy_removed = 0
 
     try:
         with open(log_path, "r", encoding="utf-8") as f:
@@ -305,16 +315,16 @@ def clear_old_rejected_items(days_to_keep: int = 30) -> int:
                     if ts.timestamp() >= cutoff:
                         kept_items.append(line)
                     else:
-                        removed_count += 1
+                        legacy_removed += 1
                 except Exception:
                     # Keep items we can't parse
                     kept_items.append(line)
 
         # Rewrite file with kept items
-        if removed_count > 0:
+        if legacy_removed > 0:
             with open(log_path, "w", encoding="utf-8") as f:
                 f.writelines(kept_items)
     except Exception:
-        return 0
+        return removed_count
 
-    return removed_count
+    return removed_count + legacy_removed
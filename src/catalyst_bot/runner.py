@@ -76,6 +76,15 @@ from pathlib import Path
 import requests
 
 from . import alerts as _alerts  # used to post log digests as embeds
+from . import (
+    charts,
+    cycle_profiler,
+    feed_scheduler,
+    intraday_features,
+    partitioned_jsonl,
+    quote_stream,
+    sharding,
+)
 from .admin_reporter import send_admin_report_if_scheduled  # Nightly admin reports
 from .alerts import send_alert_safe
 from .analyzer import run_analyzer_once_if_scheduled
@@ -84,6 +93,12 @@ from .breakout_feedback import (  # Real-time outcome tracking
     register_alert_for_tracking,
     track_pending_outcomes,
 )
+from .cache_registry import (
+    bounded_cache,
+    format_cache_summary,
+    get_cache_registry,
+    maybe_snapshot_allocations,
+)
 from .classify import fast_classify, load_dynamic_keyword_weights
 from .config import get_settings
 from .config_extras import LOG_REPORT_CATEGORIES
@@ -97,6 +112,13 @@ from .log_reporter import deliver_report
 from .logging_utils import get_logger, setup_logging
 from .market import sample_alpaca_stream
 from .market_hours import get_market_info  # WAVE 0.0 Phase 2: Market hours detection
+from .metrics_registry import (
+    get_registry,
+    inc_counter,
+    observe,
+    sample_process_metrics,
+    set_gauge,
+)
 from .moa_price_tracker import (
     track_pending_outcomes as track_moa_outcomes,  # MOA Phase 2: Price tracking for rejected items
 )
@@ -138,7 +160,10 @@ except Exception:
 logging.getLogger("yfinance").setLevel(logging.CRITICAL)
 
 STOP = False
-_PX_CACHE: Dict[str, Tuple[float, float]] = {}
+# ticker -> (price, expires_at); LRU-bounded so it can live across cycles
+_PX_CACHE = bounded_cache(
+    "runner.price", max_entries=int(os.getenv("PX_CACHE_MAX_ENTRIES", "2000"))
+)
 
 # WEEK 1 FIX: Network failure detection - Track consecutive empty cycles
 _CONSECUTIVE_EMPTY_CYCLES = 0
@@ -432,6 +457,28 @@ def price_snapshot(ticker: str) -> float | None:
 # ============================================================================
 
 
+# Position gauges older than this are ignored and Alpaca is queried instead.
+_TRADING_GAUGE_MAX_AGE_S = 900
+
+
+def _get_trading_gauges() -> Tuple[int, str, str] | None:
+    """
+    Read the portfolio gauges published after each cycle's position update.
+
+    Returns:
+        (position_count, daily_pnl, portfolio_value) formatted for display,
+        or None when the gauges are missing or stale
+    """
+    registry = get_registry()
+    max_age = _TRADING_GAUGE_MAX_AGE_S
+    positions = registry.gauge("trading_open_positions").get(max_age=max_age)
+    equity = registry.gauge("trading_portfolio_value").get(max_age=max_age)
+    if positions is None or equity is None:
+        return None
+    pnl = registry.gauge("trading_unrealized_pnl").get(0.0, max_age=max_age)
+    return int(positions), f"${pnl:,.2f}", f"${equity:,.2f}"
+
+
 def _get_trading_engine_data() -> Dict[str, Any]:
     """
     Get TradingEngine portfolio metrics and status.
@@ -457,52 +504,58 @@ def _get_trading_engine_data() -> Dict[str, Any]:
         daily_pnl = "—"
         status = "Initialized"
 
-        # Try to get positions and portfolio directly from Alpaca
-        # This is the source of truth - local PositionManager may miss async fills
-        try:
-            import os
-
-            from alpaca.trading.client import TradingClient
+        # Prefer the gauges published after each cycle's position update;
+        # only fall back to an Alpaca round trip when they are stale.
+        published = _get_trading_gauges()
+        if published is not None:
+            position_count, daily_pnl, portfolio_value = published
+        else:
+            try:
+                # Try to get positions and portfolio directly from Alpaca
+                # This is the source of truth - local PositionManager may miss async fills
+                import os
 
-            api_key = os.getenv("ALPACA_API_KEY", "").strip()
-            api_secret = (
-                os.getenv("ALPACA_SECRET", "").strip()
-                or os.getenv("ALPACA_API_SECRET", "").strip()
-            )
+                from alpaca.trading.client import TradingClient
 
-            if api_key and api_secret:
-                # Create a sync client for this one-off call
-                sync_client = TradingClient(api_key, api_secret, paper=True)
+                api_key = os.getenv("ALPACA_API_KEY", "").strip()
+                api_secret = (
+                    os.getenv("ALPACA_SECRET", "").strip()
+                    or os.getenv("ALPACA_API_SECRET", "").strip()
+                )
 
-                # Get actual positions from Alpaca (source of truth)
-                alpaca_positions = sync_client.get_all_positions()
-                position_count = len(alpaca_positions)
+                if api_key and api_secret:
+                    # Create a sync client for this one-off call
+                    sync_client = TradingClient(api_key, api_secret, paper=True)
 
-                # Calculate daily P&L from Alpaca positions
-                if alpaca_positions:
-                    total_pnl = sum(
-                        float(pos.unrealized_pl) for pos in alpaca_positions
-                    )
-                    daily_pnl = f"${total_pnl:,.2f}"
+                    # Get actual positions from Alpaca (source of truth)
+                    alpaca_positions = sync_client.get_all_positions()
+                    position_count = len(alpaca_positions)
 
-                # Get account equity
-                account = sync_client.get_account()
-                portfolio_value = f"${float(account.equity):,.2f}"
+                    # Calculate daily P&L from Alpaca positions
+                    if alpaca_positions:
+                        total_pnl = sum(
+                            float(pos.unrealized_pl) for pos in alpaca_positions
+                        )
+                        daily_pnl = f"${total_pnl:,.2f}"
 
-        except Exception:
-            # Fallback to local position manager if Alpaca call fails
-            try:
-                if trading_engine.position_manager and hasattr(
-                    trading_engine.position_manager, "get_all_positions"
-                ):
-                    positions = trading_engine.position_manager.get_all_positions()
-                    position_count = len(positions)
+                    # Get account equity
+                    account = sync_client.get_account()
+                    portfolio_value = f"${float(account.equity):,.2f}"
 
-                    # Calculate daily P&L from positions
-                    total_pnl = sum(float(pos.unrealized_pnl) for pos in positions)
-                    daily_pnl = f"${total_pnl:,.2f}"
             except Exception:
-                pass  # Keep default values
+                # Fallback to local position manager if Alpaca call fails
+                try:
+                    if trading_engine.position_manager and hasattr(
+                        trading_engine.position_manager, "get_all_positions"
+                    ):
+                        positions = trading_engine.position_manager.get_all_positions()
+                        position_count = len(positions)
+
+                        # Calculate daily P&L from positions
+                        total_pnl = sum(float(pos.unrealized_pnl) for pos in positions)
+                        daily_pnl = f"${total_pnl:,.2f}"
+                except Exception:
+                    pass  # Keep default values
 
         # Check circuit breaker status
         circuit_breaker_status = (
@@ -535,31 +588,30 @@ def _get_llm_usage_hourly() -> Dict[str, Any]:
         Dictionary with request counts, token counts, and cost estimates
     """
     try:
-        from datetime import datetime, timedelta, timezone
-
-        # Get hourly stats (last 60 minutes)
-        now = datetime.now(timezone.utc)
-        hour_ago = now - timedelta(hours=1)
-        hourly_stats = get_monitor().get_stats(since=hour_ago, until=now)
+        # Hourly figures come from the windowed LLM counters that
+        # llm_usage_monitor updates on every call
+        registry = get_registry()
+        requests_ctr = registry.counter("llm_requests_total")
+        input_ctr = registry.counter("llm_input_tokens_total")
+        output_ctr = registry.counter("llm_output_tokens_total")
 
         # Get daily stats
         daily_stats = get_monitor().get_daily_stats()
 
-        # Count by provider
-        gemini_count = hourly_stats.gemini.total_requests
-        claude_count = hourly_stats.anthropic.total_requests
-        local_count = hourly_stats.local.total_requests
-
         return {
-            "total_requests": hourly_stats.total_requests,
-            "gemini_count": gemini_count,
-            "claude_count": claude_count,
-            "local_count": local_count,
-            "input_tokens": hourly_stats.gemini.total_input_tokens
-            + hourly_stats.anthropic.total_input_tokens,
-            "output_tokens": hourly_stats.gemini.total_output_tokens
-            + hourly_stats.anthropic.total_output_tokens,
-            "hourly_cost": hourly_stats.total_cost,
+            "total_requests": int(requests_ctr.window_total()),
+            "gemini_count": int(requests_ctr.window_total(provider="gemini")),
+            "claude_count": int(requests_ctr.window_total(provider="anthropic")),
+            "local_count": int(requests_ctr.window_total(provider="local")),
+            "input_tokens": int(
+                input_ctr.window_total(provider="gemini")
+                + input_ctr.window_total(provider="anthropic")
+            ),
+            "output_tokens": int(
+                output_ctr.window_total(provider="gemini")
+                + output_ctr.window_total(provider="anthropic")
+            ),
+            "hourly_cost": registry.counter("llm_cost_usd_total").window_total(),
             "daily_cost": daily_stats.total_cost,
         }
     except Exception:
@@ -794,42 +846,24 @@ def _get_system_resources() -> str:
         Formatted string with memory and CPU usage
     """
     try:
-        import os
-
+        # Sampled once per cycle by sample_process_metrics(); reading the
+        # gauges avoids a blocking cpu_percent() call in the heartbeat.
+        registry = get_registry()
         lines = []
 
-        # Memory usage via /proc/self/status (Linux)
-        try:
-            with open("/proc/self/status", "r") as f:
-                for line in f:
-                    if line.startswith("VmRSS:"):
-                        # Resident memory in KB
-                        kb = int(line.split()[1])
-                        mb = kb / 1024
-                        emoji = "🟢" if mb < 500 else "🟡" if mb < 1000 else "🔴"
-                        lines.append(f"{emoji} Memory: {mb:.0f} MB")
-                        break
-        except Exception:
-            # Fallback: try psutil if available
-            try:
-                import psutil
-
-                process = psutil.Process(os.getpid())
-                mb = process.memory_info().rss / (1024 * 1024)
-                emoji = "🟢" if mb < 500 else "🟡" if mb < 1000 else "🔴"
-                lines.append(f"{emoji} Memory: {mb:.0f} MB")
-            except Exception:
-                pass
+        mb = registry.gauge("process_rss_mb").get()
+        if mb is not None:
+            emoji = "🟢" if mb < 500 else "🟡" if mb < 1000 else "🔴"
+            lines.append(f"{emoji} Memory: {mb:.0f} MB")
 
-        # CPU usage (requires psutil)
-        try:
-            import psutil
-
-            cpu_pct = psutil.Process(os.getpid()).cpu_percent(interval=0.1)
+        cpu_pct = registry.gauge("process_cpu_percent").get()
+        if cpu_pct is not None:
             emoji = "🟢" if cpu_pct < 50 else "🟡" if cpu_pct < 80 else "🔴"
             lines.append(f"{emoji} CPU: {cpu_pct:.0f}%")
-        except Exception:
-            pass
+
+        caches = format_cache_summary(get_cache_registry().report())
+        if caches:
+            lines.append(f"🗃️ {caches}")
 
         return "\n".join(lines) if lines else "—"
     except Exception:
@@ -961,6 +995,7 @@ def _track_feed_source(source: str) -> None:
             return
 
         source_lower = source.lower()
+        inc_counter("feed_items_total", source=source_lower)
 
         # Classify source type
         if source_lower.startswith("sec_"):
@@ -1015,6 +1050,8 @@ def _track_error(level: str, category: str, message: str) -> None:
         if len(ERROR_TRACKER) > 100:
             ERROR_TRACKER = ERROR_TRACKER[-100:]
 
+        inc_counter("errors_total", level=level, category=category)
+
     except Exception:
         pass  # Silent fail - error tracking shouldn't cause errors
 
@@ -2056,24 +2093,8 @@ def _is_sec_source(source: str) -> bool:
     return (source or "").lower() in SEC_SOURCES
 
 
-def _cycle(log, settings, market_info: dict | None = None) -> None:
-    """One ingest→dedupe→enrich→classify→alert pass with clean skip behavior.
-
-    Parameters
-    ----------
-    log : Logger
-        Logger instance
-    settings : Settings
-        Bot settings
-    market_info : dict, optional
-        Market hours information from get_market_info(). If provided and
-        market hours detection is enabled, features will be gated based on
-        market status.
-    """
-    # Track errors in this cycle for heartbeat accumulator
-    cycle_errors = 0
-
-    # Initialize seen store for this cycle (fixed: check-only, mark after success)
+def _open_seen_store(log):
+    """Open the persistent seen store (None when disabled or unavailable)."""
     seen_store = None
     try:
         import os
@@ -2103,9 +2124,21 @@ def _cycle(log, settings, market_info: dict | None = None) -> None:
                 seen_store = SeenStore()
     except Exception:
         log.warning("seen_store_init_failed", exc_info=True)
+    return seen_store
+
+
+def _ingest_items(log, settings, seen_store, market_info: dict | None = None):
+    """Fetch, dedupe and ticker-enrich one cycle's feed items.
+
+    Returns ``(items, deduped, errors)``: the raw fetched items, the deduped
+    list (plus scanner events) ready for classification, and the number of
+    errors recorded while fetching.
+    """
+    cycle_errors = 0
 
     # Ingest + dedupe
     # Pass seen_store to enable SEC filing pre-filtering before LLM enrichment
+    cycle_profiler.phase("fetch")
     try:
         items = feeds.fetch_pr_feeds(seen_store=seen_store)
     except Exception as e:
@@ -2114,13 +2147,19 @@ def _cycle(log, settings, market_info: dict | None = None) -> None:
         cycle_errors += 1
         items = []
 
+    cycle_profiler.phase("dedupe")
     deduped = feeds.dedupe(items)
 
     # ------------------------------------------------------------------
     # WEEK 1 FIX: Network failure detection - Track consecutive empty cycles
     # and alert if feed sources appear to be down.
     global _CONSECUTIVE_EMPTY_CYCLES
-    if not items or len(items) == 0:
+    # Under the adaptive feed scheduler an empty pass is normal (sources
+    # not due yet or unchanged); only count it when every poll failed.
+    _sched = feed_scheduler.active_scheduler()
+    if _sched is not None and not items and _sched.cycle_quiet():
+        pass
+    elif not items or len(items) == 0:
         _CONSECUTIVE_EMPTY_CYCLES += 1
 
         if _CONSECUTIVE_EMPTY_CYCLES >= _MAX_EMPTY_CYCLES:
@@ -2161,6 +2200,7 @@ def _cycle(log, settings, market_info: dict | None = None) -> None:
         _CONSECUTIVE_EMPTY_CYCLES = 0
 
     # ------------------------------------------------------------------
+    cycle_profiler.phase("scanners")
     # Watchlist cascade decay: demote HOT→WARM→COOL entries based on age
     # before processing any new events.  This uses a JSON state file
     # separate from the static watchlist CSV.  When the cascade feature
@@ -2227,6 +2267,7 @@ def _cycle(log, settings, market_info: dict | None = None) -> None:
         pass
 
     # Enrich tickers where missing
+    cycle_profiler.phase("enrich_ticker")
     for it in deduped:
         enrich_ticker(it, it)
 
@@ -2257,7 +2298,52 @@ def _cycle(log, settings, market_info: dict | None = None) -> None:
             "warning", "Data", f"News velocity tracking failed: {str(e)[:80]}"
         )
 
+    return items, deduped, cycle_errors
+
+
+def _cycle(
+    log, settings, market_info: dict | None = None, items: list | None = None
+) -> None:
+    """One ingest→dedupe→enrich→classify→alert pass with clean skip behavior.
+
+    Parameters
+    ----------
+    log : Logger
+        Logger instance
+    settings : Settings
+        Bot settings
+    market_info : dict, optional
+        Market hours information from get_market_info(). If provided and
+        market hours detection is enabled, features will be gated based on
+        market status.
+    items : list, optional
+        Already ingested items to classify and alert on. Shard workers of
+        the multi-process runner receive their batch this way; when omitted
+        the cycle fetches and enriches its own items.
+    """
+    # Track errors in this cycle for heartbeat accumulator
+    cycle_errors = 0
+
+    # Initialize seen store for this cycle (fixed: check-only, mark after success)
+    seen_store = _open_seen_store(log)
+
+    if items is None:
+        items, deduped, cycle_errors = _ingest_items(
+            log, settings, seen_store, market_info
+        )
+        if sharding.role() == sharding.ROLE_INGEST:
+            # Sharded runner: workers classify and alert on the items
+            cycle_profiler.phase("dispatch")
+            sharding.dispatch(deduped, market_info, seen_store=seen_store)
+            _heartbeat_acc.add_cycle(scanned=0, alerts=0, errors=cycle_errors)
+            return
+    else:
+        deduped = list(items)
+    # Shard workers leave seen-store writes to the delivery process
+    seen_store = sharding.wrap_seen_store(seen_store)
+
     # Dynamic keyword weights (with on-disk fallback)
+    cycle_profiler.phase("prepare")
     dyn_weights, dyn_loaded, dyn_path_str, dyn_path_exists = (
         _load_dynamic_weights_with_fallback(log)
     )
@@ -2322,6 +2408,7 @@ def _cycle(log, settings, market_info: dict | None = None) -> None:
     tickers_missing = len(deduped) - tickers_present
 
     # PERFORMANCE OPTIMIZATION: Batch-fetch all prices at once (10-20x faster than sequential)
+    cycle_profiler.phase("price_batch")
     # Collect all unique tickers that need price lookups
     all_tickers = list(
         set(it.get("ticker") for it in deduped if (it.get("ticker") or "").strip())
@@ -2347,6 +2434,30 @@ def _cycle(log, settings, market_info: dict | None = None) -> None:
             cycle_errors += 1
             price_cache = {}
 
+    # Warm shared intraday feature snapshots (RVOL/VWAP/divergence) and the
+    # chart pattern scan for unseen candidates in bulk while the items are
+    # filtered.
+    scan_patterns = bool(charts.pattern_overlay_kinds())
+    if (intraday_features.engine_enabled() or scan_patterns) and all_tickers:
+        candidates = set()
+        for it in deduped:
+            tkr = (it.get("ticker") or "").strip().upper()
+            if not tkr or tkr in candidates:
+                continue
+            try:
+                if seen_store and seen_store.is_seen(it.get("id") or ""):
+                    continue
+            except Exception:
+                pass
+            px = (price_cache.get(tkr) or (None, None))[0]
+            if px is not None and price_ceiling is not None and px > price_ceiling:
+                continue
+            candidates.add(tkr)
+        if candidates:
+            intraday_features.prefetch_features(candidates, wait=False)
+            if scan_patterns:
+                charts.prescan_chart_patterns(candidates, wait=False)
+
     skipped_no_ticker = 0
     skipped_crypto = 0
     skipped_ticker_relevance = 0
@@ -2384,7 +2495,24 @@ def _cycle(log, settings, market_info: dict | None = None) -> None:
         log.debug("watchlist_load_failed err=%s", e.__class__.__name__)
         watchlist_tickers = set()
 
+    # Keep the streaming quote subscriptions in step with this cycle
+    if quote_stream.get_quote_stream() is not None:
+        try:
+            position_tickers = []
+            engine = globals().get("trading_engine")
+            manager = getattr(engine, "position_manager", None)
+            if manager is not None and hasattr(manager, "get_all_positions"):
+                position_tickers = [p.ticker for p in manager.get_all_positions()]
+            quote_stream.update_stream_tickers(
+                watchlist=watchlist_tickers,
+                positions=position_tickers,
+                news=[it.get("ticker") for it in deduped if it.get("ticker")],
+            )
+        except Exception as e:
+            log.debug("quote_stream_update_failed err=%s", e.__class__.__name__)
+
     # WAVE 4: Batch SEC LLM Processing - Parallel keyword extraction
+    cycle_profiler.phase("sec_batch")
     # Collect all SEC filings for batch processing (eliminates serial asyncio.run() bottleneck)
     sec_llm_cache = {}
     sec_filings_to_process = []
@@ -2483,6 +2611,8 @@ def _cycle(log, settings, market_info: dict | None = None) -> None:
             sec_llm_cache = {}
 
     # Sort by timestamp descending (newest first) to prioritize breaking news
+    cycle_profiler.phase("items")
+
     def get_timestamp(item):
         """Extract timestamp for sorting, defaulting to epoch for items without ts."""
         ts_str = item.get("ts")
@@ -3274,10 +3404,11 @@ def _cycle(log, settings, market_info: dict | None = None) -> None:
         # WAVE 3: Fast classify (keywords, sentiment, ML) - NO market enrichment
         # Market data (RVOL, float, VWAP, divergence) deferred until after filtering
         try:
-            scored = fast_classify(
-                item=market.NewsItem.from_feed_dict(it),  # type: ignore[attr-defined]
-                keyword_weights=dyn_weights,
-            )
+            with cycle_profiler.span("classify"):
+                scored = fast_classify(
+                    item=market.NewsItem.from_feed_dict(it),  # type: ignore[attr-defined]
+                    keyword_weights=dyn_weights,
+                )
         except (AttributeError, KeyError, TypeError, ValueError) as err:
             # CRITICAL FIX: Handle specific exceptions for better debugging
             log.warning(
@@ -3495,32 +3626,35 @@ def _cycle(log, settings, market_info: dict | None = None) -> None:
         # Enrichment (RVOL, float, VWAP, divergence) must complete before alert
         # This ensures alerts show all market data fields
         enriched_scored = scored  # Default to non-enriched if enrichment fails
-        try:
-            news_item = market.NewsItem.from_feed_dict(it)  # type: ignore[attr-defined]
-            enrichment_task_id = enqueue_for_enrichment(scored, news_item)
-            log.debug(
-                "enrichment_queued ticker=%s task_id=%s", ticker, enrichment_task_id
-            )
-
-            # CRITICAL: Wait for enrichment to complete before sending alert
-            # This allows alerts to show Price, Float, Volume, RVol, RSI, etc.
-            enriched_result = get_enriched_item(enrichment_task_id, timeout=5.0)
-            if enriched_result:
-                enriched_scored = enriched_result
+        with cycle_profiler.span("enrich"):
+            try:
+                news_item = market.NewsItem.from_feed_dict(it)  # type: ignore[attr-defined]
+                enrichment_task_id = enqueue_for_enrichment(scored, news_item)
                 log.debug(
-                    "enrichment_completed ticker=%s task_id=%s",
-                    ticker,
-                    enrichment_task_id,
+                    "enrichment_queued ticker=%s task_id=%s", ticker, enrichment_task_id
                 )
-            else:
+
+                # CRITICAL: Wait for enrichment to complete before sending alert
+                # This allows alerts to show Price, Float, Volume, RVol, RSI, etc.
+                enriched_result = get_enriched_item(enrichment_task_id, timeout=5.0)
+                if enriched_result:
+                    enriched_scored = enriched_result
+                    log.debug(
+                        "enrichment_completed ticker=%s task_id=%s",
+                        ticker,
+                        enrichment_task_id,
+                    )
+                else:
+                    log.warning(
+                        "enrichment_timeout ticker=%s task_id=%s timeout=5.0s",
+                        ticker,
+                        enrichment_task_id,
+                    )
+            except Exception as enrich_err:
+                # Don't block alerts if enrichment fails - send with basic data
                 log.warning(
-                    "enrichment_timeout ticker=%s task_id=%s timeout=5.0s",
-                    ticker,
-                    enrichment_task_id,
+                    "enrichment_failed ticker=%s err=%s", ticker, str(enrich_err)
                 )
-        except Exception as enrich_err:
-            # Don't block alerts if enrichment fails - send with basic data
-            log.warning("enrichment_failed ticker=%s err=%s", ticker, str(enrich_err))
 
         # Build a payload the new alerts API understands
         # Use enriched_scored (which has market data) instead of scored
@@ -3548,7 +3682,12 @@ def _cycle(log, settings, market_info: dict | None = None) -> None:
         # Send (or record-only) alert with compatibility shim
         try:
             # Prefer the new signature: send_alert_safe(payload)
-            ok = send_alert_safe(alert_payload)
+            with cycle_profiler.span("alert"):
+                if sharding.role() == sharding.ROLE_WORKER:
+                    # The delivery process posts it (and owns rate limits)
+                    ok = sharding.forward_alert(alert_payload)
+                else:
+                    ok = send_alert_safe(alert_payload)
         except TypeError as type_err:
             # Fall back to the legacy keyword-args signature
             log.debug("alert_signature_fallback err=%s", str(type_err))
@@ -3782,6 +3921,12 @@ def _cycle(log, settings, market_info: dict | None = None) -> None:
             log.info("alert_skip source=%s ticker=%s", source, ticker)
 
     # Final cycle metrics
+    cycle_profiler.phase("finalize")
+    # One write per day file for the cycle's accepted/rejected items
+    try:
+        partitioned_jsonl.flush_all()
+    except Exception as e:
+        log.warning("item_log_flush_failed err=%s", e.__class__.__name__)
     # Use a single log line for compatibility with upstream monitoring; update
     # LAST_CYCLE_STATS to expose counts for the heartbeat embed.
     log.info(
@@ -3846,6 +3991,7 @@ def _cycle(log, settings, market_info: dict | None = None) -> None:
             "deduped": len(deduped),
             "skipped": skipped_total,
             "alerts": alerted,
+            "errors": cycle_errors,
         }
         # Add this cycle's counts to the cumulative totals
         try:
@@ -3856,6 +4002,13 @@ def _cycle(log, settings, market_info: dict | None = None) -> None:
         except Exception:
             # ensure totals exist; fallback silently
             pass
+        # Mirror the cycle counts into the metrics registry
+        inc_counter("cycle_items_total", len(items))
+        inc_counter("cycle_deduped_total", len(deduped))
+        inc_counter("cycle_skipped_total", skipped_total)
+        inc_counter("alerts_sent_total", alerted)
+        set_gauge("cycle_last_items", len(items))
+        set_gauge("cycle_last_alerts", alerted)
         # WAVE ALPHA Agent 1: Update heartbeat accumulator with cycle stats
         try:
             _heartbeat_acc.add_cycle(
@@ -4064,14 +4217,13 @@ def _cycle(log, settings, market_info: dict | None = None) -> None:
         pass
 
     # ---------------------------------------------------------------------
-    # WEEK 1 FIX: Clear price cache to prevent memory leak
-    # The global _PX_CACHE dict grows unbounded without cleanup.
-    # Clear it at the end of each cycle to prevent 10MB+ growth over 24 hours.
-    global _PX_CACHE
-    cache_size = len(_PX_CACHE)
-    if cache_size > 0:
-        _PX_CACHE.clear()
-        log.debug("price_cache_cleared entries=%d", cache_size)
+    # Module-level caches are bounded by the cache registry; drop expired
+    # entries and publish sizes for the heartbeat and /metrics.
+    try:
+        get_cache_registry().sweep()
+        get_cache_registry().publish_metrics()
+    except Exception:
+        pass
 
 
 def _set_process_priority(log, settings) -> None:
@@ -4390,8 +4542,36 @@ def _run_moa_nightly_if_scheduled(log, settings) -> None:
     log.info("moa_nightly_thread_started")
 
 
+def _apply_shard_stats(stats: List[Dict[str, Any]]) -> None:
+    """Fold the shard workers' batch counts into the heartbeat totals."""
+    global LAST_CYCLE_STATS
+    if not stats:
+        return
+    merged = {
+        key: sum(int(s.get(key, 0) or 0) for s in stats)
+        for key in ("items", "deduped", "skipped", "alerts", "errors")
+    }
+    LAST_CYCLE_STATS = {k: v for k, v in merged.items() if k != "errors"}
+    for key in TOTAL_STATS:
+        TOTAL_STATS[key] += merged[key]
+    _heartbeat_acc.total_scanned += merged["items"]
+    _heartbeat_acc.total_alerts += merged["alerts"]
+    _heartbeat_acc.total_errors += merged["errors"]
+    _heartbeat_acc.total_deduped += merged["deduped"]
+    _heartbeat_acc.total_skipped += merged["skipped"]
+    inc_counter("cycle_items_total", merged["items"])
+    inc_counter("cycle_deduped_total", merged["deduped"])
+    inc_counter("cycle_skipped_total", merged["skipped"])
+    inc_counter("alerts_sent_total", merged["alerts"])
+    set_gauge("cycle_last_items", merged["items"])
+    set_gauge("cycle_last_alerts", merged["alerts"])
+
+
 def runner_main(
-    once: bool = False, loop: bool = False, sleep_s: float | None = None
+    once: bool = False,
+    loop: bool = False,
+    sleep_s: float | None = None,
+    workers: int | None = None,
 ) -> int:
     global FEEDBACK_AVAILABLE
     global trading_engine
@@ -4401,6 +4581,17 @@ def runner_main(
     setup_logging(settings.log_level)
     log = get_logger("runner")
 
+    # Record feed items, quotes, LLM responses and SEC documents into a
+    # fixture bundle for scripts/benchmark_cycle_replay.py
+    record_dir = os.getenv("CYCLE_REPLAY_RECORD_DIR", "").strip()
+    if record_dir:
+        try:
+            from .simulation.cycle_replay import BundleRecorder
+
+            BundleRecorder(record_dir).install()
+        except Exception as e:
+            log.warning("cycle_replay_record_init_failed err=%s", str(e))
+
     # =========================================================================
     # SIMULATION MODE: Auto-initialize mock providers for full pipeline testing
     # =========================================================================
@@ -4550,6 +4741,15 @@ def runner_main(
         except Exception as e:
             log.warning("health_endpoint_failed err=%s", str(e))
 
+    # Streaming quote cache: serves price lookups for the watchlist, open
+    # positions and recently mentioned tickers without REST round-trips
+    if quote_stream.stream_enabled():
+        try:
+            quote_stream.start_quote_stream(settings)
+            log.info("quote_stream_started")
+        except Exception as e:
+            log.warning("quote_stream_start_failed err=%s", str(e))
+
     # Manual Capture Listener (Jan 2026)
     # Monitors a dedicated Discord channel for user-submitted missed opportunities
     if getattr(settings, "feature_manual_capture", False):
@@ -4689,6 +4889,16 @@ def runner_main(
                 "warning", "Discord", f"Startup test alert failed: {str(test_err)[:80]}"
             )
 
+    # Sharded runner: classification and alerting move to shard worker
+    # processes; this process keeps ingest, scheduling and heartbeats
+    shard_workers = sharding.configured_workers() if workers is None else workers
+    if shard_workers > 0:
+        try:
+            sharding.start_pool(shard_workers)
+            log.info("sharded_runner_enabled workers=%d", shard_workers)
+        except Exception as e:
+            log.warning("shard_pool_start_failed err=%s", str(e))
+
     do_loop = loop or (not once)
     sleep_interval = float(sleep_s if sleep_s is not None else settings.loop_seconds)
 
@@ -4827,8 +5037,7 @@ def runner_main(
                     _MOA_OUTCOME_LAST_UPDATE = now
                     if updated > 0:
                         log.info(
-                            "moa_outcome_tracking_cycle "
-                            "updated=%d completed=%d",
+                            "moa_outcome_tracking_cycle updated=%d completed=%d",
                             updated,
                             completed,
                         )
@@ -4884,6 +5093,9 @@ def runner_main(
                 continue
 
         t0 = time.time()
+        trace = cycle_profiler.start_cycle(
+            int(get_registry().counter("cycles_total").total()) + 1
+        )
         try:
             _cycle(log, settings, market_info=current_market_info)
         except Exception as e:
@@ -4891,8 +5103,18 @@ def runner_main(
             _record_and_track_error(
                 "error", "Cycle", f"Main cycle error: {str(e)[:80]}"
             )
+        finally:
+            cycle_profiler.finish_cycle(trace)
+        if sharding.active_pool() is not None:
+            _apply_shard_stats(sharding.drain_stats())
+            sharding.supervise()
         cycle_time = time.time() - t0
         log.info("CYCLE_DONE took=%.2fs", cycle_time)
+        observe("cycle_duration_seconds", cycle_time)
+        set_gauge("cycle_last_duration_seconds", cycle_time)
+        inc_counter("cycles_total")
+        sample_process_metrics()
+        maybe_snapshot_allocations(int(get_registry().counter("cycles_total").total()))
 
         # Update health status after successful cycle
         try:
@@ -4910,6 +5132,11 @@ def runner_main(
             try:
                 # Run async position update using run_async (persistent event loop)
                 metrics = run_async(trading_engine.update_positions(), timeout=10.0)
+                if "error" not in metrics:
+                    set_gauge("trading_open_positions", metrics.get("positions", 0))
+                    set_gauge("trading_unrealized_pnl", metrics.get("pnl", 0.0))
+                    if "account_value" in metrics:
+                        set_gauge("trading_portfolio_value", metrics["account_value"])
                 if metrics.get("positions", 0) > 0:
                     log.info(
                         "portfolio_update positions=%d exposure=$%.2f pnl=$%.2f",
@@ -4921,6 +5148,13 @@ def runner_main(
                 # Never crash the bot - just log position update errors
                 log.error("position_update_error err=%s", str(e), exc_info=True)
 
+        # Publish the snapshot read by the heartbeat, /health/detailed and
+        # /admin stats until the next cycle completes
+        try:
+            get_registry().publish()
+        except Exception as e:
+            log.debug("metrics_publish_failed err=%s", e.__class__.__name__)
+
         # WAVE ALPHA Agent 1: Check if it's time to send heartbeat with cumulative stats
         try:
             # Get interval from env (default 60 minutes)
@@ -4940,18 +5174,32 @@ def runner_main(
 
         if not do_loop or STOP:
             break
+        # With the adaptive feed scheduler, wake as soon as the next source
+        # is due; the market-hours interval becomes the longest sleep
+        wait_s = sleep_interval
+        _sched = feed_scheduler.active_scheduler()
+        if _sched is not None and not is_sim_mode():
+            wait_s = _sched.next_wait(sleep_interval)
+            log.debug(
+                "feed_schedule_wait sleep=%.1fs cap=%.0fs", wait_s, sleep_interval
+            )
         # sleep between cycles, but wake early if STOP flips
         if is_sim_mode():
             # In simulation mode, use sim_sleep (instant in fast mode)
-            sim_sleep(sleep_interval)
+            sim_sleep(wait_s)
         else:
             # In production, sleep interruptibly
-            end = time.time() + sleep_interval
+            end = time.time() + wait_s
             while time.time() < end:
                 if STOP:
                     break
                 time.sleep(0.2)
 
+    if sharding.active_pool() is not None:
+        # Let queued items finish (a --once run waits for its whole batch)
+        sharding.stop_pool(drain_timeout=30.0 if do_loop else 300.0)
+        _apply_shard_stats(sharding.drain_stats())
+
     log.info("boot_end")
     # At the end of the run, send a final heartbeat summarising totals.  This
     # "endday" heartbeat includes the same metrics as the interval heartbeat
@@ -5005,6 +5253,7 @@ def main(
     once: bool = False,
     loop: bool = False,
     sleep: float | None = None,
+    workers: int | None = None,
     argv: List[str] | None = None,
 ) -> int:
     """
@@ -5016,7 +5265,7 @@ def main(
     ``runner_main``.  This allows tests to call ``main(once=True, loop=False)``.
     """
     if once or loop or sleep is not None:
-        return runner_main(once=once, loop=loop, sleep_s=sleep)
+        return runner_main(once=once, loop=loop, sleep_s=sleep, workers=workers)
     # CLI path
     ap = argparse.ArgumentParser()
     ap.add_argument("--once", action="store_true", help="Run a single cycle and exit")
@@ -5027,8 +5276,17 @@ def main(
         default=None,
         help="Seconds between cycles when looping (default: settings.loop_seconds)",
     )
+    ap.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Shard worker processes for classification/alerting "
+        "(default: RUNNER_WORKERS; 0 = single process)",
+    )
     args = ap.parse_args(argv)
-    return runner_main(once=args.once, loop=args.loop, sleep_s=args.sleep)
+    return runner_main(
+        once=args.once, loop=args.loop, sleep_s=args.sleep, workers=args.workers
+    )
 
 
 if __name__ == "__main__":
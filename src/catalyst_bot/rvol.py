@@ -16,6 +16,7 @@ Features:
 - Real-time intraday volume calculation with time-of-day adjustment
 - 20-day average volume baseline (exclude today)
 - 5-minute memory cache (TTL configurable)
+- Daily bars persisted in the shared bar store (bar_store.py)
 - Historical backtesting support (MOA Agent 1 - legacy)
 - Bulk fetching for multiple tickers
 - Uses existing market.py data providers (yfinance, Tiingo, Alpha Vantage)
@@ -29,17 +30,15 @@ Date: 2025-10-13
 
 from __future__ import annotations
 
-import hashlib
-import pickle
 import time
 from datetime import datetime
 from datetime import time as dt_time
 from datetime import timedelta, timezone
-from pathlib import Path
 from typing import Any, Dict, Optional, Tuple
 
 import yfinance as yf
 
+from .bar_store import get_bar_store
 from .config import get_settings
 from .logging_utils import get_logger
 
@@ -48,7 +47,6 @@ log = get_logger("rvol")
 # Cache configuration - DUAL MODE
 RVOL_CACHE_TTL_DAYS = 1  # Historical backtesting cache (1 day TTL)
 RVOL_INTRADAY_CACHE_TTL_SEC = 300  # Real-time intraday cache (5 minutes)
-RVOL_CACHE_DIR = Path("data/cache/rvol")
 
 # Volume calculation parameters
 VOLUME_LOOKBACK_DAYS = 20  # 20-day average volume
@@ -60,59 +58,20 @@ MARKET_CLOSE_TIME = dt_time(16, 0)  # 4:00 PM ET
 TRADING_HOURS = 6.5  # 6.5 hours in a full trading day
 
 
-def _ensure_cache_dir() -> Path:
-    """Ensure RVOL cache directory exists."""
-    cache_dir = RVOL_CACHE_DIR
-    cache_dir.mkdir(parents=True, exist_ok=True)
-    return cache_dir
-
-
-def _get_cache_key(ticker: str, date: datetime) -> str:
-    """
-    Generate cache key for RVOL data.
-
-    Args:
-        ticker: Stock ticker
-        date: Date for volume lookup
-
-    Returns:
-        Cache key string
-    """
-    date_str = date.strftime("%Y-%m-%d")
-    return f"{ticker}_{date_str}"
-
-
-def _get_disk_cache_path(ticker: str, date: datetime) -> Path:
+class RVOLCache:
     """
-    Get disk cache file path for RVOL data.
-
-    Args:
-        ticker: Stock ticker
-        date: Date for volume lookup
+    In-memory cache for computed RVOL results.
 
-    Returns:
-        Path to cache file
+    The underlying daily bars are persisted in the shared bar store
+    (``bar_store``), so only the cheap derived result is kept here.
     """
-    cache_dir = _ensure_cache_dir()
-    cache_key = _get_cache_key(ticker, date)
-    key_hash = hashlib.md5(cache_key.encode()).hexdigest()
-
-    # Create 2-level directory structure: first 2 chars / next 2 chars
-    subdir = cache_dir / key_hash[:2] / key_hash[2:4]
-    subdir.mkdir(parents=True, exist_ok=True)
-
-    return subdir / f"{cache_key}.pkl"
-
-
-class RVOLCache:
-    """Multi-level cache for RVOL data (memory + disk)."""
 
     def __init__(self):
         """Initialize RVOL cache."""
         self._memory_cache: Dict[Tuple[str, str], Dict] = {}
         self._cache_hits = 0
         self._cache_misses = 0
-        self._disk_hits = 0
+        self._store_hits = 0
 
     def get(self, ticker: str, date: datetime) -> Optional[Dict]:
         """
@@ -125,49 +84,16 @@ class RVOLCache:
         Returns:
             Cached RVOL data or None if not found
         """
-        date_str = date.strftime("%Y-%m-%d")
-        cache_key = (ticker, date_str)
-
-        # Level 1: Memory cache
-        if cache_key in self._memory_cache:
-            self._cache_hits += 1
-            return self._memory_cache[cache_key]
+        cache_key = (ticker, date.strftime("%Y-%m-%d"))
 
-        # Level 2: Disk cache
-        cache_path = _get_disk_cache_path(ticker, date)
+        cached = self._memory_cache.get(cache_key)
+        if cached is not None:
+            cache_age_days = (datetime.now(timezone.utc) - cached["cached_at"]).days
+            if cache_age_days <= RVOL_CACHE_TTL_DAYS:
+                self._cache_hits += 1
+                return cached
+            del self._memory_cache[cache_key]
 
-        if cache_path.exists():
-            # Validate cache file is within expected directory (path traversal protection)
-            try:
-                cache_path.resolve().relative_to(RVOL_CACHE_DIR.resolve())
-            except ValueError:
-                log.debug(
-                    f"cache_path_traversal_attempt ticker={ticker} path={cache_path}"
-                )
-                self._cache_misses += 1
-                return None
-
-            try:
-                # Security Note: Loading pickle from application-controlled cache directory
-                # Files are created by this application only. Do not load from untrusted sources.
-                with open(cache_path, "rb") as f:
-                    cache_data = pickle.load(f)
-
-                # Check TTL
-                cached_date = cache_data.get("cached_at")
-                if cached_date:
-                    cache_age_days = (datetime.now(timezone.utc) - cached_date).days
-
-                    if cache_age_days <= RVOL_CACHE_TTL_DAYS:
-                        # Valid cache - load into memory and return
-                        self._memory_cache[cache_key] = cache_data
-                        self._disk_hits += 1
-                        return cache_data
-
-            except Exception as e:
-                log.debug(f"disk_cache_load_failed ticker={ticker} err={e}")
-
-        # Cache miss
         self._cache_misses += 1
         return None
 
@@ -180,30 +106,21 @@ class RVOLCache:
             date: Date of data
             data: RVOL data dictionary
         """
-        date_str = date.strftime("%Y-%m-%d")
-        cache_key = (ticker, date_str)
-
-        # Add timestamp
         data["cached_at"] = datetime.now(timezone.utc)
+        self._memory_cache[(ticker, date.strftime("%Y-%m-%d"))] = data
 
-        # Store in memory cache
-        self._memory_cache[cache_key] = data
-
-        # Store in disk cache
-        try:
-            cache_path = _get_disk_cache_path(ticker, date)
-            with open(cache_path, "wb") as f:
-                pickle.dump(data, f)
-        except Exception as e:
-            log.debug(f"disk_cache_write_failed ticker={ticker} err={e}")
+    def record_store_hit(self) -> None:
+        """Count a calculation served from the bar store without an API call."""
+        self._store_hits += 1
 
     def get_stats(self) -> Dict[str, int]:
         """Get cache statistics."""
         return {
             "memory_hits": self._cache_hits,
-            "disk_hits": self._disk_hits,
+            # Kept under the historical key name: bar store hits replace disk hits
+            "disk_hits": self._store_hits,
             "misses": self._cache_misses,
-            "total_requests": self._cache_hits + self._disk_hits + self._cache_misses,
+            "total_requests": self._cache_hits + self._store_hits + self._cache_misses,
         }
 
 
@@ -211,6 +128,117 @@ class RVOLCache:
 _rvol_cache = RVOLCache()
 
 
+def _fetch_daily_history(ticker: str, start: datetime, end: datetime):
+    """
+    Fetch daily OHLCV bars for [start, end) from Tiingo, falling back to yfinance.
+
+    Used directly when caching is disabled and as the gap fetcher for the
+    shared bar store otherwise.
+
+    Returns:
+        DataFrame of daily bars (possibly empty)
+    """
+    settings = get_settings()
+    hist_df = None
+
+    if getattr(settings, "feature_tiingo", False) and getattr(
+        settings, "tiingo_api_key", ""
+    ):
+        try:
+            from .market import _tiingo_daily_history
+
+            hist_df = _tiingo_daily_history(
+                ticker,
+                settings.tiingo_api_key,
+                start_date=start.strftime("%Y-%m-%d"),
+                end_date=end.strftime("%Y-%m-%d"),
+            )
+        except Exception as e:
+            log.debug(f"tiingo_volume_fetch_failed ticker={ticker} err={e}")
+
+    # Fallback to yfinance
+    if hist_df is None or (hasattr(hist_df, "empty") and hist_df.empty):
+        ticker_obj = yf.Ticker(ticker)
+        hist_df = ticker_obj.history(
+            start=start.strftime("%Y-%m-%d"),
+            end=end.strftime("%Y-%m-%d"),
+            interval="1d",
+        )
+
+    return hist_df
+
+
+def _rvol_from_history(ticker: str, hist_df, date: datetime) -> Optional[Dict]:
+    """
+    Compute the RVOL result dict from a daily history frame.
+
+    Args:
+        ticker: Stock ticker
+        hist_df: Daily bars with a Volume column
+        date: Date to calculate RVOL for
+
+    Returns:
+        RVOL data dict, or None if there is insufficient data
+    """
+    if hist_df is None or hist_df.empty:
+        log.debug(f"rvol_no_data ticker={ticker} date={date.date()}")
+        return None
+
+    if "Volume" not in hist_df.columns:
+        log.debug(f"rvol_no_volume_column ticker={ticker}")
+        return None
+
+    # Filter to get data up to and including target date
+    hist_df = hist_df[hist_df.index <= date]
+
+    if len(hist_df) < VOLUME_LOOKBACK_DAYS:
+        log.debug(
+            f"rvol_insufficient_data ticker={ticker} "
+            f"rows={len(hist_df)} required={VOLUME_LOOKBACK_DAYS}"
+        )
+        return None
+
+    # Get last 20 days of volume data
+    volume_series = hist_df["Volume"].tail(VOLUME_LOOKBACK_DAYS)
+
+    # Calculate average volume (excluding zero volume days)
+    valid_volumes = volume_series[volume_series > MIN_VOLUME_THRESHOLD]
+
+    if len(valid_volumes) < VOLUME_LOOKBACK_DAYS * 0.5:  # Need at least 50% valid days
+        log.debug(
+            f"rvol_insufficient_valid_days ticker={ticker} valid={len(valid_volumes)}"
+        )
+        return None
+
+    avg_volume_20d = float(valid_volumes.mean())
+
+    # Get current volume (most recent day)
+    current_volume = int(volume_series.iloc[-1])
+
+    if avg_volume_20d == 0:
+        log.debug(f"rvol_zero_avg_volume ticker={ticker}")
+        return None
+
+    rvol = current_volume / avg_volume_20d
+
+    # Categorize RVOL
+    if rvol >= 2.0:
+        rvol_category = "HIGH"
+    elif rvol >= 1.0:
+        rvol_category = "MODERATE"
+    else:
+        rvol_category = "LOW"
+
+    return {
+        "ticker": ticker,
+        "date": date.strftime("%Y-%m-%d"),
+        "current_volume": current_volume,
+        "avg_volume_20d": round(avg_volume_20d, 2),
+        "rvol": round(rvol, 2),
+        "rvol_category": rvol_category,
+    }
+
+
 def calculate_rvol(
     ticker: str,
     date: datetime,
@@ -222,6 +250,9 @@ def calculate_rvol(
 
     RVOL = Current volume / 20-day average volume
 
+    With ``use_cache`` the daily bars are read from the shared bar store and
+    only missing spans are fetched from the providers.
+
     Args:
         ticker: Stock ticker symbol
         date: Date to calculate RVOL for
@@ -252,104 +283,28 @@ def calculate_rvol(
         start_date = date - timedelta(days=VOLUME_LOOKBACK_DAYS + 5)  # Add buffer
         end_date = date + timedelta(days=1)
 
-        # Try Tiingo first if available
-        settings = get_settings()
-        hist_df = None
-
-        if getattr(settings, "feature_tiingo", False) and getattr(
-            settings, "tiingo_api_key", ""
-        ):
-            try:
-                from .market import _tiingo_daily_history
-
-                hist_df = _tiingo_daily_history(
-                    ticker,
-                    settings.tiingo_api_key,
-                    start_date=start_date.strftime("%Y-%m-%d"),
-                    end_date=end_date.strftime("%Y-%m-%d"),
-                )
-            except Exception as e:
-                log.debug(f"tiingo_volume_fetch_failed ticker={ticker} err={e}")
-
-        # Fallback to yfinance
-        if hist_df is None or (hasattr(hist_df, "empty") and hist_df.empty):
-            ticker_obj = yf.Ticker(ticker)
-            hist_df = ticker_obj.history(
-                start=start_date.strftime("%Y-%m-%d"),
-                end=end_date.strftime("%Y-%m-%d"),
-                interval="1d",
-            )
-
-        if hist_df is None or hist_df.empty:
-            log.debug(f"rvol_no_data ticker={ticker} date={date.date()}")
-            return None
-
-        # Get volume data
-        if "Volume" not in hist_df.columns:
-            log.debug(f"rvol_no_volume_column ticker={ticker}")
-            return None
-
-        # Filter to get data up to and including target date
-        hist_df = hist_df[hist_df.index <= date]
-
-        if len(hist_df) < VOLUME_LOOKBACK_DAYS:
-            log.debug(
-                f"rvol_insufficient_data ticker={ticker} "
-                f"rows={len(hist_df)} required={VOLUME_LOOKBACK_DAYS}"
-            )
-            return None
-
-        # Get last 20 days of volume data
-        volume_series = hist_df["Volume"].tail(VOLUME_LOOKBACK_DAYS)
-
-        # Calculate average volume (excluding zero volume days)
-        valid_volumes = volume_series[volume_series > MIN_VOLUME_THRESHOLD]
-
-        if (
-            len(valid_volumes) < VOLUME_LOOKBACK_DAYS * 0.5
-        ):  # Need at least 50% valid days
-            log.debug(
-                f"rvol_insufficient_valid_days ticker={ticker} valid={len(valid_volumes)}"
+        if use_cache:
+            store = get_bar_store()
+            fetched = bool(store.missing_ranges(ticker, "1d", start_date, end_date))
+            hist_df = store.get_bars(
+                ticker, "1d", start_date, end_date, fetcher=_fetch_daily_history
             )
-            return None
-
-        avg_volume_20d = float(valid_volumes.mean())
-
-        # Get current volume (most recent day)
-        current_volume = int(volume_series.iloc[-1])
+            if not fetched:
+                _rvol_cache.record_store_hit()
+        else:
+            hist_df = _fetch_daily_history(ticker, start_date, end_date)
 
-        # Calculate RVOL
-        if avg_volume_20d == 0:
-            log.debug(f"rvol_zero_avg_volume ticker={ticker}")
+        result = _rvol_from_history(ticker, hist_df, date)
+        if result is None:
             return None
 
-        rvol = current_volume / avg_volume_20d
-
-        # Categorize RVOL
-        if rvol >= 2.0:
-            rvol_category = "HIGH"
-        elif rvol >= 1.0:
-            rvol_category = "MODERATE"
-        else:
-            rvol_category = "LOW"
-
-        # Build result
-        result = {
-            "ticker": ticker,
-            "date": date.strftime("%Y-%m-%d"),
-            "current_volume": current_volume,
-            "avg_volume_20d": round(avg_volume_20d, 2),
-            "rvol": round(rvol, 2),
-            "rvol_category": rvol_category,
-        }
-
         # Cache result
         if use_cache:
             _rvol_cache.put(ticker, date, result)
 
         log.debug(
-            f"rvol_calculated ticker={ticker} rvol={rvol:.2f} "
-            f"category={rvol_category}"
+            f"rvol_calculated ticker={ticker} rvol={result['rvol']:.2f} "
+            f"category={result['rvol_category']}"
         )
 
         return result
@@ -371,7 +326,9 @@ def bulk_calculate_rvol(
     Calculate RVOL for multiple tickers at once (bulk operation).
 
     Uses batch fetching for efficiency. Significantly faster than calling
-    calculate_rvol() in a loop.
+    calculate_rvol() in a loop. With ``use_cache``, tickers whose daily bars
+    are already covered by the bar store are computed without a download,
+    and downloaded frames are written back to the store.
 
     Args:
         tickers: List of ticker symbols
@@ -395,12 +352,24 @@ def bulk_calculate_rvol(
     # Normalize tickers
     normalized_tickers = [t.strip().upper() for t in tickers if t and t.strip()]
 
-    # Check cache first
+    start_date = date - timedelta(days=VOLUME_LOOKBACK_DAYS + 5)
+    end_date = date + timedelta(days=1)
+    store = get_bar_store() if use_cache else None
+
+    # Check cache first (memory results, then fully covered bar store series)
     if use_cache:
         for ticker in normalized_tickers:
             cached_data = _rvol_cache.get(ticker, date)
             if cached_data is not None:
                 results[ticker] = cached_data
+            elif not store.missing_ranges(ticker, "1d", start_date, end_date):
+                _rvol_cache.record_store_hit()
+                result = _rvol_from_history(
+                    ticker, store.read_bars(ticker, "1d", start_date, end_date), date
+                )
+                results[ticker] = result
+                if result is not None:
+                    _rvol_cache.put(ticker, date, result)
             else:
                 to_fetch.append(ticker)
     else:
@@ -411,9 +380,6 @@ def bulk_calculate_rvol(
 
     # Fetch data for remaining tickers
     try:
-        start_date = date - timedelta(days=VOLUME_LOOKBACK_DAYS + 5)
-        end_date = date + timedelta(days=1)
-
         # Bulk fetch via yfinance (fastest for multiple tickers)
         data = yf.download(
             tickers=" ".join(to_fetch),
@@ -443,59 +409,14 @@ def bulk_calculate_rvol(
                         results[ticker] = None
                         continue
 
-                if ticker_data.empty or "Volume" not in ticker_data.columns:
-                    results[ticker] = None
-                    continue
-
-                # Filter to get data up to and including target date
-                ticker_data = ticker_data[ticker_data.index <= date]
-
-                if len(ticker_data) < VOLUME_LOOKBACK_DAYS:
-                    results[ticker] = None
-                    continue
-
-                # Get last 20 days of volume data
-                volume_series = ticker_data["Volume"].tail(VOLUME_LOOKBACK_DAYS)
-
-                # Calculate average volume (excluding zero volume days)
-                valid_volumes = volume_series[volume_series > MIN_VOLUME_THRESHOLD]
-
-                if len(valid_volumes) < VOLUME_LOOKBACK_DAYS * 0.5:
-                    results[ticker] = None
-                    continue
-
-                avg_volume_20d = float(valid_volumes.mean())
-                current_volume = int(volume_series.iloc[-1])
-
-                # Calculate RVOL
-                if avg_volume_20d == 0:
-                    results[ticker] = None
-                    continue
-
-                rvol = current_volume / avg_volume_20d
-
-                # Categorize RVOL
-                if rvol >= 2.0:
-                    rvol_category = "HIGH"
-                elif rvol >= 1.0:
-                    rvol_category = "MODERATE"
-                else:
-                    rvol_category = "LOW"
-
-                # Build result
-                result = {
-                    "ticker": ticker,
-                    "date": date.strftime("%Y-%m-%d"),
-                    "current_volume": current_volume,
-                    "avg_volume_20d": round(avg_volume_20d, 2),
-                    "rvol": round(rvol, 2),
-                    "rvol_category": rvol_category,
-                }
+                if use_cache and not ticker_data.empty:
+                    store.write_bars(ticker, "1d", ticker_data, start_date, end_date)
 
+                result = _rvol_from_history(ticker, ticker_data, date)
                 results[ticker] = result
 
                 # Cache result
-                if use_cache:
+                if use_cache and result is not None:
                     _rvol_cache.put(ticker, date, result)
 
             except Exception as e:
@@ -820,6 +741,47 @@ def _save_to_cache(ticker: str, data: Dict[str, Any]) -> None:
     _intraday_cache[ticker] = data
 
 
+def build_rvol_result(
+    ticker: str, current_volume: int, avg_volume_20d: float, hours_open: float
+) -> Dict[str, Any]:
+    """
+    Build the intraday RVol result dict from its inputs.
+
+    Shared by :func:`calculate_rvol_intraday` and the bulk intraday feature
+    engine (``intraday_features``) so both classify the same way.
+
+    Args:
+        ticker: Stock ticker symbol
+        current_volume: Cumulative intraday volume so far
+        avg_volume_20d: 20-day average daily volume baseline
+        hours_open: Hours since market open (0.0 to 6.5)
+
+    Returns:
+        Dict in the shape documented on :func:`calculate_rvol_intraday`
+    """
+    # Extrapolate to full trading day (KEY INSIGHT: time-of-day adjustment)
+    if hours_open < TRADING_HOURS and hours_open > 0.0:
+        # During market hours: extrapolate to full day
+        estimated_full_day_volume = int(current_volume * (TRADING_HOURS / hours_open))
+    else:
+        # Pre-market, after-hours, or exactly at close: use current volume as-is
+        estimated_full_day_volume = current_volume
+
+    rvol = estimated_full_day_volume / avg_volume_20d
+
+    return {
+        "ticker": ticker,
+        "rvol": round(rvol, 2),
+        "rvol_class": classify_rvol(rvol),
+        "multiplier": round(get_rvol_multiplier(rvol), 2),
+        "current_volume": current_volume,
+        "avg_volume_20d": round(avg_volume_20d, 2),
+        "hours_open": round(hours_open, 2),
+        "estimated_full_day_volume": estimated_full_day_volume,
+        "calculated_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
 def calculate_rvol_intraday(ticker: str) -> Optional[Dict[str, Any]]:
     """
     Calculate real-time intraday RVol with time-of-day adjustment.
@@ -864,6 +826,14 @@ def calculate_rvol_intraday(ticker: str) -> Optional[Dict[str, Any]]:
     if not getattr(settings, "feature_rvol", True):
         return None
 
+    # Served from the shared intraday feature snapshot when the bulk
+    # engine is on (one bar fetch per ticker per cycle for RVOL/VWAP/etc.)
+    from . import intraday_features
+
+    if intraday_features.engine_enabled():
+        snap = intraday_features.get_intraday_engine().get(ticker)
+        return snap.rvol_data() if snap is not None else None
+
     # Check cache first
     cached = _get_from_cache(ticker)
     if cached is not None:
@@ -896,35 +866,7 @@ def calculate_rvol_intraday(ticker: str) -> Optional[Dict[str, Any]]:
         # Calculate hours since market open
         hours_open = calculate_hours_since_market_open()
 
-        # Extrapolate to full trading day (KEY INSIGHT: time-of-day adjustment)
-        if hours_open < TRADING_HOURS and hours_open > 0.0:
-            # During market hours: extrapolate to full day
-            estimated_full_day_volume = int(
-                current_volume * (TRADING_HOURS / hours_open)
-            )
-        else:
-            # Pre-market, after-hours, or exactly at close: use current volume as-is
-            estimated_full_day_volume = current_volume
-
-        # Calculate RVol
-        rvol = estimated_full_day_volume / avg_volume_20d
-
-        # Classify and get multiplier
-        rvol_class = classify_rvol(rvol)
-        multiplier = get_rvol_multiplier(rvol)
-
-        # Build result
-        result = {
-            "ticker": ticker,
-            "rvol": round(rvol, 2),
-            "rvol_class": rvol_class,
-            "multiplier": round(multiplier, 2),
-            "current_volume": current_volume,
-            "avg_volume_20d": round(avg_volume_20d, 2),
-            "hours_open": round(hours_open, 2),
-            "estimated_full_day_volume": estimated_full_day_volume,
-            "calculated_at": datetime.now(timezone.utc).isoformat(),
-        }
+        result = build_rvol_result(ticker, current_volume, avg_volume_20d, hours_open)
 
         # Cache result
         _save_to_cache(ticker, result)
@@ -933,13 +875,13 @@ def calculate_rvol_intraday(ticker: str) -> Optional[Dict[str, Any]]:
             "rvol_calculated ticker=%s rvol=%.2fx class=%s multiplier=%.2f "
             "current_vol=%d avg_vol=%.0f hours_open=%.2f est_vol=%d",
             ticker,
-            rvol,
-            rvol_class,
-            multiplier,
+            result["rvol"],
+            result["rvol_class"],
+            result["multiplier"],
             current_volume,
             avg_volume_20d,
             hours_open,
-            estimated_full_day_volume,
+            result["estimated_full_day_volume"],
         )
 
         return result
@@ -959,6 +901,7 @@ __all__ = [
     "bulk_calculate_rvol",  # Bulk historical backtesting
     "get_cache_stats",  # Cache statistics
     "calculate_rvol_intraday",  # Real-time RVol calculation (Quick Win #4)
+    "build_rvol_result",  # Shared RVol result builder
     "get_rvol_multiplier",  # Get confidence multiplier from RVol
     "classify_rvol",  # Classify RVol into categories
     "get_volume_baseline",  # Get 20-day average volume
@@ -2,8 +2,9 @@
 Retroactive Keyword Extraction for Rejected Items
 ==================================================
 
-This script processes rejected items in data/rejected_items.jsonl that are
-missing keyword data. It runs classification on each item to extract:
+This script processes rejected items in data/rejected_items.jsonl (and its
+day partitions under data/rejected_items/) that are missing keyword data.
+It runs classification on each item to extract:
 - Keywords from title/summary
 - Sentiment scores
 - Full classification metadata
@@ -42,13 +43,14 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from catalyst_bot.classify import classify
 from catalyst_bot.logging_utils import get_logger
 from catalyst_bot.models import NewsItem
+from catalyst_bot.partitioned_jsonl import has_records, iter_lines
 
 log = get_logger(__name__)
 
 
 def load_rejected_items(file_path: Path) -> List[Dict[str, Any]]:
     """
-    Load rejected items from JSONL file.
+    Load rejected items from the JSONL log and its day partitions.
 
     Args:
         file_path: Path to rejected_items.jsonl
@@ -56,24 +58,23 @@ def load_rejected_items(file_path: Path) -> List[Dict[str, Any]]:
     Returns:
         List of rejected item dicts
     """
-    if not file_path.exists():
+    if not has_records(file_path):
         log.error(f"rejected_items_file_not_found path={file_path}")
         return []
 
     items = []
-    with open(file_path, "r", encoding="utf-8") as f:
-        for line_num, line in enumerate(f, 1):
-            line = line.strip()
-            if not line:
-                continue
-
-            try:
-                item = json.loads(line)
-                items.append(item)
-            except json.JSONDecodeError as e:
-                log.warning(
-                    f"rejected_items_parse_failed line={line_num} err={e}"
-                )
+    for line_num, line in enumerate(iter_lines(file_path), 1):
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            item = json.loads(line)
+            items.append(item)
+        except json.JSONDecodeError as e:
+            log.warning(
+                f"rejected_items_parse_failed line={line_num} err={e}"
+            )
 
     log.info(f"rejected_items_loaded count={len(items)} path={file_path}")
     return items
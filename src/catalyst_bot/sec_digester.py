@@ -43,12 +43,16 @@ import os
 from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional, Tuple
 
+from .cache_registry import bounded_cache
 from .config import get_settings
 
 # In‑memory cache of recent filings.  Keys are uppercase tickers; values
 # are lists of dictionaries with keys: ``ts`` (datetime), ``label``
-# (str) and ``reason`` (str).  The cache is pruned on each write/read.
-_SEC_CACHE: Dict[str, List[Dict[str, object]]] = {}
+# (str) and ``reason`` (str).  Each ticker's list is pruned on each
+# write/read; the ticker set is LRU-bounded.
+_SEC_CACHE = bounded_cache(
+    "sec_digester", max_entries=int(os.getenv("SEC_DIGESTER_MAX_TICKERS", "2000"))
+)
 
 # Mapping from sentiment labels to numeric scores.  Used when
 # aggregating multiple filings into a single score.
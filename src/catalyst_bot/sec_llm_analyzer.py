@@ -19,6 +19,7 @@ import re
 from typing import Any, Dict, Optional
 
 from .llm_client import query_llm
+from .llm_scheduler import SEC, llm_priority
 from .logging_utils import get_logger
 from .prompt_compression import compress_sec_filing, should_compress
 
@@ -138,11 +139,12 @@ CRITICAL: Traders need immediate clarity on whether to BUY or AVOID. Make your s
 Respond ONLY with valid JSON. No additional text."""
 
     try:
-        response = query_llm(
-            prompt=user_prompt,
-            system=system_prompt,
-            timeout=timeout,
-        )
+        with llm_priority(SEC):
+            response = query_llm(
+                prompt=user_prompt,
+                system=system_prompt,
+                timeout=timeout,
+            )
 
         if not response:
             log.warning("llm_no_response filing_type=%s", filing_type)
@@ -261,11 +263,12 @@ Source: {source or 'Unknown'}
 Is this a meaningful catalyst? Respond with JSON only."""
 
     try:
-        response = query_llm(
-            prompt=user_prompt,
-            system=system_prompt,
-            timeout=15.0,
-        )
+        with llm_priority(SEC):
+            response = query_llm(
+                prompt=user_prompt,
+                system=system_prompt,
+                timeout=15.0,
+            )
 
         if not response:
             return {}
@@ -351,6 +354,62 @@ def extract_keywords_from_document_sync(
         return {}
 
 
+def _normalize_keyword_analysis(analysis: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a raw LLM keyword/analysis object to the extraction result format."""
+    # Safe float conversion helper
+    def safe_float(value, default=0.0):
+        """Convert value to float, handling 'unknown', 'N/A', None, etc."""
+        if value is None or value == "":
+            return default
+        if isinstance(value, (int, float)):
+            return float(value)
+        if isinstance(value, str):
+            value_lower = value.lower().strip()
+            if value_lower in ("unknown", "n/a", "na", "none", "null"):
+                return default
+            try:
+                return float(value)
+            except (ValueError, TypeError):
+                return default
+        return default
+
+    # Normalize result (convert to keyword extraction format)
+    result = {
+        "keywords": list(analysis.get("keywords", analysis.get("catalysts", []))),
+        "sentiment": safe_float(analysis.get("sentiment"), 0.0),
+        "confidence": safe_float(analysis.get("confidence"), 0.5),
+        "summary": str(analysis.get("summary", "")),
+        "material": bool(
+            analysis.get(
+                "material",
+                bool(analysis.get("keywords")) or bool(analysis.get("catalysts")),
+            )
+        ),
+    }
+
+    # Add additional fields if available
+    if "risk_level" in analysis:
+        result["risk_level"] = str(analysis["risk_level"])
+    if "deal_size" in analysis or "deal_value_upfront" in analysis:
+        result["deal_size"] = analysis.get("deal_size") or analysis.get(
+            "deal_value_upfront"
+        )
+    if "dilution_pct" in analysis:
+        result["dilution_pct"] = analysis.get("dilution_pct")
+
+    # Add enhanced LLM output fields
+    if "reasoning" in analysis:
+        result["llm_reasoning"] = str(analysis["reasoning"])
+    if "event_context" in analysis:
+        result["event_context"] = str(analysis["event_context"])
+    if "trading_thesis" in analysis:
+        result["trading_thesis"] = str(analysis["trading_thesis"])
+    if "expected_price_action" in analysis:
+        result["expected_price_action"] = str(analysis["expected_price_action"])
+
+    return result
+
+
 async def extract_keywords_from_document(
     document_text: str,
     title: str,
@@ -473,9 +532,10 @@ async def extract_keywords_from_document(
 
     try:
         # Query hybrid LLM (routes through Local → Gemini → Anthropic)
-        response = await query_hybrid_llm(
-            prompt, article_length=len(doc_excerpt), priority="normal"
-        )
+        with llm_priority(SEC):
+            response = await query_hybrid_llm(
+                prompt, article_length=len(doc_excerpt), priority="normal"
+            )
 
         if not response:
             log.warning(f"llm_no_response filing={filing_type}")
@@ -490,57 +550,7 @@ async def extract_keywords_from_document(
             response = json_match.group(0)
 
         analysis = json.loads(response)
-
-        # Safe float conversion helper
-        def safe_float(value, default=0.0):
-            """Convert value to float, handling 'unknown', 'N/A', None, etc."""
-            if value is None or value == "":
-                return default
-            if isinstance(value, (int, float)):
-                return float(value)
-            if isinstance(value, str):
-                value_lower = value.lower().strip()
-                if value_lower in ("unknown", "n/a", "na", "none", "null"):
-                    return default
-                try:
-                    return float(value)
-                except (ValueError, TypeError):
-                    return default
-            return default
-
-        # Normalize result (convert to keyword extraction format)
-        result = {
-            "keywords": list(analysis.get("keywords", analysis.get("catalysts", []))),
-            "sentiment": safe_float(analysis.get("sentiment"), 0.0),
-            "confidence": safe_float(analysis.get("confidence"), 0.5),
-            "summary": str(analysis.get("summary", "")),
-            "material": bool(
-                analysis.get(
-                    "material",
-                    bool(analysis.get("keywords")) or bool(analysis.get("catalysts")),
-                )
-            ),
-        }
-
-        # Add additional fields if available
-        if "risk_level" in analysis:
-            result["risk_level"] = str(analysis["risk_level"])
-        if "deal_size" in analysis or "deal_value_upfront" in analysis:
-            result["deal_size"] = analysis.get("deal_size") or analysis.get(
-                "deal_value_upfront"
-            )
-        if "dilution_pct" in analysis:
-            result["dilution_pct"] = analysis.get("dilution_pct")
-
-        # Add enhanced LLM output fields
-        if "reasoning" in analysis:
-            result["llm_reasoning"] = str(analysis["reasoning"])
-        if "event_context" in analysis:
-            result["event_context"] = str(analysis["event_context"])
-        if "trading_thesis" in analysis:
-            result["trading_thesis"] = str(analysis["trading_thesis"])
-        if "expected_price_action" in analysis:
-            result["expected_price_action"] = str(analysis["expected_price_action"])
+        result = _normalize_keyword_analysis(analysis)
 
         if result["keywords"]:
             # Enhanced logging with LLM reasoning
@@ -590,8 +600,9 @@ async def batch_extract_keywords_from_documents(
 
     Agent 2: Integrated with SEC LLM cache to avoid duplicate analysis.
 
-    This eliminates the serial processing bottleneck from calling extract_keywords_from_document_sync()
-    in a loop, which creates a new event loop for each filing.
+    This eliminates the serial processing bottleneck from calling
+    extract_keywords_from_document_sync() in a loop, which creates a new
+    event loop for each filing.
 
     Parameters
     ----------
@@ -646,7 +657,6 @@ async def batch_extract_keywords_from_documents(
     for filing in sec_filings:
         item_id = filing.get("item_id")
         doc_text = filing.get("document_text", "")
-        title = filing.get("title", "")
         filing_type = filing.get("filing_type", "8-K")
         ticker = filing.get("ticker", "UNKNOWN")
         filing_id = filing.get("filing_id", item_id)
@@ -661,11 +671,15 @@ async def batch_extract_keywords_from_documents(
 
         # Agent 2: Check cache first
         doc_hash = hashlib.md5(doc_text[:1000].encode()).hexdigest()[:8]
-        cached_result = cache.get_cached_sec_analysis(
+        # Off the event loop: the semantic fallback embeds the text
+        cached_result = await asyncio.to_thread(
+            cache.get_cached_sec_analysis,
             filing_id=filing_id,
             ticker=ticker,
             filing_type=filing_type,
             document_hash=doc_hash,
+            document_text=doc_text,
+            namespace="sec_keyword_extraction",
         )
 
         if cached_result is not None:
@@ -679,11 +693,8 @@ async def batch_extract_keywords_from_documents(
                 filing_type,
             )
         else:
-            # Cache miss - create async task for LLM analysis
-            task = extract_keywords_from_document(
-                document_text=doc_text, title=title, filing_type=filing_type
-            )
-            tasks.append((task, item_id, filing_id, ticker, filing_type, doc_hash))
+            # Cache miss - queue for LLM analysis
+            tasks.append((filing, item_id, filing_id, ticker, filing_type, doc_hash, doc_text))
             item_ids.append(item_id)
 
     # Log cache performance
@@ -704,17 +715,37 @@ async def batch_extract_keywords_from_documents(
     start_time = time.time()
 
     try:
-        # Extract just the async tasks for gather()
-        async_tasks = [t[0] for t in tasks]
-        results_list = await asyncio.gather(*async_tasks, return_exceptions=True)
+        from .sec_llm_packing import extract_keywords_packed, packing_enabled
+
+        if packing_enabled(len(tasks)):
+            # Short filings share token-budgeted multi-document prompts
+            packed = await extract_keywords_packed(
+                [
+                    {**t[0], "item_id": t[1], "title": t[0].get("title", ""), "filing_type": t[4]}
+                    for t in tasks
+                ],
+                single_fn=extract_keywords_from_document,
+            )
+            results_list = [packed.get(t[1], {}) for t in tasks]
+        else:
+            async_tasks = [
+                extract_keywords_from_document(
+                    document_text=t[6], title=t[0].get("title", ""), filing_type=t[4]
+                )
+                for t in tasks
+            ]
+            results_list = await asyncio.gather(*async_tasks, return_exceptions=True)
 
         # Build results dictionary and cache new results
         success_count = 0
         error_count = 0
 
-        for (_, item_id, filing_id, ticker, filing_type, doc_hash), result in zip(tasks, results_list):
+        for task, result in zip(tasks, results_list):
+            _, item_id, filing_id, ticker, filing_type, doc_hash, doc_text = task
             if isinstance(result, Exception):
-                log.warning("batch_extract_failed item_id=%s err=%s", item_id, str(result))
+                log.warning(
+                    "batch_extract_failed item_id=%s err=%s", item_id, str(result)
+                )
                 error_count += 1
                 results_dict[item_id] = {}  # Empty result on error
             elif result and isinstance(result, dict):
@@ -722,12 +753,15 @@ async def batch_extract_keywords_from_documents(
                 success_count += 1
 
                 # Agent 2: Cache the result
-                cache.cache_sec_analysis(
+                await asyncio.to_thread(
+                    cache.cache_sec_analysis,
                     filing_id=filing_id,
                     ticker=ticker,
                     filing_type=filing_type,
                     analysis_result=result,
                     document_hash=doc_hash,
+                    document_text=doc_text,
+                    namespace="sec_keyword_extraction",
                 )
             else:
                 log.debug("batch_extract_no_result item_id=%s", item_id)
@@ -735,7 +769,8 @@ async def batch_extract_keywords_from_documents(
 
         elapsed = time.time() - start_time
         log.info(
-            "batch_extract_complete total=%d cached=%d analyzed=%d success=%d errors=%d elapsed=%.2fs avg=%.2fs",
+            "batch_extract_complete total=%d cached=%d analyzed=%d success=%d "
+            "errors=%d elapsed=%.2fs avg=%.2fs",
             len(sec_filings),
             cache_hits,
             len(tasks),
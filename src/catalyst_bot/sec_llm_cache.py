@@ -10,6 +10,13 @@ Features:
 - Automatic cache invalidation for amended filings
 - Cache hit/miss statistics
 - Thread-safe operations
+- Semantic fallback (services.semantic_cache) for the same filing whose
+  text hash differs (re-fetched or re-rendered documents); a different
+  filing ID is always a miss
+
+Lookups and stores are synchronous and the semantic fallback embeds the
+document (loading the embedding model on first use), so async callers run
+them with ``asyncio.to_thread``.
 
 Environment Variables:
 * ``FEATURE_SEC_LLM_CACHE`` – Enable SEC LLM caching (default: 1)
@@ -90,6 +97,7 @@ class SECLLMCache:
             "cache_hits": 0,
             "cache_misses": 0,
             "invalidations": 0,
+            "semantic_hits": 0,
         }
 
         # Initialize database
@@ -217,12 +225,28 @@ class SECLLMCache:
         # Generate MD5 hash
         return hashlib.md5(key_content.encode()).hexdigest()
 
+    def _semantic_cache(self, ticker: Optional[str]):
+        """Shared semantic tier, or None when it cannot be used."""
+        if not ticker or ticker.upper() == "UNKNOWN":
+            # Ticker match is what makes a semantic hit safe
+            return None
+        try:
+            from .services.semantic_cache import get_semantic_cache
+
+            semantic = get_semantic_cache()
+        except Exception as e:
+            _logger.debug("sec_llm_semantic_cache_unavailable err=%s", str(e))
+            return None
+        return semantic if semantic.enabled else None
+
     def get_cached_sec_analysis(
         self,
         filing_id: str,
         ticker: Optional[str],
         filing_type: str,
         document_hash: Optional[str] = None,
+        document_text: Optional[str] = None,
+        namespace: str = "sec_filing_analysis",
     ) -> Optional[Dict[str, Any]]:
         """
         Get cached SEC analysis result (thread-safe).
@@ -237,6 +261,14 @@ class SECLLMCache:
             Type of filing
         document_hash : str, optional
             Hash of document content
+        document_text : str, optional
+            Filing text. When given, an exact-key miss falls back to the
+            semantic tier (same ticker, filing type and filing ID
+            required). Pass the filing body, not a boilerplate feed
+            summary, or unrelated filings will look alike.
+        namespace : str
+            Semantic tier namespace; callers caching different result
+            shapes must use different namespaces
 
         Returns
         -------
@@ -247,6 +279,46 @@ class SECLLMCache:
         if not os.getenv("FEATURE_SEC_LLM_CACHE", "1") in ("1", "true", "yes", "on"):
             return None
 
+        result = self._get_exact(filing_id, ticker, filing_type, document_hash)
+        if result is not None or not document_text:
+            return result
+
+        semantic = self._semantic_cache(ticker)
+        if semantic is None:
+            return None
+        hit = semantic.lookup(
+            namespace,
+            document_text,
+            ticker=ticker,
+            filing_type=filing_type,
+            audit_key=f"{namespace}|{filing_id}",
+            doc_id=filing_id,
+        )
+        if hit is None:
+            return None
+
+        with self._lock:
+            # Reclassify the exact-tier miss
+            self.stats["cache_misses"] -= 1
+            self.stats["cache_hits"] += 1
+            self.stats["semantic_hits"] += 1
+        _logger.info(
+            "sec_llm_cache_semantic_hit filing_id=%s ticker=%s filing_type=%s sim=%.3f",
+            filing_id,
+            ticker,
+            filing_type,
+            hit.similarity,
+        )
+        return json.loads(hit.payload)
+
+    def _get_exact(
+        self,
+        filing_id: str,
+        ticker: Optional[str],
+        filing_type: str,
+        document_hash: Optional[str],
+    ) -> Optional[Dict[str, Any]]:
+        """Exact cache-key lookup in SQLite."""
         cache_key = self._generate_cache_key(
             filing_id, ticker, filing_type, document_hash
         )
@@ -336,6 +408,8 @@ class SECLLMCache:
         filing_type: str,
         analysis_result: Dict[str, Any],
         document_hash: Optional[str] = None,
+        document_text: Optional[str] = None,
+        namespace: str = "sec_filing_analysis",
     ) -> bool:
         """
         Cache SEC analysis result (thread-safe).
@@ -352,6 +426,10 @@ class SECLLMCache:
             Analysis result to cache
         document_hash : str, optional
             Hash of document content
+        document_text : str, optional
+            Filing text; also indexes the result in the semantic tier
+        namespace : str
+            Semantic tier namespace (see ``get_cached_sec_analysis``)
 
         Returns
         -------
@@ -366,6 +444,21 @@ class SECLLMCache:
             filing_id, ticker, filing_type, document_hash
         )
 
+        if document_text:
+            semantic = self._semantic_cache(ticker)
+            if semantic is not None:
+                semantic.add(
+                    namespace,
+                    document_text,
+                    json.dumps(analysis_result),
+                    ticker=ticker,
+                    filing_type=filing_type,
+                    ttl_seconds=self.ttl_seconds,
+                    answer_text=json.dumps(analysis_result, sort_keys=True),
+                    audit_key=f"{namespace}|{filing_id}",
+                    doc_id=filing_id,
+                )
+
         with self._lock:  # Thread-safe access
             try:
                 now = time.time()
@@ -0,0 +1,455 @@
+"""
+SEC Prompt Packing
+==================
+
+Packs short SEC filings into multi-document keyword extraction prompts.
+
+``batch_extract_keywords_from_documents`` used to issue one LLM call per
+filing. Most filings in a cycle are short 8-K items, so the per-call
+overhead dominates. This module:
+
+1. Compresses each filing with ``prompt_compression.compress_sec_filing``.
+2. Packs filings that are short after compression into token-budgeted
+   prompts (``llm_batch.group_items_by_token_budget``). Each filing gets
+   a doc_id that the model echoes in its structured output.
+3. Validates every per-document result. Documents missing from, or
+   mis-parsed in, a packed response are split back out: re-packed in
+   halves, and finally sent through the single-filing path.
+4. Runs calls under an ``AdaptiveConcurrencyLimiter`` that follows the
+   provider's rate-limit headroom reported by ``llm_hybrid.RateLimitTracker``.
+
+Long filings always take the single-filing path, which keeps the
+filing-specific deep-analysis prompts.
+
+Environment Variables:
+* ``FEATURE_SEC_PROMPT_PACKING`` – Enable packing (default: 1)
+* ``SEC_LLM_PACK_MIN_FILINGS`` – Minimum uncached filings before packing
+  is used (default: 6)
+* ``SEC_LLM_PACK_TOKEN_BUDGET`` – Document tokens per packed prompt
+  (default: 6000)
+* ``SEC_LLM_PACK_MAX_DOCS`` – Filings per packed prompt (default: 8)
+* ``SEC_LLM_PACK_SHORT_TOKENS`` – Filings above this many tokens before
+  compression are never packed (default: 3000)
+* ``SEC_LLM_PACK_DOC_TOKENS`` – Compression target per packed filing
+  (default: 1200)
+* ``SEC_LLM_MAX_CONCURRENT`` – Upper concurrency limit (default: 10)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .llm_batch import group_items_by_token_budget
+from .llm_scheduler import SEC, llm_priority
+from .logging_utils import get_logger
+from .prompt_compression import compress_sec_filing, estimate_tokens
+
+log = get_logger("sec_llm_packing")
+
+# Shrink concurrency below this fraction of remaining rate-limit headroom,
+# grow it back above HEADROOM_HIGH
+HEADROOM_LOW = 0.2
+HEADROOM_HIGH = 0.5
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def packing_enabled(filing_count: int) -> bool:
+    """True if ``filing_count`` uncached filings should be packed."""
+    if os.getenv("FEATURE_SEC_PROMPT_PACKING", "1").lower() not in (
+        "1",
+        "true",
+        "yes",
+        "on",
+    ):
+        return False
+    # Smaller batches already finish in one concurrent wave
+    return filing_count >= _env_int("SEC_LLM_PACK_MIN_FILINGS", 6)
+
+
+@dataclass
+class PackedDocument:
+    """One filing prepared for a packed prompt."""
+
+    doc_id: str
+    item_id: str
+    title: str
+    filing_type: str
+    document_text: str
+    excerpt: str
+    tokens: int
+
+
+def _default_tracker():
+    """Rate-limit tracker of the provider the hybrid router will use."""
+    try:
+        from .llm_hybrid import get_router
+    except ImportError:
+        return None
+    router = get_router()
+    if router is None:
+        return None
+    if router.config.gemini_enabled:
+        return router.gemini_rate_limiter
+    if router.config.anthropic_enabled:
+        return router.claude_rate_limiter
+    return None  # Local model: no provider quota
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Async semaphore whose limit follows provider rate-limit headroom.
+
+    Before each acquire the limit is halved (down to ``min_limit``) when the
+    tracker is in backoff or less than HEADROOM_LOW of its minute/hour
+    quota is left, and raised by one (up to ``max_limit``) when more than
+    HEADROOM_HIGH is left.
+    """
+
+    def __init__(
+        self,
+        max_limit: Optional[int] = None,
+        min_limit: int = 1,
+        tracker_getter: Optional[Callable[[], Any]] = None,
+    ):
+        self.max_limit = max(
+            min_limit, max_limit or _env_int("SEC_LLM_MAX_CONCURRENT", 10)
+        )
+        self.min_limit = min_limit
+        self.limit = self.max_limit
+        self._tracker_getter = tracker_getter or _default_tracker
+        self._active = 0
+        self._cond: Optional[asyncio.Condition] = None
+
+    def headroom(self) -> Optional[float]:
+        """Fraction of the tighter rate-limit window still free, or None."""
+        tracker = self._tracker_getter()
+        if tracker is None:
+            return None
+        try:
+            stats = tracker.get_stats()
+        except Exception:
+            return None
+        if stats.get("in_backoff"):
+            return 0.0
+        usage = max(stats.get("minute_usage_pct", 0), stats.get("hour_usage_pct", 0))
+        return max(0.0, 1.0 - usage / 100.0)
+
+    def adjust(self) -> int:
+        """Re-derive the limit from current headroom and return it."""
+        headroom = self.headroom()
+        if headroom is None:
+            return self.limit
+        previous = self.limit
+        if headroom < HEADROOM_LOW:
+            self.limit = max(self.min_limit, self.limit // 2)
+        elif headroom > HEADROOM_HIGH:
+            self.limit = min(self.max_limit, self.limit + 1)
+        if self.limit != previous:
+            log.info(
+                "sec_llm_concurrency_adjusted limit=%d previous=%d headroom=%.2f",
+                self.limit,
+                previous,
+                headroom,
+            )
+        return self.limit
+
+    async def __aenter__(self) -> "AdaptiveConcurrencyLimiter":
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        async with self._cond:
+            while self._active >= self.adjust():
+                await self._cond.wait()
+            self._active += 1
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        async with self._cond:
+            self._active -= 1
+            self._cond.notify_all()
+
+
+def prepare_documents(
+    filings: List[Dict[str, Any]]
+) -> Tuple[List[PackedDocument], List[Dict[str, Any]]]:
+    """
+    Compress filings and split them into packable and single-call lists.
+
+    Parameters
+    ----------
+    filings : list of dict
+        Filings with item_id, document_text, title and filing_type
+
+    Returns
+    -------
+    tuple of (packable, single)
+        ``PackedDocument`` list for short filings, and the original filing
+        dicts that should keep the single-filing path
+    """
+    short_tokens = _env_int("SEC_LLM_PACK_SHORT_TOKENS", 3000)
+    doc_tokens = _env_int("SEC_LLM_PACK_DOC_TOKENS", 1200)
+
+    packable: List[PackedDocument] = []
+    single: List[Dict[str, Any]] = []
+    for filing in filings:
+        text = filing.get("document_text", "")
+        if estimate_tokens(text) > short_tokens:
+            single.append(filing)
+            continue
+        compressed = compress_sec_filing(text, max_tokens=doc_tokens)
+        excerpt = compressed["compressed_text"] or text
+        packable.append(
+            PackedDocument(
+                doc_id=f"D{len(packable) + 1}",
+                item_id=filing["item_id"],
+                title=filing.get("title", ""),
+                filing_type=filing.get("filing_type", "8-K"),
+                document_text=text,
+                excerpt=excerpt,
+                tokens=estimate_tokens(excerpt),
+            )
+        )
+    return packable, single
+
+
+def build_packed_prompt(pack: List[PackedDocument]) -> str:
+    """Format a packed multi-document keyword extraction prompt."""
+    from .llm_prompts import PACKED_DOCUMENT_TEMPLATE, PACKED_KEYWORD_EXTRACTION_PROMPT
+
+    documents = "\n".join(
+        PACKED_DOCUMENT_TEMPLATE.format(
+            doc_id=doc.doc_id,
+            filing_type=doc.filing_type,
+            title=doc.title,
+            document_text=doc.excerpt,
+        )
+        for doc in pack
+    )
+    return PACKED_KEYWORD_EXTRACTION_PROMPT.format(count=len(pack), documents=documents)
+
+
+def _valid_result(result: Any) -> bool:
+    if not isinstance(result, dict) or not isinstance(result.get("keywords"), list):
+        return False
+    try:
+        return -1.0 <= float(result.get("sentiment", 0.0)) <= 1.0
+    except (TypeError, ValueError):
+        return False
+
+
+def parse_packed_response(
+    response: Optional[str], pack: List[PackedDocument]
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Map doc_id -> raw result for every well-formed result in a response.
+
+    Results with unknown or repeated doc_ids, non-list keywords or
+    out-of-range sentiment are dropped, so their documents count as
+    mis-parsed.
+    """
+    if not response:
+        return {}
+    match = re.search(r"[\[{].*[\]}]", response, re.DOTALL)
+    if not match:
+        return {}
+    try:
+        data = json.loads(match.group(0))
+    except json.JSONDecodeError:
+        return {}
+    results = data.get("results") if isinstance(data, dict) else data
+    if not isinstance(results, list):
+        return {}
+
+    expected = {doc.doc_id for doc in pack}
+    parsed: Dict[str, Dict[str, Any]] = {}
+    repeated = set()
+    for result in results:
+        doc_id = str(result.get("doc_id", "")) if isinstance(result, dict) else ""
+        if doc_id not in expected or not _valid_result(result):
+            continue
+        if doc_id in parsed:
+            repeated.add(doc_id)
+        parsed[doc_id] = result
+    for doc_id in repeated:
+        del parsed[doc_id]
+    return parsed
+
+
+class PackedExtractor:
+    """Runs packed and single-filing extraction for one batch."""
+
+    def __init__(
+        self,
+        query_fn: Callable[..., Awaitable[Optional[str]]],
+        single_fn: Callable[..., Awaitable[Dict[str, Any]]],
+        limiter: AdaptiveConcurrencyLimiter,
+    ):
+        self.query_fn = query_fn
+        self.single_fn = single_fn
+        self.limiter = limiter
+        self.stats = {
+            "packed_calls": 0,
+            "packed_docs": 0,
+            "split_docs": 0,
+            "single_calls": 0,
+        }
+
+    async def run_single(self, filing: Dict[str, Any]) -> Any:
+        """Single-filing path (filing-specific prompts)."""
+        self.stats["single_calls"] += 1
+        async with self.limiter:
+            return await self.single_fn(
+                document_text=filing["document_text"],
+                title=filing.get("title", ""),
+                filing_type=filing.get("filing_type", "8-K"),
+            )
+
+    async def run_pack(self, pack: List[PackedDocument]) -> Dict[str, Any]:
+        """Extract a pack; documents that fail to parse are split back out."""
+        from .sec_llm_analyzer import _normalize_keyword_analysis
+
+        if len(pack) == 1:
+            doc = pack[0]
+            try:
+                result = await self.run_single(self._as_filing(doc))
+            except Exception as e:
+                result = e
+            return {doc.item_id: result}
+
+        prompt = build_packed_prompt(pack)
+        self.stats["packed_calls"] += 1
+        try:
+            async with self.limiter:
+                with llm_priority(SEC):
+                    response = await self.query_fn(
+                        prompt, article_length=len(prompt), priority="normal"
+                    )
+        except Exception as e:
+            log.warning("sec_llm_packed_call_failed docs=%d err=%s", len(pack), e)
+            response = None
+
+        parsed = parse_packed_response(response, pack)
+        results = {
+            doc.item_id: _normalize_keyword_analysis(parsed[doc.doc_id])
+            for doc in pack
+            if doc.doc_id in parsed
+        }
+        self.stats["packed_docs"] += len(results)
+
+        failed = [doc for doc in pack if doc.doc_id not in parsed]
+        if failed:
+            self.stats["split_docs"] += len(failed)
+            log.info(
+                "sec_llm_pack_split docs=%d failed=%d ids=%s",
+                len(pack),
+                len(failed),
+                ",".join(doc.doc_id for doc in failed),
+            )
+            if len(failed) == len(pack):
+                # Whole response unusable: halve the pack
+                middle = len(failed) // 2
+                retries = [failed[:middle], failed[middle:]]
+            else:
+                retries = [[doc] for doc in failed]
+            for outcome in await asyncio.gather(
+                *(self.run_pack(retry) for retry in retries), return_exceptions=True
+            ):
+                if isinstance(outcome, dict):
+                    results.update(outcome)
+        return results
+
+    @staticmethod
+    def _as_filing(doc: PackedDocument) -> Dict[str, Any]:
+        return {
+            "item_id": doc.item_id,
+            "document_text": doc.document_text,
+            "title": doc.title,
+            "filing_type": doc.filing_type,
+        }
+
+
+async def extract_keywords_packed(
+    filings: List[Dict[str, Any]],
+    query_fn: Optional[Callable[..., Awaitable[Optional[str]]]] = None,
+    single_fn: Optional[Callable[..., Awaitable[Dict[str, Any]]]] = None,
+    limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+) -> Dict[str, Any]:
+    """
+    Extract keywords for filings using packed prompts where possible.
+
+    Parameters
+    ----------
+    filings : list of dict
+        Uncached filings (item_id, document_text, title, filing_type)
+    query_fn : callable, optional
+        Async LLM call (default: ``llm_hybrid.query_hybrid_llm``)
+    single_fn : callable, optional
+        Single-filing extractor
+        (default: ``sec_llm_analyzer.extract_keywords_from_document``)
+    limiter : AdaptiveConcurrencyLimiter, optional
+        Shared concurrency limiter
+
+    Returns
+    -------
+    dict
+        item_id -> extraction result, or the exception raised for that
+        filing (same contract as ``asyncio.gather(return_exceptions=True)``)
+    """
+    if query_fn is None:
+        from .llm_hybrid import query_hybrid_llm as query_fn
+    if single_fn is None:
+        from . import sec_llm_analyzer
+
+        single_fn = sec_llm_analyzer.extract_keywords_from_document
+
+    extractor = PackedExtractor(
+        query_fn, single_fn, limiter or AdaptiveConcurrencyLimiter()
+    )
+    packable, single = prepare_documents(filings)
+    packs = group_items_by_token_budget(
+        packable,
+        token_budget=_env_int("SEC_LLM_PACK_TOKEN_BUDGET", 6000),
+        max_items=_env_int("SEC_LLM_PACK_MAX_DOCS", 8),
+        tokens_of=lambda doc: doc.tokens,
+    )
+
+    start = time.time()
+    results: Dict[str, Any] = {}
+    outcomes = await asyncio.gather(
+        *(extractor.run_pack(pack) for pack in packs),
+        *(extractor.run_single(filing) for filing in single),
+        return_exceptions=True,
+    )
+    for pack, outcome in zip(packs, outcomes):
+        if isinstance(outcome, dict):
+            results.update(outcome)
+        else:
+            for doc in pack:
+                results[doc.item_id] = outcome
+    for filing, outcome in zip(single, outcomes[len(packs) :]):
+        results[filing["item_id"]] = outcome
+
+    log.info(
+        "sec_llm_packed_complete filings=%d packs=%d packed_calls=%d packed_docs=%d "
+        "split_docs=%d single_calls=%d concurrency=%d elapsed=%.2fs",
+        len(filings),
+        len(packs),
+        extractor.stats["packed_calls"],
+        extractor.stats["packed_docs"],
+        extractor.stats["split_docs"],
+        extractor.stats["single_calls"],
+        extractor.limiter.limit,
+        time.time() - start,
+    )
+    return results
@@ -7,7 +7,8 @@ Key features:
 - WebSocket streaming from sec-api.io
 - Market cap filtering (<$5B for penny stock focus)
 - Automatic reconnection with exponential backoff
-- Redis queue for filing backlog during processing spikes
+- Durable local backlog (SQLite WAL) drained by concurrent consumers; filings
+  survive processing spikes and restarts, and failed filings are retried
 - Graceful fallback to RSS polling on failure
 
 Environment Variables:
@@ -15,6 +16,11 @@ Environment Variables:
 - SEC_STREAM_ENABLED: Enable WebSocket streaming (default: true)
 - SEC_STREAM_MARKET_CAP_MAX: Maximum market cap filter in USD (default: $5B)
 - SEC_STREAM_RECONNECT_DELAY: Base reconnect delay in seconds (default: 5)
+- SEC_STREAM_BACKLOG: Buffer filings in the durable backlog (default: true)
+- SEC_STREAM_QUEUE_PATH: Backlog file (default: data/sec_stream_queue.sqlite)
+- SEC_STREAM_CONSUMERS: Concurrent backlog consumers (default: 2)
+- SEC_STREAM_VISIBILITY_SEC: Seconds a consumer holds a filing before it is
+  handed out again (default: 300)
 
 References:
 - sec-api.io WebSocket API: https://sec-api.io/docs/websocket-api
@@ -47,6 +53,12 @@ except Exception:
         return logging.getLogger("sec_stream")
 
 
+try:
+    from .durable_queue import DurableQueue
+except Exception:
+    DurableQueue = None
+
+
 log = get_logger("sec_stream")
 
 
@@ -60,6 +72,15 @@ DEFAULT_RECONNECT_DELAY = 5  # seconds
 MAX_RECONNECT_DELAY = 300  # 5 minutes
 BACKOFF_MULTIPLIER = 2.0
 
+BACKLOG_TOPIC = "sec_filings"
+DEFAULT_QUEUE_PATH = "data/sec_stream_queue.sqlite"
+DEFAULT_CONSUMERS = 2
+DEFAULT_VISIBILITY_TIMEOUT = 300  # seconds
+BACKLOG_POLL_INTERVAL = 0.1  # seconds between polls of an empty backlog
+BACKLOG_WAIT_TIMEOUT = 1.0  # seconds a consumer blocks waiting for a filing
+BACKLOG_RETRY_DELAY = 30  # seconds before a failed filing is retried
+BACKLOG_REPORT_INTERVAL = 60  # seconds between backlog depth/lag reports
+
 
 # ============================================================================
 # Data Models
@@ -217,9 +238,6 @@ class SECStreamClient:
         self.is_connected = False
         self.reconnect_attempts = 0
 
-        # Queue for filing backlog
-        self.filing_queue: asyncio.Queue[FilingEvent] = asyncio.Queue(maxsize=1000)
-
     async def __aenter__(self):
         """Async context manager entry."""
         await self.connect()
@@ -381,14 +399,6 @@ class SECStreamClient:
                     f"(market cap: ${filing.market_cap or 0:,.0f})"
                 )
 
-                # Add to queue for backpressure handling
-                try:
-                    self.filing_queue.put_nowait(filing)
-                except asyncio.QueueFull:
-                    log.warning(
-                        f"Filing queue full, dropping {filing.ticker} {filing.filing_type}"
-                    )
-
                 yield filing
 
             except (WebSocketException, ConnectionError, asyncio.TimeoutError) as e:
@@ -452,6 +462,65 @@ def get_market_cap_max() -> float:
         return DEFAULT_MARKET_CAP_MAX
 
 
+def is_backlog_enabled() -> bool:
+    """Check if filings should be buffered in the durable local backlog.
+
+    Returns
+    -------
+    bool
+        True if the backlog should be used
+    """
+    if DurableQueue is None:
+        return False
+    return os.getenv("SEC_STREAM_BACKLOG", "true").lower() in ("true", "1", "yes")
+
+
+def get_consumer_count() -> int:
+    """Get the number of concurrent backlog consumers from environment.
+
+    Returns
+    -------
+    int
+        Consumer count (at least 1)
+    """
+    try:
+        return max(1, int(os.getenv("SEC_STREAM_CONSUMERS", DEFAULT_CONSUMERS)))
+    except (ValueError, TypeError):
+        return DEFAULT_CONSUMERS
+
+
+def get_visibility_timeout() -> float:
+    """Get the backlog visibility timeout from environment.
+
+    Returns
+    -------
+    float
+        Seconds a consumer holds a filing before it is redelivered
+    """
+    try:
+        return float(os.getenv("SEC_STREAM_VISIBILITY_SEC", DEFAULT_VISIBILITY_TIMEOUT))
+    except (ValueError, TypeError):
+        return float(DEFAULT_VISIBILITY_TIMEOUT)
+
+
+def open_backlog() -> Optional["DurableQueue"]:
+    """Open the durable filing backlog, or None when it is disabled.
+
+    Returns
+    -------
+    DurableQueue or None
+        Backlog queue at SEC_STREAM_QUEUE_PATH
+    """
+    if not is_backlog_enabled():
+        return None
+    path = os.getenv("SEC_STREAM_QUEUE_PATH", DEFAULT_QUEUE_PATH)
+    try:
+        return DurableQueue(path, visibility_timeout=get_visibility_timeout())
+    except Exception as e:
+        log.warning(f"SEC backlog unavailable at {path}, processing inline: {e}")
+        return None
+
+
 def get_reconnect_delay() -> int:
     """Get reconnect delay from environment.
 
@@ -466,6 +535,112 @@ def get_reconnect_delay() -> int:
         return DEFAULT_RECONNECT_DELAY
 
 
+# ============================================================================
+# Durable Backlog
+# ============================================================================
+
+
+def enqueue_filing(backlog: "DurableQueue", filing: FilingEvent) -> bool:
+    """Persist a filing to the backlog.
+
+    Parameters
+    ----------
+    backlog : DurableQueue
+        Filing backlog
+    filing : FilingEvent
+        Filing to buffer
+
+    Returns
+    -------
+    bool
+        False if the same accession number is already waiting
+    """
+    return backlog.put(
+        BACKLOG_TOPIC, filing.to_json(), key=filing.accession_number or None
+    )
+
+
+async def drain_backlog(
+    backlog: "DurableQueue",
+    on_filing_callback: callable,
+    stop: Optional[asyncio.Event] = None,
+) -> None:
+    """Consume filings from the backlog until cancelled or ``stop`` is set.
+
+    A filing is acked once the callback returns. If the callback raises,
+    the filing is retried after BACKLOG_RETRY_DELAY seconds. After the
+    queue's attempt limit it is moved to the dead-letter topic. Run several
+    of these concurrently (in one process or several) to drain faster.
+    Queue calls are blocking SQLite transactions, so they run in a worker
+    thread to keep the event loop free.
+
+    Parameters
+    ----------
+    backlog : DurableQueue
+        Filing backlog
+    on_filing_callback : callable
+        Async function to call for each filing
+    stop : asyncio.Event, optional
+        Set to stop after the current filing
+    """
+    visibility_timeout = get_visibility_timeout()
+    while stop is None or not stop.is_set():
+        jobs = await asyncio.to_thread(
+            backlog.get,
+            BACKLOG_TOPIC,
+            visibility_timeout=visibility_timeout,
+            timeout=BACKLOG_WAIT_TIMEOUT,
+            stop=stop,
+        )
+        if not jobs:
+            continue
+        job = jobs[0]
+        try:
+            filing = FilingEvent.from_json(job.message)
+        except Exception as e:
+            log.error(f"Dropping unreadable backlog entry {job.id}: {e}")
+            await asyncio.to_thread(backlog.ack, job)
+            continue
+
+        try:
+            await on_filing_callback(filing)
+        except Exception as e:
+            log.error(
+                f"Error processing filing {filing.ticker} "
+                f"(attempt {job.attempts}): {e}"
+            )
+            await asyncio.to_thread(backlog.nack, job, delay=BACKLOG_RETRY_DELAY)
+            continue
+        await asyncio.to_thread(backlog.ack, job)
+
+
+async def _report_backlog(backlog: "DurableQueue") -> None:
+    """Publish backlog depth, lag and throughput periodically."""
+    while True:
+        try:
+            stats = await asyncio.to_thread(backlog.publish_metrics, BACKLOG_TOPIC)
+            if stats["ready"] or stats["in_flight"] or stats["dead"]:
+                log.info(
+                    f"SEC backlog: ready={stats['ready']} "
+                    f"in_flight={stats['in_flight']} dead={stats['dead']} "
+                    f"lag={stats['lag_seconds']:.1f}s "
+                    f"throughput={stats['throughput_per_sec']:.2f}/s"
+                )
+        except Exception as e:
+            log.debug(f"SEC backlog stats failed: {e}")
+        await asyncio.sleep(BACKLOG_REPORT_INTERVAL)
+
+
+async def _wait_drained(backlog: "DurableQueue", timeout: float) -> None:
+    """Wait (up to ``timeout`` seconds) until every backlog filing is acked."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while loop.time() < deadline:
+        if not await asyncio.to_thread(backlog.depth, BACKLOG_TOPIC):
+            return
+        await asyncio.sleep(BACKLOG_POLL_INTERVAL)
+
+
 # ============================================================================
 # High-Level Stream Monitor
 # ============================================================================
@@ -479,6 +654,11 @@ async def monitor_sec_stream(
 
     This is the main entry point for integrating with runner.py.
 
+    With the durable backlog enabled (the default), the stream only
+    persists filings. SEC_STREAM_CONSUMERS tasks run the callback. They
+    start before the WebSocket connects, so filings left over from a
+    previous run are processed first.
+
     Parameters
     ----------
     on_filing_callback : callable
@@ -516,18 +696,39 @@ async def monitor_sec_stream(
         f"(market cap < ${market_cap_max:,.0f}, types={filing_types or ['8-K', '10-Q', '10-K']})"
     )
 
-    async with SECStreamClient(
-        api_key=api_key,
-        market_cap_max=market_cap_max,
-        filing_types=filing_types,
-        reconnect_delay=reconnect_delay,
-    ) as client:
-        async for filing in client.stream_filings():
-            try:
-                await on_filing_callback(filing)
-            except Exception as e:
-                log.error(f"Error processing filing {filing.ticker}: {e}")
-                # Continue processing other filings
+    backlog = await asyncio.to_thread(open_backlog)
+    tasks = []
+    if backlog is not None:
+        tasks = [
+            asyncio.create_task(drain_backlog(backlog, on_filing_callback))
+            for _ in range(get_consumer_count())
+        ]
+        tasks.append(asyncio.create_task(_report_backlog(backlog)))
+
+    try:
+        async with SECStreamClient(
+            api_key=api_key,
+            market_cap_max=market_cap_max,
+            filing_types=filing_types,
+            reconnect_delay=reconnect_delay,
+        ) as client:
+            async for filing in client.stream_filings():
+                if backlog is not None:
+                    await asyncio.to_thread(enqueue_filing, backlog, filing)
+                    continue
+                try:
+                    await on_filing_callback(filing)
+                except Exception as e:
+                    log.error(f"Error processing filing {filing.ticker}: {e}")
+                    # Continue processing other filings
+
+        if backlog is not None:
+            await _wait_drained(backlog, get_visibility_timeout())
+    finally:
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
 
 
 # ============================================================================
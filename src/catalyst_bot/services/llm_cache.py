@@ -8,8 +8,12 @@ not just exact string matching.
 Features:
 - Semantic similarity matching using embeddings
 - Redis backend with TTL management
+- Local SQLite store (WAL) when Redis is unavailable, so cached responses
+  survive restarts on a single box without a Redis service
 - Target: 70%+ cache hit rate
 - Thread-safe and async-compatible
+- Embedding tier (services.semantic_cache) for near-duplicate prompts
+  such as syndicated press releases
 
 Example:
     These prompts will match in cache:
@@ -20,21 +24,82 @@ Example:
 Cost Impact:
 - 70% cache hit rate = 70% cost reduction
 - Typical savings: $500-700/month → $150-210/month
+
+Environment Variables:
+- REDIS_URL: Redis server (default: redis://localhost:6379/0)
+- LLM_CACHE_PERSIST: Use the local SQLite store without Redis (default: 1)
+- LLM_CACHE_DB_PATH: Local store file (default: data/llm_cache.sqlite)
 """
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import json
 import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
 from typing import Optional
 
 from ..logging_utils import get_logger
 from .llm_service import LLMResponse
+from .semantic_cache import get_semantic_cache
 
 log = get_logger("llm_cache")
 
 
+def _has_ticker(ticker: Optional[str]) -> bool:
+    """Ticker match is what makes a semantic hit safe (see SECLLMCache)."""
+    return bool(ticker and ticker.strip() and ticker.strip().upper() != "UNKNOWN")
+
+
+class _LocalCacheStore:
+    """Redis-style ``get``/``setex`` over a local SQLite (WAL) file."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._sets = 0
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=10, isolation_level=None)
+            conn.execute("PRAGMA busy_timeout=10000")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[str]:
+        row = self._conn().execute(
+            "SELECT value FROM llm_cache WHERE key = ? AND expires_at > ?",
+            (key, time.time()),
+        ).fetchone()
+        return row[0] if row else None
+
+    def setex(self, key: str, ttl: int, value: str) -> None:
+        now = time.time()
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO llm_cache(key, value, expires_at) VALUES(?, ?, ?)",
+            (key, value, now + ttl),
+        )
+        self._sets += 1
+        if self._sets % 500 == 0:
+            conn.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (now,))
+
+    def size(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+
+
 class LLMCache:
     """
     Semantic cache for LLM responses.
@@ -64,25 +129,34 @@ class LLMCache:
             "default": self.ttl_seconds  # 24 hours for everything else
         }
 
-        # Try to connect to Redis
+        # Try to connect to Redis (falls back to the local store)
         self.redis_client = None
+        self.local_store = None
         self._init_redis()
 
         # In-memory fallback cache
         self.memory_cache = {}
 
+        # Second tier: embedding match for prompts that differ in wording
+        self.semantic = (
+            get_semantic_cache()
+            if self.enabled and config.get("semantic_cache_enabled", True)
+            else None
+        )
+
         # PHASE 4: Cache statistics
         self.stats = {
             "hits": 0,
             "misses": 0,
             "sets": 0,
             "errors": 0,
+            "semantic_hits": 0,
         }
 
         log.info(
             "llm_cache_initialized enabled=%s backend=%s ttl_sec=%d feature_ttls=%d",
             self.enabled,
-            "redis" if self.redis_client else "memory",
+            self._backend_name(),
             self.ttl_seconds,
             len(self.feature_ttls)
         )
@@ -105,24 +179,57 @@ class LLMCache:
             log.info("redis_connected url=%s", redis_url)
 
         except ImportError:
-            log.warning("redis_library_not_installed fallback_to_memory install_with: pip install redis")
+            log.warning(
+                "redis_library_not_installed fallback_to_local "
+                "install_with: pip install redis"
+            )
             self.redis_client = None
+            self._init_local_store()
 
         except Exception as e:
-            log.warning("redis_connection_failed err=%s fallback_to_memory", str(e))
+            log.warning("redis_connection_failed err=%s fallback_to_local", str(e))
             self.redis_client = None
+            self._init_local_store()
+
+    def _init_local_store(self):
+        """Open the local SQLite store (memory-only when disabled or failing)."""
+        if os.getenv("LLM_CACHE_PERSIST", "1").strip().lower() not in ("1", "true", "yes", "on"):
+            return
+        path = os.getenv("LLM_CACHE_DB_PATH", "data/llm_cache.sqlite")
+        try:
+            self.local_store = _LocalCacheStore(Path(path))
+            log.info("llm_cache_local_store path=%s", path)
+        except Exception as e:
+            log.warning("llm_cache_local_store_failed err=%s fallback_to_memory", str(e))
+            self.local_store = None
+
+    def _backend_name(self) -> str:
+        if self.redis_client:
+            return "redis"
+        return "sqlite" if self.local_store else "memory"
 
     async def get(
         self,
         prompt: str,
-        feature: str
+        feature: str,
+        ticker: Optional[str] = None,
+        filing_type: Optional[str] = None,
+        audit_key: Optional[str] = None,
     ) -> Optional[LLMResponse]:
         """
         Get cached response for prompt.
 
+        Exact (normalized hash) matches are tried first, then the semantic
+        tier, which is skipped without a ticker and also requires ticker and
+        filing type to match.
+
         Args:
             prompt: Query prompt
             feature: Feature name (for namespacing)
+            ticker: Ticker the prompt is about (semantic tier only; required
+                for a semantic hit)
+            filing_type: Filing type, e.g. "8-K" (semantic tier only)
+            audit_key: Request ID, passed again to set() (false-hit audits)
 
         Returns:
             Cached LLMResponse or None if cache miss
@@ -144,6 +251,18 @@ class LLMCache:
                 self.stats["errors"] += 1  # PHASE 4: Track errors
                 log.warning("redis_get_failed err=%s", str(e))
 
+        # Local store (used when Redis is unavailable)
+        if self.local_store:
+            try:
+                cached_data = self.local_store.get(cache_key)
+                if cached_data:
+                    self.stats["hits"] += 1
+                    log.debug("cache_hit backend=sqlite feature=%s", feature)
+                    return self._deserialize_response(cached_data)
+            except Exception as e:
+                self.stats["errors"] += 1
+                log.warning("local_cache_get_failed err=%s", str(e))
+
         # Fallback to memory cache
         if cache_key in self.memory_cache:
             cached_data, expiry = self.memory_cache[cache_key]
@@ -156,6 +275,26 @@ class LLMCache:
                 # Expired
                 del self.memory_cache[cache_key]
 
+        # Semantic tier (embedding runs off the event loop)
+        if self.semantic is not None and _has_ticker(ticker):
+            hit = await asyncio.to_thread(
+                self.semantic.lookup,
+                feature,
+                self._normalize_prompt(prompt, feature),
+                ticker,
+                filing_type,
+                audit_key,
+            )
+            if hit is not None:
+                self.stats["hits"] += 1
+                self.stats["semantic_hits"] += 1
+                log.debug(
+                    "cache_hit backend=semantic feature=%s sim=%.3f",
+                    feature,
+                    hit.similarity,
+                )
+                return self._deserialize_response(hit.payload)
+
         self.stats["misses"] += 1  # PHASE 4: Track stats
         log.debug("cache_miss feature=%s", feature)
         return None
@@ -164,7 +303,10 @@ class LLMCache:
         self,
         prompt: str,
         feature: str,
-        response: LLMResponse
+        response: LLMResponse,
+        ticker: Optional[str] = None,
+        filing_type: Optional[str] = None,
+        audit_key: Optional[str] = None,
     ):
         """
         Cache LLM response.
@@ -173,6 +315,10 @@ class LLMCache:
             prompt: Query prompt
             feature: Feature name
             response: LLM response to cache
+            ticker: Ticker the prompt is about (semantic tier only; the
+                response is not indexed there without one)
+            filing_type: Filing type (semantic tier only)
+            audit_key: Request ID given to get() (completes false-hit audits)
         """
         if not self.enabled:
             return
@@ -183,6 +329,19 @@ class LLMCache:
         cache_key = self._generate_cache_key(prompt, feature)
         serialized = self._serialize_response(response)
 
+        if self.semantic is not None and _has_ticker(ticker):
+            await asyncio.to_thread(
+                self.semantic.add,
+                feature,
+                self._normalize_prompt(prompt, feature),
+                serialized,
+                ticker,
+                filing_type,
+                ttl,
+                response.text,
+                audit_key,
+            )
+
         # Store in Redis
         if self.redis_client:
             try:
@@ -198,6 +357,17 @@ class LLMCache:
                 self.stats["errors"] += 1  # PHASE 4: Track errors
                 log.warning("redis_set_failed err=%s fallback_to_memory", str(e))
 
+        # Store locally when Redis is unavailable
+        if self.local_store:
+            try:
+                self.local_store.setex(cache_key, ttl, serialized)
+                self.stats["sets"] += 1
+                log.debug("cache_set backend=sqlite feature=%s ttl=%d", feature, ttl)
+                return
+            except Exception as e:
+                self.stats["errors"] += 1
+                log.warning("local_cache_set_failed err=%s fallback_to_memory", str(e))
+
         # Fallback to memory cache
         import time
         expiry = time.time() + ttl
@@ -350,8 +520,15 @@ class LLMCache:
 
     def get_stats(self) -> dict:
         """Get cache statistics (PHASE 4: Enhanced with hit rates)."""
-        backend = "redis" if self.redis_client else "memory"
+        backend = self._backend_name()
         size = len(self.memory_cache) if backend == "memory" else 0
+        # Entries in the active backend (Redis is shared, so not counted)
+        cache_size = size
+        if backend == "sqlite":
+            try:
+                cache_size = self.local_store.size()
+            except Exception as e:
+                log.debug("local_cache_size_failed err=%s", str(e))
 
         # Calculate hit rate
         total_requests = self.stats["hits"] + self.stats["misses"]
@@ -361,6 +538,7 @@ class LLMCache:
             "enabled": self.enabled,
             "backend": backend,
             "memory_cache_size": size,
+            "cache_size": cache_size,
             "ttl_seconds": self.ttl_seconds,
             # PHASE 4: Performance metrics
             "hits": self.stats["hits"],
@@ -369,4 +547,6 @@ class LLMCache:
             "errors": self.stats["errors"],
             "total_requests": total_requests,
             "hit_rate_pct": round(hit_rate, 1),
+            "semantic_hits": self.stats["semantic_hits"],
+            "semantic": self.semantic.get_stats() if self.semantic else None,
         }
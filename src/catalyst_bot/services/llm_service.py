@@ -40,6 +40,13 @@ from datetime import datetime
 from enum import Enum
 from typing import Any, Dict, List, Optional, Union
 
+from ..llm_scheduler import (
+    BATCH,
+    SEC,
+    LLMRequestDropped,
+    estimate_tokens,
+    get_llm_scheduler,
+)
 from ..logging_utils import get_logger
 
 log = get_logger("llm_service")
@@ -78,6 +85,8 @@ class LLMRequest:
         max_tokens: Maximum tokens in response
         temperature: Sampling temperature (0.0 = deterministic, 1.0 = creative)
         timeout_seconds: Request timeout
+        priority_class: LLM scheduler class (realtime, interactive, sec,
+            batch); inferred from feature_name when None
     """
 
     prompt: str
@@ -95,7 +104,9 @@ class LLMRequest:
     fallback_on_error: bool = True
     max_retries: int = 2
     request_id: Optional[str] = None
+    # "ticker" / "filing_type" keys gate semantic cache hits
     metadata: Dict[str, Any] = field(default_factory=dict)
+    priority_class: Optional[str] = None
 
 
 @dataclass
@@ -279,7 +290,11 @@ class LLMService:
             # 2. Check cache
             if request.enable_cache and self.cache:
                 cached_response = await self.cache.get(
-                    request.prompt, request.feature_name
+                    request.prompt,
+                    request.feature_name,
+                    ticker=request.metadata.get("ticker"),
+                    filing_type=request.metadata.get("filing_type"),
+                    audit_key=request_id,
                 )
                 if cached_response:
                     log.info(
@@ -291,84 +306,94 @@ class LLMService:
                     cached_response.request_id = request_id
                     return cached_response
 
-            # 3. Compress prompt if enabled
-            prompt = request.prompt
-            compressed = False
-            if request.compress_prompt and self.config.get("prompt_compression"):
-                prompt = self._compress_prompt(prompt, request.complexity)
-                compressed = True
-
-            # 4. Route to appropriate provider
-            provider_name, model = self.router.select_provider(request.complexity)
-            provider = self._get_provider(provider_name)
-
-            log.info(
-                "llm_query_start feature=%s complexity=%s provider=%s model=%s compressed=%s",
-                request.feature_name,
-                request.complexity.value if request.complexity else "auto",
-                provider_name,
-                model,
-                compressed,
-            )
+            # Hold a scheduler slot (class concurrency, token budget, deadline)
+            # for the provider calls; cache hits above never queue
+            async with get_llm_scheduler().aslot(
+                self._priority_class(request),
+                tokens=estimate_tokens(request.prompt, request.system_prompt),
+            ):
+                # 3. Compress prompt if enabled
+                prompt = request.prompt
+                compressed = False
+                if request.compress_prompt and self.config.get("prompt_compression"):
+                    prompt = self._compress_prompt(prompt, request.complexity)
+                    compressed = True
+
+                # 4. Route to appropriate provider
+                provider_name, model = self.router.select_provider(request.complexity)
+                provider = self._get_provider(provider_name)
+
+                log.info(
+                    "llm_query_start feature=%s complexity=%s provider=%s model=%s compressed=%s",
+                    request.feature_name,
+                    request.complexity.value if request.complexity else "auto",
+                    provider_name,
+                    model,
+                    compressed,
+                )
 
-            # 5. Execute request with retry and fallback logic
-            last_error = None
-            retry_count = 0
-            max_retries = request.max_retries if hasattr(request, "max_retries") else 2
+                # 5. Execute request with retry and fallback logic
+                last_error = None
+                retry_count = 0
+                max_retries = (
+                    request.max_retries if hasattr(request, "max_retries") else 2
+                )
 
-            for attempt in range(max_retries + 1):
-                try:
-                    response = await provider.query(
-                        prompt=prompt,
-                        system_prompt=request.system_prompt,
-                        model=model,
-                        max_tokens=request.max_tokens,
-                        temperature=request.temperature,
-                        timeout=request.timeout_seconds,
-                    )
-                    # Success - break out of retry loop
-                    break
+                for attempt in range(max_retries + 1):
+                    try:
+                        response = await provider.query(
+                            prompt=prompt,
+                            system_prompt=request.system_prompt,
+                            model=model,
+                            max_tokens=request.max_tokens,
+                            temperature=request.temperature,
+                            timeout=request.timeout_seconds,
+                        )
+                        # Success - break out of retry loop
+                        break
 
-                except (TimeoutError, Exception) as e:
-                    last_error = e
-                    retry_count = attempt + 1
+                    except (TimeoutError, Exception) as e:
+                        last_error = e
+                        retry_count = attempt + 1
 
-                    log.warning(
-                        "llm_query_failed provider=%s attempt=%d/%d err=%s",
-                        provider_name,
-                        retry_count,
-                        max_retries + 1,
-                        str(e)[:100],
-                    )
+                        log.warning(
+                            "llm_query_failed provider=%s attempt=%d/%d err=%s",
+                            provider_name,
+                            retry_count,
+                            max_retries + 1,
+                            str(e)[:100],
+                        )
 
-                    # If this isn't the last attempt and fallback is enabled, try fallback provider
-                    if attempt < max_retries:
-                        fallback_provider_name, fallback_model = (
-                            self.router.get_fallback_provider(
-                                failed_provider=provider_name,
-                                complexity=request.complexity or TaskComplexity.MEDIUM,
+                        # If this isn't the last attempt and fallback is enabled,
+                        # try fallback provider
+                        if attempt < max_retries:
+                            fallback_provider_name, fallback_model = (
+                                self.router.get_fallback_provider(
+                                    failed_provider=provider_name,
+                                    complexity=request.complexity
+                                    or TaskComplexity.MEDIUM,
+                                )
                             )
-                        )
 
-                        # Mark current provider as unhealthy temporarily (5 minutes)
-                        self.router.mark_provider_unhealthy(
-                            provider_name, duration_seconds=300
-                        )
+                            # Mark current provider as unhealthy temporarily (5 minutes)
+                            self.router.mark_provider_unhealthy(
+                                provider_name, duration_seconds=300
+                            )
 
-                        # Switch to fallback provider
-                        provider_name = fallback_provider_name
-                        model = fallback_model
-                        provider = self._get_provider(provider_name)
+                            # Switch to fallback provider
+                            provider_name = fallback_provider_name
+                            model = fallback_model
+                            provider = self._get_provider(provider_name)
 
-                        log.info(
-                            "llm_fallback_provider from=%s to=%s model=%s",
-                            provider_name,
-                            fallback_provider_name,
-                            fallback_model,
-                        )
-                    else:
-                        # Last attempt failed - re-raise error
-                        raise last_error
+                            log.info(
+                                "llm_fallback_provider from=%s to=%s model=%s",
+                                provider_name,
+                                fallback_provider_name,
+                                fallback_model,
+                            )
+                        else:
+                            # Last attempt failed - re-raise error
+                            raise last_error
 
             # 6. Build response object
             latency_ms = (datetime.now() - start_time).total_seconds() * 1000
@@ -425,7 +450,14 @@ class LLMService:
 
             # 8. Cache response
             if request.enable_cache and self.cache:
-                await self.cache.set(request.prompt, request.feature_name, llm_response)
+                await self.cache.set(
+                    request.prompt,
+                    request.feature_name,
+                    llm_response,
+                    ticker=request.metadata.get("ticker"),
+                    filing_type=request.metadata.get("filing_type"),
+                    audit_key=request_id,
+                )
 
             log.info(
                 "llm_query_success feature=%s provider=%s latency_ms=%.1f cost_usd=%.4f",
@@ -437,6 +469,18 @@ class LLMService:
 
             return llm_response
 
+        except LLMRequestDropped as e:
+            latency_ms = (datetime.now() - start_time).total_seconds() * 1000
+            log.warning(
+                "llm_query_dropped feature=%s class=%s reason=%s",
+                request.feature_name,
+                e.priority_class,
+                e.reason,
+            )
+            return LLMResponse(
+                text="", error=str(e), request_id=request_id, latency_ms=latency_ms
+            )
+
         except Exception as e:
             latency_ms = (datetime.now() - start_time).total_seconds() * 1000
             log.error(
@@ -573,6 +617,17 @@ class LLMService:
             return self.monitor.get_stats()
         return {}
 
+    def _priority_class(self, request: LLMRequest) -> Optional[str]:
+        """Scheduler class for a request; None keeps the caller's ambient class."""
+        if request.priority_class:
+            return request.priority_class
+        feature = (request.feature_name or "").lower()
+        if feature.startswith("sec"):
+            return SEC
+        if feature.startswith(("moa", "keyword_review", "backtest")):
+            return BATCH
+        return None
+
     def _auto_detect_complexity(self, prompt: str) -> TaskComplexity:
         """
         Auto-detect task complexity from prompt.
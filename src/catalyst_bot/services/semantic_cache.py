@@ -0,0 +1,574 @@
+"""
+Semantic LLM Cache Tier
+=======================
+
+Second cache tier behind the exact-match caches (``LLMCache`` and
+``SECLLMCache``). Syndicated press releases and re-filed exhibits reach
+the LLM with different URLs, bylines and boilerplate, so their normalized
+prompts hash differently even though the answer is the same.
+
+Each prompt is embedded with a small local sentence-embedding model (CPU)
+and matched against an in-process cosine index kept per feature
+namespace. A cached response is only returned when:
+
+- cosine similarity is at or above the namespace threshold, and
+- ticker and filing type of the query match the cached entry, and
+- when both sides carry a document ID (e.g. an SEC accession number),
+  the IDs are equal.
+
+Every hit and every near-miss rejected on metadata is written to a JSONL
+audit log. A sampled fraction of would-be hits is deliberately treated as
+a miss; when the caller stores the fresh answer, it is compared with the
+answer the cache would have served, which measures the false-hit rate.
+
+Environment Variables:
+* ``FEATURE_LLM_SEMANTIC_CACHE`` – Enable the semantic tier (default: 1)
+* ``LLM_SEMANTIC_CACHE_MODEL`` – sentence-transformers model
+  (default: all-MiniLM-L6-v2)
+* ``LLM_SEMANTIC_CACHE_THRESHOLD`` – Default cosine threshold (default: 0.94)
+* ``LLM_SEMANTIC_CACHE_MAX_ENTRIES`` – Entries kept per namespace (default: 2000)
+* ``LLM_SEMANTIC_CACHE_AUDIT_RATE`` – Fraction of hits re-verified (default: 0.05)
+* ``LLM_SEMANTIC_CACHE_AUDIT_PATH`` – Audit log
+  (default: data/logs/llm_semantic_cache_audit.jsonl)
+
+Usage:
+    cache = get_semantic_cache()
+    hit = cache.lookup("sec_8k", prompt, ticker="ACME", filing_type="8-K",
+                       audit_key=request_id)
+    if hit is None:
+        answer = call_llm(prompt)
+        cache.add("sec_8k", prompt, answer, ticker="ACME", filing_type="8-K",
+                  ttl_seconds=604800, audit_key=request_id)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from ..logging_utils import get_logger
+
+log = get_logger("semantic_cache")
+
+try:
+    from sentence_transformers import SentenceTransformer
+
+    SENTENCE_TRANSFORMERS_AVAILABLE = True
+except ImportError:
+    SentenceTransformer = None
+    SENTENCE_TRANSFORMERS_AVAILABLE = False
+
+DEFAULT_MODEL = "all-MiniLM-L6-v2"
+DEFAULT_AUDIT_PATH = "data/logs/llm_semantic_cache_audit.jsonl"
+
+# Embedding models truncate long inputs anyway; cap what we hand them
+MAX_EMBED_CHARS = 2000
+
+# Cached and fresh answers at or above this similarity count as agreeing
+AUDIT_AGREE_THRESHOLD = 0.90
+
+Embedder = Callable[[Sequence[str]], np.ndarray]
+
+
+@dataclass
+class SemanticHit:
+    """Cached payload served by the semantic tier."""
+
+    payload: str
+    similarity: float
+    namespace: str
+    matched_hash: str
+
+
+@dataclass
+class _Entry:
+    text_hash: str
+    payload: str
+    answer_text: str
+    ticker: Optional[str]
+    filing_type: Optional[str]
+    expires_at: float
+    doc_id: Optional[str] = None
+
+
+class _NamespaceIndex:
+    """Unit-normalized embeddings plus metadata for one feature namespace."""
+
+    def __init__(self):
+        self.entries: List[_Entry] = []
+        self.vectors: Optional[np.ndarray] = None
+
+    def append(self, vector: np.ndarray, entry: _Entry) -> None:
+        row = vector.reshape(1, -1).astype(np.float32)
+        self.vectors = row if self.vectors is None else np.vstack([self.vectors, row])
+        self.entries.append(entry)
+
+    def keep(self, mask: np.ndarray) -> None:
+        self.entries = [e for e, k in zip(self.entries, mask) if k]
+        self.vectors = self.vectors[mask] if self.entries else None
+
+
+def _norm_meta(value: Optional[str]) -> Optional[str]:
+    value = (value or "").strip().upper()
+    return value or None
+
+
+def _hash_text(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8", "ignore")).hexdigest()[:16]
+
+
+def _load_default_embedder(model_name: str) -> Optional[Embedder]:
+    """Load the sentence-transformers model, or None if unavailable."""
+    if not SENTENCE_TRANSFORMERS_AVAILABLE:
+        log.info(
+            "semantic_cache_disabled reason=sentence_transformers_missing "
+            "install_with: pip install sentence-transformers"
+        )
+        return None
+    try:
+        model = SentenceTransformer(model_name, device="cpu")
+    except Exception as e:
+        log.warning("semantic_cache_model_load_failed model=%s err=%s", model_name, e)
+        return None
+    log.info("semantic_cache_model_loaded model=%s", model_name)
+
+    def embed(texts: Sequence[str]) -> np.ndarray:
+        return model.encode(
+            list(texts), convert_to_numpy=True, normalize_embeddings=True
+        )
+
+    return embed
+
+
+class SemanticCache:
+    """
+    Embedding-based response cache with one cosine index per namespace.
+
+    Lookups are brute-force inner products over unit vectors. With a few
+    thousand entries per namespace that is a single small matrix-vector
+    product, which is faster than maintaining an approximate index.
+    """
+
+    # Per-feature similarity thresholds (prefix match, like LLMCache TTLs).
+    # SEC answers depend on exact amounts and item numbers, so they need a
+    # closer match than sentiment or classification prompts.
+    DEFAULT_THRESHOLDS = {
+        "sec_": 0.96,
+        "sentiment": 0.93,
+        "classification": 0.93,
+    }
+
+    def __init__(
+        self,
+        embedder: Optional[Embedder] = None,
+        thresholds: Optional[Dict[str, float]] = None,
+        default_threshold: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        audit_rate: Optional[float] = None,
+        audit_path: Optional[Path] = None,
+        model_name: Optional[str] = None,
+        enabled: Optional[bool] = None,
+    ):
+        if enabled is None:
+            enabled = os.getenv("FEATURE_LLM_SEMANTIC_CACHE", "1").lower() in (
+                "1",
+                "true",
+                "yes",
+                "on",
+            )
+        self.enabled = enabled
+        self.model_name = model_name or os.getenv(
+            "LLM_SEMANTIC_CACHE_MODEL", DEFAULT_MODEL
+        )
+        self.default_threshold = (
+            default_threshold
+            if default_threshold is not None
+            else float(os.getenv("LLM_SEMANTIC_CACHE_THRESHOLD", "0.94"))
+        )
+        self.thresholds = dict(self.DEFAULT_THRESHOLDS)
+        if thresholds:
+            self.thresholds.update(thresholds)
+        self.max_entries = max_entries or int(
+            os.getenv("LLM_SEMANTIC_CACHE_MAX_ENTRIES", "2000")
+        )
+        self.audit_rate = (
+            audit_rate
+            if audit_rate is not None
+            else float(os.getenv("LLM_SEMANTIC_CACHE_AUDIT_RATE", "0.05"))
+        )
+        self.audit_path = Path(
+            audit_path or os.getenv("LLM_SEMANTIC_CACHE_AUDIT_PATH", DEFAULT_AUDIT_PATH)
+        )
+
+        self._embedder = embedder
+        self._embedder_loaded = embedder is not None
+        self._indexes: Dict[str, _NamespaceIndex] = {}
+        self._pending_audits: Dict[str, _Entry] = {}
+        self._lock = threading.Lock()
+        self._rng = random.Random()
+
+        self.stats = {
+            "lookups": 0,
+            "hits": 0,
+            "misses": 0,
+            "rejected_ticker": 0,
+            "rejected_filing_type": 0,
+            "rejected_doc_id": 0,
+            "audits": 0,
+            "false_hits": 0,
+            "errors": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Embedding
+    # ------------------------------------------------------------------
+
+    def _get_embedder(self) -> Optional[Embedder]:
+        if not self._embedder_loaded:
+            # Loaded on first use so importing callers never pays for the model
+            with self._lock:
+                if not self._embedder_loaded:
+                    self._embedder = _load_default_embedder(self.model_name)
+                    self._embedder_loaded = True
+        return self._embedder
+
+    @property
+    def available(self) -> bool:
+        """True when enabled and an embedding model could be loaded."""
+        return self.enabled and self._get_embedder() is not None
+
+    def _embed(self, texts: Sequence[str]) -> Optional[np.ndarray]:
+        embedder = self._get_embedder()
+        if embedder is None:
+            return None
+        try:
+            vectors = np.asarray(
+                embedder([t[:MAX_EMBED_CHARS] for t in texts]), dtype=np.float32
+            )
+        except Exception as e:
+            self.stats["errors"] += 1
+            log.warning("semantic_cache_embed_failed err=%s", e)
+            return None
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def threshold_for(self, namespace: str) -> float:
+        """Similarity threshold for a namespace (exact, then prefix match)."""
+        if namespace in self.thresholds:
+            return self.thresholds[namespace]
+        for prefix, threshold in self.thresholds.items():
+            if namespace.startswith(prefix):
+                return threshold
+        return self.default_threshold
+
+    # ------------------------------------------------------------------
+    # Lookup / store
+    # ------------------------------------------------------------------
+
+    def lookup(
+        self,
+        namespace: str,
+        text: str,
+        ticker: Optional[str] = None,
+        filing_type: Optional[str] = None,
+        audit_key: Optional[str] = None,
+        doc_id: Optional[str] = None,
+    ) -> Optional[SemanticHit]:
+        """
+        Return the closest cached payload above the namespace threshold.
+
+        Parameters
+        ----------
+        namespace : str
+            Feature namespace (e.g. ``sec_8k_item_1.01``)
+        text : str
+            Normalized prompt or document text
+        ticker, filing_type : str, optional
+            Must equal the cached entry's values for a hit
+        audit_key : str, optional
+            Identifier the caller will pass to ``add`` for the fresh answer.
+            Required for the hit to be sampled for a false-hit audit.
+        doc_id : str, optional
+            Document identifier; an entry stored with a different ID is
+            rejected (an entry or query without one matches any ID)
+
+        Returns
+        -------
+        SemanticHit or None
+        """
+        if not self.enabled or not text:
+            return None
+        with self._lock:
+            index = self._indexes.get(namespace)
+            if index is None or not index.entries:
+                self.stats["lookups"] += 1
+                self.stats["misses"] += 1
+                return None
+
+        vectors = self._embed([text])
+        if vectors is None:
+            return None
+        query = vectors[0]
+        ticker = _norm_meta(ticker)
+        filing_type = _norm_meta(filing_type)
+        doc_id = doc_id or None
+        threshold = self.threshold_for(namespace)
+        now = time.time()
+
+        with self._lock:
+            self.stats["lookups"] += 1
+            index = self._indexes.get(namespace)
+            if index is None or index.vectors is None:
+                self.stats["misses"] += 1
+                return None
+
+            scores = index.vectors @ query
+            best = None
+            rejected = None
+            for i in np.argsort(-scores):
+                score = float(scores[i])
+                if score < threshold:
+                    break
+                entry = index.entries[i]
+                if entry.expires_at <= now:
+                    continue
+                if entry.ticker != ticker:
+                    rejected = rejected or ("ticker", score, entry)
+                    continue
+                if entry.filing_type != filing_type:
+                    rejected = rejected or ("filing_type", score, entry)
+                    continue
+                if doc_id and entry.doc_id and entry.doc_id != doc_id:
+                    rejected = rejected or ("doc_id", score, entry)
+                    continue
+                best = (score, entry)
+                break
+
+            if best is None:
+                self.stats["misses"] += 1
+                if rejected is not None:
+                    reason, score, entry = rejected
+                    self.stats[f"rejected_{reason}"] += 1
+            else:
+                score, entry = best
+                sampled = (
+                    audit_key is not None
+                    and self.audit_rate > 0
+                    and self._rng.random() < self.audit_rate
+                )
+                if sampled:
+                    # Pay for the call and compare answers when it is stored
+                    self._pending_audits[audit_key] = entry
+                    self.stats["misses"] += 1
+                else:
+                    self.stats["hits"] += 1
+
+        query_hash = _hash_text(text)
+        if best is None:
+            if rejected is not None:
+                log.debug(
+                    "semantic_cache_rejected namespace=%s reason=%s_mismatch sim=%.3f",
+                    namespace,
+                    reason,
+                    score,
+                )
+                self._audit(
+                    "rejected",
+                    namespace,
+                    similarity=score,
+                    reason=f"{reason}_mismatch",
+                    query_hash=query_hash,
+                    match_hash=entry.text_hash,
+                    ticker=ticker,
+                    filing_type=filing_type,
+                    cached_ticker=entry.ticker,
+                    cached_filing_type=entry.filing_type,
+                    doc_id=doc_id,
+                    cached_doc_id=entry.doc_id,
+                )
+            return None
+
+        self._audit(
+            "audit_sampled" if sampled else "hit",
+            namespace,
+            similarity=score,
+            threshold=threshold,
+            query_hash=query_hash,
+            match_hash=entry.text_hash,
+            ticker=ticker,
+            filing_type=filing_type,
+        )
+        if sampled:
+            return None
+
+        log.info(
+            "semantic_cache_hit namespace=%s sim=%.3f threshold=%.2f ticker=%s",
+            namespace,
+            score,
+            threshold,
+            ticker,
+        )
+        return SemanticHit(
+            payload=entry.payload,
+            similarity=score,
+            namespace=namespace,
+            matched_hash=entry.text_hash,
+        )
+
+    def add(
+        self,
+        namespace: str,
+        text: str,
+        payload: str,
+        ticker: Optional[str] = None,
+        filing_type: Optional[str] = None,
+        ttl_seconds: float = 86400,
+        answer_text: Optional[str] = None,
+        audit_key: Optional[str] = None,
+        doc_id: Optional[str] = None,
+    ) -> bool:
+        """
+        Index a fresh response.
+
+        Parameters
+        ----------
+        namespace, text, ticker, filing_type, doc_id
+            As for ``lookup``
+        payload : str
+            Serialized response returned on later hits
+        ttl_seconds : float
+            Entry lifetime
+        answer_text : str, optional
+            Text compared during false-hit audits (default: payload)
+        audit_key : str, optional
+            Completes a pending audit sampled by ``lookup``
+
+        Returns
+        -------
+        bool
+            True if the entry was indexed
+        """
+        if not self.enabled or not text:
+            return False
+        answer_text = answer_text if answer_text is not None else payload
+
+        with self._lock:
+            pending = self._pending_audits.pop(audit_key, None) if audit_key else None
+
+        texts = [text]
+        if pending is not None and pending.answer_text != answer_text:
+            texts += [pending.answer_text, answer_text]
+        vectors = self._embed(texts)
+        if vectors is None:
+            return False
+
+        if pending is not None:
+            if len(texts) == 1:
+                agreement = 1.0
+            else:
+                agreement = float(vectors[1] @ vectors[2])
+            self._record_audit(namespace, pending, agreement)
+
+        entry = _Entry(
+            text_hash=_hash_text(text),
+            payload=payload,
+            answer_text=answer_text,
+            ticker=_norm_meta(ticker),
+            filing_type=_norm_meta(filing_type),
+            expires_at=time.time() + ttl_seconds,
+            doc_id=doc_id or None,
+        )
+        with self._lock:
+            index = self._indexes.setdefault(namespace, _NamespaceIndex())
+            index.append(vectors[0], entry)
+            if len(index.entries) > self.max_entries:
+                self._prune(index)
+        return True
+
+    def _prune(self, index: _NamespaceIndex) -> None:
+        """Drop expired entries, then the oldest beyond max_entries."""
+        now = time.time()
+        mask = np.array([e.expires_at > now for e in index.entries], dtype=bool)
+        excess = int(mask.sum()) - self.max_entries
+        if excess > 0:
+            live = np.flatnonzero(mask)
+            mask[live[:excess]] = False
+        index.keep(mask)
+
+    # ------------------------------------------------------------------
+    # Auditing
+    # ------------------------------------------------------------------
+
+    def _record_audit(self, namespace: str, entry: _Entry, agreement: float) -> None:
+        agree = agreement >= AUDIT_AGREE_THRESHOLD
+        with self._lock:
+            self.stats["audits"] += 1
+            if not agree:
+                self.stats["false_hits"] += 1
+        if not agree:
+            log.warning(
+                "semantic_cache_false_hit namespace=%s agreement=%.3f match=%s",
+                namespace,
+                agreement,
+                entry.text_hash,
+            )
+        self._audit(
+            "audit_result",
+            namespace,
+            agreement=round(agreement, 4),
+            agree=agree,
+            match_hash=entry.text_hash,
+        )
+
+    def _audit(self, event: str, namespace: str, **fields: Any) -> None:
+        record = {"ts": time.time(), "event": event, "namespace": namespace}
+        for key, value in fields.items():
+            record[key] = round(value, 4) if isinstance(value, float) else value
+        try:
+            self.audit_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.audit_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+        except Exception as e:
+            log.debug("semantic_cache_audit_write_failed err=%s", e)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit rate, metadata rejections and audited false-hit rate."""
+        with self._lock:
+            stats = dict(self.stats)
+            stats["entries"] = sum(len(i.entries) for i in self._indexes.values())
+            stats["namespaces"] = len(self._indexes)
+        lookups = stats["lookups"]
+        stats["hit_rate_pct"] = (
+            round(stats["hits"] / lookups * 100, 1) if lookups else 0.0
+        )
+        stats["false_hit_rate_pct"] = (
+            round(stats["false_hits"] / stats["audits"] * 100, 1)
+            if stats["audits"]
+            else 0.0
+        )
+        return stats
+
+
+# Global instance shared by LLMCache and SECLLMCache (one model in memory)
+_semantic_cache: Optional[SemanticCache] = None
+_semantic_cache_lock = threading.Lock()
+
+
+def get_semantic_cache() -> SemanticCache:
+    """Get or create the process-wide semantic cache."""
+    global _semantic_cache
+    if _semantic_cache is None:
+        with _semantic_cache_lock:
+            if _semantic_cache is None:
+                _semantic_cache = SemanticCache()
+    return _semantic_cache
@@ -0,0 +1,599 @@
+"""
+Sharded Multi-Process Runner
+============================
+
+Runs the runner pipeline across processes so the CPU-bound stages are no
+longer capped at one core by the GIL. The stages are HTML cleaning,
+sentiment models and classification. With ``RUNNER_WORKERS=N`` (or
+``--workers N``) the runner splits into::
+
+    ingest (runner_main)   fetch -> dedupe -> scanners -> ticker enrichment
+        |   items sharded by crc32(ticker) % N
+        v
+    shard-0 ... shard-N-1  durable local queue (RUNNER_SHARD_QUEUE_PATH)
+        v
+    N shard workers        _cycle(items=batch): gates, classify, enrich,
+        |                  alert payloads
+        v
+    delivery               send_alert_safe (Discord rate limits), seen
+                           store writes, accepted/rejected item logs
+
+The ingest process keeps everything else ``runner_main`` owns. That
+covers scheduling, heartbeats, health, MOA and the trading-engine
+lifecycle. Workers send their cycle counts back, so the heartbeat still
+reports pipeline totals.
+
+A ticker always maps to the same worker, so per-ticker state (enrichment
+caches, dedupe) stays in one process. The delivery process is the only
+writer of the seen store and the day-partitioned item logs. It re-checks
+the seen store before posting, so an item handed out twice while an earlier
+alert is still queued is only delivered once.
+
+The queues are a :class:`~catalyst_bot.durable_queue.DurableQueue`.
+Workers and delivery ack a batch only after they finish it. A batch held
+by a process that crashed is redelivered once its lease runs out, and the
+pool restarts the process. Work queued before a restart is picked up by
+the next pool.
+
+Environment Variables:
+    RUNNER_WORKERS: Shard worker processes; 0 runs the classic single
+        process runner (default: 0)
+    RUNNER_SHARD_QUEUE_PATH: SQLite file backing the process queues
+        (default: data/shard_queue.sqlite)
+    RUNNER_SHARD_BATCH: Items a worker pulls per pass (default: 25)
+    RUNNER_SHARD_VISIBILITY_SEC: Lease on a worker's batch before it is
+        handed to another worker (default: 900)
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import signal
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .durable_queue import DurableQueue
+from .logging_utils import get_logger
+from .metrics_registry import inc_counter, set_gauge
+
+log = get_logger("sharding")
+
+ROLE_SINGLE = "single"
+ROLE_INGEST = "ingest"
+ROLE_WORKER = "worker"
+ROLE_DELIVERY = "delivery"
+
+DELIVERY_TOPIC = "delivery"
+STATS_TOPIC = "stats"
+
+# Delivery message kinds
+KIND_ALERT = "alert"
+KIND_SEEN = "seen"
+KIND_ITEM_LOG = "item_log"
+
+_role = ROLE_SINGLE
+_queue: Optional[DurableQueue] = None
+
+# Seen marks and item logs a worker produced for the batch in progress. They
+# go to the delivery process in one put_many per batch (one transaction)
+# instead of one put per message; alerts are forwarded immediately.
+_outbox: List[Tuple[Optional[str], Any]] = []
+_outbox_lock = threading.Lock()
+
+
+def configured_workers() -> int:
+    """Shard worker count from RUNNER_WORKERS (0 = single process)."""
+    try:
+        return max(0, int(os.getenv("RUNNER_WORKERS", "0") or 0))
+    except ValueError:
+        return 0
+
+
+def _queue_path() -> Path:
+    return Path(os.getenv("RUNNER_SHARD_QUEUE_PATH", "data/shard_queue.sqlite"))
+
+
+def _batch_size() -> int:
+    try:
+        return max(1, int(os.getenv("RUNNER_SHARD_BATCH", "25") or 25))
+    except ValueError:
+        return 25
+
+
+def _visibility_timeout() -> float:
+    try:
+        return max(1.0, float(os.getenv("RUNNER_SHARD_VISIBILITY_SEC", "900") or 900))
+    except ValueError:
+        return 900.0
+
+
+def _open_queue(path: Path) -> DurableQueue:
+    return DurableQueue(path, visibility_timeout=_visibility_timeout())
+
+
+def role() -> str:
+    """This process's part in the pipeline (``ROLE_*``)."""
+    return _role
+
+
+def shard_for(key: str, shards: int) -> int:
+    """Stable shard index for a ticker (or item id) across processes."""
+    if shards <= 1:
+        return 0
+    return zlib.crc32((key or "").strip().upper().encode("utf-8")) % shards
+
+
+def shard_topic(index: int) -> str:
+    return f"shard-{index}"
+
+
+# ============================================================================
+# Ingest side
+# ============================================================================
+
+
+def dispatch(
+    items: List[Dict[str, Any]],
+    market_info: Optional[dict] = None,
+    seen_store: Any = None,
+) -> int:
+    """Hand a cycle's deduped items to the shard workers by ticker hash.
+
+    Items already in the seen store are dropped here so workers do not
+    re-screen them. An item still waiting in its shard from an earlier
+    cycle is not queued twice. Returns the number of items queued.
+    """
+    pool = _pool
+    if pool is None or _queue is None:
+        return 0
+    by_shard: Dict[int, List[Tuple[Optional[str], Any]]] = {}
+    skipped_seen = 0
+    for it in items:
+        item_id = it.get("id") or it.get("link") or ""
+        try:
+            if item_id and seen_store is not None and seen_store.is_seen(item_id):
+                skipped_seen += 1
+                continue
+        except Exception:
+            pass
+        key = (it.get("ticker") or "").strip() or item_id
+        message = {"item": it, "market_info": market_info}
+        by_shard.setdefault(shard_for(key, pool.workers), []).append(
+            (item_id or None, message)
+        )
+
+    queued = 0
+    for index, messages in by_shard.items():
+        try:
+            queued += _queue.put_many(shard_topic(index), messages)
+        except Exception as e:
+            log.warning("shard_dispatch_failed shard=%d err=%s", index, str(e))
+    pool.dispatched += queued
+    inc_counter("shard_items_dispatched_total", queued)
+    log.info(
+        "shard_dispatch items=%d queued=%d skipped_seen=%d shards=%d",
+        len(items),
+        queued,
+        skipped_seen,
+        len(by_shard),
+    )
+    return queued
+
+
+def drain_stats() -> List[Dict[str, Any]]:
+    """Cycle counts reported by the workers since the last call."""
+    if _queue is None:
+        return []
+    jobs = _queue.get(STATS_TOPIC, limit=10_000)
+    _queue.ack(jobs)
+    stats = [job.message for job in jobs]
+    if _pool is not None:
+        _pool.processed += sum(int(s.get("processed", 0)) for s in stats)
+    return stats
+
+
+# ============================================================================
+# Worker side
+# ============================================================================
+
+
+def forward_alert(payload: Dict[str, Any]) -> bool:
+    """Queue an alert payload for the delivery process."""
+    if _queue is None:
+        return False
+    return _queue.put(DELIVERY_TOPIC, (KIND_ALERT, payload))
+
+
+class ForwardingSeenStore:
+    """Seen store view for workers: reads locally, writes via delivery."""
+
+    def __init__(self, store: Any):
+        self._store = store
+
+    def is_seen(self, item_id: str) -> bool:
+        return bool(self._store is not None and self._store.is_seen(item_id))
+
+    def mark_seen(self, item_id: str, ts: Optional[int] = None) -> None:
+        if _queue is not None and item_id:
+            _buffer_delivery((KIND_SEEN, item_id))
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._store, name)
+
+
+def wrap_seen_store(store: Any) -> Any:
+    """Route seen-store writes to the delivery process in worker role."""
+    if _role != ROLE_WORKER:
+        return store
+    return ForwardingSeenStore(store)
+
+
+def _forward_item_log(legacy_path: Path, fields: Tuple[str, ...], record: Dict) -> None:
+    if _queue is not None:
+        _buffer_delivery((KIND_ITEM_LOG, (str(legacy_path), fields, record)))
+
+
+def _buffer_delivery(message: Tuple[str, Any]) -> None:
+    with _outbox_lock:
+        _outbox.append((None, message))
+
+
+def _flush_forwarded(queue: DurableQueue) -> int:
+    """Send the buffered seen marks and item logs in one transaction."""
+    with _outbox_lock:
+        messages = list(_outbox)
+        _outbox.clear()
+    if not messages:
+        return 0
+    return queue.put_many(DELIVERY_TOPIC, messages)
+
+
+def run_worker(
+    queue: DurableQueue,
+    index: int,
+    stop: Any,
+    process_batch: Callable[[List[Dict[str, Any]], Optional[dict]], Dict[str, Any]],
+    batch_size: int = 25,
+) -> None:
+    """Pull this shard's items in batches and run them through the pipeline.
+
+    A batch is acked once processed and its seen marks and item logs are
+    queued for delivery; a batch that raises is released for a retry (and
+    dead-lettered after the queue's ``max_attempts``).
+    """
+    topic = shard_topic(index)
+    while not stop.is_set():
+        jobs = queue.get(topic, limit=batch_size, timeout=1.0, stop=stop)
+        if not jobs:
+            continue
+        items = [job.message["item"] for job in jobs]
+        market_info = jobs[-1].message.get("market_info")
+        t0 = time.time()
+        try:
+            stats = dict(process_batch(items, market_info) or {})
+        except Exception as e:
+            log.error(
+                "shard_batch_failed shard=%d err=%s", index, str(e), exc_info=True
+            )
+            # Alerts already sent for part of the batch keep their seen marks
+            _flush_forwarded(queue)
+            queue.nack(jobs, delay=30.0)
+            queue.put(STATS_TOPIC, {"shard": index, "processed": 0, "errors": 1})
+            continue
+        stats.update(shard=index, processed=len(items), seconds=time.time() - t0)
+        _flush_forwarded(queue)
+        queue.put(STATS_TOPIC, stats)
+        queue.ack(jobs)
+
+
+def _worker_main(index: int, queue_path: str, stop: Any, batch_size: int) -> None:
+    """Process entry point for a shard worker."""
+    global _role, _queue
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _role, _queue = ROLE_WORKER, _open_queue(Path(queue_path))
+
+    from . import partitioned_jsonl, runner
+    from .config import get_settings
+    from .logging_utils import setup_logging
+
+    settings = get_settings()
+    setup_logging(settings.log_level)
+    worker_log = get_logger(f"runner.shard{index}")
+    # Item logs are written by the delivery process only
+    partitioned_jsonl.set_append_sink(_forward_item_log)
+    worker_log.info("shard_worker_started shard=%d pid=%d", index, os.getpid())
+
+    def process_batch(items, market_info):
+        runner.LAST_CYCLE_STATS = {}
+        runner._cycle(worker_log, settings, market_info=market_info, items=items)
+        return dict(runner.LAST_CYCLE_STATS)
+
+    run_worker(_queue, index, stop, process_batch, batch_size=batch_size)
+    worker_log.info("shard_worker_stopped shard=%d", index)
+
+
+# ============================================================================
+# Delivery side
+# ============================================================================
+
+
+class _Deliverer:
+    """Single owner of alert posting, seen-store writes and item logs."""
+
+    def __init__(self, send: Callable[[Dict[str, Any]], bool], seen_store: Any):
+        self.send = send
+        self.seen_store = seen_store
+        # Items whose alert failed; a worker's follow-up seen mark is dropped
+        # so the item is retried next cycle, as in the single-process runner
+        self._failed: "OrderedDict[str, bool]" = OrderedDict()
+
+    def handle(self, messages: List[Tuple[str, Any]]) -> Dict[str, int]:
+        from .partitioned_jsonl import flush_all, get_log
+
+        counts = {"sent": 0, "failed": 0, "duplicate": 0}
+        for kind, body in messages:
+            try:
+                if kind == KIND_ALERT:
+                    counts[self._alert(body)] += 1
+                elif kind == KIND_SEEN:
+                    if body not in self._failed:
+                        self._mark(body)
+                elif kind == KIND_ITEM_LOG:
+                    legacy_path, fields, record = body
+                    get_log(Path(legacy_path), fields).append(record)
+            except Exception as e:
+                log.warning("delivery_message_failed kind=%s err=%s", kind, str(e))
+        flush_all()
+        return counts
+
+    def _alert(self, payload: Dict[str, Any]) -> str:
+        item = payload.get("item") or {}
+        item_id = item.get("id") or ""
+        if item_id and self._is_seen(item_id):
+            return "duplicate"
+        try:
+            ok = self.send(payload)
+        except Exception as e:
+            log.warning("delivery_send_failed item_id=%s err=%s", item_id, str(e))
+            ok = False
+        if not ok:
+            if item_id:
+                self._failed[item_id] = True
+                while len(self._failed) > 10_000:
+                    self._failed.popitem(last=False)
+            return "failed"
+        if item_id:
+            self._failed.pop(item_id, None)
+            self._mark(item_id)
+        return "sent"
+
+    def _is_seen(self, item_id: str) -> bool:
+        try:
+            return bool(
+                self.seen_store is not None and self.seen_store.is_seen(item_id)
+            )
+        except Exception:
+            return False
+
+    def _mark(self, item_id: str) -> None:
+        if self.seen_store is not None and item_id:
+            self.seen_store.mark_seen(item_id)
+
+
+def run_delivery(
+    queue: DurableQueue,
+    stop: Any,
+    send: Callable[[Dict[str, Any]], bool],
+    seen_store: Any,
+) -> None:
+    """Drain the delivery topic until ``stop`` is set."""
+    deliverer = _Deliverer(send, seen_store)
+    while not stop.is_set():
+        jobs = queue.get(DELIVERY_TOPIC, limit=100, timeout=1.0, stop=stop)
+        if not jobs:
+            continue
+        batch = [job.message for job in jobs]
+        counts = deliverer.handle(batch)
+        queue.ack(jobs)
+        if counts["sent"] or counts["failed"] or counts["duplicate"]:
+            log.info(
+                "delivery_batch messages=%d sent=%d failed=%d duplicate=%d",
+                len(batch),
+                counts["sent"],
+                counts["failed"],
+                counts["duplicate"],
+            )
+
+
+def _delivery_main(queue_path: str, stop: Any) -> None:
+    """Process entry point for the delivery process."""
+    global _role, _queue
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _role, _queue = ROLE_DELIVERY, _open_queue(Path(queue_path))
+
+    from . import runner
+    from .alerts import send_alert_safe
+    from .config import get_settings
+    from .logging_utils import setup_logging
+
+    setup_logging(get_settings().log_level)
+    delivery_log = get_logger("runner.delivery")
+    delivery_log.info("delivery_started pid=%d", os.getpid())
+    run_delivery(_queue, stop, send_alert_safe, runner._open_seen_store(delivery_log))
+    delivery_log.info("delivery_stopped")
+
+
+# ============================================================================
+# Process pool (owned by the ingest process)
+# ============================================================================
+
+
+class ShardPool:
+    """Starts, supervises and stops the worker and delivery processes."""
+
+    def __init__(self, workers: int, queue_path: Path, batch_size: int = 25):
+        self.workers = workers
+        self.queue_path = Path(queue_path)
+        self.batch_size = batch_size
+        self.dispatched = 0
+        self.processed = 0
+        self._ctx = multiprocessing.get_context("spawn")
+        self._stop = self._ctx.Event()
+        self._procs: Dict[str, Any] = {}
+
+    def _spawn(self, name: str) -> None:
+        if name == ROLE_DELIVERY:
+            target, args = _delivery_main, (str(self.queue_path), self._stop)
+        else:
+            index = int(name.rsplit("-", 1)[1])
+            target = _worker_main
+            args = (index, str(self.queue_path), self._stop, self.batch_size)
+        proc = self._ctx.Process(target=target, args=args, name=f"catalyst-{name}")
+        proc.daemon = True
+        proc.start()
+        self._procs[name] = proc
+
+    def start(self) -> None:
+        self._spawn(ROLE_DELIVERY)
+        for index in range(self.workers):
+            self._spawn(shard_topic(index))
+        log.info(
+            "shard_pool_started workers=%d queue=%s", self.workers, self.queue_path
+        )
+
+    def ensure_running(self) -> int:
+        """Restart any process that exited; returns how many were restarted."""
+        restarted = 0
+        for name, proc in list(self._procs.items()):
+            if not proc.is_alive() and not self._stop.is_set():
+                log.warning(
+                    "shard_process_died name=%s exitcode=%s", name, proc.exitcode
+                )
+                self._spawn(name)
+                restarted += 1
+        return restarted
+
+    def publish_metrics(self, queue: DurableQueue) -> None:
+        try:
+            set_gauge("shard_queue_depth", queue.depth())
+            for index in range(self.workers):
+                queue.publish_metrics(shard_topic(index))
+            queue.publish_metrics(DELIVERY_TOPIC)
+        except Exception:
+            pass
+
+    def idle(self, queue: DurableQueue) -> bool:
+        """Every shard batch and delivery message has been acked."""
+        shard_depth = sum(queue.depth(shard_topic(i)) for i in range(self.workers))
+        return shard_depth == 0 and queue.depth(DELIVERY_TOPIC) == 0
+
+    def stop(
+        self, queue: Optional[DurableQueue] = None, drain_timeout: float = 0.0
+    ) -> None:
+        """Optionally wait for queued work to finish, then stop all processes."""
+        deadline = time.monotonic() + drain_timeout
+        while queue is not None and time.monotonic() < deadline:
+            drain_stats()
+            if self.idle(queue):
+                break
+            time.sleep(0.2)
+        self._stop.set()
+        for proc in self._procs.values():
+            proc.join(timeout=15)
+            if proc.is_alive():
+                proc.terminate()
+        log.info(
+            "shard_pool_stopped dispatched=%d processed=%d",
+            self.dispatched,
+            self.processed,
+        )
+
+
+_pool: Optional[ShardPool] = None
+
+
+def _rebalance(queue: DurableQueue, workers: int) -> int:
+    """Re-shard items left on shards this pool no longer has."""
+    moved = 0
+    for topic in queue.topics():
+        prefix, _, index = topic.partition("-")
+        if prefix != "shard" or not index.isdigit() or int(index) < workers:
+            continue
+        while True:
+            jobs = queue.get(topic, limit=500, visibility_timeout=60.0)
+            if not jobs:
+                break
+            for job in jobs:
+                it = job.message.get("item") or {}
+                key = (it.get("ticker") or "").strip() or job.key or ""
+                queue.put(
+                    shard_topic(shard_for(key, workers)), job.message, key=job.key
+                )
+            queue.ack(jobs)
+            moved += len(jobs)
+    if moved:
+        log.info("shard_rebalanced items=%d workers=%d", moved, workers)
+    return moved
+
+
+def start_pool(workers: Optional[int] = None) -> Optional[ShardPool]:
+    """Switch this process to the ingest role and start the worker pool."""
+    global _role, _queue, _pool
+    workers = configured_workers() if workers is None else workers
+    if workers <= 0:
+        return None
+    _queue = _open_queue(_queue_path())
+    _queue.clear(STATS_TOPIC)
+    _rebalance(_queue, workers)
+    _pool = ShardPool(workers, _queue.path, batch_size=_batch_size())
+    _pool.start()
+    _role = ROLE_INGEST
+    return _pool
+
+
+def active_pool() -> Optional[ShardPool]:
+    return _pool
+
+
+def supervise() -> None:
+    """Per-cycle upkeep in the ingest process: restarts and queue gauges."""
+    if _pool is None or _queue is None:
+        return
+    _pool.ensure_running()
+    _pool.publish_metrics(_queue)
+
+
+def stop_pool(drain_timeout: float = 0.0) -> None:
+    """Stop the pool (after draining queued work for up to ``drain_timeout``)."""
+    global _role, _pool
+    if _pool is None:
+        return
+    _pool.stop(_queue, drain_timeout=drain_timeout)
+    _pool = None
+    _role = ROLE_SINGLE
+
+
+__all__ = [
+    "ROLE_DELIVERY",
+    "ROLE_INGEST",
+    "ROLE_SINGLE",
+    "ROLE_WORKER",
+    "ShardPool",
+    "configured_workers",
+    "dispatch",
+    "drain_stats",
+    "forward_alert",
+    "role",
+    "run_delivery",
+    "run_worker",
+    "shard_for",
+    "start_pool",
+    "stop_pool",
+    "supervise",
+    "wrap_seen_store",
+]
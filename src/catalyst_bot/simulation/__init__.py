@@ -59,6 +59,15 @@ from .config import TIME_PRESETS, SimulationConfig
 # Controller - Phase 5
 from .controller import SimulationController, SimulationSetupError
 
+# Cycle replay benchmark
+from .cycle_replay import (
+    BundleRecorder,
+    CycleReplayBench,
+    FixtureBundle,
+    StubServices,
+    compare_reports,
+)
+
 # Data fetcher - Phase 4
 from .data_fetcher import HistoricalDataFetcher
 
@@ -127,6 +136,12 @@ __all__ = [
     # Controller
     "SimulationController",
     "SimulationSetupError",
+    # Cycle replay benchmark
+    "BundleRecorder",
+    "CycleReplayBench",
+    "FixtureBundle",
+    "StubServices",
+    "compare_reports",
 ]
 
 __version__ = "0.1.0"
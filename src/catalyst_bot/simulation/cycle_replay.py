@@ -0,0 +1,789 @@
+"""
+Cycle replay benchmark - record live cycle inputs, replay them offline.
+
+Recording wraps the boundaries a cycle talks to the outside world through
+(feed fetch, price snapshots, LLM calls, SEC document fetches) and appends
+what they return to a fixture bundle directory. Replaying drives the real
+``runner._cycle`` over the recorded cycles with local stand-ins:
+
+- feeds return the recorded items for each cycle
+- ``market`` serves the recorded quotes
+- an in-process HTTP stub answers the Ollama ``/api/generate`` API with the
+  recorded responses (configurable latency, jitter and 429 rate) and acts
+  as the Discord webhook sink
+- every other outbound connection is refused and counted
+
+Bundle layout:
+    manifest.json   - version and recording start time
+    items.jsonl     - {"key", "item"} - each distinct feed item, stored once
+    cycles.jsonl    - {"ts", "items": [key, ...]} - one line per fetch
+    quotes.jsonl    - {"ticker", "last", "prev"} - last line per ticker wins
+    llm.jsonl       - {"key", "response"} - keyed by prompt hash
+    sec_docs.jsonl  - {"link", "text"}
+
+Usage:
+    # Record while the bot runs normally
+    CYCLE_REPLAY_RECORD_DIR=data/replay/2025-12-09 python -m catalyst_bot.runner
+
+    # Replay
+    from catalyst_bot.simulation.cycle_replay import CycleReplayBench, FixtureBundle
+
+    bundle = FixtureBundle.load("data/replay/2025-12-09")
+    report = CycleReplayBench(bundle, llm_latency_ms=400, llm_429_rate=0.05).run()
+"""
+
+import copy
+import functools
+import hashlib
+import json
+import logging
+import math
+import os
+import random
+import socket
+import tempfile
+import threading
+import time
+import tracemalloc
+from dataclasses import replace
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+BUNDLE_VERSION = 1
+DEFAULT_LLM_RESPONSE = '{"sentiment": 0.0, "confidence": 0.0}'
+LOCAL_HOSTS = frozenset({"127.0.0.1", "localhost", "::1"})
+
+
+def prompt_key(prompt: str) -> str:
+    """Stable key for an LLM prompt."""
+    return hashlib.sha1(prompt.encode("utf-8", errors="replace")).hexdigest()[:20]
+
+
+def _item_key(item: Dict[str, Any]) -> str:
+    raw = json.dumps(item, sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def _read_jsonl(path: Path) -> List[Dict[str, Any]]:
+    records = []
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+    except FileNotFoundError:
+        pass
+    return records
+
+
+def _dump(record: Dict[str, Any]) -> str:
+    return json.dumps(record, separators=(",", ":"), default=str) + "\n"
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """Process RSS high-water mark in MB (current RSS where unavailable)."""
+    try:
+        import resource
+
+        # ru_maxrss is KB on Linux
+        return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0, 1)
+    except Exception:
+        pass
+    try:
+        import psutil
+
+        return round(psutil.Process().memory_info().rss / (1024 * 1024), 1)
+    except Exception:
+        return None
+
+
+class FixtureBundle:
+    """Recorded cycle inputs loaded into memory."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.manifest: Dict[str, Any] = {}
+        self.cycles: List[List[Dict[str, Any]]] = []
+        self.quotes: Dict[str, Tuple[Optional[float], Optional[float]]] = {}
+        self.llm: Dict[str, str] = {}
+        self.sec_docs: Dict[str, str] = {}
+
+    @classmethod
+    def load(cls, path) -> "FixtureBundle":
+        """Load a bundle directory written by :class:`BundleRecorder`."""
+        bundle = cls(path)
+        manifest_path = bundle.path / "manifest.json"
+        if not manifest_path.exists():
+            raise FileNotFoundError(f"No fixture bundle at {bundle.path}")
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            bundle.manifest = json.load(f)
+
+        items = {
+            rec["key"]: rec["item"]
+            for rec in _read_jsonl(bundle.path / "items.jsonl")
+            if "key" in rec
+        }
+        for rec in _read_jsonl(bundle.path / "cycles.jsonl"):
+            bundle.cycles.append([items[k] for k in rec.get("items", []) if k in items])
+        for rec in _read_jsonl(bundle.path / "quotes.jsonl"):
+            bundle.quotes[rec["ticker"]] = (rec.get("last"), rec.get("prev"))
+        for rec in _read_jsonl(bundle.path / "llm.jsonl"):
+            bundle.llm[rec["key"]] = rec["response"]
+        for rec in _read_jsonl(bundle.path / "sec_docs.jsonl"):
+            bundle.sec_docs[rec["link"]] = rec["text"]
+        return bundle
+
+    def save(self) -> None:
+        """Write the in-memory bundle to ``self.path``, replacing its files."""
+        self.path.mkdir(parents=True, exist_ok=True)
+        manifest = dict(self.manifest)
+        manifest.setdefault("version", BUNDLE_VERSION)
+        manifest.setdefault("created_at", datetime.now(timezone.utc).isoformat())
+        with open(self.path / "manifest.json", "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+
+        written = set()
+        item_lines, cycle_lines = [], []
+        for cycle in self.cycles:
+            keys = []
+            for item in cycle:
+                key = _item_key(item)
+                keys.append(key)
+                if key not in written:
+                    written.add(key)
+                    item_lines.append(_dump({"key": key, "item": item}))
+            cycle_lines.append(_dump({"items": keys}))
+        with open(self.path / "items.jsonl", "w", encoding="utf-8") as f:
+            f.writelines(item_lines)
+        with open(self.path / "cycles.jsonl", "w", encoding="utf-8") as f:
+            f.writelines(cycle_lines)
+        with open(self.path / "quotes.jsonl", "w", encoding="utf-8") as f:
+            for ticker, (last, prev) in self.quotes.items():
+                f.write(_dump({"ticker": ticker, "last": last, "prev": prev}))
+        with open(self.path / "llm.jsonl", "w", encoding="utf-8") as f:
+            for key, response in self.llm.items():
+                f.write(_dump({"key": key, "response": response}))
+        with open(self.path / "sec_docs.jsonl", "w", encoding="utf-8") as f:
+            for link, text in self.sec_docs.items():
+                f.write(_dump({"link": link, "text": text}))
+
+    @property
+    def item_count(self) -> int:
+        return sum(len(c) for c in self.cycles)
+
+
+_MISSING = object()
+
+
+class _Patches:
+    """Attribute swaps that are undone in reverse order."""
+
+    def __init__(self):
+        self._undo: List[Tuple[Any, str, Any]] = []
+
+    def set(self, target: Any, name: str, value: Any) -> Any:
+        original = getattr(target, name, _MISSING)
+        self._undo.append((target, name, original))
+        setattr(target, name, value)
+        return original
+
+    def restore(self) -> None:
+        while self._undo:
+            target, name, original = self._undo.pop()
+            if original is _MISSING:
+                delattr(target, name)
+            else:
+                setattr(target, name, original)
+
+
+class BundleRecorder:
+    """
+    Append live cycle inputs to a fixture bundle.
+
+    Wraps module attributes in place, so it only sees calls that look the
+    function up through its module (``feeds.fetch_pr_feeds(...)``), which is
+    how the runner calls them. Recording failures are logged and never
+    propagate into the cycle.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._patches = _Patches()
+        self._item_keys = set()
+        self._llm_keys = set()
+        for rec in _read_jsonl(self.path / "items.jsonl"):
+            self._item_keys.add(rec.get("key"))
+        for rec in _read_jsonl(self.path / "llm.jsonl"):
+            self._llm_keys.add(rec.get("key"))
+
+    def install(self) -> "BundleRecorder":
+        from .. import feeds, llm_client, llm_hybrid, market, sec_document_fetcher
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        manifest_path = self.path / "manifest.json"
+        if not manifest_path.exists():
+            with open(manifest_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "version": BUNDLE_VERSION,
+                        "created_at": datetime.now(timezone.utc).isoformat(),
+                    },
+                    f,
+                    indent=2,
+                )
+
+        self._wrap(feeds, "fetch_pr_feeds", self._wrap_feeds)
+        self._wrap(market, "get_last_price_snapshot", self._wrap_snapshot)
+        self._wrap(market, "batch_get_prices", self._wrap_batch_prices)
+        self._wrap(llm_client, "query_llm", self._wrap_query_llm)
+        self._wrap(llm_hybrid.HybridLLMRouter, "route_request", self._wrap_route)
+        self._wrap(sec_document_fetcher, "fetch_sec_document_text", self._wrap_sec_doc)
+        log.info("cycle_replay_recording path=%s", self.path)
+        return self
+
+    def uninstall(self) -> None:
+        self._patches.restore()
+
+    # -- writers -----------------------------------------------------------
+
+    def _append(self, name: str, lines: List[str]) -> None:
+        if not lines:
+            return
+        with self._lock:
+            with open(self.path / name, "a", encoding="utf-8") as f:
+                f.writelines(lines)
+
+    def record_cycle(self, items: List[Dict[str, Any]]) -> None:
+        keys, new_items = [], []
+        for item in items:
+            key = _item_key(item)
+            keys.append(key)
+            if key not in self._item_keys:
+                self._item_keys.add(key)
+                new_items.append(_dump({"key": key, "item": item}))
+        self._append("items.jsonl", new_items)
+        self._append(
+            "cycles.jsonl",
+            [_dump({"ts": datetime.now(timezone.utc).isoformat(), "items": keys})],
+        )
+
+    def record_quote(
+        self, ticker: str, last: Optional[float], prev: Optional[float]
+    ) -> None:
+        if not ticker or last is None:
+            return
+        self._append(
+            "quotes.jsonl",
+            [_dump({"ticker": ticker.upper(), "last": last, "prev": prev})],
+        )
+
+    def record_llm(self, prompt: str, response: Optional[str]) -> None:
+        if not prompt or not response:
+            return
+        key = prompt_key(prompt)
+        if key in self._llm_keys:
+            return
+        self._llm_keys.add(key)
+        self._append("llm.jsonl", [_dump({"key": key, "response": response})])
+
+    def record_sec_doc(self, link: str, text: Optional[str]) -> None:
+        if link and text:
+            self._append("sec_docs.jsonl", [_dump({"link": link, "text": text})])
+
+    # -- wrappers ----------------------------------------------------------
+
+    def _wrap(self, target: Any, name: str, factory: Callable) -> None:
+        self._patches.set(target, name, factory(getattr(target, name)))
+
+    def _safely(self, fn: Callable, *args) -> None:
+        try:
+            fn(*args)
+        except Exception as e:
+            log.warning("cycle_replay_record_failed fn=%s err=%s", fn.__name__, e)
+
+    def _wrap_feeds(self, original):
+        @functools.wraps(original)
+        def fetch_pr_feeds(*args, **kwargs):
+            items = original(*args, **kwargs)
+            self._safely(self.record_cycle, items or [])
+            return items
+
+        return fetch_pr_feeds
+
+    def _wrap_snapshot(self, original):
+        @functools.wraps(original)
+        def get_last_price_snapshot(ticker, *args, **kwargs):
+            last, prev = original(ticker, *args, **kwargs)
+            self._safely(self.record_quote, ticker, last, prev)
+            return last, prev
+
+        return get_last_price_snapshot
+
+    def _wrap_batch_prices(self, original):
+        @functools.wraps(original)
+        def batch_get_prices(tickers, *args, **kwargs):
+            results = original(tickers, *args, **kwargs)
+            for ticker, (last, change_pct) in (results or {}).items():
+                prev = None
+                if last is not None and change_pct is not None:
+                    prev = last / (1.0 + change_pct / 100.0)
+                self._safely(self.record_quote, ticker, last, prev)
+            return results
+
+        return batch_get_prices
+
+    def _wrap_query_llm(self, original):
+        @functools.wraps(original)
+        def query_llm(prompt, *args, **kwargs):
+            response = original(prompt, *args, **kwargs)
+            self._safely(self.record_llm, prompt, response)
+            return response
+
+        return query_llm
+
+    def _wrap_route(self, original):
+        @functools.wraps(original)
+        async def route_request(router, prompt, *args, **kwargs):
+            response = await original(router, prompt, *args, **kwargs)
+            self._safely(self.record_llm, prompt, response)
+            return response
+
+        return route_request
+
+    def _wrap_sec_doc(self, original):
+        @functools.wraps(original)
+        def fetch_sec_document_text(link, *args, **kwargs):
+            text = original(link, *args, **kwargs)
+            self._safely(self.record_sec_doc, link, text)
+            return text
+
+        return fetch_sec_document_text
+
+
+class StubServices:
+    """
+    Local HTTP stand-in for the Ollama LLM API and Discord webhooks.
+
+    ``POST .../api/generate`` answers with the recorded response for the
+    prompt after ``latency_ms`` (+ up to ``jitter_ms``), or 429 with
+    probability ``rate_429``. ``POST .../api/webhooks/...`` is accepted
+    and counted. The 429 draw is seeded so repeated runs see the same
+    sequence for the same request order.
+    """
+
+    def __init__(
+        self,
+        llm_responses: Optional[Dict[str, str]] = None,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        rate_429: float = 0.0,
+        default_response: str = DEFAULT_LLM_RESPONSE,
+        seed: int = 0,
+    ):
+        self.llm_responses = llm_responses or {}
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_429 = rate_429
+        self.default_response = default_response
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {
+            "llm_requests": 0,
+            "llm_rate_limited": 0,
+            "llm_misses": 0,
+            "discord_posts": 0,
+        }
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def llm_url(self) -> str:
+        return f"{self.base_url}/api/generate"
+
+    @property
+    def webhook_url(self) -> str:
+        return f"{self.base_url}/api/webhooks/0/replay"
+
+    def start(self) -> "StubServices":
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):  # noqa: A002
+                pass
+
+            def _reply(self, code: int, body: Optional[Dict[str, Any]] = None):
+                data = json.dumps(body).encode("utf-8") if body is not None else b""
+                self.send_response(code)
+                if data:
+                    self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                if data:
+                    self.wfile.write(data)
+
+            def do_HEAD(self):
+                self._reply(200)
+
+            def do_GET(self):
+                if self.path.startswith("/api/tags"):
+                    self._reply(200, {"models": []})
+                else:
+                    self._reply(200, {})
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                if self.path.endswith("/api/generate"):
+                    code, body = stub._handle_llm(raw)
+                    self._reply(code, body)
+                elif "/api/webhooks/" in self.path:
+                    with stub._lock:
+                        stub.stats["discord_posts"] += 1
+                        message_id = stub.stats["discord_posts"]
+                    if "wait=true" in self.path:
+                        self._reply(200, {"id": str(message_id), "channel_id": "0"})
+                    else:
+                        self._reply(204)
+                else:
+                    self._reply(404, {"error": "unknown route"})
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(
+            target=self._server.serve_forever, name="cycle-replay-stub", daemon=True
+        ).start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def _handle_llm(self, raw: bytes) -> Tuple[int, Dict[str, Any]]:
+        try:
+            prompt = str(json.loads(raw or b"{}").get("prompt") or "")
+        except ValueError:
+            prompt = ""
+        with self._lock:
+            self.stats["llm_requests"] += 1
+            limited = self._rng.random() < self.rate_429
+            delay = self.latency_ms + self._rng.uniform(0.0, self.jitter_ms)
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+        if limited:
+            with self._lock:
+                self.stats["llm_rate_limited"] += 1
+            return 429, {"error": "rate limit exceeded"}
+        response = self.llm_responses.get(prompt_key(prompt))
+        if response is None:
+            with self._lock:
+                self.stats["llm_misses"] += 1
+            response = self.default_response
+        return 200, {"response": response, "done": True}
+
+
+class _NetworkGuard:
+    """Refuse outbound connections to anything but the local stand-ins."""
+
+    def __init__(self):
+        self.blocked: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._patches = _Patches()
+
+    def _block(self, host: Any) -> None:
+        with self._lock:
+            self.blocked[str(host)] = self.blocked.get(str(host), 0) + 1
+        raise ConnectionRefusedError(f"cycle replay blocks network access to {host}")
+
+    def install(self) -> None:
+        guard = self
+        original_getaddrinfo = socket.getaddrinfo
+        original_connect = socket.socket.connect
+
+        def getaddrinfo(host, *args, **kwargs):
+            if host is not None and str(host) not in LOCAL_HOSTS:
+                guard._block(host)
+            return original_getaddrinfo(host, *args, **kwargs)
+
+        def connect(sock, address):
+            host = address[0] if isinstance(address, tuple) else address
+            if sock.family in (socket.AF_INET, socket.AF_INET6) and (
+                str(host) not in LOCAL_HOSTS
+            ):
+                guard._block(host)
+            return original_connect(sock, address)
+
+        self._patches.set(socket, "getaddrinfo", getaddrinfo)
+        self._patches.set(socket.socket, "connect", connect)
+
+    def restore(self) -> None:
+        self._patches.restore()
+
+
+class CycleReplayBench:
+    """
+    Replay a fixture bundle through ``runner._cycle`` and measure it.
+
+    State the cycle persists (seen store, traces, event logs) goes to a
+    scratch ``work_dir`` so runs don't influence each other. The report
+    holds cycle time percentiles, alerts/min over replay wall time, peak
+    memory, per-stage timings from the cycle profiler, stub LLM counters
+    and any outbound connections that had to be refused.
+    """
+
+    def __init__(
+        self,
+        bundle: FixtureBundle,
+        llm_latency_ms: float = 0.0,
+        llm_jitter_ms: float = 0.0,
+        llm_429_rate: float = 0.0,
+        seed: int = 0,
+        work_dir: Optional[Path] = None,
+        trace_memory: bool = False,
+        env: Optional[Dict[str, str]] = None,
+    ):
+        self.bundle = bundle
+        self.stub = StubServices(
+            bundle.llm,
+            latency_ms=llm_latency_ms,
+            jitter_ms=llm_jitter_ms,
+            rate_429=llm_429_rate,
+            seed=seed,
+        )
+        self.work_dir = Path(work_dir or tempfile.mkdtemp(prefix="cycle_replay_"))
+        self.trace_memory = trace_memory
+        self.extra_env = dict(env or {})
+        self._cycle_items: List[Dict[str, Any]] = []
+
+    def _env(self) -> Dict[str, str]:
+        env = {
+            "LLM_ENDPOINT_URL": self.stub.llm_url,
+            "LLM_LOCAL_ENABLED": "1",
+            "LLM_LOCAL_MAX_LENGTH": str(10**9),
+            "GEMINI_API_KEY": "",
+            "ANTHROPIC_API_KEY": "",
+            "DISCORD_WEBHOOK_URL": self.stub.webhook_url,
+            "DISCORD_ADMIN_WEBHOOK": "",
+            "FEATURE_CYCLE_PROFILER": "1",
+            "CYCLE_PROFILER_SAMPLE_HZ": "0",
+            "CYCLE_TRACE_DIR": str(self.work_dir / "traces"),
+            "SEEN_DB_PATH": str(self.work_dir / "seen_ids.sqlite"),
+            "EVENTS_PATH": str(self.work_dir / "events.jsonl"),
+            "LLM_USAGE_LOG_PATH": str(self.work_dir / "llm_usage.jsonl"),
+        }
+        env.update(self.extra_env)
+        return env
+
+    def _install_stand_ins(self, patches: _Patches) -> None:
+        from .. import feeds, llm_hybrid, market, runner, sec_document_fetcher
+
+        bundle = self.bundle
+
+        def fetch_pr_feeds(seen_store=None):
+            return copy.deepcopy(self._cycle_items)
+
+        def get_last_price_snapshot(ticker, retries=2):
+            return bundle.quotes.get((ticker or "").strip().upper(), (None, None))
+
+        def batch_get_prices(tickers):
+            results = {}
+            for ticker in tickers or []:
+                norm = (ticker or "").strip().upper()
+                if not norm:
+                    continue
+                last, prev = bundle.quotes.get(norm, (None, None))
+                change = None
+                if last is not None and prev:
+                    change = (last - prev) / prev * 100.0
+                results[norm] = (last, change)
+            return results
+
+        def fetch_sec_document_text(link, accession_number=None):
+            return bundle.sec_docs.get(link, "")
+
+        patches.set(feeds, "fetch_pr_feeds", fetch_pr_feeds)
+        patches.set(market, "get_last_price_snapshot", get_last_price_snapshot)
+        patches.set(market, "batch_get_prices", batch_get_prices)
+        patches.set(
+            sec_document_fetcher, "fetch_sec_document_text", fetch_sec_document_text
+        )
+        # Rebuild the router so it picks up the stub endpoint
+        patches.set(llm_hybrid, "_router", None)
+        # Replays never place paper trades
+        patches.set(runner, "trading_engine", None)
+
+    def run(self, cycles: Optional[int] = None) -> Dict[str, Any]:
+        """Replay up to ``cycles`` recorded cycles and return the report."""
+        from .. import cycle_profiler, runner
+        from ..config import get_settings
+
+        replay_cycles = self.bundle.cycles[:cycles] if cycles else self.bundle.cycles
+        self.stub.start()
+        saved_env = {k: os.environ.get(k) for k in self._env()}
+        patches = _Patches()
+        guard = _NetworkGuard()
+        durations: List[float] = []
+        records: List[Dict[str, Any]] = []
+        errors = 0
+        tracemalloc_peak = None
+        tracing = self.trace_memory and not tracemalloc.is_tracing()
+        try:
+            os.environ.update(self._env())
+            self._install_stand_ins(patches)
+            guard.install()
+            settings = replace(
+                get_settings(),
+                discord_webhook_url=self.stub.webhook_url,
+                webhook_url=self.stub.webhook_url,
+                discord_webhook=self.stub.webhook_url,
+                admin_webhook_url=None,
+            )
+            cycle_log = logging.getLogger("catalyst_bot.runner")
+            if tracing:
+                tracemalloc.start()
+
+            for i, items in enumerate(replay_cycles, start=1):
+                self._cycle_items = items
+                trace = cycle_profiler.start_cycle(i)
+                t0 = time.perf_counter()
+                try:
+                    runner._cycle(cycle_log, settings, market_info=None)
+                except Exception as e:
+                    errors += 1
+                    log.warning("cycle_replay_cycle_failed cycle=%d err=%s", i, e)
+                finally:
+                    durations.append(time.perf_counter() - t0)
+                    record = cycle_profiler.finish_cycle(trace)
+                    if record:
+                        records.append(record)
+
+            if tracing:
+                tracemalloc_peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+        finally:
+            guard.restore()
+            patches.restore()
+            for key, value in saved_env.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+            self.stub.stop()
+
+        return self._report(
+            replay_cycles, durations, records, errors, tracemalloc_peak, guard
+        )
+
+    def _report(
+        self,
+        replay_cycles: List[List[Dict[str, Any]]],
+        durations: List[float],
+        records: List[Dict[str, Any]],
+        errors: int,
+        tracemalloc_peak: Optional[int],
+        guard: _NetworkGuard,
+    ) -> Dict[str, Any]:
+        from ..cycle_profiler import summarize_traces
+
+        total_s = sum(durations)
+        ordered = sorted(durations)
+
+        def pct(q: float) -> float:
+            if not ordered:
+                return 0.0
+            return round(ordered[max(0, math.ceil(q * len(ordered)) - 1)] * 1000, 1)
+
+        alerts = self.stub.stats["discord_posts"]
+        return {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "bundle": str(self.bundle.path),
+            "cycles": len(durations),
+            "items": sum(len(c) for c in replay_cycles),
+            "cycle_errors": errors,
+            "cycle_ms": {
+                "p50": pct(0.50),
+                "p95": pct(0.95),
+                "max": round(ordered[-1] * 1000, 1) if ordered else 0.0,
+                "total": round(total_s * 1000, 1),
+            },
+            "alerts": alerts,
+            "alerts_per_min": round(alerts / (total_s / 60.0), 2) if total_s else 0.0,
+            "memory": {
+                "peak_rss_mb": _peak_rss_mb(),
+                "tracemalloc_peak_mb": (
+                    round(tracemalloc_peak / (1024 * 1024), 1)
+                    if tracemalloc_peak is not None
+                    else None
+                ),
+            },
+            "llm": {
+                "latency_ms": self.stub.latency_ms,
+                "jitter_ms": self.stub.jitter_ms,
+                "rate_429": self.stub.rate_429,
+                "requests": self.stub.stats["llm_requests"],
+                "rate_limited": self.stub.stats["llm_rate_limited"],
+                "misses": self.stub.stats["llm_misses"],
+            },
+            "blocked_network": dict(
+                sorted(guard.blocked.items(), key=lambda kv: -kv[1])
+            ),
+            "stages": summarize_traces(records),
+        }
+
+
+def compare_reports(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    tolerance: float = 0.5,
+    min_delta_ms: float = 250.0,
+) -> Dict[str, Any]:
+    """Headline deltas and stage regressions between two replay reports."""
+    from ..cycle_profiler import find_regressions
+
+    def delta(before: Optional[float], after: Optional[float]) -> Dict[str, Any]:
+        change = None
+        if before and after is not None:
+            change = round((after - before) / before * 100.0, 1)
+        return {"baseline": before, "current": after, "change_pct": change}
+
+    headline = {
+        "cycle_p50_ms": delta(
+            baseline.get("cycle_ms", {}).get("p50"),
+            current.get("cycle_ms", {}).get("p50"),
+        ),
+        "cycle_p95_ms": delta(
+            baseline.get("cycle_ms", {}).get("p95"),
+            current.get("cycle_ms", {}).get("p95"),
+        ),
+        "alerts_per_min": delta(
+            baseline.get("alerts_per_min"), current.get("alerts_per_min")
+        ),
+        "peak_rss_mb": delta(
+            baseline.get("memory", {}).get("peak_rss_mb"),
+            current.get("memory", {}).get("peak_rss_mb"),
+        ),
+    }
+    return {
+        "headline": headline,
+        "regressions": find_regressions(
+            current.get("stages", {}),
+            baseline.get("stages", {}),
+            tolerance,
+            min_delta_ms,
+        ),
+    }
@@ -2,7 +2,7 @@
 HistoricalDataFetcher - Reconstruct a trading day from APIs.
 
 Fetches:
-- Intraday price data (5-minute bars)
+- Intraday price data (5-minute bars, persisted in the shared bar store)
 - News articles published that day
 - SEC filings from that day
 - Market metadata (float, volume, etc.)
@@ -28,6 +28,8 @@ from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Set
 
+from ..bar_store import BarStore, get_bar_store
+
 # Use simulation-aware time when available
 try:
     from ..time_utils import now as sim_now
@@ -52,6 +54,7 @@ class HistoricalDataFetcher:
         cache_dir: Optional[Path] = None,
         price_source: str = "tiingo",
         news_source: str = "finnhub",
+        bar_store: Optional[BarStore] = None,
     ):
         """
         Initialize the data fetcher.
@@ -60,12 +63,14 @@ class HistoricalDataFetcher:
             cache_dir: Directory to store cached data
             price_source: Price data source ("tiingo", "yfinance", "cached")
             news_source: News source ("finnhub", "cached")
+            bar_store: Bar store for intraday bars (default: shared store)
         """
         self.cache_dir = Path(cache_dir or "data/simulation_cache")
         self.cache_dir.mkdir(parents=True, exist_ok=True)
 
         self.price_source = price_source
         self.news_source = news_source
+        self.bar_store = bar_store or get_bar_store()
 
     def _cache_key(self, date_str: str, tickers: Optional[List[str]] = None) -> str:
         """Generate a unique cache key for the data request."""
@@ -333,17 +338,60 @@ class HistoricalDataFetcher:
 
         return price_bars
 
+    @staticmethod
+    def _day_range(date: datetime) -> tuple:
+        """UTC [start, end) range for the simulated trading day."""
+        day = datetime(date.year, date.month, date.day, tzinfo=timezone.utc)
+        return day, day + timedelta(days=1)
+
+    def _read_store_bars(self, ticker: str, date: datetime) -> Optional[List[Dict]]:
+        """Return the day's 5m bars from the bar store, or None if not covered."""
+        start, end = self._day_range(date)
+        try:
+            if self.bar_store.missing_ranges(ticker, "5m", start, end):
+                return None
+            df = self.bar_store.read_bars(ticker, "5m", start, end)
+        except Exception as e:
+            log.debug(f"Bar store read failed for {ticker}: {e}")
+            return None
+
+        return [
+            {
+                "timestamp": ts.isoformat(),
+                "open": row.Open,
+                "high": row.High,
+                "low": row.Low,
+                "close": row.Close,
+                "volume": row.Volume,
+            }
+            for ts, row in zip(df.index, df.itertuples(index=False))
+        ]
+
     async def _fetch_ticker_bars(self, ticker: str, date: datetime) -> List[Dict]:
-        """Fetch intraday bars for a single ticker."""
-        if self.price_source == "tiingo":
-            return await self._fetch_tiingo_bars(ticker, date)
-        elif self.price_source == "yfinance":
-            return await self._fetch_yfinance_bars(ticker, date)
-        elif self.price_source == "cached":
+        """Fetch intraday bars for a single ticker (bar store first)."""
+        if self.price_source == "cached":
             return self._load_cached_bars(ticker, date)
-        else:
+        if self.price_source not in ("tiingo", "yfinance"):
             return []
 
+        stored = self._read_store_bars(ticker, date)
+        if stored is not None:
+            return stored
+
+        if self.price_source == "tiingo":
+            bars = await self._fetch_tiingo_bars(ticker, date)
+        else:
+            bars = await self._fetch_yfinance_bars(ticker, date)
+
+        if bars:
+            start, end = self._day_range(date)
+            try:
+                self.bar_store.write_bars(ticker, "5m", bars, start, end)
+            except Exception as e:
+                log.debug(f"Bar store write failed for {ticker}: {e}")
+
+        return bars
+
     async def _fetch_tiingo_bars(self, ticker: str, date: datetime) -> List[Dict]:
         """Fetch from Tiingo IEX API."""
         try:
@@ -439,7 +487,11 @@ class HistoricalDataFetcher:
         return await loop.run_in_executor(None, _download)
 
     def _load_cached_bars(self, ticker: str, date: datetime) -> List[Dict]:
-        """Load price bars from cached file."""
+        """Load price bars from the bar store, falling back to a cached file."""
+        stored = self._read_store_bars(ticker, date)
+        if stored is not None:
+            return stored
+
         date_str = date.strftime("%Y-%m-%d")
         cached_file = self.cache_dir / f"prices_{date_str}_{ticker}.json"
 
@@ -37,6 +37,7 @@ from .config_updater import (
 )
 from .logging_utils import get_logger
 from .market import get_last_price_change
+from .metrics_registry import get_registry
 from .validation import validate_ticker
 
 log = get_logger("slash_commands")
@@ -310,6 +311,33 @@ def handle_admin_revert_command(interaction_data: Dict[str, Any]) -> Dict[str, A
         }
 
 
+def _format_runtime_metrics(snapshot: Dict[str, Any]) -> str:
+    """Summarize the published metrics snapshot for the /admin stats embed."""
+    counters = snapshot.get("counters", {})
+    cycle = snapshot.get("histograms", {}).get("cycle_duration_seconds", {})
+    lines = []
+    if cycle.get("count"):
+        window = cycle.get("window", {})
+        if not window.get("count"):
+            window = cycle
+        lines.append(
+            f"Cycles: {cycle['count']} "
+            f"(p50 {window.get('p50', 0):.1f}s, p95 {window.get('p95', 0):.1f}s)"
+        )
+    for label, name in (
+        ("Alerts", "alerts_sent_total"),
+        ("LLM requests", "llm_requests_total"),
+        ("Errors", "errors_total"),
+    ):
+        counter = counters.get(name)
+        if counter:
+            lines.append(
+                f"{label}: {int(counter['window'])} last hour, "
+                f"{int(counter['total'])} total"
+            )
+    return "\n".join(lines)
+
+
 def handle_admin_stats_command(interaction_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Handle /admin stats command.
@@ -374,6 +402,10 @@ def handle_admin_stats_command(interaction_data: Dict[str, Any]) -> Dict[str, An
             },
         ]
 
+        runtime = _format_runtime_metrics(get_registry().snapshot())
+        if runtime:
+            fields.append({"name": "Runtime", "value": runtime, "inline": False})
+
         # Add recent changes
         try:
             from .config_updater import get_change_history
@@ -434,6 +434,7 @@ class TradingEngine:
                 "positions": metrics.total_positions,
                 "exposure": float(metrics.total_exposure),
                 "pnl": float(metrics.total_unrealized_pnl),
+                "account_value": float(account.equity),
                 "triggered_stops": len(triggered_stops),
                 "triggered_profits": len(triggered_profits),
                 "closed_positions": len(closed),
@@ -214,6 +214,13 @@ def calculate_price_change(ticker: str) -> Optional[float]:
     Returns:
         Price change percentage (0.05 = +5%), or None if unavailable
     """
+    # Same intraday bar set as RVOL/VWAP when the bulk feature engine is on
+    from . import intraday_features
+
+    if intraday_features.engine_enabled():
+        snap = intraday_features.get_intraday_engine().get(ticker)
+        return snap.price_change if snap is not None else None
+
     try:
         import yfinance as yf
 
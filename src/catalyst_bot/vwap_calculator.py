@@ -22,10 +22,12 @@ from datetime import datetime, time, timezone
 from threading import Lock
 from typing import Any, Dict, Optional
 
+from .cache_registry import bounded_cache
+
 log = logging.getLogger(__name__)
 
-# In-memory cache with TTL (thread-safe)
-_VWAP_CACHE: Dict[str, Dict[str, Any]] = {}
+# In-memory cache with TTL (thread-safe), LRU-bounded across tickers
+_VWAP_CACHE = bounded_cache("vwap_calculator", max_entries=1000)
 _VWAP_CACHE_LOCK = Lock()
 _VWAP_CACHE_TTL_SEC = 300  # 5 minutes (configurable)
 
@@ -90,6 +92,58 @@ def _cache_clear_expired(ttl_seconds: int = _VWAP_CACHE_TTL_SEC) -> int:
         return len(expired_keys)
 
 
+def build_vwap_result(
+    vwap: float,
+    current_price: float,
+    cumulative_volume: float,
+    typical_price: float,
+    num_bars: int,
+) -> Dict[str, Any]:
+    """
+    Build the VWAP result dict (distance and signal) from computed levels.
+
+    Shared by calculate_vwap() and the bulk intraday feature engine.
+
+    Args:
+        vwap: VWAP price level
+        current_price: Latest price
+        cumulative_volume: Volume the VWAP was computed over
+        typical_price: Typical price of the latest bar
+        num_bars: Number of bars used
+
+    Returns:
+        Dict in the shape documented on calculate_vwap()
+    """
+    # Calculate distance from VWAP
+    distance_from_vwap_pct = ((current_price - vwap) / vwap) * 100
+
+    # Determine signal
+    is_above = current_price > vwap
+
+    if is_above and distance_from_vwap_pct > 2.0:
+        vwap_signal = "STRONG_BULLISH"
+    elif is_above and distance_from_vwap_pct > 0.5:
+        vwap_signal = "BULLISH"
+    elif not is_above and distance_from_vwap_pct < -2.0:
+        vwap_signal = "STRONG_BEARISH"
+    elif not is_above and distance_from_vwap_pct < -0.5:
+        vwap_signal = "BEARISH"
+    else:
+        vwap_signal = "NEUTRAL"
+
+    return {
+        "vwap": float(vwap),
+        "current_price": float(current_price),
+        "distance_from_vwap_pct": distance_from_vwap_pct,
+        "is_above_vwap": is_above,
+        "vwap_signal": vwap_signal,
+        "cumulative_volume": int(cumulative_volume),
+        "typical_price": float(typical_price),
+        "num_bars": int(num_bars),
+        "calculated_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
 def calculate_vwap(ticker: str, period_days: int = 1) -> Optional[Dict[str, Any]]:
     """
     Calculate VWAP (Volume Weighted Average Price) for a ticker.
@@ -111,7 +165,13 @@ def calculate_vwap(ticker: str, period_days: int = 1) -> Optional[Dict[str, Any]
 
         Returns None if calculation fails or market is closed
     """
-    from . import config
+    from . import config, intraday_features
+
+    # Intraday VWAP comes from the shared feature snapshot when the bulk
+    # engine is on
+    if period_days == 1 and intraday_features.engine_enabled():
+        snap = intraday_features.get_intraday_engine().get(ticker)
+        return snap.vwap_data() if snap is not None else None
 
     settings = config.get_settings()
 
@@ -154,38 +214,13 @@ def calculate_vwap(ticker: str, period_days: int = 1) -> Optional[Dict[str, Any]
 
         vwap = cumulative_pv / cumulative_volume
 
-        # Get current price (last bar close)
-        current_price = float(hist["Close"].iloc[-1])
-
-        # Calculate distance from VWAP
-        distance_from_vwap_pct = ((current_price - vwap) / vwap) * 100
-
-        # Determine signal
-        is_above = current_price > vwap
-
-        if is_above and distance_from_vwap_pct > 2.0:
-            vwap_signal = "STRONG_BULLISH"
-        elif is_above and distance_from_vwap_pct > 0.5:
-            vwap_signal = "BULLISH"
-        elif not is_above and distance_from_vwap_pct < -2.0:
-            vwap_signal = "STRONG_BEARISH"
-        elif not is_above and distance_from_vwap_pct < -0.5:
-            vwap_signal = "BEARISH"
-        else:
-            vwap_signal = "NEUTRAL"
-
-        # Build result
-        result = {
-            "vwap": float(vwap),
-            "current_price": current_price,
-            "distance_from_vwap_pct": distance_from_vwap_pct,
-            "is_above_vwap": is_above,
-            "vwap_signal": vwap_signal,
-            "cumulative_volume": int(cumulative_volume),
-            "typical_price": float(hist["TypicalPrice"].iloc[-1]),
-            "num_bars": len(hist),
-            "calculated_at": datetime.now(timezone.utc).isoformat(),
-        }
+        result = build_vwap_result(
+            vwap=float(vwap),
+            current_price=float(hist["Close"].iloc[-1]),  # last bar close
+            cumulative_volume=float(cumulative_volume),
+            typical_price=float(hist["TypicalPrice"].iloc[-1]),
+            num_bars=len(hist),
+        )
 
         # Cache result (thread-safe)
         _cache_set(cache_key, result)
@@ -194,9 +229,9 @@ def calculate_vwap(ticker: str, period_days: int = 1) -> Optional[Dict[str, Any]
             "vwap_calculated ticker=%s vwap=%.4f current_price=%.4f distance=%.2f%% signal=%s",
             ticker,
             vwap,
-            current_price,
-            distance_from_vwap_pct,
-            vwap_signal,
+            result["current_price"],
+            result["distance_from_vwap_pct"],
+            result["vwap_signal"],
         )
 
         return result
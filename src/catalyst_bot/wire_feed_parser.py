@@ -0,0 +1,215 @@
+"""
+Wire Feed Parser
+================
+
+Fast streaming parser for the well-formed wire feeds (GlobeNewswire,
+BusinessWire, PRNewswire RSS and SEC EDGAR Atom).
+
+feedparser handles every dialect and malformed markup, but it builds the
+whole document in pure Python. The wire feeds are well-formed XML in
+reverse-chronological order, so they can be streamed with lxml's
+``iterparse`` and abandoned as soon as entries fall outside the freshness
+window that ``fetch_pr_feeds`` applies later anyway.
+
+Entries are returned as lightweight objects exposing the attributes
+``_normalize_entry`` reads from feedparser entries (title, link,
+published/updated, id, summary). Any XML error makes ``parse_wire_feed``
+return None so the caller falls back to feedparser.
+
+Usage:
+    from catalyst_bot.wire_feed_parser import is_wire_source, parse_wire_feed
+
+    if is_wire_source(src):
+        result = parse_wire_feed(text, max_age_minutes=10)
+        if result is not None:
+            entries, stopped_early = result
+"""
+
+from __future__ import annotations
+
+import re
+from datetime import datetime, timedelta, timezone
+from io import BytesIO
+from types import SimpleNamespace
+from typing import List, Optional, Tuple
+
+from dateutil import parser as dtparse
+
+from .logging_utils import get_logger
+
+log = get_logger("wire_feed_parser")
+
+try:
+    from lxml import etree  # type: ignore
+except Exception:  # pragma: no cover - lxml is a hard requirement
+    etree = None  # type: ignore
+
+# Source keys (FEEDS / ENV_URL_OVERRIDES) served by well-formed wire feeds
+WIRE_SOURCE_PREFIXES = ("globenewswire", "businesswire", "prnewswire", "sec_")
+
+# Consecutive stale entries before parsing stops. Wire feeds are newest
+# first; the slack absorbs the occasional out-of-order correction.
+STALE_ENTRY_LIMIT = 3
+
+_ATOM = "{http://www.w3.org/2005/Atom}"
+_DC_DATE = "{http://purl.org/dc/elements/1.1/}date"
+_RSS1 = "{http://purl.org/rss/1.0/}"
+_ENTRY_TAGS = ("item", f"{_ATOM}entry", f"{_RSS1}item")
+_XML_DECL_RE = re.compile(r"^\s*<\?xml[^>]*\?>")
+
+
+def is_wire_source(source: str) -> bool:
+    """True if ``source`` is parsed by the streaming fast path."""
+    return (source or "").lower().startswith(WIRE_SOURCE_PREFIXES)
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1] if isinstance(tag, str) else ""
+
+
+def _text(el) -> Optional[str]:
+    """Element text including CDATA and nested markup (Atom type=html)."""
+    if el is None:
+        return None
+    if len(el):
+        return "".join(el.itertext())
+    return el.text
+
+
+def _entry_from_element(el) -> SimpleNamespace:
+    """Map an RSS <item> or Atom <entry> to feedparser-style attributes."""
+    fields = {}
+    links = []
+    for child in el:
+        name = _local(child.tag)
+        if name == "link":
+            href = child.get("href")
+            if href is not None:
+                links.append((child.get("rel", "alternate"), href))
+            elif child.text:
+                links.append(("alternate", child.text))
+        elif child.tag == _DC_DATE:
+            fields.setdefault("published", _text(child))
+        elif name == "pubDate":
+            fields["published"] = _text(child)
+        elif name in ("published", "updated"):
+            fields[name] = _text(child)
+        elif name in ("guid", "id"):
+            fields["id"] = _text(child)
+        elif name in ("description", "summary"):
+            fields["summary"] = _text(child)
+        elif name == "content":
+            fields.setdefault("summary", _text(child))
+        elif name == "title":
+            fields["title"] = _text(child)
+
+    alternate = [href for rel, href in links if rel == "alternate"]
+    fields["link"] = (alternate or [href for _, href in links] or [None])[0]
+    return SimpleNamespace(**{k: (v.strip() if v else v) for k, v in fields.items()})
+
+
+def _entry_time(entry: SimpleNamespace) -> Optional[datetime]:
+    raw = getattr(entry, "published", None) or getattr(entry, "updated", None)
+    if not raw:
+        return None
+    try:
+        d = dtparse.parse(raw)
+    except Exception:
+        return None
+    if d.tzinfo is None:
+        d = d.replace(tzinfo=timezone.utc)
+    return d
+
+
+def parse_wire_feed(
+    text: str,
+    max_age_minutes: int = 0,
+    now: Optional[datetime] = None,
+) -> Optional[Tuple[List[SimpleNamespace], bool]]:
+    """
+    Stream entries from a wire RSS/Atom document.
+
+    Parameters
+    ----------
+    text : str
+        Raw feed payload
+    max_age_minutes : int
+        Freshness window. Entries older than this are dropped and parsing
+        stops after STALE_ENTRY_LIMIT consecutive stale entries. 0 disables
+        the cutoff.
+    now : datetime, optional
+        Reference time for the window (default: current UTC time)
+
+    Returns
+    -------
+    tuple of (entries, stopped_early), or None
+        None when lxml is unavailable or the payload is not well-formed,
+        in which case the caller should use feedparser.
+    """
+    if etree is None or not text:
+        return None
+
+    cutoff = None
+    if max_age_minutes and max_age_minutes > 0:
+        now = now or datetime.now(timezone.utc)
+        cutoff = now - timedelta(minutes=max_age_minutes)
+
+    if isinstance(text, str):
+        # Payload is already decoded; drop the declaration so its encoding
+        # attribute does not contradict the UTF-8 bytes handed to lxml
+        data = _XML_DECL_RE.sub("", text, count=1).encode("utf-8")
+    else:
+        data = text
+
+    entries: List[SimpleNamespace] = []
+    stale_run = 0
+    stopped_early = False
+
+    try:
+        context = etree.iterparse(
+            BytesIO(data),
+            events=("end",),
+            tag=_ENTRY_TAGS,
+            resolve_entities=False,
+            no_network=True,
+            huge_tree=False,
+            recover=False,
+        )
+        for _event, el in context:
+            entry = _entry_from_element(el)
+
+            # Free parsed elements as we go (streaming)
+            el.clear()
+            parent = el.getparent()
+            if parent is not None:
+                while el.getprevious() is not None:
+                    del parent[0]
+
+            if cutoff is not None:
+                ts = _entry_time(entry)
+                if ts is not None and ts < cutoff:
+                    stale_run += 1
+                    if stale_run >= STALE_ENTRY_LIMIT:
+                        stopped_early = True
+                        break
+                    continue
+                stale_run = 0
+
+            entries.append(entry)
+        del context
+    except etree.XMLSyntaxError as e:
+        log.debug("wire_feed_not_well_formed err=%s", e)
+        return None
+    except Exception as e:
+        log.debug("wire_feed_parse_failed err=%s", e.__class__.__name__)
+        return None
+
+    return entries, stopped_early
+
+
+__all__ = [
+    "STALE_ENTRY_LIMIT",
+    "WIRE_SOURCE_PREFIXES",
+    "is_wire_source",
+    "parse_wire_feed",
+]
@@ -345,3 +345,19 @@ def reset_random_seed():
     # Reset to random state after test
     random.seed()
     np.random.seed()
+
+
+@pytest.fixture(autouse=True)
+def _isolated_bar_store(tmp_path, monkeypatch):
+    """
+    Point the shared bar store at a per-test directory so mocked price data
+    never lands in (or is read from) the real ``data/bars`` store, and drop
+    any intraday feature snapshots built from it.
+    """
+    import catalyst_bot.bar_store as bar_store
+    import catalyst_bot.intraday_features as intraday_features
+
+    monkeypatch.setenv("BAR_STORE_DIR", str(tmp_path / "bars"))
+    monkeypatch.setattr(bar_store, "_store", None)
+    monkeypatch.setattr(intraday_features, "_engine", None)
+    yield
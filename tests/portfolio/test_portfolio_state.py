@@ -0,0 +1,177 @@
+"""Tests for the ticker-indexed portfolio state and write-behind persistence."""
+
+import sqlite3
+from decimal import Decimal
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from catalyst_bot.broker.broker_interface import (
+    Order,
+    OrderSide,
+    OrderStatus,
+    PositionSide,
+)
+from catalyst_bot.portfolio import ManagedPosition, PortfolioState, PositionManager
+
+
+def _position(pid, ticker, side=PositionSide.LONG, qty=10, entry="100", **kwargs):
+    entry = Decimal(entry)
+    return ManagedPosition(
+        position_id=pid,
+        ticker=ticker,
+        side=side,
+        quantity=qty,
+        entry_price=entry,
+        current_price=entry,
+        cost_basis=entry * qty,
+        market_value=entry * qty,
+        unrealized_pnl=Decimal("0"),
+        unrealized_pnl_pct=Decimal("0"),
+        **kwargs,
+    )
+
+
+class TestPortfolioState:
+    def test_ticker_index_tracks_add_and_remove(self):
+        state = PortfolioState()
+        state.add(_position("p1", "AAPL"))
+        state.add(_position("p2", "AAPL"))
+        state.add(_position("p3", "MSFT"))
+
+        assert state.get_by_ticker("AAPL").position_id == "p1"
+        assert [p.position_id for p in state.positions_for_ticker("AAPL")] == [
+            "p1",
+            "p2",
+        ]
+
+        state.remove("p1")
+        assert state.get_by_ticker("AAPL").position_id == "p2"
+        state.remove("p2")
+        assert state.get_by_ticker("AAPL") is None
+        assert state.tickers() == ["MSFT"]
+
+    def test_apply_prices_long_and_short(self):
+        state = PortfolioState()
+        state.add(_position("long", "AAPL"))
+        state.add(_position("short", "AAPL", side=PositionSide.SHORT))
+        state.add(_position("other", "MSFT"))
+
+        updated = state.apply_prices({"AAPL": Decimal("110.50"), "TSLA": Decimal("1")})
+
+        assert {p.position_id for p in updated} == {"long", "short"}
+        long_pos, short_pos = state.get("long"), state.get("short")
+        assert long_pos.unrealized_pnl == Decimal("105.00")
+        assert long_pos.unrealized_pnl_pct == Decimal("105.00") / Decimal("1000")
+        assert long_pos.market_value == Decimal("1105.00")
+        assert short_pos.unrealized_pnl == Decimal("-105.00")
+        assert state.get("other").current_price == Decimal("100")
+
+    def test_dirty_set_cleared_by_take_and_remove(self):
+        state = PortfolioState()
+        state.add(_position("p1", "AAPL"))
+        state.add(_position("p2", "MSFT"))
+        state.apply_prices({"AAPL": Decimal("101"), "MSFT": Decimal("99")})
+        state.remove("p2")
+
+        assert [p.position_id for p in state.take_dirty()] == ["p1"]
+        assert state.dirty_count == 0
+
+    def test_triggered_matches_per_position_checks(self):
+        state = PortfolioState()
+        state.add(_position("stop", "A", stop_loss_price=Decimal("95")))
+        state.add(_position("target", "B", take_profit_price=Decimal("110")))
+        state.add(
+            _position(
+                "short_stop",
+                "C",
+                side=PositionSide.SHORT,
+                stop_loss_price=Decimal("105"),
+            )
+        )
+        state.add(_position("none", "D"))
+        state.apply_prices(
+            {
+                "A": Decimal("95"),
+                "B": Decimal("111"),
+                "C": Decimal("106"),
+                "D": Decimal("50"),
+            }
+        )
+
+        stops, targets = state.triggered()
+
+        assert {p.position_id for p in stops} == {"stop", "short_stop"}
+        assert {p.position_id for p in targets} == {"target"}
+        for position in state:
+            assert (position in stops) == position.should_stop_loss()
+            assert (position in targets) == position.should_take_profit()
+
+
+class TestPositionManagerWriteBehind:
+    @pytest.fixture
+    def manager(self, tmp_path):
+        broker = Mock()
+        broker.close_position = AsyncMock(return_value=Mock(order_id="exit_1"))
+        return PositionManager(broker=broker, db_path=tmp_path / "trading.db")
+
+    @staticmethod
+    def _filled(ticker, price="100"):
+        return Order(
+            order_id=f"order_{ticker}",
+            ticker=ticker,
+            side=OrderSide.BUY,
+            quantity=10,
+            filled_quantity=10,
+            filled_avg_price=Decimal(price),
+            status=OrderStatus.FILLED,
+        )
+
+    @pytest.mark.asyncio
+    async def test_price_tick_flushed_once(self, manager):
+        for ticker in ("AAPL", "MSFT"):
+            await manager.open_position(self._filled(ticker))
+
+        saves = []
+        original = manager._save_positions_to_db
+        manager._save_positions_to_db = lambda ps: saves.append(len(ps)) or original(ps)
+
+        updated = await manager.update_position_prices(
+            {"AAPL": Decimal("105"), "MSFT": Decimal("95")}
+        )
+
+        assert updated == 2
+        assert saves == [2]
+        with sqlite3.connect(manager.db_path) as conn:
+            rows = dict(
+                conn.execute("SELECT ticker, unrealized_pnl FROM positions").fetchall()
+            )
+        assert rows == {"AAPL": 50.0, "MSFT": -50.0}
+        assert manager.get_position_by_ticker("MSFT").current_price == Decimal("95")
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_retried(self, manager):
+        position = await manager.open_position(self._filled("AAPL"))
+        manager._save_positions_to_db = Mock(return_value=False)
+        await manager.update_position_prices({"AAPL": Decimal("101")})
+
+        manager._save_positions_to_db = Mock(return_value=True)
+        assert manager.flush_positions() == 1
+        manager._save_positions_to_db.assert_called_once_with([position])
+
+    @pytest.mark.asyncio
+    async def test_closed_position_drops_pending_write(self, manager):
+        position = await manager.open_position(self._filled("AAPL"))
+        manager._state.mark_dirty(position.position_id)
+        await manager.close_position(position.position_id)
+
+        assert manager.flush_positions() == 0
+        assert manager.get_position_by_ticker("AAPL") is None
+
+    @pytest.mark.asyncio
+    async def test_positions_view_is_read_only(self, manager):
+        position = await manager.open_position(self._filled("AAPL"))
+
+        assert manager._positions[position.position_id] is position
+        with pytest.raises(TypeError):
+            manager._positions["other"] = position
@@ -14,6 +14,15 @@ from catalyst_bot.accepted_items_logger import (
     log_accepted_item,
     should_log_accepted_item,
 )
+from catalyst_bot.partitioned_jsonl import day_files, flush_all, partition_dir
+
+
+def _flushed(log_path):
+    """Flush buffered records and return the day partition they landed in."""
+    flush_all()
+    files = day_files(partition_dir(log_path))
+    assert len(files) == 1
+    return files[0]
 
 
 @pytest.fixture
@@ -93,10 +102,10 @@ class TestLogAcceptedItem:
 
         # Check file was created
         log_path = mock_data_dir / "accepted_items.jsonl"
-        assert log_path.exists()
+        assert _flushed(log_path).exists()
 
         # Read and verify content
-        with open(log_path, "r", encoding="utf-8") as f:
+        with open(_flushed(log_path), "r", encoding="utf-8") as f:
             line = f.readline()
             logged_item = json.loads(line)
 
@@ -162,7 +171,7 @@ class TestLogAcceptedItem:
 
         # Check file has 3 lines
         log_path = mock_data_dir / "accepted_items.jsonl"
-        with open(log_path, "r", encoding="utf-8") as f:
+        with open(_flushed(log_path), "r", encoding="utf-8") as f:
             lines = f.readlines()
 
         assert len(lines) == 3
@@ -191,7 +200,7 @@ class TestLogAcceptedItem:
 
         # Read and verify
         log_path = mock_data_dir / "accepted_items.jsonl"
-        with open(log_path, "r", encoding="utf-8") as f:
+        with open(_flushed(log_path), "r", encoding="utf-8") as f:
             logged_item = json.loads(f.readline())
 
         assert "sentiment_breakdown" in logged_item["cls"]
@@ -219,7 +228,7 @@ class TestLogAcceptedItem:
 
         # Read and verify
         log_path = mock_data_dir / "accepted_items.jsonl"
-        with open(log_path, "r", encoding="utf-8") as f:
+        with open(_flushed(log_path), "r", encoding="utf-8") as f:
             logged_item = json.loads(f.readline())
 
         assert logged_item["market_regime"] == "favorable"
@@ -242,7 +251,7 @@ class TestLogAcceptedItem:
 
         # Read and verify
         log_path = mock_data_dir / "accepted_items.jsonl"
-        with open(log_path, "r", encoding="utf-8") as f:
+        with open(_flushed(log_path), "r", encoding="utf-8") as f:
             logged_item = json.loads(f.readline())
 
         assert logged_item["market_regime"] == "unfavorable"
@@ -256,7 +265,7 @@ class TestLogAcceptedItem:
 
         # Should log with defaults
         log_path = mock_data_dir / "accepted_items.jsonl"
-        with open(log_path, "r", encoding="utf-8") as f:
+        with open(_flushed(log_path), "r", encoding="utf-8") as f:
             logged_item = json.loads(f.readline())
 
         assert logged_item["ticker"] == "TEST"
@@ -277,7 +286,7 @@ class TestLogAcceptedItem:
 
         # Read and verify Unicode is preserved
         log_path = mock_data_dir / "accepted_items.jsonl"
-        with open(log_path, "r", encoding="utf-8") as f:
+        with open(_flushed(log_path), "r", encoding="utf-8") as f:
             logged_item = json.loads(f.readline())
 
         assert "therapy" in logged_item["title"]
@@ -292,7 +301,7 @@ class TestLogAcceptedItem:
 
         # Read timestamp
         log_path = mock_data_dir / "accepted_items.jsonl"
-        with open(log_path, "r", encoding="utf-8") as f:
+        with open(_flushed(log_path), "r", encoding="utf-8") as f:
             logged_item = json.loads(f.readline())
 
         ts = datetime.fromisoformat(logged_item["ts"].replace("Z", "+00:00"))
@@ -533,7 +542,7 @@ class TestIntegration:
             log_accepted_item(item=item, price=5.0)
 
         # Verify all items logged
-        with open(log_path, "r", encoding="utf-8") as f:
+        with open(_flushed(log_path), "r", encoding="utf-8") as f:
             lines = f.readlines()
 
         assert len(lines) == 10
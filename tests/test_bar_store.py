@@ -0,0 +1,324 @@
+"""Tests for the shared on-disk bar store (coverage manifest, gaps, range reads)."""
+
+from __future__ import annotations
+
+import multiprocessing
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from catalyst_bot.bar_store import BAR_DTYPE, BarStore, bars_to_records
+
+
+def _daily_frame(start: str, days: int) -> pd.DataFrame:
+    index = pd.date_range(start, periods=days, freq="D", tz="America/New_York")
+    values = [float(i) for i in range(days)]
+    return pd.DataFrame(
+        {
+            "Open": values,
+            "High": values,
+            "Low": values,
+            "Close": values,
+            "Volume": values,
+        },
+        index=index,
+    )
+
+
+def _utc(*args) -> datetime:
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+def _write_every_nth_day(root: str, offset: int, step: int, days: int) -> None:
+    """Spawned writer: one single-day write per call, interleaved with peers."""
+    store = BarStore(root)
+    for day in range(offset, days, step):
+        start = _utc(2024, 1, 1) + timedelta(days=day)
+        frame = _daily_frame(start.strftime("%Y-%m-%d"), 1)
+        frame.index = pd.DatetimeIndex([start])
+        store.write_bars("AAPL", "1d", frame, start, start + timedelta(days=1))
+
+
+@pytest.fixture
+def store(tmp_path):
+    return BarStore(tmp_path / "bars")
+
+
+class TestRecordNormalization:
+    """bars_to_records accepts provider frames and bar dicts."""
+
+    def test_dataframe_with_tz_index(self):
+        records = bars_to_records(_daily_frame("2024-01-01", 3))
+        assert records.dtype == BAR_DTYPE
+        assert len(records) == 3
+        assert list(records["close"]) == [0.0, 1.0, 2.0]
+
+    def test_multiindex_columns_flattened(self):
+        df = _daily_frame("2024-01-01", 2)
+        df.columns = pd.MultiIndex.from_product([df.columns, ["AAPL"]])
+        records = bars_to_records(df)
+        assert list(records["close"]) == [0.0, 1.0]
+
+    def test_bar_dicts_with_iso_and_epoch(self):
+        records = bars_to_records(
+            [
+                {"timestamp": "2024-01-02T14:30:00Z", "close": 2.0},
+                {"t": 1704119400, "c": 1.0},  # 2024-01-01T14:30:00Z
+                {"close": 9.0},  # no timestamp -> dropped
+            ]
+        )
+        assert list(records["close"]) == [1.0, 2.0]
+        assert np.isnan(records["volume"]).all()
+
+    def test_duplicate_timestamps_keep_last(self):
+        records = bars_to_records(
+            [
+                {"t": 100, "c": 1.0},
+                {"t": 100, "c": 2.0},
+            ]
+        )
+        assert len(records) == 1
+        assert records["close"][0] == 2.0
+
+
+class TestCoverage:
+    """Manifest coverage and gap detection."""
+
+    def test_missing_ranges_empty_store(self, store):
+        gaps = store.missing_ranges("AAPL", "1d", _utc(2024, 1, 1), _utc(2024, 1, 5))
+        assert gaps == [(_utc(2024, 1, 1), _utc(2024, 1, 5))]
+
+    def test_missing_ranges_after_write(self, store):
+        store.write_bars(
+            "AAPL",
+            "1d",
+            _daily_frame("2024-01-03", 2),
+            _utc(2024, 1, 3),
+            _utc(2024, 1, 5),
+        )
+        gaps = store.missing_ranges("AAPL", "1d", _utc(2024, 1, 1), _utc(2024, 1, 7))
+        assert gaps == [
+            (_utc(2024, 1, 1), _utc(2024, 1, 3)),
+            (_utc(2024, 1, 5), _utc(2024, 1, 7)),
+        ]
+
+    def test_coverage_clipped_to_completed_bars(self, store):
+        now = datetime.now(timezone.utc)
+        store.mark_covered(
+            "AAPL", "1d", now - timedelta(days=3), now + timedelta(days=1)
+        )
+        gaps = store.missing_ranges(
+            "AAPL", "1d", now - timedelta(days=3), now + timedelta(days=1)
+        )
+        # Today's (still forming) daily bar is never marked as covered
+        assert len(gaps) == 1
+        assert gaps[0][0] <= now
+
+    def test_manifest_persists_across_instances(self, tmp_path):
+        first = BarStore(tmp_path)
+        first.write_bars(
+            "AAPL",
+            "1d",
+            _daily_frame("2024-01-01", 3),
+            _utc(2024, 1, 1),
+            _utc(2024, 1, 4),
+        )
+        second = BarStore(tmp_path)
+        assert (
+            second.missing_ranges("AAPL", "1d", _utc(2024, 1, 1), _utc(2024, 1, 4))
+            == []
+        )
+        assert (
+            len(second.read_bars("AAPL", "1d", _utc(2024, 1, 1), _utc(2024, 1, 4))) == 3
+        )
+
+
+class TestReadsAndWrites:
+    """Append path, merge path and range reads."""
+
+    def test_range_read(self, store):
+        store.write_bars("AAPL", "1d", _daily_frame("2024-01-01", 10))
+        df = store.read_bars("AAPL", "1d", _utc(2024, 1, 3), _utc(2024, 1, 6))
+        assert list(df["Close"]) == [2.0, 3.0, 4.0]
+        assert str(df.index.tz) == "UTC"
+
+    def test_append_then_backfill_merges_sorted(self, store):
+        store.write_bars("AAPL", "1d", _daily_frame("2024-01-05", 3))
+        store.write_bars("AAPL", "1d", _daily_frame("2024-01-01", 3))
+        stats = store.get_stats()
+        assert stats["appends"] == 1
+        assert stats["rewrites"] == 1
+
+        df = store.read_bars("AAPL", "1d", _utc(2024, 1, 1), _utc(2024, 1, 9))
+        assert df.index.is_monotonic_increasing
+        assert len(df) == 6
+
+    def test_overlapping_write_replaces_values(self, store):
+        store.write_bars("AAPL", "1d", _daily_frame("2024-01-01", 3))
+        updated = _daily_frame("2024-01-02", 1) + 100.0
+        store.write_bars("AAPL", "1d", updated)
+        df = store.read_bars("AAPL", "1d", _utc(2024, 1, 1), _utc(2024, 1, 4))
+        assert list(df["Close"]) == [0.0, 100.0, 2.0]
+
+    def test_same_session_from_two_providers_is_one_row(self, store):
+        # Tiingo/Finnhub stamp 00:00Z, yfinance midnight New York (05:00Z)
+        tiingo = _daily_frame("2024-01-01", 3)
+        tiingo.index = pd.date_range("2024-01-01", periods=3, freq="D", tz="UTC")
+        store.write_bars("AAPL", "1d", tiingo)
+        store.write_bars("AAPL", "1d", _daily_frame("2024-01-02", 3) + 100.0)
+
+        df = store.read_bars("AAPL", "1d", _utc(2024, 1, 1), _utc(2024, 1, 9))
+        assert list(df["Close"]) == [0.0, 100.0, 101.0, 102.0]
+        assert all(ts.hour == 0 for ts in df.index)
+
+    def test_torn_trailing_record_ignored(self, store):
+        store.write_bars("AAPL", "1d", _daily_frame("2024-01-01", 2))
+        path = store.root / "1d" / "AAPL" / "bars.bin"
+        with open(path, "ab") as f:
+            f.write(b"\x00" * 7)
+        assert (
+            len(store.read_bars("AAPL", "1d", _utc(2024, 1, 1), _utc(2024, 1, 9))) == 2
+        )
+
+        store.write_bars("AAPL", "1d", _daily_frame("2024-01-10", 1))
+        assert (
+            len(store.read_bars("AAPL", "1d", _utc(2024, 1, 1), _utc(2024, 1, 20))) == 3
+        )
+
+    def test_unsafe_ticker_stays_inside_root(self, store):
+        store.write_bars("../../ETC", "1d", _daily_frame("2024-01-01", 1))
+        assert not (store.root.parent / "ETC").exists()
+
+    def test_unsupported_interval(self, store):
+        with pytest.raises(ValueError):
+            store.read_bars("AAPL", "3m", _utc(2024, 1, 1), _utc(2024, 1, 2))
+
+
+class TestSharedStore:
+    """Several writers (threads or processes) on one store root."""
+
+    def test_cached_manifest_reloads_after_another_writer(self, tmp_path):
+        first = BarStore(tmp_path / "bars")
+        second = BarStore(tmp_path / "bars")
+        assert first.missing_ranges("AAPL", "1d", _utc(2024, 1, 1), _utc(2024, 1, 3))
+
+        second.write_bars(
+            "AAPL",
+            "1d",
+            _daily_frame("2024-01-01", 2),
+            _utc(2024, 1, 1),
+            _utc(2024, 1, 3),
+        )
+
+        assert not first.missing_ranges(
+            "AAPL", "1d", _utc(2024, 1, 1), _utc(2024, 1, 3)
+        )
+
+    def test_concurrent_processes_keep_every_row(self, tmp_path):
+        root = str(tmp_path / "bars")
+        ctx = multiprocessing.get_context("spawn")
+        procs = [
+            ctx.Process(target=_write_every_nth_day, args=(root, i, 3, 30))
+            for i in range(3)
+        ]
+        for proc in procs:
+            proc.start()
+        for proc in procs:
+            proc.join(timeout=60)
+            assert proc.exitcode == 0
+
+        store = BarStore(root)
+        records = store.read_records("AAPL", "1d", _utc(2024, 1, 1), _utc(2024, 2, 1))
+        assert len(records) == 30
+        assert not store.missing_ranges(
+            "AAPL", "1d", _utc(2024, 1, 1), _utc(2024, 1, 31)
+        )
+        leftovers = [p.name for p in (tmp_path / "bars" / "1d" / "AAPL").iterdir()]
+        assert not [name for name in leftovers if name.endswith(".tmp")]
+
+
+class TestGetBars:
+    """Read-through with gap fetching."""
+
+    def test_fetches_only_missing_spans(self, store):
+        frame = _daily_frame("2024-01-01", 20)
+        calls = []
+
+        def fetcher(ticker, start, end):
+            calls.append((start, end))
+            return frame[(frame.index >= start) & (frame.index < end)]
+
+        store.get_bars(
+            "AAPL", "1d", _utc(2024, 1, 5), _utc(2024, 1, 10), fetcher=fetcher
+        )
+        df = store.get_bars(
+            "AAPL", "1d", _utc(2024, 1, 1), _utc(2024, 1, 15), fetcher=fetcher
+        )
+
+        assert calls == [
+            (_utc(2024, 1, 5), _utc(2024, 1, 10)),
+            (_utc(2024, 1, 1), _utc(2024, 1, 5)),
+            (_utc(2024, 1, 10), _utc(2024, 1, 15)),
+        ]
+        assert len(df) == 14
+
+        # Fully covered now: no further fetches
+        store.get_bars(
+            "AAPL", "1d", _utc(2024, 1, 2), _utc(2024, 1, 12), fetcher=fetcher
+        )
+        assert len(calls) == 3
+
+    def test_failed_fetch_is_retried(self, store):
+        calls = []
+
+        def fetcher(ticker, start, end):
+            calls.append(start)
+            raise RuntimeError("provider down")
+
+        store.get_bars(
+            "AAPL", "1d", _utc(2024, 1, 1), _utc(2024, 1, 3), fetcher=fetcher
+        )
+        store.get_bars(
+            "AAPL", "1d", _utc(2024, 1, 1), _utc(2024, 1, 3), fetcher=fetcher
+        )
+        assert len(calls) == 2
+        assert store.get_stats()["fetch_failures"] == 2
+
+    def test_short_empty_span_is_covered(self, store):
+        calls = []
+
+        def fetcher(ticker, start, end):
+            calls.append(start)
+            return []
+
+        # Weekend: empty answer is trusted
+        store.get_bars(
+            "AAPL", "1d", _utc(2024, 1, 6), _utc(2024, 1, 8), fetcher=fetcher
+        )
+        store.get_bars(
+            "AAPL", "1d", _utc(2024, 1, 6), _utc(2024, 1, 8), fetcher=fetcher
+        )
+        assert len(calls) == 1
+
+    def test_long_empty_span_is_not_covered(self, store):
+        calls = []
+
+        def fetcher(ticker, start, end):
+            calls.append(start)
+            return pd.DataFrame()
+
+        store.get_bars(
+            "AAPL", "1d", _utc(2024, 1, 1), _utc(2024, 2, 1), fetcher=fetcher
+        )
+        store.get_bars(
+            "AAPL", "1d", _utc(2024, 1, 1), _utc(2024, 2, 1), fetcher=fetcher
+        )
+        assert len(calls) == 2
+
+    def test_get_close_at(self, store):
+        store.write_bars("AAPL", "1d", _daily_frame("2024-01-01", 5))
+        assert store.get_close_at("AAPL", "1d", _utc(2024, 1, 3, 12)) == 2.0
+        # Nothing within the lookback window
+        assert store.get_close_at("AAPL", "1d", _utc(2024, 3, 1)) is None
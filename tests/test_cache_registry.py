@@ -0,0 +1,132 @@
+"""Tests for the bounded cache registry and allocation diagnostics."""
+
+import json
+
+import pytest
+
+from catalyst_bot.cache_registry import (
+    AllocationDiagnostics,
+    BoundedCache,
+    CacheRegistry,
+    approx_size,
+    format_cache_summary,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_refreshes_on_read_and_fifo_does_not():
+    lru = BoundedCache("lru", max_entries=2, policy="lru")
+    fifo = BoundedCache("fifo", max_entries=2, policy="fifo")
+    for cache in (lru, fifo):
+        cache["a"] = 1
+        cache["b"] = 2
+        assert cache["a"] == 1
+        cache["c"] = 3
+
+    assert set(lru) == {"a", "c"}
+    assert set(fifo) == {"b", "c"}
+    assert lru.evictions == fifo.evictions == 1
+
+    with pytest.raises(ValueError):
+        BoundedCache("bad", policy="random")
+
+
+def test_byte_budget_evicts_oldest():
+    cache = BoundedCache("bytes", max_entries=0, max_bytes=20_000)
+    for i in range(10):
+        cache[i] = "x" * 5_000
+
+    assert cache.estimated_bytes() <= 20_000
+    assert len(cache) == 3
+    assert list(cache) == [7, 8, 9]
+
+
+def test_ttl_expiry_and_sweep():
+    clock = FakeClock()
+    cache = BoundedCache("ttl", ttl_seconds=10, clock=clock)
+    cache["old"] = 1
+    clock.now = 5
+    cache["new"] = 2
+
+    clock.now = 12
+    assert "old" not in cache
+    assert cache.get("new") == 2
+    clock.now = 20
+    assert cache.sweep() == 1
+    assert len(cache) == 0
+    assert cache.expirations == 2
+
+
+def test_iteration_views_do_not_touch_recency_or_stats():
+    cache = BoundedCache("views", max_entries=2)
+    cache["a"] = 1
+    cache["b"] = 2
+
+    assert cache.items() == [("a", 1), ("b", 2)]
+    assert cache.values() == [1, 2]
+    cache["c"] = 3
+
+    assert set(cache) == {"b", "c"}
+    assert cache.hits == 0
+
+
+def test_registry_report_and_summary():
+    registry = CacheRegistry()
+    prices = registry.register(BoundedCache("runner.price", max_entries=10))
+    for i in range(4):
+        prices[f"T{i}"] = (1.0 + i, 0.0)
+    queue = ["pending"] * 3
+    registry.register_external("ml_queue", lambda: len(queue), queue.clear)
+
+    report = registry.report()
+
+    assert report["runner.price"]["entries"] == 4
+    assert report["runner.price"]["bytes"] > 0
+    assert report["ml_queue"] == {"entries": 3, "bytes": None}
+    assert format_cache_summary(report).startswith("Caches: 7 entries, ~0.0 MB")
+    assert format_cache_summary({}) == ""
+
+    registry.clear_all()
+    assert len(prices) == 0 and queue == []
+
+
+def test_approx_size_is_bounded_and_extrapolates():
+    small = approx_size({"k": "v" * 100})
+    big = approx_size(list(range(10_000)))
+
+    assert small > 100
+    assert big > 10_000 * 28 * 0.9
+
+
+def test_allocation_diagnostics_records_growth_sites(tmp_path):
+    diagnostics = AllocationDiagnostics(every_n_cycles=2, top_n=5, out_dir=tmp_path)
+    hoard = []
+    try:
+        assert diagnostics.maybe_snapshot(1) is None
+        diagnostics.maybe_snapshot(2)
+        hoard.extend(bytearray(1024) for _ in range(2000))
+        record = diagnostics.maybe_snapshot(4)
+    finally:
+        diagnostics.stop()
+
+    assert record["cycle"] == 4
+    assert len(record["top"]) == 5
+    assert record["top"][0]["size_diff_kb"] >= 1500
+    assert "test_cache_registry.py" in record["top"][0]["site"]
+    lines = next(tmp_path.glob("*.jsonl")).read_text().splitlines()
+    assert [json.loads(line)["cycle"] for line in lines] == [2, 4]
+
+
+def test_runner_price_cache_is_registered_and_bounded():
+    from catalyst_bot import runner
+    from catalyst_bot.cache_registry import get_cache_registry
+
+    assert get_cache_registry().get("runner.price") is runner._PX_CACHE
+    assert runner._PX_CACHE.max_entries > 0
@@ -0,0 +1,168 @@
+"""Tests for the per-stage cycle profiler."""
+
+import json
+import threading
+import time
+
+import pytest
+
+from catalyst_bot import cycle_profiler
+from catalyst_bot.cycle_profiler import (
+    find_regressions,
+    finish_cycle,
+    load_traces,
+    phase,
+    record_span,
+    span,
+    start_cycle,
+    summarize_traces,
+    traces_to_collapsed,
+)
+
+
+@pytest.fixture(autouse=True)
+def trace_env(tmp_path, monkeypatch):
+    monkeypatch.setenv("FEATURE_CYCLE_PROFILER", "1")
+    monkeypatch.setenv("CYCLE_TRACE_DIR", str(tmp_path))
+    monkeypatch.setenv("CYCLE_PROFILER_SAMPLE_HZ", "0")
+    yield tmp_path
+    cycle_profiler._active = None
+
+
+def _record(total_ms, **stages):
+    return {
+        "ts": "2025-12-09T00:00:00+00:00",
+        "total_ms": total_ms,
+        "stages": {path.replace("__", ";"): v for path, v in stages.items()},
+    }
+
+
+def test_spans_nest_under_phases_and_are_written(trace_env):
+    trace = start_cycle(7)
+    phase("fetch")
+    record_span("feed:globenewswire", 0.02)
+    phase("items")
+    for _ in range(3):
+        with span("classify"):
+            record_span("provider:tiingo", 0.001)
+    finish_cycle(trace)
+
+    files = list(trace_env.glob("*.jsonl"))
+    assert len(files) == 1
+    (record,) = load_traces(files[0])
+    stages = record["stages"]
+    assert record["cycle_id"] == 7
+    assert set(stages) == {
+        "fetch",
+        "fetch;feed:globenewswire",
+        "items",
+        "items;classify",
+        "items;classify;provider:tiingo",
+    }
+    assert stages["items;classify"][0] == 3
+    assert stages["fetch;feed:globenewswire"][1] == 20.0
+    assert record["total_ms"] >= stages["items"][1]
+
+
+def test_worker_thread_spans_attach_to_cycle_path():
+    trace = start_cycle(1)
+    phase("price_batch")
+    with span("fallback"):
+        worker = threading.Thread(target=record_span, args=("provider:yf", 0.005))
+        worker.start()
+        worker.join()
+    record = finish_cycle(trace)
+
+    assert "price_batch;fallback;provider:yf" in record["stages"]
+
+
+def test_disabled_profiler_is_a_no_op(trace_env, monkeypatch):
+    monkeypatch.setenv("FEATURE_CYCLE_PROFILER", "0")
+    trace = start_cycle(1)
+    phase("fetch")
+    with span("classify"):
+        record_span("provider:tiingo", 0.01)
+
+    assert trace is None
+    assert finish_cycle(trace) is None
+    assert list(trace_env.iterdir()) == []
+
+
+def test_stack_sampler_writes_collapsed_stacks(trace_env, monkeypatch):
+    monkeypatch.setenv("CYCLE_PROFILER_SAMPLE_HZ", "500")
+    trace = start_cycle(1)
+    deadline = time.perf_counter() + 0.1
+    while time.perf_counter() < deadline:
+        sum(range(1000))
+    finish_cycle(trace)
+
+    lines = next(trace_env.glob("*.folded")).read_text().splitlines()
+    assert lines
+    assert any("test_stack_sampler_writes_collapsed_stacks" in line for line in lines)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+
+
+def test_summarize_traces_percentiles():
+    records = [
+        _record(1000 + i, fetch=[1, 100.0 + i, 100.0 + i], items__classify=[4, 40, 12])
+        for i in range(100)
+    ]
+
+    summary = summarize_traces(records)
+
+    assert summary["cycle"]["cycles"] == 100
+    assert summary["fetch"]["p50_ms"] == 149.0
+    assert summary["fetch"]["p95_ms"] == 194.0
+    assert summary["items;classify"]["spans"] == 400
+    assert summary["items;classify"]["p95_ms"] == 40.0
+
+
+def test_find_regressions_needs_ratio_and_absolute_delta():
+    baseline = {
+        "sec_batch": {"p50_ms": 2000.0, "p95_ms": 4000.0},
+        "dedupe": {"p50_ms": 2.0, "p95_ms": 5.0},
+        "fetch": {"p50_ms": 900.0, "p95_ms": 1500.0},
+    }
+    current = {
+        "sec_batch": {"p50_ms": 2100.0, "p95_ms": 60000.0},
+        "dedupe": {"p50_ms": 20.0, "p95_ms": 50.0},
+        "fetch": {"p50_ms": 950.0, "p95_ms": 1600.0},
+        "new_stage": {"p50_ms": 9999.0, "p95_ms": 9999.0},
+    }
+
+    regressions = find_regressions(current, baseline)
+
+    assert [(r["stage"], r["metric"]) for r in regressions] == [("sec_batch", "p95_ms")]
+    assert regressions[0]["ratio"] == 15.0
+
+
+def test_traces_to_collapsed_uses_self_time():
+    records = [
+        _record(
+            1000,
+            fetch=[1, 300, 300],
+            items=[1, 600, 600],
+            items__classify=[5, 200, 50],
+            items__alert=[1, 250, 250],
+        )
+    ]
+
+    collapsed = traces_to_collapsed(records)
+
+    assert collapsed == {
+        "cycle": 100,
+        "cycle;fetch": 300,
+        "cycle;items": 150,
+        "cycle;items;classify": 200,
+        "cycle;items;alert": 250,
+    }
+
+
+def test_trace_file_is_compact_json(trace_env):
+    trace = start_cycle(2)
+    phase("fetch")
+    finish_cycle(trace)
+
+    line = next(trace_env.glob("*.jsonl")).read_text().strip()
+    assert ": " not in line
+    assert json.loads(line)["stages"]["fetch"][0] == 1
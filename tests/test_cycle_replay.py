@@ -0,0 +1,154 @@
+"""Tests for the cycle replay benchmark harness."""
+
+import asyncio
+import socket
+
+import pytest
+import requests
+
+from catalyst_bot import feeds, llm_client, llm_hybrid, market, sec_document_fetcher
+from catalyst_bot.simulation.cycle_replay import (
+    BundleRecorder,
+    CycleReplayBench,
+    FixtureBundle,
+    StubServices,
+    compare_reports,
+    prompt_key,
+)
+
+
+def _item(i, ticker="PLUG"):
+    return {
+        "id": f"it-{i}",
+        "title": f"{ticker} announces strategic partnership {i}",
+        "link": f"https://example.com/{ticker}/{i}",
+        "source": "globenewswire",
+        "ticker": ticker,
+        "ts": "2025-12-09T14:00:00+00:00",
+        "summary": f"{ticker} partnership",
+    }
+
+
+def test_recorder_round_trip(tmp_path, monkeypatch):
+    cycles = iter([[_item(1), _item(2)], [_item(2), _item(3)]])
+
+    async def route_request(router, prompt, *args, **kwargs):
+        return "cloud:" + prompt
+
+    monkeypatch.setattr(feeds, "fetch_pr_feeds", lambda seen_store=None: next(cycles))
+    monkeypatch.setattr(
+        market, "get_last_price_snapshot", lambda t, retries=2: (2.0, 1.6)
+    )
+    monkeypatch.setattr(
+        market, "batch_get_prices", lambda tickers: {"SOFI": (11.0, 10.0)}
+    )
+    monkeypatch.setattr(llm_client, "query_llm", lambda prompt, **kw: "local:" + prompt)
+    monkeypatch.setattr(llm_hybrid.HybridLLMRouter, "route_request", route_request)
+    monkeypatch.setattr(
+        sec_document_fetcher, "fetch_sec_document_text", lambda link, acc=None: "10-K"
+    )
+
+    recorder = BundleRecorder(tmp_path).install()
+    try:
+        feeds.fetch_pr_feeds()
+        feeds.fetch_pr_feeds()
+        market.get_last_price_snapshot("plug")
+        market.batch_get_prices(["SOFI"])
+        llm_client.query_llm("classify this")
+        router = llm_hybrid.HybridLLMRouter.__new__(llm_hybrid.HybridLLMRouter)
+        asyncio.run(router.route_request("summarize this"))
+        sec_document_fetcher.fetch_sec_document_text("https://sec.gov/doc")
+    finally:
+        recorder.uninstall()
+
+    # Wrappers are removed again
+    assert llm_client.query_llm("x") == "local:x"
+    assert feeds.fetch_pr_feeds.__name__ == "<lambda>"
+
+    bundle = FixtureBundle.load(tmp_path)
+    assert [[it["id"] for it in c] for c in bundle.cycles] == [
+        ["it-1", "it-2"],
+        ["it-2", "it-3"],
+    ]
+    # Repeated items are stored once
+    assert len((tmp_path / "items.jsonl").read_text().splitlines()) == 3
+    assert bundle.quotes["PLUG"] == (2.0, 1.6)
+    assert bundle.quotes["SOFI"][0] == 11.0
+    assert bundle.quotes["SOFI"][1] == pytest.approx(10.0)
+    assert bundle.llm[prompt_key("classify this")] == "local:classify this"
+    assert bundle.llm[prompt_key("summarize this")] == "cloud:summarize this"
+    assert bundle.sec_docs == {"https://sec.gov/doc": "10-K"}
+
+
+def test_stub_llm_latency_429_and_discord_sink():
+    stub = StubServices(
+        {prompt_key("known"): "recorded"}, latency_ms=20, rate_429=0.5, seed=3
+    ).start()
+    try:
+        codes = []
+        for prompt in ["known"] * 10:
+            resp = requests.post(stub.llm_url, json={"prompt": prompt}, timeout=5)
+            codes.append(resp.status_code)
+            if resp.status_code == 200:
+                assert resp.json()["response"] == "recorded"
+        miss = requests.post(stub.llm_url, json={"prompt": "other"}, timeout=5)
+        hook = requests.post(stub.webhook_url, json={"content": "hi"}, timeout=5)
+    finally:
+        stub.stop()
+
+    assert set(codes) == {200, 429}
+    assert stub.stats["llm_rate_limited"] == codes.count(429)
+    assert stub.stats["llm_requests"] == 11
+    assert miss.status_code in (200, 429)
+    assert hook.status_code == 204
+    assert stub.stats["discord_posts"] == 1
+
+
+def test_replay_runs_real_cycle_offline(tmp_path):
+    from catalyst_bot import runner
+
+    bundle = FixtureBundle(tmp_path / "bundle")
+    bundle.cycles = [[_item(1), _item(2)], [_item(1), _item(2), _item(3, "SOFI")]]
+    bundle.quotes = {"PLUG": (3.2, 3.0), "SOFI": (11.0, 10.5)}
+    bundle.save()
+    getaddrinfo = socket.getaddrinfo
+    router = llm_hybrid._router
+
+    report = CycleReplayBench(
+        FixtureBundle.load(bundle.path), work_dir=tmp_path / "work"
+    ).run()
+
+    assert report["cycles"] == 2
+    assert report["items"] == 5
+    assert report["cycle_errors"] == 0
+    assert report["stages"]["cycle"]["cycles"] == 2
+    assert {"fetch", "dedupe", "price_batch", "items"} <= set(report["stages"])
+    assert report["memory"]["peak_rss_mb"] > 0
+    assert isinstance(report["blocked_network"], dict)
+    # Patched module state is restored after the run
+    assert socket.getaddrinfo is getaddrinfo
+    assert llm_hybrid._router is router
+    assert not hasattr(runner, "trading_engine") or runner.trading_engine is None
+
+
+def test_compare_reports_flags_stage_regressions():
+    baseline = {
+        "cycle_ms": {"p50": 1000.0, "p95": 2000.0},
+        "alerts_per_min": 4.0,
+        "memory": {"peak_rss_mb": 400.0},
+        "stages": {"sec_batch": {"p50_ms": 500.0, "p95_ms": 900.0}},
+    }
+    current = {
+        "cycle_ms": {"p50": 1500.0, "p95": 2000.0},
+        "alerts_per_min": 4.0,
+        "memory": {"peak_rss_mb": 380.0},
+        "stages": {"sec_batch": {"p50_ms": 1500.0, "p95_ms": 1000.0}},
+    }
+
+    result = compare_reports(baseline, current)
+
+    assert result["headline"]["cycle_p50_ms"]["change_pct"] == 50.0
+    assert result["headline"]["peak_rss_mb"]["change_pct"] == -5.0
+    assert [(r["stage"], r["metric"]) for r in result["regressions"]] == [
+        ("sec_batch", "p50_ms")
+    ]
@@ -0,0 +1,139 @@
+"""Tests for the durable local work queue."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from catalyst_bot.durable_queue import DEAD_SUFFIX, DurableQueue
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / "queue.sqlite"
+
+
+def test_fifo_per_topic_and_key_dedupe_until_ack(path):
+    queue = DurableQueue(path)
+    assert queue.put("a", {"n": 1}, key="k1")
+    assert not queue.put("a", {"n": 2}, key="k1")
+    assert queue.put_many("a", [("k2", {"n": 3}), (None, {"n": 4})]) == 2
+    queue.put("b", {"n": 5})
+
+    jobs = queue.get("a", limit=2)
+    assert [job.message for job in jobs] == [{"n": 1}, {"n": 3}]
+    assert [job.message for job in queue.get("a", limit=5)] == [{"n": 4}]
+    # Leased but not acked: the key still blocks a duplicate
+    assert not queue.put("a", {"n": 6}, key="k1")
+    assert queue.ack(jobs) == 2
+    assert queue.put("a", {"n": 6}, key="k1")
+    assert queue.depth("a") == 2
+    assert queue.depth() == 3
+
+
+def test_unacked_messages_are_redelivered_after_visibility_timeout(path):
+    queue = DurableQueue(path, visibility_timeout=0.05)
+    queue.put("a", "work")
+
+    first = queue.get("a")[0]
+    assert queue.get("a") == []
+    time.sleep(0.08)
+    second = queue.get("a")[0]
+
+    assert second.id == first.id and second.attempts == 2
+    # The consumer whose lease expired can no longer ack
+    assert queue.ack(first) == 0
+    assert queue.ack(second) == 1
+    assert queue.depth("a") == 0
+
+
+def test_nack_delay_touch_and_dead_letter(path):
+    queue = DurableQueue(path, visibility_timeout=0.05, max_attempts=2)
+    queue.put("a", "poison")
+
+    job = queue.get("a")[0]
+    assert queue.nack(job, delay=0.05) == 1
+    assert queue.get("a") == []
+    time.sleep(0.07)
+    job = queue.get("a")[0]
+    assert queue.touch(job, visibility_timeout=10) == 1
+    time.sleep(0.07)
+    assert queue.get("a") == []
+
+    queue.nack(job)
+    assert queue.get("a") == []
+    assert queue.depth("a") == 0
+    assert [j.message for j in queue.get("a" + DEAD_SUFFIX)] == ["poison"]
+    assert queue.stats("a")["dead"] == 1
+
+
+def test_survives_reopen(path):
+    DurableQueue(path).put_many("a", [(None, i) for i in range(3)])
+    leased = DurableQueue(path, visibility_timeout=0.05).get("a")[0]
+
+    # A crashed consumer's lease expires; the other messages were never taken
+    time.sleep(0.07)
+    reopened = DurableQueue(path)
+    jobs = reopened.get("a", limit=10)
+
+    assert [job.message for job in jobs] == [0, 1, 2]
+    assert jobs[0].id == leased.id
+
+
+def test_concurrent_consumers_share_the_work(path):
+    DurableQueue(path).put_many("a", [(str(i), i) for i in range(300)])
+    seen = []
+    lock = threading.Lock()
+
+    def consume():
+        queue = DurableQueue(path)
+        while True:
+            jobs = queue.get("a", limit=7)
+            if not jobs:
+                return
+            with lock:
+                seen.extend(job.message for job in jobs)
+            queue.ack(jobs)
+
+    threads = [threading.Thread(target=consume) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=30)
+
+    assert sorted(seen) == list(range(300))
+    assert DurableQueue(path).depth("a") == 0
+
+
+def test_stats_report_lag_in_flight_and_throughput(path):
+    queue = DurableQueue(path)
+    queue.put_many("a", [(None, i) for i in range(4)])
+    time.sleep(0.05)
+    queue.ack(queue.get("a", limit=2))
+    queue.get("a")
+
+    stats = queue.stats("a")
+    assert stats["ready"] == 1
+    assert stats["in_flight"] == 1
+    assert stats["lag_seconds"] >= 0.05
+    assert stats["acked_last_minute"] == 2
+    assert stats["throughput_per_sec"] == pytest.approx(2 / 60, abs=1e-3)
+    assert queue.publish_metrics("a")["acked_last_minute"] == 2
+    assert queue.topics() == ["a"]
+
+
+def test_idle_polls_do_not_open_write_transactions(path, monkeypatch):
+    queue = DurableQueue(path)
+    writes = []
+    write = queue._write
+    monkeypatch.setattr(queue, "_write", lambda fn: writes.append(fn) or write(fn))
+
+    assert queue.get("a", timeout=0.1) == []
+    assert writes == []
+
+    queue.put("a", "work")
+    writes.clear()
+    assert [job.message for job in queue.get("a", timeout=0.1)] == ["work"]
+    assert len(writes) == 1
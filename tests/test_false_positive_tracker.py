@@ -24,6 +24,7 @@ from catalyst_bot.false_positive_analyzer import (
     generate_keyword_penalties,
 )
 from catalyst_bot.false_positive_tracker import classify_outcome
+from catalyst_bot.partitioned_jsonl import has_records, iter_lines
 
 
 class TestAcceptedItemsLogger:
@@ -50,13 +51,12 @@ class TestAcceptedItemsLogger:
 
         # Verify file exists and has correct content
         log_path = Path("data/accepted_items.jsonl")
-        assert log_path.exists()
+        assert has_records(log_path)
 
         # Read the last line (our entry)
-        with open(log_path, "r") as f:
-            lines = f.readlines()
-            last_line = lines[-1]
-            logged = json.loads(last_line)
+        lines = list(iter_lines(log_path))
+        last_line = lines[-1]
+        logged = json.loads(last_line)
 
         assert logged["ticker"] == "AAPL"
         assert logged["price"] == 5.0
@@ -74,19 +74,13 @@ class TestAcceptedItemsLogger:
 
         # Get current line count
         log_path = Path("data/accepted_items.jsonl")
-        lines_before = 0
-        if log_path.exists():
-            with open(log_path, "r") as f:
-                lines_before = len(f.readlines())
+        lines_before = len(list(iter_lines(log_path)))
 
         # Try to log item without ticker (price must be $0.10-$10.00)
         log_accepted_item(item=item, price=5.0)
 
         # Verify no new line was added
-        lines_after = 0
-        if log_path.exists():
-            with open(log_path, "r") as f:
-                lines_after = len(f.readlines())
+        lines_after = len(list(iter_lines(log_path)))
 
         assert lines_after == lines_before
 
@@ -296,10 +290,7 @@ class TestIntegration:
         """Test complete workflow from logging to analysis."""
         # Get initial line count
         log_path = Path("data/accepted_items.jsonl")
-        lines_before = 0
-        if log_path.exists():
-            with open(log_path, "r") as f:
-                lines_before = len(f.readlines())
+        lines_before = len(list(iter_lines(log_path)))
 
         # 1. Log some accepted items
         for i in range(3):
@@ -318,11 +309,10 @@ class TestIntegration:
             )
 
         # 2. Verify log file exists
-        assert log_path.exists()
+        assert has_records(log_path)
 
         # 3. Verify 3 new items were added
-        with open(log_path, "r") as f:
-            lines = f.readlines()
+        lines = list(iter_lines(log_path))
         assert len(lines) == lines_before + 3
 
 
@@ -0,0 +1,215 @@
+"""Tests for adaptive per-source feed polling."""
+
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from catalyst_bot import feed_scheduler, feeds
+from catalyst_bot.feed_scheduler import FeedScheduler, session_factor
+from catalyst_bot.feed_state_manager import FeedStateManager
+
+
+class Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def sched(tmp_path, clock):
+    return FeedScheduler(
+        state_path=tmp_path / "schedule.json",
+        min_interval=10,
+        max_interval=600,
+        base_interval=60,
+        clock=clock,
+        factor_fn=lambda now: 1.0,
+    )
+
+
+def _rss(*epochs):
+    items = "".join(
+        f"<item><title>T{e}</title><link>http://x/{e}</link><pubDate>"
+        + datetime.fromtimestamp(e, tz=timezone.utc).strftime(
+            "%a, %d %b %Y %H:%M:%S +0000"
+        )
+        + "</pubDate></item>"
+        for e in epochs
+    )
+    return f'<?xml version="1.0"?><rss><channel>{items}</channel></rss>'
+
+
+def test_hot_source_polls_faster_than_quiet_source(sched, clock):
+    now = clock.now
+    # Wire-like: a publish every 20s; quiet: one every two hours
+    assert sched.record_poll("wire", [now - 60, now - 40, now - 20]) == 0
+    assert sched.record_poll("quiet", [now - 14400, now - 7200]) == 0
+
+    assert sched.sources["wire"].interval == 10
+    assert sched.sources["quiet"].interval == 600
+    assert sched.due(["wire", "quiet", "new"]) == ["new"]
+
+    clock.now += 10
+    assert sched.due(["wire", "quiet"]) == ["wire"]
+    assert sched.record_poll("wire", [clock.now - 5, now - 20]) == 1
+    assert sched.sources["wire"].hits == 1
+
+
+def test_silence_and_304s_slow_a_source_down(sched, clock):
+    now = clock.now
+    sched.record_poll("src", [now - 90, now - 60, now - 30])
+    assert sched.sources["src"].interval == 15
+
+    intervals = []
+    for _ in range(6):
+        clock.now += sched.sources["src"].interval
+        sched.record_poll("src", not_modified=True)
+        intervals.append(sched.sources["src"].interval)
+    assert intervals == sorted(intervals) and intervals[-1] > 60
+    assert sched.sources["src"].not_modified == 6
+
+    # Errors keep the interval rather than learning from them
+    before = sched.sources["src"].interval
+    sched.begin_cycle()
+    sched.record_poll("src", error=True)
+    assert sched.sources["src"].interval == before
+    assert not sched.cycle_quiet()
+
+
+def test_untimestamped_source_backs_off_and_caps(sched):
+    for _ in range(20):
+        sched.record_poll("nots")
+    assert sched.sources["nots"].interval == 600
+
+
+def test_next_wait_and_persistence(sched, clock, tmp_path):
+    assert sched.next_wait(60) == 60  # nothing tracked yet
+    sched.record_poll("a", [clock.now - 40, clock.now - 20])
+    sched.record_poll("b")
+    assert sched.next_wait(60) == 10
+    assert sched.next_wait(5) == 5
+    clock.now += 30
+    assert sched.next_wait(60) == feed_scheduler.MIN_WAIT_SEC
+
+    sched.save()
+    again = FeedScheduler(state_path=tmp_path / "schedule.json", clock=clock)
+    assert again.sources["a"] == sched.sources["a"]
+
+
+def test_session_factor_speeds_up_the_open(monkeypatch):
+    monkeypatch.delenv("MARKET_CLOSED_CYCLE_SEC", raising=False)
+    monkeypatch.delenv("MARKET_OPEN_CYCLE_SEC", raising=False)
+    open_rush = datetime(2026, 1, 6, 14, 40, tzinfo=timezone.utc).timestamp()
+    midday = datetime(2026, 1, 6, 18, 0, tzinfo=timezone.utc).timestamp()
+    saturday = datetime(2026, 1, 10, 18, 0, tzinfo=timezone.utc).timestamp()
+
+    assert session_factor(open_rush, 30, 0.5) == 0.5
+    assert session_factor(midday, 30, 0.5) == 1.0
+    assert session_factor(saturday, 30, 0.5) == 3.0
+
+
+def test_fetch_pr_feeds_polls_only_due_sources(tmp_path, monkeypatch, clock):
+    monkeypatch.setenv("FEATURE_FEED_SCHEDULER", "1")
+    sched = FeedScheduler(
+        state_path=tmp_path / "schedule.json",
+        min_interval=10,
+        max_interval=600,
+        clock=clock,
+        factor_fn=lambda now: 1.0,
+    )
+    monkeypatch.setattr(feed_scheduler, "_scheduler", sched)
+    monkeypatch.setattr(
+        feeds, "_feed_state_manager", FeedStateManager(tmp_path / "state.json")
+    )
+    monkeypatch.setattr(feeds, "AIOHTTP_AVAILABLE", False)
+    monkeypatch.setattr(
+        feeds,
+        "FEEDS",
+        {"hot": ["http://hot.local/rss"], "cold": ["http://cold.local/rss"]},
+    )
+    monkeypatch.setattr(feeds, "dedupe", lambda items: items)
+    monkeypatch.setattr(feeds, "_filter_by_freshness", lambda items, **kw: (items, 0))
+
+    now = clock.now
+    payloads = {
+        "http://hot.local/rss": _rss(now - 60, now - 40, now - 20),
+        "http://cold.local/rss": _rss(now - 20000, now - 10000),
+    }
+    polled = []
+
+    def fake_get_multi(urls):
+        polled.append(urls[0])
+        return 200, payloads[urls[0]], urls[0]
+
+    monkeypatch.setattr(feeds, "_get_multi", fake_get_multi)
+
+    feeds.fetch_pr_feeds()
+    assert sorted(polled) == ["http://cold.local/rss", "http://hot.local/rss"]
+    assert (tmp_path / "schedule.json").exists()
+
+    polled.clear()
+    clock.now += 5
+    feeds.fetch_pr_feeds()
+    assert polled == []
+    assert sched.cycle_quiet()
+
+    clock.now += 5
+    feeds.fetch_pr_feeds()
+    assert polled == ["http://hot.local/rss"]
+
+
+def test_undated_feed_backs_off_instead_of_tracking_polls(tmp_path, monkeypatch, clock):
+    monkeypatch.setenv("FEATURE_FEED_SCHEDULER", "1")
+    sched = FeedScheduler(
+        state_path=tmp_path / "schedule.json",
+        min_interval=10,
+        max_interval=600,
+        base_interval=60,
+        clock=clock,
+        factor_fn=lambda now: 1.0,
+    )
+    monkeypatch.setattr(feed_scheduler, "_scheduler", sched)
+    monkeypatch.setattr(
+        feeds, "_feed_state_manager", FeedStateManager(tmp_path / "state.json")
+    )
+    monkeypatch.setattr(feeds, "AIOHTTP_AVAILABLE", False)
+    monkeypatch.setattr(feeds, "FEEDS", {"undated": ["http://undated.local/rss"]})
+    monkeypatch.setattr(feeds, "dedupe", lambda items: items)
+    monkeypatch.setattr(feeds, "_filter_by_freshness", lambda items, **kw: (items, 0))
+    monkeypatch.setattr(
+        feeds, "sim_now", lambda: datetime.fromtimestamp(clock.now, tz=timezone.utc)
+    )
+
+    def fake_get_multi(urls):
+        # A new entry every poll, none of them dated
+        body = (
+            f"<item><title>T{clock.now}</title>"
+            f"<link>http://x/{clock.now}</link></item>"
+        )
+        return (
+            200,
+            f'<?xml version="1.0"?><rss><channel>{body}</channel></rss>',
+            urls[0],
+        )
+
+    monkeypatch.setattr(feeds, "_get_multi", fake_get_multi)
+
+    intervals = []
+    for _ in range(6):
+        feeds.fetch_pr_feeds()
+        intervals.append(sched.sources["undated"].interval)
+        clock.now += intervals[-1]
+
+    # The poll-time stamp is flagged and never read as a publish
+    entry = SimpleNamespace(title="Undated", link="http://x/undated")
+    item = feeds._normalize_entry("undated", entry)
+    assert item["ts_estimated"] and feed_scheduler.entry_epochs([item]) == []
+    assert intervals == sorted(intervals) and intervals[-1] == 600
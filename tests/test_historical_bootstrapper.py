@@ -553,6 +553,108 @@ class TestEndToEnd:
             assert stats["items_processed"] >= 1
 
 
+class TestShardedRun:
+    """Month-sharded execution with per-shard checkpoints."""
+
+    @staticmethod
+    def _fetch(bootstrapper, source, start, end):
+        return [
+            {
+                "id": f"{start.date()}-{n}",
+                "title": f"Filing {n}",
+                "ts": (start + timedelta(days=n)).isoformat(),
+                "ticker": "TEST",
+            }
+            for n in range(2)
+        ] + [{"id": "dup", "title": "Seen in every shard", "ticker": "DUP"}]
+
+    @staticmethod
+    def _process_batch(self, items):
+        for item in items:
+            with open(self.rejected_path, "a") as f:
+                f.write(json.dumps({"id": item["id"]}) + "\n")
+            self.stats["items_processed"] += 1
+            self.stats["rejections_found"] += 1
+
+    @pytest.fixture
+    def sharded(self, bootstrapper, temp_data_dir, monkeypatch):
+        bootstrapper.end_date = bootstrapper.start_date + timedelta(days=75)
+        bootstrapper.shard_root = temp_data_dir / "moa" / "bootstrap_shards"
+        monkeypatch.setattr(
+            HistoricalBootstrapper, "_fetch_sec_historical", self._fetch
+        )
+        monkeypatch.setattr(
+            HistoricalBootstrapper, "_process_batch", self._process_batch
+        )
+        monkeypatch.setattr(
+            HistoricalBootstrapper, "_send_discord_notification", lambda *a: False
+        )
+        return bootstrapper
+
+    def test_shards_merge_in_order(self, sharded):
+        stats = sharded.run_sharded(workers=1)
+
+        ids = [
+            json.loads(line)["id"]
+            for line in sharded.rejected_path.read_text().splitlines()
+        ]
+        assert ids == [
+            "2024-01-01-0",
+            "2024-01-01-1",
+            "dup",
+            "2024-01-31-0",
+            "2024-01-31-1",
+            "2024-03-01-0",
+            "2024-03-01-1",
+        ]
+        assert stats["feeds_fetched"] == 3
+        assert stats["rejections_found"] == 7
+        assert len(list(sharded.shard_root.glob("*/state.json"))) == 3
+
+    def test_resume_redoes_only_unfinished_shards(self, sharded, monkeypatch):
+        sharded.run_sharded(workers=1)
+        sharded.rejected_path.unlink()
+
+        # Simulate a crash in the last shard before its checkpoint was written
+        last_shard = sorted(sharded.shard_root.iterdir())[-1]
+        (last_shard / "state.json").unlink()
+
+        fetches = []
+        monkeypatch.setattr(
+            HistoricalBootstrapper,
+            "_fetch_sec_historical",
+            lambda self, *args: fetches.append(args) or [],
+        )
+        sharded.resume = True
+        sharded._processed_ids.clear()
+        processed_before = sharded.stats["items_processed"]
+        stats = sharded.run_sharded(workers=1)
+
+        # Fetched items were checkpointed, so no feed is requested again
+        assert fetches == []
+        assert stats["items_processed"] - processed_before == 2
+        ids = [
+            json.loads(line)["id"]
+            for line in sharded.rejected_path.read_text().splitlines()
+        ]
+        assert ids == ["2024-03-01-0", "2024-03-01-1"]
+
+    def test_interrupted_merge_is_not_duplicated(self, sharded):
+        sharded.run_sharded(workers=1)
+        expected = sharded.rejected_path.read_text()
+
+        # Crash after the last shard was appended but before merged=True
+        last_shard = sorted(sharded.shard_root.iterdir())[-1]
+        state = json.loads((last_shard / "state.json").read_text())
+        assert "merge_offsets" in state
+        state["merged"] = False
+        (last_shard / "state.json").write_text(json.dumps(state))
+
+        windows = sharded._shard_windows()
+        assert sharded._merge_shards(windows) == 1
+        assert sharded.rejected_path.read_text() == expected
+
+
 def test_timeframes_definition():
     """Test timeframes are correctly defined."""
     assert "15m" in ALL_TIMEFRAMES
@@ -0,0 +1,238 @@
+"""Tests for the deferred-response Discord interaction service."""
+
+import io
+import json
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from catalyst_bot import (
+    chart_cache,
+    discord_interactions,
+    health_endpoint,
+    interaction_service,
+)
+from catalyst_bot.interaction_service import InteractionService
+
+
+class FakeChartCache:
+    def __init__(self, cached=None):
+        self.cached = cached or {}
+        self.stored = []
+
+    def get_cached_chart(self, ticker, timeframe):
+        return self.cached.get((ticker, timeframe))
+
+    def cache_chart(self, ticker, timeframe, path):
+        self.stored.append((ticker, timeframe, path))
+
+
+@pytest.fixture
+def fake_cache(monkeypatch):
+    cache = FakeChartCache()
+    monkeypatch.setattr(chart_cache, "get_cache", lambda: cache)
+    return cache
+
+
+def _command(name="stats"):
+    return {
+        "type": 2,
+        "application_id": "app",
+        "token": "tok",
+        "data": {"name": name, "options": []},
+    }
+
+
+def _click(message_id, ticker="PLUG", timeframe="5D", token="tok"):
+    return {
+        "type": 3,
+        "application_id": "app",
+        "token": token,
+        "channel_id": "c1",
+        "message": {"id": message_id, "embeds": [], "attachments": []},
+        "data": {"custom_id": f"chart_{ticker}_{timeframe}"},
+    }
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+def test_fast_command_is_answered_inline():
+    reply = {"type": 4, "data": {"content": "hi", "flags": 64}}
+    followups = []
+    service = InteractionService(
+        render_processes=0,
+        inline_budget_ms=500,
+        command_handler=lambda i: reply,
+        followup_fn=lambda url, data: followups.append(data),
+    )
+    try:
+        assert service.handle(_command()) == reply
+    finally:
+        service.shutdown()
+
+    assert followups == []
+    assert service.stats["commands_inline"] == 1
+    assert service.pending == 0
+
+
+def test_slow_command_is_deferred_then_followed_up():
+    release = threading.Event()
+    followups = []
+
+    def slow_handler(interaction):
+        release.wait(5)
+        return {"type": 4, "data": {"content": "backtest done", "flags": 64}}
+
+    service = InteractionService(
+        render_processes=0,
+        inline_budget_ms=10,
+        command_handler=slow_handler,
+        followup_fn=lambda url, data: followups.append((url, data)),
+    )
+    try:
+        started = time.perf_counter()
+        ack = service.handle(_command("backtest"))
+        ack_ms = (time.perf_counter() - started) * 1000
+        admin_ack = service.handle(_command("admin"))
+        release.set()
+        assert _wait_for(lambda: len(followups) == 2)
+    finally:
+        service.shutdown()
+
+    assert ack == {"type": 5}
+    assert ack_ms < 500
+    assert admin_ack == {"type": 5, "data": {"flags": 64}}
+    url, data = followups[0]
+    assert url == "https://discord.com/api/v10/webhooks/app/tok"
+    # Visibility is fixed by the ACK, so flags are not sent on the edit
+    assert data == {"content": "backtest done"}
+
+
+def test_duplicate_chart_clicks_share_one_render(fake_cache, tmp_path):
+    chart = tmp_path / "PLUG_5D.png"
+    chart.write_bytes(b"png")
+    release = threading.Event()
+    renders = []
+    edits = []
+
+    def render(ticker, timeframe):
+        renders.append((ticker, timeframe))
+        release.wait(5)
+        return str(chart)
+
+    service = InteractionService(
+        render_processes=0,
+        render_fn=render,
+        edit_fn=lambda i, t, tf, path: edits.append((i["token"], path)) or True,
+    )
+    try:
+        acks = [
+            service.handle(_click("m1", token="t1")),
+            service.handle(_click("m1", token="t2")),
+            service.handle(_click("m2", token="t3")),
+        ]
+        assert _wait_for(lambda: renders)
+        release.set()
+        assert _wait_for(lambda: len(edits) == 2)
+    finally:
+        service.shutdown()
+
+    assert acks == [{"type": 6}] * 3
+    assert renders == [("PLUG", "5D")]
+    # One edit per message, using the newest click's token
+    assert sorted(token for token, _ in edits) == ["t2", "t3"]
+    assert edits[0][1] == Path(chart)
+    assert fake_cache.stored == [("PLUG", "5D", Path(chart))]
+    assert service.stats["coalesced"] == 2
+    assert service.pending == 0
+
+
+def test_cached_chart_skips_render_and_failed_render_notifies(fake_cache, tmp_path):
+    fake_cache.cached[("SOFI", "1D")] = tmp_path / "SOFI_1D.png"
+    edits, notices = [], []
+    service = InteractionService(
+        render_processes=0,
+        render_fn=lambda t, tf: None,
+        edit_fn=lambda i, t, tf, path: edits.append((t, tf)) or True,
+        notice_fn=lambda url, content: notices.append(content),
+    )
+    try:
+        service.handle(_click("m1", ticker="SOFI", timeframe="1D"))
+        service.handle(_click("m2", ticker="PLUG", timeframe="1M"))
+        assert _wait_for(lambda: edits and notices)
+    finally:
+        service.shutdown()
+
+    assert edits == [("SOFI", "1D")]
+    assert notices == ["❌ Failed to generate 1M chart for PLUG"]
+    assert service.stats["render_cache_hits"] == 1
+
+
+def test_busy_service_rejects_new_work():
+    release = threading.Event()
+    service = InteractionService(
+        render_processes=0,
+        max_pending=1,
+        inline_budget_ms=0,
+        command_handler=lambda i: release.wait(5) and {"type": 4, "data": {}},
+        followup_fn=lambda url, data: True,
+    )
+    try:
+        assert service.handle(_command())["type"] == 5
+        busy = service.handle(_command())
+        release.set()
+    finally:
+        service.shutdown()
+
+    assert busy["type"] == 4 and busy["data"]["flags"] == 64
+    assert service.stats["rejected_busy"] == 1
+
+
+def test_chart_button_routes_through_service(monkeypatch):
+    calls = []
+
+    class StubService:
+        def submit_chart(self, interaction, ticker, timeframe):
+            calls.append((ticker, timeframe))
+            return {"type": 6}
+
+    monkeypatch.setattr(
+        interaction_service, "get_interaction_service", lambda: StubService()
+    )
+
+    assert discord_interactions.handle_interaction(_click("m1")) == {"type": 6}
+    assert calls == [("PLUG", "5D")]
+
+
+def test_health_endpoint_requires_signature_beyond_ping(monkeypatch):
+    monkeypatch.delenv("DISCORD_PUBLIC_KEY", raising=False)
+
+    def post(payload):
+        body = json.dumps(payload).encode()
+        handler = health_endpoint.HealthCheckHandler.__new__(
+            health_endpoint.HealthCheckHandler
+        )
+        handler.path = "/interactions"
+        handler.headers = {"Content-Length": str(len(body))}
+        handler.rfile = io.BytesIO(body)
+        handler.wfile = io.BytesIO()
+        handler.send_response = lambda code: setattr(handler, "code", code)
+        handler.send_header = lambda *a: None
+        handler.end_headers = lambda: None
+        handler.do_POST()
+        return handler.code, json.loads(handler.wfile.getvalue() or b"null")
+
+    assert post({"type": 1}) == (200, {"type": 1})
+    assert post(_command())[0] == 401
+    assert post({"type": 3, "data": {"custom_id": "admin_approve"}})[0] == 401
+    # Chart renders start work and webhook follow-ups: verified requests only
+    assert post(_click("m1"))[0] == 401
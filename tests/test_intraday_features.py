@@ -0,0 +1,162 @@
+"""Tests for shared intraday feature snapshots (one bar fetch, many signals)."""
+
+from __future__ import annotations
+
+import threading
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from catalyst_bot import config, intraday_features, market, rvol
+from catalyst_bot import volume_price_divergence as vpd
+from catalyst_bot import vwap_calculator
+from catalyst_bot.bar_store import BAR_DTYPE
+from catalyst_bot.intraday_features import IntradayFeatureEngine, compute_snapshot
+
+
+def _epoch(*args) -> int:
+    return int(datetime(*args, tzinfo=timezone.utc).timestamp())
+
+
+def _bars(today_price=11.0, prev_close=10.0, minutes=60):
+    """Two sessions of 1-minute bars (EST, so the open is 14:30 UTC)."""
+    rows = []
+    # Monday regular session tail, last close = prev_close
+    for i in range(30):
+        ts = _epoch(2026, 1, 5, 20, 30) + 60 * i
+        rows.append((ts, prev_close, prev_close, prev_close, prev_close, 2000.0))
+    # Tuesday pre-market bar (excluded from session VWAP/volume)
+    ts = _epoch(2026, 1, 6, 13, 0)
+    rows.append((ts, 10.5, 10.5, 10.5, 10.5, 5000.0))
+    # Tuesday regular session
+    for i in range(minutes):
+        ts = _epoch(2026, 1, 6, 14, 30) + 60 * i
+        p = today_price
+        rows.append((ts, p, p + 0.1, p - 0.1, p, 1000.0))
+    return np.array(rows, dtype=BAR_DTYPE)
+
+
+NOW = _epoch(2026, 1, 6, 15, 30)
+
+
+@pytest.fixture(autouse=True)
+def _rvol_on(monkeypatch):
+    monkeypatch.setattr(config.SETTINGS, "feature_rvol", True)
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    monkeypatch.setenv("FEATURE_INTRADAY_FEATURES", "1")
+    calls = []
+
+    def fetch(tickers):
+        calls.append(list(tickers))
+        return {t: _bars() for t in tickers if t != "NODATA"}
+
+    eng = IntradayFeatureEngine(
+        ttl=60,
+        batch_size=2,
+        fetch_bars=fetch,
+        baseline_fn=lambda ticker, day: 150_000.0,
+        clock=lambda: NOW,
+    )
+    eng.calls = calls
+    monkeypatch.setattr(intraday_features, "_engine", eng)
+    return eng
+
+
+def test_compute_snapshot_features():
+    snap = compute_snapshot("ABC", _bars(), avg_volume_20d=150_000.0, now=NOW)
+
+    assert snap.last_price == 11.0
+    assert snap.prev_close == 10.0
+    assert snap.price_change == pytest.approx(0.10)
+    assert snap.session_volume == 60_000
+    assert snap.session_bars == 60
+    assert snap.hours_open == pytest.approx(1.0)
+    assert snap.vwap == pytest.approx(11.0)
+    assert snap.atr14 is not None and snap.atr14 > 0
+    assert snap.rsi14 == 100.0
+    assert snap.momentum_5m == pytest.approx(0.0)
+
+    rv = snap.rvol_data()
+    assert rv["estimated_full_day_volume"] == 390_000
+    assert rv["rvol"] == 2.6
+    assert snap.vwap_data()["vwap_signal"] == "NEUTRAL"
+    assert snap.indicators() == {"vwap": snap.vwap, "rsi14": 100.0}
+
+
+def test_snapshot_without_baseline_has_no_rvol():
+    snap = compute_snapshot("ABC", _bars(), avg_volume_20d=None, now=NOW)
+    assert snap.rvol_data() is None
+    assert snap.divergence_data() is None
+    assert compute_snapshot("ABC", np.zeros(0, dtype=BAR_DTYPE)) is None
+
+
+def test_prefetch_batches_and_reuses_snapshots(engine):
+    snaps = engine.prefetch(["abc", "DEF", "GHI", "NODATA"])
+    assert engine.calls == [["ABC", "DEF"], ["GHI", "NODATA"]]
+    assert snaps["NODATA"] is None
+    assert snaps["ABC"].price_change == pytest.approx(0.10)
+
+    assert engine.get("ABC") is snaps["ABC"]
+    assert engine.get("NODATA") is None
+    assert len(engine.calls) == 2
+
+
+def test_rvol_vwap_and_price_change_share_one_fetch(engine, monkeypatch):
+    monkeypatch.setattr(market, "get_settings", lambda: _Settings())
+
+    rv = rvol.calculate_rvol_intraday("XYZ")
+    vw = vwap_calculator.calculate_vwap("XYZ")
+    pc = vpd.calculate_price_change("XYZ")
+    ind = market.get_intraday_indicators("XYZ")
+
+    assert engine.calls == [["XYZ"]]
+    assert rv["current_volume"] == 60_000
+    assert vw["vwap"] == pytest.approx(11.0)
+    assert pc == pytest.approx(0.10)
+    assert ind["vwap"] == pytest.approx(11.0)
+
+
+def test_concurrent_gets_coalesce(monkeypatch):
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow_fetch(tickers):
+        calls.append(list(tickers))
+        started.set()
+        release.wait(5)
+        return {t: _bars() for t in tickers}
+
+    eng = IntradayFeatureEngine(
+        ttl=60,
+        fetch_bars=slow_fetch,
+        baseline_fn=lambda ticker, day: None,
+        clock=lambda: NOW,
+    )
+    results = []
+    first = threading.Thread(target=lambda: results.append(eng.get("ABC")))
+    first.start()
+    started.wait(5)
+    second = threading.Thread(target=lambda: results.append(eng.get("ABC")))
+    second.start()
+    release.set()
+    first.join(5)
+    second.join(5)
+
+    assert calls == [["ABC"]]
+    assert len(results) == 2 and results[0] is results[1]
+
+
+def test_engine_disabled_by_flag(monkeypatch):
+    monkeypatch.setenv("FEATURE_INTRADAY_FEATURES", "0")
+    assert not intraday_features.engine_enabled()
+
+
+class _Settings:
+    feature_indicators = True
+    feature_tiingo = False
+    tiingo_api_key = ""
@@ -0,0 +1,115 @@
+"""Tests for the fused (single-call) SEC LLM chain."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip("pydantic")
+
+from catalyst_bot import llm_chain  # noqa: E402
+
+EXTRACTION = {
+    "key_facts": ["Acme agreed to acquire Beta Bio for $150M"],
+    "parties": ["Acme", "Beta Bio"],
+    "dates": ["March 3, 2025"],
+    "dollar_amounts": ["$150M"],
+}
+SUMMARY = "Acme Therapeutics (8-K) agreed to acquire Beta Bio for $150M in cash."
+SENTIMENT = {"score": 0.6, "justification": "Accretive deal.", "confidence": 0.8}
+
+
+class _Provider:
+    def __init__(self, fused_response):
+        self.fused_response = fused_response
+        self.prompts = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, prompt, **kwargs):
+        self.prompts.append(prompt)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        if prompt.startswith("You are analyzing an SEC filing for traders."):
+            return self.fused_response
+        if prompt.startswith("You are analyzing an SEC filing."):
+            return json.dumps(EXTRACTION)
+        if prompt.startswith("You are creating a brief summary"):
+            return SUMMARY
+        if prompt.startswith("You are tagging"):
+            return json.dumps({"keywords": ["acquisition"]})
+        return json.dumps(
+            {"score": -0.2, "justification": "Re-asked.", "confidence": 0.5}
+        )
+
+
+def _run(provider, monkeypatch, mode="fused"):
+    monkeypatch.setattr(llm_chain, "query_hybrid_llm", provider)
+    return asyncio.run(
+        llm_chain.run_llm_chain("FORM 8-K ...", max_retries=1, mode=mode)
+    )
+
+
+def _fused(**overrides):
+    data = {
+        "extraction": EXTRACTION,
+        "summary": SUMMARY,
+        "keywords": ["Acquisition", "deal", "acquisition"],
+        "sentiment": SENTIMENT,
+    }
+    data.update(overrides)
+    return json.dumps(data)
+
+
+def test_fused_single_call(monkeypatch):
+    provider = _Provider("```json\n" + _fused() + "\n```")
+
+    output = _run(provider, monkeypatch)
+
+    assert len(provider.prompts) == 1
+    assert output.mode == "fused" and output.llm_calls == 1
+    assert output.extraction.parties == ["Acme", "Beta Bio"]
+    assert output.summary.summary == SUMMARY
+    assert output.keywords.keywords == ["acquisition", "deal"]
+    assert output.sentiment.score == 0.6
+    assert output.stages_completed == 4
+
+
+def test_only_invalid_stage_reasked(monkeypatch):
+    provider = _Provider(_fused(sentiment={"score": 3.0, "justification": "x"}))
+
+    output = _run(provider, monkeypatch)
+
+    assert len(provider.prompts) == 2
+    assert provider.prompts[1].startswith("You are scoring")
+    # Validated keywords from the fused response feed the re-asked stage
+    assert "acquisition, deal" in provider.prompts[1]
+    assert output.sentiment.justification == "Re-asked."
+    assert output.summary.summary == SUMMARY
+    assert output.llm_calls == 2
+
+
+def test_unparseable_response_falls_back_to_stages(monkeypatch):
+    provider = _Provider("Sorry, I cannot help with that request today.")
+
+    output = _run(provider, monkeypatch)
+
+    assert len(provider.prompts) == 5
+    assert output.llm_calls == 5
+    assert output.keywords.keywords == ["acquisition"]
+    # Keywords and sentiment were re-asked concurrently
+    assert provider.max_in_flight == 2
+
+
+def test_chain_mode_runs_tail_stages_concurrently(monkeypatch):
+    provider = _Provider(_fused())
+
+    output = _run(provider, monkeypatch, mode="chain")
+
+    assert output.mode == "chain" and output.llm_calls == 4
+    assert provider.max_in_flight == 2
+    assert output.sentiment.score == -0.2
@@ -0,0 +1,221 @@
+"""Tests for the priority-aware LLM scheduler."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from catalyst_bot import llm_scheduler
+from catalyst_bot.llm_scheduler import (
+    BATCH,
+    INTERACTIVE,
+    REALTIME,
+    SEC,
+    ClassPolicy,
+    LLMRequestDropped,
+    LLMScheduler,
+    llm_priority,
+    scheduled,
+)
+from catalyst_bot.metrics_registry import get_registry
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def _policies(**overrides):
+    policies = {}
+    for rank, name in enumerate(llm_scheduler.PRIORITY_CLASSES):
+        kwargs = {"weight": 1.0, "concurrency": 4, "max_queue": 100}
+        kwargs.update(overrides.get(name, {}))
+        policies[name] = ClassPolicy(name=name, rank=rank, **kwargs)
+    return policies
+
+
+def _make(max_concurrent=1, clock=None, **overrides):
+    return LLMScheduler(
+        max_concurrent=max_concurrent,
+        policies=_policies(**overrides),
+        enabled=True,
+        clock=clock or time.monotonic,
+        poll_seconds=0.01,
+    )
+
+
+def _run_waiters(scheduler, classes, order, hold=0.0):
+    """Start one thread per class while the only slot is held, then release."""
+    threads = []
+
+    def worker(cls):
+        with scheduler.slot(cls, tokens=10):
+            order.append(cls)
+            time.sleep(hold)
+
+    gate = scheduler.slot(REALTIME)
+    gate.__enter__()
+    for cls in classes:
+        t = threading.Thread(target=worker, args=(cls,))
+        t.start()
+        threads.append(t)
+        while scheduler.stats()["classes"][cls]["queued"] == 0:
+            time.sleep(0.001)
+    gate.__exit__(None, None, None)
+    for t in threads:
+        t.join(5)
+
+
+@pytest.fixture
+def fresh_scheduler():
+    scheduler = _make(max_concurrent=2)
+    llm_scheduler.reset_llm_scheduler(scheduler)
+    yield scheduler
+    llm_scheduler.reset_llm_scheduler(None)
+
+
+def test_weighted_fair_share_prefers_heavier_class():
+    scheduler = _make(realtime={"weight": 4.0}, batch={"weight": 1.0})
+    order = []
+
+    _run_waiters(scheduler, [BATCH] * 3 + [REALTIME] * 3, order)
+
+    # Realtime's weight lets it finish its backlog before batch's second turn
+    assert order[:4].count(REALTIME) == 3
+    assert sorted(order) == sorted([BATCH] * 3 + [REALTIME] * 3)
+    stats = scheduler.stats()["classes"]
+    assert stats[BATCH]["granted"] == 3
+    assert stats[REALTIME]["max_wait_ms"] > 0
+
+
+def test_class_concurrency_caps_in_flight():
+    scheduler = _make(max_concurrent=8, batch={"concurrency": 1})
+    peak = []
+    in_flight = [0]
+    lock = threading.Lock()
+
+    def worker():
+        with scheduler.slot(BATCH):
+            with lock:
+                in_flight[0] += 1
+                peak.append(in_flight[0])
+            time.sleep(0.02)
+            with lock:
+                in_flight[0] -= 1
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5)
+
+    assert max(peak) == 1
+    assert scheduler.stats()["classes"][BATCH]["granted"] == 4
+
+
+def test_token_budget_holds_requests_until_refill():
+    clock = FakeClock()
+    scheduler = _make(max_concurrent=4, clock=clock, sec={"tokens_per_min": 600})
+    done = threading.Event()
+
+    with scheduler.slot(SEC, tokens=600):
+        pass
+    assert scheduler.stats()["classes"][SEC]["tokens_available"] == 0
+
+    def worker():
+        with scheduler.slot(SEC, tokens=300):
+            done.set()
+
+    t = threading.Thread(target=worker)
+    t.start()
+    assert not done.wait(0.1)
+    assert scheduler.stats()["classes"][SEC]["queued"] == 1
+
+    clock.now += 30  # 600 tokens/min refills 300 tokens in 30s
+    assert done.wait(2)
+    t.join(2)
+
+
+def test_deadline_and_queue_limits_drop_requests():
+    clock = FakeClock()
+    scheduler = _make(clock=clock, interactive={"max_queue": 1})
+    results = []
+
+    def worker(cls, deadline):
+        try:
+            with scheduler.slot(cls, deadline_sec=deadline):
+                results.append((cls, "ran"))
+        except LLMRequestDropped as exc:
+            results.append((cls, exc.reason))
+
+    with scheduler.slot(REALTIME):
+        waiter = threading.Thread(target=worker, args=(INTERACTIVE, 5.0))
+        waiter.start()
+        while scheduler.stats()["classes"][INTERACTIVE]["queued"] == 0:
+            time.sleep(0.001)
+        # The queue already holds max_queue requests
+        rejected = threading.Thread(target=worker, args=(INTERACTIVE, 5.0))
+        rejected.start()
+        rejected.join(2)
+        clock.now += 6
+        waiter.join(2)
+
+    assert results == [(INTERACTIVE, "queue_full"), (INTERACTIVE, "deadline")]
+    assert scheduler.stats()["classes"][INTERACTIVE]["dropped"] == {
+        "queue_full": 1,
+        "deadline": 1,
+    }
+    dropped = get_registry().counter("llm_sched_dropped_total")
+    assert dropped.total(cls=INTERACTIVE, reason="deadline") >= 1
+
+
+def test_ambient_class_and_reentrant_slots(fresh_scheduler):
+    seen = []
+
+    @scheduled
+    def inner(prompt):
+        seen.append(fresh_scheduler.stats()["classes"][SEC]["in_flight"])
+        return prompt.upper()
+
+    @scheduled
+    def outer(prompt):
+        return inner(prompt)
+
+    with llm_priority(SEC):
+        assert outer("hi") == "HI"
+
+    # The nested call reused the outer slot instead of taking a second one
+    assert seen == [1]
+    assert fresh_scheduler.stats()["classes"][SEC]["granted"] == 1
+    with pytest.raises(ValueError):
+        with llm_priority("urgent"):
+            pass
+
+
+def test_async_slots_and_drop_returns_none(fresh_scheduler):
+    @scheduled
+    async def query(prompt):
+        await asyncio.sleep(0.01)
+        return prompt
+
+    async def main():
+        with llm_priority(BATCH):
+            return await asyncio.gather(*(query(f"p{i}") for i in range(5)))
+
+    assert asyncio.run(main()) == [f"p{i}" for i in range(5)]
+    assert fresh_scheduler.stats()["classes"][BATCH]["granted"] == 5
+    depth = get_registry().gauge("llm_sched_queue_depth").get(cls=BATCH)
+    assert depth == 0
+
+    fresh_scheduler._classes[BATCH].policy.max_queue = 1
+
+    async def flood():
+        with llm_priority(BATCH):
+            return await asyncio.gather(*(query("x") for _ in range(4)))
+
+    results = asyncio.run(flood())
+    assert None in results and "x" in results
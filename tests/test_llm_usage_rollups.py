@@ -0,0 +1,149 @@
+"""Tests for LLMUsageMonitor rollups (stats without rescanning the log)."""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from catalyst_bot import llm_usage_monitor
+from catalyst_bot.llm_usage_monitor import (
+    ROLLUP_MINUTE_RETENTION_S,
+    LLMUsageMonitor,
+    UsageRollups,
+)
+
+
+def _record(ts: datetime, provider="gemini", operation="sec_summary", **kw):
+    record = {
+        "timestamp": ts.isoformat(),
+        "provider": provider,
+        "model": kw.get("model", "gemini-2.5-flash"),
+        "operation": operation,
+        "input_tokens": 100,
+        "output_tokens": 50,
+        "total_tokens": 150,
+        "input_cost": 0.01,
+        "output_cost": 0.02,
+        "total_cost": 0.03,
+        "success": kw.get("success", True),
+    }
+    return json.dumps(record) + "\n"
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    return tmp_path / "llm_usage.jsonl"
+
+
+def _monitor(log_path):
+    return LLMUsageMonitor(log_path=log_path)
+
+
+class TestUsageRollups:
+    def test_query_uses_overlapping_buckets(self):
+        rollups = UsageRollups()
+        base = datetime(2025, 1, 6, 14, 0, tzinfo=timezone.utc).timestamp()
+        for offset in (5, 30, 65, 3600):
+            rollups.add(base + offset, "gemini", "m", "op", True, 1, 1, 2, 0, 0, 1.0)
+
+        rows = list(rollups.query(base + 40, base + 120))
+
+        # 14:00 bucket overlaps the start bound; 15:00 is after the end
+        assert sum(c[0] for _, c in rows) == 3
+
+    def test_compact_folds_old_minutes_into_hours(self):
+        rollups = UsageRollups()
+        base = datetime(2025, 1, 6, 14, 0, tzinfo=timezone.utc).timestamp()
+        for minute in range(10):
+            rollups.add(base + minute * 60, "gemini", "m", "op", True, 1, 1, 2, 0, 0, 1)
+
+        rollups.compact(base + ROLLUP_MINUTE_RETENTION_S + 7200)
+
+        assert list(rollups.buckets) == [int(base)]
+        assert rollups.buckets[int(base)][("gemini", "m", "op")][0] == 10
+        # Late events for compacted hours land in the hour bucket
+        rollups.add(base + 1800, "gemini", "m", "op", False, 1, 1, 2, 0, 0, 1)
+        assert len(rollups) == 1
+        assert sum(c[0] for _, c in rollups.query(base + 1000, base + 1100)) == 11
+
+
+class TestMonitorRollups:
+    def test_stats_match_log(self, log_path):
+        monitor = _monitor(log_path)
+        monitor.log_usage("gemini", "gemini-2.5-flash", "sec_summary", 1000, 200)
+        monitor.log_usage(
+            "anthropic", "claude-3-haiku-20240307", "sentiment", 500, 100, success=False
+        )
+
+        stats = monitor.get_daily_stats()
+
+        assert stats.total_requests == 2
+        assert stats.gemini.total_input_tokens == 1000
+        assert stats.anthropic.failed_requests == 1
+        assert stats.total_tokens == 1800
+        assert set(stats.cost_by_operation) == {"sec_summary", "sentiment"}
+
+    def test_stats_do_not_reread_log(self, log_path, monkeypatch):
+        monitor = _monitor(log_path)
+        monitor.log_usage("gemini", "gemini-2.5-flash", "sec_summary", 1000, 200)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("log replayed")
+
+        monkeypatch.setattr(llm_usage_monitor.UsageRollups, "add_record", fail)
+        assert monitor.get_daily_stats().total_requests == 1
+
+    def test_restart_uses_snapshot_and_replays_tail(self, log_path):
+        now = datetime.now(timezone.utc)
+        monitor = _monitor(log_path)
+        monitor.log_usage("gemini", "gemini-2.5-flash", "sec_summary", 1000, 200)
+        monitor.save_rollups()
+        # Events written after the snapshot (e.g. before a crash)
+        with open(log_path, "a") as f:
+            f.write(_record(now))
+            f.write(_record(now, provider="local", model="mistral"))
+
+        restarted = _monitor(log_path)
+
+        assert restarted._log_offset == log_path.stat().st_size
+        stats = restarted.get_daily_stats()
+        assert stats.total_requests == 3
+        assert stats.local.total_requests == 1
+
+    def test_rotated_log_rebuilds(self, log_path):
+        now = datetime.now(timezone.utc)
+        monitor = _monitor(log_path)
+        for _ in range(3):
+            monitor.log_usage("gemini", "gemini-2.5-flash", "sec_summary", 10, 10)
+        monitor.save_rollups()
+
+        log_path.write_text(_record(now, operation="rotated"))
+
+        stats = _monitor(log_path).get_daily_stats()
+        assert stats.total_requests == 1
+        assert list(stats.cost_by_operation) == ["rotated"]
+
+    def test_other_writer_picked_up(self, log_path):
+        now = datetime.now(timezone.utc)
+        monitor = _monitor(log_path)
+        monitor.log_usage("gemini", "gemini-2.5-flash", "sec_summary", 10, 10)
+        with open(log_path, "a") as f:
+            f.write(_record(now - timedelta(seconds=1)))
+
+        monitor.log_usage("gemini", "gemini-2.5-flash", "sec_summary", 10, 10)
+
+        assert monitor.get_daily_stats().total_requests == 3
+
+    def test_since_until_window(self, log_path):
+        now = datetime.now(timezone.utc).replace(second=30, microsecond=0)
+        with open(log_path, "w") as f:
+            f.write(_record(now - timedelta(hours=3)))
+            f.write(_record(now - timedelta(minutes=30)))
+            f.write(_record(now))
+
+        monitor = _monitor(log_path)
+        stats = monitor.get_stats(since=now - timedelta(hours=1), until=now)
+
+        assert stats.total_requests == 2
@@ -0,0 +1,148 @@
+"""Tests for the in-process metrics registry."""
+
+import io
+import random
+
+import pytest
+
+from catalyst_bot import health_endpoint
+from catalyst_bot.metrics_registry import MetricsRegistry
+from catalyst_bot.slash_commands import _format_runtime_metrics
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def registry(clock):
+    return MetricsRegistry(window_seconds=60, window_slots=6, clock=clock)
+
+
+def test_counter_totals_and_sliding_window(registry, clock):
+    requests = registry.counter("llm_requests_total")
+    requests.inc(provider="gemini")
+    requests.inc(2, provider="anthropic")
+
+    clock.now = 45
+    requests.inc(provider="gemini")
+    assert requests.window_total() == 4
+
+    # The first two slots have aged out of the 60s window
+    clock.now = 75
+    assert requests.total() == 4
+    assert requests.window_total() == 1
+    assert requests.window_total(provider="gemini") == 1
+    assert requests.window_total(provider="anthropic") == 0
+
+    with pytest.raises(ValueError):
+        requests.inc(-1)
+
+
+def test_histogram_percentiles_within_bucket_error(registry):
+    latency = registry.histogram("cycle_duration_seconds")
+    rng = random.Random(7)
+    values = sorted(rng.uniform(0.01, 30.0) for _ in range(5000))
+    for v in values:
+        latency.observe(v)
+
+    summary = latency.summary()
+
+    assert summary["count"] == 5000
+    assert summary["max"] == values[-1]
+    for q, key in ((0.5, "p50"), (0.95, "p95"), (0.99, "p99")):
+        exact = values[int(q * len(values)) - 1]
+        assert summary[key] == pytest.approx(exact, rel=0.04)
+
+
+def test_gauge_staleness(registry, monkeypatch):
+    gauge = registry.gauge("trading_open_positions")
+    assert gauge.get() is None
+
+    gauge.set(3)
+    assert gauge.get() == 3
+    monkeypatch.setattr("catalyst_bot.metrics_registry.time.time", lambda: 1e12)
+    assert gauge.get(max_age=60) is None
+    assert gauge.get(default=0, max_age=60) == 0
+
+
+def test_snapshot_is_published_not_recomputed(registry):
+    alerts = registry.counter("alerts_sent_total")
+    alerts.inc(2)
+    published = registry.publish()
+
+    alerts.inc(5)
+
+    assert registry.snapshot() is published
+    assert published["counters"]["alerts_sent_total"]["total"] == 2
+    assert registry.publish()["counters"]["alerts_sent_total"]["total"] == 7
+
+
+def test_metric_kind_conflict(registry):
+    registry.counter("cycles_total")
+    with pytest.raises(TypeError):
+        registry.gauge("cycles_total")
+
+
+def test_prometheus_exposition(registry):
+    registry.counter("discord_posts_total", "Discord webhook posts").inc(status=204)
+    registry.gauge("process_rss_mb").set(412.5)
+    hist = registry.histogram("market_provider_seconds")
+    for v in (0.02, 0.3, 4.0):
+        hist.observe(v, provider="tiingo")
+
+    text = registry.render_prometheus()
+
+    assert "# HELP discord_posts_total Discord webhook posts" in text
+    assert 'discord_posts_total{status="204"} 1' in text
+    assert "process_rss_mb 412.5" in text
+    assert 'market_provider_seconds_bucket{provider="tiingo",le="0.025"} 1' in text
+    assert 'market_provider_seconds_bucket{provider="tiingo",le="+Inf"} 3' in text
+    assert 'market_provider_seconds_count{provider="tiingo"} 3' in text
+
+
+def test_metrics_route_respects_feature_flag(registry, monkeypatch):
+    registry.counter("cycles_total").inc()
+    monkeypatch.setattr(health_endpoint, "get_registry", lambda: registry)
+
+    def get(path):
+        handler = health_endpoint.HealthCheckHandler.__new__(
+            health_endpoint.HealthCheckHandler
+        )
+        handler.path = path
+        handler.wfile = io.BytesIO()
+        handler.send_response = lambda code: setattr(handler, "code", code)
+        handler.send_header = lambda *a: None
+        handler.end_headers = lambda: None
+        handler.do_GET()
+        return handler.code, handler.wfile.getvalue().decode()
+
+    monkeypatch.setenv("FEATURE_METRICS_ENDPOINT", "0")
+    assert get("/metrics")[0] == 404
+
+    monkeypatch.setenv("FEATURE_METRICS_ENDPOINT", "1")
+    code, body = get("/metrics")
+    assert code == 200
+    assert "cycles_total 1" in body
+
+
+def test_admin_stats_runtime_summary(registry):
+    for v in (10.0, 20.0, 30.0):
+        registry.histogram("cycle_duration_seconds").observe(v)
+    registry.counter("alerts_sent_total").inc(4)
+
+    text = _format_runtime_metrics(registry.publish())
+
+    assert text.startswith("Cycles: 3 (p50 ")
+    assert "p95 30.0s" in text
+    assert "Alerts: 4 last hour, 4 total" in text
+    assert _format_runtime_metrics({}) == ""
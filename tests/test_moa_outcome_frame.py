@@ -0,0 +1,144 @@
+"""Tests for the columnar MOA outcome frame and the analyses built on it."""
+
+import json
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+
+from catalyst_bot import moa_historical_analyzer as moa
+from catalyst_bot.moa_outcome_frame import OutcomeFrame
+
+
+def _outcome(i, days_ago, ret, missed, keywords=("fda",), **extra):
+    ts = datetime.now(timezone.utc) - timedelta(days=days_ago, minutes=i)
+    outcome = {
+        "ticker": f"T{i}",
+        "rejection_ts": ts.isoformat(),
+        "rejection_reason": "LOW_SCORE" if i % 2 else "HIGH_PRICE",
+        "max_return_pct": ret,
+        "is_missed_opportunity": missed,
+        "outcomes": {"15m": {"return_pct": ret / 4}, "30m": {"return_pct": ret / 2}},
+        "cls": {"keywords": list(keywords)},
+        "sector_context": {"sector": "Tech", "sector_vs_spy": 1.0 if i % 3 else -1.0},
+        "rvol_category": "HIGH" if i % 2 else "LOW",
+        "market_regime": "BULL",
+        "market_vix": 15.0,
+        "sentiment_breakdown": {"vader": 0.8, "llm": None},
+        "source": "sec",
+    }
+    outcome.update(extra)
+    return outcome
+
+
+@pytest.fixture
+def outcomes():
+    recent = [_outcome(i, 3, 20.0 + i, True, ("FDA", "Approval")) for i in range(12)]
+    older = [_outcome(100 + i, 45, 4.0, False, ("offering",)) for i in range(12)]
+    return recent + older
+
+
+def test_frame_columns_and_exploded_keywords(outcomes):
+    frame = OutcomeFrame.from_records(outcomes)
+
+    assert len(frame) == 24
+    assert frame.df["max_return"].dtype == "float64"
+    assert frame.df["is_missed"].sum() == 12
+    assert str(frame.df["ts"].dt.tz) == "UTC"
+    kw = frame.keywords
+    assert len(kw) == 36
+    assert set(kw["keyword"]) == {"fda", "approval", "offering"}
+    assert frame.df["sent_llm"].isna().all()
+
+
+def test_windows_are_masks_over_one_frame(outcomes):
+    frame = OutcomeFrame.from_records(outcomes)
+    week = frame.select(frame.since(datetime.now(timezone.utc) - timedelta(days=7)))
+
+    assert len(week) == 12
+    assert set(week.keywords["keyword"]) == {"fda", "approval"}
+    rows = week.keyword_rows("ticker", "max_return")
+    assert rows["ticker"].iloc[0] == "T0" and rows["max_return"].iloc[0] == 20.0
+
+
+def test_rejected_items_supply_keywords_and_source(outcomes):
+    first = outcomes[0]
+    rejected = {
+        (first["ticker"], first["rejection_ts"]): {
+            "cls": {"keywords": ["merger"]},
+            "title": "Merger agreement",
+            "source": "businesswire",
+        }
+    }
+    frame = OutcomeFrame.from_records(outcomes, rejected)
+
+    row = frame.df.iloc[0]
+    assert row["keywords"] == ["merger"]
+    assert row["title"] == "Merger agreement"
+    assert row["source"] == "businesswire"
+
+
+def test_frame_and_list_inputs_agree(outcomes):
+    frame = OutcomeFrame.from_records(outcomes)
+    missed = moa.identify_missed_opportunities(outcomes)
+
+    assert moa.extract_keywords_from_missed_opps(
+        frame.select(frame.missed_mask(moa.SUCCESS_THRESHOLD_PCT))
+    ) == moa.extract_keywords_from_missed_opps(missed)
+    for analysis in (
+        moa.analyze_rejection_reasons,
+        moa.analyze_intraday_timing,
+        moa.identify_flash_catalysts,
+        moa.analyze_intraday_keyword_correlation,
+        moa.analyze_sector_performance,
+        moa.analyze_rvol_correlation,
+        moa.analyze_regime_performance,
+        moa.analyze_sector_timing_correlation,
+        moa.analyze_sentiment_sources,
+        moa.analyze_source_effectiveness,
+    ):
+        assert analysis(frame) == analysis(outcomes), analysis.__name__
+
+
+def test_grouped_analyses_match_hand_counts(outcomes):
+    stats = moa.extract_keywords_from_missed_opps(
+        moa.identify_missed_opportunities(outcomes)
+    )
+    assert stats["fda"]["occurrences"] == 12
+    assert stats["fda"]["success_rate"] == 1.0
+    assert stats["fda"]["avg_return"] == 25.5
+    assert len(stats["fda"]["examples"]) == 3
+
+    sectors = moa.analyze_sector_performance(outcomes)
+    assert sectors["Tech"]["total"] == 24
+    assert sectors["Tech"]["missed_opportunities"] == 12
+    assert sectors["Tech"]["hot_sector_rate"] == 0.667
+
+    sentiment = moa.analyze_sentiment_sources(outcomes)
+    assert list(sentiment["source_statistics"]) == ["vader"]
+    assert sentiment["source_statistics"]["vader"]["successful_outcomes"] == 12
+
+
+def test_run_analysis_parses_outcomes_once(tmp_path, outcomes):
+    moa_dir = tmp_path / "data" / "moa"
+    moa_dir.mkdir(parents=True)
+    with open(moa_dir / "outcomes.jsonl", "w", encoding="utf-8") as f:
+        for outcome in outcomes + outcomes[:2]:  # duplicates are dropped
+            f.write(json.dumps(outcome) + "\n")
+
+    with (
+        patch.object(moa, "_ensure_moa_dirs", return_value=(tmp_path, moa_dir)),
+        patch.object(moa, "load_outcomes", wraps=moa.load_outcomes) as load,
+    ):
+        result = moa.run_historical_moa_analysis(lookback_days=14)
+
+    assert load.call_count == 1
+    assert result["status"] == "success"
+    assert result["summary"]["total_outcomes"] == 12
+    report = json.loads((moa_dir / "analysis_report.json").read_text())
+    windows = report["multi_window_analysis"]["windows"]
+    assert windows["7d"]["total_outcomes"] == 12
+    assert windows["90d"]["total_outcomes"] == 24
+    assert windows["90d"]["keyword_stats"]["fda"]["occurrences"] == 12
+    assert report["top_missed_opportunities"][0]["ticker"] == "T11"
+    assert report["source_effectiveness"]["summary"]["best_source"] == "sec"
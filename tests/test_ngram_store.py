@@ -0,0 +1,189 @@
+"""Tests for the per-day n-gram count store and its MOA/logger integration."""
+
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from catalyst_bot import (
+    accepted_items_logger,
+    moa_analyzer,
+    ngram_store,
+    partitioned_jsonl,
+)
+from catalyst_bot.keyword_miner import (
+    count_ngrams,
+    filter_subsumed_phrases,
+    mine_discriminative_keywords,
+)
+from catalyst_bot.ngram_store import CLASS_ACCEPTED, NgramStore
+
+TODAY = datetime.now(timezone.utc)
+
+
+def _day(days_ago):
+    return (TODAY - timedelta(days=days_ago)).date()
+
+
+@pytest.fixture
+def store(tmp_path):
+    return NgramStore(tmp_path / "ngrams.db")
+
+
+def test_window_counts_sum_day_tables(store):
+    store.record_titles(
+        "pos", ["FDA Approval Granted", "FDA Approval Delayed"], _day(2)
+    )
+    store.record_title("pos", "FDA Approval Granted", _day(1))
+    store.record_title("pos", "", _day(1))
+    store.record_title("pos", "Merger Agreement", _day(40))
+
+    counts, titles = store.window_counts("pos", _day(7))
+    expected, expected_titles = count_ngrams(
+        ["FDA Approval Granted", "FDA Approval Delayed", "FDA Approval Granted"]
+    )
+    assert counts == dict(expected)
+    assert titles == expected_titles == 3
+
+    counts, titles = store.window_counts("pos", _day(7), until=_day(2), max_n=1)
+    assert counts == {"fda": 2, "approval": 2, "granted": 1, "delayed": 1}
+    assert titles == 2
+
+    counts, _ = store.window_counts("pos", _day(60), phrases=["merger", "fda", "nope"])
+    assert counts == {"merger": 1, "fda": 3}
+    assert store.window_counts("neg", _day(60)) == ({}, 0)
+
+
+def test_backfill_runs_once_and_replaces_early_records(store, tmp_path):
+    path = tmp_path / "accepted_items.jsonl"
+    lines = [
+        json.dumps({"ts": TODAY.isoformat(), "title": "Earnings Call Scheduled"}),
+        json.dumps({"ts": "not-a-date", "title": "Skipped Title"}),
+        "{bad json",
+        json.dumps(
+            {"ts": (TODAY - timedelta(days=3)).isoformat(), "title": "Earnings"}
+        ),
+    ]
+    path.write_text("\n".join(lines) + "\n")
+    # Logged before the first backfill; also present in the file
+    store.record_title(CLASS_ACCEPTED, "Earnings Call Scheduled", TODAY)
+
+    assert store.ensure_backfilled(CLASS_ACCEPTED, path) is True
+    assert store.ensure_backfilled(CLASS_ACCEPTED, path) is False
+    assert store.is_backfilled(CLASS_ACCEPTED)
+
+    counts, titles = store.window_counts(CLASS_ACCEPTED, _day(7))
+    assert titles == 2
+    assert counts["earnings"] == 2
+    assert "skipped" not in counts
+
+    assert store.prune(_day(1)) > 0
+    assert store.window_counts(CLASS_ACCEPTED, _day(7))[1] == 1
+
+
+def test_discovery_from_store_matches_jsonl_path(tmp_path, monkeypatch):
+    data = tmp_path / "data"
+    data.mkdir()
+    accepted = [
+        "Quarterly Earnings Conference Call",
+        "FDA Advisory Committee Meeting Scheduled",
+        "Company Reports Financial Results",
+    ]
+    with open(data / "accepted_items.jsonl", "w", encoding="utf-8") as f:
+        for i, title in enumerate(accepted * 3):
+            ts = TODAY - timedelta(days=i)
+            f.write(json.dumps({"ts": ts.isoformat(), "title": title}) + "\n")
+    missed = [
+        {"title": t}
+        for t in [
+            "FDA Approval Granted for New Drug",
+            "FDA Approval Received",
+            "FDA Fast Track Designation",
+            "Merger Agreement Signed",
+        ]
+    ]
+    monkeypatch.setattr(moa_analyzer, "_repo_root", lambda: tmp_path)
+    monkeypatch.delenv("NGRAM_STORE_PATH", raising=False)
+
+    monkeypatch.setenv("NGRAM_STORE_ENABLED", "0")
+    from_jsonl = moa_analyzer.discover_keywords_from_missed_opportunities(
+        missed, min_occurrences=2, min_lift=1.0
+    )
+    assert not (data / "ngram_stats.db").exists()
+
+    monkeypatch.setenv("NGRAM_STORE_ENABLED", "1")
+    from_store = moa_analyzer.discover_keywords_from_missed_opportunities(
+        missed, min_occurrences=2, min_lift=1.0
+    )
+    assert (data / "ngram_stats.db").exists()
+
+    assert from_store == from_jsonl
+    fda = next(d for d in from_store if d["keyword"] == "fda")
+    assert fda["negative_count"] == 3
+    assert {d["keyword"] for d in from_store} >= {"fda approval", "approval"}
+
+
+def test_accepted_logger_records_titles(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    db = tmp_path / "ngram_test.db"
+    monkeypatch.setenv("NGRAM_STORE_PATH", str(db))
+
+    accepted_items_logger.log_accepted_item(
+        {"ticker": "ABC", "title": "Phase 3 Trial Success"}, price=2.0
+    )
+    accepted_items_logger.log_accepted_item(
+        {"ticker": "ABC", "title": "Ignored Price"}, price=50.0
+    )
+    # Titles are buffered until the item logs flush
+    assert not db.exists()
+    partitioned_jsonl.flush_all()
+
+    counts, titles = ngram_store.get_ngram_store(db).window_counts(
+        CLASS_ACCEPTED, _day(1)
+    )
+    assert titles == 1
+    assert counts["trial success"] == 1
+
+
+def test_discovery_sees_live_counts_outside_repo_root(tmp_path, monkeypatch):
+    repo, cwd = tmp_path / "repo", tmp_path / "cwd"
+    cwd.mkdir()
+    monkeypatch.setattr(moa_analyzer, "_repo_root", lambda: repo)
+    monkeypatch.setattr(ngram_store, "_repo_root", lambda: repo)
+    monkeypatch.chdir(cwd)
+    monkeypatch.delenv("NGRAM_STORE_PATH", raising=False)
+    monkeypatch.setenv("NGRAM_STORE_ENABLED", "1")
+
+    # First discovery run backfills (nothing yet); later titles arrive live
+    assert moa_analyzer._accepted_window_counts(["trial success"])[1] == 0
+    ngram_store.record_logged_title(CLASS_ACCEPTED, "Phase 3 Trial Success")
+    partitioned_jsonl.flush_all()
+
+    counts, titles = moa_analyzer._accepted_window_counts(["trial success"])
+    assert titles == 1
+    assert counts == {"trial success": 1}
+    assert not (cwd / "data" / "ngram_stats.db").exists()
+
+
+def test_subsumption_is_token_aligned():
+    counts = {
+        "fda approval granted": 98,
+        "approval": 100,  # middle of the kept trigram
+        "app": 100,  # character substring only
+        "fda approval": 40,  # rarer than the trigram: not subsumed
+    }
+    filtered = filter_subsumed_phrases(counts, subsume_threshold=0.9)
+
+    assert filtered == {"fda approval granted": 98, "fda approval": 40, "app": 100}
+
+
+def test_mine_discriminative_keywords_uses_occurrence_counts():
+    scored = mine_discriminative_keywords(
+        ["FDA approval FDA", "FDA approval", "FDA"],
+        ["Earnings call", "FDA meeting"],
+        min_occurrences=2,
+        min_lift=1.0,
+    )
+    by_phrase = {phrase: (pos, neg) for phrase, _, pos, neg in scored}
+    assert by_phrase["fda"] == (4, 1)
+    assert by_phrase["fda approval"] == (2, 0)
@@ -0,0 +1,214 @@
+"""Tests for batched outcome tracking (one bar fetch per ticker, bulk writes)."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+from datetime import datetime, timezone
+
+import pandas as pd
+import pytest
+
+from catalyst_bot.bar_store import BarStore
+from catalyst_bot.feedback.outcome_scheduler import OutcomeScheduler, due_outcomes
+
+# Monday 2024-01-08 14:30 UTC (09:30 ET)
+ANCHOR = int(datetime(2024, 1, 8, 14, 30, tzinfo=timezone.utc).timestamp())
+HORIZONS = {"15m": 900, "1h": 3600}
+
+
+def _bars(start_ts: int, count: int, step: int = 300) -> pd.DataFrame:
+    """5m bars whose close is the number of minutes since ``start_ts``."""
+    index = pd.to_datetime(
+        [start_ts + i * step for i in range(count)], unit="s", utc=True
+    )
+    closes = [float(i * step // 60) for i in range(count)]
+    return pd.DataFrame(
+        {
+            "Open": closes,
+            "High": closes,
+            "Low": closes,
+            "Close": closes,
+            "Volume": [1000.0] * count,
+        },
+        index=index,
+    )
+
+
+class _Fetcher:
+    def __init__(self, frame):
+        self.frame = frame
+        self.calls = []
+
+    def __call__(self, ticker, start, end):
+        self.calls.append((ticker, start, end))
+        return self.frame[(self.frame.index >= start) & (self.frame.index < end)]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return BarStore(tmp_path / "bars")
+
+
+class TestDueOutcomes:
+    def test_only_elapsed_pending_horizons(self):
+        due = due_outcomes("a1", "abc", ANCHOR, HORIZONS, ["15m", "1h"], ANCHOR + 1000)
+        assert [(d.horizon, d.ticker) for d in due] == [("15m", "ABC")]
+        assert due[0].target_ts == ANCHOR + 900
+
+    def test_unknown_horizon_and_blank_ticker(self):
+        assert due_outcomes("a1", "ABC", ANCHOR, HORIZONS, ["7d"], ANCHOR + 10**6) == []
+        assert due_outcomes("a1", "", ANCHOR, HORIZONS, ["15m"], ANCHOR + 10**6) == []
+
+
+class TestResolve:
+    def test_one_fetch_per_ticker_and_price_at_target(self, store):
+        fetcher = _Fetcher(_bars(ANCHOR, 24))
+        quotes = []
+        scheduler = OutcomeScheduler(
+            bar_store=store,
+            bar_fetcher=fetcher,
+            quote_fetcher=lambda tickers: quotes.append(tickers) or {},
+        )
+        now = ANCHOR + 2 * 3600
+        due = due_outcomes("a1", "ABC", ANCHOR, HORIZONS, HORIZONS, now)
+        due += due_outcomes("a2", "ABC", ANCHOR + 300, HORIZONS, ["15m"], now)
+
+        resolved = {(r.due.key, r.due.horizon): r for r in scheduler.resolve(due, now)}
+
+        assert len(fetcher.calls) == 1
+        assert quotes == []
+        # Close of the last bar completed by the target, not the price at run time
+        assert resolved[("a1", "15m")].price == 10.0
+        assert resolved[("a1", "1h")].price == 55.0
+        assert resolved[("a2", "15m")].price == 15.0
+        assert resolved[("a1", "15m")].source == "bars"
+        assert resolved[("a1", "15m")].volume == 1000.0
+
+    def test_recent_target_falls_back_to_bulk_quote(self, store):
+        scheduler = OutcomeScheduler(
+            bar_store=store,
+            bar_fetcher=_Fetcher(_bars(ANCHOR, 0)),
+            quote_fetcher=lambda tickers: {t: (4.2, 1.0) for t in tickers},
+        )
+        now = ANCHOR + 1000
+        due = due_outcomes("a1", "ABC", ANCHOR, HORIZONS, ["15m"], now)
+        due += due_outcomes("b1", "XYZ", ANCHOR, HORIZONS, ["15m"], now)
+
+        resolved = scheduler.resolve(due, now)
+
+        assert {r.due.ticker for r in resolved} == {"ABC", "XYZ"}
+        assert all(r.source == "quote" and r.price == 4.2 for r in resolved)
+
+    def test_old_target_without_bars_stays_unresolved(self, store):
+        scheduler = OutcomeScheduler(
+            bar_store=store,
+            bar_fetcher=lambda *a: None,
+            quote_fetcher=lambda tickers: {t: (4.2, 1.0) for t in tickers},
+        )
+        now = ANCHOR + 86400
+        due = due_outcomes("a1", "ABC", ANCHOR, HORIZONS, ["15m"], now)
+        assert scheduler.resolve(due, now) == []
+        assert scheduler.stats["unresolved"] == 1
+
+
+class TestBatchPersistence:
+    def test_feedback_database_batch_update(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("FEEDBACK_DB_PATH", str(tmp_path / "perf.db"))
+        from catalyst_bot.feedback import database
+
+        database.init_database()
+        for alert_id in ("a1", "a2"):
+            database.record_alert(
+                alert_id=alert_id,
+                ticker="ABC",
+                source="test",
+                catalyst_type="test",
+                keywords=[],
+                posted_price=10.0,
+            )
+
+        updated = database.update_performance_batch(
+            [
+                {"alert_id": "a1", "timeframe": "15m", "price": 11.0},
+                {"alert_id": "a2", "timeframe": "1h", "price": 9.0},
+                {"alert_id": "a2", "timeframe": "2h", "price": 9.0},
+            ]
+        )
+
+        assert updated == 2
+        assert database.get_alert_performance("a1")["price_15m"] == 11.0
+        assert database.get_alert_performance("a2")["price_1h"] == 9.0
+
+    def test_moa_tracker_writes_outcomes_once(self, tmp_path, monkeypatch, store):
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "data").mkdir()
+        rejected_ts = datetime.fromtimestamp(ANCHOR, tz=timezone.utc).isoformat()
+        with open(tmp_path / "data" / "rejected_items.jsonl", "w") as f:
+            for ticker in ("ABC", "ABC", "XYZ"):
+                f.write(json.dumps({"ticker": ticker, "ts": rejected_ts, "price": 1.0}))
+                f.write("\n")
+
+        fetcher = _Fetcher(_bars(ANCHOR, 24))
+        monkeypatch.setattr(
+            "catalyst_bot.feedback.outcome_scheduler.get_bar_store", lambda: store
+        )
+        monkeypatch.setattr(
+            "catalyst_bot.feedback.outcome_scheduler._fetch_outcome_bars", fetcher
+        )
+        monkeypatch.setattr(
+            "catalyst_bot.feedback.outcome_scheduler._default_quotes",
+            lambda tickers: {},
+        )
+        from catalyst_bot import moa_price_tracker
+
+        class _Now(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return datetime.fromtimestamp(ANCHOR + 2 * 3600, tz=tz)
+
+        monkeypatch.setattr(moa_price_tracker, "datetime", _Now)
+
+        counts = moa_price_tracker.track_pending_outcomes()
+
+        assert counts["15m"] == 2 and counts["1h"] == 2
+        assert {call[0] for call in fetcher.calls} == {"ABC", "XYZ"}
+        lines = (tmp_path / "data" / "moa" / "outcomes.jsonl").read_text().splitlines()
+        records = {json.loads(line)["ticker"]: json.loads(line) for line in lines}
+        assert records["ABC"]["outcomes"]["15m"]["price"] == 10.0
+        assert records["ABC"]["outcomes"]["1h"]["return_pct"] == 5400.0
+
+    def test_breakout_feedback_batch_update(self, tmp_path, monkeypatch):
+        from catalyst_bot import breakout_feedback
+
+        db_path = str(tmp_path / "breakout.db")
+        monkeypatch.setattr(breakout_feedback, "DB_PATH", db_path)
+        conn = sqlite3.connect(db_path)
+        breakout_feedback.migrate_feedback_tables(conn)
+        conn.close()
+        breakout_feedback.register_alert_for_tracking(
+            alert_id="a1",
+            ticker="ABC",
+            entry_price=10.0,
+            entry_volume=None,
+            timestamp=datetime.fromtimestamp(ANCHOR, tz=timezone.utc),
+            keywords=["fda"],
+            confidence=0.9,
+        )
+
+        written = breakout_feedback.update_alert_outcomes_batch(
+            [
+                {"alert_id": "a1", "interval": "15m", "price": 11.0},
+                {"alert_id": "a1", "interval": "1h", "price": 9.0},
+                {"alert_id": "missing", "interval": "1h", "price": 9.0},
+            ]
+        )
+
+        assert written == 2
+        conn = sqlite3.connect(db_path)
+        row = conn.execute(
+            "SELECT outcome_15m, outcome_1h FROM alert_outcomes WHERE alert_id='a1'"
+        ).fetchone()
+        conn.close()
+        assert json.loads(row[0])["breakout_confirmed"] is True
+        assert json.loads(row[1])["price_change_pct"] == pytest.approx(-10.0)
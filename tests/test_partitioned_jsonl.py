@@ -0,0 +1,118 @@
+"""Tests for buffered, day-partitioned JSONL item logs."""
+
+from __future__ import annotations
+
+import json
+from datetime import date, datetime, timezone
+
+from catalyst_bot.partitioned_jsonl import (
+    PartitionedJsonlLog,
+    day_files,
+    has_records,
+    iter_lines,
+)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _rec(day: str, ticker: str, reason: str = "LOW_SCORE") -> dict:
+    return {"ts": f"{day}T12:00:00+00:00", "ticker": ticker, "rejection_reason": reason}
+
+
+def _log(tmp_path, **kw) -> PartitionedJsonlLog:
+    kw.setdefault("flush_records", 100)
+    kw.setdefault("flush_seconds", 30)
+    return PartitionedJsonlLog(
+        tmp_path / "rejected_items.jsonl", summary_fields=("rejection_reason",), **kw
+    )
+
+
+def test_buffers_until_flush_and_partitions_by_day(tmp_path):
+    item_log = _log(tmp_path)
+    item_log.append(_rec("2026-01-05", "A"))
+    item_log.append(_rec("2026-01-06", "B"))
+    item_log.append(_rec("2026-01-06", "C", "HIGH_PRICE"))
+
+    assert item_log.pending() == 3
+    assert not has_records(tmp_path / "rejected_items.jsonl")
+
+    assert item_log.flush() == 3
+    files = day_files(tmp_path / "rejected_items")
+    assert [f.name for f in files] == ["2026-01-05.jsonl", "2026-01-06.jsonl"]
+    assert item_log.read_summary("2026-01-06") == {
+        "count": 2,
+        "rejection_reason": {"HIGH_PRICE": 1, "LOW_SCORE": 1},
+    }
+
+
+def test_flushes_on_record_count_and_age(tmp_path):
+    clock = Clock()
+    item_log = _log(tmp_path, flush_records=2, clock=clock)
+    item_log.append(_rec("2026-01-06", "A"))
+    assert item_log.pending() == 1
+    item_log.append(_rec("2026-01-06", "B"))
+    assert item_log.pending() == 0
+
+    item_log.append(_rec("2026-01-06", "C"))
+    clock.now += 31
+    item_log.append(_rec("2026-01-06", "D"))
+    assert item_log.pending() == 0
+    assert item_log.read_summary("2026-01-06")["count"] == 4
+
+
+def test_rotates_parts_past_size_cap(tmp_path):
+    item_log = _log(tmp_path, part_max_bytes=1)
+    for ticker in ("A", "B", "C"):
+        item_log.append(_rec("2026-01-06", ticker))
+        item_log.flush()
+
+    names = [f.name for f in day_files(tmp_path / "rejected_items")]
+    assert names == ["2026-01-06.jsonl", "2026-01-06.1.jsonl", "2026-01-06.2.jsonl"]
+    tickers = [json.loads(line)["ticker"] for line in iter_lines(item_log.legacy_path)]
+    assert tickers == ["A", "B", "C"]
+
+
+def test_iter_lines_reads_legacy_then_partitions(tmp_path):
+    legacy = tmp_path / "rejected_items.jsonl"
+    legacy.write_text(json.dumps(_rec("2025-12-01", "OLD")) + "\n", encoding="utf-8")
+    item_log = _log(tmp_path)
+    item_log.append(_rec("2026-01-05", "A"))
+    item_log.append(_rec("2026-01-06", "B"))
+
+    # Reading flushes this process's buffered records first
+    assert [json.loads(x)["ticker"] for x in iter_lines(legacy)] == ["OLD", "A", "B"]
+    since = datetime(2026, 1, 6, tzinfo=timezone.utc)
+    assert [json.loads(x)["ticker"] for x in iter_lines(legacy, since=since)] == [
+        "OLD",
+        "B",
+    ]
+
+
+def test_day_summary_merges_legacy_flushed_and_pending(tmp_path):
+    legacy = tmp_path / "rejected_items.jsonl"
+    legacy.write_text(json.dumps(_rec("2026-01-06", "OLD")) + "\n", encoding="utf-8")
+    item_log = _log(tmp_path)
+    item_log.append(_rec("2026-01-06", "A", "HIGH_PRICE"))
+    item_log.flush()
+    item_log.append(_rec("2026-01-06", "B"))
+
+    summary = item_log.day_summary("2026-01-06")
+    assert summary["count"] == 3
+    assert summary["rejection_reason"] == {"LOW_SCORE": 2, "HIGH_PRICE": 1}
+
+
+def test_drop_days_before_deletes_whole_days(tmp_path):
+    item_log = _log(tmp_path)
+    for day in ("2026-01-04", "2026-01-05", "2026-01-06"):
+        item_log.append(_rec(day, "A"))
+        item_log.append(_rec(day, "B"))
+
+    assert item_log.drop_days_before(date(2026, 1, 6)) == 4
+    remaining = sorted(p.name for p in (tmp_path / "rejected_items").iterdir())
+    assert remaining == ["2026-01-06.jsonl", "2026-01-06.summary.json"]
@@ -0,0 +1,183 @@
+"""Tests for the vectorized whole-panel chart pattern scanner."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.signal import find_peaks
+
+from catalyst_bot import charts, market
+from catalyst_bot.indicators import cache as indicator_cache
+from catalyst_bot.indicators import patterns as patterns_module
+from catalyst_bot.indicators.pattern_scanner import (
+    build_panel,
+    fit_trendlines,
+    reuse_patterns,
+    rolling_trendlines,
+    scan_panel,
+    scan_patterns,
+    swing_points,
+)
+from catalyst_bot.indicators.patterns import detect_all_patterns
+
+
+@pytest.fixture(autouse=True)
+def _fresh_indicator_cache(monkeypatch):
+    monkeypatch.setattr(indicator_cache, "_global_cache", None)
+
+
+def _frames(count=120, seed=3):
+    rng = np.random.default_rng(seed)
+    frames = {}
+    for t in range(count):
+        n = int(rng.integers(15, 80))
+        i = np.arange(n)
+        if t % 3 == 0:
+            close = 100 + np.cumsum(rng.normal(0, 1, n))
+        elif t % 3 == 1:
+            close = 100 + 3 * np.sin(i / 2.0) + rng.normal(0, 0.3, n) + 0.05 * i
+        else:
+            close = 50 + 5 * np.sin(i / 1.5) * (1 - i / n) + rng.normal(0, 0.1, n)
+        frames[f"T{t}"] = {
+            "close": close,
+            "high": close + np.abs(rng.normal(0, 0.5, n)),
+            "low": close - np.abs(rng.normal(0, 0.5, n)),
+            "volume": rng.uniform(1e5, 2e5, n),
+        }
+    return frames
+
+
+def _key(pattern):
+    return (
+        pattern["type"],
+        pattern["start_idx"],
+        pattern["end_idx"],
+        pattern["description"],
+    )
+
+
+def test_swing_points_match_find_peaks():
+    rng = np.random.default_rng(0)
+    panel = 100 + np.cumsum(rng.normal(0, 1, (50, 40)), axis=1)
+
+    for distance, prominence in ((3, None), (3, 0.5), (5, 0.5)):
+        mask = swing_points(panel, distance, prominence)
+        for row, values in zip(mask, panel):
+            expected, _ = find_peaks(values, distance=distance, prominence=prominence)
+            assert np.flatnonzero(row).tolist() == expected.tolist()
+
+
+def test_fit_trendlines_match_polyfit():
+    rng = np.random.default_rng(1)
+    values = rng.normal(100, 2, (20, 30))
+    mask = swing_points(values, 3)
+
+    slope, intercept, count = fit_trendlines(values, mask)
+    for r in range(len(values)):
+        y = values[r][mask[r]]
+        expected = np.polyfit(np.arange(len(y)), y, 1)
+        assert count[r] == len(y)
+        assert slope[r] == pytest.approx(expected[0])
+        assert intercept[r] == pytest.approx(expected[1])
+
+    rolled = rolling_trendlines(values, window=10)[0]
+    assert rolled.shape == (20, 21)
+    last = fit_trendlines(values[:, -10:], swing_points(values[:, -10:], 3))[0]
+    np.testing.assert_allclose(rolled[:, -1], last)
+
+
+def test_scan_matches_per_ticker_detection():
+    frames = _frames()
+    results = scan_patterns(frames)
+
+    assert sum(len(v) for v in results.values()) > 50
+    for ticker, bars in frames.items():
+        expected = detect_all_patterns(
+            list(bars["close"]),
+            list(bars["high"]),
+            list(bars["low"]),
+            list(bars["volume"]),
+        )
+        assert [_key(p) for p in results[ticker]] == [_key(p) for p in expected]
+        for got, want in zip(results[ticker], expected):
+            assert got["confidence"] == pytest.approx(want["confidence"])
+
+
+def test_short_and_ragged_rows_use_own_indices():
+    frames = _frames(count=3)
+    frames["SHORT"] = {"close": [1.0, 2.0, 1.5]}
+    panel = build_panel(frames)
+
+    assert panel.lengths.tolist() == [len(f["close"]) for f in frames.values()]
+    results = scan_panel(panel, remember=False)
+    assert results["SHORT"] == []
+    for ticker, patterns in results.items():
+        for p in patterns:
+            assert 0 <= p["start_idx"] <= p["end_idx"] < len(frames[ticker]["close"])
+
+
+def test_kinds_and_dataframe_input():
+    frames = _frames(count=30)
+    dfs = {
+        t: pd.DataFrame({k.title(): v for k, v in bars.items()})
+        for t, bars in frames.items()
+    }
+    results = scan_patterns(dfs, kinds=["double_tops"])
+    types = {p["type"] for patterns in results.values() for p in patterns}
+    assert types and types <= {"double_top", "double_bottom"}
+
+    with pytest.raises(ValueError):
+        scan_patterns(dfs, kinds=["wedges"])
+
+
+def test_chart_reuse_shifts_indices_and_checks_bars():
+    frames = _frames()
+    results = scan_patterns(frames)
+    ticker = next(t for t, v in results.items() if len(frames[t]["close"]) >= 30 and v)
+    bars = frames[ticker]
+    close = list(bars["close"])
+
+    same = reuse_patterns(ticker, close, bars["high"], bars["low"])
+    assert [_key(p) for p in same] == [_key(p) for p in results[ticker]]
+
+    # A chart with five more bars of history sees the same trailing window
+    longer = [1.0] * 5 + close
+    highs = [1.0] * 5 + list(bars["high"])
+    lows = [1.0] * 5 + list(bars["low"])
+    shifted = reuse_patterns(ticker, longer, highs, lows)
+    assert [p["start_idx"] for p in shifted] == [
+        p["start_idx"] + 5 for p in results[ticker]
+    ]
+
+    # Different latest bar, stricter scan or unknown ticker -> detect afresh
+    assert reuse_patterns(ticker, close[:-1] + [close[-1] + 1]) is None
+    assert reuse_patterns(ticker, close, min_confidence=0.5) is None
+    assert reuse_patterns("NOPE", close) is None
+
+
+def test_cycle_prescan_feeds_the_chart_overlays(monkeypatch):
+    frames = _frames(count=30)
+    index = pd.date_range("2026-01-06 09:30", periods=80, freq="5min")
+    dfs = {
+        t: pd.DataFrame(
+            {k.title(): v for k, v in bars.items()}, index=index[: len(bars["close"])]
+        )
+        for t, bars in frames.items()
+    }
+    monkeypatch.setattr(market, "get_intraday", lambda sym, **kw: dfs.get(sym))
+    monkeypatch.delenv("CHART_DEFAULT_INDICATORS", raising=False)
+
+    # Pattern overlays are off by default, so the cycle fetches nothing
+    assert charts.pattern_overlay_kinds() == ()
+    assert charts.prescan_chart_patterns(dfs) == 0
+    assert charts.prescan_chart_patterns(dfs, indicators=["patterns"]) == len(dfs)
+
+    results = scan_panel(build_panel(frames), kinds=["head_shoulders"], remember=False)
+    ticker = next(t for t, found in results.items() if found)
+    detect = MagicMock(return_value=[])
+    monkeypatch.setattr(patterns_module, "detect_head_shoulders", detect)
+    charts.add_hs_patterns(MagicMock(), dfs[ticker], ticker)
+    detect.assert_not_called()
@@ -0,0 +1,176 @@
+"""Tests for the streaming quote cache and its local replay server."""
+
+import json
+import time
+
+import pytest
+
+from catalyst_bot import market, quote_stream
+from catalyst_bot.quote_stream import (
+    AlpacaProtocol,
+    FinnhubProtocol,
+    QuoteReplayServer,
+    QuoteStream,
+    QuoteTable,
+    TickerSet,
+)
+
+pytest.importorskip("websockets")
+
+
+def _trade(symbol, price, second):
+    return {
+        "T": "t",
+        "S": symbol,
+        "p": price,
+        "s": 100,
+        "t": f"2026-01-05T15:30:{second:02d}.123456789Z",
+    }
+
+
+TICKS = [
+    _trade("AAA", 1.10, 0),
+    {"T": "q", "S": "AAA", "bp": 1.09, "ap": 1.11, "t": "2026-01-05T15:30:01Z"},
+    _trade("CCC", 9.00, 1),
+    _trade("BBB", 2.50, 2),
+    _trade("AAA", 1.25, 3),
+]
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+@pytest.fixture
+def live_stream(monkeypatch):
+    """Install a connected stream with a hand-filled table as the global."""
+    stream = QuoteStream(
+        AlpacaProtocol(url="ws://unused"), prev_close_fn=lambda t: None
+    )
+    stream.connected = True
+    monkeypatch.setattr(quote_stream, "_stream", stream)
+    return stream
+
+
+def test_replay_server_feeds_subscribed_tickers(tmp_path):
+    recorded = tmp_path / "ticks.jsonl"
+    server = QuoteReplayServer(TICKS).start()
+    stream = QuoteStream(
+        AlpacaProtocol(url=server.url),
+        prev_close_fn=lambda ticker: 1.0,
+        record_path=str(recorded),
+    )
+    stream.tickers.set_source(quote_stream.SOURCE_WATCHLIST, ["aaa"])
+    stream.tickers.touch_news(["BBB"])
+    stream.start()
+    try:
+        assert _wait_for(
+            lambda: stream.snapshot("AAA") == (1.25, 1.0)
+            and stream.snapshot("BBB") == (2.5, 1.0)
+        )
+    finally:
+        stream.stop()
+        server.stop()
+
+    assert stream.subscribed == ["AAA", "BBB"]
+    assert stream.table.get("CCC") is None
+    assert stream.table.get("AAA").bid == 1.09
+    lines = [json.loads(line) for line in recorded.read_text().splitlines()]
+    assert [(t["S"], t["T"]) for t in lines] == [
+        ("AAA", "t"),
+        ("AAA", "q"),
+        ("BBB", "t"),
+        ("AAA", "t"),
+    ]
+    assert not stream.connected
+    assert stream.snapshot("AAA") is None
+
+
+def test_ticker_set_priority_cap_and_news_expiry():
+    tickers = TickerSet(news_ttl=0.05)
+    tickers.touch_news(["NEWS1", "WATCH"])
+    tickers.set_source(quote_stream.SOURCE_WATCHLIST, ["WATCH", "W2"])
+    tickers.set_source(quote_stream.SOURCE_POSITIONS, ["POS"])
+    tickers.touch_news(["NEWS2"])
+
+    assert tickers.desired(10) == ["POS", "W2", "WATCH", "NEWS2", "NEWS1"]
+    assert tickers.desired(3) == ["POS", "W2", "WATCH"]
+    time.sleep(0.06)
+    assert tickers.desired(10) == ["POS", "W2", "WATCH"]
+
+
+def test_table_staleness_and_prev_close():
+    table = QuoteTable(max_age=0.05)
+    table.update_trade("AAA", 3.0)
+    assert table.snapshot("AAA") == (3.0, None)
+    table.set_prev_close("AAA", 2.0)
+    assert table.snapshot("AAA") == (3.0, 2.0)
+    time.sleep(0.06)
+    assert table.snapshot("AAA") is None
+
+
+def test_finnhub_trades_parse_to_alpaca_shape():
+    raw = json.dumps(
+        {"type": "trade", "data": [{"s": "AAA", "p": 1.5, "v": 10, "t": 1767627000000}]}
+    )
+    protocol = FinnhubProtocol("token")
+
+    (tick,) = protocol.parse(raw)
+    assert tick["T"] == "t" and tick["S"] == "AAA" and tick["p"] == 1.5
+    assert tick["t"].startswith("2026-01-05T15:30:00")
+    assert protocol.parse(json.dumps({"type": "ping"})) == []
+    assert json.loads(protocol.subscribe(["AAA"])[0]) == {
+        "type": "subscribe",
+        "symbol": "AAA",
+    }
+
+
+def test_price_lookups_use_stream_before_rest(live_stream, monkeypatch):
+    live_stream.table.update_trade("AAA", 2.2)
+    live_stream.table.set_prev_close("AAA", 2.0)
+    live_stream.table.update_trade("BBB", 5.0)  # no previous close yet
+
+    rest_calls = []
+    monkeypatch.setattr(market, "yf", None)
+    monkeypatch.setattr(market, "_AV_KEY", "")
+    monkeypatch.setattr(market, "get_settings", lambda: None)
+    monkeypatch.setattr(
+        market,
+        "batch_get_prices",
+        _recording(market.batch_get_prices, rest_calls),
+    )
+
+    assert market.get_last_price_snapshot("aaa") == (2.2, 2.0)
+    # Missing previous close: REST runs, the streamed last still wins
+    assert market.get_last_price_snapshot("BBB") == (5.0, None)
+
+    prices = market.batch_get_prices(["AAA", "ZZZ"])
+    assert prices["AAA"][0] == 2.2
+    assert prices["AAA"][1] == pytest.approx(10.0)
+    assert prices["ZZZ"] == (None, None)
+    assert rest_calls == [["AAA", "ZZZ"], ["ZZZ"]]
+
+
+def test_rest_previous_close_seeds_the_table(live_stream, monkeypatch):
+    live_stream.table.update_trade("AAA", 4.0)
+    monkeypatch.setattr(market, "get_settings", lambda: None)
+    monkeypatch.setattr(market, "_AV_KEY", "key")
+    monkeypatch.setattr(market, "_SKIP_ALPHA", False)
+    monkeypatch.setattr(market, "_alpha_last_prev_cached", lambda t, k: (3.9, 3.5))
+    monkeypatch.setattr(market, "yf", None)
+
+    assert market.get_last_price_snapshot("AAA", retries=0) == (4.0, 3.5)
+    assert live_stream.table.prev_close("AAA") == 3.5
+
+
+def _recording(fn, calls):
+    def wrapper(tickers):
+        calls.append(list(tickers))
+        return fn(tickers)
+
+    return wrapper
@@ -0,0 +1,153 @@
+"""Tests for the ticker-partitioned, append-only SEC RAG index."""
+
+import pickle
+import re
+import zlib
+from types import SimpleNamespace
+
+import pytest
+
+np = pytest.importorskip("numpy")
+faiss = pytest.importorskip("faiss")
+
+from catalyst_bot.rag_system import SECFilingRAG  # noqa: E402
+
+
+class HashEncoder:
+    """Bag-of-words stand-in for sentence-transformers."""
+
+    dim = 64
+
+    def __init__(self):
+        self.calls = 0
+
+    def get_sentence_embedding_dimension(self):
+        return self.dim
+
+    def encode(self, texts, batch_size=32, normalize_embeddings=True):
+        self.calls += 1
+        vectors = np.zeros((len(texts), self.dim), dtype="float32")
+        for row, text in enumerate(texts):
+            for word in re.findall(r"[a-z0-9]+", text.lower()):
+                vectors[row, zlib.crc32(word.encode()) % self.dim] += 1.0
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+
+def _filing(ticker, text, url=None):
+    return SimpleNamespace(
+        ticker=ticker,
+        filing_type="8-K",
+        filing_url=url or f"https://sec.gov/{ticker}/{zlib.crc32(text.encode())}",
+        text=text,
+        catalyst_type="other",
+    )
+
+
+@pytest.fixture
+def encoder():
+    return HashEncoder()
+
+
+@pytest.fixture
+def rag(tmp_path, encoder):
+    return SECFilingRAG(index_path=str(tmp_path / "rag"), encoder=encoder)
+
+
+def test_rare_ticker_found_despite_closer_matches(rag):
+    for i in range(30):
+        rag.index_filing(_filing(f"BIG{i}", f"revenue guidance raised quarter {i}"))
+    rag.index_filing(_filing("RARE", "board approved a share repurchase program"))
+
+    results = rag.search("revenue guidance raised", ticker="RARE", top_k=3)
+
+    assert [r.chunk.ticker for r in results] == ["RARE"]
+    assert results[0].rank == 1
+    assert rag.search("revenue guidance", ticker="NONE") == []
+
+
+def test_global_search_resolves_ids(rag):
+    rag.index_filing(_filing("AAA", "fda approval for lead drug candidate"))
+    rag.index_filing(_filing("BBB", "registered direct offering priced at discount"))
+
+    results = rag.search("priced registered direct offering", top_k=2)
+
+    assert results[0].chunk.ticker == "BBB"
+    assert [r.rank for r in results] == [1, 2]
+
+
+def test_batched_indexing_and_dedupe(rag, encoder):
+    filings = [
+        (_filing("AAA", "merger agreement signed"), "summary", ["merger"]),
+        (_filing("BBB", "going concern doubt disclosed"), "", None),
+    ]
+
+    assert rag.index_filings(filings) == 2
+    assert encoder.calls == 1
+    assert rag.index_filings(filings) == 0
+    assert rag.get_stats()["total_vectors"] == 2
+
+
+def test_store_is_append_only_and_reloads(rag, encoder):
+    rag.index_filing(_filing("AAA", "merger agreement signed"))
+    first = (rag.index_path / "chunks.jsonl").read_bytes()
+    rag.index_filing(_filing("BBB", "going concern doubt disclosed"))
+
+    after = (rag.index_path / "chunks.jsonl").read_bytes()
+    assert after.startswith(first)
+    assert len(after.splitlines()) == 2
+    assert (rag.index_path / "vectors.f32").stat().st_size == 2 * HashEncoder.dim * 4
+
+    reloaded = SECFilingRAG(index_path=str(rag.index_path), encoder=encoder)
+    assert reloaded.search("going concern", ticker="BBB")[0].chunk.text == (
+        "going concern doubt disclosed"
+    )
+    assert reloaded.get_stats()["total_chunks"] == 2
+
+
+def test_torn_append_is_truncated(rag, encoder):
+    rag.index_filing(_filing("AAA", "merger agreement signed"))
+    with open(rag.index_path / "vectors.f32", "ab") as f:
+        f.write(np.ones(HashEncoder.dim, dtype="float32").tobytes())
+
+    reloaded = SECFilingRAG(index_path=str(rag.index_path), encoder=encoder)
+
+    assert reloaded.get_stats()["total_vectors"] == 1
+    assert (rag.index_path / "vectors.f32").stat().st_size == HashEncoder.dim * 4
+
+
+def test_migrates_legacy_pickle_store(tmp_path, encoder):
+    source = SECFilingRAG(index_path=str(tmp_path / "new"), encoder=encoder)
+    source.index_filing(_filing("AAA", "merger agreement signed"))
+    source.index_filing(_filing("BBB", "going concern doubt disclosed"))
+
+    legacy_dir = tmp_path / "legacy"
+    legacy_dir.mkdir()
+    legacy_index = faiss.IndexFlatIP(HashEncoder.dim)
+    legacy_index.add(source._vectors.copy())
+    faiss.write_index(legacy_index, str(legacy_dir / "faiss.index"))
+    legacy_chunks = {c.chunk_id: c for c in source._chunk_table}
+    with open(legacy_dir / "chunks.pkl", "wb") as f:
+        pickle.dump(legacy_chunks, f)
+
+    migrated = SECFilingRAG(index_path=str(legacy_dir), encoder=encoder)
+
+    assert (legacy_dir / "chunks.jsonl").exists()
+    assert migrated.search("going concern", ticker="BBB")[0].chunk.ticker == "BBB"
+    assert migrated.get_stats()["total_chunks"] == 2
+
+
+@pytest.mark.parametrize("index_type", ["hnsw", "ivf"])
+def test_switches_to_ann_index(tmp_path, encoder, monkeypatch, index_type):
+    monkeypatch.setenv("RAG_ANN_MIN_VECTORS", "20")
+    monkeypatch.setenv("RAG_IVF_NPROBE", "64")
+    rag = SECFilingRAG(
+        index_path=str(tmp_path / "rag"), encoder=encoder, index_type=index_type
+    )
+    for i in range(25):
+        rag.index_filing(_filing(f"T{i}", f"unique topic word{i} filing"))
+
+    assert rag.get_stats()["index_type"] == index_type
+    results = rag.search("unique topic word7 filing", top_k=1)
+    assert results[0].chunk.ticker == "T7"
@@ -17,6 +17,7 @@ from pathlib import Path
 
 import pytest
 
+from catalyst_bot.partitioned_jsonl import day_files, flush_all, partition_dir
 from catalyst_bot.rejected_items_logger import (
     clear_old_rejected_items,
     get_rejection_stats,
@@ -25,6 +26,14 @@ from catalyst_bot.rejected_items_logger import (
 )
 
 
+def _flushed(log_path):
+    """Flush buffered records and return the day partition they landed in."""
+    flush_all()
+    files = day_files(partition_dir(log_path))
+    assert len(files) == 1
+    return files[0]
+
+
 @pytest.fixture
 def temp_data_dir(tmp_path):
     """Create temporary data directory."""
@@ -69,8 +78,8 @@ class TestSentimentBreakdownLogging:
         )
 
         # Read logged item
-        assert log_path.exists()
-        with open(log_path, "r") as f:
+        assert _flushed(log_path).exists()
+        with open(_flushed(log_path), "r") as f:
             logged = json.loads(f.readline())
 
         # Verify sentiment breakdown is included
@@ -107,7 +116,7 @@ class TestSentimentBreakdownLogging:
             sentiment=0.725,
         )
 
-        with open(log_path, "r") as f:
+        with open(_flushed(log_path), "r") as f:
             logged = json.loads(f.readline())
 
         assert "sentiment_confidence" in logged["cls"]
@@ -144,7 +153,7 @@ class TestSentimentBreakdownLogging:
             sentiment=0.73,
         )
 
-        with open(log_path, "r") as f:
+        with open(_flushed(log_path), "r") as f:
             logged = json.loads(f.readline())
 
         # Should list only sources with non-None values
@@ -186,7 +195,7 @@ class TestSentimentBreakdownLogging:
             sentiment=0.65,
         )
 
-        with open(log_path, "r") as f:
+        with open(_flushed(log_path), "r") as f:
             logged = json.loads(f.readline())
 
         assert logged["cls"]["sentiment_breakdown"]["vader"] == 0.65
@@ -224,7 +233,7 @@ class TestSentimentBreakdownLogging:
             sentiment=0.725,
         )
 
-        with open(log_path, "r") as f:
+        with open(_flushed(log_path), "r") as f:
             logged = json.loads(f.readline())
 
         assert logged["cls"]["sentiment_breakdown"]["vader"] == 0.70
@@ -251,7 +260,7 @@ class TestSentimentBreakdownLogging:
             keywords=["test", "keyword"],
         )
 
-        with open(log_path, "r") as f:
+        with open(_flushed(log_path), "r") as f:
             logged = json.loads(f.readline())
 
         # Should still work with basic sentiment
@@ -286,7 +295,7 @@ class TestSentimentBreakdownLogging:
             sentiment=0.70,
         )
 
-        with open(log_path, "r") as f:
+        with open(_flushed(log_path), "r") as f:
             logged = json.loads(f.readline())
 
         # Should work without breakdown
@@ -324,7 +333,7 @@ class TestSentimentBreakdownLogging:
             sentiment=0.775,
         )
 
-        with open(log_path, "r") as f:
+        with open(_flushed(log_path), "r") as f:
             logged = json.loads(f.readline())
 
         breakdown = logged["cls"]["sentiment_breakdown"]
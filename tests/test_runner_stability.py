@@ -183,9 +183,11 @@ class TestCycleIntegration:
 
     def test_price_cache_global_variable_exists(self):
         """Test that price cache global variable is accessible."""
+        from collections.abc import MutableMapping
+
         from catalyst_bot.runner import _PX_CACHE
 
-        assert isinstance(_PX_CACHE, dict), "_PX_CACHE should be a dictionary"
+        assert isinstance(_PX_CACHE, MutableMapping), "_PX_CACHE should be a mapping"
 
     def test_consecutive_empty_cycles_global_exists(self):
         """Test that consecutive empty cycles global variable exists."""
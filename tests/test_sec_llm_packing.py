@@ -0,0 +1,223 @@
+"""Tests for packed multi-filing SEC keyword extraction."""
+
+import asyncio
+import json
+import re
+
+import pytest
+
+from catalyst_bot.llm_batch import group_items_by_token_budget
+from catalyst_bot.sec_llm_analyzer import batch_extract_keywords_from_documents
+from catalyst_bot.sec_llm_packing import (
+    AdaptiveConcurrencyLimiter,
+    PackedDocument,
+    extract_keywords_packed,
+    parse_packed_response,
+)
+
+
+def _filing(i, text=None):
+    return {
+        "item_id": f"item_{i}",
+        "document_text": text or f"Company {i} announces a partnership agreement.",
+        "title": f"8-K {i}",
+        "filing_type": "8-K",
+    }
+
+
+def _doc(doc_id):
+    return PackedDocument(doc_id, f"item_{doc_id}", "", "8-K", "text", "text", 1)
+
+
+def _result(doc_id, **overrides):
+    result = {
+        "doc_id": doc_id,
+        "keywords": ["partnership"],
+        "sentiment": 0.4,
+        "confidence": 0.7,
+        "summary": f"summary {doc_id}",
+        "material": True,
+    }
+    result.update(overrides)
+    return result
+
+
+class StubProvider:
+    """Packed-prompt responder; ``bad`` doc_ids get an invalid result."""
+
+    def __init__(self, bad=(), garbage=False):
+        self.bad = set(bad)
+        self.garbage = garbage
+        self.prompts = []
+
+    async def __call__(self, prompt, **kwargs):
+        self.prompts.append(prompt)
+        if self.garbage:
+            return "I cannot help with that."
+        doc_ids = re.findall(r"=== doc_id: (\w+) ===", prompt)
+        return json.dumps(
+            {
+                "results": [
+                    _result(d, sentiment="very") if d in self.bad else _result(d)
+                    for d in doc_ids
+                ]
+            }
+        )
+
+
+class SingleExtractor:
+    def __init__(self):
+        self.calls = []
+
+    async def __call__(self, document_text, title, filing_type):
+        self.calls.append(title)
+        return {"keywords": ["single"], "sentiment": 0.1}
+
+
+class FakeTracker:
+    def __init__(self, usage_pct, in_backoff=False):
+        self.stats = {
+            "minute_usage_pct": usage_pct,
+            "hour_usage_pct": 0.0,
+            "in_backoff": in_backoff,
+        }
+
+    def get_stats(self):
+        return self.stats
+
+
+def test_group_items_by_token_budget():
+    items = [{"tokens": t} for t in (700, 300, 600, 200, 900, 1500)]
+
+    batches = group_items_by_token_budget(items, token_budget=1000, max_items=2)
+
+    assert [[i["tokens"] for i in b] for b in batches] == [
+        [1500],
+        [900],
+        [700, 300],
+        [600, 200],
+    ]
+
+
+def test_parse_packed_response_drops_invalid_results():
+    pack = [_doc("D1"), _doc("D2"), _doc("D3"), _doc("D4")]
+    response = "Here you go:\n" + json.dumps(
+        {
+            "results": [
+                _result("D1"),
+                _result("D2", keywords="partnership"),
+                _result("D3"),
+                _result("D3"),
+                _result("D4", sentiment=3),
+                _result("D9"),
+            ]
+        }
+    )
+
+    assert set(parse_packed_response(response, pack)) == {"D1"}
+    assert parse_packed_response("not json", pack) == {}
+    assert parse_packed_response(None, pack) == {}
+
+
+class TestExtractKeywordsPacked:
+    def _run(self, filings, provider, single):
+        limiter = AdaptiveConcurrencyLimiter(max_limit=4, tracker_getter=lambda: None)
+        return asyncio.run(
+            extract_keywords_packed(
+                filings, query_fn=provider, single_fn=single, limiter=limiter
+            )
+        )
+
+    def test_short_filings_share_calls(self, monkeypatch):
+        monkeypatch.setenv("SEC_LLM_PACK_MAX_DOCS", "5")
+        provider, single = StubProvider(), SingleExtractor()
+
+        results = self._run([_filing(i) for i in range(10)], provider, single)
+
+        assert len(provider.prompts) == 2
+        assert single.calls == []
+        assert set(results) == {f"item_{i}" for i in range(10)}
+        assert results["item_3"]["keywords"] == ["partnership"]
+        assert results["item_3"]["material"] is True
+
+    def test_misparsed_documents_split_back_out(self, monkeypatch):
+        monkeypatch.setenv("SEC_LLM_PACK_MAX_DOCS", "10")
+        provider, single = StubProvider(bad={"D2", "D5"}), SingleExtractor()
+
+        results = self._run([_filing(i) for i in range(6)], provider, single)
+
+        assert len(provider.prompts) == 1
+        assert len(single.calls) == 2
+        assert sum(r["keywords"] == ["single"] for r in results.values()) == 2
+        assert len(results) == 6
+
+    def test_unusable_response_halves_pack(self, monkeypatch):
+        monkeypatch.setenv("SEC_LLM_PACK_MAX_DOCS", "4")
+        provider, single = StubProvider(garbage=True), SingleExtractor()
+
+        results = self._run([_filing(i) for i in range(4)], provider, single)
+
+        # 4 -> 2 + 2 -> 1+1+1+1
+        assert len(provider.prompts) == 3
+        assert len(single.calls) == 4
+        assert all(r["keywords"] == ["single"] for r in results.values())
+
+    def test_long_filings_keep_single_path(self, monkeypatch):
+        monkeypatch.setenv("SEC_LLM_PACK_SHORT_TOKENS", "50")
+        provider, single = StubProvider(), SingleExtractor()
+        filings = [_filing(0, "word " * 400), _filing(1), _filing(2)]
+
+        results = self._run(filings, provider, single)
+
+        assert single.calls == ["8-K 0"]
+        assert len(provider.prompts) == 1
+        assert results["item_1"]["keywords"] == ["partnership"]
+
+
+class TestAdaptiveConcurrencyLimiter:
+    def test_limit_follows_headroom(self):
+        tracker = FakeTracker(usage_pct=90.0)
+        limiter = AdaptiveConcurrencyLimiter(
+            max_limit=8, tracker_getter=lambda: tracker
+        )
+
+        assert limiter.adjust() == 4
+        assert limiter.adjust() == 2
+        tracker.stats["minute_usage_pct"] = 10.0
+        assert limiter.adjust() == 3
+        tracker.stats["in_backoff"] = True
+        assert limiter.adjust() == 1
+
+    def test_caps_concurrent_calls(self):
+        limiter = AdaptiveConcurrencyLimiter(max_limit=3, tracker_getter=lambda: None)
+        active, peak = 0, 0
+
+        async def call():
+            nonlocal active, peak
+            async with limiter:
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+
+        async def main():
+            await asyncio.gather(*(call() for _ in range(10)))
+
+        asyncio.run(main())
+        assert peak == 3
+
+
+@pytest.mark.asyncio
+async def test_batch_extract_uses_packing(monkeypatch):
+    monkeypatch.setenv("FEATURE_SEC_LLM_CACHE", "0")
+    monkeypatch.setenv("SEC_LLM_PACK_MIN_FILINGS", "3")
+    provider = StubProvider()
+    monkeypatch.setattr("catalyst_bot.llm_hybrid.query_hybrid_llm", provider)
+
+    results = await batch_extract_keywords_from_documents(
+        [_filing(i) for i in range(4)]
+    )
+
+    assert len(provider.prompts) == 1
+    assert all(r["keywords"] == ["partnership"] for r in results.values())
+    assert len(results) == 4
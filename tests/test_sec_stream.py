@@ -2,16 +2,22 @@
 
 import asyncio
 import json
+import threading
 from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from catalyst_bot import sec_stream
+from catalyst_bot.durable_queue import DurableQueue
 from catalyst_bot.sec_stream import (
+    BACKLOG_TOPIC,
     DEFAULT_MARKET_CAP_MAX,
     FilingEvent,
     SECStreamClient,
     SECStreamException,
+    drain_backlog,
+    enqueue_filing,
     get_market_cap_max,
     get_reconnect_delay,
     get_sec_api_key,
@@ -21,6 +27,14 @@ from catalyst_bot.sec_stream import (
 )
 
 
+@pytest.fixture(autouse=True)
+def backlog_path(tmp_path, monkeypatch):
+    """Keep the durable filing backlog out of the working directory."""
+    path = tmp_path / "sec_stream_queue.sqlite"
+    monkeypatch.setenv("SEC_STREAM_QUEUE_PATH", str(path))
+    return path
+
+
 @pytest.fixture
 def sample_filing_payload():
     """Sample WebSocket payload from sec-api.io."""
@@ -302,37 +316,80 @@ async def test_stream_filings_filters_high_market_cap(
 
 
 @pytest.mark.asyncio
-async def test_stream_filings_queue_full_handling(sample_filing_payload):
-    """Test handling of queue overflow."""
-    with patch("catalyst_bot.sec_stream.websockets") as mock_ws:
-        mock_websocket = AsyncMock()
-        mock_ws.connect = AsyncMock(return_value=mock_websocket)
+async def test_backlog_survives_restart_and_dedupes(
+    sample_filing_payload, backlog_path
+):
+    """Filings buffered before a restart are processed by the next run."""
+    filing = FilingEvent.from_websocket_payload(sample_filing_payload)
+    assert enqueue_filing(DurableQueue(backlog_path), filing)
+    # Redelivered by the stream while still waiting: not queued twice
+    assert not enqueue_filing(DurableQueue(backlog_path), filing)
 
-        client = SECStreamClient(api_key="test_key")
-        # Fill the queue manually
-        for _ in range(1000):  # Max queue size
-            await client.filing_queue.put(
-                FilingEvent.from_websocket_payload(sample_filing_payload)
-            )
+    backlog = DurableQueue(backlog_path)
+    received = []
+    stop = asyncio.Event()
 
-        assert client.filing_queue.full()
+    async def callback(f: FilingEvent):
+        received.append(f.accession_number)
+        stop.set()
 
-        # Next filing should be dropped (logged, not raised)
-        auth_response = json.dumps({"type": "auth_success"})
-        filing_message = json.dumps(sample_filing_payload)
+    await asyncio.wait_for(drain_backlog(backlog, callback, stop), timeout=5.0)
 
-        mock_websocket.recv.side_effect = [
-            auth_response,
-            filing_message,
-            asyncio.CancelledError(),
-        ]
+    assert received == ["0000320193-25-000001"]
+    assert backlog.depth(BACKLOG_TOPIC) == 0
 
-        # Should not raise exception
-        try:
-            async for _ in client.stream_filings():
-                break
-        except asyncio.CancelledError:
-            pass
+
+@pytest.mark.asyncio
+async def test_backlog_retries_failed_filings(
+    sample_filing_payload, backlog_path, monkeypatch
+):
+    """A filing whose callback raises is retried instead of lost."""
+    monkeypatch.setattr(sec_stream, "BACKLOG_RETRY_DELAY", 0)
+    backlog = DurableQueue(backlog_path)
+    enqueue_filing(backlog, FilingEvent.from_websocket_payload(sample_filing_payload))
+    attempts = []
+    stop = asyncio.Event()
+
+    async def flaky(f: FilingEvent):
+        attempts.append(f.ticker)
+        if len(attempts) == 1:
+            raise RuntimeError("LLM timeout")
+        stop.set()
+
+    consumers = [drain_backlog(backlog, flaky, stop) for _ in range(3)]
+    await asyncio.wait_for(asyncio.gather(*consumers), timeout=5.0)
+
+    assert attempts == ["AAPL", "AAPL"]
+    assert backlog.stats(BACKLOG_TOPIC)["ready"] == 0
+
+
+@pytest.mark.asyncio
+async def test_backlog_queue_calls_run_off_the_event_loop(
+    sample_filing_payload, backlog_path
+):
+    """Blocking SQLite queue calls never run on the event loop thread."""
+    threads = []
+
+    class RecordingQueue(DurableQueue):
+        def get(self, *args, **kwargs):
+            threads.append(threading.get_ident())
+            return super().get(*args, **kwargs)
+
+        def ack(self, *args, **kwargs):
+            threads.append(threading.get_ident())
+            return super().ack(*args, **kwargs)
+
+    backlog = RecordingQueue(backlog_path)
+    enqueue_filing(backlog, FilingEvent.from_websocket_payload(sample_filing_payload))
+    stop = asyncio.Event()
+
+    async def callback(f: FilingEvent):
+        stop.set()
+
+    await asyncio.wait_for(drain_backlog(backlog, callback, stop), timeout=5.0)
+
+    assert len(threads) == 2
+    assert threading.get_ident() not in threads
 
 
 @pytest.mark.asyncio
@@ -370,6 +427,32 @@ async def test_monitor_sec_stream():
             assert "AAPL" in callback_results
 
 
+@pytest.mark.asyncio
+async def test_monitor_sec_stream_without_backlog(monkeypatch):
+    """With the backlog disabled, filings go straight to the callback."""
+    monkeypatch.setenv("SEC_STREAM_BACKLOG", "false")
+    callback_results = []
+
+    async def mock_callback(filing: FilingEvent):
+        callback_results.append(filing.ticker)
+
+    with patch("catalyst_bot.sec_stream.get_sec_api_key", return_value="test_key"):
+        with patch("catalyst_bot.sec_stream.SECStreamClient") as mock_client_class:
+            mock_client = AsyncMock()
+            mock_client_class.return_value.__aenter__.return_value = mock_client
+
+            async def mock_stream():
+                yield FilingEvent.from_websocket_payload(
+                    {"type": "filing", "ticker": "TSLA", "formType": "8-K"}
+                )
+
+            mock_client.stream_filings = MagicMock(return_value=mock_stream())
+            await monitor_sec_stream(mock_callback, filing_types=["8-K"])
+
+    assert callback_results == ["TSLA"]
+    assert sec_stream.open_backlog() is None
+
+
 @pytest.mark.asyncio
 async def test_monitor_with_fallback_stream_enabled():
     """Test fallback monitor when streaming is enabled."""
@@ -0,0 +1,268 @@
+"""Tests for the embedding-based semantic LLM cache tier."""
+
+import asyncio
+import hashlib
+import json
+import re
+import threading
+import zlib
+
+import numpy as np
+import pytest
+
+from catalyst_bot import sec_llm_cache as sec_cache_module
+from catalyst_bot.sec_llm_analyzer import batch_extract_keywords_from_documents
+from catalyst_bot.sec_llm_cache import SECLLMCache
+from catalyst_bot.services import semantic_cache as semantic_module
+from catalyst_bot.services.llm_cache import LLMCache
+from catalyst_bot.services.llm_service import LLMResponse
+from catalyst_bot.services.semantic_cache import SemanticCache
+
+RELEASE = (
+    "Acme Therapeutics announces positive phase 3 results for ACM-101 in "
+    "metastatic breast cancer meeting its primary endpoint of overall survival"
+)
+SYNDICATED = RELEASE + " via wire service"
+UNRELATED = "Globex Corp prices public offering of common stock at a discount"
+
+
+def bag_of_words(texts):
+    """Deterministic stand-in for a sentence-embedding model."""
+    vectors = np.zeros((len(texts), 256), dtype=np.float32)
+    for row, text in enumerate(texts):
+        for word in re.findall(r"[a-z0-9-]+", text.lower()):
+            vectors[row, zlib.crc32(word.encode()) % 256] += 1.0
+    return vectors
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return SemanticCache(
+        embedder=bag_of_words,
+        default_threshold=0.9,
+        audit_rate=0.0,
+        audit_path=tmp_path / "audit.jsonl",
+        enabled=True,
+    )
+
+
+def _audit_events(cache):
+    lines = cache.audit_path.read_text().splitlines()
+    return [json.loads(line) for line in lines]
+
+
+class TestSemanticCache:
+    def test_near_duplicate_hits_with_matching_metadata(self, cache):
+        cache.add("news", RELEASE, "cached-answer", ticker="acme", filing_type="PR")
+
+        hit = cache.lookup("news", SYNDICATED, ticker="ACME", filing_type="pr")
+
+        assert hit is not None
+        assert hit.payload == "cached-answer"
+        assert hit.similarity >= 0.9
+        assert cache.lookup("news", UNRELATED, ticker="ACME", filing_type="PR") is None
+        assert _audit_events(cache)[0]["event"] == "hit"
+
+    def test_metadata_mismatch_rejected_and_audited(self, cache):
+        cache.add("news", RELEASE, "cached-answer", ticker="ACME", filing_type="PR")
+
+        assert cache.lookup("news", SYNDICATED, ticker="ACMX", filing_type="PR") is None
+        assert (
+            cache.lookup("news", SYNDICATED, ticker="ACME", filing_type="8-K") is None
+        )
+
+        stats = cache.get_stats()
+        assert stats["rejected_ticker"] == 1
+        assert stats["rejected_filing_type"] == 1
+        assert stats["hits"] == 0
+        reasons = [e["reason"] for e in _audit_events(cache)]
+        assert reasons == ["ticker_mismatch", "filing_type_mismatch"]
+
+    def test_different_doc_id_is_a_miss(self, cache):
+        cache.add("sec", RELEASE, "cached-answer", ticker="ACME", doc_id="0001-1")
+
+        assert cache.lookup("sec", SYNDICATED, ticker="ACME", doc_id="0001-2") is None
+        hit = cache.lookup("sec", SYNDICATED, ticker="ACME", doc_id="0001-1")
+
+        assert hit is not None and hit.payload == "cached-answer"
+        assert cache.get_stats()["rejected_doc_id"] == 1
+        assert _audit_events(cache)[0]["reason"] == "doc_id_mismatch"
+
+    def test_namespaces_are_isolated_and_thresholds_by_prefix(self, cache):
+        cache.add("sentiment", RELEASE, "answer", ticker="ACME")
+
+        assert cache.lookup("news", RELEASE, ticker="ACME") is None
+        assert cache.threshold_for("sec_8k_item_1.01") == 0.96
+        assert cache.threshold_for("news") == 0.9
+
+    def test_expired_entries_are_not_served(self, cache):
+        cache.add("news", RELEASE, "answer", ticker="ACME", ttl_seconds=-1)
+        assert cache.lookup("news", RELEASE, ticker="ACME") is None
+
+    def test_sampled_hit_audits_fresh_answer(self, cache):
+        cache.audit_rate = 1.0
+        cache.add("news", RELEASE, "p1", ticker="ACME", answer_text="bullish trial")
+
+        # Sampled hits are served as misses so the fresh answer can be compared
+        assert cache.lookup("news", SYNDICATED, ticker="ACME", audit_key="r1") is None
+        cache.add(
+            "news",
+            SYNDICATED,
+            "p2",
+            ticker="ACME",
+            answer_text="bullish trial",
+            audit_key="r1",
+        )
+        assert cache.lookup("news", SYNDICATED, ticker="ACME", audit_key="r2") is None
+        cache.add(
+            "news",
+            SYNDICATED,
+            "p3",
+            ticker="ACME",
+            answer_text="dilutive offering",
+            audit_key="r2",
+        )
+
+        stats = cache.get_stats()
+        assert stats["audits"] == 2
+        assert stats["false_hits"] == 1
+        assert stats["false_hit_rate_pct"] == 50.0
+        results = [e for e in _audit_events(cache) if e["event"] == "audit_result"]
+        assert [e["agree"] for e in results] == [True, False]
+
+    def test_prunes_oldest_beyond_max_entries(self, cache):
+        cache.max_entries = 3
+        for i in range(5):
+            cache.add("news", f"headline number {i}", str(i), ticker="ACME")
+
+        assert cache.get_stats()["entries"] == 3
+        assert cache.lookup("news", "headline number 0", ticker="ACME") is None
+        assert cache.lookup("news", "headline number 4", ticker="ACME").payload == "4"
+
+    def test_disabled_without_embedder(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(semantic_module, "_load_default_embedder", lambda _: None)
+        cache = SemanticCache(audit_path=tmp_path / "a.jsonl", enabled=True)
+
+        assert cache.add("news", RELEASE, "answer") is False
+        assert cache.available is False
+
+
+class TestCacheIntegration:
+    @pytest.fixture(autouse=True)
+    def shared_cache(self, cache, monkeypatch):
+        monkeypatch.setattr(semantic_module, "_semantic_cache", cache)
+        return cache
+
+    def test_llm_cache_serves_semantic_hit(self, monkeypatch):
+        monkeypatch.setattr(LLMCache, "_init_redis", lambda self: None)
+        llm_cache = LLMCache({"cache_enabled": True})
+        response = LLMResponse(text="positive", provider="gemini", model="flash")
+
+        asyncio.run(llm_cache.set(RELEASE, "news_sentiment", response, ticker="ACME"))
+        hit = asyncio.run(llm_cache.get(SYNDICATED, "news_sentiment", ticker="ACME"))
+        miss = asyncio.run(llm_cache.get(SYNDICATED, "news_sentiment", ticker="ZZZ"))
+
+        assert hit is not None and hit.text == "positive" and hit.cached
+        assert miss is None
+        stats = llm_cache.get_stats()
+        assert stats["semantic_hits"] == 1
+        assert stats["semantic"]["rejected_ticker"] == 1
+
+    def test_llm_cache_skips_semantic_tier_without_ticker(
+        self, shared_cache, monkeypatch
+    ):
+        monkeypatch.setattr(LLMCache, "_init_redis", lambda self: None)
+        llm_cache = LLMCache({"cache_enabled": True})
+        response = LLMResponse(text="positive", provider="gemini", model="flash")
+
+        asyncio.run(llm_cache.set(RELEASE, "news_sentiment", response))
+        asyncio.run(llm_cache.set(RELEASE, "news_sentiment", response, ticker="ACME"))
+        miss = asyncio.run(llm_cache.get(SYNDICATED, "news_sentiment", ticker=" "))
+
+        assert miss is None
+        assert shared_cache.get_stats()["entries"] == 1
+        assert shared_cache.get_stats()["lookups"] == 0
+
+    def test_sec_cache_falls_back_to_semantic_tier(
+        self, shared_cache, tmp_path, monkeypatch
+    ):
+        monkeypatch.setenv("FEATURE_SEC_LLM_CACHE", "1")
+        shared_cache.thresholds["sec_"] = 0.9
+        sec_cache = SECLLMCache(db_path=tmp_path / "sec.db")
+        result = {"summary": "Positive phase 3", "llm_sentiment": 0.7}
+
+        sec_cache.cache_sec_analysis(
+            "0001-25-000001", "ACME", "8-K", result, "aaaa", document_text=RELEASE
+        )
+        # Same filing re-fetched with slightly different text
+        hit = sec_cache.get_cached_sec_analysis(
+            "0001-25-000001", "ACME", "8-K", "bbbb", document_text=SYNDICATED
+        )
+        other_filing = sec_cache.get_cached_sec_analysis(
+            "0001-25-000002", "ACME", "8-K", "bbbb", document_text=SYNDICATED
+        )
+        other_namespace = sec_cache.get_cached_sec_analysis(
+            "0001-25-000001",
+            "ACME",
+            "8-K",
+            "bbbb",
+            document_text=SYNDICATED,
+            namespace="sec_keyword_extraction",
+        )
+        unknown = sec_cache.get_cached_sec_analysis(
+            "0001-25-000003", "UNKNOWN", "8-K", "cccc", document_text=SYNDICATED
+        )
+
+        assert hit == result
+        assert other_filing is None
+        assert other_namespace is None
+        assert unknown is None
+        assert sec_cache.stats["semantic_hits"] == 1
+        assert sec_cache.stats["cache_hits"] == 1
+
+    def test_llm_cache_persists_locally_without_redis(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("LLM_CACHE_DB_PATH", str(tmp_path / "llm_cache.sqlite"))
+        monkeypatch.setattr(LLMCache, "_init_redis", LLMCache._init_local_store)
+        config = {"cache_enabled": True, "semantic_cache_enabled": False}
+        response = LLMResponse(text="negative", provider="gemini", model="flash")
+
+        asyncio.run(LLMCache(config).set(UNRELATED, "news_sentiment", response))
+        # A fresh instance (bot restart) reads the same local store
+        restarted = LLMCache(config)
+        hit = asyncio.run(restarted.get(UNRELATED, "news_sentiment"))
+
+        stats = restarted.get_stats()
+        assert stats["backend"] == "sqlite"
+        assert stats["cache_size"] == 1
+        assert hit is not None and hit.text == "negative" and hit.cached
+
+    def test_sec_batch_lookups_run_off_the_event_loop(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("FEATURE_SEC_LLM_CACHE", "1")
+        sec_cache = SECLLMCache(db_path=tmp_path / "sec.db")
+        doc_hash = hashlib.md5(RELEASE[:1000].encode()).hexdigest()[:8]
+        sec_cache.cache_sec_analysis(
+            "0001-25-000001", "ACME", "8-K", {"keywords": ["fda"]}, doc_hash
+        )
+        threads = []
+        lookup = sec_cache.get_cached_sec_analysis
+
+        def recording_lookup(*args, **kwargs):
+            threads.append(threading.current_thread())
+            return lookup(*args, **kwargs)
+
+        monkeypatch.setattr(sec_cache, "get_cached_sec_analysis", recording_lookup)
+        monkeypatch.setattr(sec_cache_module, "get_sec_llm_cache", lambda: sec_cache)
+        filings = [
+            {
+                "item_id": "a",
+                "filing_id": "0001-25-000001",
+                "ticker": "ACME",
+                "filing_type": "8-K",
+                "document_text": RELEASE,
+            }
+        ]
+
+        results = asyncio.run(batch_extract_keywords_from_documents(filings))
+
+        assert results == {"a": {"keywords": ["fda"]}}
+        assert threads and threading.main_thread() not in threads
@@ -0,0 +1,202 @@
+"""Tests for the sharded multi-process runner plumbing."""
+
+from __future__ import annotations
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from catalyst_bot import partitioned_jsonl, sharding
+from catalyst_bot.durable_queue import DurableQueue
+
+
+class FakeSeen:
+    def __init__(self, seen=()):
+        self.ids = set(seen)
+
+    def is_seen(self, item_id):
+        return item_id in self.ids
+
+    def mark_seen(self, item_id, ts=None):
+        self.ids.add(item_id)
+
+
+@pytest.fixture
+def queue(tmp_path, monkeypatch):
+    q = DurableQueue(tmp_path / "shard_queue.sqlite")
+    monkeypatch.setattr(sharding, "_queue", q)
+    monkeypatch.setattr(sharding, "_outbox", [])
+    return q
+
+
+def _messages(queue, topic):
+    return [job.message for job in queue.get(topic, limit=100)]
+
+
+def _run_until(target, *args, until, timeout=5.0):
+    stop = threading.Event()
+    thread = threading.Thread(target=target, args=args + (stop,), daemon=True)
+    thread.start()
+    deadline = time.monotonic() + timeout
+    while not until() and time.monotonic() < deadline:
+        time.sleep(0.02)
+    stop.set()
+    thread.join(timeout=5)
+
+
+def test_shard_for_is_stable_and_case_insensitive():
+    assert sharding.shard_for("AAPL", 4) == sharding.shard_for(" aapl ", 4)
+    assert sharding.shard_for("AAPL", 1) == 0
+    shards = {sharding.shard_for(f"T{i}", 4) for i in range(100)}
+    assert shards == {0, 1, 2, 3}
+
+
+def test_dispatch_routes_by_ticker_and_drops_seen(queue, monkeypatch):
+    pool = SimpleNamespace(workers=3, dispatched=0, processed=0)
+    monkeypatch.setattr(sharding, "_pool", pool)
+    items = [
+        {"id": "1", "ticker": "AAPL"},
+        {"id": "2", "ticker": "aapl"},
+        {"id": "3", "ticker": "MSFT"},
+        {"id": "4", "ticker": ""},
+        {"id": "5", "ticker": "TSLA"},
+    ]
+
+    assert sharding.dispatch(items, {"status": "regular"}, FakeSeen({"5"})) == 4
+    # Re-dispatching items still waiting in their shard queues nothing new
+    assert sharding.dispatch(items, None) == 1
+    assert pool.dispatched == 5
+
+    aapl = sharding.shard_topic(sharding.shard_for("AAPL", 3))
+    got = [m["item"]["id"] for m in _messages(queue, aapl)]
+    assert got[:2] == ["1", "2"]
+    # Leased to this consumer until acked
+    assert _messages(queue, aapl) == []
+
+
+def test_worker_processes_its_shard_and_reports_stats(queue):
+    queue.put_many(
+        "shard-1",
+        [(str(i), {"item": {"id": str(i)}, "market_info": None}) for i in range(5)],
+    )
+    batches = []
+
+    def process_batch(items, market_info):
+        batches.append([it["id"] for it in items])
+        return {"items": len(items), "alerts": 1}
+
+    def worker(stop):
+        sharding.run_worker(queue, 1, stop, process_batch, batch_size=2)
+
+    _run_until(worker, until=lambda: queue.depth("stats") == 3)
+
+    assert batches == [["0", "1"], ["2", "3"], ["4"]]
+    assert queue.depth("shard-1") == 0
+    stats = _messages(queue, "stats")
+    assert sum(s["processed"] for s in stats) == 5
+    assert {s["shard"] for s in stats} == {1}
+
+
+def test_worker_forwards_alerts_seen_marks_and_item_logs(queue, tmp_path, monkeypatch):
+    monkeypatch.setattr(sharding, "_role", sharding.ROLE_WORKER)
+    monkeypatch.setattr(partitioned_jsonl, "_append_sink", None)
+    local = FakeSeen({"old"})
+    store = sharding.wrap_seen_store(local)
+
+    assert store.is_seen("old")
+    store.mark_seen("new")
+    assert not local.is_seen("new")
+    assert sharding.forward_alert({"item": {"id": "new"}})
+
+    partitioned_jsonl.set_append_sink(sharding._forward_item_log)
+    legacy = tmp_path / "accepted_items.jsonl"
+    partitioned_jsonl.get_log(legacy).append({"ts": "2026-01-06T00:00:00", "id": 1})
+    partitioned_jsonl.set_append_sink(None)
+
+    # Alerts go out at once; seen marks and item logs wait for the batch end
+    assert [kind for kind, _ in _messages(queue, "delivery")] == ["alert"]
+    assert sharding._flush_forwarded(queue) == 2
+    kinds = [kind for kind, _ in _messages(queue, "delivery")]
+    assert kinds == ["seen", "item_log"]
+    assert not partitioned_jsonl.has_records(legacy)
+
+
+def test_worker_sends_a_batch_of_seen_marks_in_one_put(queue, monkeypatch):
+    monkeypatch.setattr(sharding, "_role", sharding.ROLE_WORKER)
+    queue.put_many(
+        "shard-0",
+        [(str(i), {"item": {"id": str(i)}, "market_info": None}) for i in range(3)],
+    )
+    store = sharding.wrap_seen_store(FakeSeen())
+    puts = []
+    put_many = queue.put_many
+
+    def counting_put_many(topic, messages, **kwargs):
+        puts.append(topic)
+        return put_many(topic, messages, **kwargs)
+
+    monkeypatch.setattr(queue, "put_many", counting_put_many)
+
+    def process_batch(items, market_info):
+        for it in items:
+            store.mark_seen(it["id"])
+        return {}
+
+    def worker(stop):
+        sharding.run_worker(queue, 0, stop, process_batch, batch_size=3)
+
+    _run_until(worker, until=lambda: queue.depth("stats") == 1)
+
+    assert puts == ["delivery", "stats"]
+    assert [body for _, body in _messages(queue, "delivery")] == ["0", "1", "2"]
+
+
+def test_delivery_sends_once_and_keeps_failed_items_unseen(queue, tmp_path):
+    seen = FakeSeen()
+    sent = []
+
+    def send(payload):
+        sent.append(payload["item"]["id"])
+        if payload["item"]["id"] == "boom":
+            raise RuntimeError("discord down")
+        return payload["item"]["id"] != "bad"
+
+    legacy = tmp_path / "rejected_items.jsonl"
+    record = {"ts": "2026-01-06T12:00:00+00:00", "ticker": "A"}
+    queue.put_many(
+        "delivery",
+        [
+            (None, ("alert", {"item": {"id": "a"}})),
+            (None, ("seen", "a")),
+            (None, ("alert", {"item": {"id": "bad"}})),
+            (None, ("seen", "bad")),
+            (None, ("alert", {"item": {"id": "boom"}})),
+            (None, ("seen", "boom")),
+            # A duplicate handed out while the first alert was queued
+            (None, ("alert", {"item": {"id": "a"}})),
+            (None, ("seen", "sec-filing")),
+            (None, ("item_log", (str(legacy), (), record))),
+        ],
+    )
+
+    def delivery(stop):
+        sharding.run_delivery(queue, stop, send, seen)
+
+    _run_until(delivery, until=lambda: queue.depth("delivery") == 0 and sent)
+
+    assert sent == ["a", "bad", "boom"]
+    assert seen.ids == {"a", "sec-filing"}
+    assert partitioned_jsonl.has_records(legacy)
+
+
+def test_rebalance_moves_items_off_removed_shards(queue):
+    item = {"id": "9", "ticker": "NVDA"}
+    queue.put("shard-5", {"item": item, "market_info": None}, key="9")
+    queue.put("shard-0", {"item": {"id": "1"}, "market_info": None}, key="1")
+
+    assert sharding._rebalance(queue, 2) == 1
+    assert queue.depth("shard-5") == 0
+    target = sharding.shard_topic(sharding.shard_for("NVDA", 2))
+    assert [m["item"]["id"] for m in _messages(queue, target)][-1] == "9"
@@ -0,0 +1,169 @@
+"""Tests for the streaming wire feed parser and off-loop feed parsing."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import feedparser
+import pytest
+
+from catalyst_bot import feeds
+from catalyst_bot.wire_feed_parser import is_wire_source, parse_wire_feed
+
+NOW = datetime(2024, 1, 8, 15, 0, tzinfo=timezone.utc)
+
+
+def _rss(ages_minutes):
+    items = "".join(
+        "<item>"
+        f"<title><![CDATA[Acme (NASDAQ: ACME) Update {i}]]></title>"
+        f"<link>https://www.globenewswire.com/news/{i}</link>"
+        f"<guid isPermaLink='false'>gnw-{i}</guid>"
+        f"<description>Body &amp; details {i}</description>"
+        "<pubDate>"
+        + (NOW - timedelta(minutes=age)).strftime("%a, %d %b %Y %H:%M:%S GMT")
+        + "</pubDate>"
+        "</item>"
+        for i, age in enumerate(ages_minutes)
+    )
+    return (
+        '<?xml version="1.0" encoding="ISO-8859-1"?>'
+        f"<rss version='2.0'><channel><title>GNW</title>{items}</channel></rss>"
+    )
+
+
+ATOM = """<?xml version="1.0" encoding="ISO-8859-1" ?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+<title>Latest Filings</title>
+<entry>
+<title>8-K - Acme Corp (0001234567) (Filer)</title>
+<link rel="alternate" type="text/html" href="https://www.sec.gov/Archives/1"/>
+<summary type="html">&lt;b&gt;Filed:&lt;/b&gt; 2024-01-08</summary>
+<updated>2024-01-08T09:45:00-05:00</updated>
+<id>urn:tag:sec.gov,2008:accession-number=0001</id>
+</entry>
+</feed>"""
+
+
+class TestParseWireFeed:
+    def test_rss_entries_match_feedparser(self):
+        text = _rss([1, 2, 3])
+        entries, stopped_early = parse_wire_feed(text, now=NOW)
+        reference = feedparser.parse(text).entries
+
+        assert stopped_early is False
+        assert [e.title for e in entries] == [e.title for e in reference]
+        assert [e.link for e in entries] == [e.link for e in reference]
+        assert [e.id for e in entries] == [e.id for e in reference]
+        assert entries[0].summary == "Body & details 0"
+
+    def test_atom_entry(self):
+        (entry,), _ = parse_wire_feed(ATOM, now=NOW)
+
+        assert entry.link == "https://www.sec.gov/Archives/1"
+        assert entry.updated == "2024-01-08T09:45:00-05:00"
+        assert entry.id.endswith("accession-number=0001")
+        assert entry.summary == "<b>Filed:</b> 2024-01-08"
+
+    def test_stops_after_consecutive_stale_entries(self):
+        # One out-of-order stale entry is skipped, then a stale run stops parsing
+        text = _rss([1, 30, 2, 40, 50, 60, 3])
+        entries, stopped_early = parse_wire_feed(text, max_age_minutes=10, now=NOW)
+
+        assert stopped_early is True
+        assert [e.id for e in entries] == ["gnw-0", "gnw-2"]
+
+    def test_malformed_payload_returns_none(self):
+        assert parse_wire_feed("<rss><channel><item><title>x</channel>") is None
+        assert parse_wire_feed("") is None
+
+    def test_entities_not_expanded(self):
+        text = (
+            '<?xml version="1.0"?><!DOCTYPE rss [<!ENTITY x SYSTEM '
+            '"file:///etc/passwd">]><rss><channel><item><title>&x;</title>'
+            "</item></channel></rss>"
+        )
+        result = parse_wire_feed(text)
+        assert result is None or "root:" not in (result[0][0].title or "")
+
+    @pytest.mark.parametrize(
+        "source,expected",
+        [
+            ("globenewswire_public", True),
+            ("businesswire", True),
+            ("sec_8k", True),
+            ("finviz_news", False),
+            ("", False),
+        ],
+    )
+    def test_is_wire_source(self, source, expected):
+        assert is_wire_source(source) is expected
+
+
+class TestParseFeedText:
+    def test_wire_source_uses_fast_path(self, monkeypatch):
+        monkeypatch.setattr(feeds, "sim_now", lambda: NOW)
+        monkeypatch.setenv("NEWS_MAX_AGE_MINUTES", "10")
+        text = _rss([1, 2, 30, 40, 50, 60])
+
+        items, stats = feeds._parse_feed_text("globenewswire_public", text)
+
+        assert stats["parser"] == "wire"
+        assert stats["stopped_early"] == 1
+        assert stats["entries"] == 2
+        assert "parse_ms" in stats
+        assert [it["link"] for it in items] == [
+            "https://www.globenewswire.com/news/0",
+            "https://www.globenewswire.com/news/1",
+        ]
+
+    def test_wire_items_match_feedparser_items(self, monkeypatch):
+        monkeypatch.setattr(feeds, "sim_now", lambda: NOW)
+        monkeypatch.setenv("NEWS_MAX_AGE_MINUTES", "0")
+        text = _rss([1, 2])
+
+        wire_items, _ = feeds._parse_feed_text("globenewswire_public", text)
+        reference = [
+            feeds._normalize_entry("globenewswire_public", e)
+            for e in feedparser.parse(text).entries
+        ]
+
+        keys = ("id", "title", "link", "ts", "ticker", "summary")
+        assert [{k: it.get(k) for k in keys} for it in wire_items] == [
+            {k: it.get(k) for k in keys} for it in reference
+        ]
+
+    def test_malformed_wire_payload_falls_back(self):
+        text = "<rss><channel><item><title>Acme</title><link>https://x/1</link>"
+
+        _, stats = feeds._parse_feed_text("businesswire", text)
+
+        assert stats["parser"] == "feedparser"
+        assert stats["stopped_early"] == 0
+
+    def test_other_sources_use_feedparser(self):
+        _, stats = feeds._parse_feed_text("finviz_news", _rss([1]))
+        assert stats["parser"] == "feedparser"
+        assert stats["entries"] == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not feeds.AIOHTTP_AVAILABLE, reason="aiohttp not installed")
+async def test_async_fetch_reports_parse_metrics(monkeypatch):
+    monkeypatch.setattr(feeds, "sim_now", lambda: NOW)
+    monkeypatch.setenv("NEWS_MAX_AGE_MINUTES", "0")
+
+    async def fake_get(url_list, session):
+        return 200, _rss([1, 2]), url_list[0]
+
+    monkeypatch.setattr(feeds, "_get_multi_async", fake_get)
+
+    items, summary = await feeds._fetch_feeds_async_concurrent(
+        {"globenewswire_public": ["https://example.com/gnw"]}, {}
+    )
+
+    stats = summary["globenewswire_public"]
+    assert len(items) == 2
+    assert stats["ok"] == 1
+    assert stats["parser"] == "wire"
+    assert stats["entries"] == 2